@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Calibrate learning_atoms item statistics from atom_responses.
+
+Fits a 2PL (or 3PL) IRT model plus classical p-values / point-biserial
+discrimination and writes them back in one bulk update. Runs are
+incremental: only responses newer than the saved watermark are read and
+the previous parameters seed the fit.
+
+Usage:
+    python scripts/analysis/calibrate_items.py
+    python scripts/analysis/calibrate_items.py --full --model 3pl
+    python scripts/analysis/calibrate_items.py --dry-run
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.adaptive.psychometrics import DEFAULT_STATE_PATH, PsychometricCalibrator
+from src.db.database import session_scope
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Calibrate IRT/CTT item statistics")
+    parser.add_argument("--full", action="store_true", help="Ignore saved state and refit all")
+    parser.add_argument("--model", choices=["2pl", "3pl"], default="2pl")
+    parser.add_argument("--dry-run", action="store_true", help="Fit without writing results")
+    parser.add_argument("--state", type=Path, default=DEFAULT_STATE_PATH, help="State file")
+    args = parser.parse_args()
+
+    with session_scope() as session:
+        calibrator = PsychometricCalibrator(session, model=args.model, state_path=args.state)
+        result = calibrator.run(full=args.full, dry_run=args.dry_run)
+
+    print(json.dumps(result.to_dict(), indent=2))
+    return 1 if result.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
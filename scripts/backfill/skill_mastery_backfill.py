@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Backfill learner skill mastery from the full response history.
+
+Replays atom_responses and session_atom_responses oldest first through
+SkillMasteryTracker's batch path. The Bayesian and FSRS updates are the same
+as for live responses. All responses are applied in memory and the final
+states are written in one upsert per 50k learner skills. Responses without
+a confidence rating count as confidence 3. Learner ids that are not UUIDs
+(e.g. the 'default' user) are skipped.
+
+Every (learner, skill) pair in the history is recomputed from scratch.
+Mastery rows without any history are left alone.
+
+Usage:
+    python scripts/backfill/skill_mastery_backfill.py
+    python scripts/backfill/skill_mastery_backfill.py --prefetch 50000
+
+Requires: DATABASE_URL set (defaults from config.py).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from config import get_settings
+from src.learning.skill_mastery_tracker import SkillMasteryTracker
+
+
+async def backfill(prefetch: int) -> dict:
+    import asyncpg
+
+    conn = await asyncpg.connect(get_settings().database_url)
+    try:
+        started = time.perf_counter()
+        result = await SkillMasteryTracker(conn).backfill_from_history(prefetch=prefetch)
+        elapsed = time.perf_counter() - started
+    finally:
+        await conn.close()
+    return {
+        **asdict(result),
+        "seconds": round(elapsed, 2),
+        "responses_per_second": round(result.events / elapsed) if elapsed else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay response history into skill mastery")
+    parser.add_argument(
+        "--prefetch", type=int, default=10_000, help="Rows per cursor round-trip"
+    )
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(backfill(args.prefetch)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,10 @@ Idempotency:
 - Uses card_id as unique constraint to prevent duplicates
 - Running twice is safe; existing records are updated
 
+Performance:
+- Rows are bulk-merged via src.db.bulk.BulkLoader (COPY into a temp table,
+  then one INSERT ... ON CONFLICT per table)
+
 Usage:
     python scripts/hydrate_db.py                      # Hydrate from DB source
     python scripts/hydrate_db.py --from-json          # Hydrate from JSON files
@@ -36,6 +40,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from loguru import logger
 from sqlalchemy import text
 
+from src.db.bulk import BulkLoader
 from src.db.database import init_db, session_scope
 
 # Quiz-compatible atom types that need QuizQuestion records
@@ -219,11 +224,12 @@ def map_atom_to_quiz_question(
     """
     Map raw atom data to QuizQuestion column values.
 
-    Returns None if atom type doesn't need a quiz question.
+    Returns None if atom type doesn't need a quiz question or has no card_id
+    to key the imported question on.
     """
     atom_type = atom_data.get("atom_type", "flashcard")
 
-    if atom_type not in QUIZ_TYPES:
+    if atom_type not in QUIZ_TYPES or not atom_data.get("card_id"):
         return None
 
     # Build question_content JSONB based on type
@@ -276,6 +282,7 @@ def map_atom_to_quiz_question(
 
     return {
         "atom_id": clean_atom_id,
+        "import_key": f"card:{atom_data['card_id']}",
         "question_type": question_type,
         "question_content": content_json,
         "difficulty": difficulty,
@@ -465,80 +472,55 @@ def create_quiz_questions_from_clean_atoms(
     Create QuizQuestion records for quiz-eligible atoms already in clean_atoms.
 
     This bridges the gap when clean_atoms exists but quiz_questions is empty.
+    Questions already imported for a card are left untouched (merged with
+    ON CONFLICT (import_key) DO NOTHING).
     """
     stats = HydrationStats()
 
     if dry_run:
         logger.info("[DRY RUN] Would create quiz questions without writing to database")
 
-    with session_scope() as session:
-        for atom_data in atoms:
-            stats.atoms_processed += 1
-            clean_atom_id = atom_data.get("id")
-            card_id = atom_data.get("card_id", "unknown")
+    quiz_rows: list[dict[str, Any]] = []
+    now = datetime.utcnow()
 
-            if not clean_atom_id:
-                stats.atoms_skipped += 1
-                continue
+    for atom_data in atoms:
+        stats.atoms_processed += 1
+        clean_atom_id = atom_data.get("id")
 
-            try:
-                # Check if quiz question already exists
-                existing = session.execute(
-                    text("SELECT id FROM quiz_questions WHERE atom_id = :atom_id"),
-                    {"atom_id": clean_atom_id},
-                ).fetchone()
-
-                if existing:
-                    stats.atoms_skipped += 1
-                    continue
-
-                if dry_run:
-                    stats.quiz_questions_created += 1
-                    continue
-
-                # Build quiz question data
-                quiz_values = map_atom_to_quiz_question(atom_data, clean_atom_id)
-
-                if quiz_values:
-                    # Convert content to JSON string for JSONB column
-                    quiz_values_copy = quiz_values.copy()
-                    if "question_content" in quiz_values_copy:
-                        quiz_values_copy["question_content"] = json.dumps(
-                            quiz_values_copy["question_content"]
-                        )
-
-                    # Add timestamps
-                    quiz_values_copy["created_at"] = datetime.utcnow()
-                    quiz_values_copy["updated_at"] = datetime.utcnow()
-
-                    cols = ", ".join(quiz_values_copy.keys())
-                    placeholders = ", ".join(f":{k}" for k in quiz_values_copy.keys())
-                    session.execute(
-                        text(f"""
-                            INSERT INTO quiz_questions ({cols})
-                            VALUES ({placeholders})
-                        """),
-                        quiz_values_copy,
-                    )
-                    stats.quiz_questions_created += 1
-
-                # Commit every 500 atoms for efficiency
-                if stats.atoms_processed % 500 == 0:
-                    session.commit()
-                    logger.info(
-                        f"Progress: {stats.atoms_processed} atoms processed, {stats.quiz_questions_created} created"
-                    )
-
-            except Exception as e:
-                stats.errors.append(f"Error processing {card_id}: {e}")
-                logger.error(f"Failed to create quiz question for {card_id}: {e}")
-                # Rollback to allow next insert
-                session.rollback()
-                continue
+        if not clean_atom_id:
+            stats.atoms_skipped += 1
+            continue
+
+        quiz_values = map_atom_to_quiz_question(atom_data, clean_atom_id)
+        if not quiz_values:
+            stats.atoms_skipped += 1
+            continue
+
+        quiz_values["created_at"] = now
+        quiz_values["updated_at"] = now
+        quiz_rows.append(quiz_values)
 
-        # Final commit
-        if not dry_run:
-            session.commit()
+    if dry_run:
+        stats.quiz_questions_created = len(quiz_rows)
+        return stats
+
+    with session_scope() as session:
+        try:
+            result = BulkLoader(session).load(
+                "quiz_questions",
+                quiz_rows,
+                key_columns=["import_key"],
+                update_columns=(),
+                json_columns=["question_content"],
+                isolate_errors=True,
+            )
+            stats.quiz_questions_created = result.inserted
+            stats.atoms_skipped += result.skipped
+            stats.errors.extend(result.errors)
+        except Exception as e:
+            stats.errors.append(f"Bulk quiz question load failed: {e}")
+            logger.error(f"Failed to create quiz questions: {e}")
+            raise
 
     return stats
 
@@ -550,7 +532,10 @@ def hydrate_clean_atoms(
     """
     Hydrate clean_atoms and quiz_questions tables.
 
-    Uses PostgreSQL UPSERT (INSERT ... ON CONFLICT) for idempotency.
+    Atoms are streamed into a staging table with COPY and merged with one
+    INSERT ... ON CONFLICT (card_id); quiz questions follow the same path keyed
+    on import_key ('card:<card_id>'). Running twice is safe. A row that fails
+    to merge is recorded in stats.errors without aborting the others.
     """
     stats = HydrationStats()
 
@@ -566,123 +551,83 @@ def hydrate_clean_atoms(
     if dry_run:
         logger.info("[DRY RUN] Would process atoms without writing to database")
 
-    with session_scope() as session:
-        for atom_data in atoms:
-            stats.atoms_processed += 1
-            card_id = atom_data.get("card_id")
+    atom_rows: list[dict[str, Any]] = []
+    quiz_sources: dict[str, dict[str, Any]] = {}
+    now = datetime.utcnow()
 
-            if not card_id:
-                stats.atoms_skipped += 1
-                stats.errors.append(f"Atom missing card_id: {atom_data.get('front', '')[:50]}")
-                continue
+    for atom_data in atoms:
+        stats.atoms_processed += 1
+        card_id = atom_data.get("card_id")
 
-            try:
-                # Map to CleanAtom columns
-                clean_atom_values = map_atom_to_clean_atom(
-                    atom_data, module_map, section_concept_map
-                )
-
-                if dry_run:
-                    # Just validate
-                    atom_type = atom_data.get("atom_type", "flashcard")
-                    if atom_type in QUIZ_TYPES:
-                        stats.quiz_questions_created += 1
-                    stats.atoms_created += 1
-                    continue
-
-                # Check if atom exists
-                existing = session.execute(
-                    text("SELECT id FROM clean_atoms WHERE card_id = :card_id"),
-                    {"card_id": card_id},
-                ).fetchone()
-
-                if existing:
-                    # Update existing atom
-                    clean_atom_id = existing[0]
-                    update_cols = ", ".join(
-                        f"{k} = :{k}" for k in clean_atom_values.keys() if k != "card_id"
-                    )
-                    session.execute(
-                        text(f"""
-                            UPDATE clean_atoms
-                            SET {update_cols}, updated_at = NOW()
-                            WHERE card_id = :card_id
-                        """),
-                        clean_atom_values,
-                    )
-                    stats.atoms_updated += 1
-                else:
-                    # Insert new atom
-                    cols = ", ".join(clean_atom_values.keys())
-                    placeholders = ", ".join(f":{k}" for k in clean_atom_values.keys())
-                    result = session.execute(
-                        text(f"""
-                            INSERT INTO clean_atoms ({cols})
-                            VALUES ({placeholders})
-                            RETURNING id
-                        """),
-                        clean_atom_values,
-                    )
-                    clean_atom_id = result.fetchone()[0]
-                    stats.atoms_created += 1
-
-                # Handle quiz question if applicable
-                quiz_values = map_atom_to_quiz_question(atom_data, clean_atom_id)
-
-                if quiz_values:
-                    # Check if quiz question exists for this atom
-                    existing_quiz = session.execute(
-                        text("SELECT id FROM quiz_questions WHERE atom_id = :atom_id"),
-                        {"atom_id": clean_atom_id},
-                    ).fetchone()
-
-                    if existing_quiz:
-                        # Update existing quiz question
-                        update_cols = ", ".join(
-                            f"{k} = :{k}" for k in quiz_values.keys() if k != "atom_id"
-                        )
-                        session.execute(
-                            text(f"""
-                                UPDATE quiz_questions
-                                SET {update_cols}, updated_at = NOW()
-                                WHERE atom_id = :atom_id
-                            """),
-                            quiz_values,
-                        )
-                        stats.quiz_questions_updated += 1
-                    else:
-                        # Insert new quiz question
-                        cols = ", ".join(quiz_values.keys())
-                        placeholders = ", ".join(f":{k}" for k in quiz_values.keys())
-                        # Convert content to JSON string for JSONB column
-                        quiz_values_copy = quiz_values.copy()
-                        if "question_content" in quiz_values_copy:
-                            quiz_values_copy["question_content"] = json.dumps(
-                                quiz_values_copy["question_content"]
-                            )
-                        session.execute(
-                            text(f"""
-                                INSERT INTO quiz_questions ({cols})
-                                VALUES ({placeholders})
-                            """),
-                            quiz_values_copy,
-                        )
-                        stats.quiz_questions_created += 1
-
-                # Commit every 100 atoms
-                if stats.atoms_processed % 100 == 0:
-                    session.commit()
-                    logger.info(f"Progress: {stats.atoms_processed} atoms processed")
-
-            except Exception as e:
-                stats.errors.append(f"Error processing {card_id}: {e}")
-                logger.error(f"Failed to process {card_id}: {e}")
-                # Continue with next atom
-                continue
+        if not card_id:
+            stats.atoms_skipped += 1
+            stats.errors.append(f"Atom missing card_id: {atom_data.get('front', '')[:50]}")
+            continue
+
+        try:
+            # Map to CleanAtom columns
+            clean_atom_values = map_atom_to_clean_atom(
+                atom_data, module_map, section_concept_map
+            )
+        except Exception as e:
+            stats.errors.append(f"Error processing {card_id}: {e}")
+            logger.error(f"Failed to process {card_id}: {e}")
+            continue
+
+        if dry_run:
+            # Just validate
+            atom_type = atom_data.get("atom_type", "flashcard")
+            if atom_type in QUIZ_TYPES:
+                stats.quiz_questions_created += 1
+            stats.atoms_created += 1
+            continue
+
+        clean_atom_values["updated_at"] = now
+        atom_rows.append(clean_atom_values)
+        if atom_data.get("atom_type", "flashcard") in QUIZ_TYPES:
+            quiz_sources[card_id] = atom_data
+
+    if dry_run or not atom_rows:
+        return stats
 
-        # Final commit
-        if not dry_run:
-            session.commit()
+    with session_scope() as session:
+        loader = BulkLoader(session)
+
+        atom_result = loader.load(
+            "clean_atoms",
+            atom_rows,
+            key_columns=["card_id"],
+            returning=["id"],
+            isolate_errors=True,
+        )
+        stats.atoms_created = atom_result.inserted
+        stats.atoms_updated = atom_result.updated
+        stats.atoms_skipped += atom_result.skipped
+        stats.errors.extend(atom_result.errors)
+        logger.info(f"Merged {len(atom_rows)} atoms into clean_atoms")
+
+        # Build quiz questions against the (possibly pre-existing) atom ids
+        quiz_rows: list[dict[str, Any]] = []
+        for row in atom_result.returned:
+            atom_data = quiz_sources.get(row["card_id"])
+            if not atom_data:
+                continue
+            quiz_values = map_atom_to_quiz_question(atom_data, row["id"])
+            if quiz_values:
+                quiz_values["updated_at"] = now
+                quiz_rows.append(quiz_values)
+
+        if quiz_rows:
+            quiz_result = loader.load(
+                "quiz_questions",
+                quiz_rows,
+                key_columns=["import_key"],
+                json_columns=["question_content"],
+                isolate_errors=True,
+            )
+            stats.quiz_questions_created = quiz_result.inserted
+            stats.quiz_questions_updated = quiz_result.updated
+            stats.errors.extend(quiz_result.errors)
 
     return stats
 
@@ -0,0 +1,351 @@
+"""
+Persistent Sparse Confusion Store.
+
+Cross-session replacement for the in-memory ConfusionMatrix in
+ncde_pipeline. Confusion probabilities M[target, selected] are kept as
+CSR arrays over integer atom indices plus a small per-row buffer of new
+entries that is folded into the CSR arrays periodically.
+
+Complexity:
+- record_confusion / record_discrimination: O(nnz(row)) (binary search + slice)
+- get_psi / get_worst_pair / get_confusables: O(nnz(row))
+- most_confused_pairs: O(nnz)
+
+The store is persisted per learner as a compressed ``.npz`` file so lure
+generation and PLM remediation can use confusion history from earlier
+sessions, not just the current one.
+
+Reference: Section 3.1.2 - The Confusion Matrix
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+# Under the project's data/ directory, whatever the working directory
+DEFAULT_CONFUSION_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "confusion"
+
+# Entries decayed below this are dropped at compaction to keep the matrix sparse
+PRUNE_EPSILON = 1e-4
+
+
+class SparseConfusionStore:
+    """
+    Sparse, persistent confusion matrix with the ConfusionMatrix API.
+
+    Update rules match ConfusionMatrix:
+    - Confusion:       M_ij ← M_ij + α(1 - M_ij)
+    - Discrimination:  M_Tk ← M_Tk (1 - β) for all k
+    - PSI_T = 1 - max_k M_Tk
+    """
+
+    def __init__(
+        self,
+        learner_id: str = "default",
+        alpha: float = 0.2,
+        beta: float = 0.1,
+        directory: Path | str = DEFAULT_CONFUSION_DIR,
+        compact_every: int = 256,
+    ):
+        """
+        Initialize an empty store.
+
+        Args:
+            learner_id: Learner the matrix belongs to (file name on disk)
+            alpha: Learning rate for confusions
+            beta: Decay rate for correct discriminations
+            directory: Directory holding per-learner ``.npz`` files
+            compact_every: Buffered new entries before folding into CSR
+        """
+        self.learner_id = learner_id
+        self.alpha = alpha
+        self.beta = beta
+        self.directory = Path(directory)
+        self.compact_every = compact_every
+
+        self._ids: list[str] = []
+        self._index: dict[str, int] = {}
+
+        # CSR over rows [0, len(indptr) - 1); later rows live only in _pending
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.empty(0, dtype=np.int32)
+        self._data = np.empty(0, dtype=np.float64)
+
+        # row -> {col: value} for entries not yet in the CSR structure
+        self._pending: dict[int, dict[int, float]] = {}
+        self._pending_count = 0
+
+    # =========================================================================
+    # Index management
+    # =========================================================================
+
+    def _intern(self, atom_id: str) -> int:
+        idx = self._index.get(atom_id)
+        if idx is None:
+            idx = len(self._ids)
+            self._ids.append(atom_id)
+            self._index[atom_id] = idx
+        return idx
+
+    def _csr_slice(self, row: int) -> tuple[int, int]:
+        if row + 1 >= len(self._indptr):
+            return 0, 0
+        return int(self._indptr[row]), int(self._indptr[row + 1])
+
+    def _row(self, target: str) -> tuple[np.ndarray, np.ndarray]:
+        """Column indices and values for a target row (CSR + pending)."""
+        row = self._index.get(target)
+        if row is None:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+
+        start, end = self._csr_slice(row)
+        cols = self._indices[start:end]
+        vals = self._data[start:end]
+
+        pending = self._pending.get(row)
+        if pending:
+            cols = np.concatenate([cols, np.fromiter(pending.keys(), dtype=np.int32)])
+            vals = np.concatenate([vals, np.fromiter(pending.values(), dtype=np.float64)])
+        return cols, vals
+
+    @property
+    def nnz(self) -> int:
+        return len(self._data) + self._pending_count
+
+    @property
+    def atom_ids(self) -> list[str]:
+        return list(self._ids)
+
+    # =========================================================================
+    # Updates
+    # =========================================================================
+
+    def record_confusion(self, target: str, selected: str) -> None:
+        """
+        Record a confusion event (user selected 'selected' when 'target' was correct).
+
+        Args:
+            target: The correct concept ID
+            selected: The incorrectly selected concept ID
+        """
+        if target == selected:
+            return
+
+        row = self._intern(target)
+        col = self._intern(selected)
+
+        start, end = self._csr_slice(row)
+        pos = start + int(np.searchsorted(self._indices[start:end], col))
+        if pos < end and self._indices[pos] == col:
+            current = float(self._data[pos])
+            self._data[pos] = min(1.0, current + self.alpha * (1 - current))
+            return
+
+        pending = self._pending.setdefault(row, {})
+        current = pending.get(col)
+        if current is None:
+            self._pending_count += 1
+            current = 0.0
+        pending[col] = min(1.0, current + self.alpha * (1 - current))
+
+        if self._pending_count >= self.compact_every:
+            self.compact()
+
+    def record_discrimination(self, target: str, selected: str) -> None:
+        """
+        Record a correct discrimination; decays every confusion of the target.
+
+        Args:
+            target: The correct concept ID
+            selected: The correctly selected concept ID
+        """
+        if target != selected:
+            return
+
+        row = self._index.get(target)
+        if row is None:
+            return
+
+        start, end = self._csr_slice(row)
+        if end > start:
+            self._data[start:end] *= 1 - self.beta
+
+        pending = self._pending.get(row)
+        if pending:
+            for col in pending:
+                pending[col] *= 1 - self.beta
+
+    def compact(self) -> None:
+        """Fold buffered entries into the CSR arrays and prune decayed ones."""
+        n_rows = len(self._ids)
+        csr_rows = np.repeat(
+            np.arange(len(self._indptr) - 1, dtype=np.int64), np.diff(self._indptr)
+        )
+
+        rows = [csr_rows]
+        cols = [self._indices.astype(np.int64)]
+        vals = [self._data]
+        for row, entries in self._pending.items():
+            rows.append(np.full(len(entries), row, dtype=np.int64))
+            cols.append(np.fromiter(entries.keys(), dtype=np.int64, count=len(entries)))
+            vals.append(np.fromiter(entries.values(), dtype=np.float64, count=len(entries)))
+
+        all_rows = np.concatenate(rows)
+        all_cols = np.concatenate(cols)
+        all_vals = np.concatenate(vals)
+
+        keep = all_vals >= PRUNE_EPSILON
+        all_rows, all_cols, all_vals = all_rows[keep], all_cols[keep], all_vals[keep]
+
+        order = np.lexsort((all_cols, all_rows))
+        all_rows = all_rows[order]
+
+        self._indices = all_cols[order].astype(np.int32)
+        self._data = all_vals[order].astype(np.float64)
+        self._indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(all_rows, minlength=n_rows), out=self._indptr[1:])
+
+        self._pending.clear()
+        self._pending_count = 0
+
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
+    def get_psi(self, target: str) -> float:
+        """
+        Pattern Separation Index: PSI_T = 1 - max(M_Tk for all k ≠ T).
+
+        Returns:
+            PSI value between 0 and 1 (1.0 when no confusion is recorded)
+        """
+        _, vals = self._row(target)
+        if len(vals) == 0:
+            return 1.0
+        return max(0.0, min(1.0, 1.0 - float(vals.max())))
+
+    def get_worst_pair(self, target: str) -> tuple[str, float] | None:
+        """
+        Find the concept most confused with the target.
+
+        Returns:
+            Tuple of (confusable_id, confusion_probability) or None
+        """
+        cols, vals = self._row(target)
+        if len(vals) == 0:
+            return None
+        best = int(vals.argmax())
+        return self._ids[int(cols[best])], float(vals[best])
+
+    def get_confusables(self, target: str, threshold: float = 0.3) -> list[str]:
+        """
+        Get all concepts that exceed confusion threshold with target.
+
+        Returns:
+            Confusable concept IDs, most confused first
+        """
+        cols, vals = self._row(target)
+        mask = vals >= threshold
+        cols, vals = cols[mask], vals[mask]
+        order = np.argsort(-vals, kind="stable")
+        return [self._ids[int(c)] for c in cols[order]]
+
+    def most_confused_pairs(self, k: int = 10) -> list[tuple[str, str, float]]:
+        """Global top-k (target, selected, probability) triples."""
+        if self._pending_count:
+            self.compact()
+        if len(self._data) == 0 or k <= 0:
+            return []
+
+        k = min(k, len(self._data))
+        top = np.argpartition(-self._data, k - 1)[:k]
+        top = top[np.argsort(-self._data[top], kind="stable")]
+        rows = np.searchsorted(self._indptr, top, side="right") - 1
+        return [
+            (self._ids[int(r)], self._ids[int(self._indices[i])], float(self._data[i]))
+            for r, i in zip(rows, top)
+        ]
+
+    def to_coo(self) -> tuple[list[str], np.ndarray, np.ndarray, np.ndarray]:
+        """Return (atom_ids, rows, cols, values) for export/analysis."""
+        if self._pending_count:
+            self.compact()
+        rows = np.repeat(np.arange(len(self._indptr) - 1), np.diff(self._indptr))
+        return self.atom_ids, rows, self._indices.copy(), self._data.copy()
+
+    # =========================================================================
+    # Persistence
+    # =========================================================================
+
+    @staticmethod
+    def _file_for(directory: Path, learner_id: str) -> Path:
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", learner_id) or "default"
+        return directory / f"{safe}.npz"
+
+    @property
+    def path(self) -> Path:
+        return self._file_for(self.directory, self.learner_id)
+
+    def save(self) -> Path:
+        """Write the store atomically to ``<directory>/<learner_id>.npz``."""
+        self.compact()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".npz")
+        os.close(fd)
+        try:
+            np.savez_compressed(
+                tmp,
+                ids=np.array(self._ids, dtype=str),
+                indptr=self._indptr,
+                indices=self._indices,
+                data=self._data,
+                params=np.array([self.alpha, self.beta]),
+            )
+            os.replace(tmp, self.path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+        logger.debug(f"ConfusionStore saved: {self.path} (nnz={len(self._data)})")
+        return self.path
+
+    @classmethod
+    def load(
+        cls,
+        learner_id: str = "default",
+        directory: Path | str = DEFAULT_CONFUSION_DIR,
+        **kwargs,
+    ) -> SparseConfusionStore:
+        """
+        Load a learner's store, or return an empty one if none is saved.
+
+        Stored alpha/beta are used unless overridden via kwargs.
+        """
+        directory = Path(directory)
+        path = cls._file_for(directory, learner_id)
+        if not path.exists():
+            return cls(learner_id=learner_id, directory=directory, **kwargs)
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                alpha, beta = (float(x) for x in data["params"])
+                kwargs.setdefault("alpha", alpha)
+                kwargs.setdefault("beta", beta)
+                store = cls(learner_id=learner_id, directory=directory, **kwargs)
+                store._ids = [str(x) for x in data["ids"]]
+                store._indptr = data["indptr"].astype(np.int64)
+                store._indices = data["indices"].astype(np.int32)
+                store._data = data["data"].astype(np.float64)
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"ConfusionStore: could not load {path}: {e}")
+            return cls(learner_id=learner_id, directory=directory, **kwargs)
+
+        store._index = {atom_id: i for i, atom_id in enumerate(store._ids)}
+        return store
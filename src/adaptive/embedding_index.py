@@ -0,0 +1,242 @@
+"""
+Contiguous Embedding Index.
+
+Keeps atom embeddings in one L2-normalized float32 matrix with an
+id <-> row mapping so similarity queries are matrix products instead of
+per-pair Python loops. Used by KnowledgeGraph (confusable neighbors,
+prerequisite inference, ps_index) and by the neuro_model lure search.
+
+Complexity (n atoms, d dimensions):
+- add: amortized O(d) (capacity doubles when full)
+- top_k: O(n * d) in blocks of ``block_size`` rows + O(n) argpartition
+- pairs_above: O(n^2 * d) in blocks of at most ~16M scores
+
+Scores are PSI values (cosine similarity clipped to [0, 1]), matching
+NeuroCognitiveModel.calculate_psi.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+
+import numpy as np
+
+from src.adaptive.neuro_model import normalize_embeddings
+
+DEFAULT_BLOCK_SIZE = 8192
+_INITIAL_CAPACITY = 64
+
+
+class EmbeddingIndex:
+    """
+    Row-major normalized embedding matrix with top-k similarity search.
+
+    Re-adding an existing id overwrites its row in place, so row order
+    always follows first insertion order.
+    """
+
+    def __init__(self, dim: int | None = None, block_size: int = DEFAULT_BLOCK_SIZE):
+        """
+        Initialize an empty index.
+
+        Args:
+            dim: Embedding dimension (inferred from the first vector if None)
+            block_size: Rows per matrix-product block in queries
+        """
+        self.dim = dim
+        self.block_size = block_size
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._matrix = np.zeros((0, dim or 0), dtype=np.float32)
+
+    @classmethod
+    def from_vectors(
+        cls,
+        ids: Sequence[str],
+        embeddings: Sequence[Sequence[float]] | np.ndarray,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> EmbeddingIndex:
+        """Build an index in one shot (single normalization pass)."""
+        matrix = normalize_embeddings(np.asarray(embeddings, dtype=np.float32))
+        return cls.from_normalized(ids, matrix, block_size=block_size)
+
+    @classmethod
+    def from_normalized(
+        cls,
+        ids: Sequence[str],
+        matrix: np.ndarray,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> EmbeddingIndex:
+        """
+        Wrap an already-normalized (n, dim) matrix without copying.
+
+        A read-only (e.g. memory-mapped) matrix is copied on the first add.
+        """
+        if len(ids) != len(matrix):
+            raise ValueError(f"{len(ids)} ids for {len(matrix)} embeddings")
+
+        index = cls(dim=matrix.shape[1], block_size=block_size)
+        for atom_id in ids:
+            if atom_id in index._rows:
+                raise ValueError(f"Duplicate id in embedding index: {atom_id}")
+            index._rows[atom_id] = len(index._ids)
+            index._ids.append(atom_id)
+        index._matrix = matrix
+        return index
+
+    # =========================================================================
+    # Maintenance
+    # =========================================================================
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, atom_id: object) -> bool:
+        return atom_id in self._rows
+
+    @property
+    def ids(self) -> list[str]:
+        return list(self._ids)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Normalized (n, dim) view over the populated rows."""
+        return self._matrix[: len(self._ids)]
+
+    def row_of(self, atom_id: str) -> int | None:
+        return self._rows.get(atom_id)
+
+    def id_at(self, row: int) -> str:
+        return self._ids[row]
+
+    def vector(self, atom_id: str) -> np.ndarray | None:
+        """Normalized embedding row for an id (a view, do not mutate)."""
+        row = self._rows.get(atom_id)
+        return None if row is None else self._matrix[row]
+
+    def add(self, atom_id: str, embedding: Sequence[float] | np.ndarray) -> int:
+        """
+        Insert or overwrite an embedding.
+
+        Returns:
+            Row index of the atom
+
+        Raises:
+            ValueError: If the embedding dimension does not match the index
+        """
+        vector = normalize_embeddings(np.asarray(embedding, dtype=np.float32))[0]
+        if self.dim is None:
+            self.dim = len(vector)
+            self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+        elif len(vector) != self.dim:
+            raise ValueError(
+                f"Embedding for {atom_id} has dimension {len(vector)}, index uses {self.dim}"
+            )
+
+        row = self._rows.get(atom_id)
+        if row is None:
+            row = len(self._ids)
+            if row >= len(self._matrix):
+                capacity = max(_INITIAL_CAPACITY, 2 * len(self._matrix))
+                grown = np.zeros((capacity, self.dim), dtype=np.float32)
+                grown[:row] = self._matrix[:row]
+                self._matrix = grown
+            self._ids.append(atom_id)
+            self._rows[atom_id] = row
+
+        if not self._matrix.flags.writeable:
+            self._matrix = np.array(self._matrix)
+        self._matrix[row] = vector
+        return row
+
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
+    def _query_vector(self, query: str | Sequence[float] | np.ndarray) -> np.ndarray | None:
+        if isinstance(query, str):
+            return self.vector(query)
+        vector = normalize_embeddings(np.asarray(query, dtype=np.float32))[0]
+        if self.dim is not None and len(vector) != self.dim:
+            raise ValueError(f"Query has dimension {len(vector)}, index uses {self.dim}")
+        return vector
+
+    def scores(self, query: str | Sequence[float] | np.ndarray) -> np.ndarray:
+        """PSI between the query and every row (length n)."""
+        vector = self._query_vector(query)
+        if vector is None or not self._ids:
+            return np.zeros(len(self._ids), dtype=np.float32)
+        out = np.empty(len(self._ids), dtype=np.float32)
+        matrix = self.matrix
+        for start in range(0, len(matrix), self.block_size):
+            block = matrix[start : start + self.block_size]
+            np.matmul(block, vector, out=out[start : start + len(block)])
+        return np.clip(out, 0.0, 1.0, out=out)
+
+    def top_k(
+        self,
+        query: str | Sequence[float] | np.ndarray,
+        k: int,
+        threshold: float | None = None,
+        exclude: Iterable[str] = (),
+        strict: bool = False,
+        within: Iterable[str] | None = None,
+    ) -> list[tuple[str, float]]:
+        """
+        Most similar rows to the query.
+
+        Args:
+            query: Atom id in the index, or a raw embedding
+            k: Maximum results
+            threshold: Minimum PSI (inclusive unless ``strict``)
+            exclude: Ids to skip (a string query always excludes itself)
+            strict: Use ``> threshold`` instead of ``>= threshold``
+            within: Only rank these ids (e.g. a candidate pool in a shared index)
+
+        Returns:
+            (atom_id, psi) pairs sorted by PSI descending
+        """
+        if k <= 0 or not self._ids:
+            return []
+        if isinstance(query, str) and query not in self._rows:
+            return []
+
+        scores = self.scores(query)
+        excluded = [self._rows[e] for e in exclude if e in self._rows]
+        if isinstance(query, str) and query in self._rows:
+            excluded.append(self._rows[query])
+        if excluded:
+            scores[excluded] = -1.0
+        if within is not None:
+            allowed = np.zeros(len(scores), dtype=bool)
+            allowed[[self._rows[i] for i in within if i in self._rows]] = True
+            scores[~allowed] = -1.0
+
+        if threshold is not None:
+            candidates = np.flatnonzero(scores > threshold if strict else scores >= threshold)
+        else:
+            candidates = np.flatnonzero(scores >= 0.0)
+        if len(candidates) > k:
+            top = np.argpartition(-scores[candidates], k - 1)[:k]
+            candidates = candidates[top]
+
+        order = np.argsort(-scores[candidates], kind="stable")
+        return [(self._ids[int(i)], float(scores[i])) for i in candidates[order]]
+
+    def pairs_above(self, threshold: float) -> Iterator[tuple[int, int, float]]:
+        """
+        Yield (row_i, row_j, psi) for every pair i < j with psi > threshold.
+
+        Pairs come out in row-major order (the order of a nested i < j loop).
+        """
+        matrix = self.matrix
+        n = len(matrix)
+        # Bound each block to ~16M scores regardless of corpus size
+        block_size = max(1, min(self.block_size, (1 << 24) // max(n, 1)))
+        for start in range(0, n, block_size):
+            block = np.clip(matrix[start : start + block_size] @ matrix[start:].T, 0.0, 1.0)
+            # Keep only the upper triangle (column j > row i)
+            block[np.tril_indices(len(block), m=block.shape[1])] = -1.0
+            r_idx, c_idx = np.nonzero(block > threshold)
+            for r, c in zip(r_idx.tolist(), c_idx.tolist()):
+                yield start + r, start + c, float(block[r, c])
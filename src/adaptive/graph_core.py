@@ -0,0 +1,439 @@
+"""
+Compact Knowledge Graph Core.
+
+Integer-indexed storage for the KnowledgeGraph topology:
+
+- Nodes are dense integer ids with ``__slots__`` records (atom id, concept).
+- Edges are kept per ConnectionType as CSR arrays (indptr, indices,
+  weights). Edits go to a small per-node delta and are folded into the CSR
+  arrays on the next read.
+- Prerequisite closures are memoized as Python int bitsets (bit n = node n).
+- The global topological order (prerequisites first) is cached and
+  invalidated whenever a prerequisite edge changes.
+- ``save``/``load`` write a snapshot directory of ``.npy`` files that are
+  memory-mapped on load, so startup does not rebuild edges or orderings.
+
+Edge direction follows AtomConnection: an edge ``u -> v`` of type
+PREREQUISITE means v is a prerequisite of u.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+SNAPSHOT_VERSION = 1
+
+
+class GraphNode:
+    """Node record: integer id, atom id, concept, and whether the atom is loaded."""
+
+    __slots__ = ("node_id", "atom_id", "concept_id", "present")
+
+    def __init__(
+        self,
+        node_id: int,
+        atom_id: str,
+        concept_id: str | None = None,
+        present: bool = False,
+    ):
+        self.node_id = node_id
+        self.atom_id = atom_id
+        self.concept_id = concept_id
+        self.present = present
+
+
+@dataclass(frozen=True)
+class CSRAdjacency:
+    """Out-edges for one connection type; row u is indices[indptr[u]:indptr[u + 1]]."""
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+
+    @classmethod
+    def empty(cls, n_nodes: int = 0) -> CSRAdjacency:
+        return cls(
+            indptr=np.zeros(n_nodes + 1, dtype=np.int64),
+            indices=np.empty(0, dtype=np.int32),
+            weights=np.empty(0, dtype=np.float32),
+        )
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.indptr) - 1
+
+    def row(self, node: int) -> np.ndarray:
+        if node >= self.n_rows:
+            return self.indices[:0]
+        return self.indices[self.indptr[node] : self.indptr[node + 1]]
+
+    def transpose(self, n_nodes: int) -> CSRAdjacency:
+        """Reverse every edge (in-edges become out-edges)."""
+        sources = np.repeat(np.arange(self.n_rows, dtype=np.int32), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind="stable")
+        indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=n_nodes), out=indptr[1:])
+        return CSRAdjacency(indptr, sources[order], self.weights[order])
+
+
+def bits_to_mask(bits: int, n_nodes: int) -> np.ndarray:
+    """Expand an int bitset into a boolean array of length n_nodes."""
+    raw = np.frombuffer(bits.to_bytes((n_nodes + 7) // 8 or 1, "little"), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder="little")[:n_nodes].astype(bool)
+
+
+class GraphCore:
+    """
+    Integer-id graph with CSR adjacency, closure bitsets and cached ordering.
+
+    ``prerequisite_type`` is the connection type used for closures and
+    topological order (ConnectionType.PREREQUISITE in KnowledgeGraph).
+    """
+
+    def __init__(self, prerequisite_type: str = "prerequisite"):
+        self.prerequisite_type = prerequisite_type
+        self._nodes: list[GraphNode] = []
+        self._ids: dict[str, int] = {}
+
+        # Per connection type: folded CSR + node -> replacement edge list
+        self._csr: dict[str, CSRAdjacency] = {}
+        self._delta: dict[str, dict[int, list[tuple[int, float]]]] = {}
+
+        self._closures: dict[int, int] = {}
+        self._topo_order: np.ndarray | None = None
+
+    # =========================================================================
+    # Nodes
+    # =========================================================================
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def node_id(self, atom_id: str) -> int | None:
+        return self._ids.get(atom_id)
+
+    def node(self, node_id: int) -> GraphNode:
+        return self._nodes[node_id]
+
+    def atom_id(self, node_id: int) -> str:
+        return self._nodes[node_id].atom_id
+
+    def intern(self, atom_id: str) -> int:
+        """Node id for an atom, creating a placeholder node if unseen."""
+        node_id = self._ids.get(atom_id)
+        if node_id is None:
+            node_id = len(self._nodes)
+            self._nodes.append(GraphNode(node_id, atom_id))
+            self._ids[atom_id] = node_id
+            self._topo_order = None
+        return node_id
+
+    def add_node(self, atom_id: str, concept_id: str | None = None) -> int:
+        """Register a loaded atom (placeholders created by edges become present)."""
+        node_id = self.intern(atom_id)
+        node = self._nodes[node_id]
+        if not node.present:
+            # Presence changes which closure members are reported
+            self._closures.clear()
+        node.present = True
+        node.concept_id = concept_id
+        return node_id
+
+    def present_mask(self) -> np.ndarray:
+        return np.fromiter((n.present for n in self._nodes), dtype=bool, count=len(self._nodes))
+
+    # =========================================================================
+    # Edges
+    # =========================================================================
+
+    def set_edges(
+        self,
+        node_id: int,
+        connection_type: str,
+        targets: Iterable[tuple[int, float]],
+    ) -> None:
+        """Replace all out-edges of one type for a node."""
+        edges = list(targets)
+        current = self._current_row(node_id, connection_type)
+        if current == edges:
+            return
+        self._delta.setdefault(connection_type, {})[node_id] = edges
+        self._invalidate(connection_type)
+
+    def add_edge(
+        self,
+        source: int,
+        target: int,
+        connection_type: str,
+        strength: float = 0.5,
+    ) -> None:
+        """Append a single out-edge."""
+        edges = self._current_row(source, connection_type)
+        edges.append((target, strength))
+        self._delta.setdefault(connection_type, {})[source] = edges
+        self._invalidate(connection_type)
+
+    def _current_row(self, node_id: int, connection_type: str) -> list[tuple[int, float]]:
+        delta = self._delta.get(connection_type, {})
+        if node_id in delta:
+            return list(delta[node_id])
+        csr = self._csr.get(connection_type)
+        if csr is None or node_id >= csr.n_rows:
+            return []
+        start, end = int(csr.indptr[node_id]), int(csr.indptr[node_id + 1])
+        return list(zip(csr.indices[start:end].tolist(), csr.weights[start:end].tolist()))
+
+    def _invalidate(self, connection_type: str) -> None:
+        if connection_type == self.prerequisite_type:
+            self._closures.clear()
+            self._topo_order = None
+
+    @property
+    def connection_types(self) -> list[str]:
+        return sorted(set(self._csr) | set(self._delta))
+
+    def csr(self, connection_type: str) -> CSRAdjacency:
+        """CSR adjacency for a connection type (folds pending edits first)."""
+        n = len(self._nodes)
+        csr = self._csr.get(connection_type) or CSRAdjacency.empty(0)
+        delta = self._delta.get(connection_type)
+
+        if not delta:
+            if csr.n_rows < n:
+                csr = self._pad(csr, n)
+                self._csr[connection_type] = csr
+            return csr
+
+        sources = np.repeat(np.arange(csr.n_rows, dtype=np.int64), np.diff(csr.indptr))
+        keep = ~np.isin(sources, np.fromiter(delta.keys(), dtype=np.int64, count=len(delta)))
+        new_src = [sources[keep]]
+        new_dst = [csr.indices[keep].astype(np.int64)]
+        new_w = [csr.weights[keep].astype(np.float32)]
+        for node_id, edges in delta.items():
+            if edges:
+                new_src.append(np.full(len(edges), node_id, dtype=np.int64))
+                new_dst.append(np.fromiter((t for t, _ in edges), dtype=np.int64))
+                new_w.append(np.fromiter((w for _, w in edges), dtype=np.float32))
+
+        all_src = np.concatenate(new_src)
+        order = np.argsort(all_src, kind="stable")
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(all_src, minlength=n), out=indptr[1:])
+        csr = CSRAdjacency(
+            indptr=indptr,
+            indices=np.concatenate(new_dst)[order].astype(np.int32),
+            weights=np.concatenate(new_w)[order],
+        )
+        self._csr[connection_type] = csr
+        self._delta[connection_type] = {}
+        return csr
+
+    @staticmethod
+    def _pad(csr: CSRAdjacency, n: int) -> CSRAdjacency:
+        tail = np.full(n - csr.n_rows, csr.indptr[-1], dtype=np.int64)
+        return CSRAdjacency(np.concatenate([csr.indptr, tail]), csr.indices, csr.weights)
+
+    def neighbors(self, node_id: int, connection_type: str) -> list[int]:
+        """Out-neighbors of a node for one connection type."""
+        delta = self._delta.get(connection_type, {})
+        if node_id in delta:
+            return [t for t, _ in delta[node_id]]
+        csr = self._csr.get(connection_type)
+        return [] if csr is None else csr.row(node_id).tolist()
+
+    # =========================================================================
+    # Prerequisite closure and ordering
+    # =========================================================================
+
+    def prerequisite_closure(self, node_id: int) -> int:
+        """
+        Bitset of the node and all transitive prerequisites (present nodes only).
+
+        Closures are memoized per node and shared across queries until a
+        prerequisite edge changes.
+        """
+        cached = self._closures.get(node_id)
+        if cached is not None:
+            return cached
+
+        csr = self.csr(self.prerequisite_type)
+        present = self._nodes
+
+        # Iterative post-order DFS; sub-closures are reused from the memo
+        on_stack: set[int] = set()
+        stack: list[tuple[int, bool]] = [(node_id, False)]
+        cyclic = False
+        while stack:
+            node, expanded = stack.pop()
+            if node in self._closures:
+                continue
+            if expanded:
+                on_stack.discard(node)
+                bits = 1 << node if present[node].present else 0
+                for prereq in csr.row(node).tolist():
+                    bits |= self._closures.get(prereq, 0)
+                self._closures[node] = bits
+                continue
+            if node in on_stack:
+                cyclic = True
+                continue
+            on_stack.add(node)
+            stack.append((node, True))
+            for prereq in csr.row(node).tolist():
+                if prereq not in self._closures:
+                    stack.append((prereq, False))
+
+        if cyclic:
+            # Memoized values on a cycle may be partial: recompute this one by BFS
+            self._closures.clear()
+            bits = self._closure_bfs(node_id, csr)
+            self._closures[node_id] = bits
+            return bits
+
+        return self._closures[node_id]
+
+    def _closure_bfs(self, node_id: int, csr: CSRAdjacency) -> int:
+        seen = {node_id}
+        queue = deque([node_id])
+        while queue:
+            for prereq in csr.row(queue.popleft()).tolist():
+                if prereq not in seen:
+                    seen.add(prereq)
+                    queue.append(prereq)
+        bits = 0
+        for node in seen:
+            if self._nodes[node].present:
+                bits |= 1 << node
+        return bits
+
+    def topological_order(self) -> np.ndarray:
+        """
+        Node ids with prerequisites first (Kahn's algorithm, cached).
+
+        Nodes on, or depending on, a prerequisite cycle are omitted.
+        """
+        if self._topo_order is not None:
+            return self._topo_order
+
+        n = len(self._nodes)
+        requires = self.csr(self.prerequisite_type)
+        unlocks = requires.transpose(n)
+        in_degree = np.diff(requires.indptr).astype(np.int64)
+
+        queue = deque(np.flatnonzero(in_degree == 0).tolist())
+        order: list[int] = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for dependent in unlocks.row(node).tolist():
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+
+        self._topo_order = np.asarray(order, dtype=np.int32)
+        return self._topo_order
+
+    def order_subset(self, mask: np.ndarray) -> list[int]:
+        """Topologically order the nodes selected by a boolean mask."""
+        if not mask.any():
+            return []
+        order = self.topological_order()
+        selected = order[mask[order]]
+        if len(selected) == int(mask.sum()):
+            return selected.tolist()
+        # Some members sit downstream of a cycle outside the subset
+        return self._kahn_subset(np.flatnonzero(mask).tolist())
+
+    def _kahn_subset(self, nodes: list[int]) -> list[int]:
+        members = set(nodes)
+        csr = self.csr(self.prerequisite_type)
+        in_degree = {node: 0 for node in nodes}
+        unlocks: dict[int, list[int]] = {node: [] for node in nodes}
+        for node in nodes:
+            for prereq in csr.row(node).tolist():
+                if prereq in members:
+                    unlocks[prereq].append(node)
+                    in_degree[node] += 1
+
+        queue = deque(node for node in nodes if in_degree[node] == 0)
+        result = []
+        while queue:
+            node = queue.popleft()
+            result.append(node)
+            for dependent in unlocks[node]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+        return result
+
+    def learning_path(self, target: int, mastered: Iterable[int] = ()) -> list[int]:
+        """Unmastered closure of target in prerequisite order."""
+        mask = bits_to_mask(self.prerequisite_closure(target), len(self._nodes))
+        mask[np.fromiter(mastered, dtype=np.int64)] = False
+        return self.order_subset(mask)
+
+    # =========================================================================
+    # Snapshot
+    # =========================================================================
+
+    def save(self, directory: Path | str) -> None:
+        """Write nodes, folded CSR arrays and topological order as .npy files."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        types = self.connection_types
+        for connection_type in types:
+            csr = self.csr(connection_type)
+            np.save(directory / f"{connection_type}.indptr.npy", csr.indptr)
+            np.save(directory / f"{connection_type}.indices.npy", csr.indices)
+            np.save(directory / f"{connection_type}.weights.npy", csr.weights)
+        np.save(directory / "topo_order.npy", self.topological_order())
+
+        manifest = {
+            "version": SNAPSHOT_VERSION,
+            "prerequisite_type": self.prerequisite_type,
+            "connection_types": types,
+            "atom_ids": [n.atom_id for n in self._nodes],
+            "concept_ids": [n.concept_id for n in self._nodes],
+            "present": [n.present for n in self._nodes],
+        }
+        (directory / "graph.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+    @classmethod
+    def load(cls, directory: Path | str, mmap: bool = True) -> GraphCore:
+        """
+        Load a snapshot written by ``save``.
+
+        Arrays are memory-mapped read-only when ``mmap`` is set; later edits
+        go to the delta and produce fresh in-memory arrays on fold.
+
+        Raises:
+            ValueError: If the snapshot version is not supported
+        """
+        directory = Path(directory)
+        manifest = json.loads((directory / "graph.json").read_text(encoding="utf-8"))
+        if manifest.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported graph snapshot version: {manifest.get('version')}")
+
+        mode = "r" if mmap else None
+        core = cls(prerequisite_type=manifest["prerequisite_type"])
+        for node_id, (atom_id, concept_id, present) in enumerate(
+            zip(manifest["atom_ids"], manifest["concept_ids"], manifest["present"])
+        ):
+            core._nodes.append(GraphNode(node_id, atom_id, concept_id, present))
+            core._ids[atom_id] = node_id
+
+        for connection_type in manifest["connection_types"]:
+            core._csr[connection_type] = CSRAdjacency(
+                indptr=np.load(directory / f"{connection_type}.indptr.npy", mmap_mode=mode),
+                indices=np.load(directory / f"{connection_type}.indices.npy", mmap_mode=mode),
+                weights=np.load(directory / f"{connection_type}.weights.npy", mmap_mode=mode),
+            )
+        core._topo_order = np.load(directory / "topo_order.npy", mmap_mode=mode)
+        return core
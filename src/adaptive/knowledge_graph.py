@@ -33,25 +33,36 @@ Version: 2.0.0 (Neuromorphic Architecture)
 
 from __future__ import annotations
 
-import math
-from collections.abc import Iterator
+import json
+import os
+import shutil
+from collections import deque
+from collections.abc import Iterator, MutableMapping
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from pathlib import Path
 from typing import Any
 from uuid import uuid4
 
 from loguru import logger
 
-# Try to import numpy for vector operations
+# Try to import numpy for vector operations and the CSR topology core
 try:
     import numpy as np
 
+    from src.adaptive.embedding_index import EmbeddingIndex
+    from src.adaptive.graph_core import GraphCore
+
     HAS_NUMPY = True
 except ImportError:
     HAS_NUMPY = False
 
 
+# Under the project's data/ directory, whatever the working directory
+DEFAULT_GRAPH_SNAPSHOT = Path(__file__).resolve().parent.parent.parent / "data" / "knowledge_graph"
+
+
 # =============================================================================
 # ENUMERATIONS
 # =============================================================================
@@ -293,6 +304,45 @@ class LearningAtom:
 # =============================================================================
 
 
+class _AtomTable(MutableMapping):
+    """
+    Atoms keyed by id, insertion-ordered.
+
+    Entries loaded from a snapshot stay as raw dicts and are converted to
+    LearningAtom on first access, so loading a large graph does not build
+    every atom object up front.
+    """
+
+    def __init__(self, records: dict[str, dict[str, Any]] | None = None):
+        self._entries: dict[str, LearningAtom | dict[str, Any]] = dict(records or {})
+
+    def __getitem__(self, atom_id: str) -> LearningAtom:
+        entry = self._entries[atom_id]
+        if isinstance(entry, dict):
+            entry = LearningAtom.from_dict(entry)
+            self._entries[atom_id] = entry
+        return entry
+
+    def __setitem__(self, atom_id: str, atom: LearningAtom) -> None:
+        self._entries[atom_id] = atom
+
+    def __delitem__(self, atom_id: str) -> None:
+        del self._entries[atom_id]
+
+    def __contains__(self, atom_id: object) -> bool:
+        return atom_id in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def records(self) -> list[dict[str, Any]]:
+        """Serializable dicts for every atom (untouched snapshot records as-is)."""
+        return [e if isinstance(e, dict) else e.to_dict() for e in self._entries.values()]
+
+
 class KnowledgeGraph:
     """
     Graph structure for Learning Atoms.
@@ -302,13 +352,26 @@ class KnowledgeGraph:
     - Prerequisite traversal
     - Confusable neighbor detection
     - Topological sorting for learning paths
+
+    Embeddings are mirrored into a contiguous normalized matrix
+    (EmbeddingIndex) as atoms are added, so similarity queries are
+    blocked matrix products with top-k selection.
+
+    Topology lives in a GraphCore (integer node ids, CSR adjacency per
+    ConnectionType, memoized prerequisite closures, cached topological
+    order). Change connections through add_atom / add_connection so the
+    core stays in sync; mutating ``atom.connections`` directly does not.
+    Without numpy there is no core and traversals walk ``atom.connections``.
     """
 
     def __init__(self):
         """Initialize empty knowledge graph."""
-        self._atoms: dict[str, LearningAtom] = {}
+        self._atoms = _AtomTable()
         self._by_concept: dict[str, list[str]] = {}  # concept_id -> atom_ids
-        self._adjacency: dict[str, list[str]] = {}  # atom_id -> connected atom_ids
+        self._core: GraphCore | None = (
+            GraphCore(prerequisite_type=ConnectionType.PREREQUISITE.value) if HAS_NUMPY else None
+        )
+        self._embeddings: EmbeddingIndex | None = EmbeddingIndex() if HAS_NUMPY else None
 
     def add_atom(self, atom: LearningAtom) -> None:
         """Add an atom to the graph."""
@@ -320,8 +383,52 @@ class KnowledgeGraph:
                 self._by_concept[atom.concept_id] = []
             self._by_concept[atom.concept_id].append(atom.id)
 
-        # Build adjacency list
-        self._adjacency[atom.id] = [c.target_id for c in atom.connections]
+        # Mirror connections into the CSR core (one edge list per type)
+        core = self._core
+        if core is None:
+            return  # No numpy: no core and no embedding index
+        node = core.add_node(atom.id, atom.concept_id)
+        edges: dict[str, list[tuple[int, float]]] = {t: [] for t in core.connection_types}
+        for c in atom.connections:
+            target = (core.intern(c.target_id), c.strength)
+            edges.setdefault(c.connection_type.value, []).append(target)
+        for connection_type, targets in edges.items():
+            core.set_edges(node, connection_type, targets)
+
+        # Mirror embedding into the contiguous similarity matrix
+        if self._embeddings is not None and atom.embedding:
+            try:
+                self._embeddings.add(atom.id, atom.embedding)
+            except ValueError as e:
+                logger.warning(f"Skipping embedding for atom {atom.id}: {e}")
+
+    def add_connection(self, atom_id: str, connection: AtomConnection) -> None:
+        """
+        Add a connection from an existing atom (e.g. an accepted inferred prerequisite).
+
+        Raises:
+            KeyError: If the source atom is not in the graph
+        """
+        atom = self._atoms[atom_id]
+        atom.connections.append(connection)
+        if self._core is None:
+            return
+        self._core.add_edge(
+            self._core.node_id(atom_id),
+            self._core.intern(connection.target_id),
+            connection.connection_type.value,
+            connection.strength,
+        )
+
+    @property
+    def core(self) -> GraphCore | None:
+        """Integer-id topology (CSR adjacency, closures, topological order); None without numpy."""
+        return self._core
+
+    @property
+    def embedding_index(self) -> EmbeddingIndex | None:
+        """Normalized embedding matrix for all atoms with embeddings."""
+        return self._embeddings
 
     def get_atom(self, atom_id: str) -> LearningAtom | None:
         """Get an atom by ID."""
@@ -376,13 +483,11 @@ class KnowledgeGraph:
                     if other.ps_index > threshold:
                         confusables.append((other, other.ps_index))
 
-        # 3. Embedding similarity (if available)
-        if atom.embedding and HAS_NUMPY:
-            for other_id, other in self._atoms.items():
-                if other_id != atom_id and other.embedding:
-                    sim = self._cosine_similarity(atom.embedding, other.embedding)
-                    if sim > threshold:
-                        confusables.append((other, sim))
+        # 3. Embedding similarity (if available); only the top 10 can survive
+        if self._embeddings is not None and atom_id in self._embeddings:
+            nearest = self._embeddings.top_k(atom_id, k=10, threshold=threshold, strict=True)
+            for other_id, sim in nearest:
+                confusables.append((self._atoms[other_id], sim))
 
         # Deduplicate and sort by similarity
         seen = set()
@@ -394,19 +499,6 @@ class KnowledgeGraph:
 
         return unique[:10]  # Top 10 confusables
 
-    def _cosine_similarity(self, v1: list[float], v2: list[float]) -> float:
-        """Calculate cosine similarity between two vectors."""
-        if not HAS_NUMPY:
-            # Fallback without numpy
-            dot = sum(a * b for a, b in zip(v1, v2))
-            norm1 = math.sqrt(sum(a * a for a in v1))
-            norm2 = math.sqrt(sum(b * b for b in v2))
-            return dot / (norm1 * norm2) if norm1 > 0 and norm2 > 0 else 0
-
-        a1 = np.array(v1)
-        a2 = np.array(v2)
-        return float(np.dot(a1, a2) / (np.linalg.norm(a1) * np.linalg.norm(a2)))
-
     def get_learning_path(
         self,
         target_atom_id: str,
@@ -430,6 +522,20 @@ class KnowledgeGraph:
         if target_atom_id not in self._atoms:
             return []
 
+        core = self._core
+        if core is None:
+            return self._learning_path_without_core(target_atom_id, mastered_atoms)
+        mastered = [n for n in map(core.node_id, mastered_atoms) if n is not None]
+        path = core.learning_path(core.node_id(target_atom_id), mastered)
+
+        return [self._atoms[core.atom_id(n)] for n in path]
+
+    def _learning_path_without_core(
+        self,
+        target_atom_id: str,
+        mastered_atoms: set[str],
+    ) -> list[LearningAtom]:
+        """get_learning_path over ``atom.connections`` (no numpy)."""
         # DFS to collect all prerequisites
         to_learn = set()
         visited = set()
@@ -451,13 +557,21 @@ class KnowledgeGraph:
 
         collect_prereqs(target_atom_id)
 
-        # Topological sort
         sorted_atoms = self._topological_sort(to_learn)
-
         return [self._atoms[aid] for aid in sorted_atoms if aid in self._atoms]
 
     def _topological_sort(self, atom_ids: set[str]) -> list[str]:
         """Topological sort of atoms by prerequisites."""
+        core = self._core
+        if core is None:
+            return self._topological_sort_without_core(atom_ids)
+        mask = np.zeros(len(core), dtype=bool)
+        nodes = [n for n in map(core.node_id, atom_ids) if n is not None]
+        mask[nodes] = True
+        return [core.atom_id(n) for n in core.order_subset(mask)]
+
+    def _topological_sort_without_core(self, atom_ids: set[str]) -> list[str]:
+        """Kahn's algorithm over ``atom.prerequisites`` (no numpy)."""
         in_degree = {aid: 0 for aid in atom_ids}
         graph = {aid: [] for aid in atom_ids}
 
@@ -470,15 +584,14 @@ class KnowledgeGraph:
                     graph[prereq_id].append(aid)
                     in_degree[aid] += 1
 
-        # Kahn's algorithm
-        queue = [aid for aid in atom_ids if in_degree[aid] == 0]
+        queue = deque(aid for aid in atom_ids if in_degree[aid] == 0)
         result = []
 
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             result.append(current)
 
-            for neighbor in graph.get(current, []):
+            for neighbor in graph[current]:
                 in_degree[neighbor] -= 1
                 if in_degree[neighbor] == 0:
                     queue.append(neighbor)
@@ -503,41 +616,39 @@ class KnowledgeGraph:
 
         inferred = []
 
-        # Get atoms with embeddings
-        atoms_with_embeddings = [a for a in self._atoms.values() if a.embedding is not None]
-
-        if len(atoms_with_embeddings) < 2:
+        index = self._embeddings
+        if index is None or len(index) < 2:
             return []
 
-        # Compare all pairs
-        for i, atom_a in enumerate(atoms_with_embeddings):
-            for atom_b in atoms_with_embeddings[i + 1 :]:
-                sim = self._cosine_similarity(atom_a.embedding, atom_b.embedding)
-
-                if sim > similarity_threshold:
-                    # Check if connection already exists
-                    existing_connections = {c.target_id for c in atom_a.connections}
-
-                    if atom_b.id not in existing_connections:
-                        # Determine direction based on atom type hierarchy
-                        if self._should_be_prerequisite(atom_a, atom_b):
-                            inferred.append(
-                                AtomConnection(
-                                    target_id=atom_a.id,
-                                    connection_type=ConnectionType.PREREQUISITE,
-                                    strength=sim,
-                                    inferred=True,
-                                )
-                            )
-                        elif self._should_be_prerequisite(atom_b, atom_a):
-                            inferred.append(
-                                AtomConnection(
-                                    target_id=atom_b.id,
-                                    connection_type=ConnectionType.PREREQUISITE,
-                                    strength=sim,
-                                    inferred=True,
-                                )
-                            )
+        # Pairs above threshold from blocked upper-triangle products
+        for row_a, row_b, sim in index.pairs_above(similarity_threshold):
+            atom_a = self._atoms[index.id_at(row_a)]
+            atom_b = self._atoms[index.id_at(row_b)]
+
+            # Check if connection already exists
+            existing_connections = {c.target_id for c in atom_a.connections}
+            if atom_b.id in existing_connections:
+                continue
+
+            # Determine direction based on atom type hierarchy
+            if self._should_be_prerequisite(atom_a, atom_b):
+                inferred.append(
+                    AtomConnection(
+                        target_id=atom_a.id,
+                        connection_type=ConnectionType.PREREQUISITE,
+                        strength=sim,
+                        inferred=True,
+                    )
+                )
+            elif self._should_be_prerequisite(atom_b, atom_a):
+                inferred.append(
+                    AtomConnection(
+                        target_id=atom_b.id,
+                        connection_type=ConnectionType.PREREQUISITE,
+                        strength=sim,
+                        inferred=True,
+                    )
+                )
 
         return inferred
 
@@ -576,17 +687,11 @@ class KnowledgeGraph:
 
         scores = []
 
-        # Factor 1: Embedding similarity
-        if atom.embedding:
-            similarities = []
-            for other_id, other in self._atoms.items():
-                if other_id != atom.id and other.embedding:
-                    sim = self._cosine_similarity(atom.embedding, other.embedding)
-                    if sim > 0.5:  # Only count meaningful similarities
-                        similarities.append(sim)
-
-            if similarities:
-                scores.append(max(similarities))
+        # Factor 1: Embedding similarity (only count meaningful similarities)
+        if self._embeddings is not None and atom.id in self._embeddings:
+            nearest = self._embeddings.top_k(atom.id, k=1, threshold=0.5, strict=True)
+            if nearest:
+                scores.append(nearest[0][1])
 
         # Factor 2: Concept crowding
         if atom.concept_id:
@@ -600,6 +705,83 @@ class KnowledgeGraph:
 
         return sum(scores) / len(scores) if scores else 0.5
 
+    # =========================================================================
+    # Snapshot
+    # =========================================================================
+
+    def save_snapshot(self, directory: Path | str = DEFAULT_GRAPH_SNAPSHOT) -> Path:
+        """
+        Persist the graph so later processes can load it without rebuilding.
+
+        Writes the GraphCore arrays, the normalized embedding matrix and the
+        atom records into a fresh directory, then swaps it into place.
+
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        if self._core is None:
+            raise ImportError("numpy is required for knowledge graph snapshots")
+        directory = Path(directory)
+        staging = directory.with_name(f"{directory.name}.tmp")
+        if staging.exists():
+            shutil.rmtree(staging)
+        staging.mkdir(parents=True)
+
+        self._core.save(staging)
+        (staging / "atoms.json").write_text(json.dumps(self._atoms.records()), encoding="utf-8")
+        if self._embeddings is not None and len(self._embeddings):
+            np.save(staging / "embeddings.npy", self._embeddings.matrix)
+            (staging / "embedding_ids.json").write_text(
+                json.dumps(self._embeddings.ids), encoding="utf-8"
+            )
+
+        if directory.exists():
+            retired = directory.with_name(f"{directory.name}.old")
+            if retired.exists():
+                shutil.rmtree(retired)
+            os.replace(directory, retired)
+            os.replace(staging, directory)
+            shutil.rmtree(retired)
+        else:
+            os.replace(staging, directory)
+
+        logger.info(f"Knowledge graph snapshot saved: {directory} ({len(self)} atoms)")
+        return directory
+
+    @classmethod
+    def load_snapshot(cls, directory: Path | str = DEFAULT_GRAPH_SNAPSHOT) -> KnowledgeGraph:
+        """
+        Load a snapshot written by save_snapshot.
+
+        Adjacency, topological order and embeddings are memory-mapped and
+        atom records are materialized on first access. ``atom.embedding``
+        is not restored; similarity queries use the embedding index.
+
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        if not HAS_NUMPY:
+            raise ImportError("numpy is required for knowledge graph snapshots")
+        directory = Path(directory)
+        graph = cls()
+        graph._core = GraphCore.load(directory)
+
+        records = json.loads((directory / "atoms.json").read_text(encoding="utf-8"))
+        graph._atoms = _AtomTable({data["id"]: data for data in records})
+        for data in records:
+            if data.get("concept_id"):
+                graph._by_concept.setdefault(data["concept_id"], []).append(data["id"])
+
+        embeddings_path = directory / "embeddings.npy"
+        if embeddings_path.exists():
+            ids = json.loads((directory / "embedding_ids.json").read_text(encoding="utf-8"))
+            graph._embeddings = EmbeddingIndex.from_normalized(
+                ids, np.load(embeddings_path, mmap_mode="r")
+            )
+
+        logger.debug(f"Knowledge graph snapshot loaded: {directory} ({len(graph)} atoms)")
+        return graph
+
     def __len__(self) -> int:
         """Return number of atoms in graph."""
         return len(self._atoms)
@@ -815,11 +997,23 @@ class AtomFactory:
 _graph: KnowledgeGraph | None = None
 
 
-def get_knowledge_graph() -> KnowledgeGraph:
-    """Get or create the global knowledge graph."""
+def get_knowledge_graph(snapshot_dir: Path | str | None = None) -> KnowledgeGraph:
+    """
+    Get or create the global knowledge graph.
+
+    On first use the graph is loaded from ``snapshot_dir`` (default
+    DEFAULT_GRAPH_SNAPSHOT) when a snapshot exists, instead of starting empty.
+    """
     global _graph
     if _graph is None:
-        _graph = KnowledgeGraph()
+        directory = Path(snapshot_dir or DEFAULT_GRAPH_SNAPSHOT)
+        if (directory / "graph.json").exists():
+            try:
+                _graph = KnowledgeGraph.load_snapshot(directory)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Could not load knowledge graph snapshot {directory}: {e}")
+        if _graph is None:
+            _graph = KnowledgeGraph()
     return _graph
 
 
@@ -10,6 +10,7 @@ Architecture:
 1. InteractionInterceptor - Captures raw telemetry
 2. FeatureExtractor - Normalizes behavioral signals
 3. ConfusionMatrix - Tracks PSI for pattern separation
+   (SparseConfusionStore for cross-session, per-learner persistence)
 4. FatigueVectorCalculator - Multi-dimensional fatigue tracking
 5. NeuroModelClassifier - Error classification
 6. RemediationSelector - Strategy dispatch
@@ -34,6 +35,7 @@ from typing import Any
 
 from loguru import logger
 
+from .confusion_store import SparseConfusionStore
 from .neuro_model import (
     CognitiveDiagnosis,
     FailMode,
@@ -795,9 +797,19 @@ class NCDEPipeline:
         confusion_beta: float = 0.1,
         fatigue_threshold: float = 0.7,
         psi_critical_threshold: float = 0.4,
+        confusion_store: SparseConfusionStore | None = None,
     ):
+        """
+        Args:
+            confusion_store: Persistent per-learner store to use instead of a
+                session-only ConfusionMatrix (same query API)
+        """
         self.feature_extractor = FeatureExtractor()
-        self.confusion_matrix = ConfusionMatrix(alpha=confusion_alpha, beta=confusion_beta)
+        self.confusion_matrix: ConfusionMatrix | SparseConfusionStore = (
+            confusion_store
+            if confusion_store is not None
+            else ConfusionMatrix(alpha=confusion_alpha, beta=confusion_beta)
+        )
         self.fatigue_calculator = FatigueVectorCalculator()
         self.remediation_selector = RemediationSelector(
             fatigue_threshold=fatigue_threshold,
@@ -944,6 +956,14 @@ class NCDEPipeline:
         self.feature_extractor.update_baseline(rt_history, dwell_history)
         self.fatigue_calculator.update_baseline(rt_history)
 
+    def persist_confusions(self) -> None:
+        """Save confusion history when backed by a SparseConfusionStore."""
+        if isinstance(self.confusion_matrix, SparseConfusionStore):
+            try:
+                self.confusion_matrix.save()
+            except OSError as e:
+                logger.warning(f"NCDE: Could not persist confusion store: {e}")
+
     def reset_fatigue(self) -> None:
         """
         Reset fatigue calculator after a micro-break.
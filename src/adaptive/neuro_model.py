@@ -40,6 +40,8 @@ from loguru import logger
 if TYPE_CHECKING:
     import numpy as np
 
+    from src.adaptive.embedding_index import EmbeddingIndex
+
 # =============================================================================
 # COGNITIVE STATE MACHINE
 # =============================================================================
@@ -1522,27 +1524,108 @@ class NeuroCognitiveModel:
 # =============================================================================
 
 
-def compute_psi_matrix(atoms: list[LearningAtomEmbed]) -> dict[tuple[str, str], float]:
+def normalize_embeddings(embeddings: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize embedding rows (float32); zero-norm rows stay zero.
+
+    With normalized rows, PSI for every pair is a single matrix product.
+    """
+    import numpy as np
+
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def vectorized_psi(
+    embeddings_a: np.ndarray,
+    embeddings_b: np.ndarray | None = None,
+    normalized: bool = False,
+) -> np.ndarray:
+    """
+    PSI (clipped cosine similarity) between every row of A and every row of B.
+
+    Vectorized equivalent of NeuroCognitiveModel.calculate_psi. Memory is
+    len(A) x len(B); use iter_psi_blocks for large corpora.
+
+    Args:
+        embeddings_a: (n, d) embedding matrix
+        embeddings_b: (m, d) embedding matrix (default: A)
+        normalized: Rows are already L2-normalized
+
+    Returns:
+        (n, m) float32 matrix of PSI scores in [0, 1]
+    """
+    import numpy as np
+
+    a = embeddings_a if normalized else normalize_embeddings(embeddings_a)
+    if embeddings_b is None:
+        b = a
+    else:
+        b = embeddings_b if normalized else normalize_embeddings(embeddings_b)
+    return np.clip(a @ b.T, 0.0, 1.0)
+
+
+def iter_psi_blocks(
+    embeddings: np.ndarray,
+    block_size: int = 2048,
+    normalized: bool = False,
+):
+    """
+    Yield (row_offset, psi_block) for the full PSI matrix in row blocks.
+
+    Keeps peak memory at block_size x n so precomputation scales to corpora
+    where the dense n x n matrix would not fit.
+    """
+    matrix = embeddings if normalized else normalize_embeddings(embeddings)
+    for start in range(0, len(matrix), block_size):
+        block = vectorized_psi(matrix[start : start + block_size], matrix, normalized=True)
+        yield start, block
+
+
+def compute_psi_matrix(
+    atoms: list[LearningAtomEmbed],
+    threshold: float | None = None,
+    block_size: int = 2048,
+) -> dict[tuple[str, str], float]:
     """
     Compute PSI (Pattern Separation Index) for all pairs of atoms.
 
     Returns a dict mapping (atom_id_1, atom_id_2) -> PSI score.
     Useful for precomputing confusability in a curriculum.
 
+    Scores are computed with blocked matrix products over the normalized
+    embedding matrix rather than one calculate_psi call per pair.
+
     Args:
         atoms: List of atoms with embeddings
+        threshold: Only keep pairs with PSI >= threshold (sparse output)
+        block_size: Rows per matrix-product block
 
     Returns:
-        Dict mapping atom ID pairs to PSI scores
+        Dict mapping atom ID pairs to PSI scores (both orderings)
     """
-    model = NeuroCognitiveModel()
-    psi_matrix = {}
+    import numpy as np
+
+    if len(atoms) < 2:
+        return {}
 
-    for i, atom_a in enumerate(atoms):
-        for atom_b in atoms[i + 1 :]:
-            psi = model.calculate_psi(atom_a, atom_b)
-            psi_matrix[(atom_a.id, atom_b.id)] = psi
-            psi_matrix[(atom_b.id, atom_a.id)] = psi  # Symmetric
+    ids = [atom.id for atom in atoms]
+    matrix = normalize_embeddings(np.array([atom.embedding for atom in atoms], dtype=np.float32))
+    psi_matrix: dict[tuple[str, str], float] = {}
+
+    for start, block in iter_psi_blocks(matrix, block_size=block_size, normalized=True):
+        rows = np.arange(start, start + len(block))
+        # Mask self-pairs
+        block[np.arange(len(block)), rows] = -1.0
+        if threshold is None:
+            r_idx, c_idx = np.nonzero(block >= 0.0)
+        else:
+            r_idx, c_idx = np.nonzero(block >= threshold)
+        for r, c in zip(r_idx.tolist(), c_idx.tolist()):
+            psi_matrix[(ids[start + r], ids[c])] = float(block[r, c])
 
     return psi_matrix
 
@@ -1552,6 +1635,7 @@ def find_confusable_neighbors(
     candidates: list[LearningAtomEmbed],
     threshold: float = 0.7,
     max_neighbors: int = 5,
+    index: EmbeddingIndex | None = None,
 ) -> list[tuple[LearningAtomEmbed, float]]:
     """
     Find atoms that are semantically close to the target (confusable).
@@ -1561,36 +1645,49 @@ def find_confusable_neighbors(
     2. Contrastive training pairs
     3. Pattern separation exercises
 
+    PSI against every candidate is one blocked matrix product followed by
+    top-k selection. Pass a prebuilt ``index`` over the candidates (e.g.
+    KnowledgeGraph.embedding_index) to skip rebuilding the matrix on each
+    call; interactive lure generation should always do so.
+
     Args:
         target: The atom to find neighbors for
         candidates: Pool of candidate atoms
         threshold: Minimum PSI to be considered confusable
         max_neighbors: Maximum neighbors to return
+        index: Optional EmbeddingIndex covering the candidate ids
 
     Returns:
         List of (atom, psi_score) tuples sorted by PSI descending
     """
-    model = NeuroCognitiveModel()
-    neighbors = []
-
-    for candidate in candidates:
-        if candidate.id == target.id:
-            continue
-
-        psi = model.calculate_psi(target, candidate)
-        if psi >= threshold:
-            neighbors.append((candidate, psi))
-
-    # Sort by PSI descending
-    neighbors.sort(key=lambda x: x[1], reverse=True)
-
-    return neighbors[:max_neighbors]
+    from src.adaptive.embedding_index import EmbeddingIndex
+
+    by_id = {c.id: c for c in candidates if c.id != target.id}
+    if not by_id or target.embedding is None or len(target.embedding) == 0:
+        return []
+
+    # A prebuilt index can hold ids outside the pool: rank only the pool
+    # instead of over-fetching past the others
+    within = None if index is None else by_id
+    if index is None:
+        pool = list(by_id.values())
+        index = EmbeddingIndex.from_vectors([c.id for c in pool], [c.embedding for c in pool])
+
+    hits = index.top_k(
+        target.embedding,
+        k=max_neighbors,
+        threshold=threshold,
+        exclude=(target.id,),
+        within=within,
+    )
+    return [(by_id[atom_id], psi) for atom_id, psi in hits]
 
 
 def generate_adversarial_lures(
     target: LearningAtomEmbed,
     candidates: list[LearningAtomEmbed],
     num_lures: int = 3,
+    index: EmbeddingIndex | None = None,
 ) -> list[LearningAtomEmbed]:
     """
     Generate adversarial lures for MCQ distractor generation.
@@ -1604,6 +1701,7 @@ def generate_adversarial_lures(
         target: The correct answer atom
         candidates: Pool of candidate lures
         num_lures: Number of lures to generate
+        index: Optional prebuilt EmbeddingIndex over the candidates
 
     Returns:
         List of adversarial lure atoms
@@ -1613,6 +1711,7 @@ def generate_adversarial_lures(
         candidates,
         threshold=0.6,  # Lower threshold for more options
         max_neighbors=num_lures * 2,  # Get extra for diversity
+        index=index,
     )
 
     # Take top N by PSI
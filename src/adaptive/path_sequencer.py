@@ -10,7 +10,6 @@ Determines optimal atom ordering based on:
 
 from __future__ import annotations
 
-from collections import defaultdict
 from uuid import UUID
 
 from loguru import logger
@@ -30,6 +29,7 @@ from src.adaptive.models import (
     LearningPath,
     UnlockStatus,
 )
+from src.core.interleaving import InterleaveEngine
 # Avoid importing database session at module import time to keep pure helpers testable
 # Lazy import inside _get_session to prevent failures when DB deps are unavailable in unit tests
 
@@ -576,23 +576,9 @@ class PathSequencer:
             logger.debug(f"Interleave query failed: {exc}")
             return atom_ids
 
-        # Group by type
-        by_type = defaultdict(list)
-        for atom_id in atom_ids:
-            kt = type_map.get(atom_id, "unknown")
-            by_type[kt].append(atom_id)
-
         # Interleave (round-robin through types)
-        interleaved = []
-        type_lists = list(by_type.values())
-
-        while any(type_lists):
-            for tl in type_lists:
-                if tl:
-                    interleaved.append(tl.pop(0))
-            type_lists = [tl for tl in type_lists if tl]
-
-        return interleaved
+        engine = InterleaveEngine(group_by=lambda atom_id: type_map.get(atom_id, "unknown"))
+        return engine.interleave(atom_ids)
 
     def _get_concept_info(
         self,
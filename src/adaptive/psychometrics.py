@@ -0,0 +1,762 @@
+"""
+Psychometric Calibration Engine.
+
+Computes the item statistics added to learning_atoms by migration 027
+(irt_difficulty, irt_discrimination, irt_guessing, p_value,
+discrimination_index, response_count, correct_count) from atom_responses.
+
+Pipeline:
+1. Stream atom_responses (server-side cursor) into a sparse learner x item
+   matrix of (attempts, correct) counts per cell.
+2. Classical Test Theory: p-value (proportion correct) and item-rest
+   point-biserial correlation, vectorized over cells with bincount.
+3. IRT 2PL/3PL via joint maximum likelihood with weak priors (JML/MAP):
+   alternating Fisher-scoring steps for learner ability (theta) and item
+   parameters, each a handful of array operations over all cells.
+4. Bulk write-back with BulkLoader.update.
+
+Repeated attempts by the same learner on the same item are modeled as
+binomial counts, so spaced-repetition history is used without inflating
+the number of learners.
+
+Incremental runs keep the matrix, parameters and a responded_at watermark
+in an ``.npz`` state file; only newer responses are read, and the fit is
+warm-started from the previous parameters.
+
+Model:
+    P_ij = c_j + (1 - c_j) * sigmoid(a_j * (theta_i - b_j))
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.db.bulk import BulkLoader
+
+# Under the project's data/ directory, whatever the working directory
+DEFAULT_STATE_PATH = (
+    Path(__file__).resolve().parent.parent.parent / "data" / "calibration" / "irt_state.npz"
+)
+
+# learning_atoms columns written by calibration
+CALIBRATION_COLUMNS = (
+    "irt_difficulty",
+    "irt_discrimination",
+    "irt_guessing",
+    "p_value",
+    "discrimination_index",
+    "response_count",
+    "correct_count",
+)
+
+# Items need this many attempts before IRT parameters are reported
+MIN_IRT_RESPONSES = 10
+
+# Parameter bounds (irt_difficulty has a CHECK between -3 and 3)
+THETA_BOUNDS = (-4.0, 4.0)
+DIFFICULTY_BOUNDS = (-3.0, 3.0)
+DISCRIMINATION_BOUNDS = (0.05, 4.0)
+GUESSING_BOUNDS = (0.0, 0.5)
+
+# Prior standard deviations (MAP regularization keeps JML finite for
+# perfect or zero scores)
+THETA_PRIOR_SD = 1.0
+DIFFICULTY_PRIOR_SD = 2.0
+LOG_DISCRIMINATION_PRIOR_SD = 0.5
+GUESSING_PRIOR_MEAN = 0.2
+GUESSING_PRIOR_SD = 0.1
+
+_EPS = 1e-9
+
+
+# =============================================================================
+# RESPONSE MATRIX
+# =============================================================================
+
+
+class ResponseMatrix:
+    """
+    Sparse learner x item matrix of (attempts, correct) counts.
+
+    Cells are stored COO-style (rows, cols, attempts, correct) sorted by
+    (row, col); new responses are buffered and folded in by ``compact``.
+    """
+
+    def __init__(self):
+        self.learner_ids: list[str] = []
+        self.item_ids: list[str] = []
+        self._learner_index: dict[str, int] = {}
+        self._item_index: dict[str, int] = {}
+
+        self.rows = np.empty(0, dtype=np.int32)
+        self.cols = np.empty(0, dtype=np.int32)
+        self.attempts = np.empty(0, dtype=np.int32)
+        self.correct = np.empty(0, dtype=np.int32)
+
+        self._pending: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+
+    @property
+    def n_learners(self) -> int:
+        return len(self.learner_ids)
+
+    @property
+    def n_items(self) -> int:
+        return len(self.item_ids)
+
+    @property
+    def n_cells(self) -> int:
+        self.compact()
+        return len(self.rows)
+
+    @property
+    def n_responses(self) -> int:
+        self.compact()
+        return int(self.attempts.sum())
+
+    def _intern(self, ids: list[str], index: dict[str, int], key: Any) -> int:
+        key = str(key)
+        idx = index.get(key)
+        if idx is None:
+            idx = len(ids)
+            ids.append(key)
+            index[key] = idx
+        return idx
+
+    def add_responses(
+        self,
+        learner_ids: Iterable[Any],
+        item_ids: Iterable[Any],
+        is_correct: Iterable[bool],
+    ) -> int:
+        """Buffer a chunk of individual responses; returns how many were added."""
+        rows = np.fromiter(
+            (self._intern(self.learner_ids, self._learner_index, x) for x in learner_ids),
+            dtype=np.int32,
+        )
+        cols = np.fromiter(
+            (self._intern(self.item_ids, self._item_index, x) for x in item_ids),
+            dtype=np.int32,
+        )
+        correct = np.fromiter((bool(x) for x in is_correct), dtype=np.int32)
+        if not (len(rows) == len(cols) == len(correct)):
+            raise ValueError("learner_ids, item_ids and is_correct must have equal length")
+        if len(rows):
+            self._pending.append((rows, cols, correct))
+        return len(rows)
+
+    def compact(self) -> None:
+        """Fold buffered responses into the (row, col)-sorted cell arrays."""
+        if not self._pending:
+            return
+
+        rows = np.concatenate([self.rows, *(p[0] for p in self._pending)]).astype(np.int64)
+        cols = np.concatenate([self.cols, *(p[1] for p in self._pending)]).astype(np.int64)
+        attempts = np.concatenate(
+            [self.attempts, *(np.ones(len(p[0]), dtype=np.int32) for p in self._pending)]
+        )
+        correct = np.concatenate([self.correct, *(p[2] for p in self._pending)])
+        self._pending.clear()
+
+        keys = (rows << 32) | cols
+        unique, inverse = np.unique(keys, return_inverse=True)
+        self.rows = (unique >> 32).astype(np.int32)
+        self.cols = (unique & 0xFFFFFFFF).astype(np.int32)
+        self.attempts = np.bincount(inverse, weights=attempts, minlength=len(unique)).astype(
+            np.int32
+        )
+        self.correct = np.bincount(inverse, weights=correct, minlength=len(unique)).astype(
+            np.int32
+        )
+
+
+# =============================================================================
+# CLASSICAL TEST THEORY
+# =============================================================================
+
+
+@dataclass
+class ClassicalStats:
+    """Per-item CTT statistics aligned with ResponseMatrix.item_ids."""
+
+    response_count: np.ndarray  # attempts per item
+    correct_count: np.ndarray
+    p_value: np.ndarray  # proportion correct (NaN if no responses)
+    point_biserial: np.ndarray  # item-rest correlation (NaN if undefined)
+
+
+def classical_item_stats(matrix: ResponseMatrix) -> ClassicalStats:
+    """
+    Compute p-values and item-rest point-biserial correlations.
+
+    Each learner's item score is their proportion correct on the item; the
+    criterion is their proportion correct on all other items, so the item
+    does not correlate with itself.
+    """
+    matrix.compact()
+    n_items, n_learners = matrix.n_items, matrix.n_learners
+    n = matrix.attempts.astype(np.float64)
+    k = matrix.correct.astype(np.float64)
+
+    response_count = np.bincount(matrix.cols, weights=n, minlength=n_items)
+    correct_count = np.bincount(matrix.cols, weights=k, minlength=n_items)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p_value = correct_count / response_count
+
+    learner_n = np.bincount(matrix.rows, weights=n, minlength=n_learners)
+    learner_k = np.bincount(matrix.rows, weights=k, minlength=n_learners)
+    rest_n = learner_n[matrix.rows] - n
+    valid = rest_n > 0
+
+    cols = matrix.cols[valid]
+    x = k[valid] / n[valid]
+    y = (learner_k[matrix.rows][valid] - k[valid]) / rest_n[valid]
+
+    def total(values: np.ndarray) -> np.ndarray:
+        return np.bincount(cols, weights=values, minlength=n_items)
+
+    m = total(np.ones_like(x))
+    sx, sy = total(x), total(y)
+    sxx, syy, sxy = total(x * x), total(y * y), total(x * y)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = m * sxy - sx * sy
+        var = (m * sxx - sx * sx) * (m * syy - sy * sy)
+        point_biserial = np.where((m >= 2) & (var > _EPS), cov / np.sqrt(var), np.nan)
+
+    return ClassicalStats(
+        response_count=response_count.astype(np.int64),
+        correct_count=correct_count.astype(np.int64),
+        p_value=p_value,
+        point_biserial=np.clip(point_biserial, -1.0, 1.0),
+    )
+
+
+# =============================================================================
+# ITEM RESPONSE THEORY
+# =============================================================================
+
+
+@dataclass
+class IRTParameters:
+    """Fitted parameters aligned with ResponseMatrix learner/item ids."""
+
+    model: str  # "2pl" or "3pl"
+    theta: np.ndarray  # learner ability
+    discrimination: np.ndarray  # a
+    difficulty: np.ndarray  # b
+    guessing: np.ndarray  # c (zeros for 2PL)
+    iterations: int = 0
+    converged: bool = False
+    log_likelihood: float = float("nan")
+
+    @classmethod
+    def initial(cls, matrix: ResponseMatrix, model: str = "2pl") -> IRTParameters:
+        """Start from logits of observed proportions (learners and items)."""
+        stats = classical_item_stats(matrix)
+        n = matrix.attempts.astype(np.float64)
+        k = matrix.correct.astype(np.float64)
+        learner_n = np.bincount(matrix.rows, weights=n, minlength=matrix.n_learners)
+        learner_k = np.bincount(matrix.rows, weights=k, minlength=matrix.n_learners)
+
+        theta = _logit((learner_k + 0.5) / (learner_n + 1.0))
+        theta = (theta - theta.mean()) / (theta.std() or 1.0)
+        p = (stats.correct_count + 0.5) / (stats.response_count + 1.0)
+        guessing = np.full(matrix.n_items, GUESSING_PRIOR_MEAN if model == "3pl" else 0.0)
+        return cls(
+            model=model,
+            theta=np.clip(theta, *THETA_BOUNDS),
+            discrimination=np.ones(matrix.n_items),
+            difficulty=np.clip(-_logit(p) / 1.7, *DIFFICULTY_BOUNDS),
+            guessing=guessing,
+        )
+
+    def extended_to(
+        self,
+        matrix: ResponseMatrix,
+        learner_ids: Sequence[str],
+        item_ids: Sequence[str],
+    ) -> IRTParameters:
+        """
+        Warm start for a matrix that may contain new learners/items.
+
+        Known ids keep their previous estimates; new ones start from the
+        observed-proportion initialization.
+        """
+        fresh = IRTParameters.initial(matrix, self.model)
+        learner_pos = {lid: i for i, lid in enumerate(learner_ids)}
+        item_pos = {iid: j for j, iid in enumerate(item_ids)}
+
+        for new_i, lid in enumerate(matrix.learner_ids):
+            old_i = learner_pos.get(lid)
+            if old_i is not None and old_i < len(self.theta):
+                fresh.theta[new_i] = self.theta[old_i]
+        for new_j, iid in enumerate(matrix.item_ids):
+            old_j = item_pos.get(iid)
+            if old_j is not None and old_j < len(self.difficulty):
+                fresh.discrimination[new_j] = self.discrimination[old_j]
+                fresh.difficulty[new_j] = self.difficulty[old_j]
+                if self.model == fresh.model == "3pl":
+                    fresh.guessing[new_j] = self.guessing[old_j]
+        return fresh
+
+
+def _logit(p: np.ndarray) -> np.ndarray:
+    p = np.clip(p, 1e-4, 1 - 1e-4)
+    return np.log(p / (1 - p))
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 0.5 * (1.0 + np.tanh(0.5 * z))
+
+
+def _cell_terms(
+    matrix: ResponseMatrix, params: IRTParameters
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Per-cell (P, s, dl/dP, n / (P(1-P)), theta_i - b_j)."""
+    a = params.discrimination[matrix.cols]
+    c = params.guessing[matrix.cols]
+    diff = params.theta[matrix.rows] - params.difficulty[matrix.cols]
+    s = _sigmoid(a * diff)
+    p = np.clip(c + (1 - c) * s, _EPS, 1 - _EPS)
+    n = matrix.attempts
+    k = matrix.correct
+    dl_dp = k / p - (n - k) / (1 - p)
+    info_weight = n / (p * (1 - p))
+    return p, s, dl_dp, info_weight, diff
+
+
+def log_likelihood(matrix: ResponseMatrix, params: IRTParameters) -> float:
+    """Binomial log-likelihood of the matrix under the parameters."""
+    p, *_ = _cell_terms(matrix, params)
+    k = matrix.correct
+    n = matrix.attempts
+    return float(np.sum(k * np.log(p) + (n - k) * np.log(1 - p)))
+
+
+def fit_irt(
+    matrix: ResponseMatrix,
+    model: str = "2pl",
+    init: IRTParameters | None = None,
+    max_iter: int = 100,
+    tol: float = 1e-3,
+    ll_tol: float = 1e-5,
+) -> IRTParameters:
+    """
+    Fit 2PL/3PL parameters by joint MAP estimation.
+
+    Each iteration takes one Fisher-scoring step for every learner's theta
+    and one for every item's (log a, b[, c]); all steps are bincount
+    reductions over the cell arrays, so an iteration is O(cells).
+
+    Args:
+        matrix: Response matrix
+        model: "2pl" or "3pl"
+        init: Warm-start parameters aligned with the matrix ids
+        max_iter: Maximum alternating iterations
+        tol: Stop when the largest parameter change is below this
+        ll_tol: Or when the relative log-likelihood gain is below this
+            (JML approaches its optimum slowly; the tail barely moves estimates)
+
+    Returns:
+        Fitted IRTParameters
+    """
+    if model not in ("2pl", "3pl"):
+        raise ValueError(f"Unknown IRT model: {model}")
+
+    matrix.compact()
+    params = init or IRTParameters.initial(matrix, model)
+    params.model = model
+    if model == "2pl":
+        params.guessing = np.zeros(matrix.n_items)
+    if matrix.n_cells == 0:
+        return params
+
+    rows, cols = matrix.rows, matrix.cols
+    n_l, n_i = matrix.n_learners, matrix.n_items
+    k, n = matrix.correct, matrix.attempts
+    previous_ll = None
+
+    for iteration in range(1, max_iter + 1):
+        # --- Learner step (theta) ---
+        p, s, dl_dp, w, diff = _cell_terms(matrix, params)
+        a = params.discrimination[cols]
+        c = params.guessing[cols]
+        dp_dtheta = (1 - c) * s * (1 - s) * a
+        grad = np.bincount(rows, weights=dl_dp * dp_dtheta, minlength=n_l)
+        info = np.bincount(rows, weights=w * dp_dtheta**2, minlength=n_l)
+        grad -= params.theta / THETA_PRIOR_SD**2
+        info += 1.0 / THETA_PRIOR_SD**2
+        theta_step = np.clip(grad / info, -1.0, 1.0)
+        params.theta = np.clip(params.theta + theta_step, *THETA_BOUNDS)
+
+        # --- Item step (log a, b, and c for 3PL) ---
+        p, s, dl_dp, w, diff = _cell_terms(matrix, params)
+        current_ll = float(np.sum(k * np.log(p) + (n - k) * np.log(1 - p)))
+        a = params.discrimination[cols]
+        c = params.guessing[cols]
+        slope = (1 - c) * s * (1 - s)
+
+        # Joint Newton step per item over (b, log a[, c]). The parameters are
+        # strongly correlated, so independent diagonal steps overshoot and
+        # oscillate (notably for 3PL); the per-item 2x2 / 3x3 Fisher systems
+        # are solved in one batched call.
+        log_a = np.log(params.discrimination)
+        derivs = [-slope * a, slope * diff * a]
+        centered = [params.difficulty, log_a]
+        prior_sd = [DIFFICULTY_PRIOR_SD, LOG_DISCRIMINATION_PRIOR_SD]
+        limits = [1.0, 0.5]
+        if model == "3pl":
+            derivs.append(1 - s)
+            centered.append(params.guessing - GUESSING_PRIOR_MEAN)
+            prior_sd.append(GUESSING_PRIOR_SD)
+            limits.append(0.1)
+
+        dim = len(derivs)
+        grad = np.empty((n_i, dim))
+        info = np.empty((n_i, dim, dim))
+        for r in range(dim):
+            grad[:, r] = np.bincount(cols, weights=dl_dp * derivs[r], minlength=n_i)
+            grad[:, r] -= centered[r] / prior_sd[r] ** 2
+            for q in range(r, dim):
+                info[:, r, q] = np.bincount(cols, weights=w * derivs[r] * derivs[q], minlength=n_i)
+                info[:, q, r] = info[:, r, q]
+            info[:, r, r] += 1.0 / prior_sd[r] ** 2
+        step = np.linalg.solve(info, grad[..., None])[..., 0]
+        step = np.clip(step, -np.asarray(limits), np.asarray(limits))
+
+        b_step, a_step = step[:, 0], step[:, 1]
+        params.difficulty = np.clip(params.difficulty + b_step, *DIFFICULTY_BOUNDS)
+        params.discrimination = np.clip(np.exp(log_a + a_step), *DISCRIMINATION_BOUNDS)
+        c_step = np.zeros(n_i)
+        if model == "3pl":
+            c_step = step[:, 2]
+            params.guessing = np.clip(params.guessing + c_step, *GUESSING_BOUNDS)
+
+        change = max(
+            float(np.abs(theta_step).max(initial=0.0)),
+            float(np.abs(b_step).max(initial=0.0)),
+            float(np.abs(a_step).max(initial=0.0)),
+            float(np.abs(c_step).max(initial=0.0)),
+        )
+        params.iterations = iteration
+        gain = None if previous_ll is None else (current_ll - previous_ll) / abs(previous_ll)
+        previous_ll = current_ll
+        if change < tol or (gain is not None and 0 <= gain < ll_tol):
+            params.converged = True
+            break
+
+    params.log_likelihood = log_likelihood(matrix, params)
+    return params
+
+
+# =============================================================================
+# CALIBRATION JOB
+# =============================================================================
+
+
+@dataclass
+class CalibrationResult:
+    """Summary of one calibration run."""
+
+    responses_read: int = 0
+    total_responses: int = 0
+    learners: int = 0
+    items: int = 0
+    items_calibrated: int = 0
+    rows_updated: int = 0
+    iterations: int = 0
+    converged: bool = False
+    log_likelihood: float = float("nan")
+    warm_start: bool = False
+    duration_seconds: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "responses_read": self.responses_read,
+            "total_responses": self.total_responses,
+            "learners": self.learners,
+            "items": self.items,
+            "items_calibrated": self.items_calibrated,
+            "rows_updated": self.rows_updated,
+            "iterations": self.iterations,
+            "converged": self.converged,
+            "log_likelihood": self.log_likelihood,
+            "warm_start": self.warm_start,
+            "duration_seconds": self.duration_seconds,
+            "errors": self.errors,
+        }
+
+
+class PsychometricCalibrator:
+    """
+    Nightly IRT/CTT calibration over atom_responses.
+
+    Example:
+        with session_scope() as session:
+            result = PsychometricCalibrator(session).run()
+
+    The calibrator writes through the caller's session and never commits.
+    """
+
+    RESPONSES_SQL = """
+        SELECT user_id, atom_id, is_correct, responded_at
+        FROM atom_responses
+        WHERE responded_at IS NOT NULL {since_filter}
+        ORDER BY responded_at
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        model: str = "2pl",
+        state_path: Path | str | None = DEFAULT_STATE_PATH,
+        chunk_size: int = 50_000,
+        min_irt_responses: int = MIN_IRT_RESPONSES,
+    ):
+        """
+        Initialize calibrator.
+
+        Args:
+            session: SQLAlchemy session (transaction owned by caller)
+            model: "2pl" or "3pl" (3PL estimates a guessing floor for MCQ-heavy pools)
+            state_path: Incremental state file (None disables warm starts)
+            chunk_size: Rows fetched per server-side cursor batch
+            min_irt_responses: Attempts required before IRT params are written
+        """
+        self.session = session
+        self.model = model
+        self.state_path = Path(state_path) if state_path else None
+        self.chunk_size = chunk_size
+        self.min_irt_responses = min_irt_responses
+
+    def run(self, full: bool = False, dry_run: bool = False) -> CalibrationResult:
+        """
+        Read new responses, refit, and write item statistics back.
+
+        Args:
+            full: Ignore saved state and recalibrate from all responses
+            dry_run: Fit but do not write to the database or state file
+        """
+        started = time.perf_counter()
+        result = CalibrationResult()
+
+        state = None if full else self._load_state()
+        matrix = state["matrix"] if state else ResponseMatrix()
+        since = state["watermark"] if state else None
+
+        result.responses_read, watermark = self.stream_responses(matrix, since)
+        watermark = watermark or since
+        result.total_responses = matrix.n_responses
+        result.learners = matrix.n_learners
+        result.items = matrix.n_items
+
+        if matrix.n_cells == 0:
+            result.duration_seconds = time.perf_counter() - started
+            return result
+
+        init = None
+        if state and state["params"] is not None and state["params"].model == self.model:
+            init = state["params"].extended_to(
+                matrix, state["learner_ids"], state["item_ids"]
+            )
+            result.warm_start = True
+
+        params = fit_irt(matrix, model=self.model, init=init, max_iter=30 if init else 100)
+        stats = classical_item_stats(matrix)
+
+        result.iterations = params.iterations
+        result.converged = params.converged
+        result.log_likelihood = params.log_likelihood
+
+        rows = self.build_rows(matrix, params, stats)
+        result.items_calibrated = sum(1 for r in rows if r["irt_difficulty"] is not None)
+
+        if not dry_run:
+            # Skip atoms whose statistics did not change, so a nightly run
+            # leaves them (and their updated_at) alone
+            changed = " OR ".join(
+                f"learning_atoms.{c} IS DISTINCT FROM s.{c}" for c in CALIBRATION_COLUMNS
+            )
+            update = BulkLoader(self.session).update(
+                "learning_atoms", rows, key_columns=["id"], update_where=changed
+            )
+            result.rows_updated = update.updated
+            self._save_state(matrix, params, watermark)
+
+        result.duration_seconds = time.perf_counter() - started
+        logger.info(
+            "Calibration ({}): {} new / {} total responses, {} items ({} calibrated), "
+            "{} iterations, converged={} in {:.2f}s",
+            self.model,
+            result.responses_read,
+            result.total_responses,
+            result.items,
+            result.items_calibrated,
+            result.iterations,
+            result.converged,
+            result.duration_seconds,
+        )
+        return result
+
+    def stream_responses(
+        self, matrix: ResponseMatrix, since: datetime | None = None
+    ) -> tuple[int, datetime | None]:
+        """
+        Stream responses newer than ``since`` into the matrix.
+
+        Returns:
+            (responses added, latest responded_at seen)
+        """
+        conn = self.session.connection().execution_options(
+            stream_results=True, yield_per=self.chunk_size
+        )
+        if since is None:
+            sql, params = self.RESPONSES_SQL.format(since_filter=""), {}
+        else:
+            sql = self.RESPONSES_SQL.format(since_filter="AND responded_at > :since")
+            params = {"since": since}
+        result = conn.execute(text(sql), params)
+
+        added = 0
+        latest = None
+        for chunk in result.partitions(self.chunk_size):
+            learners, items, correct, responded = zip(*chunk)
+            added += matrix.add_responses(learners, items, correct)
+            latest = _as_datetime(responded[-1])
+        matrix.compact()
+        return added, latest
+
+    def build_rows(
+        self,
+        matrix: ResponseMatrix,
+        params: IRTParameters,
+        stats: ClassicalStats,
+    ) -> list[dict[str, Any]]:
+        """learning_atoms update rows; sparse items get CTT stats only."""
+        enough = stats.response_count >= self.min_irt_responses
+        rows = []
+        for j, item_id in enumerate(matrix.item_ids):
+            calibrated = bool(enough[j])
+            rows.append(
+                {
+                    "id": item_id,
+                    "irt_difficulty": _rounded(params.difficulty[j], 3) if calibrated else None,
+                    "irt_discrimination": (
+                        _rounded(params.discrimination[j], 3) if calibrated else None
+                    ),
+                    "irt_guessing": (
+                        _rounded(params.guessing[j], 3)
+                        if calibrated and params.model == "3pl"
+                        else None
+                    ),
+                    "p_value": _rounded(stats.p_value[j], 4),
+                    "discrimination_index": _rounded(stats.point_biserial[j], 4),
+                    "response_count": int(stats.response_count[j]),
+                    "correct_count": int(stats.correct_count[j]),
+                }
+            )
+        return rows
+
+    # =========================================================================
+    # State
+    # =========================================================================
+
+    def _load_state(self) -> dict[str, Any] | None:
+        if self.state_path is None or not self.state_path.exists():
+            return None
+        try:
+            with np.load(self.state_path, allow_pickle=False) as data:
+                matrix = ResponseMatrix()
+                matrix.learner_ids = [str(x) for x in data["learner_ids"]]
+                matrix.item_ids = [str(x) for x in data["item_ids"]]
+                matrix._learner_index = {x: i for i, x in enumerate(matrix.learner_ids)}
+                matrix._item_index = {x: i for i, x in enumerate(matrix.item_ids)}
+                matrix.rows = data["rows"].astype(np.int32)
+                matrix.cols = data["cols"].astype(np.int32)
+                matrix.attempts = data["attempts"].astype(np.int32)
+                matrix.correct = data["correct"].astype(np.int32)
+
+                watermark = str(data["watermark"])
+                params = IRTParameters(
+                    model=str(data["model"]),
+                    theta=data["theta"].astype(np.float64),
+                    discrimination=data["discrimination"].astype(np.float64),
+                    difficulty=data["difficulty"].astype(np.float64),
+                    guessing=data["guessing"].astype(np.float64),
+                )
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Calibration state unreadable, recalibrating from scratch: {e}")
+            return None
+
+        return {
+            "matrix": matrix,
+            "params": params,
+            "learner_ids": list(matrix.learner_ids),
+            "item_ids": list(matrix.item_ids),
+            "watermark": datetime.fromisoformat(watermark) if watermark else None,
+        }
+
+    def _save_state(
+        self,
+        matrix: ResponseMatrix,
+        params: IRTParameters,
+        watermark: datetime | None,
+    ) -> None:
+        if self.state_path is None:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.state_path.parent, suffix=".npz")
+        os.close(fd)
+        try:
+            np.savez_compressed(
+                tmp,
+                learner_ids=np.array(matrix.learner_ids, dtype=str),
+                item_ids=np.array(matrix.item_ids, dtype=str),
+                rows=matrix.rows,
+                cols=matrix.cols,
+                attempts=matrix.attempts,
+                correct=matrix.correct,
+                model=np.array(params.model),
+                theta=params.theta,
+                discrimination=params.discrimination,
+                difficulty=params.difficulty,
+                guessing=params.guessing,
+                watermark=np.array(watermark.isoformat() if watermark else ""),
+            )
+            os.replace(tmp, self.state_path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+
+def _as_datetime(value: datetime | str) -> datetime:
+    """responded_at as datetime (SQLite returns ISO strings)."""
+    return value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+
+
+def _rounded(value: float, digits: int) -> float | None:
+    return None if not np.isfinite(value) else round(float(value), digits)
+
+
+def difficulty_to_unit(irt_difficulty: float | None, default: float = 0.5) -> float:
+    """
+    Map an IRT b-parameter (-3..3) onto the 0-1 difficulty scale used by selectors.
+
+    Linear, so b = 0 (average item) maps to 0.5.
+    """
+    if irt_difficulty is None:
+        return default
+    low, high = DIFFICULTY_BOUNDS
+    return min(1.0, max(0.0, (float(irt_difficulty) - low) / (high - low)))
@@ -4,6 +4,7 @@ Anki import service for notion-learning-sync.
 Orchestrates the import of existing Anki decks into PostgreSQL staging tables.
 Performs:
 - Bulk card import via AnkiConnect
+- COPY-based bulk merge into stg_anki_cards
 - Prerequisite tag parsing
 - Basic quality analysis (word/char counts)
 - FSRS stat extraction
@@ -17,12 +18,12 @@ from datetime import datetime
 from typing import Any
 
 from loguru import logger
-from psycopg2.extras import Json
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from config import get_settings
 from src.anki.anki_client import AnkiClient
+from src.db.bulk import BulkLoader, BulkLoadResult
 from src.db.database import get_db
 
 
@@ -34,7 +35,7 @@ class AnkiImportService:
     1. Fetch all cards from Anki via AnkiConnect
     2. Parse prerequisite tags (tag:prereq:domain:topic:subtopic)
     3. Calculate word/char counts for quality analysis
-    4. Insert into stg_anki_cards
+    4. Bulk merge into stg_anki_cards (COPY + one upsert)
     5. Log import statistics
     """
 
@@ -87,6 +88,7 @@ class AnkiImportService:
                 - cards_with_prerequisites: Cards with prerequisite tags
                 - cards_needing_split: Non-atomic cards
                 - grade_distribution: Quality grade counts
+                - rows_inserted/rows_updated/rows_skipped: Bulk merge outcome
                 - errors: List of error messages
         """
         deck = deck_name or self.settings.anki_deck_name
@@ -151,15 +153,17 @@ class AnkiImportService:
             "errors": [],
         }
 
+        staging_rows: list[dict[str, Any]] = []
+
         for card in cards:
             try:
                 # Add quality analysis if requested
                 if quality_analysis:
                     card = self._add_quality_metrics(card)
 
-                # Insert into staging table (unless dry run)
+                # Collect for the bulk merge below (unless dry run)
                 if not dry_run:
-                    self._insert_staging_card(card)
+                    staging_rows.append(self._build_staging_row(card))
 
                 # Update statistics
                 stats["cards_imported"] += 1
@@ -182,9 +186,13 @@ class AnkiImportService:
                 logger.error(error_msg)
                 stats["errors"].append(error_msg)
 
-        # Commit transaction
+        # Bulk merge + commit transaction
         if not dry_run:
             try:
+                load_result = self._bulk_insert_staging_cards(staging_rows)
+                stats["rows_inserted"] = load_result.inserted
+                stats["rows_updated"] = load_result.updated
+                stats["rows_skipped"] = load_result.skipped
                 self.db_session.commit()
                 logger.info("Committed {} cards to database", stats["cards_imported"])
             except Exception as exc:
@@ -340,12 +348,29 @@ class AnkiImportService:
     # Database Methods
     # ========================================
 
-    def _insert_staging_card(self, card: dict[str, Any]) -> None:
+    # Columns refreshed when a note is re-imported (anki_note_id conflict)
+    STAGING_UPDATE_COLUMNS = (
+        "front",
+        "back",
+        "tags",
+        "fsrs_stability_days",
+        "fsrs_difficulty",
+        "interval_days",
+        "review_count",
+        "quality_grade",
+        "needs_split",
+        "imported_at",
+    )
+
+    def _build_staging_row(self, card: dict[str, Any]) -> dict[str, Any]:
         """
-        Insert card into stg_anki_cards table.
+        Map a card to a stg_anki_cards row.
 
         Args:
             card: Card dictionary from AnkiClient
+
+        Returns:
+            Column -> value dict (JSONB columns hold plain dicts/lists)
         """
         # Extract FSRS stats if present
         fsrs_stats = card.get("fsrs_stats", {})
@@ -353,133 +378,62 @@ class AnkiImportService:
         # Extract prerequisite data
         prerequisites = card.get("prerequisites", {})
 
-        # Build insert statement
-        insert_sql = text("""
-            INSERT INTO stg_anki_cards (
-                anki_note_id,
-                anki_card_id,
-                card_id,
-                front,
-                back,
-                deck_name,
-                note_type,
-                tags,
-                raw_tags_json,
-                has_prerequisites,
-                prerequisite_tags,
-                prerequisite_hierarchy,
-                fsrs_stability_days,
-                fsrs_difficulty,
-                fsrs_retrievability,
-                interval_days,
-                ease_factor,
-                review_count,
-                lapses,
-                last_review,
-                due_date,
-                queue,
-                card_type,
-                correct_count,
-                accuracy_percent,
-                quality_grade,
-                front_word_count,
-                back_word_count,
-                front_char_count,
-                back_char_count,
-                needs_split,
-                raw_anki_data,
-                import_batch_id,
-                imported_at
-            ) VALUES (
-                :anki_note_id,
-                :anki_card_id,
-                :card_id,
-                :front,
-                :back,
-                :deck_name,
-                :note_type,
-                :tags,
-                :raw_tags_json,
-                :has_prerequisites,
-                :prerequisite_tags,
-                :prerequisite_hierarchy,
-                :fsrs_stability_days,
-                :fsrs_difficulty,
-                :fsrs_retrievability,
-                :interval_days,
-                :ease_factor,
-                :review_count,
-                :lapses,
-                :last_review,
-                :due_date,
-                :queue,
-                :card_type,
-                :correct_count,
-                :accuracy_percent,
-                :quality_grade,
-                :front_word_count,
-                :back_word_count,
-                :front_char_count,
-                :back_char_count,
-                :needs_split,
-                :raw_anki_data,
-                :import_batch_id,
-                :imported_at
-            )
-            ON CONFLICT (anki_note_id) DO UPDATE SET
-                front = EXCLUDED.front,
-                back = EXCLUDED.back,
-                tags = EXCLUDED.tags,
-                fsrs_stability_days = EXCLUDED.fsrs_stability_days,
-                fsrs_difficulty = EXCLUDED.fsrs_difficulty,
-                interval_days = EXCLUDED.interval_days,
-                review_count = EXCLUDED.review_count,
-                quality_grade = EXCLUDED.quality_grade,
-                needs_split = EXCLUDED.needs_split,
-                imported_at = EXCLUDED.imported_at
-        """)
+        return {
+            "anki_note_id": int(card.get("anki_note_id", 0)),
+            "anki_card_id": int(card.get("anki_card_id", 0))
+            if card.get("anki_card_id")
+            else None,
+            "card_id": card.get("card_id"),
+            "front": card.get("front"),
+            "back": card.get("back"),
+            "deck_name": card.get("deck_name"),
+            "note_type": card.get("note_type"),
+            "tags": card.get("tags", []),
+            "raw_tags_json": card.get("tags", []),
+            "has_prerequisites": prerequisites.get("has_prerequisites", False),
+            "prerequisite_tags": prerequisites.get("prerequisite_tags", []),
+            "prerequisite_hierarchy": prerequisites.get("parsed_hierarchy", []),
+            "fsrs_stability_days": fsrs_stats.get("fsrs_stability_days"),
+            "fsrs_difficulty": fsrs_stats.get("fsrs_difficulty"),
+            "fsrs_retrievability": fsrs_stats.get("fsrs_retrievability"),
+            "interval_days": fsrs_stats.get("interval_days"),
+            "ease_factor": fsrs_stats.get("ease_factor"),
+            "review_count": fsrs_stats.get("review_count", 0),
+            "lapses": fsrs_stats.get("lapses", 0),
+            "last_review": fsrs_stats.get("last_review"),
+            "due_date": fsrs_stats.get("due_date"),
+            "queue": fsrs_stats.get("queue"),
+            "card_type": fsrs_stats.get("card_type"),
+            "correct_count": fsrs_stats.get("correct_count"),
+            "accuracy_percent": fsrs_stats.get("accuracy_percent"),
+            "quality_grade": card.get("quality_grade"),
+            "front_word_count": card.get("front_word_count"),
+            "back_word_count": card.get("back_word_count"),
+            "front_char_count": card.get("front_char_count"),
+            "back_char_count": card.get("back_char_count"),
+            "needs_split": card.get("needs_split", False),
+            "raw_anki_data": card,
+            "import_batch_id": self.import_batch_id,
+            "imported_at": datetime.utcnow(),
+        }
 
-        # Execute insert
-        self.db_session.execute(
-            insert_sql,
-            {
-                "anki_note_id": int(card.get("anki_note_id", 0)),
-                "anki_card_id": int(card.get("anki_card_id", 0))
-                if card.get("anki_card_id")
-                else None,
-                "card_id": card.get("card_id"),
-                "front": card.get("front"),
-                "back": card.get("back"),
-                "deck_name": card.get("deck_name"),
-                "note_type": card.get("note_type"),
-                "tags": card.get("tags", []),
-                "raw_tags_json": Json(card.get("tags", [])),  # JSONB
-                "has_prerequisites": prerequisites.get("has_prerequisites", False),
-                "prerequisite_tags": prerequisites.get("prerequisite_tags", []),
-                "prerequisite_hierarchy": Json(prerequisites.get("parsed_hierarchy", [])),  # JSONB
-                "fsrs_stability_days": fsrs_stats.get("fsrs_stability_days"),
-                "fsrs_difficulty": fsrs_stats.get("fsrs_difficulty"),
-                "fsrs_retrievability": fsrs_stats.get("fsrs_retrievability"),
-                "interval_days": fsrs_stats.get("interval_days"),
-                "ease_factor": fsrs_stats.get("ease_factor"),
-                "review_count": fsrs_stats.get("review_count", 0),
-                "lapses": fsrs_stats.get("lapses", 0),
-                "last_review": fsrs_stats.get("last_review"),
-                "due_date": fsrs_stats.get("due_date"),
-                "queue": fsrs_stats.get("queue"),
-                "card_type": fsrs_stats.get("card_type"),
-                "correct_count": fsrs_stats.get("correct_count"),
-                "accuracy_percent": fsrs_stats.get("accuracy_percent"),
-                "quality_grade": card.get("quality_grade"),
-                "front_word_count": card.get("front_word_count"),
-                "back_word_count": card.get("back_word_count"),
-                "front_char_count": card.get("front_char_count"),
-                "back_char_count": card.get("back_char_count"),
-                "needs_split": card.get("needs_split", False),
-                "raw_anki_data": Json(card),  # Wrap dict for PostgreSQL JSONB
-                "import_batch_id": self.import_batch_id,
-                "imported_at": datetime.utcnow(),
-            },
+    def _bulk_insert_staging_cards(self, rows: list[dict[str, Any]]) -> BulkLoadResult:
+        """
+        Merge staged rows into stg_anki_cards in one COPY + upsert.
+
+        Args:
+            rows: Rows from _build_staging_row
+
+        Returns:
+            BulkLoadResult with inserted/updated/skipped counts
+        """
+        return BulkLoader(self.db_session).load(
+            "stg_anki_cards",
+            rows,
+            key_columns=["anki_note_id"],
+            update_columns=self.STAGING_UPDATE_COLUMNS,
+            json_columns=["raw_tags_json", "prerequisite_hierarchy", "raw_anki_data"],
+            array_columns=["tags", "prerequisite_tags"],
         )
 
     def _create_import_log(self, deck_name: str) -> None:
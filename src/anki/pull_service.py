@@ -22,6 +22,7 @@ from sqlalchemy.orm import Session
 from src.anki.anki_client import AnkiClient
 from src.anki.config import BASE_DECK
 from src.db.database import get_session
+from src.study.summary_store import get_summary_store
 
 
 def pull_review_stats(
@@ -215,6 +216,8 @@ def pull_review_stats(
 
     try:
         session.commit()
+        # The rollup triggers updated the tables; drop the cached dashboard
+        get_summary_store().invalidate()
     except Exception as exc:
         logger.error("Failed to commit updates: {}", exc)
         session.rollback()
@@ -0,0 +1,261 @@
+"""
+In-process response cache for read-heavy API routes.
+
+Routes that recompute from the database or re-parse module files on every
+call (module listings, QA reports, duplicate/prerequisite stats) serve
+their JSON through ``response_cache.respond``:
+
+- Responses are cached per (method, path, sorted query, version) with a
+  TTL and LRU eviction (``api_cache_ttl_seconds``, ``api_cache_max_entries``).
+- Every response carries a strong ETag; ``If-None-Match`` answers 304.
+- Concurrent misses for the same key compute once (single-flight).
+- Entries carry tags; write paths call ``response_cache.invalidate(tag)``
+  after they commit. A result computed while its tag was invalidated is
+  returned but not cached, so a slow read can't resurrect stale data.
+
+Usage:
+    @router.get("/qa/report")
+    def get_qa_report(request: Request, db: Session = Depends(get_session)):
+        return response_cache.respond(request, [TAG_CCNA_QA], lambda: _qa_report(db))
+
+    # after a write
+    response_cache.invalidate(TAG_CCNA_QA)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from loguru import logger
+
+from config import get_settings
+
+# Invalidation tags
+TAG_CCNA_CONTENT = "ccna_content"  # Parsed module files
+TAG_CCNA_QA = "ccna_qa"  # Generated atoms, coverage and QA grades
+TAG_SEMANTIC = "semantic"  # Embeddings, duplicates, prerequisite suggestions
+TAG_PREREQUISITES = "prerequisites"  # Explicit prerequisite edges
+
+ALL_TAGS = (TAG_CCNA_CONTENT, TAG_CCNA_QA, TAG_SEMANTIC, TAG_PREREQUISITES)
+
+# Clients must revalidate, which is cheap thanks to ETags
+CACHE_CONTROL = "no-cache"
+
+
+@dataclass
+class CachedResponse:
+    """Serialized response body with its ETag and tags."""
+
+    body: bytes
+    etag: str
+    tags: frozenset[str]
+    expires_at: float
+
+
+class ResponseCache:
+    """Thread-safe TTL/LRU cache of JSON response bodies."""
+
+    def __init__(self, ttl_seconds: float | None = None, max_entries: int | None = None):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: Entry lifetime (defaults to settings.api_cache_ttl_seconds)
+            max_entries: LRU capacity (defaults to settings.api_cache_max_entries)
+        """
+        settings = get_settings()
+        self.ttl_seconds = settings.api_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.max_entries = settings.api_cache_max_entries if max_entries is None else max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._async_locks: dict[str, asyncio.Lock] = {}
+        self._generations: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    # =========================================================================
+    # Storage
+    # =========================================================================
+
+    @staticmethod
+    def make_key(request: Request, version: str | None = None) -> str:
+        """Cache key from method, path, sorted query parameters and version."""
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        key = f"{request.method} {request.url.path}?{query}"
+        return f"{key}#{version}" if version else key
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _generation(self, tags: Iterable[str]) -> tuple[int, ...]:
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def _store(
+        self, key: str, value: Any, tags: list[str], generation: tuple[int, ...]
+    ) -> CachedResponse:
+        body = json.dumps(jsonable_encoder(value), separators=(",", ":")).encode()
+        entry = CachedResponse(
+            body=body,
+            etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+            tags=frozenset(tags),
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        if self.ttl_seconds <= 0:
+            return entry
+        with self._lock:
+            if tuple(self._generations.get(tag, 0) for tag in tags) != generation:
+                # Invalidated while computing: serve it, don't cache it
+                return entry
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._key_locks.pop(evicted, None)
+        return entry
+
+    def invalidate(self, *tags: str) -> int:
+        """
+        Drop every entry carrying any of ``tags``.
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            stale = [k for k, e in self._entries.items() if e.tags.intersection(tags)]
+            for key in stale:
+                del self._entries[key]
+                self._key_locks.pop(key, None)
+        if stale:
+            logger.debug(f"Response cache: invalidated {len(stale)} entries for {tags}")
+        return len(stale)
+
+    def invalidate_all(self) -> int:
+        """Drop every entry (e.g. after a full sync)."""
+        return self.invalidate(*ALL_TAGS)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._key_locks.clear()
+            self.hits = self.misses = self.not_modified = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # =========================================================================
+    # HTTP
+    # =========================================================================
+
+    def _response(self, request: Request, entry: CachedResponse, hit: bool) -> Response:
+        headers = {"ETag": entry.etag, "Cache-Control": CACHE_CONTROL}
+        if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+            with self._lock:
+                self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        headers["X-Cache"] = "HIT" if hit else "MISS"
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def respond(
+        self,
+        request: Request,
+        tags: list[str],
+        produce: Callable[[], Any],
+        version: str | None = None,
+    ) -> Response:
+        """
+        Serve ``produce()`` through the cache.
+
+        Args:
+            request: Incoming request (key and If-None-Match)
+            tags: Invalidation tags for the entry
+            produce: Computes the response value on a miss
+            version: Extra key component (e.g. source file mtimes)
+
+        Returns:
+            200 JSON response with ETag, or 304 Not Modified
+        """
+        key = self.make_key(request, version)
+        entry = self.get(key)
+        hit = entry is not None
+        if entry is None:
+            with self._lock:
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+            with key_lock:
+                entry = self.get(key)
+                hit = entry is not None
+                if entry is None:
+                    generation = self._generation(tags)
+                    entry = self._store(key, produce(), tags, generation)
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return self._response(request, entry, hit)
+
+    async def respond_async(
+        self,
+        request: Request,
+        tags: list[str],
+        produce: Callable[[], Awaitable[Any]],
+        version: str | None = None,
+    ) -> Response:
+        """Async form of ``respond`` for async routes."""
+        key = self.make_key(request, version)
+        entry = self.get(key)
+        hit = entry is not None
+        if entry is None:
+            key_lock = self._async_locks.setdefault(key, asyncio.Lock())
+            try:
+                async with key_lock:
+                    entry = self.get(key)
+                    hit = entry is not None
+                    if entry is None:
+                        generation = self._generation(tags)
+                        entry = self._store(key, await produce(), tags, generation)
+            finally:
+                if not key_lock.locked() and self._async_locks.get(key) is key_lock:
+                    del self._async_locks[key]
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return self._response(request, entry, hit)
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    """If-None-Match uses weak comparison (RFC 9110 13.1.2)."""
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,87 @@
+"""
+Keep blocking work off the API event loop.
+
+- ``run_blocking`` runs sync I/O (legacy sync services, sync SQLAlchemy)
+  on the AnyIO worker-thread pool FastAPI already uses for ``def`` routes.
+- ``run_blocking_coroutine`` does the same for coroutine functions that
+  block inside (sync DB or HTTP calls behind an ``async def``), giving
+  them their own event loop in the worker thread.
+- ``run_cpu`` runs CPU-bound, picklable work (module parsing, QA grading)
+  on a small process pool so it neither blocks the loop nor holds the GIL
+  against other requests. With ``api_cpu_workers = 0`` it uses threads.
+
+Usage:
+    state = await run_blocking(engine.create_session, learner_id=..., mode=...)
+    summaries = await run_cpu(summarize_module, str(path))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import multiprocessing
+import threading
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, TypeVar
+
+from loguru import logger
+from starlette.concurrency import run_in_threadpool
+
+from config import get_settings
+
+T = TypeVar("T")
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking call in the worker-thread pool."""
+    return await run_in_threadpool(fn, *args, **kwargs)
+
+
+async def run_blocking_coroutine(
+    fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
+) -> T:
+    """Run a blocking coroutine function on its own loop in a worker thread."""
+    return await run_in_threadpool(lambda: asyncio.run(fn(*args, **kwargs)))
+
+
+def _get_pool() -> ProcessPoolExecutor | None:
+    global _pool
+    if _pool is None:
+        workers = get_settings().api_cpu_workers
+        if workers <= 0:
+            return None
+        with _pool_lock:
+            if _pool is None:
+                # spawn: workers must not inherit the server's threads, loop or DB pools
+                _pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info(f"Started CPU pool with {workers} worker processes")
+    return _pool
+
+
+async def run_cpu(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run CPU-bound work in the process pool.
+
+    ``fn`` and its arguments must be picklable (module-level function,
+    plain data). Falls back to a worker thread when no pool is configured.
+    """
+    pool = _get_pool()
+    if pool is None:
+        return await run_blocking(fn, *args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+
+
+def shutdown() -> None:
+    """Stop the process pool (application shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
@@ -22,7 +22,9 @@ from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 
 from config import get_settings
-from src.db.database import get_engine, init_db
+from src.api import concurrency, metrics
+from src.core.profiling import instrument_engine
+from src.db.database import dispose_async_engine, get_engine, init_db
 
 settings = get_settings()
 
@@ -78,6 +80,8 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down notion-learning-sync service...")
+    concurrency.shutdown()
+    await dispose_async_engine()
 
 
 app = FastAPI(
@@ -119,6 +123,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency histograms and SQL counts, served at /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+instrument_engine(get_engine())
+
 
 # ========================================
 # Health & Status Endpoints
@@ -212,6 +220,7 @@ from src.api.routers import (
     struggles_router,
 )
 
+app.include_router(metrics.router, tags=["Health"])
 app.include_router(sync_router.router, prefix="/api/sync", tags=["Sync"])
 app.include_router(anki_router.router, prefix="/api/anki", tags=["Anki"])
 app.include_router(cleaning_router.router, prefix="/api/clean", tags=["Cleaning"])
@@ -0,0 +1,137 @@
+"""
+Per-route request metrics for the API.
+
+MetricsMiddleware times every request and counts the SQL statements it
+issued, keyed by (method, route template) so path parameters don't blow
+up cardinality. ``GET /metrics`` serves the histograms in Prometheus
+text exposition format.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from dataclasses import dataclass, field
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.core.profiling import sql_capture
+
+# Histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RouteStats:
+    """Latency histogram and SQL totals for one route."""
+
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    count: int = 0
+    seconds: float = 0.0
+    errors: int = 0
+    sql_count: int = 0
+    sql_seconds: float = 0.0
+
+
+class RouteMetrics:
+    """Thread-safe per-route request metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: dict[tuple[str, str], RouteStats] = {}
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        seconds: float,
+        status: int,
+        sql_count: int = 0,
+        sql_seconds: float = 0.0,
+    ) -> None:
+        with self._lock:
+            stats = self._routes.get((method, route))
+            if stats is None:
+                stats = self._routes[(method, route)] = RouteStats()
+            stats.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            stats.count += 1
+            stats.seconds += seconds
+            if status >= 500:
+                stats.errors += 1
+            stats.sql_count += sql_count
+            stats.sql_seconds += sql_seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition of all route metrics."""
+        lines = [
+            "# HELP cortex_http_request_duration_seconds Request latency by route.",
+            "# TYPE cortex_http_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            routes = sorted(self._routes.items())
+            for (method, route), s in routes:
+                labels = f'method="{method}",route="{route}"'
+                cumulative = 0
+                for bound, n in zip(LATENCY_BUCKETS, s.buckets):
+                    cumulative += n
+                    lines.append(
+                        f'cortex_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+                    )
+                lines.append(
+                    f'cortex_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {s.count}'
+                )
+                lines.append(f"cortex_http_request_duration_seconds_sum{{{labels}}} {s.seconds:.6f}")
+                lines.append(f"cortex_http_request_duration_seconds_count{{{labels}}} {s.count}")
+
+            for name, help_text, attr in (
+                ("cortex_http_request_errors_total", "Requests answered with 5xx.", "errors"),
+                ("cortex_sql_queries_total", "SQL statements issued by route.", "sql_count"),
+                ("cortex_sql_query_seconds_total", "Time spent in SQL by route.", "sql_seconds"),
+            ):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for (method, route), s in routes:
+                    lines.append(f'{name}{{method="{method}",route="{route}"}} {getattr(s, attr)}')
+        return "\n".join(lines) + "\n"
+
+
+route_metrics = RouteMetrics()
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """Record latency, status and SQL statements per route template."""
+
+    async def dispatch(self, request: Request, call_next):
+        start = time.perf_counter()
+        status = 500
+        with sql_capture() as sql:
+            try:
+                response = await call_next(request)
+                status = response.status_code
+                return response
+            finally:
+                route = request.scope.get("route")
+                route_metrics.observe(
+                    request.method,
+                    getattr(route, "path", "<unmatched>"),
+                    time.perf_counter() - start,
+                    status,
+                    sql.count,
+                    sql.seconds,
+                )
+
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics() -> str:
+    """Per-route latency histograms and SQL counters (Prometheus format)."""
+    return route_metrics.render_prometheus()
@@ -18,12 +18,11 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query
 from loguru import logger
 from pydantic import BaseModel, Field
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.db.database import get_async_session
+from src.api.concurrency import run_blocking
 
 router = APIRouter()
 
@@ -206,7 +205,6 @@ class UnlockStatusResponse(BaseModel):
 )
 async def create_session(
     request: SessionCreateRequest,
-    db: AsyncSession = Depends(get_async_session),
 ) -> SessionResponse:
     """
     Create a new adaptive learning session.
@@ -232,7 +230,8 @@ async def create_session(
         }
         mode = mode_map.get(request.mode, SessionMode.ADAPTIVE)
 
-        session_state = engine.create_session(
+        session_state = await run_blocking(
+            engine.create_session,
             learner_id=request.learner_id,
             mode=mode,
             target_concept_id=UUID(request.target_concept_id)
@@ -258,14 +257,13 @@ async def create_session(
 )
 async def get_session(
     session_id: str,
-    db: AsyncSession = Depends(get_async_session),
 ) -> SessionResponse:
     """Get current state of a learning session."""
     try:
         from src.adaptive import LearningEngine
 
         engine = LearningEngine()
-        session_state = engine.get_session(UUID(session_id))
+        session_state = await run_blocking(engine.get_session, UUID(session_id))
 
         if not session_state:
             raise HTTPException(status_code=404, detail="Session not found")
@@ -287,7 +285,6 @@ async def get_session(
 async def end_session(
     session_id: str,
     status: str = Query("completed", description="Final status: completed, abandoned"),
-    db: AsyncSession = Depends(get_async_session),
 ) -> SessionResponse:
     """End a learning session."""
     try:
@@ -301,7 +298,7 @@ async def end_session(
         }
         final_status = status_map.get(status, SessionStatus.COMPLETED)
 
-        session_state = engine.end_session(UUID(session_id), final_status)
+        session_state = await run_blocking(engine.end_session, UUID(session_id), final_status)
         return _session_to_response(session_state)
 
     except Exception as exc:
@@ -322,7 +319,6 @@ async def end_session(
 async def submit_answer(
     session_id: str,
     request: AnswerSubmitRequest,
-    db: AsyncSession = Depends(get_async_session),
 ) -> AnswerResultResponse:
     """
     Submit an answer and get evaluation with potential remediation.
@@ -338,7 +334,8 @@ async def submit_answer(
 
         engine = LearningEngine()
 
-        result = engine.submit_answer(
+        result = await run_blocking(
+            engine.submit_answer,
             session_id=UUID(session_id),
             atom_id=UUID(request.atom_id),
             answer=request.answer,
@@ -380,7 +377,6 @@ async def submit_answer(
 )
 async def get_next_atom(
     session_id: str,
-    db: AsyncSession = Depends(get_async_session),
 ) -> AtomPresentationResponse | None:
     """
     Get the next atom in the session.
@@ -392,7 +388,7 @@ async def get_next_atom(
         from src.adaptive import LearningEngine
 
         engine = LearningEngine()
-        atom = engine.get_next_atom(UUID(session_id))
+        atom = await run_blocking(engine.get_next_atom, UUID(session_id))
 
         if not atom:
             return None
@@ -427,7 +423,6 @@ async def get_learner_mastery(
     learner_id: str,
     concept_ids: str | None = Query(None, description="Comma-separated concept UUIDs"),
     cluster_id: str | None = Query(None, description="Filter by cluster"),
-    db: AsyncSession = Depends(get_async_session),
 ) -> list[ConceptMasteryResponse]:
     """Get mastery state for a learner across concepts."""
     try:
@@ -439,7 +434,8 @@ async def get_learner_mastery(
         if concept_ids:
             concept_uuid_list = [UUID(c.strip()) for c in concept_ids.split(",")]
 
-        mastery_list = engine.get_learner_mastery(
+        mastery_list = await run_blocking(
+            engine.get_learner_mastery,
             learner_id=learner_id,
             concept_ids=concept_uuid_list,
             cluster_id=UUID(cluster_id) if cluster_id else None,
@@ -478,7 +474,6 @@ async def get_learner_mastery(
 async def recalculate_mastery(
     learner_id: str = Query(..., description="Learner identifier"),
     concept_ids: str | None = Query(None, description="Comma-separated concept UUIDs"),
-    db: AsyncSession = Depends(get_async_session),
 ) -> dict[str, Any]:
     """Trigger mastery recalculation for a learner."""
     try:
@@ -490,7 +485,7 @@ async def recalculate_mastery(
         if concept_ids:
             concept_uuid_list = [UUID(c.strip()) for c in concept_ids.split(",")]
 
-        count = engine.recalculate_mastery(learner_id, concept_uuid_list)
+        count = await run_blocking(engine.recalculate_mastery, learner_id, concept_uuid_list)
 
         return {
             "success": True,
@@ -517,7 +512,6 @@ async def get_learning_path(
     learner_id: str,
     concept_id: str,
     target_mastery: float = Query(0.85, ge=0, le=1, description="Target mastery level"),
-    db: AsyncSession = Depends(get_async_session),
 ) -> LearningPathResponse:
     """
     Get optimal learning path to master a concept.
@@ -532,7 +526,8 @@ async def get_learning_path(
 
         engine = LearningEngine()
 
-        path = engine.get_learning_path(
+        path = await run_blocking(
+            engine.get_learning_path,
             learner_id=learner_id,
             target_concept_id=UUID(concept_id),
             target_mastery=target_mastery,
@@ -585,7 +580,6 @@ async def get_next_optimal_atoms(
     cluster_id: str | None = Query(None, description="Optional cluster scope"),
     count: int = Query(10, ge=1, le=50, description="Number of atoms to return"),
     include_review: bool = Query(True, description="Include due reviews"),
-    db: AsyncSession = Depends(get_async_session),
 ) -> list[str]:
     """
     Get next optimal atoms for a learner.
@@ -600,7 +594,8 @@ async def get_next_optimal_atoms(
 
         sequencer = PathSequencer()
 
-        atoms = sequencer.get_next_atoms(
+        atoms = await run_blocking(
+            sequencer.get_next_atoms,
             learner_id=learner_id,
             concept_id=UUID(concept_id) if concept_id else None,
             cluster_id=UUID(cluster_id) if cluster_id else None,
@@ -628,7 +623,6 @@ async def get_next_optimal_atoms(
 async def get_knowledge_gaps(
     learner_id: str,
     cluster_id: str | None = Query(None, description="Optional cluster scope"),
-    db: AsyncSession = Depends(get_async_session),
 ) -> list[KnowledgeGapResponse]:
     """
     Identify knowledge gaps for a learner.
@@ -640,7 +634,8 @@ async def get_knowledge_gaps(
 
         engine = LearningEngine()
 
-        gaps = engine.get_knowledge_gaps(
+        gaps = await run_blocking(
+            engine.get_knowledge_gaps,
             learner_id=learner_id,
             cluster_id=UUID(cluster_id) if cluster_id else None,
         )
@@ -672,7 +667,6 @@ async def get_knowledge_gaps(
 async def trigger_remediation(
     learner_id: str = Query(..., description="Learner identifier"),
     concept_id: str = Query(..., description="Concept to remediate"),
-    db: AsyncSession = Depends(get_async_session),
 ) -> RemediationPlanResponse:
     """Manually trigger remediation for a concept."""
     try:
@@ -680,7 +674,8 @@ async def trigger_remediation(
 
         router = RemediationRouter()
 
-        plan = router.trigger_remediation(
+        plan = await run_blocking(
+            router.trigger_remediation,
             learner_id=learner_id,
             concept_id=UUID(concept_id),
             trigger_type=TriggerType.MANUAL,
@@ -716,7 +711,6 @@ async def trigger_remediation(
 async def check_unlock_status(
     learner_id: str,
     concept_id: str,
-    db: AsyncSession = Depends(get_async_session),
 ) -> UnlockStatusResponse:
     """Check if a concept is unlocked for a learner."""
     try:
@@ -724,7 +718,8 @@ async def check_unlock_status(
 
         sequencer = PathSequencer()
 
-        status = sequencer.check_unlock_status(
+        status = await run_blocking(
+            sequencer.check_unlock_status,
             learner_id=learner_id,
             concept_id=UUID(concept_id),
         )
@@ -764,14 +759,13 @@ async def check_unlock_status(
 )
 async def get_atom_suitability(
     atom_id: str,
-    db: AsyncSession = Depends(get_async_session),
 ) -> AtomSuitabilityResponse:
     """Get suitability scores for an atom across all atom types."""
     try:
         from src.adaptive import LearningEngine
 
         engine = LearningEngine()
-        result = engine.get_atom_suitability(UUID(atom_id))
+        result = await run_blocking(engine.get_atom_suitability, UUID(atom_id))
 
         return AtomSuitabilityResponse(
             atom_id=result["atom_id"],
@@ -802,7 +796,6 @@ async def get_atom_suitability(
 async def batch_compute_suitability(
     atom_ids: list[str] | None = None,
     limit: int = Query(100, ge=1, le=1000, description="Max atoms to process"),
-    db: AsyncSession = Depends(get_async_session),
 ) -> dict[str, Any]:
     """
     Batch compute and store suitability scores.
@@ -818,7 +811,7 @@ async def batch_compute_suitability(
         if atom_ids:
             atom_uuid_list = [UUID(a) for a in atom_ids]
 
-        count = engine.batch_compute_suitability(atom_uuid_list, limit)
+        count = await run_blocking(engine.batch_compute_suitability, atom_uuid_list, limit)
 
         return {
             "success": True,
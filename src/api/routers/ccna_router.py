@@ -10,20 +10,25 @@ Provides REST API endpoints for:
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 from pathlib import Path
 import re
 import yaml
 from typing import Any
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
 from loguru import logger
 from pydantic import BaseModel, Field
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from config import get_settings
-from src.db.database import get_session
+from src.api.cache import TAG_CCNA_CONTENT, TAG_CCNA_QA, TAG_SEMANTIC, response_cache
+from src.api.concurrency import run_blocking_coroutine, run_cpu
+from src.db.database import get_async_session, get_session
 from src.delivery.atom_deck import AtomDeck
 from src.adaptive.path_sequencer import PathSequencer
 from src.db.models.adaptive import LearningPathSession, SessionAtomResponse, RemediationEvent
@@ -155,8 +160,42 @@ class ObjectiveClusterResponse(BaseModel):
 # ============================================================================
 
 
+def _modules_version(module_paths: list[Path]) -> str:
+    """Cache version for parsed module files: changes when any file is edited."""
+    stamps = []
+    for path in module_paths:
+        stat = path.stat()
+        stamps.append(f"{path.name}:{stat.st_mtime_ns}:{stat.st_size}")
+    # hashlib, not hash(): the version must agree across workers and restarts
+    digest = hashlib.sha256("\n".join(stamps).encode()).hexdigest()[:16]
+    return f"{len(stamps)}:{digest}"
+
+
+def _summarize_module(modules_path: str, module_path: str) -> dict[str, Any]:
+    """Parse one module file (runs in the CPU pool)."""
+    from src.ccna.content_parser import CCNAContentParser
+
+    parser = CCNAContentParser(modules_path)
+    return parser.get_module_summary(parser.parse_module(module_path))
+
+
+async def _module_summaries(modules_path: str, modules: list[Path]) -> list[dict[str, Any]]:
+    """Parse all modules in parallel, skipping (and logging) files that fail."""
+    results = await asyncio.gather(
+        *(run_cpu(_summarize_module, modules_path, str(path)) for path in modules),
+        return_exceptions=True,
+    )
+    summaries = []
+    for module_path, result in zip(modules, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Failed to parse {module_path}: {result}")
+        else:
+            summaries.append(result)
+    return summaries
+
+
 @router.get("/modules", response_model=list[ModuleSummary], summary="List available modules")
-def list_modules():
+async def list_modules(request: Request) -> Response:
     """
     List all available CCNA module files with basic metadata.
 
@@ -166,6 +205,8 @@ def list_modules():
     - Line count
     - Section count
     - Estimated atoms needed
+
+    Cached until a module file changes (ETag / If-None-Match supported).
     """
     from src.ccna.content_parser import CCNAContentParser
 
@@ -173,33 +214,31 @@ def list_modules():
     parser = CCNAContentParser(settings.ccna_modules_path)
 
     modules = parser.get_available_modules()
-    summaries = []
 
-    for module_path in modules:
-        try:
-            module = parser.parse_module(module_path)
-            summary = parser.get_module_summary(module)
-            summaries.append(
-                ModuleSummary(
-                    module_id=summary["module_id"],
-                    module_number=summary["module_number"],
-                    title=summary["title"],
-                    total_lines=summary["total_lines"],
-                    section_count=summary["section_count"],
-                    total_commands=summary["total_commands"],
-                    total_tables=summary["total_tables"],
-                    total_key_terms=summary["total_key_terms"],
-                    estimated_atoms=summary["estimated_atoms"],
-                )
+    async def build() -> list[ModuleSummary]:
+        summaries = await _module_summaries(settings.ccna_modules_path, modules)
+        return [
+            ModuleSummary(
+                module_id=summary["module_id"],
+                module_number=summary["module_number"],
+                title=summary["title"],
+                total_lines=summary["total_lines"],
+                section_count=summary["section_count"],
+                total_commands=summary["total_commands"],
+                total_tables=summary["total_tables"],
+                total_key_terms=summary["total_key_terms"],
+                estimated_atoms=summary["estimated_atoms"],
             )
-        except Exception as e:
-            logger.error(f"Failed to parse {module_path}: {e}")
+            for summary in summaries
+        ]
 
-    return summaries
+    return await response_cache.respond_async(
+        request, [TAG_CCNA_CONTENT], build, version=_modules_version(modules)
+    )
 
 
 @router.get("/modules/{module_id}", summary="Get module details")
-def get_module_details(module_id: str) -> dict[str, Any]:
+async def get_module_details(module_id: str, request: Request) -> Response:
     """
     Get detailed information about a specific module.
 
@@ -214,19 +253,25 @@ def get_module_details(module_id: str) -> dict[str, Any]:
     settings = get_settings()
     parser = CCNAContentParser(settings.ccna_modules_path)
 
-    # Find matching module
-    for module_path in parser.get_available_modules():
-        module = parser.parse_module(module_path)
-        if module.module_id == module_id:
-            return parser.get_module_summary(module)
+    # Parse only the requested module's file
+    module_path = parser.find_module(module_id)
+    if module_path is None:
+        raise HTTPException(status_code=404, detail=f"Module {module_id} not found")
+
+    async def build() -> dict[str, Any]:
+        return await run_cpu(_summarize_module, settings.ccna_modules_path, str(module_path))
 
-    raise HTTPException(status_code=404, detail=f"Module {module_id} not found")
+    return await response_cache.respond_async(
+        request, [TAG_CCNA_CONTENT], build, version=_modules_version([module_path])
+    )
 
 
 @router.get(
     "/modules/{module_id}/coverage", response_model=ModuleCoverage, summary="Get module coverage"
 )
-def get_module_coverage(module_id: str, db: Session = Depends(get_session)) -> ModuleCoverage:
+async def get_module_coverage(
+    module_id: str, db: AsyncSession = Depends(get_async_session)
+) -> ModuleCoverage:
     """
     Get content coverage and quality statistics for a module.
 
@@ -242,7 +287,7 @@ def get_module_coverage(module_id: str, db: Session = Depends(get_session)) -> M
         WHERE module_id = :module_id
     """)
 
-    result = db.execute(query, {"module_id": module_id}).first()
+    result = (await db.execute(query, {"module_id": module_id})).first()
 
     if not result:
         raise HTTPException(status_code=404, detail=f"No coverage data for module {module_id}")
@@ -396,12 +441,16 @@ async def generate_module_content(
 
     try:
         pipeline = CCNAGenerationPipeline(db_session=db)
-        result = await pipeline.process_module(
+        # The pipeline uses the sync session; keep it off the server loop
+        result = await run_blocking_coroutine(
+            pipeline.process_module,
             module_path,
             preserve_good_cards=request.preserve_good_cards,
             include_migration=request.include_migration,
             dry_run=request.dry_run,
         )
+        if not request.dry_run:
+            response_cache.invalidate(TAG_CCNA_QA, TAG_SEMANTIC)
 
         return GenerationResponse(
             job_id=result.job_id,
@@ -451,10 +500,13 @@ async def generate_all_modules(
 
     try:
         pipeline = CCNAGenerationPipeline(db_session=db)
-        report = await pipeline.process_all_modules(
+        report = await run_blocking_coroutine(
+            pipeline.process_all_modules,
             priority_modules=priority,
             dry_run=request.dry_run,
         )
+        if not request.dry_run:
+            response_cache.invalidate(TAG_CCNA_QA, TAG_SEMANTIC)
 
         return {
             "total_modules": report.total_modules,
@@ -474,9 +526,9 @@ async def generate_all_modules(
 
 
 @router.get("/generate/status/{job_id}", summary="Get generation job status")
-def get_job_status(
+async def get_job_status(
     job_id: str,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
 ) -> dict[str, Any]:
     """Get the status of a generation job."""
     from sqlalchemy import text
@@ -486,7 +538,7 @@ def get_job_status(
         WHERE id = :job_id::uuid
     """)
 
-    result = db.execute(query, {"job_id": job_id}).first()
+    result = (await db.execute(query, {"job_id": job_id})).first()
 
     if not result:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
@@ -500,11 +552,14 @@ def get_job_status(
 
 
 @router.get("/qa/report", response_model=list[QAReportResponse], summary="Get overall QA report")
-def get_qa_report(db: Session = Depends(get_session)) -> list[QAReportResponse]:
+async def get_qa_report(
+    request: Request, db: AsyncSession = Depends(get_async_session)
+) -> Response:
     """
     Get quality assurance report for all modules.
 
-    Shows quality grade distribution and common issues.
+    Shows quality grade distribution and common issues. Cached until the
+    next generation or regrade.
     """
     from sqlalchemy import text
 
@@ -522,36 +577,45 @@ def get_qa_report(db: Session = Depends(get_session)) -> list[QAReportResponse]:
         ORDER BY module_id
     """)
 
-    results = []
-    for row in db.execute(query):
-        results.append(
-            QAReportResponse(
-                module_id=row.module_id,
-                total_atoms=row.total_atoms or 0,
-                passed=row.passed or 0,
-                flagged=row.flagged or 0,
-                rejected=row.rejected or 0,
-                grade_distribution={
-                    "A": row.grade_a_count or 0,
-                    "B": row.grade_b_count or 0,
-                    "C": row.grade_c_count or 0,
-                    "D": row.grade_d_count or 0,
-                    "F": row.grade_f_count or 0,
-                },
-                avg_quality_score=float(row.avg_quality_score or 0),
-                issues_summary={},  # Would need additional query
+    async def build() -> list[QAReportResponse]:
+        results = []
+        for row in await db.execute(query):
+            results.append(
+                QAReportResponse(
+                    module_id=row.module_id,
+                    total_atoms=row.total_atoms or 0,
+                    passed=row.passed or 0,
+                    flagged=row.flagged or 0,
+                    rejected=row.rejected or 0,
+                    grade_distribution={
+                        "A": row.grade_a_count or 0,
+                        "B": row.grade_b_count or 0,
+                        "C": row.grade_c_count or 0,
+                        "D": row.grade_d_count or 0,
+                        "F": row.grade_f_count or 0,
+                    },
+                    avg_quality_score=float(row.avg_quality_score or 0),
+                    issues_summary={},  # Would need additional query
+                )
             )
-        )
+        return results
 
-    return results
+    return await response_cache.respond_async(request, [TAG_CCNA_QA], build)
 
 
 @router.get("/qa/report/{module_id}", summary="Get module QA report")
-def get_module_qa_report(
+async def get_module_qa_report(
     module_id: str,
-    db: Session = Depends(get_session),
-) -> dict[str, Any]:
-    """Get detailed QA report for a specific module."""
+    request: Request,
+    db: AsyncSession = Depends(get_async_session),
+) -> Response:
+    """Get detailed QA report for a specific module (cached until regrade)."""
+    return await response_cache.respond_async(
+        request, [TAG_CCNA_QA], lambda: _module_qa_report(db, module_id)
+    )
+
+
+async def _module_qa_report(db: AsyncSession, module_id: str) -> dict[str, Any]:
     from sqlalchemy import text
 
     # Get module stats
@@ -560,7 +624,7 @@ def get_module_qa_report(
         WHERE module_id = :module_id
     """)
 
-    stats = db.execute(stats_query, {"module_id": module_id}).first()
+    stats = (await db.execute(stats_query, {"module_id": module_id})).first()
     if not stats:
         raise HTTPException(status_code=404, detail=f"No QA data for {module_id}")
 
@@ -581,7 +645,7 @@ def get_module_qa_report(
             "count": row.count,
             "avg_score": float(row.avg_score) if row.avg_score else 0,
         }
-        for row in db.execute(issues_query, {"module_id": module_id})
+        for row in await db.execute(issues_query, {"module_id": module_id})
     }
 
     # Get flagged atoms
@@ -601,7 +665,7 @@ def get_module_qa_report(
             "grade": row.quality_grade,
             "score": float(row.quality_score) if row.quality_score else 0,
         }
-        for row in db.execute(flagged_query, {"module_id": module_id})
+        for row in await db.execute(flagged_query, {"module_id": module_id})
     ]
 
     return {
@@ -612,79 +676,47 @@ def get_module_qa_report(
     }
 
 
-@router.post("/qa/regrade", summary="Re-grade all cards")
-async def regrade_all_cards(
-    module_id: str | None = Query(None, description="Limit to specific module"),
-    db: Session = Depends(get_session),
-) -> dict[str, Any]:
+def _regrade_rows(rows: list[dict[str, Any]]) -> dict[str, Any]:
     """
-    Re-grade all generated atoms using the QA pipeline.
+    QA-grade stored atoms (runs in the CPU pool).
 
-    Useful after QA algorithm updates.
+    Returns:
+        Dict with per-atom ``updates`` and the batch report counts
     """
-    from sqlalchemy import text
-
     from src.ccna.atomizer_service import AtomType, GeneratedAtom, KnowledgeType
     from src.ccna.qa_pipeline import QAPipeline
 
-    qa_pipeline = QAPipeline()
-
-    # Fetch atoms
-    query = text("""
-        SELECT card_id, atom_type, front, back, knowledge_type, tags
-        FROM ccna_generated_atoms
-        WHERE (:module_id IS NULL OR module_id = :module_id)
-    """)
-
     atoms = []
-    for row in db.execute(query, {"module_id": module_id}):
+    for row in rows:
         try:
             atoms.append(
                 GeneratedAtom(
-                    card_id=row.card_id,
-                    atom_type=AtomType(row.atom_type),
-                    front=row.front,
-                    back=row.back,
-                    knowledge_type=KnowledgeType(row.knowledge_type),
-                    tags=row.tags or [],
+                    card_id=row["card_id"],
+                    atom_type=AtomType(row["atom_type"]),
+                    front=row["front"],
+                    back=row["back"],
+                    knowledge_type=KnowledgeType(row["knowledge_type"]),
+                    tags=row["tags"] or [],
                 )
             )
         except Exception as e:
-            logger.warning(f"Skipping atom {row.card_id}: {e}")
+            logger.warning(f"Skipping atom {row['card_id']}: {e}")
 
     if not atoms:
-        return {"message": "No atoms to regrade", "count": 0}
-
-    # Re-grade
-    report = qa_pipeline.batch_qa(atoms)
-
-    # Update database
-    for qa_result in report.results:
-        update_query = text("""
-            UPDATE ccna_generated_atoms
-            SET quality_grade = :grade,
-                quality_score = :score,
-                is_atomic = :is_atomic,
-                needs_review = :needs_review,
-                last_qa_at = NOW()
-            WHERE card_id = :card_id
-        """)
+        return {"updates": [], "total_processed": 0}
 
-        db.execute(
-            update_query,
+    report = QAPipeline().batch_qa(atoms)
+    return {
+        "updates": [
             {
                 "card_id": qa_result.atom.card_id,
                 "grade": qa_result.quality_grade,
                 "score": qa_result.quality_score,
                 "is_atomic": qa_result.is_atomic,
                 "needs_review": qa_result.needs_review,
-            },
-        )
-
-    db.commit()
-
-    return {
-        "message": "Regrade complete",
+            }
+            for qa_result in report.results
+        ],
         "total_processed": report.total_processed,
         "passed": report.passed,
         "flagged": report.flagged,
@@ -693,11 +725,63 @@ async def regrade_all_cards(
     }
 
 
+@router.post("/qa/regrade", summary="Re-grade all cards")
+async def regrade_all_cards(
+    module_id: str | None = Query(None, description="Limit to specific module"),
+    db: AsyncSession = Depends(get_async_session),
+) -> dict[str, Any]:
+    """
+    Re-grade all generated atoms using the QA pipeline.
+
+    Useful after QA algorithm updates. Grading runs in the CPU pool and the
+    new grades are written in one batched UPDATE.
+    """
+    from sqlalchemy import text
+
+    # Fetch atoms
+    query = text("""
+        SELECT card_id, atom_type, front, back, knowledge_type, tags
+        FROM ccna_generated_atoms
+        WHERE (CAST(:module_id AS TEXT) IS NULL OR module_id = :module_id)
+    """)
+
+    rows = [dict(row._mapping) for row in await db.execute(query, {"module_id": module_id})]
+
+    # Re-grade
+    report = await run_cpu(_regrade_rows, rows)
+    if not report["updates"]:
+        return {"message": "No atoms to regrade", "count": 0}
+
+    # Update database
+    update_query = text("""
+        UPDATE ccna_generated_atoms
+        SET quality_grade = :grade,
+            quality_score = :score,
+            is_atomic = :is_atomic,
+            needs_review = :needs_review,
+            last_qa_at = NOW()
+        WHERE card_id = :card_id
+    """)
+    await db.execute(update_query, report["updates"])
+
+    await db.commit()
+    response_cache.invalidate(TAG_CCNA_QA)
+
+    return {
+        "message": "Regrade complete",
+        "total_processed": report["total_processed"],
+        "passed": report["passed"],
+        "flagged": report["flagged"],
+        "rejected": report["rejected"],
+        "grade_distribution": report["grade_distribution"],
+    }
+
+
 @router.get("/qa/flagged", summary="Get flagged atoms")
-def get_flagged_atoms(
+async def get_flagged_atoms(
     module_id: str | None = Query(None),
     limit: int = Query(50, le=200),
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
 ) -> list[dict[str, Any]]:
     """Get atoms flagged for manual review."""
     from sqlalchemy import text
@@ -707,14 +791,13 @@ def get_flagged_atoms(
                quality_grade, quality_score, quality_details
         FROM ccna_generated_atoms
         WHERE needs_review = true
-        AND (:module_id IS NULL OR module_id = :module_id)
+        AND (CAST(:module_id AS TEXT) IS NULL OR module_id = :module_id)
         ORDER BY quality_score
         LIMIT :limit
     """)
 
-    return [
-        dict(row._mapping) for row in db.execute(query, {"module_id": module_id, "limit": limit})
-    ]
+    rows = await db.execute(query, {"module_id": module_id, "limit": limit})
+    return [dict(row._mapping) for row in rows]
 
 
 # ============================================================================
@@ -725,7 +808,7 @@ def get_flagged_atoms(
 @router.post("/migrate/export", summary="Export Anki learning state")
 async def export_anki_state(
     module_id: str | None = Query(None, description="Limit to specific module"),
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
 ) -> dict[str, Any]:
     """
     Export current learning state from Anki cards.
@@ -739,45 +822,48 @@ async def export_anki_state(
     migration_service = AnkiMigrationService()
 
     try:
-        states = await migration_service.export_learning_states(module_id=module_id)
-
-        # Save to backup table
-        for state in states:
-            if state.has_learning_progress:
-                query = text("""
-                    INSERT INTO anki_learning_state_backup (
-                        card_id, anki_nid, stability, difficulty,
-                        due_date, interval_days, ease_factor,
-                        total_reviews, total_lapses, last_review_date,
-                        front_text, back_text, tags, backup_reason
-                    ) VALUES (
-                        :card_id, :anki_nid, :stability, :difficulty,
-                        :due_date, :interval, :ease,
-                        :reviews, :lapses, :last_review,
-                        :front, :back, :tags, 'export'
-                    )
-                """)
-
-                db.execute(
-                    query,
-                    {
-                        "card_id": state.card_id,
-                        "anki_nid": state.anki_note_id,
-                        "stability": state.stability,
-                        "difficulty": state.difficulty,
-                        "due_date": state.due_date,
-                        "interval": state.interval_days,
-                        "ease": state.ease_factor,
-                        "reviews": state.total_reviews,
-                        "lapses": state.total_lapses,
-                        "last_review": state.last_review,
-                        "front": state.front_text[:500],
-                        "back": state.back_text[:500],
-                        "tags": state.tags,
-                    },
-                )
+        # AnkiConnect calls are blocking behind the async signature
+        states = await run_blocking_coroutine(
+            migration_service.export_learning_states, module_id=module_id
+        )
 
-        db.commit()
+        # Save to backup table (one batched INSERT)
+        query = text("""
+            INSERT INTO anki_learning_state_backup (
+                card_id, anki_nid, stability, difficulty,
+                due_date, interval_days, ease_factor,
+                total_reviews, total_lapses, last_review_date,
+                front_text, back_text, tags, backup_reason
+            ) VALUES (
+                :card_id, :anki_nid, :stability, :difficulty,
+                :due_date, :interval, :ease,
+                :reviews, :lapses, :last_review,
+                :front, :back, :tags, 'export'
+            )
+        """)
+        backups = [
+            {
+                "card_id": state.card_id,
+                "anki_nid": state.anki_note_id,
+                "stability": state.stability,
+                "difficulty": state.difficulty,
+                "due_date": state.due_date,
+                "interval": state.interval_days,
+                "ease": state.ease_factor,
+                "reviews": state.total_reviews,
+                "lapses": state.total_lapses,
+                "last_review": state.last_review,
+                "front": state.front_text[:500],
+                "back": state.back_text[:500],
+                "tags": state.tags,
+            }
+            for state in states
+            if state.has_learning_progress
+        ]
+        if backups:
+            await db.execute(query, backups)
+
+        await db.commit()
 
         with_progress = [s for s in states if s.has_learning_progress]
         mature = [s for s in states if s.is_mature]
@@ -795,8 +881,8 @@ async def export_anki_state(
 
 
 @router.get("/migrate/report", summary="Get migration report")
-def get_migration_report(
-    db: Session = Depends(get_session),
+async def get_migration_report(
+    db: AsyncSession = Depends(get_async_session),
 ) -> dict[str, Any]:
     """Get summary of card migrations."""
     from sqlalchemy import text
@@ -810,7 +896,7 @@ def get_migration_report(
         FROM anki_card_migrations
     """)
 
-    result = db.execute(query).first()
+    result = (await db.execute(query)).first()
 
     return {
         "total_migrations": result.total_migrations or 0,
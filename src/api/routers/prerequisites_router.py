@@ -19,16 +19,23 @@ from decimal import Decimal
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from loguru import logger
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.cache import TAG_PREREQUISITES, response_cache
 from src.db.database import get_async_session
 
 router = APIRouter()
 
 
+async def _commit_and_invalidate(db: AsyncSession) -> None:
+    """Commit the edit before dropping cached listings so they can't be re-cached stale."""
+    await db.commit()
+    response_cache.invalidate(TAG_PREREQUISITES)
+
+
 # ========================================
 # Request/Response Models
 # ========================================
@@ -235,6 +242,7 @@ async def create_prerequisite(
         )
 
         target_name = prereq.target_concept.name if prereq.target_concept else None
+        await _commit_and_invalidate(db)
 
         return PrerequisiteResponse(
             id=str(prereq.id),
@@ -265,6 +273,7 @@ async def create_prerequisite(
     summary="List prerequisites",
 )
 async def list_prerequisites(
+    request: Request,
     source_concept_id: str | None = Query(None),
     source_atom_id: str | None = Query(None),
     target_concept_id: str | None = Query(None),
@@ -272,44 +281,48 @@ async def list_prerequisites(
     status: str = Query("active", description="Filter by status"),
     limit: int = Query(100, ge=1, le=500),
     db: AsyncSession = Depends(get_async_session),
-) -> list[PrerequisiteResponse]:
+) -> Response:
     """
     List prerequisites with optional filters.
 
-    Use this to find all prerequisites for a concept or atom.
+    Use this to find all prerequisites for a concept or atom. Cached until
+    the next prerequisite edit.
     """
     try:
         from src.prerequisites import PrerequisiteService
 
         service = PrerequisiteService(db)
 
-        prereqs = await service.list_prerequisites(
-            source_concept_id=UUID(source_concept_id) if source_concept_id else None,
-            source_atom_id=UUID(source_atom_id) if source_atom_id else None,
-            target_concept_id=UUID(target_concept_id) if target_concept_id else None,
-            gating_type=gating_type,
-            status=status,
-            limit=limit,
-        )
-
-        return [
-            PrerequisiteResponse(
-                id=str(p.id),
-                source_concept_id=str(p.source_concept_id) if p.source_concept_id else None,
-                source_atom_id=str(p.source_atom_id) if p.source_atom_id else None,
-                target_concept_id=str(p.target_concept_id),
-                target_concept_name=p.target_concept.name if p.target_concept else None,
-                gating_type=p.gating_type,
-                mastery_type=p.mastery_type,
-                mastery_threshold=float(p.mastery_threshold),
-                origin=p.origin,
-                anki_tag=p.anki_tag,
-                status=p.status,
-                notes=p.notes,
-                created_at=p.created_at,
+        async def build() -> list[PrerequisiteResponse]:
+            prereqs = await service.list_prerequisites(
+                source_concept_id=UUID(source_concept_id) if source_concept_id else None,
+                source_atom_id=UUID(source_atom_id) if source_atom_id else None,
+                target_concept_id=UUID(target_concept_id) if target_concept_id else None,
+                gating_type=gating_type,
+                status=status,
+                limit=limit,
             )
-            for p in prereqs
-        ]
+
+            return [
+                PrerequisiteResponse(
+                    id=str(p.id),
+                    source_concept_id=str(p.source_concept_id) if p.source_concept_id else None,
+                    source_atom_id=str(p.source_atom_id) if p.source_atom_id else None,
+                    target_concept_id=str(p.target_concept_id),
+                    target_concept_name=p.target_concept.name if p.target_concept else None,
+                    gating_type=p.gating_type,
+                    mastery_type=p.mastery_type,
+                    mastery_threshold=float(p.mastery_threshold),
+                    origin=p.origin,
+                    anki_tag=p.anki_tag,
+                    status=p.status,
+                    notes=p.notes,
+                    created_at=p.created_at,
+                )
+                for p in prereqs
+            ]
+
+        return await response_cache.respond_async(request, [TAG_PREREQUISITES], build)
 
     except Exception as exc:
         logger.exception("Failed to list prerequisites")
@@ -383,6 +396,7 @@ async def update_prerequisite(
 
         if not prereq:
             raise HTTPException(status_code=404, detail="Prerequisite not found")
+        await _commit_and_invalidate(db)
 
         return PrerequisiteResponse(
             id=str(prereq.id),
@@ -424,6 +438,7 @@ async def delete_prerequisite(
 
         if not success:
             raise HTTPException(status_code=404, detail="Prerequisite not found")
+        await _commit_and_invalidate(db)
 
         return {"success": True, "message": "Prerequisite removed"}
 
@@ -573,10 +588,11 @@ async def check_access_post(
 )
 async def get_prerequisite_chain(
     concept_id: str,
+    request: Request,
     user_mastery: str | None = Query(None, description="JSON string of mastery data"),
     max_depth: int = Query(10, ge=1, le=20),
     db: AsyncSession = Depends(get_async_session),
-) -> PrerequisiteChainResponse:
+) -> Response:
     """
     Get the full prerequisite chain for a concept.
 
@@ -601,36 +617,42 @@ async def get_prerequisite_chain(
             except (json.JSONDecodeError, ValueError):
                 pass
 
-        chain = await service.get_prerequisite_chain(
-            concept_id=UUID(concept_id),
-            max_depth=max_depth,
-        )
+        async def build() -> PrerequisiteChainResponse:
+            chain = await service.get_prerequisite_chain(
+                concept_id=UUID(concept_id),
+                max_depth=max_depth,
+            )
 
-        # Get concept name
-        from sqlalchemy import select
-
-        from src.db.models import CleanConcept
-
-        result = await db.execute(select(CleanConcept).where(CleanConcept.id == UUID(concept_id)))
-        concept = result.scalar_one_or_none()
-
-        return PrerequisiteChainResponse(
-            target_concept_id=concept_id,
-            target_concept_name=concept.name if concept else concept_id,
-            chain=[
-                PrerequisiteChainNode(
-                    depth=node.depth,
-                    concept_id=str(node.concept_id),
-                    concept_name=node.concept_name,
-                    gating_type=node.gating_type,
-                    mastery_threshold=float(node.mastery_threshold),
-                    is_met=mastery_data.get(node.concept_id, 0) >= float(node.mastery_threshold),
-                    current_mastery=mastery_data.get(node.concept_id),
-                )
-                for node in chain
-            ],
-            total_depth=len(chain),
-        )
+            # Get concept name
+            from sqlalchemy import select
+
+            from src.db.models import CleanConcept
+
+            result = await db.execute(
+                select(CleanConcept).where(CleanConcept.id == UUID(concept_id))
+            )
+            concept = result.scalar_one_or_none()
+
+            return PrerequisiteChainResponse(
+                target_concept_id=concept_id,
+                target_concept_name=concept.name if concept else concept_id,
+                chain=[
+                    PrerequisiteChainNode(
+                        depth=node.depth,
+                        concept_id=str(node.concept_id),
+                        concept_name=node.concept_name,
+                        gating_type=node.gating_type,
+                        mastery_threshold=float(node.mastery_threshold),
+                        is_met=mastery_data.get(node.concept_id, 0)
+                        >= float(node.mastery_threshold),
+                        current_mastery=mastery_data.get(node.concept_id),
+                    )
+                    for node in chain
+                ],
+                total_depth=len(chain),
+            )
+
+        return await response_cache.respond_async(request, [TAG_PREREQUISITES], build)
 
     except Exception as exc:
         logger.exception(f"Failed to get prerequisite chain for {concept_id}")
@@ -751,6 +773,7 @@ async def sync_from_anki_tags(
             atom_id=UUID(request.atom_id),
             tags=request.tags,
         )
+        await _commit_and_invalidate(db)
 
         return AnkiTagSyncResponse(
             atom_id=request.atom_id,
@@ -982,7 +1005,7 @@ async def batch_import_prerequisites(
             except Exception as e:
                 errors.append({"row": i, "error": str(e)})
 
-        await db.commit()
+        await _commit_and_invalidate(db)
 
         return BatchImportResponse(
             success=len(errors) == 0,
@@ -15,11 +15,12 @@ from __future__ import annotations
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from loguru import logger
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
+from src.api.cache import TAG_SEMANTIC, response_cache
 from src.db.database import get_session
 
 router = APIRouter()
@@ -188,6 +189,7 @@ def generate_embeddings(
             regenerate=request.regenerate,
             limit=request.limit,
         )
+        response_cache.invalidate(TAG_SEMANTIC)
 
         return EmbeddingGenerateResponse(**result)
 
@@ -204,8 +206,9 @@ def generate_embeddings(
     summary="Get embedding coverage",
 )
 def get_embedding_coverage(
+    request: Request,
     db: Session = Depends(get_session),
-) -> EmbeddingCoverageResponse:
+) -> Response:
     """
     Get embedding coverage statistics for all supported tables.
 
@@ -214,10 +217,11 @@ def get_embedding_coverage(
     try:
         from src.semantic import BatchEmbeddingProcessor
 
-        processor = BatchEmbeddingProcessor(db)
-        coverage = processor.get_embedding_coverage()
+        def build() -> EmbeddingCoverageResponse:
+            processor = BatchEmbeddingProcessor(db)
+            return EmbeddingCoverageResponse(**processor.get_embedding_coverage())
 
-        return EmbeddingCoverageResponse(**coverage)
+        return response_cache.respond(request, [TAG_SEMANTIC], build)
 
     except Exception as exc:
         logger.exception("Failed to get embedding coverage")
@@ -352,6 +356,7 @@ def store_detected_duplicates(
         service = SemanticSimilarityService(db)
         matches = service.find_semantic_duplicates(threshold=threshold, limit=limit)
         stored = service.store_duplicate_pairs(matches)
+        response_cache.invalidate(TAG_SEMANTIC)
 
         return {
             "success": True,
@@ -370,16 +375,18 @@ def store_detected_duplicates(
     summary="Get duplicate statistics",
 )
 def get_duplicate_stats(
+    request: Request,
     db: Session = Depends(get_session),
-) -> DuplicateStatsResponse:
+) -> Response:
     """Get statistics about detected duplicates."""
     try:
         from src.semantic import SemanticSimilarityService
 
-        service = SemanticSimilarityService(db)
-        stats = service.get_duplicate_stats()
+        def build() -> DuplicateStatsResponse:
+            service = SemanticSimilarityService(db)
+            return DuplicateStatsResponse(**service.get_duplicate_stats())
 
-        return DuplicateStatsResponse(**stats)
+        return response_cache.respond(request, [TAG_SEMANTIC], build)
 
     except Exception as exc:
         logger.exception("Failed to get duplicate stats")
@@ -422,6 +429,7 @@ def infer_prerequisites(
             # Run batch inference and return recently generated
             service.infer_all_missing_prerequisites(batch_size=batch_size)
             suggestions = service.get_suggestions_for_review(limit=batch_size)
+        response_cache.invalidate(TAG_SEMANTIC)
 
         return PrerequisitesResponse(
             total_suggestions=len(suggestions),
@@ -449,10 +457,11 @@ def infer_prerequisites(
     summary="Get prerequisite suggestions",
 )
 def get_prerequisite_suggestions(
+    request: Request,
     min_confidence: str = Query("medium", description="Minimum confidence (low, medium, high)"),
     limit: int = Query(50, ge=1, le=500),
     db: Session = Depends(get_session),
-) -> PrerequisitesResponse:
+) -> Response:
     """
     Get pending prerequisite suggestions for review.
 
@@ -461,26 +470,29 @@ def get_prerequisite_suggestions(
     try:
         from src.semantic import PrerequisiteInferenceService
 
-        service = PrerequisiteInferenceService(db)
-        suggestions = service.get_suggestions_for_review(
-            min_confidence=min_confidence,
-            limit=limit,
-        )
+        def build() -> PrerequisitesResponse:
+            service = PrerequisiteInferenceService(db)
+            suggestions = service.get_suggestions_for_review(
+                min_confidence=min_confidence,
+                limit=limit,
+            )
 
-        return PrerequisitesResponse(
-            total_suggestions=len(suggestions),
-            suggestions=[
-                PrerequisiteSuggestionModel(
-                    source_atom_id=str(s.source_atom_id),
-                    target_concept_id=str(s.target_concept_id),
-                    concept_name=s.concept_name,
-                    concept_definition=s.concept_definition,
-                    similarity_score=s.similarity_score,
-                    confidence=s.confidence,
-                )
-                for s in suggestions
-            ],
-        )
+            return PrerequisitesResponse(
+                total_suggestions=len(suggestions),
+                suggestions=[
+                    PrerequisiteSuggestionModel(
+                        source_atom_id=str(s.source_atom_id),
+                        target_concept_id=str(s.target_concept_id),
+                        concept_name=s.concept_name,
+                        concept_definition=s.concept_definition,
+                        similarity_score=s.similarity_score,
+                        confidence=s.confidence,
+                    )
+                    for s in suggestions
+                ],
+            )
+
+        return response_cache.respond(request, [TAG_SEMANTIC], build)
 
     except Exception as exc:
         logger.exception("Failed to get prerequisite suggestions")
@@ -502,6 +514,7 @@ def accept_prerequisite(
 
         service = PrerequisiteInferenceService(db)
         success = service.accept_suggestion(UUID(atom_id), UUID(concept_id))
+        response_cache.invalidate(TAG_SEMANTIC)
 
         return {"success": success}
 
@@ -526,6 +539,7 @@ def reject_prerequisite(
 
         service = PrerequisiteInferenceService(db)
         success = service.reject_suggestion(UUID(atom_id), UUID(concept_id), notes)
+        response_cache.invalidate(TAG_SEMANTIC)
 
         return {"success": success}
 
@@ -540,16 +554,18 @@ def reject_prerequisite(
     summary="Get prerequisite statistics",
 )
 def get_prerequisite_stats(
+    request: Request,
     db: Session = Depends(get_session),
-) -> PrerequisiteStatsResponse:
+) -> Response:
     """Get statistics about prerequisite suggestions."""
     try:
         from src.semantic import PrerequisiteInferenceService
 
-        service = PrerequisiteInferenceService(db)
-        stats = service.get_suggestion_stats()
+        def build() -> PrerequisiteStatsResponse:
+            service = PrerequisiteInferenceService(db)
+            return PrerequisiteStatsResponse(**service.get_suggestion_stats())
 
-        return PrerequisiteStatsResponse(**stats)
+        return response_cache.respond(request, [TAG_SEMANTIC], build)
 
     except Exception as exc:
         logger.exception("Failed to get prerequisite stats")
@@ -17,6 +17,7 @@ from loguru import logger
 from pydantic import BaseModel
 
 from config import get_settings
+from src.api.cache import response_cache
 
 router = APIRouter()
 settings = get_settings()
@@ -95,6 +96,9 @@ def sync_notion(request: SyncRequest = SyncRequest()) -> SyncResponse:
             dry_run=request.dry_run,
             parallel=request.parallel,
         )
+        if not request.dry_run:
+            # Synced content feeds every cached read route
+            response_cache.invalidate_all()
 
         # Calculate totals
         total_added = sum(r.get("added", 0) for r in results.values())
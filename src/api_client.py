@@ -1,26 +1,67 @@
-﻿import httpx
-from typing import List, Dict, Any
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+from src.core.http_client import ResponseCache, build_async_client, cached_get_json
+
 
 class RightLearningClient:
-    def __init__(self, base_url: str, api_key: str):
+    """
+    Thin client for the right-learning REST API.
+
+    One pooled ``httpx.AsyncClient`` is reused for every call (keep-alive,
+    HTTP/2 when available); curriculum and due-atom payloads are revalidated
+    with ETags when ``cache_dir`` is set. Use as an async context manager or
+    call ``aclose()`` when done.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        cache_dir: Path | str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
         self.base_url = base_url
         self.headers = {"Authorization": f"Bearer {api_key}"}
+        self._cache = ResponseCache(cache_dir) if cache_dir else None
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
 
-    async def get_due_atoms(self, limit: int = 20) -> List[Dict[str, Any]]:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/api/Atoms/due",
-                headers=self.headers,
-                params={"limit": limit},
+    async def __aenter__(self) -> RightLearningClient:
+        self._get_client()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = build_async_client(
+                self.base_url, self.headers, transport=self._transport
             )
-            response.raise_for_status()
-            return response.json()
+        return self._client
 
-    async def get_curriculums(self) -> List[Dict[str, Any]]:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/api/Curriculum",
-                headers=self.headers,
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_json(self, path: str, params: Dict[str, Any] | None = None) -> Any:
+        status, body = await cached_get_json(self._get_client(), path, params, self._cache)
+        if status not in (200, 304):
+            raise httpx.HTTPStatusError(
+                f"GET {path} returned {status}",
+                request=httpx.Request("GET", f"{self.base_url}{path}"),
+                response=httpx.Response(status),
             )
-            response.raise_for_status()
-            return response.json()
+        return body
+
+    async def get_due_atoms(self, limit: int = 20) -> List[Dict[str, Any]]:
+        return await self._get_json("/api/Atoms/due", {"limit": limit})
+
+    async def get_curriculums(self) -> List[Dict[str, Any]]:
+        return await self._get_json("/api/Curriculum")
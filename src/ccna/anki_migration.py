@@ -19,11 +19,18 @@ from datetime import datetime
 from typing import Any
 
 from loguru import logger
-from rapidfuzz import fuzz
 
 from config import get_settings
 from src.anki.anki_client import AnkiClient
 from src.ccna.atomizer_service import GeneratedAtom
+from src.ccna.migration_matching import best_matches, normalize_text, similarity
+
+_CARD_SUFFIX = re.compile(r"-(FC|MCQ|CL|PAR|TF|MAT|CMP)-\d+$")
+
+
+def _base_card_id(card_id: str) -> str:
+    """Card ID without its atom-type suffix (NET-M1-S1-FC-1 -> NET-M1-S1)."""
+    return _CARD_SUFFIX.sub("", card_id)
 
 
 @dataclass
@@ -128,6 +135,8 @@ class AnkiMigrationService:
         self.anki_client = AnkiClient()
         self.similarity_threshold = settings.ccna_migration_similarity_threshold
         self.preserve_grades = [g.strip() for g in settings.ccna_preserve_grades.split(",")]
+        self.max_candidates = settings.ccna_migration_max_candidates
+        self.match_workers = settings.ccna_migration_match_workers
 
     async def export_learning_states(
         self,
@@ -249,62 +258,80 @@ class AnkiMigrationService:
         self,
         old_states: list[CardLearningState],
         new_atoms: list[GeneratedAtom],
+        exhaustive: bool = False,
     ) -> list[CardMatch]:
         """
         Find best matching new cards for old cards based on content similarity.
 
+        Candidates come from a word index over the new atoms (see
+        migration_matching); ``exhaustive`` scores every pair instead.
+
         Args:
             old_states: Learning states from existing cards
             new_atoms: Newly generated atoms
+            exhaustive: Score every old x new pair (slow; for recall checks)
 
         Returns:
             List of CardMatch objects for matched pairs
         """
+        candidates = [old for old in old_states if old.has_learning_progress]  # State to move
+        best = best_matches(
+            [(old.front_text, old.back_text, old.tags) for old in candidates],
+            [(new.front, new.back, new.tags) for new in new_atoms],
+            threshold=self.similarity_threshold,
+            max_candidates=None if exhaustive else self.max_candidates,
+            workers=self.match_workers,
+        )
+
+        by_id: dict[str, int] = {}
+        by_base: dict[str, int] = {}
+        for i, new in enumerate(new_atoms):
+            by_id.setdefault(new.card_id, i)
+            by_base.setdefault(_base_card_id(new.card_id), i)
+
         matches = []
+        for old, (new_index, score) in zip(candidates, best):
+            if new_index is None:
+                continue
 
-        for old in old_states:
-            if not old.has_learning_progress:
-                continue  # No state to transfer
-
-            best_match = None
-            best_score = 0.0
-
-            # Compare with each new atom
-            for new in new_atoms:
-                score = self._calculate_similarity(old, new)
-
-                if score > best_score and score >= self.similarity_threshold:
-                    best_score = score
-                    best_match = CardMatch(
-                        old_card_id=old.card_id,
-                        new_card_id=new.card_id,
-                        similarity_score=score,
-                        match_type="semantic",
-                        old_state=old,
-                    )
-
-            if best_match:
-                # Check for exact ID match first
-                for new in new_atoms:
-                    if self._is_id_match(old.card_id, new.card_id):
-                        best_match = CardMatch(
-                            old_card_id=old.card_id,
-                            new_card_id=new.card_id,
-                            similarity_score=1.0,
-                            match_type="exact",
-                            old_state=old,
-                        )
-                        break
-
-                matches.append(best_match)
-                logger.debug(
-                    f"Matched {old.card_id} -> {best_match.new_card_id} "
-                    f"({best_match.match_type}, {best_match.similarity_score:.2f})"
+            id_index = self._find_id_match(old.card_id, by_id, by_base)
+            if id_index is not None:
+                match = CardMatch(
+                    old_card_id=old.card_id,
+                    new_card_id=new_atoms[id_index].card_id,
+                    similarity_score=1.0,
+                    match_type="exact",
+                    old_state=old,
+                )
+            else:
+                match = CardMatch(
+                    old_card_id=old.card_id,
+                    new_card_id=new_atoms[new_index].card_id,
+                    similarity_score=score,
+                    match_type="semantic",
+                    old_state=old,
                 )
 
+            matches.append(match)
+            logger.debug(
+                f"Matched {old.card_id} -> {match.new_card_id} "
+                f"({match.match_type}, {match.similarity_score:.2f})"
+            )
+
         logger.info(f"Found {len(matches)} card matches for state transfer")
         return matches
 
+    def _find_id_match(
+        self, old_id: str, by_id: dict[str, int], by_base: dict[str, int]
+    ) -> int | None:
+        """First new atom whose ID matches ``old_id`` (see _is_id_match)."""
+        found = [by_id.get(old_id)]
+        old_base = _base_card_id(old_id)
+        if old_base != old_id:
+            found.append(by_base.get(old_base))
+        found_indexes = [i for i in found if i is not None]
+        return min(found_indexes) if found_indexes else None
+
     def _calculate_similarity(
         self,
         old: CardLearningState,
@@ -315,41 +342,18 @@ class AnkiMigrationService:
 
         Uses fuzzy string matching on front and back content.
         """
-        # Normalize text
-        old_front = self._normalize_text(old.front_text)
-        old_back = self._normalize_text(old.back_text)
-        new_front = self._normalize_text(new.front)
-        new_back = self._normalize_text(new.back)
-
-        # Calculate component scores
-        front_score = fuzz.token_set_ratio(old_front, new_front) / 100
-        back_score = fuzz.token_set_ratio(old_back, new_back) / 100
-
-        # Weight front more heavily (question defines the concept)
-        weighted_score = (front_score * 0.6) + (back_score * 0.4)
-
-        # Bonus for tag overlap
-        old_tags = set(old.tags)
-        new_tags = set(new.tags)
-        if old_tags and new_tags:
-            tag_overlap = len(old_tags & new_tags) / len(old_tags | new_tags)
-            weighted_score = (weighted_score * 0.9) + (tag_overlap * 0.1)
-
-        return weighted_score
+        return similarity(
+            normalize_text(old.front_text),
+            normalize_text(old.back_text),
+            frozenset(old.tags),
+            normalize_text(new.front),
+            normalize_text(new.back),
+            frozenset(new.tags),
+        )
 
     def _normalize_text(self, text: str) -> str:
         """Normalize text for comparison."""
-        if not text:
-            return ""
-
-        # Remove HTML tags
-        text = re.sub(r"<[^>]+>", " ", text)
-        # Remove code blocks
-        text = re.sub(r"```[\s\S]*?```", " ", text)
-        # Normalize whitespace
-        text = re.sub(r"\s+", " ", text)
-        # Lowercase
-        return text.lower().strip()
+        return normalize_text(text)
 
     def _is_id_match(self, old_id: str, new_id: str) -> bool:
         """Check if card IDs indicate the same content."""
@@ -358,8 +362,8 @@ class AnkiMigrationService:
             return True
 
         # Same prefix pattern (NET-M1-S1 -> NET-M1-S1-FC)
-        old_base = re.sub(r"-(FC|MCQ|CL|PAR|TF|MAT|CMP)-\d+$", "", old_id)
-        new_base = re.sub(r"-(FC|MCQ|CL|PAR|TF|MAT|CMP)-\d+$", "", new_id)
+        old_base = _base_card_id(old_id)
+        new_base = _base_card_id(new_id)
 
         return old_base == new_base and old_base != old_id
 
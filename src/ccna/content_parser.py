@@ -326,6 +326,16 @@ class CCNAContentParser:
             key=lambda p: self._extract_module_number(p.stem),
         )
 
+    def find_module(self, module_id: str) -> Path | None:
+        """File of a module by ID (NET-M<number>), or None if there is none."""
+        match = re.fullmatch(r"NET-M(\d+)", module_id)
+        if not match:
+            return None
+        for path in self.get_available_modules():
+            if self._extract_module_number(path.stem) == int(match.group(1)):
+                return path
+        return None
+
     def _extract_module_number(self, stem: str) -> int:
         """Extract module number from filename stem."""
         match = re.search(r"Module\s*(\d+)", stem, re.IGNORECASE)
@@ -0,0 +1,240 @@
+"""
+Candidate-blocked content matching for Anki state migration.
+
+Scoring every legacy card against every new atom is O(old x new). The
+blocked matcher instead:
+
+1. Normalizes every text once and indexes the new atoms in an inverted
+   index keyed by word (plural ``s`` stripped).
+2. Ranks, for each old card, the new atoms sharing its keys by IDF-weighted
+   containment (shared weight over the lighter card's weight, mirroring
+   ``token_set_ratio`` scoring a subset as a full match), skipping keys too
+   common to discriminate, and keeps the top ``max_candidates``.
+3. Fuzzy-scores only those candidates with the same weighted
+   ``token_set_ratio`` the exhaustive matcher uses, spread over a process
+   pool for large inputs.
+
+Pairs that share no rare word are never compared, so recall
+is measured against the exhaustive matcher (``max_candidates=None``)
+rather than assumed; see tests/benchmarks/migration_match.py.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+from rapidfuzz import fuzz
+
+MAX_DF = 0.05  # Keys on more than 5% of new atoms don't narrow anything
+MIN_POSTINGS_CAP = 64
+PARALLEL_MIN_PAIRS = 200_000  # Below this a process pool costs more than it saves
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# (front, back, tags) for one card
+CardText = tuple[str, str, Iterable[str]]
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, strip HTML and code blocks, collapse whitespace."""
+    if not text:
+        return ""
+    text = re.sub(r"<[^>]+>", " ", text)
+    text = re.sub(r"```[\s\S]*?```", " ", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.lower().strip()
+
+
+def index_keys(*texts: str) -> set[str]:
+    """Words of the (normalized) texts used as inverted-index keys."""
+    keys = set()
+    for text in texts:
+        for token in _TOKEN.findall(text):
+            if len(token) > 3 and token.endswith("s"):
+                token = token[:-1]
+            if len(token) > 1:
+                keys.add(token)
+    return keys
+
+
+def similarity(
+    old_front: str,
+    old_back: str,
+    old_tags: frozenset[str],
+    new_front: str,
+    new_back: str,
+    new_tags: frozenset[str],
+) -> float:
+    """
+    Weighted fuzzy similarity of two normalized cards.
+
+    Front counts 60%, back 40%; when both sides have tags, tag Jaccard
+    overlap contributes 10%.
+    """
+    front_score = fuzz.token_set_ratio(old_front, new_front) / 100
+    back_score = fuzz.token_set_ratio(old_back, new_back) / 100
+    score = (front_score * 0.6) + (back_score * 0.4)
+    if old_tags and new_tags:
+        overlap = len(old_tags & new_tags) / len(old_tags | new_tags)
+        score = (score * 0.9) + (overlap * 0.1)
+    return score
+
+
+@dataclass
+class CandidateIndex:
+    """Inverted index from word to the new atoms containing it."""
+
+    postings: dict[str, np.ndarray]
+    weights: np.ndarray  # Total IDF weight of each new atom's keys
+    size: int
+    max_postings: int
+
+    def idf(self, df: int) -> float:
+        return math.log(1 + self.size / df)
+
+    @classmethod
+    def build(cls, keys: Sequence[set[str]], max_df: float = MAX_DF) -> CandidateIndex:
+        lists: dict[str, list[int]] = {}
+        for i, doc_keys in enumerate(keys):
+            for key in doc_keys:
+                lists.setdefault(key, []).append(i)
+        size = len(keys)
+        index = cls(
+            postings={key: np.array(ids, dtype=np.int32) for key, ids in lists.items()},
+            weights=np.zeros(size),
+            size=size,
+            max_postings=max(MIN_POSTINGS_CAP, int(max_df * size)),
+        )
+        for i, doc_keys in enumerate(keys):
+            index.weights[i] = sum(index.idf(len(lists[key])) for key in doc_keys)
+        return index
+
+    def candidates(self, keys: set[str], limit: int) -> list[int]:
+        """
+        Top ``limit`` new atoms by IDF-weighted containment.
+
+        Keys over the postings cap are skipped, except that a card made
+        only of common words still gets its rarest key.
+
+        Returns:
+            Candidate indexes in ascending order
+        """
+        found = sorted(
+            (posting for key in keys if (posting := self.postings.get(key)) is not None), key=len
+        )
+        if not found:
+            return []
+        idfs = [self.idf(len(posting)) for posting in found]
+        query_weight = sum(idfs)
+        kept = 1 + sum(1 for posting in found[1:] if len(posting) <= self.max_postings)
+
+        shared = np.bincount(
+            np.concatenate(found[:kept]),
+            weights=np.repeat(idfs[:kept], [len(posting) for posting in found[:kept]]),
+            minlength=self.size,
+        )
+        hits = np.flatnonzero(shared)
+        if len(hits) > limit:
+            containment = shared[hits] / np.minimum(query_weight, self.weights[hits])
+            hits = np.sort(hits[np.argpartition(-containment, limit - 1)[:limit]])
+        return hits.tolist()
+
+
+@dataclass
+class _MatchContext:
+    """New-atom side of a match run, shipped once to each worker."""
+
+    fronts: list[str]
+    backs: list[str]
+    tags: list[frozenset[str]]
+    index: CandidateIndex | None
+    threshold: float
+    max_candidates: int
+
+
+# (position, front, back, tags) for one normalized old card
+_OldRow = tuple[int, str, str, frozenset[str]]
+
+_context: _MatchContext | None = None
+
+
+def _init_worker(context: _MatchContext) -> None:
+    global _context
+    _context = context
+
+
+def _best(context: _MatchContext, row: _OldRow) -> tuple[int, int | None, float]:
+    position, front, back, tags = row
+    if context.index is None:
+        candidates: Iterable[int] = range(len(context.fronts))
+    else:
+        candidates = context.index.candidates(index_keys(front, back), context.max_candidates)
+
+    best_index, best_score = None, 0.0
+    for i in candidates:  # Ascending, so ties keep the earliest atom
+        score = similarity(front, back, tags, context.fronts[i], context.backs[i], context.tags[i])
+        if score > best_score and score >= context.threshold:
+            best_index, best_score = i, score
+    return position, best_index, best_score
+
+
+def _match_chunk(rows: list[_OldRow]) -> list[tuple[int, int | None, float]]:
+    assert _context is not None
+    return [_best(_context, row) for row in rows]
+
+
+def best_matches(
+    old_cards: Sequence[CardText],
+    new_cards: Sequence[CardText],
+    threshold: float,
+    max_candidates: int | None = 64,
+    workers: int = 0,
+) -> list[tuple[int | None, float]]:
+    """
+    Best-scoring new card for each old card.
+
+    Args:
+        old_cards: (front, back, tags) of the cards being replaced
+        new_cards: (front, back, tags) of the replacement atoms
+        threshold: Minimum similarity for a match
+        max_candidates: Candidates scored per old card; None scores all (exhaustive)
+        workers: Worker processes; 0 uses every core, 1 stays in-process
+
+    Returns:
+        (new index or None, score) per old card, in input order
+    """
+    fronts, backs, tags = [], [], []
+    for front, back, card_tags in new_cards:
+        fronts.append(normalize_text(front))
+        backs.append(normalize_text(back))
+        tags.append(frozenset(card_tags))
+
+    index = None
+    limit = len(new_cards)
+    if max_candidates is not None and max_candidates < len(new_cards):
+        index = CandidateIndex.build([index_keys(f, b) for f, b in zip(fronts, backs)])
+        limit = max_candidates
+    context = _MatchContext(fronts, backs, tags, index, threshold, limit)
+
+    rows = [
+        (n, normalize_text(front), normalize_text(back), frozenset(card_tags))
+        for n, (front, back, card_tags) in enumerate(old_cards)
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(rows) * limit < PARALLEL_MIN_PAIRS:
+        results = [_best(context, row) for row in rows]
+    else:
+        chunk_size = max(1, math.ceil(len(rows) / (workers * 4)))
+        chunks = [rows[i : i + chunk_size] for i in range(0, len(rows), chunk_size)]
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(context,)
+        ) as pool:
+            results = [r for chunk in pool.map(_match_chunk, chunks) for r in chunk]
+
+    return [(new_index, score) for _, new_index, score in results]
@@ -2188,6 +2188,138 @@ def cortex_stats():
     ))
 
 
+@cortex_app.command("telemetry")
+def cortex_telemetry(
+    days: int = typer.Option(90, "--days", "-d", help="Days of telemetry to scan"),
+    log_dir: Optional[Path] = typer.Option(None, "--log-dir", help="Telemetry directory"),
+):
+    """
+    Analyse JSON session telemetry across days.
+
+    Streams plain and compressed session logs and reports accuracy,
+    response-time percentiles, the accuracy-by-position curve and
+    where fatigue sets in.
+    """
+    from src.delivery.telemetry_query import TelemetryQuery
+
+    start = (datetime.now() - timedelta(days=days)).date()
+    report = TelemetryQuery(log_dir=log_dir).summarize(start=start)
+
+    if not report.interactions:
+        console.print(f"[dim]No telemetry interactions in the last {days} days.[/dim]")
+        return
+
+    summary = Table(
+        title="[bold cyan]SESSION TELEMETRY[/bold cyan]",
+        box=box.HEAVY,
+        border_style=Style(color=CORTEX_THEME["secondary"]),
+        show_header=False,
+    )
+    summary.add_column("Metric", style=Style(color=CORTEX_THEME["dim"]))
+    summary.add_column("Value", justify="right", style=Style(color=CORTEX_THEME["white"]))
+    summary.add_row("Sessions", str(report.sessions))
+    summary.add_row("Interactions", str(report.interactions))
+    summary.add_row("Accuracy", f"{report.accuracy_percent:.1f}%")
+    for p, value in report.rt_percentiles.items():
+        summary.add_row(f"RT p{p}", f"{value / 1000:.1f}s")
+    onset = report.fatigue_onset_position
+    summary.add_row("Fatigue onset", f"card {onset}" if onset is not None else "not detected")
+    if report.diagnosed_fatigue_sessions:
+        summary.add_row(
+            "Diagnosed fatigue",
+            f"{report.diagnosed_fatigue_sessions} sessions "
+            f"(median card {report.diagnosed_fatigue_median_position:.0f})",
+        )
+    console.print(summary)
+
+    curve = Table(
+        title="[bold cyan]ACCURACY BY POSITION[/bold cyan]",
+        box=box.HEAVY,
+        border_style=Style(color=CORTEX_THEME["secondary"]),
+    )
+    curve.add_column("Cards", style=Style(color=CORTEX_THEME["dim"]))
+    curve.add_column("N", justify="right")
+    curve.add_column("Accuracy", justify="right")
+    for position, count, accuracy in report.accuracy_by_position:
+        curve.add_row(f"{position}+", str(count), f"{accuracy:.1f}%")
+    console.print(curve)
+
+
+@cortex_app.command("profile")
+def cortex_profile(
+    limit: int = typer.Option(20, "--limit", "-l", help="Atoms in the scripted session"),
+    modules: Optional[str] = typer.Option(None, "--modules", "-m", help="Module filter: 5 or 1-3"),
+    accuracy: float = typer.Option(0.75, "--accuracy", help="Share of scripted answers that are correct"),
+    seed: int = typer.Option(7, "--seed", help="Seed for scripted answers"),
+    min_percent: float = typer.Option(0.5, "--min-percent", help="Hide spans below this share"),
+    show_output: bool = typer.Option(False, "--show-output", help="Render the session to the terminal"),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Don't ask before recording reviews"),
+):
+    """
+    Profile a scripted study session.
+
+    Runs CortexSession with scripted answers (no prompts or breaks) and
+    prints a flame-style breakdown of span time and SQL statements for
+    queue loading, rendering, interaction handling and the NCDE pipeline,
+    then the time from each card's end to the next question being shown.
+
+    Reviews and struggle updates are recorded like a real session, so
+    point it at a scratch database for repeatable numbers.
+    """
+    import io
+
+    import src.cortex.session as session_module
+    from src.core import profiling
+
+    if not yes and not Confirm.ask(
+        "The scripted session records reviews to the configured database. Continue?",
+        default=False,
+    ):
+        return
+
+    filter_modules, _, _ = resolve_filters(modules_arg=modules)
+    rng = random.Random(seed)
+
+    profiling.profiler.reset()
+    profiling.instrument_engine(engine)
+    profiling.enable()
+    session_console = session_module.console
+    if not show_output:
+        # Still render (that's part of the cost), just not to the terminal
+        session_module.console = Console(file=io.StringIO(), force_terminal=True, width=120)
+    try:
+        with profiling.span("profile"):
+            with profiling.span("session.init"):
+                session = CortexSession(
+                    modules=filter_modules or list(range(1, 18)),
+                    limit=limit,
+                    answer_provider=lambda note: rng.random() < accuracy,
+                )
+            session.run()
+    finally:
+        session_module.console = session_console
+        profiling.disable()
+
+    console.print(
+        Panel(
+            profiling.render_breakdown(min_percent=min_percent),
+            title="[bold cyan]SESSION PROFILE[/bold cyan]",
+            border_style=Style(color=CORTEX_THEME["primary"]),
+            box=box.HEAVY,
+        )
+    )
+
+    render_ms = sorted(session.render_times_ms)
+    if render_ms:
+        p50 = render_ms[len(render_ms) // 2]
+        p95 = render_ms[min(len(render_ms) - 1, int(len(render_ms) * 0.95))]
+        console.print(
+            f"Time to render: p50 {p50:.1f} ms, p95 {p95:.1f} ms, max {render_ms[-1]:.1f} ms "
+            f"over {len(render_ms)} cards (prefetched {session.prefetcher.hits}, "
+            f"built on demand {session.prefetcher.misses})"
+        )
+
+
 @cortex_app.command("today")
 def cortex_today():
     """
@@ -123,13 +123,18 @@ async def _run_study_session(
 
     if config.is_connected:
         # API mode - fetch from platform
-        async with PlatformClient(config.api) as client:
+        # The first batch is prefetched while the health check runs
+        api_config = config.api.model_copy(update={"due_batch_size": card_limit})
+        async with PlatformClient(api_config) as client:
             if not await client.health_check():
                 console.print("[yellow]⚠ Platform unreachable, switching to offline[/]")
                 config.mode = OperatingMode.OFFLINE
                 strategy = get_mode_strategy(config)
 
-            atoms = await strategy.get_due_atoms(card_limit)
+                atoms = await strategy.get_due_atoms(card_limit)
+            else:
+                # One batch per session until the study loop runs inside this block
+                atoms = await client.next_due_batch(prefetch_next=False)
             console.print(f"[green]Loaded {len(atoms)} cards from platform[/]")
     else:
         # Offline mode - use local database
@@ -162,6 +167,10 @@ def sync(
     """
     config = get_config()
 
+    if config.mode == OperatingMode.OFFLINE:
+        console.print("[cyan]🔄 Syncing local replica...[/]")
+        asyncio.run(_run_replica_sync(config))
+        return
     if config.mode != OperatingMode.API:
         console.print("[yellow]Sync requires API mode. Set CORTEX_API_KEY.[/]")
         return
@@ -170,6 +179,22 @@ def sync(
     asyncio.run(_run_sync(config, force))
 
 
+async def _run_replica_sync(config: CortexCliConfig) -> None:
+    """Push local reviews and pull changed study tables into the replica."""
+    result = await get_mode_strategy(config).sync()
+
+    table = Table(title="Replica Sync Results")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="green")
+    table.add_row("Reviews Uploaded", str(result["uploaded"]))
+    table.add_row("Rows Downloaded", str(result["downloaded"]))
+    table.add_row("Pending Reviews", str(result["pending_syncs"]))
+    table.add_row("Status", "✓ Success" if not result["errors"] else "✗ Failed")
+    console.print(table)
+    for error in result["errors"]:
+        console.print(f"[red]{error}[/]")
+
+
 async def _run_sync(config: CortexCliConfig, force: bool) -> None:
     """Execute sync operation."""
     async with PlatformClient(config.api) as client:
@@ -3,6 +3,7 @@ Cortex Stats: Statistics calculation and display for the Cortex CLI.
 
 Extracted from cortex.py for better maintainability.
 Provides pre-session stats, struggle stats, and severity calculations.
+Dashboard aggregates read the pre-aggregated rollups in src.study.summary_store.
 """
 
 from __future__ import annotations
@@ -12,6 +13,7 @@ from rich.console import Console
 from sqlalchemy import text
 
 from src.db.database import engine
+from src.study.summary_store import get_summary_store
 
 console = Console()
 
@@ -47,51 +49,30 @@ def get_pre_session_stats() -> dict:
         streak_days, struggle_zones, struggle_count, due_count, new_count
     """
     try:
-        with engine.connect() as conn:
-            # Get overall mastery
-            result = conn.execute(text("""
-                SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN nls_correct_count > nls_incorrect_count THEN 1 ELSE 0 END) as mastered
-                FROM learning_atoms
-                WHERE atom_type IN ('mcq', 'true_false', 'numeric', 'parsons')
-            """))
-            row = result.fetchone()
-            total = row[0] or 1
-            mastered = row[1] or 0
-            overall_mastery = int((mastered / total) * 100) if total > 0 else 0
-
-            # Get streak (placeholder)
-            streak_days = 0
-
-            # Get struggle zones (grouped by module to avoid duplicates)
-            result = conn.execute(text("""
-                SELECT module_number, MAX(weight) as max_weight, AVG(weight) as avg_weight
-                FROM struggle_weights
-                WHERE weight > 0.5
-                GROUP BY module_number
-                ORDER BY max_weight DESC
-                LIMIT 5
-            """))
-            struggle_zones = [
-                {
-                    "module_number": row[0],
-                    "weight": float(row[1]) if row[1] else 0.0,
-                    "avg_priority": float(row[2]) if row[2] else 0.0,
-                }
-                for row in result.fetchall()
-            ]
+        snapshot = get_summary_store().snapshot()
+
+        # Get overall mastery
+        atoms = snapshot.atom_totals(atom_types=("mcq", "true_false", "numeric", "parsons"))
+        total = atoms["atom_count"] or 1
+        mastered = atoms["nls_mastered_count"]
+        overall_mastery = int((mastered / total) * 100) if total > 0 else 0
+
+        # Get streak (placeholder)
+        streak_days = 0
 
-            return {
-                "overall_mastery": overall_mastery,
-                "sections_total": total,
-                "sections_complete": mastered,
-                "streak_days": streak_days,
-                "struggle_zones": struggle_zones,
-                "struggle_count": len(struggle_zones),
-                "due_count": 0,
-                "new_count": 0,
-            }
+        # Get struggle zones (grouped by module to avoid duplicates)
+        struggle_zones = snapshot.struggle_zones(min_weight=0.5, limit=5)
+
+        return {
+            "overall_mastery": overall_mastery,
+            "sections_total": total,
+            "sections_complete": mastered,
+            "streak_days": streak_days,
+            "struggle_zones": struggle_zones,
+            "struggle_count": len(struggle_zones),
+            "due_count": 0,
+            "new_count": 0,
+        }
     except Exception as e:
         logger.warning(f"Failed to get pre-session stats: {e}")
         return {
@@ -167,35 +148,24 @@ def get_module_stats() -> list[dict]:
         mastery_pct, struggle_weight
     """
     try:
-        with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT
-                    cs.module_number,
-                    COUNT(la.id) as atom_count,
-                    COUNT(la.id) FILTER (WHERE la.anki_review_count > 0) as reviewed_count,
-                    ROUND(
-                        COUNT(la.id) FILTER (WHERE la.nls_correct_count > la.nls_incorrect_count)::numeric /
-                        NULLIF(COUNT(la.id), 0) * 100,
-                        1
-                    ) as mastery_pct,
-                    COALESCE(MAX(sw.weight), 0) as max_struggle
-                FROM ccna_sections cs
-                LEFT JOIN learning_atoms la ON la.ccna_section_id = cs.section_id
-                LEFT JOIN struggle_weights sw ON sw.section_id = cs.section_id
-                GROUP BY cs.module_number
-                ORDER BY cs.module_number
-            """))
-
-            return [
-                {
-                    "module_number": row[0],
-                    "atom_count": row[1] or 0,
-                    "reviewed_count": row[2] or 0,
-                    "mastery_pct": float(row[3]) if row[3] else 0.0,
-                    "struggle_weight": float(row[4]) if row[4] else 0.0,
-                }
-                for row in result.fetchall()
-            ]
+        snapshot = get_summary_store().snapshot()
+        struggle = snapshot.max_struggle_by_section_module()
+
+        stats = []
+        for module_number in snapshot.modules():
+            atoms = snapshot.atom_totals(module_number=module_number, has_section=True)
+            atom_count = atoms["atom_count"]
+            mastery_pct = (
+                round(atoms["nls_mastered_count"] / atom_count * 100, 1) if atom_count else 0.0
+            )
+            stats.append({
+                "module_number": module_number,
+                "atom_count": atom_count,
+                "reviewed_count": atoms["reviewed_count"],
+                "mastery_pct": mastery_pct,
+                "struggle_weight": struggle.get(module_number, 0.0),
+            })
+        return stats
     except Exception as e:
         logger.warning(f"Failed to get module stats: {e}")
         return []
@@ -209,15 +179,7 @@ def get_atom_type_stats() -> dict[str, int]:
         Dict mapping atom_type to count
     """
     try:
-        with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT atom_type, COUNT(*) as count
-                FROM learning_atoms
-                WHERE front IS NOT NULL AND front != ''
-                GROUP BY atom_type
-                ORDER BY count DESC
-            """))
-            return {row[0]: row[1] for row in result.fetchall()}
+        return get_summary_store().snapshot().authored_by_type()
     except Exception as e:
         logger.warning(f"Failed to get atom type stats: {e}")
         return {}
@@ -0,0 +1,154 @@
+"""
+Shared HTTP plumbing for right-learning platform clients.
+
+Provides:
+- build_async_client(): pooled httpx.AsyncClient with keep-alive (HTTP/2 when
+  the optional ``h2`` package is installed)
+- ResponseCache: on-disk ETag cache so unchanged curriculum/atom payloads
+  come back as ``304 Not Modified`` instead of full bodies
+- cached_get_json(): GET with If-None-Match revalidation against the cache
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import httpx
+from loguru import logger
+
+# Pool defaults: the CLI talks to one host, so a small keep-alive pool is
+# enough to avoid a TCP+TLS handshake per request.
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = 30.0
+
+
+def http2_available() -> bool:
+    """HTTP/2 support in httpx needs the optional ``h2`` package."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def build_async_client(
+    base_url: str,
+    headers: dict[str, str] | None = None,
+    *,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    http2: bool = True,
+    timeout: float = DEFAULT_TIMEOUT,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    """
+    Create a pooled AsyncClient intended to live for the whole session.
+
+    Args:
+        base_url: API base URL
+        headers: Default request headers
+        max_connections: Connection pool size
+        keepalive_expiry: Seconds idle connections are kept open
+        http2: Negotiate HTTP/2 when ``h2`` is installed
+        timeout: Request timeout in seconds
+        transport: Custom transport (tests / local stub servers)
+    """
+    use_http2 = http2 and http2_available() and transport is None
+    return httpx.AsyncClient(
+        base_url=base_url,
+        headers=headers or {},
+        timeout=timeout,
+        http2=use_http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        transport=transport,
+    )
+
+
+class ResponseCache:
+    """
+    Disk cache of JSON responses keyed by URL + query params.
+
+    Each entry stores the ETag and body; entries are written atomically so a
+    crash mid-write never leaves a truncated file behind.
+    """
+
+    def __init__(self, cache_dir: Path | str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(url: str, params: dict[str, Any] | None = None) -> str:
+        raw = json.dumps([url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> tuple[str, Any] | None:
+        """Return (etag, body) or None."""
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            return entry["etag"], entry["body"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key: str, etag: str, body: Any) -> None:
+        path = self._path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"etag": etag, "body": body}, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.debug(f"Could not write HTTP cache entry: {e}")
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        for path in self.cache_dir.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+async def cached_get_json(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict[str, Any] | None = None,
+    cache: ResponseCache | None = None,
+) -> tuple[int, Any]:
+    """
+    GET a JSON resource, revalidating with If-None-Match when cached.
+
+    Returns:
+        (status_code, body). On 304 the cached body is returned; on non-2xx
+        responses body is the decoded error payload (or None).
+    """
+    key = cache.key(url, params) if cache else None
+    cached = cache.get(key) if cache and key else None
+
+    headers = {"If-None-Match": cached[0]} if cached else None
+    response = await client.get(url, params=params, headers=headers)
+
+    if response.status_code == 304 and cached:
+        logger.debug(f"HTTP cache hit (304): {url}")
+        return 304, cached[1]
+
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+
+    if response.status_code == 200 and cache and key:
+        etag = response.headers.get("ETag")
+        if etag:
+            cache.put(key, etag, body)
+    return response.status_code, body
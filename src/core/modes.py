@@ -20,6 +20,8 @@ from typing import Any
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
 
 class OperatingMode(str, Enum):
     """Operating mode for cortex-cli."""
@@ -44,6 +46,18 @@ class ApiConfig(BaseModel):
     progress_endpoint: str = "/api/v1/progress"
     struggles_endpoint: str = "/api/v1/struggles"
 
+    # Transport (one pooled client per session)
+    max_connections: int = 10
+    keepalive_expiry_seconds: float = 30.0
+    http2: bool = True  # Used when the optional h2 package is installed
+    cache_dir: Path | None = Path.home() / ".cortex" / "http_cache"  # ETag cache
+
+    # Latency hiding
+    prefetch_due_atoms: bool = True  # Fetch next batch while learner answers
+    due_batch_size: int = 50  # Batch prefetched when the client opens
+    review_batch_size: int = 20  # Deferred reviews flushed in bulk
+    review_flush_seconds: float = 5.0
+
 
 class PipelineConfig(BaseModel):
     """Configuration for Pipeline mode (CI/CD)."""
@@ -67,13 +81,17 @@ class PipelineConfig(BaseModel):
 class OfflineConfig(BaseModel):
     """Configuration for Offline mode (local-only)."""
 
-    database_path: Path = Path("data/cortex.db")
+    database_path: Path = _PROJECT_ROOT / "data" / "cortex.db"
     export_dir: Path = Path("exports")
 
     # Sync points for later reconciliation
     track_pending_syncs: bool = True
     max_offline_days: int = 30
 
+    # Local read replica (study tables mirrored from PostgreSQL)
+    use_replica: bool = True  # Serve sessions from database_path once synced
+    replica_push_batch_size: int = 500  # Reviews per push transaction
+
     # Local features
     enable_local_ai: bool = False  # Ollama/local LLM
     local_model: str = "llama3.2"
@@ -312,19 +330,50 @@ class OfflineModeStrategy(ModeStrategy):
             mode=OperatingMode.OFFLINE,
         )
 
+    def _service(self):
+        """Replica-backed study service (None until the replica has been synced)."""
+        from src.study.replica_study_service import ReplicaStudyService, open_study_service
+
+        if getattr(self, "_replica_service", None) is None:
+            offline = self.config.offline
+            service = open_study_service(
+                replica_path=offline.database_path, prefer_replica=offline.use_replica
+            )
+            if isinstance(service, ReplicaStudyService):
+                self._replica_service = service
+        return getattr(self, "_replica_service", None)
+
     async def record_review(
         self, atom_id: str, grade: int, response_ms: int
     ) -> dict[str, Any]:
         # Record locally, mark for future sync
-        return {"synced": False, "atom_id": atom_id, "pending_sync": True}
+        service = self._service()
+        if service is None:
+            return {"synced": False, "atom_id": atom_id, "pending_sync": True}
+        result = service.record_interaction(atom_id, grade > 1, response_ms)
+        return {"synced": False, **result}
 
     async def get_due_atoms(self, limit: int = 50) -> list[dict[str, Any]]:
         # Fetch from local SQLite
-        return []
+        service = self._service()
+        if service is None:
+            return []
+        return service.get_adaptive_session(limit=limit)
 
     async def sync(self) -> dict[str, Any]:
-        # Export pending changes for manual sync
-        return {"status": "offline", "pending_syncs": 0}
+        # Push local reviews and pull changed rows when the database is reachable
+        from src.db.replica import LocalReplica, ReplicaSync
+
+        offline = self.config.offline
+        replica = LocalReplica(offline.database_path)
+        result = ReplicaSync(replica, batch_size=offline.replica_push_batch_size).sync()
+        return {
+            "status": "synced" if result.success else "offline",
+            "uploaded": result.pushed_reviews,
+            "downloaded": sum(result.pulled_rows.values()),
+            "pending_syncs": replica.pending_count(),
+            "errors": result.errors,
+        }
 
 
 def get_mode_strategy(config: CortexCliConfig) -> ModeStrategy:
@@ -5,10 +5,11 @@ HTTP client for syncing cortex-cli with the right-learning platform.
 Handles authentication, bidirectional sync, and offline reconciliation.
 
 Usage:
-    client = PlatformClient(config.api)
-    await client.authenticate()
-    due_atoms = await client.get_due_atoms()
-    await client.record_review(atom_id, grade, response_ms)
+    async with PlatformClient(config.api) as client:   # starts the first prefetch
+        await client.authenticate()
+        due_atoms = await client.next_due_batch()      # prefetches the following batch
+        await client.record_review(atom_id, grade, response_ms, defer=True)
+    # Leaving the block cancels the prefetch and flushes deferred reviews
 """
 
 from __future__ import annotations
@@ -21,6 +22,7 @@ from typing import Any
 import httpx
 from loguru import logger
 
+from .http_client import ResponseCache, build_async_client, cached_get_json
 from .modes import ApiConfig
 
 
@@ -56,16 +58,44 @@ class PlatformClient:
     - Bidirectional sync (reviews up, atoms down)
     - Offline queue reconciliation
     - Progress tracking
+
+    Latency:
+    - One pooled keep-alive client per instance (HTTP/2 when available)
+    - ETag revalidation of atom payloads against an on-disk cache
+    - Background prefetch of the next due-atom batch (next_due_batch)
+    - Deferred reviews flushed via the bulk endpoint (record_review(defer=True))
+
+    Background tasks belong to the client: the first prefetch starts in
+    ``__aenter__`` and close() cancels prefetches and flushes deferred reviews.
     """
 
-    def __init__(self, config: ApiConfig):
+    def __init__(
+        self,
+        config: ApiConfig,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
         self.config = config
+        self._transport = transport
         self._client: httpx.AsyncClient | None = None
         self._token: str | None = None
         self._learner_id: str | None = config.learner_id
+        self._cache = ResponseCache(config.cache_dir) if config.cache_dir else None
+
+        # Due-atom prefetch state. Atoms already handed out are excluded from
+        # later batches instead of paged past by offset.
+        self._prefetch_task: asyncio.Task[list[dict[str, Any]]] | None = None
+        self._prefetch_limit = 0
+        self._served_atom_ids: set[str] = set()
+
+        # Deferred review buffer, flushed by _flush_loop
+        self._pending_reviews: list[dict[str, Any]] = []
+        self._flush_task: asyncio.Task[None] | None = None
+        self._flush_now = asyncio.Event()
 
     async def __aenter__(self) -> "PlatformClient":
         await self._ensure_client()
+        if self.config.prefetch_due_atoms:
+            self._start_prefetch(self.config.due_batch_size)
         return self
 
     async def __aexit__(self, *args: Any) -> None:
@@ -79,15 +109,33 @@ class PlatformClient:
             if self._token:
                 headers["Authorization"] = f"Bearer {self._token}"
 
-            self._client = httpx.AsyncClient(
-                base_url=self.config.base_url,
-                headers=headers,
-                timeout=30.0,
+            self._client = build_async_client(
+                self.config.base_url,
+                headers,
+                max_connections=self.config.max_connections,
+                keepalive_expiry=self.config.keepalive_expiry_seconds,
+                http2=self.config.http2,
+                transport=self._transport,
             )
         return self._client
 
     async def close(self) -> None:
+        """Cancel the due-atom prefetch, flush deferred reviews and close the pool."""
+        await self._cancel_prefetch()
+
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+
         if self._client:
+            if self._pending_reviews:
+                result = await self.flush_reviews()
+                if not result.get("success"):
+                    logger.error(
+                        f"{len(self._pending_reviews)} deferred reviews not submitted; "
+                        "read pending_reviews to queue them for sync"
+                    )
             await self._client.aclose()
             self._client = None
 
@@ -120,6 +168,11 @@ class PlatformClient:
                 if self._client and self._token:
                     self._client.headers["Authorization"] = f"Bearer {self._token}"
 
+                # A prefetch sent before authenticating used the old credentials
+                if self._prefetch_task is not None:
+                    await self._cancel_prefetch()
+                    self._start_prefetch(self._prefetch_limit)
+
                 logger.info(f"Authenticated as learner: {self._learner_id}")
                 return AuthResult(
                     success=True,
@@ -154,33 +207,82 @@ class PlatformClient:
         Returns:
             List of atom dictionaries
         """
+        params = {"due": "true", "limit": limit, "learner_id": self._learner_id}
+
         try:
             client = await self._ensure_client()
-            response = await client.get(
-                self.config.atoms_endpoint,
-                params={"due": "true", "limit": limit, "learner_id": self._learner_id},
+            status, body = await cached_get_json(
+                client, self.config.atoms_endpoint, params, self._cache
             )
 
-            if response.status_code == 200:
-                atoms = response.json().get("atoms", [])
+            if status in (200, 304):
+                atoms = (body or {}).get("atoms", [])
                 logger.debug(f"Fetched {len(atoms)} due atoms from platform")
                 return atoms
             else:
-                logger.warning(f"Failed to fetch due atoms: {response.status_code}")
+                logger.warning(f"Failed to fetch due atoms: {status}")
                 return []
 
         except httpx.RequestError as e:
             logger.error(f"Connection error fetching atoms: {e}")
             return []
 
+    async def next_due_batch(
+        self, limit: int | None = None, prefetch_next: bool = True
+    ) -> list[dict[str, Any]]:
+        """
+        Return the next batch of due atoms not yet handed out by this client.
+
+        Atoms from earlier batches are excluded by ID rather than skipped with
+        an offset: reviews move atoms out of the due set, so offsets would
+        jump past atoms that were never served. Each request asks for
+        ``limit`` more atoms than have been served, so the exclusion costs one
+        slightly larger response per batch.
+
+        Args:
+            limit: Batch size (default: config.due_batch_size)
+            prefetch_next: Request the following batch in the background, so
+                it is usually ready when the learner finishes this one
+        """
+        limit = limit or self.config.due_batch_size
+        task, self._prefetch_task = self._prefetch_task, None
+        if task is not None and self._prefetch_limit == limit:
+            atoms = await task
+        else:
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            atoms = await self.get_due_atoms(limit + len(self._served_atom_ids))
+
+        batch = [a for a in atoms if a.get("id") not in self._served_atom_ids][:limit]
+        self._served_atom_ids.update(a["id"] for a in batch if "id" in a)
+
+        if batch and prefetch_next and self.config.prefetch_due_atoms:
+            self._start_prefetch(limit)
+        return batch
+
+    def _start_prefetch(self, limit: int) -> None:
+        self._prefetch_limit = limit
+        self._prefetch_task = asyncio.create_task(
+            self.get_due_atoms(limit + len(self._served_atom_ids))
+        )
+
+    async def _cancel_prefetch(self) -> None:
+        task, self._prefetch_task = self._prefetch_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
     async def get_atom(self, atom_id: str) -> dict[str, Any] | None:
-        """Fetch a single atom by ID."""
+        """Fetch a single atom by ID (ETag-revalidated)."""
         try:
             client = await self._ensure_client()
-            response = await client.get(f"{self.config.atoms_endpoint}/{atom_id}")
+            status, body = await cached_get_json(
+                client, f"{self.config.atoms_endpoint}/{atom_id}", None, self._cache
+            )
 
-            if response.status_code == 200:
-                return response.json()
+            if status in (200, 304):
+                return body
             return None
 
         except httpx.RequestError as e:
@@ -197,6 +299,7 @@ class PlatformClient:
         grade: int,
         response_ms: int,
         session_id: str | None = None,
+        defer: bool = False,
     ) -> dict[str, Any]:
         """
         Record a review on the platform.
@@ -206,9 +309,13 @@ class PlatformClient:
             grade: FSRS grade (1-4)
             response_ms: Response time in milliseconds
             session_id: Optional study session ID
+            defer: Buffer the review and submit it with the next bulk flush
+                (review_batch_size reviews, review_flush_seconds, or close())
+                instead of a round trip now
 
         Returns:
             Review result with updated scheduling info
+            (``{"success": True, "deferred": True}`` when deferred)
         """
         payload = {
             "atom_id": atom_id,
@@ -219,6 +326,10 @@ class PlatformClient:
             "timestamp": datetime.utcnow().isoformat(),
         }
 
+        if defer:
+            self._defer_review(payload)
+            return {"success": True, "deferred": True}
+
         try:
             client = await self._ensure_client()
             response = await client.post(self.config.reviews_endpoint, json=payload)
@@ -270,6 +381,52 @@ class PlatformClient:
         except httpx.RequestError as e:
             return {"success": False, "error": str(e)}
 
+    def _defer_review(self, payload: dict[str, Any]) -> None:
+        self._pending_reviews.append(payload)
+        if len(self._pending_reviews) >= self.config.review_batch_size:
+            self._flush_now.set()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """Flush deferred reviews when the batch fills or after review_flush_seconds."""
+        while self._pending_reviews:
+            try:
+                await asyncio.wait_for(
+                    self._flush_now.wait(), timeout=self.config.review_flush_seconds
+                )
+            except TimeoutError:
+                pass
+            self._flush_now.clear()
+            await self.flush_reviews()
+
+    async def flush_reviews(self) -> dict[str, Any]:
+        """
+        Submit all deferred reviews in one bulk request.
+
+        Reviews that fail to upload (or whose upload is cancelled) go back
+        into the buffer for the next flush.
+        """
+        reviews, self._pending_reviews = self._pending_reviews, []
+        if not reviews:
+            return {"success": True, "uploaded": 0}
+
+        try:
+            result = await self.bulk_upload_reviews(reviews)
+        except asyncio.CancelledError:
+            self._pending_reviews = reviews + self._pending_reviews
+            raise
+
+        if not result.get("success"):
+            logger.warning(f"Deferred review flush failed: {result.get('error')}")
+            self._pending_reviews = reviews + self._pending_reviews
+        return result
+
+    @property
+    def pending_reviews(self) -> list[dict[str, Any]]:
+        """Deferred reviews not yet submitted (e.g. to queue for offline sync)."""
+        return list(self._pending_reviews)
+
     # =========================================================================
     # Progress & Struggles
     # =========================================================================
@@ -343,11 +500,20 @@ class PlatformClient:
         """
         result = SyncResult(success=True)
 
+        # Flush reviews deferred during this session first
+        if self._pending_reviews:
+            flushed = await self.flush_reviews()
+            if flushed.get("success"):
+                result.uploaded_reviews += flushed.get("uploaded", 0)
+                result.conflicts.extend(flushed.get("conflicts", []))
+            else:
+                result.errors.append(f"Deferred upload failed: {flushed.get('error')}")
+
         # Upload pending reviews
         if pending_reviews:
             upload_result = await self.bulk_upload_reviews(pending_reviews)
             if upload_result.get("success"):
-                result.uploaded_reviews = upload_result.get("uploaded", 0)
+                result.uploaded_reviews += upload_result.get("uploaded", 0)
                 result.conflicts.extend(upload_result.get("conflicts", []))
             else:
                 result.errors.append(f"Upload failed: {upload_result.get('error')}")
@@ -356,6 +522,10 @@ class PlatformClient:
         progress = await self.get_progress()
         if progress:
             result.downloaded_atoms = progress.get("atoms_updated", 0)
+            # Schedules may have moved; refetch the prefetched batch
+            if self._prefetch_task is not None:
+                await self._cancel_prefetch()
+                self._start_prefetch(self._prefetch_limit)
 
         result.success = len(result.errors) == 0
         logger.info(
@@ -0,0 +1,281 @@
+"""
+Lightweight spans, timers and SQL accounting for hot paths.
+
+Spans nest (the active path lives in a ContextVar, so it follows asyncio
+tasks and FastAPI's threadpool) and are aggregated per path into call
+count, total and max wall time plus the SQL statements issued inside them.
+When profiling is disabled, ``span()`` returns a shared no-op object and
+``@timed`` functions pay one global check, so instrumentation can stay in
+production code.
+
+SQL statements are counted through SQLAlchemy cursor events registered
+by ``instrument_engine``; they are attributed to the innermost span and
+to any ``sql_capture()`` block (used by the API metrics middleware).
+
+Enable with ``CORTEX_PROFILE=1`` or ``profiling.enable()``.
+
+Usage:
+    with span("load_queue"):
+        ...
+
+    @timed("ncde_pipeline")
+    def _handle_ncde_pipeline(...):
+        ...
+
+    print(render_breakdown())
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from sqlalchemy import event
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_enabled = os.environ.get("CORTEX_PROFILE", "").lower() in ("1", "true", "yes", "on")
+_path: ContextVar[tuple[str, ...]] = ContextVar("cortex_span_path", default=())
+_sql_sink: ContextVar[SQLStats | None] = ContextVar("cortex_sql_sink", default=None)
+
+
+@dataclass
+class SQLStats:
+    """Statements executed and their total duration."""
+
+    count: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class SpanStats:
+    """Aggregate timings for one span path."""
+
+    path: tuple[str, ...]
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    sql_count: int = 0
+    sql_seconds: float = 0.0
+
+    @property
+    def name(self) -> str:
+        return self.path[-1]
+
+
+class Profiler:
+    """Thread-safe registry of span aggregates keyed by span path."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans: dict[tuple[str, ...], SpanStats] = {}
+
+    def _get(self, path: tuple[str, ...]) -> SpanStats:
+        stats = self._spans.get(path)
+        if stats is None:
+            stats = self._spans.setdefault(path, SpanStats(path))
+        return stats
+
+    def record(self, path: tuple[str, ...], seconds: float) -> None:
+        with self._lock:
+            stats = self._get(path)
+            stats.calls += 1
+            stats.seconds += seconds
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+
+    def record_sql(self, path: tuple[str, ...], seconds: float) -> None:
+        with self._lock:
+            stats = self._get(path)
+            stats.sql_count += 1
+            stats.sql_seconds += seconds
+
+    def snapshot(self) -> list[SpanStats]:
+        """Copies of all span aggregates, ordered by path."""
+        with self._lock:
+            return [
+                SpanStats(s.path, s.calls, s.seconds, s.max_seconds, s.sql_count, s.sql_seconds)
+                for _, s in sorted(self._spans.items())
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+profiler = Profiler()
+
+
+def enable() -> None:
+    """Turn span recording on."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Turn span recording off (spans become no-ops)."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+# =============================================================================
+# Spans
+# =============================================================================
+
+
+class _Span:
+    __slots__ = ("name", "_token", "_start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> _Span:
+        self._token = _path.set(_path.get() + (self.name,))
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        elapsed = time.perf_counter() - self._start
+        path = _path.get()
+        _path.reset(self._token)
+        profiler.record(path, elapsed)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str) -> _Span | _NoopSpan:
+    """Time a block as a (nested) span; a shared no-op when profiling is off."""
+    if not _enabled:
+        return _NOOP
+    return _Span(name)
+
+
+def timed(name: str | None = None) -> Callable[[F], F]:
+    """Decorator form of ``span``; defaults to the function's qualified name."""
+
+    def decorate(fn: F) -> F:
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(label):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+# =============================================================================
+# SQL accounting
+# =============================================================================
+
+_instrumented: set[int] = set()
+
+
+def instrument_engine(engine: Any) -> None:
+    """
+    Count statements and their duration on ``engine`` (idempotent).
+
+    Accepts a sync Engine or an AsyncEngine.
+    """
+    engine = getattr(engine, "sync_engine", engine)
+    if id(engine) in _instrumented:
+        return
+    _instrumented.add(id(engine))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _enabled or _sql_sink.get() is not None:
+            conn.info.setdefault("cortex_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("cortex_query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        sink = _sql_sink.get()
+        if sink is not None:
+            sink.count += 1
+            sink.seconds += elapsed
+        if _enabled:
+            profiler.record_sql(_path.get() or ("<no span>",), elapsed)
+
+
+@contextmanager
+def sql_capture() -> Iterator[SQLStats]:
+    """Collect statements executed in this context (and tasks/threads it spawns)."""
+    stats = SQLStats()
+    token = _sql_sink.set(stats)
+    try:
+        yield stats
+    finally:
+        _sql_sink.reset(token)
+
+
+# =============================================================================
+# Reporting
+# =============================================================================
+
+
+def render_breakdown(stats: list[SpanStats] | None = None, min_percent: float = 0.0) -> str:
+    """
+    Indented, flame-style text breakdown of span time.
+
+    Each line shows total time, share of the root total, calls, mean and
+    max per call, SQL statements and self time (time not in child spans).
+    """
+    stats = profiler.snapshot() if stats is None else stats
+    if not stats:
+        return "(no spans recorded)"
+
+    children: dict[tuple[str, ...], float] = {}
+    for s in stats:
+        if len(s.path) > 1:
+            parent = s.path[:-1]
+            children[parent] = children.get(parent, 0.0) + s.seconds
+    total = sum(s.seconds for s in stats if len(s.path) == 1) or 1e-12
+
+    width = max(len("  " * (len(s.path) - 1) + s.name) for s in stats)
+    lines = [
+        f"{'span':<{width}}  {'total':>9}  {'%':>5}  {'calls':>6}  {'mean':>8}  "
+        f"{'max':>8}  {'sql':>5}  {'sql ms':>8}  {'self':>9}"
+    ]
+    for s in stats:
+        share = s.seconds / total * 100
+        if share < min_percent:
+            continue
+        label = "  " * (len(s.path) - 1) + s.name
+        self_time = s.seconds - children.get(s.path, 0.0)
+        bar = "#" * max(1, round(share / 5)) if len(s.path) == 1 else ""
+        lines.append(
+            f"{label:<{width}}  {s.seconds * 1000:>7.1f}ms  {share:>5.1f}  {s.calls:>6}  "
+            f"{s.seconds / max(s.calls, 1) * 1000:>6.2f}ms  {s.max_seconds * 1000:>6.1f}ms  "
+            f"{s.sql_count:>5}  {s.sql_seconds * 1000:>8.1f}  {self_time * 1000:>7.1f}ms {bar}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,217 @@
+"""
+Background prefetch of render assets for study sessions.
+
+After each answer, CortexSession used to build the next card's assets on the
+spot. Those are the parsed content JSON, the contrastive pair a
+discrimination error shows (two database reads) and the Socratic opening
+question for "I don't know" (an LLM call when configured). RenderPrefetcher
+builds them for the next ``depth`` atoms on one worker thread while the
+learner is answering.
+
+- The session schedules its upcoming window after every card. Work for
+  atoms that left the window (the queue was re-ranked) is cancelled. A
+  build that finishes after its atom left the window is discarded.
+- Assets are built for a plan: a snapshot, taken on the session thread, of
+  the state they depend on (e.g. the atom's most confused partner). An
+  atom rescheduled with a different plan is rebuilt.
+- Ready assets are capped at ``max_bytes`` (estimated). Over the cap the
+  farthest-ahead atoms are dropped. They are rescheduled later or built by
+  the session when due.
+
+Usage:
+    prefetcher = RenderPrefetcher(build_assets, depth=3)
+    prefetcher.schedule([(atom, plan_for(atom)) for atom in upcoming])
+    assets = prefetcher.take(atom, plan_for(atom)) or build_now(atom)
+    prefetcher.close()
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections.abc import Callable, Hashable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+Assets = dict[str, Any]
+
+# Entry states
+QUEUED = "queued"  # Submitted, not finished
+READY = "ready"  # Built and counted against the memory cap
+TAKEN = "taken"  # Handed to the session (possibly still building)
+DROPPED = "dropped"  # Left the window, re-planned or evicted
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory held by ``value``: getsizeof over nested dicts and sequences."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v) for v in value)
+    return size
+
+
+@dataclass
+class _Entry:
+    plan: Hashable
+    state: str = QUEUED
+    assets: Assets | None = None
+    size: int = 0
+    future: Future | None = field(default=None, repr=False)
+
+
+class RenderPrefetcher:
+    """Builds render assets for upcoming atoms on a background thread."""
+
+    def __init__(
+        self,
+        build: Callable[[dict, Hashable], Assets],
+        depth: int = 3,
+        max_bytes: int = 1 << 20,
+    ):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            build: Builds an atom's assets for a plan (runs on the worker thread)
+            depth: Upcoming atoms to prefetch (0 disables prefetching)
+            max_bytes: Cap on the estimated size of ready assets
+        """
+        self.build = build
+        self.depth = depth
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._entries: dict[str, _Entry] = {}  # Current window, nearest first
+        self._ready_bytes = 0
+        self.hits = 0  # Taken ready or in flight
+        self.misses = 0  # Not prefetched; the session built them
+        self.discarded = 0  # Built, then dropped
+
+    @staticmethod
+    def atom_key(atom: dict) -> str:
+        return str(atom.get("id", ""))
+
+    @property
+    def ready_bytes(self) -> int:
+        return self._ready_bytes
+
+    def schedule(self, upcoming: Sequence[tuple[dict, Hashable]]) -> None:
+        """
+        Make the next atoms the prefetch window.
+
+        Atoms already in the window with the same plan keep their work.
+        Everything else in the previous window is cancelled or discarded.
+
+        Args:
+            upcoming: (atom, plan) pairs in queue order; only the first ``depth`` are used
+        """
+        if self.depth <= 0:
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="render-prefetch"
+                )
+            window: dict[str, _Entry] = {}
+            for atom, plan in upcoming[: self.depth]:
+                key = self.atom_key(atom)
+                if not key or key in window:
+                    continue
+                entry = self._entries.pop(key, None)
+                if entry is not None and entry.plan != plan:
+                    self._drop(entry)
+                    entry = None
+                if entry is None:
+                    entry = _Entry(plan)
+                    entry.future = self._executor.submit(self._build, entry, atom)
+                window[key] = entry
+            for entry in self._entries.values():
+                self._drop(entry)
+            self._entries = window
+
+    def take(self, atom: dict, plan: Hashable) -> Assets | None:
+        """
+        Claim an atom's prefetched assets.
+
+        Assets still being built are waited for; queued ones are cancelled.
+
+        Returns:
+            The assets, or None if the atom wasn't prefetched for this plan
+        """
+        key = self.atom_key(atom)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None and (entry.plan != plan or entry.future.cancel()):
+                self._drop(entry)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.state == READY:
+                self._ready_bytes -= entry.size
+                entry.state = TAKEN
+                self.hits += 1
+                return entry.assets
+            entry.state = TAKEN
+        # In flight: waiting is cheaper than building it twice
+        entry.future.result()
+        with self._lock:
+            if entry.assets is None:
+                self.misses += 1  # The build failed
+            else:
+                self.hits += 1
+        return entry.assets
+
+    def close(self) -> None:
+        """Cancel pending work and stop the worker."""
+        with self._lock:
+            for entry in self._entries.values():
+                self._drop(entry)
+            self._entries = {}
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _build(self, entry: _Entry, atom: dict) -> None:
+        try:
+            assets = self.build(atom, entry.plan)
+        except Exception as e:
+            logger.warning(f"Prefetch failed for atom {self.atom_key(atom)}: {e}")
+            assets = None
+        size = estimate_size(assets) if assets is not None else 0
+        with self._lock:
+            if entry.state == DROPPED:
+                self.discarded += 1
+                return
+            entry.assets = assets
+            if entry.state == TAKEN or assets is None:
+                return
+            entry.state = READY
+            entry.size = size
+            self._ready_bytes += size
+            self._evict_over_cap()
+
+    def _drop(self, entry: _Entry) -> None:
+        """Forget an entry (lock held); a build in flight is discarded when it finishes."""
+        if entry.state == READY:
+            self._ready_bytes -= entry.size
+            self.discarded += 1
+        elif entry.state == QUEUED:
+            entry.future.cancel()  # A running build sees DROPPED when it finishes
+        entry.state = DROPPED
+        entry.assets = None
+
+    def _evict_over_cap(self) -> None:
+        """Drop the farthest-ahead ready entries until under the cap (lock held)."""
+        for key in reversed(list(self._entries)):
+            if self._ready_bytes <= self.max_bytes:
+                return
+            entry = self._entries[key]
+            if entry.state == READY:
+                del self._entries[key]
+                self._drop(entry)
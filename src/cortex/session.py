@@ -16,7 +16,7 @@ import random
 import sys
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from loguru import logger
 
@@ -33,14 +33,18 @@ from rich.prompt import Confirm
 from rich.table import Table
 
 from config import get_settings
+from src.core.profiling import span, timed
 from src.cortex.atoms import get_handler as get_atom_handler
+from src.cortex.atoms.base import AnswerResult
+from src.cortex.render_prefetch import Assets, RenderPrefetcher
 from src.cortex.session_store import SessionStore, SessionState, create_session_state
-from src.study.study_service import StudyService
+from src.study.replica_study_service import ReplicaStudyService, open_study_service
 
 # UI Delegation
 from src.delivery import cortex_visuals as ui
 
 # Adaptive Pipeline
+from src.adaptive.confusion_store import SparseConfusionStore
 from src.adaptive.ncde_pipeline import (
     FatigueVector,
     NCDEPipeline,
@@ -69,6 +73,9 @@ OFFLINE_CACHE_DIR = Path("outputs/cache")
 OFFLINE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 PENDING_SYNC_FILE = OFFLINE_CACHE_DIR / "pending_sync.json"
 
+# Confusion score from which a discrimination error shows the contrastive panel
+CONTRASTIVE_MIN_CONFUSION = 0.3
+
 
 class CortexSession:
     """
@@ -86,6 +93,8 @@ class CortexSession:
         atoms_override: Optional[list[dict]] = None,
         sections: Optional[list[str]] = None,
         source_file: Optional[str] = None,
+        answer_provider: Optional[Callable[[dict], bool]] = None,
+        learner_id: str = "default",
     ):
         self.modules = modules
         self.sections = sections
@@ -93,9 +102,15 @@ class CortexSession:
         self.limit = limit
         self.war_mode = war_mode
         self.enable_ncde = enable_ncde
+        self.learner_id = learner_id
         self.start_time = time.monotonic()
         self.settings = get_settings()
 
+        # Scripted sessions (cortex profile) answer via the provider and
+        # skip prompts, animations and breaks
+        self.answer_provider = answer_provider
+        self.scripted = answer_provider is not None
+
         # Greenlight Integration
         self.greenlight_config = self.settings.get_greenlight_config()
         self.greenlight_enabled = self.settings.has_greenlight_configured()
@@ -119,9 +134,13 @@ class CortexSession:
         self._recent_response_times: list[int] = []  # For Flow State detection
 
         # Backend & Pipeline
-        self.study_service = StudyService()
+        self.study_service = open_study_service()
         self.persona_service = PersonaService()
-        self.ncde = NCDEPipeline() if enable_ncde else None
+        self.ncde = (
+            NCDEPipeline(confusion_store=SparseConfusionStore.load(learner_id))
+            if enable_ncde
+            else None
+        )
         self.session_context: Optional[SessionContext] = None
 
         # State Management
@@ -143,9 +162,19 @@ class CortexSession:
 
         # Socratic Tutoring
         self.socratic_tutor = SocraticTutor()
-        self.dialogue_recorder = DialogueRecorder()
+        self.dialogue_recorder = DialogueRecorder(learner_id)
         self.remediation_recommender = RemediationRecommender()
 
+        # Render prefetch: upcoming atoms' assets are built while the learner answers
+        self.prefetcher = RenderPrefetcher(
+            self._build_render_assets,
+            depth=self.settings.cortex_prefetch_depth,
+            max_bytes=self.settings.cortex_prefetch_max_kb * 1024,
+        )
+        self._card_assets: Assets | None = None
+        self.render_times_ms: list[float] = []  # Previous card done -> question shown
+        self._card_done_at = self.start_time
+
         if session_state:
             self._restore_from_state(session_state)
 
@@ -241,53 +270,69 @@ class CortexSession:
 
     def run(self) -> None:
         """Event-Driven Cognitive Loop."""
-        ui.cortex_boot_sequence(console, self.war_mode)
-        self.sync_anki()
+        with span("session.run"):
+            self._run()
+
+    def _run(self) -> None:
+        if not self.scripted:
+            ui.cortex_boot_sequence(console, self.war_mode)
+        with span("sync_anki"):
+            self.sync_anki()
 
         if not self.queue:
-            self.load_queue()
+            with span("load_queue"):
+                self.load_queue()
             if not self.queue:
                 console.print("[red]No content available.[/red]")
                 return
 
         # Pre-session: Check for unread remediation notes
-        self._check_unread_notes()
+        if not self.scripted:
+            self._check_unread_notes()
 
         # Init NCDE
         if self.ncde:
             self.session_context = SessionContext(
                 session_id=f"session_{int(time.time())}",
-                learner_id="default",
+                learner_id=self.learner_id,
                 queue_size=len(self.queue),
             )
 
         idx = 0
+        self._card_done_at = time.monotonic()
         try:
             while idx < len(self.queue):
                 note = self.queue[idx]
                 self.current_index = idx + 1
 
+                # Claim this card's assets, then prefetch the next ones while it's answered
+                self._card_assets = self.prefetcher.take(note, self._render_plan(note))
+                self._schedule_prefetch(idx + 1)
+
                 # Render Dashboard
-                ui.render_session_dashboard(
-                    console=console,
-                    mode="WAR" if self.war_mode else "ADAPTIVE",
-                    start_time=self.start_time,
-                    stats={
-                        "correct": self.correct,
-                        "incorrect": self.incorrect,
-                        "streak": self._streak,
-                    },
-                    total=len(self.queue),
-                    current=self.current_index,
-                    context=self.session_context,
-                    offline=self._offline_mode,
-                )
+                with span("render_dashboard"):
+                    ui.render_session_dashboard(
+                        console=console,
+                        mode="WAR" if self.war_mode else "ADAPTIVE",
+                        start_time=self.start_time,
+                        stats={
+                            "correct": self.correct,
+                            "incorrect": self.incorrect,
+                            "streak": self._streak,
+                        },
+                        total=len(self.queue),
+                        current=self.current_index,
+                        context=self.session_context,
+                        offline=self._offline_mode,
+                    )
 
                 # Process Interaction
                 result_state = self._process_atom_interaction(note)
+                self._card_done_at = time.monotonic()
 
                 # Post-Processing
-                self._update_metrics(result_state, note)
+                with span("update_metrics"):
+                    self._update_metrics(result_state, note)
                 self._handle_ncde_pipeline(result_state, note, idx)
 
                 # Advance
@@ -295,21 +340,73 @@ class CortexSession:
                     idx += 1
 
                 if idx % 5 == 0:
-                    self._session_store.save(self._session_state)
+                    with span("save_session_state"):
+                        self._session_store.save(self._session_state)
 
         except KeyboardInterrupt:
             self._handle_interrupt()
+        finally:
+            self.prefetcher.close()
 
-        self._finalize_session()
+        with span("finalize_session"):
+            self._finalize_session()
 
-    def _process_atom_interaction(self, note: dict) -> dict:
-        """Handles Ask -> Answer -> Feedback loop for a single atom."""
+    def _render_plan(self, note: dict) -> str | None:
+        """State the prefetched assets depend on: the atom's most confused partner."""
+        if not self.ncde or not hasattr(self.ncde, "confusion_matrix"):
+            return None
+        worst_pair = self.ncde.confusion_matrix.get_worst_pair(str(note.get("id", "")))
+        if not worst_pair or worst_pair[1] < CONTRASTIVE_MIN_CONFUSION:
+            return None
+        return worst_pair[0]
+
+    def _schedule_prefetch(self, start: int) -> None:
+        """Prefetch the atoms after ``start``; called again whenever the queue may have moved."""
+        upcoming = self.queue[start : start + self.prefetcher.depth]
+        self.prefetcher.schedule([(atom, self._render_plan(atom)) for atom in upcoming])
+
+    def _build_render_assets(self, note: dict, confused_id: str | None) -> Assets:
+        """
+        Build a card's assets ahead of time (runs on the prefetch worker).
+
+        Contrastive data is fetched for the atom's current most confused
+        partner, in case the answer is a discrimination error. Socratic
+        openers are generated only if cortex_prefetch_socratic is set.
+        """
+        assets = self._parse_render_assets(note)
+        if confused_id:
+            try:
+                from src.cortex.contrastive import get_contrastive_data
+
+                data = get_contrastive_data(assets["atom_id"], confused_id)
+                assets["contrastive"] = (confused_id, data)
+            except Exception as e:
+                logger.debug(f"Contrastive prefetch failed for {assets['atom_id']}: {e}")
+        if self.settings.cortex_prefetch_socratic and self.socratic_tutor.is_available:
+            assets["socratic_opening"] = self.socratic_tutor.opening_question(note)
+        return assets
+
+    @staticmethod
+    def _parse_render_assets(note: dict) -> Assets:
         content_json = note.get("content_json") or note.get("content") or {}
         if isinstance(content_json, str):
             try:
                 content_json = json.loads(content_json)
             except json.JSONDecodeError:
                 content_json = {}
+        return {"atom_id": str(note.get("id", "")), "content_json": content_json}
+
+    def _assets_for(self, note: dict) -> Assets:
+        """The current card's assets; parsed now if they weren't prefetched."""
+        assets = self._card_assets
+        if assets is None or assets["atom_id"] != str(note.get("id", "")):
+            assets = self._card_assets = self._parse_render_assets(note)
+        return assets
+
+    @timed("process_atom_interaction")
+    def _process_atom_interaction(self, note: dict) -> dict:
+        """Handles Ask -> Answer -> Feedback loop for a single atom."""
+        content_json = self._assets_for(note)["content_json"]
         if self._should_handoff_greenlight(note, content_json):
             return self._process_greenlight_atom(note, content_json)
 
@@ -319,14 +416,22 @@ class CortexSession:
 
         # 1. Ask
         ui.render_question_panel(console, note)
+        if not note.get("_retry_attempt"):
+            self.render_times_ms.append((time.monotonic() - self._card_done_at) * 1000)
 
         # 2. Capture
         start = time.monotonic()
-        user_input = handler.get_input(note, console)
-        duration_ms = int((time.monotonic() - start) * 1000)
+        if self.answer_provider is not None:
+            result = self._scripted_result(note)
+            duration_ms = int((time.monotonic() - start) * 1000)
+        else:
+            with span("await_input"):
+                user_input = handler.get_input(note, console)
+            duration_ms = int((time.monotonic() - start) * 1000)
 
-        # 3. Evaluate
-        result = handler.check(note, user_input, console=console)
+            # 3. Evaluate
+            with span("check_answer"):
+                result = handler.check(note, user_input, console=console)
 
         # 4. Handle "I don't know" - trigger Socratic dialogue
         if result.dont_know:
@@ -368,7 +473,7 @@ class CortexSession:
                 ui.render_result_panel(console, False, result.correct_answer, result.explanation)
 
             # Offer flag option for incorrect answers
-            flag_data = ui.prompt_flag_option(console)
+            flag_data = None if self.scripted else ui.prompt_flag_option(console)
             if flag_data:
                 self._record_flag(note, flag_data)
 
@@ -379,6 +484,16 @@ class CortexSession:
             "repeat_queue": False,
         }
 
+    def _scripted_result(self, note: dict) -> AnswerResult:
+        """Answer from the scripted provider instead of prompting."""
+        correct = bool(self.answer_provider(note))
+        return AnswerResult(
+            correct=correct,
+            feedback="",
+            user_answer="scripted",
+            correct_answer=str(note.get("back", "")),
+        )
+
     def _should_handoff_greenlight(self, note: dict, content_json: dict) -> bool:
         """Check whether an atom should be routed to Greenlight."""
         owner = content_json.get("owner") or note.get("owner", "cortex")
@@ -563,6 +678,7 @@ class CortexSession:
                 asyncio.set_event_loop(loop)
             return loop.run_until_complete(coro)
 
+    @timed("ncde_pipeline")
     def _handle_ncde_pipeline(self, result: dict, note: dict, idx: int) -> None:
         """Runs the Neuro-Cognitive Diagnosis Engine pipeline."""
         if result.get("skipped"):
@@ -591,7 +707,8 @@ class CortexSession:
             self._post_break_grace -= 1
             return
 
-        diagnosis, strategy = self.ncde.process(raw_event, self.session_context)
+        with span("ncde.process"):
+            diagnosis, strategy = self.ncde.process(raw_event, self.session_context)
 
         # Update dynamic struggle weights in PostgreSQL
         self._update_struggle_weight(note, result["correct"], diagnosis)
@@ -612,7 +729,8 @@ class CortexSession:
             self._check_micro_note_trigger(note)
 
         if strategy.name == "micro_break":
-            ui.trigger_micro_break(console, strategy.message)
+            if not self.scripted:
+                ui.trigger_micro_break(console, strategy.message)
             self._post_break_grace = 5
             self.ncde.reset_fatigue()
 
@@ -658,12 +776,16 @@ class CortexSession:
             confused_id, confusion_score = worst_pair
             logger.debug(f"Contrastive: Found confused pair ({atom_id}, {confused_id}) with score {confusion_score:.2f}.")
 
-            if confusion_score < 0.3:  # Threshold for showing comparison
+            if confusion_score < CONTRASTIVE_MIN_CONFUSION:
                 logger.debug("Contrastive: Confusion score below threshold, skipping panel.")
                 return
 
-            # Fetch contrastive data
-            concept_a, concept_b, evidence = get_contrastive_data(atom_id, confused_id)
+            # Fetch contrastive data (prefetched if the pair hasn't changed since)
+            prefetched = self._assets_for(note).get("contrastive")
+            if prefetched and prefetched[0] == confused_id:
+                concept_a, concept_b, evidence = prefetched[1]
+            else:
+                concept_a, concept_b, evidence = get_contrastive_data(atom_id, confused_id)
 
             # Render the comparison panel
             ui.render_contrastive_panel(
@@ -676,6 +798,7 @@ class CortexSession:
         except Exception as e:
             logger.warning(f"Could not show contrastive comparison: {e}", exc_info=True)
 
+    @timed("update_struggle_weight")
     def _update_struggle_weight(self, note: dict, is_correct: bool, diagnosis) -> None:
         """
         Update dynamic struggle weights in PostgreSQL based on NCDE diagnosis.
@@ -724,7 +847,7 @@ class CortexSession:
                         )
                     """),
                     {
-                        "user_id": "default",
+                        "user_id": self.learner_id,
                         "module_number": update_data.module_number,
                         "section_id": update_data.section_id,
                         "failure_mode": update_data.failure_mode,
@@ -926,7 +1049,8 @@ class CortexSession:
         from rich.prompt import Prompt
 
         # Start Socratic session
-        session = self.socratic_tutor.start_session(note)
+        opening = self._assets_for(note).get("socratic_opening")
+        session = self.socratic_tutor.start_session(note, opening=opening)
 
         # Start recording (learner_id is set in DialogueRecorder constructor)
         dialogue_id = self.dialogue_recorder.start_recording(
@@ -1140,6 +1264,9 @@ class CortexSession:
         """End of session cleanup and summary."""
         if self._session_state:
             self._session_store.delete(self._session_state.session_id)
+        if self.ncde:
+            self.ncde.persist_confusions()
+        self._push_replica_reviews()
         ui.render_session_summary(
             console,
             self.correct,
@@ -1149,7 +1276,20 @@ class CortexSession:
         )
 
         # Post-session remediation offer
-        self._offer_post_session_remediation()
+        if not self.scripted:
+            self._offer_post_session_remediation()
+
+    def _push_replica_reviews(self) -> None:
+        """Best-effort push of reviews recorded against the local replica."""
+        if not isinstance(self.study_service, ReplicaStudyService):
+            return
+        try:
+            from src.db.replica import ReplicaSync
+
+            ReplicaSync(self.study_service.replica).push()
+        except Exception as e:
+            self._offline_mode = True
+            logger.info(f"Replica reviews kept for next sync: {e}")
 
     def _offer_post_session_remediation(self) -> None:
         """Offer remediation for weak sections after session ends."""
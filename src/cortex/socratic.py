@@ -343,9 +343,31 @@ class SocraticTutor:
     def is_available(self) -> bool:
         return self.api_key is not None
 
-    def start_session(self, atom: dict) -> SocraticSession:
-        """Initialize a new Socratic dialogue session."""
-        session = SocraticSession(
+    def start_session(self, atom: dict, opening: str | None = None) -> SocraticSession:
+        """
+        Initialize a new Socratic dialogue session.
+
+        Args:
+            atom: The atom being studied
+            opening: Opening question generated ahead of time (see opening_question);
+                generated now if None
+        """
+        session = self._new_session(atom)
+
+        # Generate opening question
+        if opening is None:
+            opening = self._generate_opening_question(session)
+        session.add_tutor_turn(opening)
+
+        return session
+
+    def opening_question(self, atom: dict) -> str:
+        """Generate the opening question for an atom without starting a session."""
+        return self._generate_opening_question(self._new_session(atom))
+
+    @staticmethod
+    def _new_session(atom: dict) -> SocraticSession:
+        return SocraticSession(
             atom_id=str(atom.get("id", atom.get("card_id", "unknown"))),
             atom_content={
                 "front": atom.get("front", ""),
@@ -354,12 +376,6 @@ class SocraticTutor:
             }
         )
 
-        # Generate opening question
-        opening = self._generate_opening_question(session)
-        session.add_tutor_turn(opening)
-
-        return session
-
     def process_response(
         self,
         session: SocraticSession,
@@ -2,6 +2,10 @@
 EASV Curriculum Parser.
 
 Parses course files (SDE2.txt, PROGII.txt, etc.) and generates learning atoms.
+
+Week sections and their Before Class / During Class / Workshop blocks are cut
+in one scan by src.processing.section_tokenizer. With a ParseCache, files
+whose content is unchanged are not parsed again.
 """
 
 from __future__ import annotations
@@ -12,6 +16,9 @@ from typing import Iterator
 
 from loguru import logger
 
+from src.processing.parse_cache import DEFAULT_PARSE_CACHE_PATH, ParseCache, content_sha256
+from src.processing.section_tokenizer import easv_sections
+
 from .models import Course, Week, LearningObjective, GeneratedAtom
 
 
@@ -25,18 +32,35 @@ class EASVParser:
     )
     LEARNING_OBJ_PATTERN = re.compile(r"([KSC]\d)", re.IGNORECASE)
     TOPIC_PATTERN = re.compile(r"^#+\s*(.+)$", re.MULTILINE)
-    BEFORE_CLASS_PATTERN = re.compile(r"Before\s+Class(.+?)(?=During\s+Class|Workshop|$)", re.DOTALL | re.IGNORECASE)
-    DURING_CLASS_PATTERN = re.compile(r"During\s+Class(.+?)(?=Workshop|Before\s+Class|$)", re.DOTALL | re.IGNORECASE)
-    WORKSHOP_PATTERN = re.compile(r"Workshop(.+?)(?=Before\s+Class|During\s+Class|$)", re.DOTALL | re.IGNORECASE)
 
-    def __init__(self):
+    def __init__(self, cache: ParseCache | None = None):
+        """
+        Initialize parser.
+
+        Args:
+            cache: Parsed courses by file and content hash (None to always parse)
+        """
         self.courses: list[Course] = []
+        self.cache = cache
+
+    def parse_directory(self, directory: Path | str, pattern: str = "*.txt") -> list[Course]:
+        """Parse every curriculum file in a directory; unchanged files come from the cache."""
+        paths = sorted(Path(directory).glob(pattern))
+        return [self.parse_file(path) for path in paths if path.is_file()]
 
     def parse_file(self, file_path: Path | str) -> Course:
         """Parse a curriculum file and return a Course object."""
         file_path = Path(file_path)
         content = file_path.read_text(encoding="utf-8", errors="replace")
 
+        content_hash = content_sha256(content) if self.cache else ""
+        if self.cache:
+            cached = self.cache.get(self, file_path, content_hash)
+            if cached is not None:
+                logger.info(f"Loaded cached parse of {file_path.name}")
+                self.courses.append(cached)
+                return cached
+
         # Detect course from filename
         course_code = self._detect_course_code(file_path.stem)
         course_name = self._course_code_to_name(course_code)
@@ -52,6 +76,8 @@ class EASVParser:
         # Parse weeks from content
         course.weeks = self._parse_weeks(content, course_code)
 
+        if self.cache:
+            self.cache.put(self, file_path, content_hash, course)
         self.courses.append(course)
         return course
 
@@ -92,13 +118,8 @@ class EASVParser:
 
         # Split content by week headers
         # Look for patterns like "W35", "Week 35", "35 -", etc.
-        week_sections = re.split(
-            r"(?=W\d+[\s\-:]|Week\s+\d+|^\d+\s+[\-:])",
-            content,
-            flags=re.MULTILINE | re.IGNORECASE,
-        )
-
-        for section in week_sections:
+        for node in easv_sections(content):
+            section = node.span.text(content)
             if not section.strip():
                 continue
 
@@ -108,7 +129,6 @@ class EASVParser:
                 continue
 
             week_num = int(week_match.group(1))
-            rest = section[week_match.end():]
 
             # Extract topic from first line or header
             topic = self._extract_topic(section)
@@ -125,13 +145,13 @@ class EASVParser:
                 content=section,
             )
 
-            # Extract structured content
-            if before_match := self.BEFORE_CLASS_PATTERN.search(section):
-                week.before_class = before_match.group(1).strip()
-            if during_match := self.DURING_CLASS_PATTERN.search(section):
-                week.during_class = during_match.group(1).strip()
-            if workshop_match := self.WORKSHOP_PATTERN.search(section):
-                week.workshop = workshop_match.group(1).strip()
+            # Extract structured content (Before Class, During Class, Workshop)
+            if before := node.children.get("before_class"):
+                week.before_class = before.text(content).strip()
+            if during := node.children.get("during_class"):
+                week.during_class = during.text(content).strip()
+            if workshop := node.children.get("workshop"):
+                week.workshop = workshop.text(content).strip()
 
             weeks.append(week)
 
@@ -141,7 +161,7 @@ class EASVParser:
     def _extract_topic(self, section: str) -> str:
         """Extract main topic from section."""
         # Try to find a header
-        lines = section.strip().split("\n")
+        lines = section.strip().split("\n", 5)
         for line in lines[:5]:
             line = line.strip()
             # Skip week number lines
@@ -266,14 +286,25 @@ class EASVParser:
                 )
 
 
-def parse_curriculum_file(file_path: Path | str) -> tuple[Course, list[GeneratedAtom]]:
+def parse_curriculum_file(
+    file_path: Path | str, cache_path: Path | str | None = DEFAULT_PARSE_CACHE_PATH
+) -> tuple[Course, list[GeneratedAtom]]:
     """
     Parse a curriculum file and return course + generated atoms.
 
     Convenience function for single-file parsing.
+
+    Args:
+        file_path: Curriculum file
+        cache_path: Parse cache file (None disables the cache)
     """
-    parser = EASVParser()
-    course = parser.parse_file(file_path)
+    cache = ParseCache(cache_path) if cache_path else None
+    try:
+        parser = EASVParser(cache)
+        course = parser.parse_file(file_path)
+    finally:
+        if cache:
+            cache.close()
     atoms = list(parser.generate_atoms(course))
     return course, atoms
 
@@ -0,0 +1,556 @@
+"""
+Bulk loading helpers for staging and canonical tables.
+
+Streams rows into a temporary staging table and merges them into the target
+with a single ``INSERT ... ON CONFLICT`` statement per call:
+
+- PostgreSQL: rows are streamed with ``COPY ... FROM STDIN`` (psycopg2 or psycopg 3)
+- Other dialects (SQLite in tests/portable mode): ``executemany`` into the stage
+
+Used by the Anki import, the clean_atoms hydration script and the ETL
+table loader so that imports of thousands of rows take one round-trip per
+chunk instead of one per row.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import time
+import uuid
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+# Rows per COPY/executemany chunk; bounded so very large imports never hold
+# the whole serialized payload in memory at once.
+DEFAULT_CHUNK_SIZE = 5000
+
+
+@dataclass
+class BulkLoadResult:
+    """Result of a bulk merge into one table."""
+
+    table: str
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    errors: list[str] = field(default_factory=list)
+    duration_seconds: float = 0.0
+    # Rows of (key_columns + returning) read back from the target after merge
+    returned: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.skipped + self.failed
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize counts (without returned rows)."""
+        return {
+            "table": self.table,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "errors": self.errors,
+            "duration_seconds": self.duration_seconds,
+        }
+
+
+class BulkLoader:
+    """
+    Merge many rows into a table using a temp staging table.
+
+    Example:
+        loader = BulkLoader(session)
+        result = loader.load(
+            "stg_anki_cards",
+            rows,
+            key_columns=["anki_note_id"],
+            json_columns=["raw_anki_data"],
+            array_columns=["tags"],
+        )
+        session.commit()
+
+    The loader never commits; the caller owns the transaction.
+    """
+
+    def __init__(
+        self,
+        db: Session | Connection,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """
+        Initialize bulk loader.
+
+        Args:
+            db: SQLAlchemy session or connection (transaction owned by caller)
+            chunk_size: Rows per COPY/executemany chunk
+        """
+        self.db = db
+        self.chunk_size = max(1, chunk_size)
+
+    # ========================================
+    # Public API
+    # ========================================
+
+    def load(
+        self,
+        table: str,
+        rows: Iterable[Mapping[str, Any]],
+        key_columns: Sequence[str],
+        columns: Sequence[str] | None = None,
+        update_columns: Sequence[str] | None = None,
+        json_columns: Sequence[str] = (),
+        array_columns: Sequence[str] = (),
+        update_where: str | None = None,
+        returning: Sequence[str] = (),
+        isolate_errors: bool = False,
+    ) -> BulkLoadResult:
+        """
+        Stage rows and merge them into ``table``.
+
+        Args:
+            table: Target table name
+            rows: Row dicts (missing columns are staged as NULL)
+            key_columns: Conflict target (must have a unique index)
+            columns: Columns to load (default: keys of the first row)
+            update_columns: Columns updated on conflict (default: all non-key
+                columns; empty sequence means ``DO NOTHING``)
+            json_columns: Columns serialized with ``json.dumps``
+            array_columns: PostgreSQL array columns (JSON-encoded elsewhere)
+            update_where: Optional SQL predicate on ``{table}``/``EXCLUDED``
+                restricting which conflicting rows are updated
+            returning: Target columns read back for every staged key
+            isolate_errors: Merge inside a savepoint; if the merge fails, merge
+                row by row so one bad row is counted as failed instead of
+                aborting the whole load
+
+        Returns:
+            BulkLoadResult with inserted/updated/skipped counts. Rows whose key
+            appears more than once are counted as skipped (last one wins).
+        """
+        if isolate_errors:
+            return self._load_isolated(
+                table,
+                rows,
+                key_columns,
+                columns=columns,
+                update_columns=update_columns,
+                json_columns=json_columns,
+                array_columns=array_columns,
+                update_where=update_where,
+                returning=returning,
+            )
+
+        started = time.perf_counter()
+        result = BulkLoadResult(table=table)
+
+        deduped, duplicates = self._dedupe(rows, key_columns)
+        result.skipped += duplicates
+        if not deduped:
+            result.duration_seconds = time.perf_counter() - started
+            return result
+
+        cols = list(columns or deduped[0].keys())
+        missing_keys = [k for k in key_columns if k not in cols]
+        if missing_keys:
+            raise ValueError(f"Key columns {missing_keys} not in loaded columns for {table}")
+
+        if update_columns is None:
+            update_columns = [c for c in cols if c not in key_columns]
+
+        stage = f"_bulk_{table}_{uuid.uuid4().hex[:8]}"
+        conn = self._connection()
+        is_postgres = conn.dialect.name == "postgresql"
+
+        try:
+            self._create_stage(conn, stage, table, cols, is_postgres)
+            self._stage_rows(
+                conn, stage, cols, deduped, set(json_columns), set(array_columns), is_postgres
+            )
+
+            key_match = " AND ".join(f"t.{k} = s.{k}" for k in key_columns)
+            existing = conn.execute(
+                text(
+                    f"SELECT COUNT(*) FROM {stage} s "
+                    f"WHERE EXISTS (SELECT 1 FROM {table} t WHERE {key_match})"
+                )
+            ).scalar_one()
+
+            merged = conn.execute(
+                text(self._merge_sql(table, stage, cols, key_columns, update_columns, update_where))
+            ).rowcount
+
+            staged = len(deduped)
+            result.inserted = staged - existing
+            result.updated = max(0, merged - result.inserted)
+            result.skipped += existing - result.updated
+
+            if returning:
+                select_cols = ", ".join(f"t.{c}" for c in [*key_columns, *returning])
+                rows_back = conn.execute(
+                    text(
+                        f"SELECT {select_cols} FROM {table} t "
+                        f"JOIN {stage} s ON {key_match}"
+                    )
+                )
+                result.returned = [dict(r._mapping) for r in rows_back]
+        except Exception:
+            _discard_stage(conn, stage)
+            raise
+        conn.execute(text(f"DROP TABLE IF EXISTS {stage}"))
+
+        result.duration_seconds = time.perf_counter() - started
+        logger.info(
+            "Bulk load {}: inserted={}, updated={}, skipped={} in {:.2f}s",
+            table,
+            result.inserted,
+            result.updated,
+            result.skipped,
+            result.duration_seconds,
+        )
+        return result
+
+    def update(
+        self,
+        table: str,
+        rows: Iterable[Mapping[str, Any]],
+        key_columns: Sequence[str],
+        columns: Sequence[str] | None = None,
+        json_columns: Sequence[str] = (),
+        array_columns: Sequence[str] = (),
+        update_columns: Sequence[str] | None = None,
+        update_where: str | None = None,
+    ) -> BulkLoadResult:
+        """
+        Stage rows and update matching rows of ``table`` (never inserts).
+
+        For tables whose NOT NULL columns the caller does not supply, e.g.
+        writing computed statistics back onto learning_atoms.
+
+        Args:
+            update_columns: Columns assigned (default: all non-key columns);
+                other staged columns are only available to ``update_where``
+            update_where: Optional SQL predicate on ``{table}``/``s`` (the
+                stage) restricting which matching rows are updated
+
+        Returns:
+            BulkLoadResult with updated count; staged keys with no matching
+            row, rows excluded by ``update_where`` and duplicate keys are
+            counted as skipped.
+        """
+        started = time.perf_counter()
+        result = BulkLoadResult(table=table)
+
+        deduped, duplicates = self._dedupe(rows, key_columns)
+        result.skipped += duplicates
+        if not deduped:
+            result.duration_seconds = time.perf_counter() - started
+            return result
+
+        cols = list(columns or deduped[0].keys())
+        missing_keys = [k for k in key_columns if k not in cols]
+        if missing_keys:
+            raise ValueError(f"Key columns {missing_keys} not in loaded columns for {table}")
+
+        stage = f"_bulk_{table}_{uuid.uuid4().hex[:8]}"
+        conn = self._connection()
+        is_postgres = conn.dialect.name == "postgresql"
+
+        try:
+            self._create_stage(conn, stage, table, cols, is_postgres)
+            self._stage_rows(
+                conn, stage, cols, deduped, set(json_columns), set(array_columns), is_postgres
+            )
+            if update_columns is None:
+                update_columns = [c for c in cols if c not in key_columns]
+            assignments = ", ".join(f"{c} = s.{c}" for c in update_columns)
+            where = " AND ".join(f"{table}.{k} = s.{k}" for k in key_columns)
+            if update_where:
+                where += f" AND ({update_where})"
+            result.updated = conn.execute(
+                text(f"UPDATE {table} SET {assignments} FROM {stage} s WHERE {where}")
+            ).rowcount
+            result.skipped += len(deduped) - result.updated
+        except Exception:
+            _discard_stage(conn, stage)
+            raise
+        conn.execute(text(f"DROP TABLE IF EXISTS {stage}"))
+
+        result.duration_seconds = time.perf_counter() - started
+        logger.info(
+            "Bulk update {}: updated={}, skipped={} in {:.2f}s",
+            table,
+            result.updated,
+            result.skipped,
+            result.duration_seconds,
+        )
+        return result
+
+    def _load_isolated(
+        self,
+        table: str,
+        rows: Iterable[Mapping[str, Any]],
+        key_columns: Sequence[str],
+        **options: Any,
+    ) -> BulkLoadResult:
+        """Merge in one savepoint, falling back to one savepoint per row."""
+        deduped, duplicates = self._dedupe(rows, key_columns)
+        try:
+            with self.db.begin_nested():
+                result = self.load(table, deduped, key_columns, **options)
+            result.skipped += duplicates
+            return result
+        except Exception as e:
+            logger.warning(f"Bulk load {table} failed, merging rows one at a time: {e}")
+
+        started = time.perf_counter()
+        result = BulkLoadResult(table=table, skipped=duplicates)
+        for row in deduped:
+            try:
+                with self.db.begin_nested():
+                    single = self.load(table, [row], key_columns, **options)
+            except Exception as e:
+                key = ", ".join(str(row.get(k)) for k in key_columns)
+                result.failed += 1
+                result.errors.append(f"{table} ({key}): {e}")
+                continue
+            result.inserted += single.inserted
+            result.updated += single.updated
+            result.skipped += single.skipped
+            result.returned.extend(single.returned)
+
+        result.duration_seconds = time.perf_counter() - started
+        logger.info(
+            "Bulk load {} row by row: inserted={}, updated={}, skipped={}, failed={} in {:.2f}s",
+            table,
+            result.inserted,
+            result.updated,
+            result.skipped,
+            result.failed,
+            result.duration_seconds,
+        )
+        return result
+
+    # ========================================
+    # Staging
+    # ========================================
+
+    def _connection(self) -> Connection:
+        if isinstance(self.db, Session):
+            return self.db.connection()
+        return self.db
+
+    @staticmethod
+    def _dedupe(
+        rows: Iterable[Mapping[str, Any]],
+        key_columns: Sequence[str],
+    ) -> tuple[list[Mapping[str, Any]], int]:
+        """Keep the last row per key; ON CONFLICT cannot touch a row twice."""
+        by_key: dict[tuple, Mapping[str, Any]] = {}
+        total = 0
+        for row in rows:
+            total += 1
+            by_key[tuple(row.get(k) for k in key_columns)] = row
+        return list(by_key.values()), total - len(by_key)
+
+    @staticmethod
+    def _create_stage(
+        conn: Connection,
+        stage: str,
+        table: str,
+        cols: Sequence[str],
+        is_postgres: bool,
+    ) -> None:
+        col_list = ", ".join(cols)
+        if is_postgres:
+            conn.execute(
+                text(
+                    f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS "
+                    f"SELECT {col_list} FROM {table} WITH NO DATA"
+                )
+            )
+        else:
+            conn.execute(
+                text(f"CREATE TEMP TABLE {stage} AS SELECT {col_list} FROM {table} WHERE 0")
+            )
+
+    def _stage_rows(
+        self,
+        conn: Connection,
+        stage: str,
+        cols: Sequence[str],
+        rows: Sequence[Mapping[str, Any]],
+        json_columns: set[str],
+        array_columns: set[str],
+        is_postgres: bool,
+    ) -> None:
+        raw = conn.connection.dbapi_connection if is_postgres else None
+        use_copy = raw is not None and _supports_copy(raw)
+
+        for start in range(0, len(rows), self.chunk_size):
+            chunk = rows[start : start + self.chunk_size]
+            if use_copy:
+                payload = "".join(
+                    _copy_line(row, cols, json_columns, array_columns) for row in chunk
+                )
+                _copy_from(raw, stage, cols, payload)
+            else:
+                params = [
+                    {
+                        c: _param_value(row.get(c), c in json_columns, c in array_columns, is_postgres)
+                        for c in cols
+                    }
+                    for row in chunk
+                ]
+                placeholders = ", ".join(f":{c}" for c in cols)
+                conn.execute(
+                    text(f"INSERT INTO {stage} ({', '.join(cols)}) VALUES ({placeholders})"),
+                    params,
+                )
+
+    @staticmethod
+    def _merge_sql(
+        table: str,
+        stage: str,
+        cols: Sequence[str],
+        key_columns: Sequence[str],
+        update_columns: Sequence[str],
+        update_where: str | None,
+    ) -> str:
+        col_list = ", ".join(cols)
+        conflict = ", ".join(key_columns)
+        # "WHERE true" disambiguates INSERT ... SELECT ... ON CONFLICT for SQLite
+        sql = f"INSERT INTO {table} ({col_list}) SELECT {col_list} FROM {stage} WHERE true "
+        if not update_columns:
+            return sql + f"ON CONFLICT ({conflict}) DO NOTHING"
+        assignments = ", ".join(f"{c} = EXCLUDED.{c}" for c in update_columns)
+        sql += f"ON CONFLICT ({conflict}) DO UPDATE SET {assignments}"
+        if update_where:
+            sql += f" WHERE {update_where}"
+        return sql
+
+
+def _discard_stage(conn: Connection, stage: str) -> None:
+    """
+    Drop a stage after a failed merge without masking the failure.
+
+    A failed statement aborts the PostgreSQL transaction, so the DROP is
+    rejected there; the stage is ON COMMIT DROP and goes with the rollback.
+    """
+    try:
+        conn.execute(text(f"DROP TABLE IF EXISTS {stage}"))
+    except Exception as e:
+        logger.debug(f"Stage {stage} left to the rollback: {e}")
+
+
+# ========================================
+# Value encoding
+# ========================================
+
+
+def _supports_copy(raw: Any) -> bool:
+    """psycopg2 exposes cursor.copy_expert, psycopg 3 exposes cursor.copy."""
+    cursor = raw.cursor()
+    try:
+        return hasattr(cursor, "copy_expert") or hasattr(cursor, "copy")
+    finally:
+        cursor.close()
+
+
+def _copy_from(raw: Any, stage: str, cols: Sequence[str], payload: str) -> None:
+    sql = f"COPY {stage} ({', '.join(cols)}) FROM STDIN"
+    cursor = raw.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):
+            cursor.copy_expert(sql, io.StringIO(payload))
+        else:
+            with cursor.copy(sql) as copy:
+                copy.write(payload)
+    finally:
+        cursor.close()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return str(value)
+
+
+def _to_json(value: Any) -> str:
+    # psycopg2.extras.Json wrappers keep the original object on .adapted
+    value = getattr(value, "adapted", value)
+    return json.dumps(value, default=_json_default)
+
+
+def _escape_copy(value: str) -> str:
+    """Escape a value for COPY text format."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _array_literal(values: Iterable[Any]) -> str:
+    items = []
+    for v in values:
+        if v is None:
+            items.append("NULL")
+        else:
+            s = str(v).replace("\\", "\\\\").replace('"', '\\"')
+            items.append(f'"{s}"')
+    return "{" + ",".join(items) + "}"
+
+
+def _scalar_text(value: Any) -> str:
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _copy_line(
+    row: Mapping[str, Any],
+    cols: Sequence[str],
+    json_columns: set[str],
+    array_columns: set[str],
+) -> str:
+    fields = []
+    for col in cols:
+        value = row.get(col)
+        if value is None:
+            fields.append("\\N")
+        elif col in json_columns:
+            fields.append(_escape_copy(_to_json(value)))
+        elif col in array_columns:
+            fields.append(_escape_copy(_array_literal(value)))
+        else:
+            fields.append(_escape_copy(_scalar_text(value)))
+    return "\t".join(fields) + "\n"
+
+
+def _param_value(value: Any, is_json: bool, is_array: bool, is_postgres: bool) -> Any:
+    if value is None:
+        return None
+    if is_json:
+        return _to_json(value)
+    if is_array:
+        return list(value) if is_postgres else json.dumps(list(value), default=_json_default)
+    if not is_postgres and isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
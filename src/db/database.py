@@ -11,12 +11,31 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from sqlalchemy.orm import Session, sessionmaker
 
 from config import get_settings
+from src.core.profiling import instrument_engine
 from src.db.models.base import Base
 
 settings = get_settings()
 
+
+def _pool_options(url: str) -> dict[str, Any]:
+    """QueuePool sizing for server databases (SQLite keeps SQLAlchemy's defaults)."""
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+
 # Sync engine/session
-engine = create_engine(settings.database_url, echo=settings.log_level == "DEBUG", pool_pre_ping=True)
+engine = create_engine(
+    settings.database_url,
+    echo=settings.log_level == "DEBUG",
+    pool_pre_ping=True,
+    **_pool_options(settings.database_url),
+)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
 
@@ -95,10 +114,26 @@ def _get_async_engine():
             async_url,
             echo=settings.log_level == "DEBUG",
             pool_pre_ping=True,
+            **_pool_options(async_url),
         )
+        instrument_engine(_async_engine.sync_engine)
     return _async_engine
 
 
+def get_async_engine():
+    """Get the async (asyncpg) engine, creating it on first use."""
+    return _get_async_engine()
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections (application shutdown)."""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _AsyncSessionLocal = None
+
+
 def _get_async_session_factory():
     """Get or create async session factory."""
     global _AsyncSessionLocal
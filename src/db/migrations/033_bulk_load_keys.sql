@@ -0,0 +1,29 @@
+-- Migration 033: Conflict targets for bulk loading
+--
+-- src/db/bulk.BulkLoader merges staged rows with INSERT ... ON CONFLICT,
+-- which requires a unique index on the conflict columns. Atoms can have any
+-- number of quiz questions (the quiz API creates more), so imported questions
+-- carry their own key instead: hydrate_db sets import_key to 'card:<card_id>'.
+-- Questions created elsewhere leave it NULL and never conflict.
+
+ALTER TABLE quiz_questions ADD COLUMN IF NOT EXISTS import_key TEXT;
+
+-- Earlier hydration runs updated the oldest question of each atom; adopt it
+UPDATE quiz_questions q
+SET import_key = 'card:' || la.card_id
+FROM learning_atoms la
+WHERE la.id = q.atom_id
+  AND la.card_id IS NOT NULL
+  AND q.import_key IS NULL
+  AND NOT EXISTS (
+      SELECT 1 FROM quiz_questions older
+      WHERE older.atom_id = q.atom_id
+        AND (older.created_at, older.id) < (q.created_at, q.id)
+  );
+
+DROP INDEX IF EXISTS uq_quiz_questions_atom;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_quiz_questions_import_key
+    ON quiz_questions(import_key);
+
+COMMENT ON COLUMN quiz_questions.import_key IS 'Source key of imported questions (bulk upsert conflict target); NULL for authored ones';
@@ -0,0 +1,45 @@
+-- Migration 034: Dashboard rollups
+--
+-- Pre-aggregated counters behind the study dashboard (src/study/summary_store.py).
+-- StudyService.record_interaction and the Anki pull apply per-atom deltas;
+-- the store rebuilds these tables from learning_atoms when they are empty.
+
+CREATE TABLE IF NOT EXISTS dashboard_atom_rollup (
+    module_number INTEGER NOT NULL,            -- 0 = no (or unknown) section
+    atom_type TEXT NOT NULL,                   -- '' when atom_type is NULL
+    has_section BOOLEAN NOT NULL,              -- ccna_section_id IS NOT NULL
+    atom_count INTEGER NOT NULL DEFAULT 0,
+    authored_count INTEGER NOT NULL DEFAULT 0,     -- front is non-empty
+    reviewed_count INTEGER NOT NULL DEFAULT 0,     -- anki_review_count > 0
+    nls_mastered_count INTEGER NOT NULL DEFAULT 0, -- nls_correct_count > nls_incorrect_count
+    PRIMARY KEY (module_number, atom_type, has_section)
+);
+
+CREATE TABLE IF NOT EXISTS dashboard_due_rollup (
+    due_date DATE PRIMARY KEY,
+    atom_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS dashboard_section_rollup (
+    user_id TEXT NOT NULL DEFAULT 'default',
+    module_number INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    section_count INTEGER NOT NULL DEFAULT 0,
+    completed_count INTEGER NOT NULL DEFAULT 0,
+    mastery_rows INTEGER NOT NULL DEFAULT 0,       -- sections with a mastery_score
+    mastery_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    atoms_total INTEGER NOT NULL DEFAULT 0,
+    atoms_mastered INTEGER NOT NULL DEFAULT 0,
+    atoms_learning INTEGER NOT NULL DEFAULT 0,
+    atoms_struggling INTEGER NOT NULL DEFAULT 0,
+    atoms_new INTEGER NOT NULL DEFAULT 0,
+    remediation_sections INTEGER NOT NULL DEFAULT 0,
+    remediation_atoms INTEGER NOT NULL DEFAULT 0,
+    first_incomplete_order INTEGER,
+    first_incomplete_section TEXT,
+    PRIMARY KEY (user_id, module_number, level)
+);
+
+COMMENT ON TABLE dashboard_atom_rollup IS 'Dashboard atom counters per module/type (incrementally maintained)';
+COMMENT ON TABLE dashboard_due_rollup IS 'Atoms per anki_due_date; due count is a prefix sum';
+COMMENT ON TABLE dashboard_section_rollup IS 'Per-user section mastery aggregated per module and level';
@@ -0,0 +1,75 @@
+-- Migration 035: Materialized struggle priority
+--
+-- v_struggle_priority (migration 018) joined learning_atoms, ccna_sections and
+-- struggle_weights and scored every atom on every read. The join now lives in
+-- struggle_priority, one row per (struggle weight, atom), maintained by
+-- src/study/struggle_priority.py:
+--
+-- - record_interaction, the Anki pull and replica pushes refresh the touched atoms
+-- - struggle imports and NCDE weight updates refresh the touched modules
+-- - the table is rebuilt when empty, after hydration, or on demand
+--
+-- The time-independent part of the score is stored in base_score. The recency
+-- term depends on NOW(), so the view applies it at read time from
+-- atom_updated_at; time passing never requires a refresh.
+
+CREATE TABLE IF NOT EXISTS struggle_priority (
+    weight_id UUID NOT NULL,
+    atom_id UUID NOT NULL,
+    user_id VARCHAR(255) NOT NULL,
+    module_number INTEGER NOT NULL,
+    section_id TEXT NOT NULL,
+    struggle_weight FLOAT NOT NULL,
+    base_score DOUBLE PRECISION NOT NULL,   -- weight * 2 + (1 - min(stability / 30, 1))
+    atom_updated_at TIMESTAMPTZ,
+    PRIMARY KEY (weight_id, atom_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_struggle_priority_atom ON struggle_priority(atom_id);
+CREATE INDEX IF NOT EXISTS idx_struggle_priority_module ON struggle_priority(module_number);
+CREATE INDEX IF NOT EXISTS idx_struggle_priority_user_weight
+    ON struggle_priority(user_id, struggle_weight);
+
+INSERT INTO struggle_priority (
+    weight_id, atom_id, user_id, module_number, section_id,
+    struggle_weight, base_score, atom_updated_at
+)
+SELECT
+    sw.id, la.id, sw.user_id, cs.module_number, cs.section_id, sw.weight,
+    (sw.weight * 2.0) + (1.0 - LEAST(la.anki_stability / 30.0, 1.0)),
+    la.updated_at
+FROM learning_atoms la
+JOIN ccna_sections cs ON la.ccna_section_id = cs.section_id
+JOIN struggle_weights sw
+    ON sw.module_number = cs.module_number
+    AND (sw.section_id IS NULL OR sw.section_id = cs.section_id)
+ON CONFLICT (weight_id, atom_id) DO NOTHING;
+
+DROP VIEW IF EXISTS v_struggle_priority;
+
+CREATE VIEW v_struggle_priority AS
+SELECT
+    sp.atom_id,
+    la.card_id,
+    la.atom_type,
+    la.front,
+    la.back,
+    sp.section_id,
+    sp.module_number,
+    cs.title as section_title,
+    sp.struggle_weight,
+    la.anki_difficulty as difficulty,
+    la.anki_stability as stability,
+    sp.base_score + (1.0 / (1 + EXTRACT(EPOCH FROM (NOW() - sp.atom_updated_at))/86400)) as priority_score
+FROM
+    struggle_priority sp
+JOIN
+    learning_atoms la ON la.id = sp.atom_id
+JOIN
+    ccna_sections cs ON cs.section_id = sp.section_id
+WHERE
+    sp.user_id = 'default';
+
+COMMENT ON TABLE struggle_priority IS 'Materialized (struggle weight, atom) pairs behind v_struggle_priority (incrementally maintained)';
+COMMENT ON COLUMN struggle_priority.base_score IS 'Time-independent part of priority_score; the view adds the recency term';
+COMMENT ON VIEW v_struggle_priority IS 'Provides a prioritized list of atoms for study, weighted by struggle scores.';
@@ -0,0 +1,38 @@
+-- Greenlight queue claims: leases, claim indexes and wake-up notifications
+--
+-- Workers claim batches of pending rows with FOR UPDATE SKIP LOCKED and hold
+-- them under a lease (worker_id, lease_expires_at) renewed by heartbeats.
+-- Rows whose lease expired are reclaimed by any worker.
+
+ALTER TABLE greenlight_queue
+    ADD COLUMN IF NOT EXISTS worker_id VARCHAR(100),
+    ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+
+-- Claim scans only pending rows, oldest first
+CREATE INDEX IF NOT EXISTS idx_greenlight_queue_pending
+    ON greenlight_queue(queued_at)
+    WHERE status = 'pending';
+
+-- Reclaim scans only executing rows by lease expiry
+CREATE INDEX IF NOT EXISTS idx_greenlight_queue_lease
+    ON greenlight_queue(lease_expires_at)
+    WHERE status = 'executing';
+
+-- Wake idle workers when a row becomes pending. Identical notifications in
+-- one transaction are delivered once, so a bulk enqueue sends a single one.
+CREATE OR REPLACE FUNCTION notify_greenlight_queue() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('greenlight_queue', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_greenlight_queue_notify ON greenlight_queue;
+CREATE TRIGGER trg_greenlight_queue_notify
+    AFTER INSERT OR UPDATE OF status ON greenlight_queue
+    FOR EACH ROW
+    WHEN (NEW.status = 'pending')
+    EXECUTE FUNCTION notify_greenlight_queue();
+
+COMMENT ON COLUMN greenlight_queue.worker_id IS 'Worker holding the lease of an executing row';
+COMMENT ON COLUMN greenlight_queue.lease_expires_at IS 'Executing rows are reclaimed after this';
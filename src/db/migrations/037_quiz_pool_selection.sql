@@ -0,0 +1,10 @@
+-- Quiz pool selection: candidate index for seeded selection
+--
+-- QuizPoolManager ranks a pool's active questions by md5(salt || id) and
+-- counts them per question type. Both scan only this index's entries for
+-- the pool instead of the pool-wide partial index plus a heap filter.
+
+CREATE INDEX IF NOT EXISTS idx_quiz_questions_pool_active
+    ON quiz_questions(pool_id, question_type)
+    INCLUDE (id)
+    WHERE is_active = true;
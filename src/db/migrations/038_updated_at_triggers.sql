@@ -0,0 +1,50 @@
+-- Migration 038: Keep updated_at current on the replicated study tables
+--
+-- src/db/replica.ReplicaSync pulls rows with updated_at >= its watermark and
+-- guards pushes with the updated_at the replica last saw. Writers of these
+-- tables (Anki sync, importers, remediation, the API) rarely set updated_at,
+-- so without a trigger their changes never reach the replica and pushes
+-- cannot tell a newer server row from an unchanged one.
+-- update_updated_at_column() is defined in 005_prerequisites_and_quiz.sql.
+
+-- Nightly calibration (src/adaptive/psychometrics) rewrites the IRT/CTT
+-- columns of learning_atoms. Those are not study content or scheduling, so an
+-- update changing nothing else keeps updated_at: replica pulls and the
+-- struggle_priority recency term would otherwise see most atoms change daily.
+DROP TRIGGER IF EXISTS trg_learning_atoms_updated_at ON learning_atoms;
+CREATE TRIGGER trg_learning_atoms_updated_at
+    BEFORE UPDATE ON learning_atoms
+    FOR EACH ROW
+    WHEN (
+        to_jsonb(OLD) - ARRAY[
+            'irt_difficulty', 'irt_discrimination', 'irt_guessing', 'p_value',
+            'discrimination_index', 'response_count', 'correct_count'
+        ]
+        IS DISTINCT FROM
+        to_jsonb(NEW) - ARRAY[
+            'irt_difficulty', 'irt_discrimination', 'irt_guessing', 'p_value',
+            'discrimination_index', 'response_count', 'correct_count'
+        ]
+    )
+    EXECUTE FUNCTION update_updated_at_column();
+
+DROP TRIGGER IF EXISTS trg_ccna_sections_updated_at ON ccna_sections;
+CREATE TRIGGER trg_ccna_sections_updated_at
+    BEFORE UPDATE ON ccna_sections
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+DROP TRIGGER IF EXISTS trg_ccna_section_mastery_updated_at ON ccna_section_mastery;
+CREATE TRIGGER trg_ccna_section_mastery_updated_at
+    BEFORE UPDATE ON ccna_section_mastery
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+DROP TRIGGER IF EXISTS trg_concepts_updated_at ON concepts;
+CREATE TRIGGER trg_concepts_updated_at
+    BEFORE UPDATE ON concepts
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Pull scans
+CREATE INDEX IF NOT EXISTS idx_learning_atoms_updated_at ON learning_atoms(updated_at);
@@ -0,0 +1,200 @@
+-- Migration 039: Keep struggle_priority in step with its source tables
+--
+-- struggle_priority (migration 035) was refreshed only by the write paths
+-- that knew about it. Importers, note actions, remediation, the learning
+-- engine and ETL bulk loads write learning_atoms and struggle_weights
+-- directly, so their changes never reached v_struggle_priority, and rows of
+-- deleted weights kept being served.
+--
+-- Statement-level triggers now recompute the rows of every changed atom,
+-- struggle weight and section, whoever writes them. Transition tables keep
+-- bulk statements to one DELETE and one INSERT per statement. The view also
+-- joins struggle_weights again, so a weight that no longer exists is never
+-- ranked.
+
+-- Rows of struggle_priority, as computed by src/study/struggle_priority.py
+CREATE OR REPLACE VIEW v_struggle_priority_rows AS
+SELECT
+    sw.id AS weight_id,
+    la.id AS atom_id,
+    sw.user_id,
+    cs.module_number,
+    cs.section_id,
+    sw.weight AS struggle_weight,
+    (sw.weight * 2.0) + (1.0 - LEAST(la.anki_stability / 30.0, 1.0)) AS base_score,
+    la.updated_at AS atom_updated_at
+FROM learning_atoms la
+JOIN ccna_sections cs ON la.ccna_section_id = cs.section_id
+JOIN struggle_weights sw
+    ON sw.module_number = cs.module_number
+    AND (sw.section_id IS NULL OR sw.section_id = cs.section_id);
+
+CREATE OR REPLACE FUNCTION refresh_struggle_priority_atoms()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM struggle_priority sp
+    USING changed_rows c
+    WHERE sp.atom_id = c.id;
+
+    INSERT INTO struggle_priority (
+        weight_id, atom_id, user_id, module_number, section_id,
+        struggle_weight, base_score, atom_updated_at
+    )
+    SELECT r.weight_id, r.atom_id, r.user_id, r.module_number, r.section_id,
+           r.struggle_weight, r.base_score, r.atom_updated_at
+    FROM v_struggle_priority_rows r
+    WHERE r.atom_id IN (SELECT id FROM changed_rows);
+
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION refresh_struggle_priority_weights()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM struggle_priority sp
+    USING changed_rows c
+    WHERE sp.weight_id = c.id;
+
+    INSERT INTO struggle_priority (
+        weight_id, atom_id, user_id, module_number, section_id,
+        struggle_weight, base_score, atom_updated_at
+    )
+    SELECT r.weight_id, r.atom_id, r.user_id, r.module_number, r.section_id,
+           r.struggle_weight, r.base_score, r.atom_updated_at
+    FROM v_struggle_priority_rows r
+    WHERE r.weight_id IN (SELECT id FROM changed_rows);
+
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION refresh_struggle_priority_sections()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM struggle_priority sp
+    USING changed_rows c
+    WHERE sp.section_id = c.section_id;
+
+    INSERT INTO struggle_priority (
+        weight_id, atom_id, user_id, module_number, section_id,
+        struggle_weight, base_score, atom_updated_at
+    )
+    SELECT r.weight_id, r.atom_id, r.user_id, r.module_number, r.section_id,
+           r.struggle_weight, r.base_score, r.atom_updated_at
+    FROM v_struggle_priority_rows r
+    WHERE r.section_id IN (SELECT section_id FROM changed_rows);
+
+    RETURN NULL;
+END;
+$$;
+
+-- Triggers with transition tables take a single event each. After a
+-- DELETE the source rows are gone, so the INSERT finds nothing to add.
+DROP TRIGGER IF EXISTS trg_struggle_priority_atoms_insert ON learning_atoms;
+CREATE TRIGGER trg_struggle_priority_atoms_insert
+    AFTER INSERT ON learning_atoms
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_struggle_priority_atoms();
+
+DROP TRIGGER IF EXISTS trg_struggle_priority_atoms_update ON learning_atoms;
+CREATE TRIGGER trg_struggle_priority_atoms_update
+    AFTER UPDATE ON learning_atoms
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_struggle_priority_atoms();
+
+DROP TRIGGER IF EXISTS trg_struggle_priority_atoms_delete ON learning_atoms;
+CREATE TRIGGER trg_struggle_priority_atoms_delete
+    AFTER DELETE ON learning_atoms
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_struggle_priority_atoms();
+
+DROP TRIGGER IF EXISTS trg_struggle_priority_weights_insert ON struggle_weights;
+CREATE TRIGGER trg_struggle_priority_weights_insert
+    AFTER INSERT ON struggle_weights
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_struggle_priority_weights();
+
+DROP TRIGGER IF EXISTS trg_struggle_priority_weights_update ON struggle_weights;
+CREATE TRIGGER trg_struggle_priority_weights_update
+    AFTER UPDATE ON struggle_weights
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_struggle_priority_weights();
+
+DROP TRIGGER IF EXISTS trg_struggle_priority_weights_delete ON struggle_weights;
+CREATE TRIGGER trg_struggle_priority_weights_delete
+    AFTER DELETE ON struggle_weights
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_struggle_priority_weights();
+
+DROP TRIGGER IF EXISTS trg_struggle_priority_sections_insert ON ccna_sections;
+CREATE TRIGGER trg_struggle_priority_sections_insert
+    AFTER INSERT ON ccna_sections
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_struggle_priority_sections();
+
+DROP TRIGGER IF EXISTS trg_struggle_priority_sections_update ON ccna_sections;
+CREATE TRIGGER trg_struggle_priority_sections_update
+    AFTER UPDATE ON ccna_sections
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_struggle_priority_sections();
+
+DROP TRIGGER IF EXISTS trg_struggle_priority_sections_delete ON ccna_sections;
+CREATE TRIGGER trg_struggle_priority_sections_delete
+    AFTER DELETE ON ccna_sections
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_struggle_priority_sections();
+
+-- Catch up on everything written while the table was maintained by hand
+DELETE FROM struggle_priority;
+INSERT INTO struggle_priority (
+    weight_id, atom_id, user_id, module_number, section_id,
+    struggle_weight, base_score, atom_updated_at
+)
+SELECT weight_id, atom_id, user_id, module_number, section_id,
+       struggle_weight, base_score, atom_updated_at
+FROM v_struggle_priority_rows;
+
+CREATE OR REPLACE VIEW v_struggle_priority AS
+SELECT
+    sp.atom_id,
+    la.card_id,
+    la.atom_type,
+    la.front,
+    la.back,
+    sp.section_id,
+    sp.module_number,
+    cs.title as section_title,
+    sp.struggle_weight,
+    la.anki_difficulty as difficulty,
+    la.anki_stability as stability,
+    sp.base_score + (1.0 / (1 + EXTRACT(EPOCH FROM (NOW() - sp.atom_updated_at))/86400)) as priority_score
+FROM
+    struggle_priority sp
+JOIN
+    struggle_weights sw ON sw.id = sp.weight_id
+JOIN
+    learning_atoms la ON la.id = sp.atom_id
+JOIN
+    ccna_sections cs ON cs.section_id = sp.section_id
+WHERE
+    sp.user_id = 'default';
+
+COMMENT ON VIEW v_struggle_priority_rows IS 'Source rows of struggle_priority (used by its maintenance triggers)';
+COMMENT ON TABLE struggle_priority IS 'Materialized (struggle weight, atom) pairs behind v_struggle_priority (maintained by triggers)';
+COMMENT ON VIEW v_struggle_priority IS 'Provides a prioritized list of atoms for study, weighted by struggle scores.';
@@ -0,0 +1,212 @@
+-- Migration 040: Keep the dashboard rollups in step with their source tables
+--
+-- The rollups of migration 034 were patched only by the write paths that
+-- knew about them (record_interaction, the Anki pull, the replica push).
+-- The CCNA router, importers and ETL bulk loads write learning_atoms
+-- directly, so the dashboard drifted from the source tables until the next
+-- full rebuild.
+--
+-- Statement-level triggers now maintain the rollups for every writer:
+-- - learning_atoms: subtract the old rows' facts and add the new rows'
+--   facts (transition tables, one grouped upsert per statement)
+-- - ccna_sections: an atom's module comes from its section, so the atom
+--   rollup is recomputed when sections that have atoms change; every
+--   section rollup is dropped
+-- - ccna_section_mastery: the changed users' section rollups are dropped
+--   and recomputed on the next dashboard read
+
+-- Rollup facts of the rows in a transition table, with +1/-1 signs.
+-- Mirrors ATOM_FACTS_SQL in src/study/summary_store.py.
+CREATE OR REPLACE FUNCTION apply_dashboard_atom_changes()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    changed TEXT;
+BEGIN
+    changed := CASE TG_OP
+        WHEN 'INSERT' THEN 'SELECT 1 AS sign, * FROM new_rows'
+        WHEN 'DELETE' THEN 'SELECT -1 AS sign, * FROM old_rows'
+        ELSE 'SELECT -1 AS sign, * FROM old_rows UNION ALL SELECT 1, * FROM new_rows'
+    END;
+
+    EXECUTE format($sql$
+        WITH facts AS (
+            SELECT
+                c.sign,
+                COALESCE(cs.module_number, 0) AS module_number,
+                COALESCE(c.atom_type, '') AS atom_type,
+                (c.ccna_section_id IS NOT NULL) AS has_section,
+                CASE WHEN c.front IS NOT NULL AND c.front != '' THEN 1 ELSE 0 END AS authored,
+                CASE WHEN c.anki_review_count > 0 THEN 1 ELSE 0 END AS reviewed,
+                CASE WHEN c.nls_correct_count > c.nls_incorrect_count THEN 1 ELSE 0 END
+                    AS nls_mastered,
+                c.anki_due_date::date AS due_date
+            FROM (%s) c
+            LEFT JOIN ccna_sections cs ON cs.section_id = c.ccna_section_id
+        ),
+        atom_delta AS (
+            INSERT INTO dashboard_atom_rollup (
+                module_number, atom_type, has_section,
+                atom_count, authored_count, reviewed_count, nls_mastered_count
+            )
+            SELECT module_number, atom_type, has_section,
+                   SUM(sign), SUM(sign * authored), SUM(sign * reviewed),
+                   SUM(sign * nls_mastered)
+            FROM facts
+            GROUP BY 1, 2, 3
+            ON CONFLICT (module_number, atom_type, has_section) DO UPDATE SET
+                atom_count = dashboard_atom_rollup.atom_count + EXCLUDED.atom_count,
+                authored_count = dashboard_atom_rollup.authored_count + EXCLUDED.authored_count,
+                reviewed_count = dashboard_atom_rollup.reviewed_count + EXCLUDED.reviewed_count,
+                nls_mastered_count =
+                    dashboard_atom_rollup.nls_mastered_count + EXCLUDED.nls_mastered_count
+        )
+        INSERT INTO dashboard_due_rollup (due_date, atom_count)
+        SELECT due_date, SUM(sign)
+        FROM facts
+        WHERE due_date IS NOT NULL
+        GROUP BY due_date
+        ON CONFLICT (due_date) DO UPDATE SET
+            atom_count = dashboard_due_rollup.atom_count + EXCLUDED.atom_count
+    $sql$, changed);
+
+    DELETE FROM dashboard_atom_rollup WHERE atom_count = 0;
+    DELETE FROM dashboard_due_rollup WHERE atom_count = 0;
+
+    RETURN NULL;
+END;
+$$;
+
+-- Full recompute of the atom and due rollups (ATOM_ROLLUP_SQL / DUE_ROLLUP_SQL)
+CREATE OR REPLACE FUNCTION rebuild_dashboard_atom_rollups()
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM dashboard_atom_rollup;
+    INSERT INTO dashboard_atom_rollup (
+        module_number, atom_type, has_section,
+        atom_count, authored_count, reviewed_count, nls_mastered_count
+    )
+    SELECT
+        COALESCE(cs.module_number, 0),
+        COALESCE(la.atom_type, ''),
+        (la.ccna_section_id IS NOT NULL),
+        COUNT(*),
+        SUM(CASE WHEN la.front IS NOT NULL AND la.front != '' THEN 1 ELSE 0 END),
+        SUM(CASE WHEN la.anki_review_count > 0 THEN 1 ELSE 0 END),
+        SUM(CASE WHEN la.nls_correct_count > la.nls_incorrect_count THEN 1 ELSE 0 END)
+    FROM learning_atoms la
+    LEFT JOIN ccna_sections cs ON cs.section_id = la.ccna_section_id
+    GROUP BY 1, 2, 3;
+
+    DELETE FROM dashboard_due_rollup;
+    INSERT INTO dashboard_due_rollup (due_date, atom_count)
+    SELECT anki_due_date::date, COUNT(*)
+    FROM learning_atoms
+    WHERE anki_due_date IS NOT NULL
+    GROUP BY 1;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION refresh_dashboard_sections()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM learning_atoms la
+        WHERE la.ccna_section_id IN (SELECT section_id FROM changed_rows)
+    ) THEN
+        PERFORM rebuild_dashboard_atom_rollups();
+    END IF;
+    DELETE FROM dashboard_section_rollup;
+
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION drop_dashboard_section_rollups()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM dashboard_section_rollup r
+    WHERE r.user_id IN (SELECT DISTINCT user_id FROM changed_rows);
+
+    RETURN NULL;
+END;
+$$;
+
+-- Triggers with transition tables take a single event each
+DROP TRIGGER IF EXISTS trg_dashboard_atoms_insert ON learning_atoms;
+CREATE TRIGGER trg_dashboard_atoms_insert
+    AFTER INSERT ON learning_atoms
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_dashboard_atom_changes();
+
+DROP TRIGGER IF EXISTS trg_dashboard_atoms_update ON learning_atoms;
+CREATE TRIGGER trg_dashboard_atoms_update
+    AFTER UPDATE ON learning_atoms
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_dashboard_atom_changes();
+
+DROP TRIGGER IF EXISTS trg_dashboard_atoms_delete ON learning_atoms;
+CREATE TRIGGER trg_dashboard_atoms_delete
+    AFTER DELETE ON learning_atoms
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_dashboard_atom_changes();
+
+DROP TRIGGER IF EXISTS trg_dashboard_sections_insert ON ccna_sections;
+CREATE TRIGGER trg_dashboard_sections_insert
+    AFTER INSERT ON ccna_sections
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_dashboard_sections();
+
+DROP TRIGGER IF EXISTS trg_dashboard_sections_update ON ccna_sections;
+CREATE TRIGGER trg_dashboard_sections_update
+    AFTER UPDATE ON ccna_sections
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_dashboard_sections();
+
+DROP TRIGGER IF EXISTS trg_dashboard_sections_delete ON ccna_sections;
+CREATE TRIGGER trg_dashboard_sections_delete
+    AFTER DELETE ON ccna_sections
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION refresh_dashboard_sections();
+
+DROP TRIGGER IF EXISTS trg_dashboard_mastery_insert ON ccna_section_mastery;
+CREATE TRIGGER trg_dashboard_mastery_insert
+    AFTER INSERT ON ccna_section_mastery
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION drop_dashboard_section_rollups();
+
+DROP TRIGGER IF EXISTS trg_dashboard_mastery_update ON ccna_section_mastery;
+CREATE TRIGGER trg_dashboard_mastery_update
+    AFTER UPDATE ON ccna_section_mastery
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION drop_dashboard_section_rollups();
+
+DROP TRIGGER IF EXISTS trg_dashboard_mastery_delete ON ccna_section_mastery;
+CREATE TRIGGER trg_dashboard_mastery_delete
+    AFTER DELETE ON ccna_section_mastery
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION drop_dashboard_section_rollups();
+
+-- Catch up on everything written while the rollups were maintained by hand
+SELECT rebuild_dashboard_atom_rollups();
+DELETE FROM dashboard_section_rollup;
+
+COMMENT ON TABLE dashboard_atom_rollup IS 'Dashboard atom counters per module/type (maintained by triggers)';
+COMMENT ON TABLE dashboard_due_rollup IS 'Atoms per anki_due_date; due count is a prefix sum (maintained by triggers)';
+COMMENT ON TABLE dashboard_section_rollup IS 'Per-user section mastery aggregated per module and level (dropped by triggers, recomputed on read)';
@@ -159,6 +159,9 @@ class QuizQuestion(Base):
     )
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
 
+    # Source key of imported questions ('card:<card_id>'); NULL for authored ones
+    import_key: Mapped[str | None] = mapped_column(Text, unique=True)
+
     created_at: Mapped[datetime] = mapped_column(default=func.now())
     updated_at: Mapped[datetime] = mapped_column(default=func.now(), onupdate=func.now())
 
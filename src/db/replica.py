@@ -0,0 +1,708 @@
+"""
+Local SQLite Read Replica.
+
+Keeps the study-relevant subset of PostgreSQL (learning_atoms,
+ccna_sections, concepts, struggle_weights, ccna_section_mastery) in the
+offline database (OfflineConfig.database_path) so sessions can be built
+without a database server.
+
+Sync is incremental in both directions:
+- pull: per table, only rows with updated_at >= the stored watermark (less
+  PULL_OVERLAP, for rows committed late by long transactions) are fetched
+  and upserted. PostgreSQL keeps updated_at current with BEFORE UPDATE
+  triggers (migration 038). When local and remote row counts disagree
+  (rows deleted upstream, or inserted with a NULL updated_at) the table's
+  keys are reconciled.
+- push: reviews recorded against the replica are queued in
+  pending_reviews and written back in batches (atom_responses rows plus
+  the atoms' resulting scheduling state), one transaction per batch. The
+  local updated_at of an atom is the server's as of the last pull; atoms
+  changed on the server since then keep the server's scheduling state and
+  are counted as stale.
+
+Push always runs before pull so unpushed local scheduling state is never
+overwritten by older server rows.
+
+Usage:
+    replica = LocalReplica()
+    ReplicaSync(replica).sync()
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import bindparam, create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+# Under the project's data/ directory, whatever the working directory
+DEFAULT_REPLICA_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "cortex.db"
+DEFAULT_PUSH_BATCH_SIZE = 500
+# Seconds to wait for the server before studying offline (libpq rounds up to 2)
+SERVER_PROBE_TIMEOUT = 3
+# Re-read window before the watermark: updated_at is the writing
+# transaction's start time, so rows can commit after a pull saw later ones
+PULL_OVERLAP = timedelta(minutes=5)
+_FETCH_CHUNK = 5000
+_KEY_CHUNK = 900  # Below SQLite's bound-parameter limit
+
+
+@dataclass(frozen=True)
+class ReplicaTable:
+    """A replicated table: key and columns as named in both databases."""
+
+    name: str
+    key_columns: tuple[str, ...]
+    columns: tuple[str, ...]
+
+
+REPLICA_TABLES: tuple[ReplicaTable, ...] = (
+    ReplicaTable(
+        "ccna_sections",
+        ("section_id",),
+        ("section_id", "module_number", "title", "level", "parent_section_id", "display_order"),
+    ),
+    ReplicaTable("concepts", ("id",), ("id", "name")),
+    ReplicaTable(
+        "learning_atoms",
+        ("id",),
+        (
+            "id",
+            "card_id",
+            "atom_type",
+            "front",
+            "back",
+            "concept_id",
+            "ccna_section_id",
+            "source_file",
+            "anki_difficulty",
+            "anki_stability",
+            "anki_lapses",
+            "anki_review_count",
+            "anki_due_date",
+        ),
+    ),
+    ReplicaTable(
+        "struggle_weights",
+        ("id",),
+        ("id", "module_number", "section_id", "weight", "severity", "user_id"),
+    ),
+    ReplicaTable(
+        "ccna_section_mastery",
+        ("section_id", "user_id"),
+        (
+            "section_id",
+            "user_id",
+            "mastery_score",
+            "is_completed",
+            "needs_remediation",
+            "atoms_total",
+            "atoms_mastered",
+            "atoms_learning",
+            "atoms_struggling",
+            "atoms_new",
+        ),
+    ),
+)
+
+# Atom scheduling columns written back to PostgreSQL on push
+SCHEDULING_COLUMNS = (
+    "anki_difficulty",
+    "anki_stability",
+    "anki_lapses",
+    "anki_review_count",
+    "anki_due_date",
+)
+
+SCHEMA_SQL = (
+    """
+    CREATE TABLE IF NOT EXISTS ccna_sections (
+        section_id TEXT PRIMARY KEY,
+        module_number INTEGER,
+        title TEXT,
+        level INTEGER,
+        parent_section_id TEXT,
+        display_order INTEGER,
+        updated_at TEXT
+    )
+    """,
+    "CREATE TABLE IF NOT EXISTS concepts (id TEXT PRIMARY KEY, name TEXT, updated_at TEXT)",
+    """
+    CREATE TABLE IF NOT EXISTS learning_atoms (
+        id TEXT PRIMARY KEY,
+        card_id TEXT,
+        atom_type TEXT,
+        front TEXT,
+        back TEXT,
+        concept_id TEXT,
+        ccna_section_id TEXT,
+        source_file TEXT,
+        anki_difficulty REAL,
+        anki_stability REAL,
+        anki_lapses INTEGER,
+        anki_review_count INTEGER,
+        anki_due_date TEXT,
+        updated_at TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS struggle_weights (
+        id TEXT PRIMARY KEY,
+        module_number INTEGER,
+        section_id TEXT,
+        weight REAL,
+        severity TEXT,
+        user_id TEXT,
+        updated_at TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ccna_section_mastery (
+        section_id TEXT NOT NULL,
+        user_id TEXT NOT NULL,
+        mastery_score REAL,
+        is_completed INTEGER,
+        needs_remediation INTEGER,
+        atoms_total INTEGER,
+        atoms_mastered INTEGER,
+        atoms_learning INTEGER,
+        atoms_struggling INTEGER,
+        atoms_new INTEGER,
+        updated_at TEXT,
+        PRIMARY KEY (section_id, user_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS pending_reviews (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        atom_id TEXT NOT NULL,
+        user_id TEXT NOT NULL,
+        is_correct INTEGER NOT NULL,
+        response_time_ms INTEGER,
+        user_answer TEXT,
+        session_type TEXT,
+        responded_at TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS replica_sync_state (
+        table_name TEXT PRIMARY KEY,
+        watermark TEXT,
+        row_count INTEGER,
+        synced_at TEXT
+    )
+    """,
+    # Session queries: due reviews, new atoms per section, war mode by type
+    """
+    CREATE INDEX IF NOT EXISTS idx_replica_atoms_due
+        ON learning_atoms(anki_due_date, anki_stability)
+        WHERE anki_due_date IS NOT NULL AND front IS NOT NULL AND front != ''
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_replica_atoms_new
+        ON learning_atoms(ccna_section_id, atom_type)
+        WHERE COALESCE(anki_review_count, 0) = 0
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_replica_atoms_section_type ON learning_atoms(ccna_section_id, atom_type)",
+    "CREATE INDEX IF NOT EXISTS idx_replica_atoms_card ON learning_atoms(card_id)",
+    "CREATE INDEX IF NOT EXISTS idx_replica_sections_module ON ccna_sections(module_number, display_order)",
+    "CREATE INDEX IF NOT EXISTS idx_replica_struggle_module ON struggle_weights(module_number, section_id)",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection: Any, _record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=OFF")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def _to_local(value: Any) -> Any:
+    """PostgreSQL value -> SQLite-storable value."""
+    if value is None or isinstance(value, (str, int, float)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return str(value)
+
+
+def _parse_timestamp(value: str | datetime | None) -> datetime | None:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def _utcnow() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+class LocalReplica:
+    """
+    SQLite replica of the study tables plus the local review outbox.
+
+    Example:
+        replica = LocalReplica("data/cortex.db")
+        with replica.engine.connect() as conn:
+            ...
+    """
+
+    def __init__(self, path: Path | str = DEFAULT_REPLICA_PATH, create: bool = True):
+        """
+        Open (and by default create) the replica database.
+
+        Args:
+            path: SQLite file (":memory:" for tests)
+            create: Create the schema if missing
+        """
+        self.path = Path(path) if str(path) != ":memory:" else None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            url = f"sqlite:///{self.path}"
+        else:
+            url = "sqlite://"
+        self.engine: Engine = create_engine(url)
+        event.listen(self.engine, "connect", _set_sqlite_pragmas)
+        if create:
+            self.create_schema()
+
+    @classmethod
+    def open_existing(cls, path: Path | str = DEFAULT_REPLICA_PATH) -> LocalReplica | None:
+        """The replica at ``path`` if it has been synced at least once, else None."""
+        if not Path(path).exists():
+            return None
+        replica = cls(path)
+        return replica if replica.is_populated() else None
+
+    def create_schema(self) -> None:
+        with self.engine.begin() as conn:
+            for ddl in SCHEMA_SQL:
+                conn.execute(text(ddl))
+
+    def is_populated(self) -> bool:
+        with self.engine.connect() as conn:
+            return bool(
+                conn.execute(
+                    text("SELECT 1 FROM replica_sync_state WHERE table_name = 'learning_atoms'")
+                ).first()
+            )
+
+    # =========================================================================
+    # Sync bookkeeping
+    # =========================================================================
+
+    def watermark(self, conn: Any, table: str) -> datetime | None:
+        value = conn.execute(
+            text("SELECT watermark FROM replica_sync_state WHERE table_name = :t"), {"t": table}
+        ).scalar()
+        return _parse_timestamp(value)
+
+    def set_watermark(self, conn: Any, table: str, watermark: datetime | None) -> None:
+        row_count = conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+        conn.execute(
+            text(
+                "INSERT INTO replica_sync_state (table_name, watermark, row_count, synced_at) "
+                "VALUES (:t, :w, :n, :s) "
+                "ON CONFLICT (table_name) DO UPDATE SET watermark = excluded.watermark, "
+                "row_count = excluded.row_count, synced_at = excluded.synced_at"
+            ),
+            {
+                "t": table,
+                "w": watermark.isoformat() if watermark else None,
+                "n": row_count,
+                "s": _utcnow(),
+            },
+        )
+
+    def upsert(self, conn: Any, table: ReplicaTable, rows: Sequence[dict[str, Any]]) -> int:
+        """Insert or replace rows (values already converted with _to_local)."""
+        if not rows:
+            return 0
+        columns = list(table.columns) + ["updated_at"]
+        updates = [c for c in columns if c not in table.key_columns]
+        conn.execute(
+            text(
+                f"INSERT INTO {table.name} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(':' + c for c in columns)}) "
+                f"ON CONFLICT ({', '.join(table.key_columns)}) DO UPDATE SET "
+                + ", ".join(f"{c} = excluded.{c}" for c in updates)
+            ),
+            list(rows),
+        )
+        return len(rows)
+
+    # =========================================================================
+    # Local reviews
+    # =========================================================================
+
+    def record_review(
+        self,
+        atom_id: str,
+        user_id: str,
+        is_correct: bool,
+        response_time_ms: int,
+        user_answer: str = "",
+        session_type: str = "cortex",
+    ) -> dict[str, Any]:
+        """
+        Apply a review to the replica and queue it for push.
+
+        Scheduling follows StudyService.record_interaction's simplified
+        FSRS: stability x2.5 (max 365) on correct, x0.5 (min 1) plus a
+        lapse on incorrect. The atom's updated_at is left at the server's
+        value so push can tell whether the server row changed since.
+
+        Returns:
+            Dict with new_stability and next_due
+        """
+        if is_correct:
+            update_sql = """
+                UPDATE learning_atoms SET
+                    anki_stability = MIN(COALESCE(anki_stability, 1) * 2.5, 365),
+                    anki_difficulty = MAX(COALESCE(anki_difficulty, 0.3) - 0.05, 0.1),
+                    anki_review_count = COALESCE(anki_review_count, 0) + 1,
+                    anki_due_date = DATE('now', 'localtime',
+                        '+' || CAST(MIN(COALESCE(anki_stability, 1) * 2.5, 365) AS INTEGER)
+                        || ' days')
+                WHERE id = :atom_id
+            """
+        else:
+            update_sql = """
+                UPDATE learning_atoms SET
+                    anki_stability = MAX(COALESCE(anki_stability, 1) * 0.5, 1),
+                    anki_difficulty = MIN(COALESCE(anki_difficulty, 0.3) + 0.1, 1.0),
+                    anki_lapses = COALESCE(anki_lapses, 0) + 1,
+                    anki_review_count = COALESCE(anki_review_count, 0) + 1,
+                    anki_due_date = DATE('now', 'localtime', '+1 day')
+                WHERE id = :atom_id
+            """
+        now = _utcnow()
+        with self.engine.begin() as conn:
+            conn.execute(text(update_sql), {"atom_id": atom_id})
+            conn.execute(
+                text(
+                    "INSERT INTO pending_reviews (atom_id, user_id, is_correct, response_time_ms, "
+                    "user_answer, session_type, responded_at) "
+                    "VALUES (:atom_id, :user_id, :is_correct, :rt, :answer, :session_type, :at)"
+                ),
+                {
+                    "atom_id": atom_id,
+                    "user_id": user_id,
+                    "is_correct": int(is_correct),
+                    "rt": response_time_ms,
+                    "answer": (user_answer or "")[:500],
+                    "session_type": session_type,
+                    "at": now,
+                },
+            )
+            row = conn.execute(
+                text("SELECT anki_stability, anki_due_date FROM learning_atoms WHERE id = :atom_id"),
+                {"atom_id": atom_id},
+            ).first()
+        return {
+            "new_stability": (row.anki_stability or 0) if row else 0.0,
+            "next_due": date.fromisoformat(row.anki_due_date) if row and row.anki_due_date else None,
+        }
+
+    def pending_count(self) -> int:
+        with self.engine.connect() as conn:
+            return int(conn.execute(text("SELECT COUNT(*) FROM pending_reviews")).scalar() or 0)
+
+
+@dataclass
+class ReplicaSyncResult:
+    """Outcome of a replica sync."""
+
+    pushed_reviews: int = 0
+    pushed_atoms: int = 0
+    pulled_rows: dict[str, int] = field(default_factory=dict)
+    deleted_rows: dict[str, int] = field(default_factory=dict)
+    stale_atoms: int = 0  # Not written back: changed (or deleted) on the server
+    duration_seconds: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        return not self.errors
+
+
+class ReplicaSync:
+    """
+    Delta sync between PostgreSQL and a LocalReplica.
+
+    Example:
+        result = ReplicaSync(LocalReplica()).sync()
+    """
+
+    def __init__(
+        self,
+        replica: LocalReplica,
+        source: Engine | None = None,
+        batch_size: int = DEFAULT_PUSH_BATCH_SIZE,
+    ):
+        """
+        Initialize sync.
+
+        Args:
+            replica: Local replica
+            source: PostgreSQL engine (default src.db.database.engine)
+            batch_size: Reviews per push transaction
+        """
+        if source is None:
+            from src.db.database import engine as source
+        self.replica = replica
+        self.source = source
+        self.batch_size = batch_size
+
+    def server_available(self, timeout: int = SERVER_PROBE_TIMEOUT) -> bool:
+        """
+        Whether the PostgreSQL source accepts connections within ``timeout`` seconds.
+
+        Probes on a throwaway engine with libpq's connect_timeout: the main
+        engine has none, so an unreachable remote server would block session
+        start for the OS TCP connect timeout (minutes).
+        """
+        probe = self.source
+        if self.source.dialect.name == "postgresql":
+            probe = create_engine(
+                self.source.url, poolclass=NullPool, connect_args={"connect_timeout": timeout}
+            )
+        try:
+            with probe.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except Exception as e:
+            logger.debug(f"Replica source unavailable: {e}")
+            return False
+        finally:
+            if probe is not self.source:
+                probe.dispose()
+        return True
+
+    def sync(self, full: bool = False) -> ReplicaSyncResult:
+        """Push pending reviews, then pull changed rows (pull skipped if push fails)."""
+        started = time.perf_counter()
+        result = ReplicaSyncResult()
+        try:
+            self.push(result)
+        except Exception as e:
+            logger.warning(f"Replica push failed, skipping pull: {e}")
+            result.errors.append(f"push: {e}")
+        else:
+            try:
+                self.pull(result, full=full)
+            except Exception as e:
+                logger.warning(f"Replica pull failed: {e}")
+                result.errors.append(f"pull: {e}")
+        result.duration_seconds = time.perf_counter() - started
+        logger.info(
+            "Replica sync: pushed {} reviews ({} atoms, {} stale), pulled {} rows, deleted {} "
+            "in {:.2f}s",
+            result.pushed_reviews,
+            result.pushed_atoms,
+            result.stale_atoms,
+            sum(result.pulled_rows.values()),
+            sum(result.deleted_rows.values()),
+            result.duration_seconds,
+        )
+        return result
+
+    # =========================================================================
+    # Pull
+    # =========================================================================
+
+    def pull(self, result: ReplicaSyncResult | None = None, full: bool = False) -> ReplicaSyncResult:
+        """Fetch rows changed since each table's watermark."""
+        result = result or ReplicaSyncResult()
+        for table in REPLICA_TABLES:
+            pulled, deleted = self._pull_table(table, full=full)
+            result.pulled_rows[table.name] = pulled
+            result.deleted_rows[table.name] = deleted
+        return result
+
+    def _pull_table(self, table: ReplicaTable, full: bool) -> tuple[int, int]:
+        columns = ", ".join(table.columns)
+        with self.replica.engine.begin() as local, self.source.connect() as remote:
+            since = None if full else self.replica.watermark(local, table.name)
+            sql = f"SELECT {columns}, updated_at FROM {table.name}"
+            params: dict[str, Any] = {}
+            if since is not None:
+                # >= so rows sharing the watermark timestamp are not skipped
+                sql += " WHERE updated_at >= :since"
+                params["since"] = since - PULL_OVERLAP
+
+            pulled = 0
+            watermark = since
+            stream = remote.execution_options(stream_results=True, yield_per=_FETCH_CHUNK)
+            for chunk in stream.execute(text(sql), params).partitions(_FETCH_CHUNK):
+                rows = [{k: _to_local(v) for k, v in row._mapping.items()} for row in chunk]
+                pulled += self.replica.upsert(local, table, rows)
+                stamps = [_parse_timestamp(row.updated_at) for row in chunk if row.updated_at is not None]
+                if stamps:
+                    latest = max(stamps)
+                    watermark = latest if watermark is None else max(watermark, latest)
+
+            deleted = 0
+            if full:
+                deleted = self._delete_missing(local, remote, table)
+            else:
+                pulled_extra, deleted = self._reconcile(local, remote, table)
+                pulled += pulled_extra
+            self.replica.set_watermark(local, table.name, watermark)
+        return pulled, deleted
+
+    def _reconcile(self, local: Any, remote: Any, table: ReplicaTable) -> tuple[int, int]:
+        """Fix up rows the watermark cannot see when the row counts differ."""
+        remote_count = remote.execute(text(f"SELECT COUNT(*) FROM {table.name}")).scalar()
+        local_count = local.execute(text(f"SELECT COUNT(*) FROM {table.name}")).scalar()
+        if remote_count == local_count:
+            return 0, 0
+
+        if len(table.key_columns) > 1:
+            # Small composite-key tables: re-pull everything
+            local.execute(text(f"DELETE FROM {table.name}"))
+            rows = [
+                {k: _to_local(v) for k, v in row._mapping.items()}
+                for row in remote.execute(
+                    text(f"SELECT {', '.join(table.columns)}, updated_at FROM {table.name}")
+                )
+            ]
+            self.replica.upsert(local, table, rows)
+            return len(rows), max(0, local_count - len(rows))
+
+        key = table.key_columns[0]
+        remote_keys = {_to_local(r[0]) for r in remote.execute(text(f"SELECT {key} FROM {table.name}"))}
+        local_keys = {r[0] for r in local.execute(text(f"SELECT {key} FROM {table.name}"))}
+
+        deleted = self._delete_keys(local, table, local_keys - remote_keys)
+        missing = sorted(remote_keys - local_keys)
+        pulled = 0
+        query = text(
+            f"SELECT {', '.join(table.columns)}, updated_at FROM {table.name} WHERE {key} IN :keys"
+        ).bindparams(bindparam("keys", expanding=True))
+        for start in range(0, len(missing), _KEY_CHUNK):
+            chunk = remote.execute(query, {"keys": missing[start : start + _KEY_CHUNK]})
+            rows = [{k: _to_local(v) for k, v in row._mapping.items()} for row in chunk]
+            pulled += self.replica.upsert(local, table, rows)
+        return pulled, deleted
+
+    def _delete_missing(self, local: Any, remote: Any, table: ReplicaTable) -> int:
+        if len(table.key_columns) > 1:
+            return 0
+        key = table.key_columns[0]
+        remote_keys = {_to_local(r[0]) for r in remote.execute(text(f"SELECT {key} FROM {table.name}"))}
+        local_keys = {r[0] for r in local.execute(text(f"SELECT {key} FROM {table.name}"))}
+        return self._delete_keys(local, table, local_keys - remote_keys)
+
+    @staticmethod
+    def _delete_keys(local: Any, table: ReplicaTable, keys: Iterable[Any]) -> int:
+        keys = list(keys)
+        key = table.key_columns[0]
+        query = text(f"DELETE FROM {table.name} WHERE {key} IN :keys").bindparams(
+            bindparam("keys", expanding=True)
+        )
+        for start in range(0, len(keys), _KEY_CHUNK):
+            local.execute(query, {"keys": keys[start : start + _KEY_CHUNK]})
+        return len(keys)
+
+    # =========================================================================
+    # Push
+    # =========================================================================
+
+    def push(self, result: ReplicaSyncResult | None = None) -> ReplicaSyncResult:
+        """Write queued reviews and the touched atoms' scheduling back in batches."""
+        from src.db.bulk import BulkLoader
+        from src.study.summary_store import get_summary_store
+
+        result = result or ReplicaSyncResult()
+        store = get_summary_store()
+        while True:
+            with self.replica.engine.connect() as local:
+                reviews = [
+                    dict(row._mapping)
+                    for row in local.execute(
+                        text("SELECT * FROM pending_reviews ORDER BY id LIMIT :n"),
+                        {"n": self.batch_size},
+                    )
+                ]
+                if not reviews:
+                    return result
+                atom_ids = sorted({r["atom_id"] for r in reviews})
+                atoms = [
+                    dict(row._mapping)
+                    for row in local.execute(
+                        text(
+                            f"SELECT id, {', '.join(SCHEDULING_COLUMNS)}, updated_at "
+                            "FROM learning_atoms WHERE id IN :ids"
+                        ).bindparams(bindparam("ids", expanding=True)),
+                        {"ids": atom_ids},
+                    )
+                ]
+
+            for atom in atoms:
+                atom["anki_due_date"] = (
+                    date.fromisoformat(atom["anki_due_date"][:10]) if atom["anki_due_date"] else None
+                )
+                atom["updated_at"] = _parse_timestamp(atom["updated_at"])
+
+            with self.source.begin() as remote:
+                remote.execute(
+                    text(
+                        "INSERT INTO atom_responses (atom_id, user_id, is_correct, "
+                        "response_time_ms, user_answer, responded_at) "
+                        "VALUES (:atom_id, :user_id, :is_correct, :response_time_ms, "
+                        ":user_answer, :responded_at)"
+                    ),
+                    [
+                        {
+                            "atom_id": r["atom_id"],
+                            "user_id": r["user_id"],
+                            "is_correct": bool(r["is_correct"]),
+                            "response_time_ms": r["response_time_ms"],
+                            "user_answer": r["user_answer"] or "",
+                            "responded_at": _parse_timestamp(r["responded_at"]),
+                        }
+                        for r in reviews
+                    ],
+                )
+                # Only atoms unchanged on the server since the last pull; the
+                # trigger stamps the new updated_at, so the next pull reads them back
+                update = BulkLoader(remote).update(
+                    "learning_atoms",
+                    atoms,
+                    key_columns=["id"],
+                    update_columns=SCHEDULING_COLUMNS,
+                    update_where=(
+                        "learning_atoms.updated_at IS NULL OR "
+                        "learning_atoms.updated_at <= s.updated_at"
+                    ),
+                )
+            # Committed; the rollup triggers updated the dashboard tables
+            store.invalidate()
+
+            with self.replica.engine.begin() as local:
+                local.execute(
+                    text("DELETE FROM pending_reviews WHERE id <= :last"),
+                    {"last": reviews[-1]["id"]},
+                )
+            result.pushed_reviews += len(reviews)
+            result.pushed_atoms += update.updated
+            result.stale_atoms += update.skipped
@@ -8,8 +8,9 @@ File Structure:
     ~/.cortex/telemetry/
         sessions/
             2025-12-07_session_abc123.jsonl  # One event per line
+            2025-12-07_session_abc123.091500.jsonl.gz  # Rotated, compressed
         summaries/
-            2025-12-07_daily.json            # Daily aggregations
+            2025-12-07_daily.jsonl           # Daily rollup, one line per session
 
 Event Types:
     - session_start: Session initialization with mode/config
@@ -17,12 +18,22 @@ Event Types:
     - diagnosis: NCDE cognitive diagnosis
     - state_change: Session state transitions
     - session_end: Session summary with statistics
+
+Events are buffered in memory and appended in one write when the buffer
+reaches ``buffer_size_kb``, when ``flush_interval_seconds`` have passed,
+or when the session ends. File size is tracked from the bytes written,
+so rotation needs no per-event stat(). See telemetry_query for analysis
+over the resulting files.
 """
 
 from __future__ import annotations
 
+import atexit
+import gzip
 import json
 import os
+import shutil
+import time
 import uuid
 from dataclasses import asdict, dataclass, field
 from datetime import UTC, datetime
@@ -143,6 +154,9 @@ class JSONTelemetryLogger:
         log_dir: Path | None = None,
         rotation_size_mb: int = 10,
         learner_id: str | None = None,
+        buffer_size_kb: int = 64,
+        flush_interval_seconds: float = 5.0,
+        compress_rotated: bool = True,
     ):
         """
         Initialize the telemetry logger.
@@ -151,12 +165,24 @@ class JSONTelemetryLogger:
             log_dir: Directory for telemetry files (default: ~/.cortex/telemetry)
             rotation_size_mb: Max file size before rotation (default: 10MB)
             learner_id: Unique learner identifier (default: auto-generated)
+            buffer_size_kb: Buffered event bytes that trigger a flush
+            flush_interval_seconds: Max age of buffered events before a flush
+            compress_rotated: Gzip session files when they are rotated
         """
         self.log_dir = log_dir or (Path.home() / ".cortex" / "telemetry")
         self.sessions_dir = self.log_dir / "sessions"
         self.summaries_dir = self.log_dir / "summaries"
         self.rotation_size_bytes = rotation_size_mb * 1024 * 1024
         self.learner_id = learner_id or self._get_or_create_learner_id()
+        self.buffer_size_bytes = buffer_size_kb * 1024
+        self.flush_interval_seconds = flush_interval_seconds
+        self.compress_rotated = compress_rotated
+
+        # Write buffer (events are ASCII JSON, so len() == bytes)
+        self._buffer: list[str] = []
+        self._buffer_bytes = 0
+        self._file_size = 0
+        self._last_flush = time.monotonic()
 
         # Current session state
         self.session_id: str | None = None
@@ -181,6 +207,9 @@ class JSONTelemetryLogger:
         # Ensure directories exist
         self._ensure_directories()
 
+        # Don't lose buffered events if the process exits mid-session
+        atexit.register(self.flush)
+
     def _ensure_directories(self) -> None:
         """Create telemetry directories if they don't exist."""
         self.sessions_dir.mkdir(parents=True, exist_ok=True)
@@ -212,6 +241,9 @@ class JSONTelemetryLogger:
         Returns:
             Session ID
         """
+        # Flush anything left from a session that was never ended
+        self.flush()
+
         self.session_id = str(uuid.uuid4())[:12]
         self.session_start = datetime.now(UTC)
         self.mode = mode
@@ -234,6 +266,7 @@ class JSONTelemetryLogger:
         date_str = self.session_start.strftime("%Y-%m-%d")
         filename = f"{date_str}_session_{self.session_id}.jsonl"
         self.session_file = self.sessions_dir / filename
+        self._file_size = 0
 
         # Write session start event
         self._write_event(
@@ -406,6 +439,7 @@ class JSONTelemetryLogger:
 
         # Write session end event
         self._write_event("session_end", summary.to_dict())
+        self.flush()
 
         # Update daily summary
         self._update_daily_summary(summary)
@@ -423,7 +457,7 @@ class JSONTelemetryLogger:
         return summary
 
     def _write_event(self, event_type: str, payload: dict[str, Any]) -> None:
-        """Write an event to the session file."""
+        """Buffer an event for the session file, flushing on size or age."""
         if not self.session_file:
             return
 
@@ -435,83 +469,135 @@ class JSONTelemetryLogger:
         }
 
         try:
-            with open(self.session_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(event, default=str) + "\n")
+            line = json.dumps(event, default=str) + "\n"
+        except Exception as e:
+            logger.error(f"Failed to serialize telemetry event: {e}")
+            return
+
+        self._buffer.append(line)
+        self._buffer_bytes += len(line)
+        if (
+            self._buffer_bytes >= self.buffer_size_bytes
+            or time.monotonic() - self._last_flush >= self.flush_interval_seconds
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Append buffered events to the session file and rotate if needed."""
+        if not self._buffer or not self.session_file:
+            return
 
-            # Check for rotation
-            self._rotate_if_needed()
+        data = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffer_bytes = 0
+        self._last_flush = time.monotonic()
 
+        try:
+            with open(self.session_file, "a", encoding="utf-8") as f:
+                f.write(data)
         except Exception as e:
-            logger.error(f"Failed to write telemetry event: {e}")
+            logger.error(f"Failed to write telemetry events: {e}")
+            return
+
+        self._file_size += len(data)
+        if self._file_size > self.rotation_size_bytes:
+            self._rotate()
 
-    def _rotate_if_needed(self) -> None:
-        """Rotate file if it exceeds size limit."""
-        if not self.session_file or not self.session_file.exists():
+    def _rotate(self) -> None:
+        """Move the full session file aside (gzipped) and start a new one."""
+        if not self.session_file:
             return
 
-        if self.session_file.stat().st_size > self.rotation_size_bytes:
-            # Rename current file with timestamp
-            timestamp = datetime.now(UTC).strftime("%H%M%S")
-            rotated = self.session_file.with_suffix(f".{timestamp}.jsonl")
+        timestamp = datetime.now(UTC).strftime("%H%M%S%f")
+        rotated = self.session_file.with_suffix(f".{timestamp}.jsonl")
+        try:
             self.session_file.rename(rotated)
+            if self.compress_rotated:
+                compressed = rotated.with_name(rotated.name + ".gz")
+                with open(rotated, "rb") as src, gzip.open(compressed, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                rotated.unlink()
+                rotated = compressed
+        except Exception as e:
+            logger.error(f"Failed to rotate telemetry file: {e}")
+            return
 
-            # Create new file
-            self.session_file.touch()
-            logger.debug(f"Rotated telemetry file: {rotated.name}")
+        self._file_size = 0
+        logger.debug(f"Rotated telemetry file: {rotated.name}")
 
     def _update_daily_summary(self, session: SessionSummary) -> None:
-        """Update daily aggregation file."""
+        """Append the session's rollup line to the daily summary file."""
         if not self.session_start:
             return
 
-        date_str = self.session_start.strftime("%Y-%m-%d")
-        summary_file = self.summaries_dir / f"{date_str}_daily.json"
+        rollup = {
+            "session_id": session.session_id,
+            "mode": session.mode,
+            "total_atoms": session.total_atoms,
+            "correct": session.correct_count,
+            "incorrect": session.incorrect_count,
+            "duration_seconds": session.duration_seconds,
+            "failure_modes": session.failure_modes_detected,
+            "modules": session.modules_touched,
+            "ended_at": session.ended_at,
+        }
+        try:
+            with open(self.get_daily_summary_path(self.session_start), "a", encoding="utf-8") as f:
+                f.write(json.dumps(rollup) + "\n")
+        except Exception as e:
+            logger.error(f"Failed to update daily summary: {e}")
+
+    def read_daily_summary(self, date: datetime | None = None) -> dict[str, Any]:
+        """
+        Fold a day's session rollups into the daily aggregate.
+
+        Args:
+            date: Day to read (default: today, UTC)
 
-        # Load or create daily summary
-        daily: dict[str, Any]
-        if summary_file.exists():
+        Returns:
+            Dict with sessions, totals, overall_accuracy, mode_counts,
+            failure_modes and modules_studied
+        """
+        d = date or datetime.now(UTC)
+        daily = self._create_empty_daily()
+        daily["date"] = d.strftime("%Y-%m-%d")
+
+        # Pre-rollup summaries were a single rewritten JSON document
+        legacy = self.summaries_dir / f"{daily['date']}_daily.json"
+        if legacy.exists():
             try:
-                daily = json.loads(summary_file.read_text())
+                daily.update(json.loads(legacy.read_text()))
             except json.JSONDecodeError:
-                daily = self._create_empty_daily()
-        else:
-            daily = self._create_empty_daily()
+                pass
+
+        modules = set(daily["modules_studied"])
+        path = self.get_daily_summary_path(d)
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rollup = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Partial line from an interrupted write
+                    daily["sessions"].append(rollup["session_id"])
+                    daily["total_atoms"] += rollup["total_atoms"]
+                    daily["total_correct"] += rollup["correct"]
+                    daily["total_incorrect"] += rollup["incorrect"]
+                    daily["total_duration_seconds"] += rollup["duration_seconds"]
+                    daily["mode_counts"][rollup["mode"]] = (
+                        daily["mode_counts"].get(rollup["mode"], 0) + 1
+                    )
+                    for mode, count in rollup["failure_modes"].items():
+                        daily["failure_modes"][mode] = daily["failure_modes"].get(mode, 0) + count
+                    modules.update(rollup["modules"])
+                    daily["last_updated"] = rollup["ended_at"]
 
-        # Update aggregates
-        daily["sessions"].append(session.session_id)
-        daily["total_atoms"] += session.total_atoms
-        daily["total_correct"] += session.correct_count
-        daily["total_incorrect"] += session.incorrect_count
-        daily["total_duration_seconds"] += session.duration_seconds
-
-        # Update accuracy
         total = daily["total_correct"] + daily["total_incorrect"]
         daily["overall_accuracy"] = (
             round(daily["total_correct"] / total * 100, 2) if total > 0 else 0.0
         )
-
-        # Update mode counts
-        daily["mode_counts"][session.mode] = (
-            daily["mode_counts"].get(session.mode, 0) + 1
-        )
-
-        # Merge failure modes
-        for mode, count in session.failure_modes_detected.items():
-            daily["failure_modes"][mode] = daily["failure_modes"].get(mode, 0) + count
-
-        # Merge modules
-        for mod in session.modules_touched:
-            if mod not in daily["modules_studied"]:
-                daily["modules_studied"].append(mod)
-        daily["modules_studied"].sort()
-
-        daily["last_updated"] = datetime.now(UTC).isoformat()
-
-        # Write back
-        try:
-            summary_file.write_text(json.dumps(daily, indent=2))
-        except Exception as e:
-            logger.error(f"Failed to update daily summary: {e}")
+        daily["modules_studied"] = sorted(modules)
+        return daily
 
     def _create_empty_daily(self) -> dict[str, Any]:
         """Create empty daily summary structure."""
@@ -537,7 +623,7 @@ class JSONTelemetryLogger:
         """Get the daily summary file path for a date."""
         d = date or datetime.now(UTC)
         date_str = d.strftime("%Y-%m-%d")
-        return self.summaries_dir / f"{date_str}_daily.json"
+        return self.summaries_dir / f"{date_str}_daily.jsonl"
 
 
 # =============================================================================
@@ -18,11 +18,14 @@ SM-2 Grade Scale:
 from __future__ import annotations
 
 import random
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 
 from loguru import logger
 
+from src.core.interleaving import InterleaveEngine, MaxConsecutive, facet
+
 from .atom_deck import Atom, AtomDeck
 from .state_store import SM2State, StateStore
 
@@ -158,6 +161,7 @@ class InterleaveConfig:
     max_consecutive_same_module: int = 2
     max_consecutive_same_type: int = 3
     due_priority_weight: float = 2.0  # Due cards are 2x priority
+    seed: int | None = None  # Fixed seed for reproducible session order
 
 
 @dataclass
@@ -267,39 +271,25 @@ class InterleaveScheduler:
         - Ensure no 3+ consecutive from same module
         - Randomize within constraints
         """
-        result: list[Atom] = []
-
-        # Shuffle due cards to avoid predictable order
-        due_shuffled = due.copy()
-        random.shuffle(due_shuffled)
+        rng = random.Random(self.config.seed)
 
-        # Shuffle new cards
-        new_shuffled = new.copy()
-        random.shuffle(new_shuffled)
-
-        # Merge with due cards taking priority
-        due_queue = list(due_shuffled)
-        new_queue = list(new_shuffled)
+        # Shuffle due and new cards to avoid predictable order
+        due_queue = deque(rng.sample(due, len(due)))
+        new_queue = deque(rng.sample(new, len(new)))
 
         # Interleaving ratio: 2 due : 1 new
         due_batch = 2
         new_batch = 1
 
+        result: list[Atom] = []
         while due_queue or new_queue:
-            # Take due cards
-            for _ in range(due_batch):
-                if due_queue:
-                    result.append(due_queue.pop(0))
-
-            # Take new cards
-            for _ in range(new_batch):
-                if new_queue:
-                    result.append(new_queue.pop(0))
+            for _ in range(min(due_batch, len(due_queue))):
+                result.append(due_queue.popleft())
+            for _ in range(min(new_batch, len(new_queue))):
+                result.append(new_queue.popleft())
 
         # Apply context-switching constraints
-        result = self._apply_interleave_constraints(result)
-
-        return result
+        return self._apply_interleave_constraints(result)
 
     def _apply_interleave_constraints(self, queue: list[Atom]) -> list[Atom]:
         """
@@ -308,49 +298,19 @@ class InterleaveScheduler:
         Ensures no more than N consecutive atoms from:
         - Same module
         - Same atom type
-        """
-        if len(queue) <= 1:
-            return queue
-
-        result: list[Atom] = []
-        remaining = queue.copy()
 
-        while remaining:
-            # Find next valid atom
-            found = False
-
-            for i, atom in enumerate(remaining):
-                if self._can_add(result, atom):
-                    result.append(remaining.pop(i))
-                    found = True
-                    break
-
-            if not found:
-                # No valid option - just add the first one
-                result.append(remaining.pop(0))
-
-        return result
-
-    def _can_add(self, queue: list[Atom], atom: Atom) -> bool:
-        """Check if atom can be added without violating constraints."""
-        if len(queue) < 2:
-            return True
-
-        # Check consecutive module constraint
-        recent_modules = [
-            a.module_number for a in queue[-self.config.max_consecutive_same_module :]
-        ]
-        if len(recent_modules) >= self.config.max_consecutive_same_module:
-            if all(m == atom.module_number for m in recent_modules):
-                return False
-
-        # Check consecutive type constraint
-        recent_types = [a.atom_type for a in queue[-self.config.max_consecutive_same_type :]]
-        if len(recent_types) >= self.config.max_consecutive_same_type:
-            if all(t == atom.atom_type for t in recent_types):
-                return False
-
-        return True
+        Each position takes the earliest remaining atom that satisfies the
+        limits (or the earliest atom if none does).
+        """
+        engine = InterleaveEngine(
+            group_by=lambda a: (a.module_number, a.atom_type),
+            constraints=[
+                MaxConsecutive(facet("module_number"), self.config.max_consecutive_same_module),
+                MaxConsecutive(facet("atom_type"), self.config.max_consecutive_same_type),
+            ],
+            policy="order",
+        )
+        return engine.interleave(queue)
 
     def record_review(
         self,
@@ -377,9 +337,10 @@ class InterleaveScheduler:
         # Calculate next review
         new_state = self.sm2.calculate_next_review(current_state, grade)
 
-        # Persist
-        self.store.save_sm2_state(new_state)
-        self.store.log_review(atom.id, grade, response_ms, confidence)
+        # Persist state and log entry in one transaction
+        with self.store.batch():
+            self.store.save_sm2_state(new_state)
+            self.store.log_review(atom.id, grade, response_ms, confidence)
 
         logger.debug(
             f"Recorded review for {atom.id}: grade={grade}, "
@@ -396,11 +357,12 @@ class InterleaveScheduler:
             List of (atom_id, atom_type, status) tuples
         """
         session = self.build_session()
+        atoms = session.interleaved_queue[:limit]
+        states = self.store.get_sm2_states(atom.id for atom in atoms)
         preview = []
 
-        for atom in session.interleaved_queue[:limit]:
-            state = self.store.get_sm2_state(atom.id)
-            status = "due" if state.is_due else "new"
+        for atom in atoms:
+            status = "due" if states[atom.id].is_due else "new"
             preview.append((atom.id, atom.atom_type, status))
 
         return preview
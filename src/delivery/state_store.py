@@ -6,18 +6,29 @@ Provides portable persistence for:
 - Review history log for analytics
 - Session history for fatigue patterns
 
+The database runs in WAL mode with synchronous=NORMAL, so readers never
+block the writer and a commit costs no fsync. Writes inside ``batch()``
+share one transaction; old review_log rows are periodically compacted
+into per-day aggregates (review_daily) so the log stays small as review
+history grows.
+
 Database location: ~/.cortex/state.db
 """
 
 from __future__ import annotations
 
 import sqlite3
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 from loguru import logger
 
+# Stay below SQLite's bound-parameter limit in IN (...) lookups
+_PARAM_CHUNK = 900
+
 # =============================================================================
 # Data Classes
 # =============================================================================
@@ -91,17 +102,25 @@ class StateStore:
 
     DEFAULT_DB_PATH = Path.home() / ".cortex" / "state.db"
 
-    def __init__(self, db_path: Path | None = None):
+    # Raw review rows older than this are folded into review_daily
+    REVIEW_RETENTION_DAYS = 90
+    COMPACTION_INTERVAL_DAYS = 7
+
+    def __init__(self, db_path: Path | None = None, synchronous: str = "NORMAL"):
         """
         Initialize the state store.
 
         Args:
             db_path: Custom database path (defaults to ~/.cortex/state.db)
+            synchronous: SQLite synchronous level (NORMAL is durable in WAL mode
+                except for the last transactions before a power loss)
         """
         self.db_path = db_path or self.DEFAULT_DB_PATH
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.synchronous = synchronous
 
         self._conn: sqlite3.Connection | None = None
+        self._batch_depth = 0
         self._init_schema()
 
         logger.info(f"StateStore initialized at {self.db_path}")
@@ -114,8 +133,43 @@ class StateStore:
                 str(self.db_path), detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
             )
             self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(f"PRAGMA synchronous={self.synchronous}")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn.execute("PRAGMA cache_size=-16000")  # 16 MB
+            self._conn.execute("PRAGMA busy_timeout=5000")
         return self._conn
 
+    @contextmanager
+    def batch(self) -> Iterator[StateStore]:
+        """
+        Group writes into one transaction.
+
+        Commits once when the outermost batch exits (rolls back on error);
+        nested batches join the outer one.
+
+        Example:
+            with store.batch():
+                store.save_sm2_state(state)
+                store.log_review(atom_id, grade, response_ms)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.conn.rollback()
+            raise
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self.conn.commit()
+
+    def _commit(self) -> None:
+        """Commit unless a batch() is open."""
+        if self._batch_depth == 0:
+            self.conn.commit()
+
     def _init_schema(self) -> None:
         """Initialize database schema."""
         cursor = self.conn.cursor()
@@ -157,15 +211,41 @@ class StateStore:
             )
         """)
 
-        # Index for fast due-date queries
+        # Compacted review history (one row per day)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS review_daily (
+                day DATE PRIMARY KEY,
+                reviews INTEGER NOT NULL DEFAULT 0,
+                passed INTEGER NOT NULL DEFAULT 0,
+                grade_sum INTEGER NOT NULL DEFAULT 0,
+                response_ms_sum INTEGER NOT NULL DEFAULT 0,
+                atoms INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS store_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+
+        # Covering index for due queries: filter, sort and atom_id from the index
+        cursor.execute("DROP INDEX IF EXISTS idx_sm2_next_review")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_sm2_due
+            ON sm2_state(next_review, interval_days, atom_id)
+        """)
+
+        cursor.execute("DROP INDEX IF EXISTS idx_review_log_atom")
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_sm2_next_review
-            ON sm2_state(next_review)
+            CREATE INDEX IF NOT EXISTS idx_review_log_atom_time
+            ON review_log(atom_id, reviewed_at)
         """)
 
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_review_log_atom
-            ON review_log(atom_id)
+            CREATE INDEX IF NOT EXISTS idx_review_log_time
+            ON review_log(reviewed_at)
         """)
 
         self.conn.commit()
@@ -191,6 +271,33 @@ class StateStore:
         if row is None:
             return SM2State(atom_id=atom_id)
 
+        return self._row_to_state(row)
+
+    def get_sm2_states(self, atom_ids: Iterable[str]) -> dict[str, SM2State]:
+        """
+        Get SM-2 states for many atoms in a few queries.
+
+        Args:
+            atom_ids: Atom identifiers
+
+        Returns:
+            Dict of atom_id -> SM2State (default values for unknown atoms)
+        """
+        ids = list(dict.fromkeys(atom_ids))
+        states = {atom_id: SM2State(atom_id=atom_id) for atom_id in ids}
+        cursor = self.conn.cursor()
+        for start in range(0, len(ids), _PARAM_CHUNK):
+            chunk = ids[start : start + _PARAM_CHUNK]
+            cursor.execute(
+                f"SELECT * FROM sm2_state WHERE atom_id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            for row in cursor.fetchall():
+                states[row["atom_id"]] = self._row_to_state(row)
+        return states
+
+    @staticmethod
+    def _row_to_state(row: sqlite3.Row) -> SM2State:
         return SM2State(
             atom_id=row["atom_id"],
             easiness_factor=row["easiness_factor"],
@@ -207,8 +314,30 @@ class StateStore:
         Args:
             state: SM2State to persist
         """
-        cursor = self.conn.cursor()
-        cursor.execute(
+        self.save_sm2_states([state])
+
+    def save_sm2_states(self, states: Iterable[SM2State]) -> int:
+        """
+        Save or update SM-2 states in one statement.
+
+        Args:
+            states: SM2States to persist
+
+        Returns:
+            Number of states written
+        """
+        rows = [
+            (
+                state.atom_id,
+                state.easiness_factor,
+                state.interval_days,
+                state.repetitions,
+                state.next_review,
+                state.last_reviewed,
+            )
+            for state in states
+        ]
+        self.conn.executemany(
             """
             INSERT INTO sm2_state (
                 atom_id, easiness_factor, interval_days,
@@ -221,16 +350,10 @@ class StateStore:
                 next_review = excluded.next_review,
                 last_reviewed = excluded.last_reviewed
         """,
-            (
-                state.atom_id,
-                state.easiness_factor,
-                state.interval_days,
-                state.repetitions,
-                state.next_review,
-                state.last_reviewed,
-            ),
+            rows,
         )
-        self.conn.commit()
+        self._commit()
+        return len(rows)
 
     def get_due_atom_ids(self, limit: int = 100) -> list[str]:
         """
@@ -306,9 +429,40 @@ class StateStore:
         """,
             (atom_id, grade, response_ms, confidence),
         )
-        self.conn.commit()
+        self._commit()
         return cursor.lastrowid
 
+    def log_reviews(self, rows: Iterable[Mapping]) -> int:
+        """
+        Log many review events in one statement.
+
+        Args:
+            rows: Mappings with atom_id, grade, response_ms and optional
+                confidence / reviewed_at (defaults to now)
+
+        Returns:
+            Number of reviews logged
+        """
+        params = [
+            (
+                row["atom_id"],
+                row["grade"],
+                row.get("response_ms"),
+                row.get("confidence"),
+                row.get("reviewed_at"),
+            )
+            for row in rows
+        ]
+        self.conn.executemany(
+            """
+            INSERT INTO review_log (atom_id, grade, response_ms, confidence, reviewed_at)
+            VALUES (?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+        """,
+            params,
+        )
+        self._commit()
+        return len(params)
+
     def get_review_history(
         self,
         atom_id: str,
@@ -390,7 +544,7 @@ class StateStore:
         """,
             (datetime.now(),),
         )
-        self.conn.commit()
+        self._commit()
         return cursor.lastrowid
 
     def end_session(
@@ -421,7 +575,8 @@ class StateStore:
         """,
             (datetime.now(), atoms_reviewed, accuracy, fatigue_detected, session_id),
         )
-        self.conn.commit()
+        self._commit()
+        self.compact_if_due()
 
     def get_session_history(self, limit: int = 30) -> list[SessionRecord]:
         """Get recent session history."""
@@ -469,8 +624,11 @@ class StateStore:
         cursor.execute("SELECT COUNT(*) as cnt FROM sm2_state WHERE next_review <= ?", (today,))
         due_atoms = cursor.fetchone()["cnt"]
 
-        # Total reviews
-        cursor.execute("SELECT COUNT(*) as cnt FROM review_log")
+        # Total reviews (raw log plus compacted days)
+        cursor.execute("""
+            SELECT (SELECT COUNT(*) FROM review_log)
+                 + (SELECT COALESCE(SUM(reviews), 0) FROM review_daily) as cnt
+        """)
         total_reviews = cursor.fetchone()["cnt"]
 
         # Average grade (last 100 reviews)
@@ -505,12 +663,123 @@ class StateStore:
             "sessions_completed": sessions,
         }
 
+    # =========================================================================
+    # Review Log Compaction
+    # =========================================================================
+
+    def compact_reviews(self, keep_days: int | None = None) -> int:
+        """
+        Fold review_log rows older than ``keep_days`` into review_daily.
+
+        Per-atom history is kept for the retention window; older reviews
+        survive only as daily totals (used by get_stats and get_daily_reviews).
+
+        Args:
+            keep_days: Raw history to keep (default REVIEW_RETENTION_DAYS)
+
+        Returns:
+            Number of review_log rows compacted
+        """
+        keep_days = self.REVIEW_RETENTION_DAYS if keep_days is None else keep_days
+        cutoff = (date.today() - timedelta(days=keep_days)).isoformat()
+
+        with self.batch():
+            self.conn.execute(
+                """
+                INSERT INTO review_daily (day, reviews, passed, grade_sum, response_ms_sum, atoms)
+                SELECT
+                    DATE(reviewed_at),
+                    COUNT(*),
+                    SUM(CASE WHEN grade >= 3 THEN 1 ELSE 0 END),
+                    SUM(grade),
+                    COALESCE(SUM(response_ms), 0),
+                    COUNT(DISTINCT atom_id)
+                FROM review_log
+                WHERE reviewed_at < ?
+                GROUP BY DATE(reviewed_at)
+                ON CONFLICT(day) DO UPDATE SET
+                    reviews = review_daily.reviews + excluded.reviews,
+                    passed = review_daily.passed + excluded.passed,
+                    grade_sum = review_daily.grade_sum + excluded.grade_sum,
+                    response_ms_sum = review_daily.response_ms_sum + excluded.response_ms_sum,
+                    atoms = MAX(review_daily.atoms, excluded.atoms)
+            """,
+                (cutoff,),
+            )
+            compacted = self.conn.execute(
+                "DELETE FROM review_log WHERE reviewed_at < ?", (cutoff,)
+            ).rowcount
+            self.conn.execute(
+                """
+                INSERT INTO store_meta (key, value) VALUES ('last_compaction', ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value
+            """,
+                (date.today().isoformat(),),
+            )
+
+        if compacted:
+            logger.info(f"Compacted {compacted} review_log rows older than {cutoff}")
+        return compacted
+
+    def compact_if_due(self) -> int:
+        """Run compact_reviews if the last run is older than COMPACTION_INTERVAL_DAYS."""
+        row = self.conn.execute(
+            "SELECT value FROM store_meta WHERE key = 'last_compaction'"
+        ).fetchone()
+        if row is not None:
+            last = date.fromisoformat(row["value"])
+            if (date.today() - last).days < self.COMPACTION_INTERVAL_DAYS:
+                return 0
+        return self.compact_reviews()
+
+    def get_daily_reviews(self, days: int = 30) -> list[dict]:
+        """
+        Daily review totals (compacted and raw) for the last ``days`` days.
+
+        Returns:
+            Dicts with day, reviews, passed, avg_grade, avg_response_ms
+        """
+        since = (date.today() - timedelta(days=days)).isoformat()
+        cursor = self.conn.execute(
+            """
+            SELECT day, SUM(reviews) as reviews, SUM(passed) as passed,
+                   SUM(grade_sum) as grade_sum, SUM(response_ms_sum) as response_ms_sum
+            FROM (
+                SELECT day, reviews, passed, grade_sum, response_ms_sum
+                FROM review_daily WHERE day >= ?
+                UNION ALL
+                SELECT DATE(reviewed_at), COUNT(*),
+                       SUM(CASE WHEN grade >= 3 THEN 1 ELSE 0 END),
+                       SUM(grade), COALESCE(SUM(response_ms), 0)
+                FROM review_log WHERE reviewed_at >= ?
+                GROUP BY DATE(reviewed_at)
+            )
+            GROUP BY day
+            ORDER BY day
+        """,
+            (since, since),
+        )
+        return [
+            {
+                "day": date.fromisoformat(str(row["day"])),
+                "reviews": row["reviews"],
+                "passed": row["passed"],
+                "avg_grade": row["grade_sum"] / row["reviews"],
+                "avg_response_ms": row["response_ms_sum"] / row["reviews"],
+            }
+            for row in cursor.fetchall()
+        ]
+
     def reset(self, module_filter: int | None = None, force: bool = False) -> int:
         """
         Reset review state (for testing or fresh start).
 
         DANGER: This deletes your learning progress! A backup is created first.
 
+        A full reset also clears the compacted history (review_daily) and
+        compaction state. review_daily holds per-day totals across all
+        modules, so a module reset keeps those compacted counts.
+
         Args:
             module_filter: If provided, only reset atoms from this module
             force: If True, skip confirmation prompt (use with caution!)
@@ -559,6 +828,10 @@ class StateStore:
         review_data = [dict(row) for row in cursor.fetchall()]
         cursor.execute("SELECT * FROM session_history")
         session_data = [dict(row) for row in cursor.fetchall()]
+        cursor.execute("SELECT * FROM review_daily")
+        daily_data = [dict(row) for row in cursor.fetchall()]
+        cursor.execute("SELECT * FROM store_meta")
+        meta_data = [dict(row) for row in cursor.fetchall()]
 
         backup = {
             "timestamp": timestamp,
@@ -566,6 +839,8 @@ class StateStore:
             "sm2_state": sm2_data,
             "review_log": review_data,
             "session_history": session_data,
+            "review_daily": daily_data,
+            "store_meta": meta_data,
         }
 
         with open(backup_file, "w") as f:
@@ -579,8 +854,10 @@ class StateStore:
             cursor.execute("DELETE FROM sm2_state WHERE atom_id LIKE ?", (pattern,))
         else:
             cursor.execute("DELETE FROM review_log")
-            cursor.execute("DELETE FROM sm2_state")
+            cursor.execute("DELETE FROM review_daily")
+            cursor.execute("DELETE FROM store_meta")
             cursor.execute("DELETE FROM session_history")
+            cursor.execute("DELETE FROM sm2_state")
 
         self.conn.commit()
         print(f"✓ Reset complete: {cursor.rowcount} records deleted")
@@ -656,6 +933,29 @@ class StateStore:
                 ),
             )
 
+        # Restore compacted history and compaction state
+        for record in backup.get("review_daily", []):
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO review_daily
+                (day, reviews, passed, grade_sum, response_ms_sum, atoms)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    record["day"],
+                    record["reviews"],
+                    record["passed"],
+                    record["grade_sum"],
+                    record["response_ms_sum"],
+                    record["atoms"],
+                ),
+            )
+        for record in backup.get("store_meta", []):
+            cursor.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)",
+                (record["key"], record["value"]),
+            )
+
         # Restore session history
         for record in backup.get("session_history", []):
             cursor.execute(
@@ -0,0 +1,329 @@
+"""
+Telemetry Query Engine.
+
+Scans the JSONL session files written by JSONTelemetryLogger (plain and
+gzip-rotated) across a date range and aggregates them without loading
+everything into memory:
+
+- Files are streamed line by line (gzip is decompressed on the fly) and
+  lines of other event types are skipped before JSON parsing
+- Interactions are collected into fixed-size numpy chunks and folded into
+  running aggregates with bincount, so memory stays O(chunk_size)
+- Response-time percentiles come from a log-spaced histogram (~2% bin
+  width), which merges across chunks exactly
+
+Fatigue onset is the first queue position (in ``position_bucket`` steps)
+where accuracy falls ``accuracy_drop`` below the session-start baseline or
+mean response time rises ``rt_rise`` above it, pooled across sessions.
+
+Usage:
+    report = TelemetryQuery().summarize(start=date(2025, 9, 1))
+    print(report.accuracy_percent, report.rt_percentiles[95])
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+# Log-spaced response-time bins, 50 ms .. 10 min
+RT_BIN_EDGES = np.geomspace(50, 600_000, 512)
+
+
+@dataclass
+class TelemetryReport:
+    """Aggregates over a telemetry date range."""
+
+    interactions: int = 0
+    sessions: int = 0
+    files_scanned: int = 0
+    accuracy_percent: float = 0.0
+    rt_percentiles: dict[int, float] = field(default_factory=dict)
+    daily: dict[str, dict[str, float]] = field(default_factory=dict)
+    accuracy_by_position: list[tuple[int, int, float]] = field(default_factory=list)
+    fatigue_onset_position: int | None = None
+    diagnosed_fatigue_sessions: int = 0
+    diagnosed_fatigue_median_position: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "interactions": self.interactions,
+            "sessions": self.sessions,
+            "files_scanned": self.files_scanned,
+            "accuracy_percent": self.accuracy_percent,
+            "rt_percentiles": self.rt_percentiles,
+            "daily": self.daily,
+            "accuracy_by_position": self.accuracy_by_position,
+            "fatigue_onset_position": self.fatigue_onset_position,
+            "diagnosed_fatigue_sessions": self.diagnosed_fatigue_sessions,
+            "diagnosed_fatigue_median_position": self.diagnosed_fatigue_median_position,
+        }
+
+
+class _Aggregates:
+    """Running sums the chunks are folded into."""
+
+    def __init__(self, n_positions: int):
+        self.n_positions = n_positions
+        self.rt_hist = np.zeros(len(RT_BIN_EDGES) + 1, dtype=np.int64)
+        self.pos_count = np.zeros(n_positions, dtype=np.int64)
+        self.pos_correct = np.zeros(n_positions, dtype=np.int64)
+        self.pos_rt_sum = np.zeros(n_positions, dtype=np.float64)
+        self.day_count: dict[int, int] = {}
+        self.day_correct: dict[int, int] = {}
+
+    def add(self, correct: np.ndarray, rt: np.ndarray, bucket: np.ndarray, day: np.ndarray) -> None:
+        self.rt_hist += np.bincount(
+            np.searchsorted(RT_BIN_EDGES, rt), minlength=len(self.rt_hist)
+        )
+        n = self.n_positions
+        self.pos_count += np.bincount(bucket, minlength=n)
+        self.pos_correct += np.bincount(bucket, weights=correct, minlength=n).astype(np.int64)
+        self.pos_rt_sum += np.bincount(bucket, weights=rt, minlength=n)
+
+        days, inverse = np.unique(day, return_inverse=True)
+        counts = np.bincount(inverse)
+        hits = np.bincount(inverse, weights=correct)
+        for d, c, h in zip(days.tolist(), counts.tolist(), hits.tolist()):
+            self.day_count[d] = self.day_count.get(d, 0) + c
+            self.day_correct[d] = self.day_correct.get(d, 0) + int(h)
+
+
+class TelemetryQuery:
+    """
+    Streaming aggregation over telemetry session files.
+
+    Example:
+        query = TelemetryQuery(log_dir=Path("~/.cortex/telemetry").expanduser())
+        report = query.summarize(start=date(2025, 9, 1), end=date(2025, 11, 30))
+    """
+
+    def __init__(
+        self,
+        log_dir: Path | None = None,
+        chunk_size: int = 50_000,
+        position_bucket: int = 5,
+        max_position: int = 200,
+    ):
+        """
+        Initialize query engine.
+
+        Args:
+            log_dir: Telemetry directory (default: ~/.cortex/telemetry)
+            chunk_size: Interactions held in memory before folding
+            position_bucket: Queue positions per fatigue-curve bucket
+            max_position: Positions beyond this share the last bucket
+        """
+        self.log_dir = log_dir or (Path.home() / ".cortex" / "telemetry")
+        self.sessions_dir = self.log_dir / "sessions"
+        self.chunk_size = chunk_size
+        self.position_bucket = position_bucket
+        self.n_positions = max_position // position_bucket + 1
+
+    # =========================================================================
+    # Streaming
+    # =========================================================================
+
+    def iter_files(self, start: date | None = None, end: date | None = None) -> list[Path]:
+        """Session files (plain and gzipped) whose date prefix falls in [start, end]."""
+        files = []
+        for path in self.sessions_dir.glob("*.jsonl*"):
+            try:
+                day = date.fromisoformat(path.name[:10])
+            except ValueError:
+                continue
+            if (start and day < start) or (end and day > end):
+                continue
+            files.append(path)
+        return sorted(files)
+
+    def iter_events(
+        self,
+        event_types: set[str] | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> Iterator[tuple[Path, dict[str, Any]]]:
+        """
+        Stream (file, event) pairs in file order.
+
+        Args:
+            event_types: Only these event types (None = all)
+            start: First day to include
+            end: Last day to include
+        """
+        markers = tuple(f'"type": "{t}"' for t in event_types) if event_types else None
+        for path in self.iter_files(start, end):
+            opener = gzip.open if path.suffix == ".gz" else open
+            try:
+                with opener(path, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        # Cheap substring test before paying for json.loads
+                        if markers and not any(m in line for m in markers):
+                            continue
+                        try:
+                            event = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue  # Truncated last line of an interrupted flush
+                        if event_types and event.get("type") not in event_types:
+                            continue
+                        yield path, event
+            except (OSError, EOFError) as e:
+                logger.warning(f"Skipping unreadable telemetry file {path.name}: {e}")
+
+    # =========================================================================
+    # Aggregation
+    # =========================================================================
+
+    def summarize(
+        self,
+        start: date | None = None,
+        end: date | None = None,
+        percentiles: tuple[int, ...] = (50, 75, 90, 95, 99),
+        baseline_buckets: int = 2,
+        accuracy_drop: float = 0.15,
+        rt_rise: float = 0.30,
+        min_samples: int = 20,
+    ) -> TelemetryReport:
+        """
+        Aggregate accuracy, response-time percentiles and fatigue onset.
+
+        Args:
+            start: First day to include
+            end: Last day to include
+            percentiles: Response-time percentiles to report
+            baseline_buckets: Leading position buckets used as the baseline
+            accuracy_drop: Absolute accuracy drop (0-1) that marks fatigue
+            rt_rise: Relative mean-RT rise that marks fatigue
+            min_samples: Minimum interactions in a bucket to judge it
+
+        Returns:
+            TelemetryReport
+        """
+        report = TelemetryReport()
+        agg = _Aggregates(self.n_positions)
+        n = self.chunk_size
+        correct = np.empty(n, dtype=np.float64)
+        rt = np.empty(n, dtype=np.float64)
+        position = np.empty(n, dtype=np.int64)
+        day = np.empty(n, dtype=np.int64)
+        filled = 0
+
+        positions: dict[str, int] = {}  # Interactions seen per session
+        fatigue_positions: dict[str, int] = {}  # First fatigue diagnosis per session
+        files: set[Path] = set()
+        file_days: dict[Path, int] = {}
+
+        events = self.iter_events({"interaction", "diagnosis"}, start, end)
+        for path, event in events:
+            files.add(path)
+            session = event.get("session") or path.name
+            if event["type"] == "diagnosis":
+                if (
+                    event.get("cognitive_state") == "fatigue" or event.get("fail_mode") == "fatigue"
+                ) and session not in fatigue_positions:
+                    fatigue_positions[session] = positions.get(session, 0)
+                continue
+
+            if path not in file_days:
+                file_days[path] = date.fromisoformat(path.name[:10]).toordinal()
+            index = positions.get(session, 0)
+            positions[session] = index + 1
+
+            correct[filled] = 1.0 if event.get("is_correct") else 0.0
+            rt[filled] = event.get("response_time_ms") or 0
+            position[filled] = index
+            day[filled] = file_days[path]
+            filled += 1
+            if filled == n:
+                self._fold(agg, correct, rt, position, day, filled)
+                filled = 0
+        if filled:
+            self._fold(agg, correct, rt, position, day, filled)
+
+        report.files_scanned = len(files)
+        report.sessions = len(positions)
+        report.interactions = int(agg.pos_count.sum())
+        if report.interactions:
+            report.accuracy_percent = round(agg.pos_correct.sum() / report.interactions * 100, 2)
+            report.rt_percentiles = self._percentiles(agg.rt_hist, percentiles)
+        report.daily = {
+            date.fromordinal(d).isoformat(): {
+                "interactions": count,
+                "accuracy_percent": round(agg.day_correct[d] / count * 100, 2),
+            }
+            for d, count in sorted(agg.day_count.items())
+        }
+        report.accuracy_by_position = [
+            (i * self.position_bucket, int(c), round(float(h) / c * 100, 2))
+            for i, (c, h) in enumerate(zip(agg.pos_count, agg.pos_correct))
+            if c
+        ]
+        report.fatigue_onset_position = self._fatigue_onset(
+            agg, self.position_bucket, baseline_buckets, accuracy_drop, rt_rise, min_samples
+        )
+        report.diagnosed_fatigue_sessions = len(fatigue_positions)
+        if fatigue_positions:
+            report.diagnosed_fatigue_median_position = float(
+                np.median(np.fromiter(fatigue_positions.values(), dtype=np.int64))
+            )
+        return report
+
+    def _fold(
+        self,
+        agg: _Aggregates,
+        correct: np.ndarray,
+        rt: np.ndarray,
+        position: np.ndarray,
+        day: np.ndarray,
+        filled: int,
+    ) -> None:
+        bucket = np.minimum(position[:filled] // self.position_bucket, self.n_positions - 1)
+        agg.add(correct[:filled], rt[:filled], bucket, day[:filled])
+
+    @staticmethod
+    def _percentiles(hist: np.ndarray, percentiles: tuple[int, ...]) -> dict[int, float]:
+        """Percentiles from the RT histogram (upper bin edge, clamped to the edge range)."""
+        cumulative = np.cumsum(hist)
+        total = cumulative[-1]
+        edges = np.concatenate((RT_BIN_EDGES, RT_BIN_EDGES[-1:]))
+        result = {}
+        for p in percentiles:
+            index = int(np.searchsorted(cumulative, total * p / 100.0))
+            result[p] = round(float(edges[min(index, len(edges) - 1)]), 1)
+        return result
+
+    @staticmethod
+    def _fatigue_onset(
+        agg: _Aggregates,
+        position_bucket: int,
+        baseline_buckets: int,
+        accuracy_drop: float,
+        rt_rise: float,
+        min_samples: int,
+    ) -> int | None:
+        counts = agg.pos_count
+        base_n = counts[:baseline_buckets].sum()
+        if base_n < min_samples:
+            return None
+        base_acc = agg.pos_correct[:baseline_buckets].sum() / base_n
+        base_rt = agg.pos_rt_sum[:baseline_buckets].sum() / base_n
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            acc = agg.pos_correct / counts
+            mean_rt = agg.pos_rt_sum / counts
+        fatigued = (counts >= min_samples) & (
+            (acc < base_acc - accuracy_drop) | (mean_rt > base_rt * (1 + rt_rise))
+        )
+        fatigued[:baseline_buckets] = False
+        hits = np.flatnonzero(fatigued)
+        if not hits.size:
+            return None
+        return int(hits[0]) * position_bucket
@@ -30,7 +30,7 @@ Example:
     result = await pipeline.run()
 """
 
-from .pipeline import Pipeline, PipelineResult, PipelineBuilder
+from .pipeline import Pipeline, PipelineResult, PipelineBuilder, StageMetrics
 from .models import (
     RawChunk,
     TransformedAtom,
@@ -48,6 +48,7 @@ __all__ = [
     "Pipeline",
     "PipelineResult",
     "PipelineBuilder",
+    "StageMetrics",
     # Models
     "RawChunk",
     "TransformedAtom",
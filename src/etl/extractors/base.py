@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import logging
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, ClassVar
@@ -145,6 +146,9 @@ class BaseExtractor(ABC):
     Subclasses must implement:
     - extract(): Main extraction logic
     - _parse_content(): Source-specific parsing
+
+    Subclasses that can produce chunks incrementally should also override
+    iter_chunks() so streaming pipelines run in bounded memory.
     """
 
     source_type: ClassVar[str] = "unknown"
@@ -176,6 +180,15 @@ class BaseExtractor(ABC):
         """
         ...
 
+    async def iter_chunks(self) -> AsyncIterator[RawChunk]:
+        """
+        Yield raw chunks as they are extracted.
+
+        The default wraps extract(), so it holds every chunk at once.
+        """
+        for chunk in await self.extract():
+            yield chunk
+
     @abstractmethod
     def _parse_content(self, raw_content: str) -> list[dict[str, Any]]:
         """
@@ -340,6 +353,18 @@ class CompositeExtractor(BaseExtractor):
         self._chunks = all_chunks
         return all_chunks
 
+    async def iter_chunks(self) -> AsyncIterator[RawChunk]:
+        """Stream each source in turn."""
+        for extractor in self.extractors:
+            count = 0
+            try:
+                async for chunk in extractor.iter_chunks():
+                    count += 1
+                    yield chunk
+                logger.info(f"Extracted {count} chunks from {extractor.source_type}")
+            except Exception as e:
+                logger.error(f"Extractor {extractor.source_type} failed: {e}")
+
     def _parse_content(self, raw_content: str) -> list[dict[str, Any]]:
         """Not used in composite extractor."""
         raise NotImplementedError("Composite extractor delegates to child extractors")
@@ -0,0 +1,103 @@
+"""
+Extracted page text cache.
+
+Text extraction is the expensive part of reading a textbook PDF, and the
+same unchanged file is often re-run while tuning chunking. Pages are
+stored in SQLite keyed by the file's SHA-256 and page number, so a re-run
+on an unchanged file never opens the PDF.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_CACHE_PATH = Path("data/pdf_pages/pages.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    file_hash TEXT PRIMARY KEY,
+    page_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    file_hash TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (file_hash, page)
+) WITHOUT ROWID;
+"""
+
+
+def file_sha256(path: str | Path, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PageTextCache:
+    """SQLite store of page text keyed by (file hash, page number)."""
+
+    def __init__(self, path: str | Path = DEFAULT_PAGE_CACHE_PATH):
+        """
+        Open (and create) the cache.
+
+        Args:
+            path: SQLite file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def page_count(self, file_hash: str) -> int | None:
+        """Page count recorded for a fully cached document, else None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT page_count FROM documents WHERE file_hash = ?", (file_hash,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_range(self, file_hash: str, start: int, stop: int) -> list[str] | None:
+        """
+        Cached text of pages [start, stop).
+
+        Returns:
+            Page texts in order, or None unless every page is cached
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT text FROM pages WHERE file_hash = ? AND page >= ? AND page < ? "
+                "ORDER BY page",
+                (file_hash, start, stop),
+            ).fetchall()
+        return [row[0] for row in rows] if len(rows) == stop - start else None
+
+    def put_range(self, file_hash: str, start: int, texts: list[str]) -> None:
+        """Store the text of pages starting at ``start``."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages (file_hash, page, text) VALUES (?, ?, ?)",
+                [(file_hash, start + i, text) for i, text in enumerate(texts)],
+            )
+
+    def mark_complete(self, file_hash: str, page_count: int) -> None:
+        """Record that every page of a document is cached."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents (file_hash, page_count) VALUES (?, ?)",
+                (file_hash, page_count),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -2,12 +2,23 @@
 PDF Content Extractor.
 
 Extracts structured content from PDF textbooks using PyMuPDF.
+
+Page text is extracted in page ranges on a process pool (or a worker
+thread for small files) so the event loop never blocks, and cached by
+file hash and page number (see page_cache) so re-running an unchanged
+textbook skips extraction entirely. Pages are then consumed in order and
+chunks are yielded as each section closes.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
 import re
+from collections import deque
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, ClassVar
@@ -15,9 +26,13 @@ from uuid import uuid4
 
 from ..models import RawChunk
 from .base import BaseExtractor, ExtractionConfig, ExtractorRegistry
+from .page_cache import DEFAULT_PAGE_CACHE_PATH, PageTextCache, file_sha256
 
 logger = logging.getLogger(__name__)
 
+CHAPTER_PATTERN = re.compile(r"^(?:Chapter|CHAPTER)\s+(\d+)[:\s]+(.+)$", re.MULTILINE)
+SECTION_PATTERN = re.compile(r"^(?:\d+\.\d+)\s+(.+)$", re.MULTILINE)
+
 
 @dataclass
 class PDFExtractionConfig(ExtractionConfig):
@@ -29,6 +44,45 @@ class PDFExtractionConfig(ExtractionConfig):
     min_section_words: int = 50
     max_section_words: int = 1000
 
+    # Page text extraction
+    workers: int = 0  # Processes (0 = all cores, 1 = a single worker thread)
+    pages_per_task: int = 32
+    page_cache_path: Path | None = DEFAULT_PAGE_CACHE_PATH  # None disables the cache
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> list[str]:
+    """Text of pages [start, stop); runs in a worker."""
+    import fitz
+
+    with fitz.open(path) as doc:
+        return [doc[i].get_text() for i in range(start, stop)]
+
+
+def _page_count(path: str) -> int:
+    import fitz
+
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+class _OpenSection:
+    """Page texts of the section being accumulated, with a running word count."""
+
+    def __init__(self) -> None:
+        self.parts: list[str] = []
+        self.words = 0
+
+    def add(self, text: str) -> None:
+        self.parts.append(text)
+        self.words += len(text.split())
+
+    def text(self) -> str:
+        return "\n".join(self.parts).strip()
+
+    def clear(self) -> None:
+        self.parts = []
+        self.words = 0
+
 
 @ExtractorRegistry.register("pdf", extensions=[".pdf"])
 class PDFExtractor(BaseExtractor):
@@ -55,84 +109,149 @@ class PDFExtractor(BaseExtractor):
 
     async def extract(self) -> list[RawChunk]:
         """Extract chunks from PDF."""
+        chunks = [chunk async for chunk in self.iter_chunks()]
+        logger.info(f"Extracted {len(chunks)} chunks from {self.source.name}")
+        return chunks
+
+    async def iter_chunks(self) -> AsyncIterator[RawChunk]:
+        """Yield chunks in page order as sections close."""
         try:
-            import fitz
+            import fitz  # noqa: F401
         except ImportError:
             logger.warning("PyMuPDF not installed, using fallback text extraction")
-            return await self._extract_fallback()
-
-        chunks: list[RawChunk] = []
+            for chunk in await self._extract_fallback():
+                yield chunk
+            return
 
+        path = str(self.source)
+        cache = PageTextCache(self.config.page_cache_path) if self.config.page_cache_path else None
         try:
-            doc = fitz.open(str(self.source))
-
-            current_chapter = "Introduction"
-            current_section = ""
-            accumulated_text = ""
-            page_start = 0
-
-            for page_num, page in enumerate(doc):
-                text = page.get_text()
-
-                chapter_match = re.search(
-                    r"^(?:Chapter|CHAPTER)\s+(\d+)[:\s]+(.+)$",
-                    text,
-                    re.MULTILINE,
-                )
+            file_hash = await asyncio.to_thread(file_sha256, path) if cache else ""
+            page_count = cache.page_count(file_hash) if cache else None
+            if page_count is None:
+                page_count = await asyncio.to_thread(_page_count, path)
+        except Exception as e:
+            logger.error(f"PDF extraction failed: {e}")
+            if cache:
+                cache.close()
+            for chunk in await self._extract_fallback():
+                yield chunk
+            return
+
+        current_chapter = "Introduction"
+        current_section = ""
+        section = _OpenSection()
+        try:
+            async for text in self._iter_page_texts(path, page_count, file_hash, cache):
+                chapter_match = CHAPTER_PATTERN.search(text)
                 if chapter_match:
-                    if accumulated_text.strip():
-                        chunk = self._create_chunk(
-                            chunk_id=str(uuid4()),
-                            title=f"{current_chapter} - {current_section}".strip(" -"),
-                            content=accumulated_text.strip(),
-                            module_number=self._extract_module_number(current_chapter),
-                        )
-                        if self._filter_chunk(chunk):
-                            chunks.append(chunk)
+                    chunk = self._close_section(current_chapter, current_section, section)
+                    if chunk:
+                        yield chunk
 
                     current_chapter = f"Chapter {chapter_match.group(1)}: {chapter_match.group(2)}"
-                    accumulated_text = ""
-                    page_start = page_num
-
-                section_match = re.search(
-                    r"^(?:\d+\.\d+)\s+(.+)$",
-                    text,
-                    re.MULTILINE,
-                )
+                    section.clear()
+
+                section_match = SECTION_PATTERN.search(text)
                 if section_match:
                     current_section = section_match.group(1)
 
-                accumulated_text += f"\n{text}"
-
-                if len(accumulated_text.split()) > self.config.max_section_words:
-                    chunk = self._create_chunk(
-                        chunk_id=str(uuid4()),
-                        title=f"{current_chapter} - {current_section}".strip(" -"),
-                        content=accumulated_text.strip()[:5000],
-                        module_number=self._extract_module_number(current_chapter),
-                    )
-                    if self._filter_chunk(chunk):
-                        chunks.append(chunk)
-                    accumulated_text = ""
-
-            if accumulated_text.strip():
-                chunk = self._create_chunk(
-                    chunk_id=str(uuid4()),
-                    title=f"{current_chapter} - {current_section}".strip(" -"),
-                    content=accumulated_text.strip()[:5000],
-                    module_number=self._extract_module_number(current_chapter),
-                )
-                if self._filter_chunk(chunk):
-                    chunks.append(chunk)
-
-            doc.close()
+                section.add(text)
+
+                if section.words > self.config.max_section_words:
+                    chunk = self._close_section(current_chapter, current_section, section, 5000)
+                    if chunk:
+                        yield chunk
+                    section.clear()
+
+            chunk = self._close_section(current_chapter, current_section, section, 5000)
+            if chunk:
+                yield chunk
 
         except Exception as e:
+            # Chunks already yielded stay yielded; stop at the failing page range
             logger.error(f"PDF extraction failed: {e}")
-            return await self._extract_fallback()
+        finally:
+            if cache:
+                cache.close()
 
-        logger.info(f"Extracted {len(chunks)} chunks from {self.source.name}")
-        return chunks
+    def _close_section(
+        self,
+        chapter: str,
+        section_title: str,
+        section: _OpenSection,
+        limit: int | None = None,
+    ) -> RawChunk | None:
+        """Chunk for the accumulated pages, if non-empty and within filters."""
+        content = section.text()
+        if not content:
+            return None
+        chunk = self._create_chunk(
+            chunk_id=str(uuid4()),
+            title=f"{chapter} - {section_title}".strip(" -"),
+            content=content[:limit] if limit else content,
+            module_number=self._extract_module_number(chapter),
+        )
+        return chunk if self._filter_chunk(chunk) else None
+
+    async def _iter_page_texts(
+        self,
+        path: str,
+        page_count: int,
+        file_hash: str,
+        cache: PageTextCache | None,
+    ) -> AsyncIterator[str]:
+        """
+        Page texts in order, extracted in parallel ranges.
+
+        At most two ranges per worker are in flight, so memory stays
+        bounded by the lookahead rather than the document.
+        """
+        loop = asyncio.get_running_loop()
+        per_task = max(1, self.config.pages_per_task)
+        ranges = [
+            (start, min(start + per_task, page_count)) for start in range(0, page_count, per_task)
+        ]
+        workers = self.config.workers or os.cpu_count() or 1
+
+        pool = None
+        if workers > 1 and len(ranges) > 1:
+            pool = ProcessPoolExecutor(max_workers=min(workers, len(ranges)))
+        pending: deque[tuple[int, asyncio.Future | None, list[str] | None]] = deque()
+        upcoming = iter(ranges)
+
+        def submit() -> None:
+            page_range = next(upcoming, None)
+            if page_range is None:
+                return
+            start, stop = page_range
+            cached = cache.get_range(file_hash, start, stop) if cache else None
+            future = None
+            if cached is None:
+                # pool=None runs the range on the loop's default thread executor
+                future = loop.run_in_executor(pool, _extract_page_range, path, start, stop)
+            pending.append((start, future, cached))
+
+        try:
+            for _ in range(2 * workers):
+                submit()
+            while pending:
+                start, future, texts = pending.popleft()
+                if texts is None:
+                    texts = await future
+                    if cache:
+                        cache.put_range(file_hash, start, texts)
+                submit()
+                for text in texts:
+                    yield text
+            if cache:
+                cache.mark_complete(file_hash, page_count)
+        finally:
+            for _, future, _ in pending:
+                if future is not None:
+                    future.cancel()
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
 
     async def _extract_fallback(self) -> list[RawChunk]:
         """Fallback extraction when PyMuPDF is not available."""
@@ -5,5 +5,6 @@ Loaders for persisting transformed atoms to various storage backends.
 """
 
 from .base import BaseLoader
+from .table_loader import AtomTableLoader
 
-__all__ = ["BaseLoader"]
+__all__ = ["AtomTableLoader", "BaseLoader"]
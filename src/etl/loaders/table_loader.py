@@ -0,0 +1,165 @@
+"""
+Learning Atoms Table Loader.
+
+Persists transformed atoms into ``learning_atoms`` using the shared
+COPY-based bulk loader: each batch is staged once and merged with a
+single ``INSERT ... ON CONFLICT (card_id)`` instead of per-row statements.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.db.bulk import BulkLoader, BulkLoadResult
+
+from ..models import TransformedAtom
+from ..pipeline import LoadResult
+from .base import BaseLoader, LoaderConfig, UpsertStrategy
+
+logger = logging.getLogger(__name__)
+
+
+# Columns written from TransformedAtom (all present after migration 032)
+ATOM_COLUMNS = (
+    "id",
+    "card_id",
+    "atom_type",
+    "front",
+    "back",
+    "content",
+    "grading_logic",
+    "engagement_mode",
+    "element_interactivity",
+    "knowledge_dimension",
+    "owner",
+    "is_hydrated",
+    "fidelity_type",
+    "source_fact_basis",
+    "quality_score",
+    "updated_at",
+)
+
+JSON_COLUMNS = ("content", "grading_logic")
+
+
+class AtomTableLoader(BaseLoader):
+    """
+    Loader that bulk-merges atoms into learning_atoms.
+
+    The upsert strategy maps directly onto the merge statement, so a batch
+    costs one COPY and one INSERT ... ON CONFLICT regardless of its size:
+
+    - INSERT_ONLY / SKIP_EXISTING: ON CONFLICT DO NOTHING
+    - UPDATE_ALWAYS: ON CONFLICT DO UPDATE
+    - UPDATE_IF_NEWER: ON CONFLICT DO UPDATE WHERE updated_at is newer
+    """
+
+    name = "atom_table"
+
+    def __init__(
+        self,
+        session: Session,
+        config: LoaderConfig | None = None,
+        table: str = "learning_atoms",
+    ):
+        super().__init__(config or LoaderConfig(batch_size=5000))
+        self.session = session
+        self.table = table
+
+    async def _process_batch(self, batch: list[TransformedAtom]) -> LoadResult:
+        """Merge a whole batch with one upsert."""
+        strategy = self.config.upsert_strategy
+        update_columns: tuple[str, ...] | None = None
+        update_where = None
+
+        if strategy in (UpsertStrategy.INSERT_ONLY, UpsertStrategy.SKIP_EXISTING):
+            update_columns = ()
+        elif strategy == UpsertStrategy.UPDATE_IF_NEWER:
+            update_where = f"EXCLUDED.updated_at > {self.table}.updated_at"
+
+        bulk = await asyncio.to_thread(self._merge, batch, update_columns, update_where)
+        result = LoadResult(
+            inserted=bulk.inserted,
+            updated=bulk.updated,
+            skipped=bulk.skipped,
+            errors=list(bulk.errors),
+        )
+
+        if strategy == UpsertStrategy.INSERT_ONLY and bulk.skipped:
+            result.failed = bulk.skipped
+            result.skipped = 0
+            result.errors.append(f"{bulk.skipped} atoms already exist (INSERT_ONLY mode)")
+
+        return result
+
+    async def _insert_batch(self, atoms: list[TransformedAtom]) -> LoadResult:
+        """Insert new atoms (existing card_ids are left untouched)."""
+        bulk = await asyncio.to_thread(self._merge, atoms, (), None)
+        return LoadResult(inserted=bulk.inserted, skipped=bulk.skipped)
+
+    async def _update_batch(self, atoms: list[TransformedAtom]) -> LoadResult:
+        """Upsert atoms, overwriting existing rows."""
+        bulk = await asyncio.to_thread(self._merge, atoms, None, None)
+        return LoadResult(inserted=bulk.inserted, updated=bulk.updated)
+
+    async def _check_existing(self, atom_ids: list[str]) -> set[str]:
+        """Check which atom IDs are already stored."""
+
+        def _query() -> set[str]:
+            rows = self.session.execute(
+                text(f"SELECT id FROM {self.table} WHERE id = ANY(:ids)"),
+                {"ids": atom_ids},
+            )
+            return {str(r[0]) for r in rows}
+
+        return await asyncio.to_thread(_query)
+
+    def _merge(
+        self,
+        atoms: list[TransformedAtom],
+        update_columns: tuple[str, ...] | None,
+        update_where: str | None,
+    ) -> BulkLoadResult:
+        rows = [self._atom_to_row(atom) for atom in atoms]
+        result = BulkLoader(self.session).load(
+            self.table,
+            rows,
+            key_columns=["card_id"],
+            columns=ATOM_COLUMNS,
+            update_columns=(
+                update_columns
+                if update_columns is not None
+                else [c for c in ATOM_COLUMNS if c not in ("id", "card_id")]
+            ),
+            json_columns=JSON_COLUMNS,
+            update_where=update_where,
+        )
+        self.session.commit()
+        return result
+
+    @staticmethod
+    def _atom_to_row(atom: TransformedAtom) -> dict[str, Any]:
+        data = atom.to_dict()
+        return {
+            "id": data["id"],
+            "card_id": data["card_id"],
+            "atom_type": data["atom_type"],
+            "front": data["front"],
+            "back": data["back"],
+            "content": data["content"],
+            "grading_logic": data["grading_logic"],
+            "engagement_mode": data["engagement_mode"],
+            "element_interactivity": data["element_interactivity"],
+            "knowledge_dimension": data["knowledge_dimension"],
+            "owner": data["owner"],
+            "is_hydrated": data["is_hydrated"],
+            "fidelity_type": data["fidelity_type"],
+            "source_fact_basis": data["source_fact_basis"],
+            "quality_score": data["quality_score"],
+            "updated_at": atom.generated_at,
+        }
@@ -2,15 +2,24 @@
 ETL Pipeline Orchestrator.
 
 Coordinates extractors, transformers, and loaders in a pluggable architecture.
+
+Two execution modes:
+- Staged (default): extract everything, transform everything, validate,
+  then load in batches. Memory grows with the corpus.
+- Streaming (``streaming=True``): chunks flow through bounded queues
+  between concurrent stage workers, and loads commit in batches while
+  extraction is still running. Memory is bounded by the queue sizes.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import TYPE_CHECKING, Protocol, runtime_checkable
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
 
 from .models import RawChunk, TransformedAtom
 
@@ -36,6 +45,15 @@ class Extractor(Protocol):
         ...
 
 
+@runtime_checkable
+class StreamingExtractor(Protocol):
+    """Protocol for extractors that can yield chunks incrementally."""
+
+    def iter_chunks(self) -> AsyncIterator[RawChunk]:
+        """Yield raw chunks as they are extracted."""
+        ...
+
+
 @runtime_checkable
 class Transformer(Protocol):
     """Protocol for atom transformers."""
@@ -70,6 +88,55 @@ class LoadResult:
     errors: list[str] = field(default_factory=list)
 
 
+@dataclass
+class StageMetrics:
+    """Throughput and input-queue depth for one streaming stage."""
+
+    name: str
+    workers: int = 1
+    items_in: int = 0
+    items_out: int = 0
+    busy_seconds: float = 0.0  # Summed over workers
+    elapsed_seconds: float = 0.0
+    queue_capacity: int = 0
+    max_queue_depth: int = 0
+    _depth_total: int = 0
+    _depth_samples: int = 0
+
+    def sample_queue(self, depth: int) -> None:
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self._depth_total += depth
+        self._depth_samples += 1
+
+    @property
+    def mean_queue_depth(self) -> float:
+        return self._depth_total / self._depth_samples if self._depth_samples else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Items out per second of wall time."""
+        return self.items_out / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Share of worker time spent working rather than waiting on queues."""
+        capacity = self.elapsed_seconds * self.workers
+        return self.busy_seconds / capacity if capacity else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to dictionary."""
+        return {
+            "workers": self.workers,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "throughput_per_sec": round(self.throughput, 2),
+            "utilization": round(self.utilization, 3),
+            "queue_capacity": self.queue_capacity,
+            "max_queue_depth": self.max_queue_depth,
+            "mean_queue_depth": round(self.mean_queue_depth, 2),
+        }
+
+
 @dataclass
 class PipelineResult:
     """Result of running the full ETL pipeline."""
@@ -98,6 +165,9 @@ class PipelineResult:
     atoms_by_type: dict[str, int] = field(default_factory=dict)
     atoms_by_engagement_mode: dict[str, int] = field(default_factory=dict)
 
+    # Streaming mode only: extract, transform, validate, load
+    stage_metrics: dict[str, StageMetrics] = field(default_factory=dict)
+
     @property
     def success(self) -> bool:
         """Pipeline succeeded if any atoms were loaded."""
@@ -127,6 +197,7 @@ class PipelineResult:
                 "transformation": self.transformation_errors,
                 "loading": self.loading_errors,
             },
+            "stages": {name: m.to_dict() for name, m in self.stage_metrics.items()},
         }
 
 
@@ -134,6 +205,31 @@ class PipelineResult:
 # Pipeline Orchestrator
 # =============================================================================
 
+_END = object()  # End-of-stream marker, one per downstream worker
+
+
+async def _put(queue: asyncio.Queue, item: Any, consumer: StageMetrics) -> None:
+    """Put with backpressure, sampling the consumer's input-queue depth."""
+    await queue.put(item)
+    consumer.sample_queue(queue.qsize())
+
+
+async def _take(queue: asyncio.Queue, limit: int) -> tuple[list[Any], bool]:
+    """
+    Wait for one item, then take up to ``limit`` without waiting.
+
+    Returns:
+        (items, end_of_stream)
+    """
+    items: list[Any] = []
+    item = await queue.get()
+    while item is not _END:
+        items.append(item)
+        if len(items) >= limit or queue.empty():
+            return items, False
+        item = queue.get_nowait()
+    return items, True
+
 
 class Pipeline:
     """
@@ -154,6 +250,9 @@ class Pipeline:
         )
 
         result = await pipeline.run()
+
+        # Overlapping stages in bounded memory
+        pipeline = Pipeline(extractor, transformers, loader, streaming=True)
     """
 
     def __init__(
@@ -165,6 +264,11 @@ class Pipeline:
         validate: bool = True,
         batch_size: int = 100,
         continue_on_error: bool = True,
+        streaming: bool = False,
+        transform_workers: int = 4,
+        validate_workers: int = 1,
+        chunk_batch_size: int = 16,
+        queue_size: int = 64,
     ):
         """
         Initialize pipeline.
@@ -176,6 +280,11 @@ class Pipeline:
             validate: Whether to validate atoms before loading
             batch_size: Batch size for loading
             continue_on_error: Continue processing on individual errors
+            streaming: Run stages concurrently through bounded queues
+            transform_workers: Concurrent transform workers (streaming)
+            validate_workers: Concurrent validation workers (streaming)
+            chunk_batch_size: Chunks per transformer call (streaming)
+            queue_size: Capacity of each inter-stage queue (streaming)
         """
         self.extractor = extractor
         self.transformers = transformers or []
@@ -183,6 +292,11 @@ class Pipeline:
         self.validate = validate
         self.batch_size = batch_size
         self.continue_on_error = continue_on_error
+        self.streaming = streaming
+        self.transform_workers = max(1, transform_workers)
+        self.validate_workers = max(1, validate_workers)
+        self.chunk_batch_size = max(1, chunk_batch_size)
+        self.queue_size = max(1, queue_size)
 
         self._result = PipelineResult()
 
@@ -193,6 +307,9 @@ class Pipeline:
         Returns:
             PipelineResult with counts and metrics
         """
+        if self.streaming:
+            return await self.run_streaming()
+
         self._result = PipelineResult()
         self._result.started_at = datetime.now()
 
@@ -302,18 +419,203 @@ class Pipeline:
             return
 
         for i in range(0, len(atoms), self.batch_size):
-            batch = atoms[i : i + self.batch_size]
-            try:
-                result = await self.loader.load(batch)
-                self._result.atoms_loaded += result.inserted + result.updated
-                self._result.atoms_failed += result.failed
-                self._result.loading_errors.extend(result.errors)
-            except Exception as e:
-                logger.error(f"Loading batch failed: {e}")
-                self._result.loading_errors.append(str(e))
-                self._result.atoms_failed += len(batch)
-                if not self.continue_on_error:
-                    raise
+            await self._load_batch(atoms[i : i + self.batch_size])
+
+    async def _load_batch(self, batch: list[TransformedAtom]) -> None:
+        """Load one batch and record its counts."""
+        try:
+            result = await self.loader.load(batch)
+            self._result.atoms_loaded += result.inserted + result.updated
+            self._result.atoms_failed += result.failed
+            self._result.loading_errors.extend(result.errors)
+        except Exception as e:
+            logger.error(f"Loading batch failed: {e}")
+            self._result.loading_errors.append(str(e))
+            self._result.atoms_failed += len(batch)
+            if not self.continue_on_error:
+                raise
+
+    # =========================================================================
+    # Streaming Mode
+    # =========================================================================
+
+    async def run_streaming(self) -> PipelineResult:
+        """
+        Run the pipeline with overlapping, backpressured stages.
+
+            extract -> chunks -> transform x N -> atoms -> validate x M -> atoms -> load
+
+        Each queue holds at most ``queue_size`` items, so a slow stage stalls
+        the stages upstream instead of letting work pile up in memory, and the
+        loader commits ``batch_size`` batches while extraction is still running.
+        Transformers receive micro-batches of ``chunk_batch_size`` chunks, and
+        atoms may reach the loader in a different order than in a staged run.
+
+        Returns:
+            PipelineResult with counts, metrics and per-stage StageMetrics
+        """
+        self._result = PipelineResult()
+        self._result.started_at = datetime.now()
+
+        stages = {
+            "extract": StageMetrics("extract"),
+            "transform": StageMetrics("transform", workers=self.transform_workers),
+            "validate": StageMetrics("validate", workers=self.validate_workers),
+            "load": StageMetrics("load"),
+        }
+        for name in ("transform", "validate", "load"):
+            stages[name].queue_capacity = self.queue_size
+        self._result.stage_metrics = stages
+
+        chunks: asyncio.Queue = asyncio.Queue(self.queue_size)
+        atoms: asyncio.Queue = asyncio.Queue(self.queue_size)
+        valid: asyncio.Queue = asyncio.Queue(self.queue_size)
+
+        logger.info("Starting streaming pipeline...")
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(
+                    self._run_stage(
+                        stages["extract"],
+                        [self._stream_extract(chunks, stages)],
+                        chunks,
+                        self.transform_workers,
+                    )
+                )
+                group.create_task(
+                    self._run_stage(
+                        stages["transform"],
+                        [
+                            self._stream_transform(chunks, atoms, stages)
+                            for _ in range(self.transform_workers)
+                        ],
+                        atoms,
+                        self.validate_workers,
+                    )
+                )
+                group.create_task(
+                    self._run_stage(
+                        stages["validate"],
+                        [
+                            self._stream_validate(atoms, valid, stages)
+                            for _ in range(self.validate_workers)
+                        ],
+                        valid,
+                        1,
+                    )
+                )
+                group.create_task(
+                    self._run_stage(stages["load"], [self._stream_load(valid, stages)])
+                )
+        except Exception as e:
+            error = e.exceptions[0] if isinstance(e, ExceptionGroup) else e
+            logger.error(f"Pipeline failed: {error}")
+            self._result.extraction_errors.append(str(error))
+
+        self._result.chunks_extracted = stages["extract"].items_out
+        logger.info(
+            f"Streamed {self._result.chunks_extracted} chunks -> "
+            f"{self._result.atoms_transformed} atoms, loaded {self._result.atoms_loaded}"
+        )
+        return self._finalize()
+
+    async def _run_stage(
+        self,
+        stage: StageMetrics,
+        workers: list,
+        output: asyncio.Queue | None = None,
+        downstream_workers: int = 0,
+    ) -> None:
+        """Run a stage's workers, then signal end-of-stream downstream."""
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            stage.elapsed_seconds = time.perf_counter() - start
+        for _ in range(downstream_workers):
+            await output.put(_END)
+
+    def _iter_chunks(self) -> AsyncIterator[RawChunk]:
+        if isinstance(self.extractor, StreamingExtractor):
+            return self.extractor.iter_chunks()
+        return self._iter_extracted()
+
+    async def _iter_extracted(self) -> AsyncIterator[RawChunk]:
+        """Adapter for list-only extractors (no memory bound on extraction)."""
+        for chunk in await self.extractor.extract():
+            yield chunk
+
+    async def _stream_extract(
+        self, output: asyncio.Queue, stages: dict[str, StageMetrics]
+    ) -> None:
+        stage = stages["extract"]
+        chunks = self._iter_chunks()
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    chunk = await anext(chunks)
+                except StopAsyncIteration:
+                    break
+                finally:
+                    stage.busy_seconds += time.perf_counter() - start
+                stage.items_out += 1
+                await _put(output, chunk, stages["transform"])
+        except Exception as e:
+            logger.error(f"Extraction failed: {e}")
+            self._result.extraction_errors.append(str(e))
+            if not self.continue_on_error:
+                raise
+
+    async def _stream_transform(
+        self, inbox: asyncio.Queue, output: asyncio.Queue, stages: dict[str, StageMetrics]
+    ) -> None:
+        stage = stages["transform"]
+        while True:
+            batch, done = await _take(inbox, self.chunk_batch_size)
+            if batch:
+                start = time.perf_counter()
+                atoms = await self._transform(batch)
+                stage.busy_seconds += time.perf_counter() - start
+                stage.items_in += len(batch)
+                stage.items_out += len(atoms)
+                self._result.atoms_transformed += len(atoms)
+                if atoms:
+                    await _put(output, atoms, stages["validate"])
+            if done:
+                return
+
+    async def _stream_validate(
+        self, inbox: asyncio.Queue, output: asyncio.Queue, stages: dict[str, StageMetrics]
+    ) -> None:
+        stage = stages["validate"]
+        while (atoms := await inbox.get()) is not _END:
+            start = time.perf_counter()
+            passed = await self._validate(atoms) if self.validate else atoms
+            stage.busy_seconds += time.perf_counter() - start
+            stage.items_in += len(atoms)
+            stage.items_out += len(passed)
+            if passed:
+                await _put(output, passed, stages["load"])
+
+    async def _stream_load(self, inbox: asyncio.Queue, stages: dict[str, StageMetrics]) -> None:
+        stage = stages["load"]
+        pending: list[TransformedAtom] = []
+        done = False
+        while not done:
+            atoms = await inbox.get()
+            done = atoms is _END
+            if not done:
+                stage.items_in += len(atoms)
+                self._compute_metrics(atoms)
+                pending.extend(atoms)
+            while pending and (done or len(pending) >= self.batch_size):
+                batch, pending = pending[: self.batch_size], pending[self.batch_size :]
+                if self.loader:
+                    start = time.perf_counter()
+                    await self._load_batch(batch)
+                    stage.busy_seconds += time.perf_counter() - start
+                stage.items_out += len(batch)
 
     def _compute_metrics(self, atoms: list[TransformedAtom]) -> None:
         """Compute distribution metrics."""
@@ -367,6 +669,7 @@ class PipelineBuilder:
         self._validate: bool = True
         self._batch_size: int = 100
         self._continue_on_error: bool = True
+        self._streaming: dict[str, Any] | None = None
 
     def extract_from(self, extractor: Extractor) -> PipelineBuilder:
         """Set the extractor."""
@@ -393,6 +696,22 @@ class PipelineBuilder:
         self._batch_size = size
         return self
 
+    def with_streaming(
+        self,
+        transform_workers: int = 4,
+        validate_workers: int = 1,
+        chunk_batch_size: int = 16,
+        queue_size: int = 64,
+    ) -> PipelineBuilder:
+        """Run stages concurrently through bounded queues."""
+        self._streaming = {
+            "transform_workers": transform_workers,
+            "validate_workers": validate_workers,
+            "chunk_batch_size": chunk_batch_size,
+            "queue_size": queue_size,
+        }
+        return self
+
     def continue_on_error(self, enabled: bool = True) -> PipelineBuilder:
         """Set whether to continue on individual errors."""
         self._continue_on_error = enabled
@@ -410,4 +729,6 @@ class PipelineBuilder:
             validate=self._validate,
             batch_size=self._batch_size,
             continue_on_error=self._continue_on_error,
+            streaming=self._streaming is not None,
+            **(self._streaming or {}),
         )
@@ -102,7 +102,7 @@ class BaseTransformer(ABC):
                 logger.error(f"Failed to transform chunk {chunk.chunk_id}: {e}")
                 self._stats.chunks_failed += 1
 
-        self._stats.chunks_processed = len(chunks)
+        self._stats.chunks_processed += len(chunks)  # Cumulative across streamed batches
         self._log_stats()
         return atoms
 
@@ -1,14 +1,34 @@
-"""Greenlight Queue Manager for async execution tracking."""
+"""
+Greenlight Queue Manager for async execution tracking.
+
+Workers take work with ``claim``: one statement locks a batch of pending
+rows with FOR UPDATE SKIP LOCKED and marks them executing under a lease,
+so concurrent workers never receive the same row and never wait on each
+other's locks. Leases are renewed with ``heartbeat``; rows whose worker
+died are returned to the queue by ``reclaim_expired``. Results are written
+back in one statement per batch (``complete_many``, ``fail_many``).
+
+Idle workers wait on GreenlightQueueListener, which LISTENs on the channel
+notified by migration 036 whenever a row becomes pending, instead of
+polling.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import json
+from collections.abc import Awaitable, Callable, Mapping
+from contextlib import AbstractAsyncContextManager
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Mapping
+from typing import Any
 
 from loguru import logger
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+NOTIFY_CHANNEL = "greenlight_queue"
+DEFAULT_LEASE_SECONDS = 60
 
 
 @dataclass
@@ -28,6 +48,8 @@ class QueuedExecution:
     error_message: str | None
     retry_count: int
     max_retries: int
+    worker_id: str | None = None
+    lease_expires_at: datetime | None = None
 
 
 class GreenlightQueueManager:
@@ -185,8 +207,200 @@ class GreenlightQueueManager:
         logger.error("Queue item {} failed: {}", queue_id, error_message)
         return False
 
+    async def claim(
+        self,
+        worker_id: str,
+        limit: int = 10,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+    ) -> list[QueuedExecution]:
+        """
+        Atomically claim up to ``limit`` pending items, oldest first.
+
+        Rows locked by another worker's claim are skipped rather than waited
+        on. Claimed rows are executing under a lease held by ``worker_id``.
+
+        Args:
+            worker_id: Claiming worker
+            limit: Maximum items to claim
+            lease_seconds: Lease duration; renew with heartbeat
+
+        Returns:
+            Claimed items in queue order (empty if nothing is pending)
+        """
+        query = text(
+            """
+            WITH claimable AS (
+                SELECT id
+                FROM greenlight_queue
+                WHERE status = 'pending'
+                ORDER BY queued_at ASC
+                LIMIT :limit
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE greenlight_queue q
+            SET status = 'executing', started_at = NOW(), worker_id = :worker_id,
+                lease_expires_at = NOW() + make_interval(secs => :lease_seconds)
+            FROM claimable
+            WHERE q.id = claimable.id
+            RETURNING q.*
+            """
+        )
+        result = await self.session.execute(
+            query,
+            {"worker_id": worker_id, "limit": limit, "lease_seconds": lease_seconds},
+        )
+        claimed = [self._row_to_queued_execution(row) for row in result.fetchall()]
+        claimed.sort(key=lambda item: item.queued_at)
+        if claimed:
+            logger.debug("Worker {} claimed {} queue items", worker_id, len(claimed))
+        return claimed
+
+    async def heartbeat(
+        self,
+        worker_id: str,
+        queue_ids: list[str],
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+    ) -> int:
+        """
+        Extend the leases ``worker_id`` still holds on ``queue_ids``.
+
+        Returns:
+            Number of leases renewed (fewer means some were reclaimed)
+        """
+        if not queue_ids:
+            return 0
+        query = text(
+            """
+            UPDATE greenlight_queue
+            SET lease_expires_at = NOW() + make_interval(secs => :lease_seconds)
+            WHERE id = ANY(CAST(:queue_ids AS uuid[]))
+              AND status = 'executing' AND worker_id = :worker_id
+            """
+        )
+        result = await self.session.execute(
+            query,
+            {"queue_ids": list(queue_ids), "worker_id": worker_id, "lease_seconds": lease_seconds},
+        )
+        return result.rowcount
+
+    async def reclaim_expired(self) -> int:
+        """
+        Return executing items whose lease expired to the queue.
+
+        An expired lease counts as a failed attempt: the item is re-queued
+        while retries remain, otherwise marked failed.
+
+        Returns:
+            Number of items reclaimed
+        """
+        query = text(
+            """
+            WITH expired AS (
+                SELECT id
+                FROM greenlight_queue
+                WHERE status = 'executing' AND lease_expires_at < NOW()
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE greenlight_queue q
+            SET retry_count = q.retry_count + 1,
+                status = CASE WHEN q.retry_count + 1 < q.max_retries
+                              THEN 'pending' ELSE 'failed' END,
+                error_message = 'Lease expired on worker ' || COALESCE(q.worker_id, '?'),
+                worker_id = NULL, lease_expires_at = NULL
+            FROM expired
+            WHERE q.id = expired.id
+            """
+        )
+        result = await self.session.execute(query)
+        if result.rowcount:
+            logger.warning("Reclaimed {} queue items with expired leases", result.rowcount)
+        return result.rowcount
+
+    async def complete_many(
+        self,
+        results: Mapping[str, Mapping[str, Any]],
+        worker_id: str | None = None,
+    ) -> int:
+        """
+        Mark executing items complete in one statement.
+
+        Args:
+            results: Result payload by queue ID
+            worker_id: Only complete rows this worker still holds
+
+        Returns:
+            Number of items completed
+        """
+        if not results:
+            return 0
+        query = text(
+            """
+            UPDATE greenlight_queue q
+            SET status = 'complete', result_payload = CAST(v.result AS jsonb),
+                completed_at = NOW(), lease_expires_at = NULL
+            FROM unnest(CAST(:queue_ids AS uuid[]), CAST(:payloads AS text[])) AS v(id, result)
+            WHERE q.id = v.id AND q.status = 'executing'
+              AND (CAST(:worker_id AS text) IS NULL OR q.worker_id = :worker_id)
+            """
+        )
+        result = await self.session.execute(
+            query,
+            {
+                "queue_ids": list(results),
+                "payloads": [json.dumps(dict(payload)) for payload in results.values()],
+                "worker_id": worker_id,
+            },
+        )
+        if result.rowcount < len(results):
+            logger.warning(
+                "Completed {}/{} queue items; the rest lost their lease",
+                result.rowcount,
+                len(results),
+            )
+        return result.rowcount
+
+    async def fail_many(
+        self,
+        errors: Mapping[str, str],
+        worker_id: str | None = None,
+    ) -> dict[str, bool]:
+        """
+        Record failed attempts of executing items in one statement.
+
+        Args:
+            errors: Error message by queue ID
+            worker_id: Only fail rows this worker still holds
+
+        Returns:
+            Re-queued flag by queue ID (False = permanently failed)
+        """
+        if not errors:
+            return {}
+        query = text(
+            """
+            UPDATE greenlight_queue q
+            SET retry_count = q.retry_count + 1,
+                status = CASE WHEN q.retry_count + 1 < q.max_retries
+                              THEN 'pending' ELSE 'failed' END,
+                error_message = v.error, worker_id = NULL, lease_expires_at = NULL
+            FROM unnest(CAST(:queue_ids AS uuid[]), CAST(:errors AS text[])) AS v(id, error)
+            WHERE q.id = v.id AND q.status = 'executing'
+              AND (CAST(:worker_id AS text) IS NULL OR q.worker_id = :worker_id)
+            RETURNING q.id, q.status
+            """
+        )
+        result = await self.session.execute(
+            query,
+            {"queue_ids": list(errors), "errors": list(errors.values()), "worker_id": worker_id},
+        )
+        requeued = {str(row[0]): row[1] == "pending" for row in result.fetchall()}
+        failed = [queue_id for queue_id, again in requeued.items() if not again]
+        if failed:
+            logger.error("Queue items failed permanently: {}", ", ".join(failed))
+        return requeued
+
     async def get_pending(self, limit: int = 10) -> list[QueuedExecution]:
-        """Get pending queue items."""
+        """Get pending queue items (read-only; workers use claim)."""
         query = text(
             """
             SELECT *
@@ -218,4 +432,202 @@ class GreenlightQueueManager:
             error_message=mapping.get("error_message"),
             retry_count=mapping["retry_count"],
             max_retries=mapping["max_retries"],
+            worker_id=mapping.get("worker_id"),
+            lease_expires_at=mapping.get("lease_expires_at"),
         )
+
+
+class GreenlightQueueListener:
+    """
+    Wakes idle queue workers on NOTIFY instead of polling.
+
+    Holds one dedicated connection that LISTENs on the queue channel. Any
+    number of workers in the process may share a listener.
+
+    Example:
+        listener = GreenlightQueueListener()
+        await listener.start()
+        woke = await listener.wait(timeout=30)
+    """
+
+    def __init__(self, engine: AsyncEngine | None = None, channel: str = NOTIFY_CHANNEL):
+        self.engine = engine
+        self.channel = channel
+        self._conn: AsyncConnection | None = None
+        self._driver_conn: Any = None
+        self._event: asyncio.Event | None = None
+
+    async def start(self) -> None:
+        """Open the listening connection."""
+        if self.engine is None:
+            from src.db.database import get_async_engine
+
+            self.engine = get_async_engine()
+        self._event = asyncio.Event()
+        self._conn = await self.engine.connect()
+        raw = await self._conn.get_raw_connection()
+        self._driver_conn = raw.driver_connection
+        await self._driver_conn.add_listener(self.channel, self._on_notify)
+        logger.debug("Listening for Greenlight queue notifications on {}", self.channel)
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Wait for a notification since the previous wait.
+
+        Returns:
+            True if notified, False on timeout
+        """
+        if self._event is None:
+            await asyncio.sleep(timeout)
+            return False
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._event.clear()
+
+    async def close(self) -> None:
+        """Stop listening and release the connection."""
+        if self._driver_conn is not None:
+            await self._driver_conn.remove_listener(self.channel, self._on_notify)
+            self._driver_conn = None
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        if self._event is not None:
+            self._event.set()
+
+
+QueueHandler = Callable[[QueuedExecution], Awaitable[Mapping[str, Any]]]
+SessionScope = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+
+class GreenlightQueueWorker:
+    """
+    Claims queue batches, runs them concurrently and records the outcomes.
+
+    ``handler`` returns the result payload of one item; an exception counts
+    as a failed attempt. Leases are renewed while a batch runs, completions
+    and failures are each written in one statement per batch, and expired
+    leases are reclaimed every ``lease_seconds``.
+
+    Example:
+        worker = GreenlightQueueWorker(execute_atom, "worker-1", listener=listener)
+        await worker.run(stop_event)
+    """
+
+    def __init__(
+        self,
+        handler: QueueHandler,
+        worker_id: str,
+        session_scope: SessionScope | None = None,
+        listener: GreenlightQueueListener | None = None,
+        batch_size: int | None = None,
+        lease_seconds: int | None = None,
+        idle_timeout: float = 30.0,
+    ):
+        """
+        Initialize worker.
+
+        Args:
+            handler: Executes one item and returns its result payload
+            worker_id: Lease owner name (unique per worker)
+            session_scope: Async transactional session factory
+                (default: async_session_scope)
+            listener: Notification listener; without one, idle workers poll
+                every ``idle_timeout`` seconds
+            batch_size: Items claimed at once (default from settings)
+            lease_seconds: Claim lease (default from settings)
+            idle_timeout: Longest wait between claims when the queue is empty
+        """
+        from config import get_settings
+
+        settings = get_settings()
+        if session_scope is None:
+            from src.db.database import async_session_scope
+
+            session_scope = async_session_scope
+        self.handler = handler
+        self.worker_id = worker_id
+        self.session_scope = session_scope
+        self.listener = listener
+        self.batch_size = batch_size or settings.greenlight_queue_batch_size
+        self.lease_seconds = lease_seconds or settings.greenlight_queue_lease_seconds
+        self.idle_timeout = idle_timeout
+        self.processed = 0
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Process batches until ``stop`` is set, sleeping on the listener when idle."""
+        loop = asyncio.get_running_loop()
+        next_reclaim = 0.0
+        while not stop.is_set():
+            if loop.time() >= next_reclaim:
+                async with self.session_scope() as session:
+                    await GreenlightQueueManager(session).reclaim_expired()
+                next_reclaim = loop.time() + self.lease_seconds
+            if await self.run_once():
+                continue
+
+            waiters = [asyncio.ensure_future(stop.wait())]
+            if self.listener is not None:
+                waiters.append(asyncio.ensure_future(self.listener.wait(self.idle_timeout)))
+            _, pending = await asyncio.wait(
+                waiters, timeout=self.idle_timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            for waiter in pending:
+                waiter.cancel()
+
+    async def run_once(self) -> int:
+        """
+        Claim and process one batch.
+
+        Returns:
+            Number of items processed (0 if nothing was pending)
+        """
+        async with self.session_scope() as session:
+            batch = await GreenlightQueueManager(session).claim(
+                self.worker_id, self.batch_size, self.lease_seconds
+            )
+        if not batch:
+            return 0
+
+        heartbeat = asyncio.create_task(self._heartbeat([item.id for item in batch]))
+        try:
+            outcomes = await asyncio.gather(
+                *(self.handler(item) for item in batch), return_exceptions=True
+            )
+        finally:
+            heartbeat.cancel()
+
+        results: dict[str, Mapping[str, Any]] = {}
+        errors: dict[str, str] = {}
+        for item, outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                errors[item.id] = str(outcome) or type(outcome).__name__
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results[item.id] = outcome
+
+        async with self.session_scope() as session:
+            manager = GreenlightQueueManager(session)
+            await manager.complete_many(results, self.worker_id)
+            await manager.fail_many(errors, self.worker_id)
+        self.processed += len(batch)
+        return len(batch)
+
+    async def _heartbeat(self, queue_ids: list[str]) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            async with self.session_scope() as session:
+                renewed = await GreenlightQueueManager(session).heartbeat(
+                    self.worker_id, queue_ids, self.lease_seconds
+                )
+            if renewed < len(queue_ids):
+                logger.warning(
+                    "Worker {} lost {} leases", self.worker_id, len(queue_ids) - renewed
+                )
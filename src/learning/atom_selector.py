@@ -2,8 +2,6 @@
 
 This module extends atom selection with skill gap targeting capabilities.
 Uses learner skill mastery data to select atoms that address weaknesses.
-"""
-Atom Selection for Adaptive Learning.
 
 Provides intelligent atom selection based on:
 - Skill gaps (targets learner's weakest skills)
@@ -18,6 +16,8 @@ import logging
 from dataclasses import dataclass
 from typing import Any
 
+from src.adaptive.psychometrics import difficulty_to_unit
+
 logger = logging.getLogger(__name__)
 
 
@@ -127,7 +127,7 @@ class SkillBasedAtomSelector:
             AtomCandidate(
                 atom_id=row["atom_id"],
                 atom_type=row["atom_type"],
-                difficulty=float(row["irt_difficulty"] or 0.5),
+                difficulty=difficulty_to_unit(row["irt_difficulty"]),
                 primary_skills=row["primary_skills"] or [],
                 secondary_skills=[],
                 z_score=0.0
@@ -5,18 +5,49 @@ This module tracks learner mastery per skill using:
 - Weighted Bayesian updates based on atom responses
 - FSRS scheduling parameters per skill
 - Confidence interval estimation
+
+``update_skill_mastery`` applies one response with a read-modify-write per
+linked skill. Bulk imports use ``update_skill_mastery_batch``, and full
+history replays use ``backfill_from_history``. Both load the skill links and
+mastery states once, apply the same per-response update in memory, in
+order, and write the final states in one upsert.
 """
 
 from __future__ import annotations
 
 import logging
 import math
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CONFIDENCE = 3  # Responses recorded without a confidence rating
+UPSERT_CHUNK = 50_000  # Mastery rows per batch upsert statement
+
+# Response history across both quiz response tables, oldest first.
+# learner_skill_mastery keys learners by UUID; other learner ids are skipped.
+HISTORY_SQL = """
+SELECT learner_id, atom_id, is_correct, latency_ms, confidence, answered_at
+FROM (
+    SELECT ar.user_id AS learner_id, ar.atom_id, ar.is_correct,
+           ar.response_time_ms AS latency_ms, NULL::int AS confidence,
+           ar.responded_at AS answered_at
+    FROM atom_responses ar
+    WHERE ar.responded_at IS NOT NULL
+    UNION ALL
+    SELECT lps.learner_id, sar.atom_id, sar.is_correct,
+           sar.time_spent_ms, sar.confidence_rating, sar.answered_at
+    FROM session_atom_responses sar
+    JOIN learning_path_sessions lps ON lps.id = sar.session_id
+    WHERE sar.answered_at IS NOT NULL AND sar.is_correct IS NOT NULL
+) history
+WHERE learner_id ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+ORDER BY answered_at
+"""
+
 
 @dataclass
 class SkillUpdate:
@@ -48,6 +79,28 @@ class SkillMasteryState:
     stability: float
 
 
+@dataclass
+class SkillEvent:
+    """One learner response to replay."""
+
+    learner_id: str
+    atom_id: str
+    is_correct: bool
+    latency_ms: int
+    confidence: int
+    answered_at: datetime | None = None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a batch update or backfill."""
+
+    events: int = 0
+    skipped_events: int = 0  # Atoms without skill links
+    skill_updates: int = 0
+    states_written: int = 0
+
+
 class SkillMasteryTracker:
     """
     Track learner mastery per skill using weighted Bayesian update + FSRS.
@@ -95,45 +148,24 @@ class SkillMasteryTracker:
             logger.warning(f"Atom {atom_id} has no skill links - skipping mastery update")
             return []
 
+        event = SkillEvent(learner_id, atom_id, is_correct, latency_ms, confidence)
         updates = []
         for link in skill_links:
             # Get current mastery state
             current_state = await self._get_skill_mastery(learner_id, link["skill_id"])
-
-            # Bayesian update
-            new_mastery = self._bayesian_update(
-                prior_mastery=current_state.mastery_level,
-                is_correct=is_correct,
-                weight=link["weight"],
-                confidence=confidence,
-            )
-
-            # Update FSRS parameters
-            fsrs_update = await self._update_fsrs_parameters(
-                skill_id=link["skill_id"],
-                learner_id=learner_id,
-                is_correct=is_correct,
-                latency_ms=latency_ms,
-                current_difficulty=current_state.difficulty,
-                current_stability=current_state.stability,
-            )
-
-            # Compute confidence interval
-            confidence_interval = self._compute_confidence_interval(
-                new_mastery, current_state.practice_count + 1
-            )
+            new_state = self._apply_event(current_state, float(link["weight"]), event)
 
             # Store update
             await self._save_skill_mastery(
                 learner_id=learner_id,
                 skill_id=link["skill_id"],
-                mastery_level=new_mastery,
-                confidence_interval=confidence_interval,
-                practice_count=current_state.practice_count + 1,
-                consecutive_correct=current_state.consecutive_correct + 1 if is_correct else 0,
-                retrievability=fsrs_update["retrievability"],
-                difficulty=fsrs_update["difficulty"],
-                stability=fsrs_update["stability"],
+                mastery_level=new_state.mastery_level,
+                confidence_interval=new_state.confidence_interval,
+                practice_count=new_state.practice_count,
+                consecutive_correct=new_state.consecutive_correct,
+                retrievability=new_state.retrievability,
+                difficulty=new_state.difficulty,
+                stability=new_state.stability,
             )
 
             updates.append(
@@ -141,16 +173,167 @@ class SkillMasteryTracker:
                     skill_id=link["skill_id"],
                     skill_code=link["skill_code"],
                     old_mastery=current_state.mastery_level,
-                    new_mastery=new_mastery,
-                    confidence_interval=confidence_interval,
-                    retrievability=fsrs_update["retrievability"],
-                    stability=fsrs_update["stability"],
-                    next_review_date=datetime.now() + timedelta(days=fsrs_update["stability"]),
+                    new_mastery=new_state.mastery_level,
+                    confidence_interval=new_state.confidence_interval,
+                    retrievability=new_state.retrievability,
+                    stability=new_state.stability,
+                    next_review_date=datetime.now() + timedelta(days=new_state.stability),
                 )
             )
 
         return updates
 
+    async def update_skill_mastery_batch(self, events: Iterable[SkillEvent]) -> BatchResult:
+        """
+        Apply many responses with one read and one write.
+
+        Events are applied in the given (chronological) order, each exactly
+        as update_skill_mastery would, starting from the stored states.
+
+        Args:
+            events: Responses, oldest first
+
+        Returns:
+            BatchResult counters
+        """
+        events = list(events)
+        links = await self._get_atom_skills_many({str(e.atom_id) for e in events})
+        keys = {
+            (str(e.learner_id), link["skill_id"])
+            for e in events
+            for link in links.get(str(e.atom_id), ())
+        }
+        states = await self._get_skill_masteries(keys)
+        result = self.apply_events(events, links, states)
+        result.states_written = await self._save_skill_masteries(states)
+        return result
+
+    async def backfill_from_history(self, prefetch: int = 10_000) -> BatchResult:
+        """
+        Recompute mastery for every learner and skill in the response history.
+
+        Replays atom_responses and session_atom_responses from the default
+        state, oldest first, and overwrites the mastery rows of every
+        (learner, skill) pair in the history. Pairs without history are
+        left alone.
+
+        Args:
+            prefetch: Rows fetched per cursor round-trip
+
+        Returns:
+            BatchResult counters
+        """
+        links = await self._get_atom_skills_many(None)
+        states: dict[tuple[str, str], SkillMasteryState] = {}
+        result = BatchResult()
+        batch: list[SkillEvent] = []
+        async with self.db.transaction():
+            async for row in self.db.cursor(HISTORY_SQL, prefetch=prefetch):
+                batch.append(
+                    SkillEvent(
+                        learner_id=str(row["learner_id"]),
+                        atom_id=str(row["atom_id"]),
+                        is_correct=row["is_correct"],
+                        latency_ms=row["latency_ms"] or 0,
+                        confidence=row["confidence"] or DEFAULT_CONFIDENCE,
+                        answered_at=row["answered_at"],
+                    )
+                )
+                if len(batch) >= prefetch:
+                    self._merge(result, self.apply_events(batch, links, states))
+                    batch.clear()
+            self._merge(result, self.apply_events(batch, links, states))
+            result.states_written = await self._save_skill_masteries(states)
+        logger.info(
+            f"Backfilled skill mastery from {result.events} responses: "
+            f"{result.states_written} learner skills, {result.skipped_events} unlinked"
+        )
+        return result
+
+    def apply_events(
+        self,
+        events: Iterable[SkillEvent],
+        links: dict[str, list[dict[str, Any]]],
+        states: dict[tuple[str, str], SkillMasteryState],
+    ) -> BatchResult:
+        """
+        Apply responses in order to in-memory states (no I/O).
+
+        Args:
+            events: Responses, oldest first
+            links: Skill links by atom id (skill_id, skill_code, weight)
+            states: Mastery state by (learner_id, skill_id); updated in place,
+                missing pairs start from the default state
+
+        Returns:
+            BatchResult counters
+        """
+        result = BatchResult()
+        for event in events:
+            result.events += 1
+            atom_links = links.get(str(event.atom_id))
+            if not atom_links:
+                result.skipped_events += 1
+                continue
+            learner_id = str(event.learner_id)
+            for link in atom_links:
+                key = (learner_id, link["skill_id"])
+                state = states.get(key)
+                if state is None:
+                    state = self._default_state(link["skill_id"], link["skill_code"])
+                states[key] = self._apply_event(state, link["weight"], event)
+                result.skill_updates += 1
+        if result.skipped_events:
+            logger.warning(f"{result.skipped_events} responses had no skill links - skipped")
+        return result
+
+    @staticmethod
+    def _merge(total: BatchResult, part: BatchResult) -> None:
+        total.events += part.events
+        total.skipped_events += part.skipped_events
+        total.skill_updates += part.skill_updates
+
+    def _apply_event(
+        self, state: SkillMasteryState, weight: float, event: SkillEvent
+    ) -> SkillMasteryState:
+        """State of a skill after one response to an atom linked with ``weight``."""
+        new_mastery = self._bayesian_update(
+            prior_mastery=state.mastery_level,
+            is_correct=event.is_correct,
+            weight=weight,
+            confidence=event.confidence,
+        )
+        fsrs_update = self._fsrs_step(event.is_correct, state.difficulty, state.stability)
+        practice_count = state.practice_count + 1
+        return SkillMasteryState(
+            skill_id=state.skill_id,
+            skill_code=state.skill_code,
+            mastery_level=new_mastery,
+            confidence_interval=self._compute_confidence_interval(new_mastery, practice_count),
+            practice_count=practice_count,
+            consecutive_correct=state.consecutive_correct + 1 if event.is_correct else 0,
+            last_practiced=event.answered_at,
+            retrievability=fsrs_update["retrievability"],
+            difficulty=fsrs_update["difficulty"],
+            stability=fsrs_update["stability"],
+        )
+
+    @staticmethod
+    def _default_state(skill_id: str, skill_code: str) -> SkillMasteryState:
+        """Mastery state of a skill the learner has never practiced."""
+        return SkillMasteryState(
+            skill_id=skill_id,
+            skill_code=skill_code,
+            mastery_level=0.0,
+            confidence_interval=0.5,
+            practice_count=0,
+            consecutive_correct=0,
+            last_practiced=None,
+            retrievability=1.0,
+            difficulty=0.3,
+            stability=1.0,
+        )
+
     def _bayesian_update(
         self, prior_mastery: float, is_correct: bool, weight: float, confidence: int
     ) -> float:
@@ -209,6 +392,13 @@ class SkillMasteryTracker:
         Returns:
             dict with updated difficulty, stability, retrievability
         """
+        return self._fsrs_step(is_correct, current_difficulty, current_stability)
+
+    @staticmethod
+    def _fsrs_step(
+        is_correct: bool, current_difficulty: float, current_stability: float
+    ) -> dict[str, float]:
+        """FSRS difficulty, stability and retrievability after one response."""
         # FSRS difficulty update
         if is_correct:
             # Decrease difficulty slightly (skill getting easier)
@@ -320,18 +510,7 @@ class SkillMasteryTracker:
         else:
             # Create default state for new skill
             skill_code = await self._get_skill_code(skill_id)
-            return SkillMasteryState(
-                skill_id=skill_id,
-                skill_code=skill_code,
-                mastery_level=0.0,
-                confidence_interval=0.5,
-                practice_count=0,
-                consecutive_correct=0,
-                last_practiced=None,
-                retrievability=1.0,
-                difficulty=0.3,
-                stability=1.0,
-            )
+            return self._default_state(skill_id, skill_code)
 
     async def _save_skill_mastery(
         self,
@@ -389,6 +568,158 @@ class SkillMasteryTracker:
             stability,
         )
 
+    async def _get_atom_skills_many(
+        self, atom_ids: Iterable[str] | None
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Skill links of many atoms (all atoms if None), in _get_atom_skills order.
+
+        Returns:
+            Links by atom id; skill ids as strings and weights as floats
+        """
+        query = """
+        SELECT
+            asw.atom_id,
+            s.id AS skill_id,
+            s.skill_code,
+            asw.weight,
+            asw.is_primary
+        FROM atom_skill_weights asw
+        JOIN skills s ON asw.skill_id = s.id
+        {where}
+        ORDER BY asw.atom_id, asw.is_primary DESC, asw.weight DESC
+        """
+        if atom_ids is None:
+            rows = await self.db.fetch(query.format(where=""))
+        else:
+            rows = await self.db.fetch(
+                query.format(where="WHERE asw.atom_id = ANY($1::uuid[])"), list(atom_ids)
+            )
+        links: dict[str, list[dict[str, Any]]] = {}
+        for row in rows:
+            links.setdefault(str(row["atom_id"]), []).append(
+                {
+                    "skill_id": str(row["skill_id"]),
+                    "skill_code": row["skill_code"],
+                    "weight": float(row["weight"]),
+                    "is_primary": row["is_primary"],
+                }
+            )
+        return links
+
+    async def _get_skill_masteries(
+        self, keys: Iterable[tuple[str, str]]
+    ) -> dict[tuple[str, str], SkillMasteryState]:
+        """Stored mastery states of (learner_id, skill_id) pairs, in one query."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        query = """
+        SELECT
+            lsm.learner_id,
+            lsm.skill_id,
+            lsm.mastery_level,
+            lsm.confidence_interval,
+            lsm.practice_count,
+            lsm.consecutive_correct,
+            lsm.last_practiced,
+            lsm.retrievability,
+            lsm.difficulty,
+            lsm.stability,
+            s.skill_code
+        FROM unnest($1::uuid[], $2::uuid[]) AS k(learner_id, skill_id)
+        JOIN learner_skill_mastery lsm
+            ON lsm.learner_id = k.learner_id AND lsm.skill_id = k.skill_id
+        JOIN skills s ON lsm.skill_id = s.id
+        """
+        rows = await self.db.fetch(query, [k[0] for k in keys], [k[1] for k in keys])
+        return {
+            (str(row["learner_id"]), str(row["skill_id"])): SkillMasteryState(
+                skill_id=str(row["skill_id"]),
+                skill_code=row["skill_code"],
+                mastery_level=float(row["mastery_level"]),
+                confidence_interval=float(row["confidence_interval"]),
+                practice_count=row["practice_count"],
+                consecutive_correct=row["consecutive_correct"],
+                last_practiced=row["last_practiced"],
+                retrievability=float(row["retrievability"]),
+                difficulty=float(row["difficulty"]),
+                stability=float(row["stability"]),
+            )
+            for row in rows
+        }
+
+    async def _save_skill_masteries(
+        self, states: dict[tuple[str, str], SkillMasteryState]
+    ) -> int:
+        """
+        Upsert many mastery states, one statement per UPSERT_CHUNK rows.
+
+        last_practiced is the last replayed response's time, or NOW() when
+        the responses carried none (as in _save_skill_mastery).
+
+        Returns:
+            Number of rows written
+        """
+        query = """
+        INSERT INTO learner_skill_mastery (
+            learner_id,
+            skill_id,
+            mastery_level,
+            confidence_interval,
+            practice_count,
+            consecutive_correct,
+            last_practiced,
+            retrievability,
+            difficulty,
+            stability,
+            last_updated
+        )
+        SELECT
+            u.learner_id, u.skill_id, u.mastery_level, u.confidence_interval,
+            u.practice_count, u.consecutive_correct, COALESCE(u.last_practiced, NOW()),
+            u.retrievability, u.difficulty, u.stability, NOW()
+        FROM unnest(
+            $1::uuid[], $2::uuid[], $3::float8[], $4::float8[], $5::int[], $6::int[],
+            $7::timestamptz[], $8::float8[], $9::float8[], $10::float8[]
+        ) AS u(
+            learner_id, skill_id, mastery_level, confidence_interval, practice_count,
+            consecutive_correct, last_practiced, retrievability, difficulty, stability
+        )
+        ON CONFLICT (learner_id, skill_id)
+        DO UPDATE SET
+            mastery_level = EXCLUDED.mastery_level,
+            confidence_interval = EXCLUDED.confidence_interval,
+            practice_count = EXCLUDED.practice_count,
+            consecutive_correct = EXCLUDED.consecutive_correct,
+            last_practiced = EXCLUDED.last_practiced,
+            retrievability = EXCLUDED.retrievability,
+            difficulty = EXCLUDED.difficulty,
+            stability = EXCLUDED.stability,
+            last_updated = NOW()
+        """
+        items = list(states.items())
+        for start in range(0, len(items), UPSERT_CHUNK):
+            chunk = items[start : start + UPSERT_CHUNK]
+            columns: list[list[Any]] = [[] for _ in range(10)]
+            for (learner_id, skill_id), state in chunk:
+                values = (
+                    learner_id,
+                    skill_id,
+                    state.mastery_level,
+                    state.confidence_interval,
+                    state.practice_count,
+                    state.consecutive_correct,
+                    state.last_practiced,
+                    state.retrievability,
+                    state.difficulty,
+                    state.stability,
+                )
+                for column, value in zip(columns, values):
+                    column.append(value)
+            await self.db.execute(query, *columns)
+        return len(items)
+
     async def _get_skill_code(self, skill_id: str) -> str:
         """Get skill_code for a skill_id."""
         query = "SELECT skill_code FROM skills WHERE id = $1"
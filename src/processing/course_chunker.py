@@ -15,6 +15,9 @@ Design Goals:
 - Extensible: Easy to add new format parsers
 - Consistent output: All parsers return TextChunk objects
 - Metadata rich: Captures format-specific features for template selection
+
+Moodle weeks and curriculum tables are cut by the single-pass tokenizer in
+section_tokenizer. With a ParseCache, unchanged files are not re-parsed.
 """
 
 from __future__ import annotations
@@ -23,11 +26,19 @@ import re
 from collections.abc import Iterator
 from dataclasses import dataclass, field
 from enum import Enum
+from itertools import islice
 from pathlib import Path
 from typing import Protocol
 
 # Import existing CCNAChunker
 from .chunker import CCNAChunker, ChunkType, TextChunk
+from .parse_cache import DEFAULT_PARSE_CACHE_PATH, ParseCache, content_sha256
+from .section_tokenizer import (
+    curriculum_table,
+    has_curriculum_table,
+    moodle_weeks,
+    section_spans,
+)
 
 
 class ContentFormat(str, Enum):
@@ -78,6 +89,18 @@ class CCNAParser:
 class MoodleWeeklyParser:
     """Parser for Moodle week-based course structure."""
 
+    # Common Moodle section headers
+    SECTION_HEADERS = [
+        "Before Class",
+        "During Class",
+        "Workshop",
+        "Quiz",
+        "After Class",
+        "Learning Resources",
+        "Learning resources",
+        "Learning activities",
+    ]
+
     def can_parse(self, content: str, file_path: Path) -> bool:
         """Detect Moodle format by looking for week table and week sections."""
         has_week_table = bool(re.search(r"Week\s+Topic\s+Learning objectives", content, re.IGNORECASE))
@@ -89,10 +112,9 @@ class MoodleWeeklyParser:
         course_name = self._extract_course_name(content)
 
         # Split content into weeks by the "W## - Date (Topic)" pattern
-        week_pattern = r"(W\d+\s*-\s*\d+\.\s*\w+.*?)(?=W\d+\s*-\s*|\Z)"
-        weeks = re.findall(week_pattern, content, re.DOTALL)
+        for week in moodle_weeks(content, self.SECTION_HEADERS):
+            week_content = week.span.text(content)
 
-        for week_content in weeks:
             # Extract week metadata
             week_match = re.match(r"W(\d+)\s*-\s*(\d+\.\s*\w+)\s*\((.*?)\)", week_content)
             if not week_match:
@@ -102,8 +124,8 @@ class MoodleWeeklyParser:
             date = week_match.group(2)
             topic = week_match.group(3)
 
-            # Split week content into sections (Before Class, During Class, etc.)
-            sections = self._split_week_sections(week_content)
+            # Sections (Before Class, During Class, etc.) from the same scan
+            sections = {name: span.text(content) for name, span in week.children.items()}
 
             for section_name, section_content in sections.items():
                 if not section_content.strip():
@@ -135,34 +157,10 @@ class MoodleWeeklyParser:
 
     def _split_week_sections(self, week_content: str) -> dict[str, str]:
         """Split week content into sections (Before Class, During Class, etc.)."""
-        sections = {}
-
-        # Common Moodle section headers
-        section_headers = [
-            "Before Class",
-            "During Class",
-            "Workshop",
-            "Quiz",
-            "After Class",
-            "Learning Resources",
-            "Learning resources",
-            "Learning activities"
-        ]
-
-        # Build pattern to split on any of these headers
-        pattern = r"(" + "|".join(re.escape(h) for h in section_headers) + r")"
-        parts = re.split(pattern, week_content)
-
-        # Reconstruct sections
-        current_section = None
-        for part in parts[1:]:  # Skip week header
-            if part in section_headers:
-                current_section = part
-                sections[current_section] = ""
-            elif current_section:
-                sections[current_section] += part
-
-        return sections
+        return {
+            name: span.text(week_content)
+            for name, span in section_spans(week_content, self.SECTION_HEADERS).items()
+        }
 
     def _infer_section_type(self, section_name: str) -> ChunkType:
         """Map Moodle section names to ChunkType."""
@@ -187,8 +185,8 @@ class QAPairParser:
         """Detect Q&A format by looking for Q: and A: patterns."""
         # Look for multiple Q: A: pairs
         qa_pattern = r"(?:^|\n)Q:|Question \d+:|^\d+\."
-        matches = re.findall(qa_pattern, content, re.MULTILINE)
-        return len(matches) >= 3  # At least 3 Q&A pairs
+        matches = re.finditer(qa_pattern, content, re.MULTILINE)
+        return next(islice(matches, 2, None), None) is not None  # At least 3 Q&A pairs
 
     def parse(self, content: str, file_path: Path) -> Iterator[TextChunk]:
         """Parse Q&A pairs into chunks."""
@@ -236,24 +234,19 @@ class CurriculumTableParser:
     def can_parse(self, content: str, file_path: Path) -> bool:
         """Detect curriculum table by looking for table structure with learning objectives."""
         # Look for table with Week | Topic | Learning objectives structure
-        table_header = r"Week\s+.*?\s+Topic\s+.*?\s+Learning objectives"
-        return bool(re.search(table_header, content, re.IGNORECASE))
+        return has_curriculum_table(content)
 
     def parse(self, content: str, file_path: Path) -> Iterator[TextChunk]:
         """Parse curriculum table into chunks."""
         file_name = file_path.stem
 
         # Find the curriculum table
-        table_match = re.search(
-            r"Week\s+.*?\s+Topic\s+.*?\s+Learning objectives\s*\n(.*?)(?=\n\n|\Z)",
-            content,
-            re.DOTALL | re.IGNORECASE
-        )
+        table = curriculum_table(content)
 
-        if not table_match:
+        if not table:
             return
 
-        table_content = table_match.group(1)
+        table_content = table.text(content)
 
         # Parse each row (tab-separated or multi-space separated)
         rows = table_content.strip().split('\n')
@@ -340,9 +333,16 @@ class UniversalChunker:
     - FreeFormParser: Generic markdown fallback
     """
 
-    def __init__(self, file_path: str | Path):
-        """Initialize with file path."""
+    def __init__(self, file_path: str | Path, cache: ParseCache | None = None):
+        """
+        Initialize with file path.
+
+        Args:
+            file_path: File to chunk
+            cache: Parsed chunks by file and content hash (None to always parse)
+        """
         self.file_path = Path(file_path)
+        self.cache = cache
 
         # Register parsers in priority order (most specific first)
         self.parsers: list[FormatParser] = [
@@ -386,6 +386,13 @@ class UniversalChunker:
 
         content = self.file_path.read_text(encoding='utf-8')
 
+        if self.cache:
+            content_hash = content_sha256(content)
+            cached = self.cache.get(self, self.file_path, content_hash)
+            if cached is not None:
+                yield from cached
+                return
+
         # Detect format and get parser
         detected_format, parser = self.detect_format(content)
 
@@ -393,16 +400,29 @@ class UniversalChunker:
         # print(f"[UniversalChunker] {self.file_path.name} → {detected_format.value}")
 
         # Parse and yield chunks
-        yield from parser.parse(content, self.file_path)
+        if self.cache:
+            chunks = list(parser.parse(content, self.file_path))
+            self.cache.put(self, self.file_path, content_hash, chunks)
+            yield from chunks
+        else:
+            yield from parser.parse(content, self.file_path)
 
     @staticmethod
-    def chunk_directory(directory: str | Path, pattern: str = "**/*.{txt,md}") -> Iterator[TextChunk]:
+    def chunk_directory(
+        directory: str | Path,
+        pattern: str = "**/*.{txt,md}",
+        cache_path: str | Path | None = DEFAULT_PARSE_CACHE_PATH,
+    ) -> Iterator[TextChunk]:
         """
         Chunk all files in a directory matching the pattern.
 
+        Files whose content is unchanged since the last run are served from
+        the parse cache.
+
         Args:
             directory: Root directory to scan
             pattern: Glob pattern for files (default: all .txt and .md files)
+            cache_path: Parse cache file (None disables the cache)
 
         Yields:
             TextChunk objects from all matching files
@@ -412,15 +432,20 @@ class UniversalChunker:
         # Expand pattern to handle both .txt and .md
         patterns = pattern.split(',') if ',' in pattern else [pattern]
 
-        for pat in patterns:
-            for file_path in directory.glob(pat.strip()):
-                if file_path.is_file():
-                    chunker = UniversalChunker(file_path)
-                    try:
-                        yield from chunker.chunk_file()
-                    except Exception as e:
-                        print(f"[ERROR] Failed to parse {file_path.name}: {e}")
-                        continue
+        cache = ParseCache(cache_path) if cache_path else None
+        try:
+            for pat in patterns:
+                for file_path in directory.glob(pat.strip()):
+                    if file_path.is_file():
+                        chunker = UniversalChunker(file_path, cache)
+                        try:
+                            yield from chunker.chunk_file()
+                        except Exception as e:
+                            print(f"[ERROR] Failed to parse {file_path.name}: {e}")
+                            continue
+        finally:
+            if cache:
+                cache.close()
 
 
 # Convenience function for backward compatibility
@@ -0,0 +1,162 @@
+"""
+Parsed course file cache.
+
+Course directories are re-ingested whole, although usually only a file or
+two changed. Parsed results are stored in SQLite per parser and file,
+together with the SHA-256 of the content they were parsed from. A lookup
+with a different hash is a miss, so only changed files are parsed again.
+
+Results are also stamped with a fingerprint of the parser's code (see
+code_version), so editing a parser, the tokenizer it calls or the result
+types it builds invalidates what older code stored.
+
+Results are pickled. The cache is a local working file, like the PDF page
+cache, and is never shared; a payload that no longer unpickles is a miss.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import logging
+import pickle
+import sqlite3
+import sys
+import threading
+from functools import cache
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_SRC_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PARSE_CACHE_PATH = _SRC_ROOT.parent / "data" / "parse_cache" / "parsed.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parsed (
+    parser TEXT NOT NULL,
+    source TEXT NOT NULL,
+    code_version TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (parser, source)
+) WITHOUT ROWID;
+"""
+
+# Raised by pickle.loads on payloads written by other code
+_UNPICKLE_ERRORS = (
+    pickle.UnpicklingError,
+    AttributeError,
+    EOFError,
+    ImportError,
+    IndexError,
+    TypeError,
+    ValueError,
+)
+
+
+def content_sha256(content: str) -> str:
+    """SHA-256 of decoded file content."""
+    return hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def _src_module(module: ModuleType | None) -> bool:
+    path = getattr(module, "__file__", None)
+    return path is not None and Path(path).resolve().is_relative_to(_SRC_ROOT)
+
+
+@cache
+def code_version(parser_type: type) -> str:
+    """
+    Fingerprint of the code behind a parser's results.
+
+    Hashes the source of the modules defining the parser's class hierarchy
+    and of the src modules they import from (tokenizer, result models).
+    """
+    modules: dict[str, ModuleType] = {}
+    for cls in parser_type.__mro__:
+        module = sys.modules.get(cls.__module__)
+        if not _src_module(module):
+            continue
+        modules[module.__name__] = module
+        for value in vars(module).values():
+            dependency = value if inspect.ismodule(value) else inspect.getmodule(value)
+            if _src_module(dependency):
+                modules[dependency.__name__] = dependency
+    digest = hashlib.sha256()
+    for name in sorted(modules):
+        digest.update(name.encode())
+        digest.update(Path(modules[name].__file__).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class ParseCache:
+    """SQLite store of parse results keyed by (parser, file), valid for one content hash."""
+
+    def __init__(self, path: str | Path = DEFAULT_PARSE_CACHE_PATH):
+        """
+        Open (and create) the cache.
+
+        Args:
+            path: SQLite file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(parsed)")}
+        if columns and "code_version" not in columns:
+            self._conn.execute("DROP TABLE parsed")  # Written before results were versioned
+        self._conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, parser: object, source: str | Path, content_hash: str) -> Any | None:
+        """
+        Cached result of ``parser`` parsing ``source``.
+
+        Returns:
+            The result, or None if the file was not parsed with this content
+            and parser code
+        """
+        parser_type = type(parser)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT code_version, content_hash, payload FROM parsed "
+                "WHERE parser = ? AND source = ?",
+                (parser_type.__qualname__, str(source)),
+            ).fetchone()
+        if row is None or row[:2] != (code_version(parser_type), content_hash):
+            self.misses += 1
+            return None
+        try:
+            result = pickle.loads(row[2])
+        except _UNPICKLE_ERRORS as e:
+            logger.warning(f"Unreadable parse cache entry for {source}: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def put(self, parser: object, source: str | Path, content_hash: str, result: Any) -> None:
+        """Store the result of ``parser`` parsing ``source``, replacing older entries."""
+        parser_type = type(parser)
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parsed "
+                "(parser, source, code_version, content_hash, payload) VALUES (?, ?, ?, ?, ?)",
+                (
+                    parser_type.__qualname__,
+                    str(source),
+                    code_version(parser_type),
+                    content_hash,
+                    payload,
+                ),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
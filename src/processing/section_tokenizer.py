@@ -0,0 +1,332 @@
+"""
+Single-pass section tokenizer for course files.
+
+The course parsers used to cut sections with lazy patterns that rescan the
+rest of the text from every candidate start:
+- ``Before\\s+Class(.+?)(?=During\\s+Class|Workshop|$)`` with re.DOTALL;
+- the Moodle week pattern;
+- the curriculum table header ``Week\\s+.*?\\s+Topic\\s+.*?\\s+Learning
+  objectives``.
+The table header backtracks catastrophically when a file mentions "week"
+and "topic" often.
+
+Here a file is scanned once with one combined pattern of its markers. The
+result is a tree: sections, each with named subsection spans. Spans are cut
+from the marker offsets. They reproduce the matches of the previous
+patterns exactly, so parsed output is unchanged.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+_WHITESPACE = re.compile(r"\s*")
+
+
+@dataclass(frozen=True)
+class Span:
+    """Character range [start, end) of a file."""
+
+    start: int
+    end: int
+
+    def text(self, content: str) -> str:
+        return content[self.start : self.end]
+
+
+@dataclass
+class Section:
+    """A section of a file and its named subsections."""
+
+    span: Span
+    children: dict[str, Span] = field(default_factory=dict)
+
+
+def _whitespace_end(content: str, pos: int) -> int:
+    """End of the whitespace run starting at ``pos``."""
+    return _WHITESPACE.match(content, pos).end()
+
+
+def _last_non_whitespace(content: str, pos: int) -> int:
+    """Index of the last non-whitespace character before ``pos`` (-1 if none)."""
+    i = pos - 1
+    while i >= 0 and content[i].isspace():
+        i -= 1
+    return i
+
+
+# =============================================================================
+# EASV curriculum weeks
+# =============================================================================
+
+# Each pattern starts with a lookahead for the markers' first characters: the
+# regex engine can then skip ahead, where an alternation is tried at every offset
+_EASV_TOKENS = re.compile(
+    r"(?=[bdw\d])(?:"
+    r"(?P<week>(?=W\d+[\s\-:]|Week\s+\d+|^\d+\s+[\-:]))"
+    r"|(?P<before_class>Before\s+Class)"
+    r"|(?P<during_class>During\s+Class)"
+    r"|(?P<workshop>Workshop))",
+    re.MULTILINE | re.IGNORECASE,
+)
+
+# A class block runs until a marker of another kind (or the section end)
+_EASV_BLOCK_ENDS = {
+    "before_class": ("during_class", "workshop"),
+    "during_class": ("workshop", "before_class"),
+    "workshop": ("before_class", "during_class"),
+}
+
+
+def easv_sections(content: str) -> list[Section]:
+    """
+    Week sections of an EASV curriculum file.
+
+    Sections are the pieces ``re.split`` cut at week headers (W35, Week 35,
+    "35 -"). This includes the text before the first week. Children are the
+    ``before_class``, ``during_class`` and ``workshop`` blocks that the
+    previous Before/During/Workshop patterns captured. A block may keep the
+    section's trailing newline, so compare them after strip().
+
+    Args:
+        content: File content
+
+    Returns:
+        Sections in file order
+    """
+    bounds = [0]
+    starts: dict[str, list[int]] = {kind: [] for kind in _EASV_BLOCK_ENDS}
+    ends: dict[str, list[int]] = {kind: [] for kind in _EASV_BLOCK_ENDS}
+    for match in _EASV_TOKENS.finditer(content):
+        kind = match.lastgroup
+        if kind == "week":
+            bounds.append(match.start())
+        else:
+            starts[kind].append(match.start())
+            ends[kind].append(match.end())
+    bounds.append(len(content))
+
+    sections = []
+    for start, end in zip(bounds, bounds[1:]):
+        section = Section(Span(start, end))
+        for kind, stops in _EASV_BLOCK_ENDS.items():
+            i = bisect_left(starts[kind], start)
+            if i == len(starts[kind]) or starts[kind][i] >= end:
+                continue
+            body = ends[kind][i]
+            if body == end:
+                continue  # The block needs at least one character
+            stop = end
+            for other in stops:
+                j = bisect_left(starts[other], body + 1)
+                if j < len(starts[other]):
+                    stop = min(stop, starts[other][j])
+            section.children[kind] = Span(body, stop)
+        sections.append(section)
+    return sections
+
+
+# =============================================================================
+# Moodle weekly course plans
+# =============================================================================
+
+
+@lru_cache(maxsize=8)
+def _moodle_tokens(headers: tuple[str, ...]) -> re.Pattern[str]:
+    first = "".join(sorted({"W"} | {h[0] for h in headers if h}))
+    return re.compile(
+        "(?=[" + re.escape(first) + "])(?:"
+        r"(?=(?P<week>W\d+\s*-(?P<header>\s*\d+\.\s*\w+)?))"
+        r"|(?P<section>" + "|".join(re.escape(h) for h in headers) + "))"
+    )
+
+
+def _section_children(markers: list[tuple[int, int, str]], end: int) -> dict[str, Span]:
+    """Text after each section header up to the next; a repeated header keeps its last text."""
+    children: dict[str, Span] = {}
+    for i, (_, body, name) in enumerate(markers):
+        stop = markers[i + 1][0] if i + 1 < len(markers) else end
+        children[name] = Span(body, stop)
+    return children
+
+
+def section_spans(text: str, headers: list[str]) -> dict[str, Span]:
+    """
+    Sections of a Moodle week by header (Before Class, Quiz, ...).
+
+    Args:
+        text: Week text
+        headers: Section headers, in match priority order
+
+    Returns:
+        Span after each header, in first-seen order
+    """
+    pattern = _moodle_tokens(tuple(headers))
+    markers = [
+        (m.start(), m.end(), m["section"])
+        for m in pattern.finditer(text)
+        if m["section"] is not None
+    ]
+    return _section_children(markers, len(text))
+
+
+def moodle_weeks(content: str, headers: list[str]) -> list[Section]:
+    """
+    Weeks of a Moodle course plan, each with its sections.
+
+    A week starts at a "W## - ##. Word" header and runs to the next "W## -"
+    at or after the header's end, as the previous week pattern matched.
+
+    Args:
+        content: File content
+        headers: Section headers, in match priority order
+
+    Returns:
+        Weeks in file order
+    """
+    weeks: list[Section] = []
+    week_start = header_end = -1
+    markers: list[tuple[int, int, str]] = []
+
+    def close(end: int) -> None:
+        weeks.append(Section(Span(week_start, end), _section_children(markers, end)))
+
+    for match in _moodle_tokens(tuple(headers)).finditer(content):
+        if match["section"] is not None:
+            if week_start >= 0:
+                markers.append((match.start(), match.end(), match["section"]))
+            continue
+        pos = match.start()
+        if week_start >= 0:
+            if pos < header_end:
+                continue
+            close(pos)
+            week_start = -1
+        if match["header"] is not None:
+            week_start, header_end = pos, match.end("header")
+            markers = []
+    if week_start >= 0:
+        close(len(content))
+    return weeks
+
+
+# =============================================================================
+# Curriculum tables
+# =============================================================================
+
+_TABLE_TOKENS = re.compile(
+    r"(?=[wtl])(?:(?P<week>week)|(?P<topic>topic)|(?P<objectives>learning objectives))",
+    re.IGNORECASE,
+)
+
+
+def _table_tokens(content: str) -> dict[str, list[int]]:
+    tokens: dict[str, list[int]] = {"week": [], "topic": [], "objectives": []}
+    for match in _TABLE_TOKENS.finditer(content):
+        tokens[match.lastgroup].append(match.start())
+    return tokens
+
+
+def has_curriculum_table(content: str) -> bool:
+    """
+    Whether ``Week\\s+.*?\\s+Topic\\s+.*?\\s+Learning objectives`` (re.I) matches.
+
+    Each gap between the words must start and end with whitespace and be at
+    least two characters long. Its text between the outer whitespace runs
+    must not contain a newline (``.`` stops there, ``\\s`` does not).
+    """
+    tokens = _table_tokens(content)
+    if not (tokens["week"] and tokens["topic"] and tokens["objectives"]):
+        return False
+    newlines = [m.start() for m in re.finditer("\n", content)]
+
+    def same_line(first: int, last: int) -> bool:
+        return bisect_left(newlines, first) == bisect_left(newlines, last)
+
+    week_ends = [a + 4 for a in tokens["week"] if content[a + 4 : a + 5].isspace()]
+    week_end_set = set(week_ends)
+    objectives = [s for s in tokens["objectives"] if s and content[s - 1].isspace()]
+    objective_set = set(objectives)
+
+    for t in tokens["topic"]:
+        if not t or not content[t - 1].isspace():
+            continue
+        last = _last_non_whitespace(content, t)
+        # Week ... Topic: whitespace-only gap, or a gap whose text sits on one line
+        if not (last + 1 in week_end_set and t - last >= 3):
+            i = bisect_right(week_ends, last) - 1
+            if i < 0 or not same_line(_whitespace_end(content, week_ends[i]), last):
+                continue
+        t_end = t + 5
+        if not content[t_end : t_end + 1].isspace():
+            continue
+        first = _whitespace_end(content, t_end)
+        if first in objective_set and first - t_end >= 2:
+            return True
+        j = bisect_right(objectives, first)
+        if j < len(objectives) and same_line(
+            first, _last_non_whitespace(content, objectives[j])
+        ):
+            return True
+    return False
+
+
+def curriculum_table(content: str) -> Span | None:
+    """
+    Table body the previous curriculum table pattern captured.
+
+    Emulates ``Week\\s+.*?\\s+Topic\\s+.*?\\s+Learning objectives\\s*\\n(.*?)
+    (?=\\n\\n|\\Z)`` with re.DOTALL | re.IGNORECASE. It takes the first week,
+    and for it the topic and header the backtracking search would reach
+    first. The body starts after the last newline following the header and
+    ends at the next blank line.
+
+    Returns:
+        Body span, or None without a table header
+    """
+    tokens = _table_tokens(content)
+    if not (tokens["week"] and tokens["topic"] and tokens["objectives"]):
+        return None
+
+    # Headers that can end a match: whitespace before, a newline in the run after
+    bodies: dict[int, int] = {}
+    for s in tokens["objectives"]:
+        if s and content[s - 1].isspace():
+            end = s + len("learning objectives")
+            newline = content.rfind("\n", end, _whitespace_end(content, end))
+            if newline >= 0:
+                bodies[s] = newline + 1
+    objectives = sorted(bodies)
+
+    def first_after(word_end: int, candidates: list[int], accepted) -> int | None:
+        """First word reached after a gap, in the order the regex backtracks."""
+        run_end = _whitespace_end(content, word_end)
+        if run_end == word_end:
+            return None
+        i = bisect_left(candidates, run_end + 1)
+        if i < len(candidates):
+            return candidates[i]
+        if run_end - word_end >= 2 and accepted(run_end):
+            return run_end
+        return None
+
+    topic_objectives: dict[int, int] = {}
+    for t in tokens["topic"]:
+        if t and content[t - 1].isspace():
+            s = first_after(t + 5, objectives, bodies.__contains__)
+            if s is not None:
+                topic_objectives[t] = s
+    topics = sorted(topic_objectives)
+    if not topics:
+        return None
+
+    for a in tokens["week"]:
+        t = first_after(a + 4, topics, topic_objectives.__contains__)
+        if t is not None:
+            start = bodies[topic_objectives[t]]
+            end = content.find("\n\n", start)
+            return Span(start, len(content) if end < 0 else end)
+    return None
@@ -3,26 +3,35 @@ Quiz Pool Manager for question pool management and selection.
 
 Handles question pool creation, randomized selection with reproducible seeds,
 and pool statistics for quiz generation.
+
+Selection never touches the global ``random`` state: each seed defines a
+permutation of question IDs, md5(salt || id), which the database orders
+by, so concurrent requests cannot disturb each other and only the
+selected rows leave the database.
 """
 
 from __future__ import annotations
 
 import hashlib
-import random
+import secrets
 from dataclasses import dataclass
 from decimal import Decimal
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import and_, select
+from sqlalchemy import Select, Text, and_, cast, func, literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from src.db.models import (
+    CleanAtom,
     QuizDefinition,
     QuizQuestion,
 )
 from src.db.models.prerequisites import QuestionPool
 
+_STREAM_BATCH = 200  # Rows fetched per round-trip when streaming a pool
+
 
 @dataclass
 class PoolStatistics:
@@ -217,7 +226,9 @@ class QuizPoolManager:
         Select random questions from a pool.
 
         Uses a reproducible seed for consistent selection across attempts
-        while ensuring different users get different questions.
+        while ensuring different users get different questions. Questions
+        are ranked by a hash of the seed and question ID in the database,
+        so only the selected rows are loaded and no shared RNG is touched.
 
         Args:
             pool_id: Pool to select from
@@ -231,19 +242,60 @@ class QuizPoolManager:
         Returns:
             List of SelectedQuestion objects
         """
-        # Build query
+        key = self._selection_key(self._selection_salt(seed))
         query = (
-            select(QuizQuestion)
-            .options(selectinload(QuizQuestion.atom))
-            .where(
-                and_(
-                    QuizQuestion.pool_id == pool_id,
-                    QuizQuestion.is_active,
-                )
+            self._candidate_query(
+                [pool_id], exclude_ids, difficulty_range, question_types, knowledge_types
             )
+            .add_columns(key)
+            .order_by(key)
+            .limit(count)
+        )
+        result = await self.session.execute(query)
+        return [self._to_selected(row) for row in result]
+
+    def _create_seed(self, seed: str | int) -> int:
+        """Create a reproducible integer seed from string or int."""
+        if isinstance(seed, int):
+            return seed
+
+        # Hash string to create seed
+        hash_bytes = hashlib.sha256(str(seed).encode()).digest()
+        return int.from_bytes(hash_bytes[:8], byteorder="big")
+
+    def _selection_salt(self, seed: str | int | None) -> str:
+        """Per-request ranking salt (fresh each call when unseeded)."""
+        if seed is None:
+            return secrets.token_hex(8)
+        return f"{self._create_seed(seed)}:"
+
+    @staticmethod
+    def _selection_key(salt: str) -> Any:
+        """Rank of a question for a salt: md5(salt || id), a seeded permutation."""
+        return func.md5(literal(salt, Text) + cast(QuizQuestion.id, Text)).label("selection_key")
+
+    @staticmethod
+    def _candidate_query(
+        pool_ids: list[UUID],
+        exclude_ids: list[UUID] | None = None,
+        difficulty_range: tuple[float, float] | None = None,
+        question_types: list[str] | None = None,
+        knowledge_types: list[str] | None = None,
+    ) -> Select:
+        """Active questions of the pools matching the filters (selected columns only)."""
+        query = (
+            select(
+                QuizQuestion.id,
+                QuizQuestion.atom_id,
+                QuizQuestion.question_type,
+                QuizQuestion.difficulty,
+                QuizQuestion.question_content,
+                CleanAtom.front,
+            )
+            .outerjoin(CleanAtom, CleanAtom.id == QuizQuestion.atom_id)
+            .where(QuizQuestion.pool_id.in_(pool_ids), QuizQuestion.is_active)
         )
 
-        # Apply filters
         if exclude_ids:
             query = query.where(QuizQuestion.id.notin_(exclude_ids))
 
@@ -262,45 +314,18 @@ class QuizPoolManager:
         if knowledge_types:
             query = query.where(QuizQuestion.knowledge_type.in_(knowledge_types))
 
-        result = await self.session.execute(query)
-        questions = list(result.scalars().all())
-
-        if not questions:
-            return []
-
-        # Apply random selection with seed
-        if seed is not None:
-            # Create reproducible seed
-            seed_value = self._create_seed(seed)
-            random.seed(seed_value)
-
-        # Shuffle and select
-        random.shuffle(questions)
-        selected = questions[:count]
-
-        # Reset random state
-        random.seed()
-
-        return [
-            SelectedQuestion(
-                question_id=q.id,
-                atom_id=q.atom_id,
-                question_type=q.question_type,
-                difficulty=float(q.difficulty) if q.difficulty else None,
-                front=q.atom.front if q.atom else "",
-                question_content=q.question_content,
-            )
-            for q in selected
-        ]
-
-    def _create_seed(self, seed: str | int) -> int:
-        """Create a reproducible integer seed from string or int."""
-        if isinstance(seed, int):
-            return seed
-
-        # Hash string to create seed
-        hash_bytes = hashlib.sha256(str(seed).encode()).digest()
-        return int.from_bytes(hash_bytes[:8], byteorder="big")
+        return query
+
+    @staticmethod
+    def _to_selected(row: Any) -> SelectedQuestion:
+        return SelectedQuestion(
+            question_id=row.id,
+            atom_id=row.atom_id,
+            question_type=row.question_type,
+            difficulty=float(row.difficulty) if row.difficulty else None,
+            front=row.front or "",
+            question_content=row.question_content,
+        )
 
     async def select_questions_for_quiz(
         self,
@@ -313,7 +338,8 @@ class QuizPoolManager:
         Select questions for a quiz attempt.
 
         Uses user_id and attempt_number to create a reproducible but unique
-        question set for each attempt.
+        question set for each attempt. All of the quiz's pools are ranked
+        together in one query.
 
         Args:
             quiz_definition_id: Quiz definition ID
@@ -341,25 +367,15 @@ class QuizPoolManager:
 
         # Create seed from user_id, quiz_id, and attempt_number
         seed = f"{user_id}:{quiz_definition_id}:{attempt_number}"
-
-        # Collect questions from all pools
-        all_questions = []
-        for pool_id in pool_ids:
-            questions = await self.select_questions(
-                pool_id=pool_id,
-                count=quiz_def.question_count * 2,  # Select extra for filtering
-                seed=seed,
-                exclude_ids=previous_question_ids,
-            )
-            all_questions.extend(questions)
-
-        # Final selection based on quiz count
-        random.seed(self._create_seed(seed))
-        random.shuffle(all_questions)
-        selected = all_questions[: quiz_def.question_count]
-        random.seed()
-
-        return selected
+        key = self._selection_key(self._selection_salt(seed))
+        query = (
+            self._candidate_query(pool_ids, exclude_ids=previous_question_ids)
+            .add_columns(key)
+            .order_by(key)
+            .limit(quiz_def.question_count)
+        )
+        result = await self.session.execute(query)
+        return [self._to_selected(row) for row in result]
 
     # ========================================
     # Pool Statistics
@@ -537,6 +553,11 @@ class QuizPoolManager:
         """
         Select questions with enforced diversity across types and knowledge areas.
 
+        Each question type gets an equal share of ``count`` (at least one),
+        taken in seeded order; the rest is filled in the same order. The
+        pool is read once, in rank order, and the read stops as soon as the
+        selection is complete.
+
         Args:
             pool_id: Pool to select from
             count: Number of questions to select
@@ -549,44 +570,46 @@ class QuizPoolManager:
         Returns:
             Diversified list of questions
         """
+        if count <= 0:
+            return []
 
-        # Get all available questions
-        all_questions = await self.select_questions(
-            pool_id=pool_id,
-            count=count * 5,  # Get extra for diversity selection
-            seed=seed,
+        # Type sizes from the (pool_id, question_type) index
+        result = await self.session.execute(
+            select(QuizQuestion.question_type, func.count())
+            .where(QuizQuestion.pool_id == pool_id, QuizQuestion.is_active)
+            .group_by(QuizQuestion.question_type)
         )
+        type_sizes = dict(result.all())
+        if not type_sizes:
+            return []
 
-        if len(all_questions) <= count:
-            return all_questions
-
-        # Group by type
-        by_type: dict[str, list[SelectedQuestion]] = {}
-        for q in all_questions:
-            by_type.setdefault(q.question_type, []).append(q)
-
-        # Calculate target counts per type
-        type_count = len(by_type)
-        base_per_type = max(1, count // type_count)
-
-        selected = []
-        remaining_count = count
-
-        # First pass: ensure type diversity
-        for question_type, questions in by_type.items():
-            take = min(base_per_type, len(questions), remaining_count)
-            selected.extend(questions[:take])
-            remaining_count -= take
-
-        # Fill remaining with random selection
-        used_ids = {q.question_id for q in selected}
-        remaining_questions = [q for q in all_questions if q.question_id not in used_ids]
-
-        if seed:
-            random.seed(self._create_seed(seed))
-        random.shuffle(remaining_questions)
-        random.seed()
+        per_type = max(1, count // len(type_sizes))
+        quota = min(count, sum(min(per_type, size) for size in type_sizes.values()))
 
-        selected.extend(remaining_questions[:remaining_count])
+        key = self._selection_key(self._selection_salt(seed))
+        query = (
+            self._candidate_query([pool_id])
+            .add_columns(key)
+            .order_by(key)
+            .execution_options(yield_per=_STREAM_BATCH)
+        )
 
-        return selected[:count]
+        picked: list[SelectedQuestion] = []
+        skipped: list[SelectedQuestion] = []
+        taken: dict[str, int] = {}
+        stream = await self.session.stream(query)
+        try:
+            async for row in stream:
+                question = self._to_selected(row)
+                question_type = question.question_type
+                if len(picked) < quota and taken.get(question_type, 0) < per_type:
+                    picked.append(question)
+                    taken[question_type] = taken.get(question_type, 0) + 1
+                elif len(skipped) < count - quota:
+                    skipped.append(question)
+                if len(picked) == quota and len(picked) + len(skipped) >= count:
+                    break
+        finally:
+            await stream.close()
+
+        return picked + skipped[: count - len(picked)]
@@ -15,11 +15,12 @@ Ratio increases with more struggling sections (capped at 50% remediation).
 
 from __future__ import annotations
 
-import random
 from dataclasses import dataclass, field
 
 from loguru import logger
 
+from src.core.interleaving import InterleaveEngine, MaxConsecutive, facet
+
 
 @dataclass
 class StudyCard:
@@ -62,6 +63,8 @@ class InterleaveConfig:
     sections_for_max_ratio: int = 5
     new_cards_per_session: int = 30
     max_remediation_cards: int = 15
+    max_consecutive_same_section: int = 2
+    seed: int | None = None  # Fixed seed for reproducible session order
 
 
 class AdaptiveInterleaver:
@@ -180,16 +183,20 @@ class AdaptiveInterleaver:
         Returns:
             List of cards in study order
         """
-        result = []
-
         # Due reviews first (in their original order)
-        result.extend(queue.due_reviews)
-
-        # Mix new and remediation
-        mixed = queue.new_cards + queue.remediation_cards
-        random.shuffle(mixed)
-
-        result.extend(mixed)
+        result = list(queue.due_reviews)
+
+        # Mix new and remediation in proportion, spreading sections apart
+        engine = InterleaveEngine(
+            group_by=facet("source"),
+            constraints=[
+                MaxConsecutive(facet("section_id"), self.config.max_consecutive_same_section)
+            ],
+            policy="proportional",
+            shuffle=True,
+            seed=self.config.seed,
+        )
+        result.extend(engine.interleave(queue.new_cards + queue.remediation_cards))
 
         return result
 
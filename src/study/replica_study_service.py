@@ -0,0 +1,343 @@
+"""
+Study Service backed by the local SQLite replica.
+
+Session queries (war, adaptive) and review recording run against
+LocalReplica so a session can start without a database server. Reviews
+are queued in the replica's outbox and written back by ReplicaSync.
+
+Usage:
+    service = open_study_service()  # synced replica, or StudyService
+    atoms = service.get_adaptive_session(limit=20)
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Engine
+
+from src.db.replica import DEFAULT_REPLICA_PATH, LocalReplica, ReplicaSync
+from src.study.study_service import StudyService
+
+QUIZ_TYPES = ("mcq", "true_false", "parsons", "matching")
+
+_ATOM_COLUMNS = """
+    ca.id,
+    ca.card_id,
+    ca.atom_type,
+    ca.front,
+    ca.back,
+    ca.concept_id,
+    ca.ccna_section_id,
+    cs.module_number,
+    cs.title as section_title,
+    cc.name as concept_name,
+    COALESCE(ca.anki_difficulty, 0.5) as difficulty,
+    COALESCE(ca.anki_stability, 0) as stability,
+    COALESCE(ca.anki_lapses, 0) as lapses,
+    COALESCE(ca.anki_review_count, 0) as review_count,
+    ca.anki_due_date
+"""
+
+_QUIZ_FILTER = """
+    ca.atom_type IN ('mcq', 'true_false', 'parsons', 'matching')
+    AND ca.front IS NOT NULL
+    AND ca.front != ''
+    AND ca.id NOT IN :exclude_ids
+"""
+
+# v_struggle_priority (migration 018) ported to SQLite
+STRUGGLE_SQL = f"""
+    SELECT {_ATOM_COLUMNS},
+        'struggle' as source,
+        (sw.weight * 2.0)
+            + (1.0 - MIN(COALESCE(ca.anki_stability, 0) / 30.0, 1.0))
+            + (1.0 / (1 + julianday('now') - julianday(ca.updated_at))) as priority_score
+    FROM learning_atoms ca
+    JOIN ccna_sections cs ON ca.ccna_section_id = cs.section_id
+    JOIN struggle_weights sw
+        ON sw.module_number = cs.module_number
+        AND (sw.section_id IS NULL OR sw.section_id = cs.section_id)
+    LEFT JOIN concepts cc ON ca.concept_id = cc.id
+    WHERE sw.user_id = :user_id
+      AND sw.weight >= 0.5
+      AND {_QUIZ_FILTER}
+      {{filters}}
+    ORDER BY priority_score DESC
+    LIMIT :limit
+"""
+
+DUE_SQL = f"""
+    SELECT {_ATOM_COLUMNS}, 'due' as source
+    FROM learning_atoms ca
+    JOIN ccna_sections cs ON ca.ccna_section_id = cs.section_id
+    LEFT JOIN concepts cc ON ca.concept_id = cc.id
+    WHERE {_QUIZ_FILTER}
+      AND ca.anki_due_date IS NOT NULL
+      AND ca.anki_due_date <= DATE('now', 'localtime')
+      {{filters}}
+    ORDER BY ca.anki_due_date ASC, ca.anki_stability ASC
+    LIMIT :limit
+"""
+
+NEW_SQL = f"""
+    SELECT {_ATOM_COLUMNS}, 'new' as source
+    FROM learning_atoms ca
+    JOIN ccna_sections cs ON ca.ccna_section_id = cs.section_id
+    LEFT JOIN concepts cc ON ca.concept_id = cc.id
+    WHERE {_QUIZ_FILTER}
+      AND COALESCE(ca.anki_review_count, 0) = 0
+      {{filters}}
+    ORDER BY cs.display_order, RANDOM()
+    LIMIT :limit
+"""
+
+WAR_SQL = f"""
+    SELECT {_ATOM_COLUMNS}
+    FROM learning_atoms ca
+    JOIN ccna_sections cs ON ca.ccna_section_id = cs.section_id
+    LEFT JOIN concepts cc ON ca.concept_id = cc.id
+    WHERE cs.module_number IN :modules
+      AND ca.atom_type IN :types
+      AND ca.front IS NOT NULL
+      AND ca.front != ''
+    ORDER BY
+        CASE ca.atom_type
+            WHEN 'numeric' THEN 1
+            WHEN 'parsons' THEN 2
+            WHEN 'mcq' THEN 3
+            WHEN 'true_false' THEN 4
+            ELSE 5
+        END,
+        COALESCE(ca.anki_stability, 0) ASC,
+        COALESCE(ca.anki_lapses, 0) DESC,
+        RANDOM()
+    LIMIT :limit
+"""
+
+
+def _session_filters(
+    modules: list[int] | None,
+    sections: list[str] | None,
+    source_file: str | None,
+) -> tuple[str, dict[str, Any], list[str]]:
+    """AND-clause, params and expanding param names for the session filters."""
+    parts: list[str] = []
+    params: dict[str, Any] = {}
+    expanding: list[str] = []
+    if modules:
+        parts.append("cs.module_number IN :filter_modules")
+        params["filter_modules"] = list(modules)
+        expanding.append("filter_modules")
+    if sections:
+        conditions = []
+        for i, sec in enumerate(sections):
+            p = f"sec_{i}"
+            conditions.append(f"(ca.ccna_section_id = :{p} OR ca.ccna_section_id LIKE :{p}_pfx)")
+            params[p] = sec
+            params[f"{p}_pfx"] = f"{sec}.%"
+        parts.append(f"({' OR '.join(conditions)})")
+    if source_file:
+        parts.append("ca.source_file = :filter_source_file")
+        params["filter_source_file"] = source_file
+    clause = (" AND " + " AND ".join(parts)) if parts else ""
+    return clause, params, expanding
+
+
+class ReplicaStudyService(StudyService):
+    """
+    StudyService whose session and review paths use the local replica.
+
+    Dashboard and mastery methods are inherited unchanged and still read
+    PostgreSQL; only the per-card hot paths are served locally.
+    """
+
+    def __init__(self, replica: LocalReplica, user_id: str = "default"):
+        """
+        Initialize replica-backed study service.
+
+        Args:
+            replica: Synced local replica
+            user_id: User identifier (default for now)
+        """
+        super().__init__(user_id=user_id)
+        self.replica = replica
+
+    def get_war_session(
+        self,
+        modules: list[int],
+        limit: int = 50,
+        prioritize_types: list[str] | None = None,
+    ) -> list[dict]:
+        """Get War Mode atoms from the replica (see StudyService.get_war_session)."""
+        if prioritize_types is None:
+            prioritize_types = ["numeric", "parsons", "mcq", "true_false"]
+
+        query = text(WAR_SQL).bindparams(
+            bindparam("modules", expanding=True), bindparam("types", expanding=True)
+        )
+        with self.replica.engine.connect() as conn:
+            rows = conn.execute(
+                query, {"modules": list(modules), "types": list(prioritize_types), "limit": limit}
+            )
+            atoms = [self._to_atom(dict(row._mapping)) for row in rows]
+
+        for atom in atoms:
+            atom.pop("source")
+        logger.info(
+            f"War session (replica): {len(atoms)} atoms from modules {modules} "
+            f"(types: {prioritize_types})"
+        )
+        return atoms
+
+    def get_adaptive_session(
+        self,
+        limit: int = 20,
+        include_new: bool = True,
+        interleave: bool = True,
+        use_struggles: bool = True,
+        exclude_ids: list[str] | None = None,
+        modules: list[int] | None = None,
+        sections: list[str] | None = None,
+        source_file: str | None = None,
+    ) -> list[dict]:
+        """Get Adaptive Mode atoms from the replica (see StudyService.get_adaptive_session)."""
+        clause, filter_params, expanding = _session_filters(modules, sections, source_file)
+        excluded = list(exclude_ids or [])
+
+        def fetch(conn: Any, sql: str, row_limit: int, **params: Any) -> list[dict]:
+            if row_limit <= 0:
+                return []
+            query = text(sql.format(filters=clause)).bindparams(
+                bindparam("exclude_ids", expanding=True),
+                *(bindparam(name, expanding=True) for name in expanding),
+            )
+            rows = conn.execute(
+                query,
+                {"exclude_ids": excluded, "limit": row_limit, **filter_params, **params},
+            )
+            found = [dict(row._mapping) for row in rows]
+            excluded.extend(str(a["id"]) for a in found)
+            return found
+
+        with self.replica.engine.connect() as conn:
+            struggle_atoms = (
+                fetch(conn, STRUGGLE_SQL, limit // 2, user_id=self.user_id) if use_struggles else []
+            )
+            remaining_due = limit - len(struggle_atoms)
+            due_limit = remaining_due if not include_new else int(remaining_due * 0.7)
+            due_atoms = fetch(conn, DUE_SQL, due_limit)
+            new_atoms = (
+                fetch(conn, NEW_SQL, limit - len(struggle_atoms) - len(due_atoms))
+                if include_new
+                else []
+            )
+
+        for atom in new_atoms:
+            atom.update(stability=0, lapses=0, review_count=0, anki_due_date=None)
+
+        all_atoms = self._apply_type_quotas(struggle_atoms + due_atoms + new_atoms, limit)
+        if interleave and len(all_atoms) > 1:
+            all_atoms = self._interleave_atoms_by_type(all_atoms)
+        atoms = [self._to_atom(row) for row in all_atoms]
+
+        logger.debug(
+            f"Adaptive session (replica): {len(atoms)} atoms "
+            f"({len(struggle_atoms)} struggle, {len(due_atoms)} due, {len(new_atoms)} new)"
+        )
+        return atoms
+
+    def record_interaction(
+        self,
+        atom_id: str,
+        is_correct: bool,
+        response_time_ms: int,
+        user_answer: str = "",
+        session_type: str = "cortex",
+        atom_type: str = "",
+    ) -> dict:
+        """
+        Record a review against the replica and queue it for push.
+
+        Mastery aggregates and transfer testing are recomputed server-side
+        once the review is pushed.
+        """
+        update = self.replica.record_review(
+            atom_id,
+            self.user_id,
+            is_correct,
+            response_time_ms,
+            user_answer=user_answer,
+            session_type=session_type,
+        )
+        result = {
+            "atom_id": atom_id,
+            "is_correct": is_correct,
+            "mastery_delta": 0.0,
+            "pending_sync": True,
+            **update,
+        }
+        if atom_type:
+            result["atom_type"] = atom_type
+        return result
+
+    @staticmethod
+    def _to_atom(row: dict) -> dict:
+        return {
+            "id": str(row["id"]),
+            "card_id": row["card_id"],
+            "atom_type": row["atom_type"],
+            "front": row["front"],
+            "back": row["back"] or "",
+            "concept_id": str(row["concept_id"]) if row.get("concept_id") else None,
+            "section_id": row.get("ccna_section_id"),
+            "module_number": row["module_number"],
+            "section_title": row["section_title"],
+            "concept_name": row["concept_name"] or "Unknown",
+            "difficulty": row["difficulty"],
+            "stability": row["stability"],
+            "lapses": row["lapses"],
+            "review_count": row["review_count"],
+            "source": row.get("source", "unknown"),
+        }
+
+
+def open_study_service(
+    user_id: str = "default",
+    replica_path: Path | str = DEFAULT_REPLICA_PATH,
+    prefer_replica: bool = True,
+    source: Engine | None = None,
+) -> StudyService:
+    """
+    StudyService for a session: the replica if it is fresh or the server is
+    unreachable, else PostgreSQL.
+
+    A synced replica is brought up to date (push, then delta pull) before it
+    is handed out. When that sync fails against a reachable server, the
+    session runs on PostgreSQL instead of on stale rows.
+
+    Args:
+        user_id: User identifier
+        replica_path: Replica SQLite file
+        prefer_replica: Use the replica when available
+        source: PostgreSQL engine (default src.db.database.engine)
+    """
+    if prefer_replica:
+        try:
+            replica = LocalReplica.open_existing(replica_path)
+        except Exception as e:
+            logger.debug(f"Local replica unavailable: {e}")
+            replica = None
+        if replica is not None:
+            sync = ReplicaSync(replica, source=source)
+            if not sync.server_available():
+                logger.info("Database unreachable, studying from the local replica")
+                return ReplicaStudyService(replica, user_id=user_id)
+            result = sync.sync()
+            if result.success:
+                return ReplicaStudyService(replica, user_id=user_id)
+            logger.warning(f"Replica sync failed, using the database: {'; '.join(result.errors)}")
+    return StudyService(user_id=user_id)
@@ -27,6 +27,8 @@ from typing import Optional
 from loguru import logger
 from sqlalchemy import text
 
+from src.core.interleaving import InterleaveEngine, MinSpacing
+
 
 # =============================================================================
 # FSRS-4 CONSTANTS (Optimized for CCNA-style content)
@@ -354,37 +356,15 @@ class SmartInterleaver:
             random.shuffle(atoms)
             return atoms
 
-        # Tag atoms with concept clusters
-        for atom in atoms:
-            atom["_clusters"] = self._identify_clusters(atom)
-
-        result = []
-        remaining = atoms.copy()
-        recent_clusters: list[set] = []
-
-        while remaining:
-            # Find atom that doesn't overlap with recent clusters
-            best_atom = None
-            best_score = -1
-
-            for atom in remaining:
-                score = self._spacing_score(atom["_clusters"], recent_clusters)
-                if score > best_score:
-                    best_score = score
-                    best_atom = atom
-
-            if best_atom:
-                result.append(best_atom)
-                remaining.remove(best_atom)
-                recent_clusters.append(best_atom["_clusters"])
-                if len(recent_clusters) > spacing_factor:
-                    recent_clusters.pop(0)
-
-        # Clean up temp tags
-        for atom in result:
-            atom.pop("_clusters", None)
-
-        return result
+        # Atoms sharing a concept cluster wait spacing_factor positions;
+        # otherwise input order is kept
+        tagged = [(frozenset(self._identify_clusters(atom)), atom) for atom in atoms]
+        engine = InterleaveEngine(
+            group_by=lambda pair: pair[0],
+            constraints=[MinSpacing(lambda pair: pair[0], spacing_factor)],
+            policy="order",
+        )
+        return [atom for _, atom in engine.interleave(tagged)]
 
     def _identify_clusters(self, atom: dict) -> set[str]:
         """Identify which concept clusters an atom belongs to."""
@@ -399,23 +379,6 @@ class SmartInterleaver:
 
         return clusters or {"general"}
 
-    def _spacing_score(
-        self,
-        atom_clusters: set[str],
-        recent_clusters: list[set[str]],
-    ) -> float:
-        """Score how well-spaced this atom is from recent ones."""
-        if not recent_clusters:
-            return 1.0
-
-        # Higher score = less overlap with recent
-        overlaps = sum(
-            len(atom_clusters & recent) / max(1, len(atom_clusters))
-            for recent in recent_clusters
-        )
-
-        return 1.0 - (overlaps / len(recent_clusters))
-
 
 class RetentionEngine:
     """
@@ -0,0 +1,169 @@
+"""
+Struggle Priority Store.
+
+Maintains struggle_priority (migration 035), the materialized join behind
+v_struggle_priority: one row per (struggle weight, atom in the weight's
+module or section) carrying the weight and the time-independent part of
+the priority score.
+
+The score is
+    weight * 2 + (1 - min(stability / 30, 1)) + 1 / (1 + days since atom update)
+The last term decays with the clock, so only the atom's updated_at is
+stored and the view adds the term at read time; nothing is recomputed as
+time passes.
+
+On PostgreSQL the table is maintained by statement-level triggers on
+learning_atoms, struggle_weights and ccna_sections (migration 039), so
+every writer keeps it current. This module computes the same rows for
+databases without those triggers (SQLite) and for repairs: refresh_atoms
+and refresh_modules recompute a subset, rebuild recomputes everything.
+All methods take a SQLAlchemy connection or session and never commit.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import bindparam, text
+
+_REFRESH_CHUNK = 1000
+
+# Rows of the 018 view before the recency term (v_struggle_priority_rows in
+# migration 039). PostgreSQL's LEAST ignores NULLs, so a NULL stability
+# counts as fully stable (the CASE keeps that and runs on SQLite too).
+PRIORITY_ROWS_SQL = """
+    INSERT INTO struggle_priority (
+        weight_id, atom_id, user_id, module_number, section_id,
+        struggle_weight, base_score, atom_updated_at
+    )
+    SELECT
+        sw.id, la.id, sw.user_id, cs.module_number, cs.section_id, sw.weight,
+        (sw.weight * 2.0) + (1.0 - CASE WHEN la.anki_stability < 30
+                                        THEN la.anki_stability / 30.0 ELSE 1.0 END),
+        la.updated_at
+    FROM learning_atoms la
+    JOIN ccna_sections cs ON la.ccna_section_id = cs.section_id
+    JOIN struggle_weights sw
+        ON sw.module_number = cs.module_number
+        AND (sw.section_id IS NULL OR sw.section_id = cs.section_id)
+"""
+
+
+class StrugglePriorityStore:
+    """
+    Struggle priority rows computed outside the database triggers.
+
+    Example:
+        store = get_struggle_priority_store()
+        store.ensure_built(conn)
+        rows = conn.execute(text("SELECT * FROM v_struggle_priority ..."))
+
+    Without the migration 039 triggers, callers refresh the atoms and
+    modules they changed with ``refresh_atoms`` and ``refresh_modules``.
+    """
+
+    def __init__(self) -> None:
+        self._built = False
+
+    def ensure_built(self, conn: Any) -> bool:
+        """
+        Rebuild the table if it is empty (checked once per process).
+
+        Returns:
+            True if a rebuild ran (the caller commits it)
+        """
+        if self._built:
+            return False
+        rebuilt = False
+        if conn.execute(text("SELECT 1 FROM struggle_priority LIMIT 1")).first() is None:
+            self.rebuild(conn)
+            rebuilt = True
+        self._built = True
+        return rebuilt
+
+    def rebuild(self, conn: Any) -> int:
+        """
+        Recompute every row from the source tables.
+
+        Repairs the table where the migration 039 triggers are missing or
+        were disabled during a load.
+
+        Returns:
+            Number of rows written
+        """
+        started = time.perf_counter()
+        conn.execute(text("DELETE FROM struggle_priority"))
+        rows = conn.execute(text(PRIORITY_ROWS_SQL)).rowcount
+        self._built = True
+        elapsed = time.perf_counter() - started
+        logger.info(f"Rebuilt struggle priority ({rows} rows) in {elapsed:.2f}s")
+        return rows
+
+    def refresh_atoms(
+        self,
+        conn: Any,
+        atom_ids: Iterable[str] | None = None,
+        card_ids: Iterable[str] | None = None,
+    ) -> int:
+        """
+        Recompute the rows of atoms selected by id or Anki card_id.
+
+        Returns:
+            Number of rows written
+        """
+        if atom_ids is not None:
+            keys = [str(k) for k in atom_ids]
+            delete_sql = "DELETE FROM struggle_priority WHERE atom_id IN :keys"
+            where = " WHERE la.id IN :keys"
+        else:
+            keys = [str(k) for k in card_ids or ()]
+            delete_sql = (
+                "DELETE FROM struggle_priority WHERE atom_id IN "
+                "(SELECT id FROM learning_atoms WHERE card_id IN :keys)"
+            )
+            where = " WHERE la.card_id IN :keys"
+        return self._refresh(conn, delete_sql, where, keys)
+
+    def refresh_modules(self, conn: Any, module_numbers: Iterable[int]) -> int:
+        """
+        Recompute the rows of every atom in the given modules.
+
+        Struggle weights only join atoms of their own module, so a weight
+        change never affects rows outside it.
+
+        Returns:
+            Number of rows written
+        """
+        keys = sorted({int(m) for m in module_numbers})
+        return self._refresh(
+            conn,
+            "DELETE FROM struggle_priority WHERE module_number IN :keys",
+            " WHERE cs.module_number IN :keys",
+            keys,
+        )
+
+    @staticmethod
+    def _refresh(conn: Any, delete_sql: str, where: str, keys: list[Any]) -> int:
+        delete = text(delete_sql).bindparams(bindparam("keys", expanding=True))
+        insert = text(PRIORITY_ROWS_SQL + where).bindparams(bindparam("keys", expanding=True))
+        rows = 0
+        for start in range(0, len(keys), _REFRESH_CHUNK):
+            chunk = {"keys": keys[start : start + _REFRESH_CHUNK]}
+            conn.execute(delete, chunk)
+            rows += conn.execute(insert, chunk).rowcount
+        return rows
+
+
+# Global store instance
+_store: StrugglePriorityStore | None = None
+
+
+def get_struggle_priority_store() -> StrugglePriorityStore:
+    """Get or create the global struggle priority store."""
+    global _store
+    if _store is None:
+        _store = StrugglePriorityStore()
+    return _store
@@ -18,8 +18,11 @@ from sqlalchemy import text
 
 from src.adaptive.models import TYPE_QUOTAS, TYPE_MINIMUM
 from src.adaptive.neuro_model import CognitiveDiagnosis
+from src.core.interleaving import InterleaveEngine, MaxConsecutive, facet
 from src.study.interleaver import AdaptiveInterleaver
 from src.study.mastery_calculator import MasteryCalculator
+from src.study.struggle_priority import get_struggle_priority_store
+from src.study.summary_store import get_summary_store
 
 
 @dataclass
@@ -111,14 +114,16 @@ class StudyService:
     Coordinates between database, mastery calculator, and interleaver.
     """
 
-    def __init__(self, user_id: str = "default"):
+    def __init__(self, user_id: str = "default", interleave_seed: int | None = None):
         """
         Initialize study service.
 
         Args:
             user_id: User identifier (default for now)
+            interleave_seed: Seed for reproducible session order (None = random)
         """
         self.user_id = user_id
+        self.interleave_seed = interleave_seed
         self.mastery_calculator = MasteryCalculator()
         self.interleaver = AdaptiveInterleaver()
 
@@ -129,94 +134,28 @@ class StudyService:
         Returns:
             DailyStudySummary with all relevant stats
         """
-        from src.db.database import engine
-
-        with engine.connect() as conn:
-            # Get due reviews count (simplified - would need Anki sync)
-            due_result = conn.execute(
-                text("""
-                SELECT COUNT(*) as cnt
-                FROM learning_atoms
-                WHERE anki_due_date IS NOT NULL
-                  AND anki_due_date <= CURRENT_DATE
-            """)
-            )
-            due_reviews = due_result.fetchone().cnt or 0
-
-            # Get learned/total atom counts
-            progress_result = conn.execute(
-                text("""
-                SELECT
-                    COUNT(*) FILTER (WHERE anki_review_count > 0) as learned,
-                    COUNT(*) as total
-                FROM learning_atoms
-                WHERE ccna_section_id IS NOT NULL
-            """)
-            )
-            progress_row = progress_result.fetchone()
-            learned_count = progress_row.learned or 0
-            total_count = progress_row.total or 0
-
-            # Get remediation stats
-            remediation_result = conn.execute(
-                text("""
-                SELECT
-                    COUNT(*) as sections,
-                    COALESCE(SUM(atoms_struggling), 0) as atoms
-                FROM ccna_section_mastery
-                WHERE needs_remediation = TRUE
-                  AND user_id = :user_id
-            """),
-                {"user_id": self.user_id},
-            )
-            rem_row = remediation_result.fetchone()
-            remediation_sections = rem_row.sections or 0
-            remediation_atoms = rem_row.atoms or 0
-
-            # Get overall mastery
-            mastery_result = conn.execute(
-                text("""
-                SELECT AVG(mastery_score) as avg_mastery
-                FROM ccna_section_mastery
-                WHERE user_id = :user_id
-            """),
-                {"user_id": self.user_id},
-            )
-            overall_mastery = mastery_result.fetchone().avg_mastery or 0
-
-            # Get current progress (first incomplete section)
-            current_result = conn.execute(
-                text("""
-                SELECT s.module_number, s.section_id
-                FROM ccna_sections s
-                LEFT JOIN ccna_section_mastery m
-                    ON s.section_id = m.section_id AND m.user_id = :user_id
-                WHERE COALESCE(m.is_completed, FALSE) = FALSE
-                ORDER BY s.display_order
-                LIMIT 1
-            """),
-                {"user_id": self.user_id},
-            )
-            current_row = current_result.fetchone()
-            current_module = current_row.module_number if current_row else 1
-            current_section = current_row.section_id if current_row else "1.2"
+        snapshot = get_summary_store().snapshot(self.user_id)
+
+        atoms = snapshot.atom_totals(has_section=True)
+        due_reviews = snapshot.due_count()
+        learned_count = atoms["reviewed_count"]
+        total_count = atoms["atom_count"]
+
+        sections = snapshot.section_totals()
+        remediation_sections = sections.remediation_sections
+        remediation_atoms = sections.remediation_atoms
+        overall_mastery = (
+            sections.mastery_sum / sections.mastery_rows if sections.mastery_rows else 0
+        )
+        current_module, current_section = snapshot.current_section() or (1, "1.2")
 
-            # Estimate time (30 sec per card)
-            unlearned = max(0, total_count - learned_count)
-            total_cards = due_reviews + min(30, unlearned) + min(15, remediation_atoms)
-            estimated_minutes = max(1, total_cards // 2)
+        # Estimate time (30 sec per card)
+        unlearned = max(0, total_count - learned_count)
+        total_cards = due_reviews + min(30, unlearned) + min(15, remediation_atoms)
+        estimated_minutes = max(1, total_cards // 2)
 
-            # Streak (simplified - count consecutive days with sessions)
-            streak_result = conn.execute(
-                text("""
-                SELECT COUNT(DISTINCT session_date) as streak
-                FROM ccna_study_sessions
-                WHERE user_id = :user_id
-                  AND session_date >= CURRENT_DATE - INTERVAL '30 days'
-            """),
-                {"user_id": self.user_id},
-            )
-            streak_days = streak_result.fetchone().streak or 0
+        # Streak (simplified - distinct session days in the last 30)
+        streak_days = snapshot.streak_days
 
         return DailyStudySummary(
             date=date.today(),
@@ -239,71 +178,51 @@ class StudyService:
         Returns:
             List of ModuleSummary for modules 1-17
         """
-        from src.db.database import engine
-
+        snapshot = get_summary_store().snapshot(self.user_id)
         summaries = []
 
-        with engine.connect() as conn:
-            result = conn.execute(
-                text("""
-                SELECT
-                    s.module_number,
-                    COUNT(DISTINCT s.section_id) as total_sections,
-                    COUNT(DISTINCT CASE WHEN m.is_completed THEN s.section_id END) as sections_completed,
-                    COALESCE(AVG(m.mastery_score), 0) as avg_mastery,
-                    COALESCE(SUM(m.atoms_total), 0) as atoms_total,
-                    COALESCE(SUM(m.atoms_mastered), 0) as atoms_mastered,
-                    COALESCE(SUM(m.atoms_learning), 0) as atoms_learning,
-                    COALESCE(SUM(m.atoms_struggling), 0) as atoms_struggling,
-                    COALESCE(SUM(m.atoms_new), 0) as atoms_new,
-                    COUNT(CASE WHEN m.needs_remediation THEN 1 END) as remediation_count
-                FROM ccna_sections s
-                LEFT JOIN ccna_section_mastery m
-                    ON s.section_id = m.section_id AND m.user_id = :user_id
-                WHERE s.level = 2  -- Main sections only for summary
-                GROUP BY s.module_number
-                ORDER BY s.module_number
-            """),
-                {"user_id": self.user_id},
-            )
-
-            # Module titles
-            module_titles = {
-                1: "Networking Today",
-                2: "Basic Switch and End Device Configuration",
-                3: "Protocols and Models",
-                4: "Physical Layer",
-                5: "Number Systems",
-                6: "Data Link Layer",
-                7: "Ethernet Switching",
-                8: "Network Layer",
-                9: "Address Resolution",
-                10: "Basic Router Configuration",
-                11: "IPv4 Addressing",
-                12: "IPv6 Addressing",
-                13: "ICMP",
-                14: "Transport Layer",
-                15: "Application Layer",
-                16: "Network Security Fundamentals",
-                17: "Build a Small Network",
-            }
+        # Module titles
+        module_titles = {
+            1: "Networking Today",
+            2: "Basic Switch and End Device Configuration",
+            3: "Protocols and Models",
+            4: "Physical Layer",
+            5: "Number Systems",
+            6: "Data Link Layer",
+            7: "Ethernet Switching",
+            8: "Network Layer",
+            9: "Address Resolution",
+            10: "Basic Router Configuration",
+            11: "IPv4 Addressing",
+            12: "IPv6 Addressing",
+            13: "ICMP",
+            14: "Transport Layer",
+            15: "Application Layer",
+            16: "Network Security Fundamentals",
+            17: "Build a Small Network",
+        }
 
-            for row in result:
-                summaries.append(
-                    ModuleSummary(
-                        module_number=row.module_number,
-                        title=module_titles.get(row.module_number, f"Module {row.module_number}"),
-                        total_sections=row.total_sections,
-                        sections_completed=row.sections_completed or 0,
-                        avg_mastery=round(row.avg_mastery or 0, 1),
-                        atoms_total=row.atoms_total or 0,
-                        atoms_mastered=row.atoms_mastered or 0,
-                        atoms_learning=row.atoms_learning or 0,
-                        atoms_struggling=row.atoms_struggling or 0,
-                        atoms_new=row.atoms_new or 0,
-                        sections_needing_remediation=row.remediation_count or 0,
-                    )
+        # Main sections (level 2) only for summary
+        for module_number in snapshot.modules():
+            rollup = snapshot.sections.get((module_number, 2))
+            if rollup is None:
+                continue
+            avg_mastery = rollup.mastery_sum / rollup.mastery_rows if rollup.mastery_rows else 0
+            summaries.append(
+                ModuleSummary(
+                    module_number=module_number,
+                    title=module_titles.get(module_number, f"Module {module_number}"),
+                    total_sections=rollup.section_count,
+                    sections_completed=rollup.completed_count,
+                    avg_mastery=round(avg_mastery, 1),
+                    atoms_total=rollup.atoms_total,
+                    atoms_mastered=rollup.atoms_mastered,
+                    atoms_learning=rollup.atoms_learning,
+                    atoms_struggling=rollup.atoms_struggling,
+                    atoms_new=rollup.atoms_new,
+                    sections_needing_remediation=rollup.remediation_sections,
                 )
+            )
 
         return summaries
 
@@ -394,8 +313,14 @@ class StudyService:
                 {"user_id": self.user_id},
             )
             count = result.fetchone().count
+            try:
+                with conn.begin_nested():
+                    get_summary_store().refresh_sections(conn, self.user_id)
+            except Exception as e:
+                logger.debug(f"Could not refresh dashboard rollups: {e}")
 
             conn.commit()
+        get_summary_store().invalidate(self.user_id)
 
         logger.info(f"Refreshed mastery for {count} sections")
         return count
@@ -1168,6 +1093,7 @@ class StudyService:
 
             # 1. Get struggle-weighted atoms first (if enabled and table exists)
             if use_struggles:
+                self._ensure_struggle_priority(conn)
                 try:
                     # Build filter clause for struggle query (uses vsp.* aliases)
                     struggle_filter_parts = []
@@ -1402,24 +1328,12 @@ class StudyService:
         Implements spaced interleaving - avoids presenting
         consecutive atoms from the same module or of the same type.
         """
-        if len(atoms) <= 1:
-            return atoms
-
-        # Group by module
-        by_module: dict[int, list] = {}
-        for atom in atoms:
-            mod = atom.get("module_number", 0)
-            by_module.setdefault(mod, []).append(atom)
-
-        # Round-robin interleave
-        result = []
-        modules = list(by_module.keys())
-        while any(by_module.values()):
-            for mod in modules:
-                if by_module.get(mod):
-                    result.append(by_module[mod].pop(0))
-
-        return result
+        engine = InterleaveEngine(
+            group_by=facet("module_number", 0),
+            constraints=[MaxConsecutive(facet("atom_type"), 1)],
+            seed=self.interleave_seed,
+        )
+        return engine.interleave(atoms)
 
     def _apply_type_quotas(self, atoms: list[dict], limit: int) -> list[dict]:
         """
@@ -1486,7 +1400,8 @@ class StudyService:
         Interleave atoms by type to prevent consecutive same-type questions.
 
         Uses round-robin selection across atom types for optimal
-        cognitive diversity and reduced fatigue.
+        cognitive diversity and reduced fatigue, shuffled within each type
+        and limited to two consecutive atoms from one module or concept.
 
         Args:
             atoms: List of atom dicts to interleave
@@ -1494,31 +1409,17 @@ class StudyService:
         Returns:
             Reordered list with type-based interleaving
         """
-        if len(atoms) <= 1:
-            return atoms
-
-        # Group by type
-        by_type: dict[str, list[dict]] = {}
-        for atom in atoms:
-            atype = atom.get("atom_type", "unknown")
-            by_type.setdefault(atype, []).append(atom)
-
-        # Shuffle within each type group for variety
-        import random
-        for type_atoms in by_type.values():
-            random.shuffle(type_atoms)
-
-        # Round-robin interleave by type
-        result = []
-        type_order = ["mcq", "matching", "true_false", "parsons"]  # Conceptual first
-        types_with_atoms = [t for t in type_order if by_type.get(t)]
-
-        while any(by_type.get(t) for t in types_with_atoms):
-            for atype in types_with_atoms:
-                if by_type.get(atype):
-                    result.append(by_type[atype].pop(0))
-
-        return result
+        engine = InterleaveEngine(
+            group_by=facet("atom_type", "unknown"),
+            constraints=[
+                MaxConsecutive(facet("module_number"), 2),
+                MaxConsecutive(facet("concept_id"), 2),
+            ],
+            group_order=["mcq", "matching", "true_false", "parsons"],  # Conceptual first
+            shuffle=True,
+            seed=self.interleave_seed,
+        )
+        return engine.interleave(atoms)
 
     def record_interaction(
         self,
@@ -1651,6 +1552,8 @@ class StudyService:
 
             try:
                 conn.commit()
+                # The rollup triggers updated the tables; drop the cached dashboard
+                get_summary_store().invalidate()
             except Exception:
                 pass
 
@@ -1665,6 +1568,16 @@ class StudyService:
         )
         return result
 
+    def _ensure_struggle_priority(self, conn) -> None:
+        """Build the materialized struggle priority rows on first use."""
+        try:
+            with conn.begin_nested():
+                rebuilt = get_struggle_priority_store().ensure_built(conn)
+            if rebuilt:
+                conn.commit()
+        except Exception as e:
+            logger.debug(f"Struggle priority table unavailable: {e}")
+
     def _update_transfer_testing(
         self,
         atom_id: str,
@@ -0,0 +1,619 @@
+"""
+Dashboard Summary Store.
+
+Pre-aggregated rollups behind the study dashboard, so opening `cortex`
+(and every hub redraw) reads a few small tables instead of scanning
+learning_atoms several times:
+
+- dashboard_atom_rollup: atom counters per (module, atom_type, has_section)
+- dashboard_due_rollup: atoms per anki_due_date (due count = prefix sum)
+- dashboard_section_rollup: per-user section mastery per (module, level)
+
+On PostgreSQL, triggers keep the rollups current for every writer
+(migration 040): learning_atoms statements apply their rows' differences
+to the atom and due rollups, section changes recompute them, and
+ccna_section_mastery changes drop the user's section rollup, which is
+recomputed on the next read. This module computes the same rollups for
+databases without those triggers (SQLite) and for repairs: atom_facts and
+apply_atom_changes for a set of atoms, rebuild for everything.
+
+Readers get a DashboardSnapshot, cached in-process per user for
+``max_age`` seconds. Write paths invalidate the cache after they commit,
+so a rolled-back write is never served.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import bindparam, text
+
+DEFAULT_MAX_AGE_SECONDS = 60.0
+_FACTS_CHUNK = 1000
+
+# Rollup facts for individual atoms. A NULL nls comparison counts as not
+# mastered, matching the original dashboard aggregates.
+ATOM_FACTS_SQL = """
+    SELECT
+        la.id AS atom_id,
+        COALESCE(cs.module_number, 0) AS module_number,
+        COALESCE(la.atom_type, '') AS atom_type,
+        (la.ccna_section_id IS NOT NULL) AS has_section,
+        CASE WHEN la.front IS NOT NULL AND la.front != '' THEN 1 ELSE 0 END AS authored,
+        CASE WHEN la.anki_review_count > 0 THEN 1 ELSE 0 END AS reviewed,
+        CASE WHEN la.nls_correct_count > la.nls_incorrect_count THEN 1 ELSE 0 END AS nls_mastered,
+        la.anki_due_date AS due_date
+    FROM learning_atoms la
+    LEFT JOIN ccna_sections cs ON cs.section_id = la.ccna_section_id
+"""
+
+ATOM_ROLLUP_SQL = """
+    SELECT
+        COALESCE(cs.module_number, 0) AS module_number,
+        COALESCE(la.atom_type, '') AS atom_type,
+        (la.ccna_section_id IS NOT NULL) AS has_section,
+        COUNT(*) AS atom_count,
+        SUM(CASE WHEN la.front IS NOT NULL AND la.front != '' THEN 1 ELSE 0 END) AS authored_count,
+        SUM(CASE WHEN la.anki_review_count > 0 THEN 1 ELSE 0 END) AS reviewed_count,
+        SUM(CASE WHEN la.nls_correct_count > la.nls_incorrect_count THEN 1 ELSE 0 END)
+            AS nls_mastered_count
+    FROM learning_atoms la
+    LEFT JOIN ccna_sections cs ON cs.section_id = la.ccna_section_id
+    GROUP BY 1, 2, 3
+"""
+
+DUE_ROLLUP_SQL = """
+    SELECT anki_due_date AS due_date, COUNT(*) AS atom_count
+    FROM learning_atoms
+    WHERE anki_due_date IS NOT NULL
+    GROUP BY anki_due_date
+"""
+
+SECTION_ROWS_SQL = """
+    SELECT
+        s.section_id, s.module_number, s.level, s.display_order,
+        m.mastery_score, m.is_completed, m.needs_remediation,
+        m.atoms_total, m.atoms_mastered, m.atoms_learning, m.atoms_struggling, m.atoms_new
+    FROM ccna_sections s
+    LEFT JOIN ccna_section_mastery m
+        ON s.section_id = m.section_id AND m.user_id = :user_id
+    {module_filter}
+"""
+
+STREAK_SQL = """
+    SELECT COUNT(DISTINCT session_date) AS streak
+    FROM ccna_study_sessions
+    WHERE user_id = :user_id
+      AND session_date >= CURRENT_DATE - INTERVAL '30 days'
+"""
+
+STRUGGLE_SQL = """
+    SELECT sw.module_number, cs.module_number AS section_module, sw.weight
+    FROM struggle_weights sw
+    LEFT JOIN ccna_sections cs ON cs.section_id = sw.section_id
+"""
+
+_ATOM_COUNTERS = ("atom_count", "authored_count", "reviewed_count", "nls_mastered_count")
+_SECTION_COUNTERS = (
+    "section_count",
+    "completed_count",
+    "mastery_rows",
+    "mastery_sum",
+    "atoms_total",
+    "atoms_mastered",
+    "atoms_learning",
+    "atoms_struggling",
+    "atoms_new",
+    "remediation_sections",
+    "remediation_atoms",
+)
+
+AtomKey = tuple[int, str, bool]  # (module_number, atom_type, has_section)
+
+
+@dataclass
+class AtomFacts:
+    """One atom's contribution to the atom and due rollups."""
+
+    module_number: int
+    atom_type: str
+    has_section: bool
+    authored: bool
+    reviewed: bool
+    nls_mastered: bool
+    due_date: date | None
+
+    @property
+    def key(self) -> AtomKey:
+        return (self.module_number, self.atom_type, self.has_section)
+
+    def counters(self) -> tuple[int, int, int, int]:
+        return (1, int(self.authored), int(self.reviewed), int(self.nls_mastered))
+
+    @classmethod
+    def from_row(cls, row: Any) -> AtomFacts:
+        return cls(
+            module_number=int(row.module_number),
+            atom_type=row.atom_type,
+            has_section=bool(row.has_section),
+            authored=bool(row.authored),
+            reviewed=bool(row.reviewed),
+            nls_mastered=bool(row.nls_mastered),
+            due_date=_as_date(row.due_date),
+        )
+
+
+@dataclass
+class SectionRollup:
+    """Aggregated section mastery for one (module, level)."""
+
+    section_count: int = 0
+    completed_count: int = 0
+    mastery_rows: int = 0
+    mastery_sum: float = 0.0
+    atoms_total: int = 0
+    atoms_mastered: int = 0
+    atoms_learning: int = 0
+    atoms_struggling: int = 0
+    atoms_new: int = 0
+    remediation_sections: int = 0
+    remediation_atoms: int = 0
+    first_incomplete_order: int | None = None
+    first_incomplete_section: str | None = None
+
+
+@dataclass
+class DashboardSnapshot:
+    """Everything the dashboard needs, loaded from the rollup tables."""
+
+    user_id: str
+    atoms: dict[AtomKey, list[int]] = field(default_factory=dict)
+    due: dict[date, int] = field(default_factory=dict)
+    sections: dict[tuple[int, int], SectionRollup] = field(default_factory=dict)
+    struggles: list[tuple[int, int | None, float]] = field(default_factory=list)
+    streak_days: int = 0
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    # --- Atom counters ---
+
+    def atom_totals(
+        self,
+        module_number: int | None = None,
+        atom_types: Iterable[str] | None = None,
+        has_section: bool | None = None,
+    ) -> dict[str, int]:
+        """Summed atom counters over the matching rollup rows."""
+        types = set(atom_types) if atom_types is not None else None
+        totals = dict.fromkeys(_ATOM_COUNTERS, 0)
+        for (module, atom_type, in_section), counts in self.atoms.items():
+            if module_number is not None and module != module_number:
+                continue
+            if types is not None and atom_type not in types:
+                continue
+            if has_section is not None and in_section != has_section:
+                continue
+            for name, value in zip(_ATOM_COUNTERS, counts):
+                totals[name] += value
+        return totals
+
+    def authored_by_type(self) -> dict[str | None, int]:
+        """Atoms with a non-empty front per atom_type, largest first."""
+        counts: dict[str | None, int] = {}
+        for (_, atom_type, _), values in self.atoms.items():
+            counts[atom_type or None] = counts.get(atom_type or None, 0) + values[1]
+        ranked = sorted(counts.items(), key=lambda item: -item[1])
+        return {atom_type: count for atom_type, count in ranked if count > 0}
+
+    def due_count(self, on: date | None = None) -> int:
+        on = on or date.today()
+        return sum(count for due_date, count in self.due.items() if due_date <= on)
+
+    # --- Section mastery ---
+
+    def modules(self) -> list[int]:
+        return sorted({module for module, _ in self.sections})
+
+    def section_totals(
+        self, module_number: int | None = None, level: int | None = None
+    ) -> SectionRollup:
+        """Summed section rollups; first_incomplete_* is the earliest overall."""
+        total = SectionRollup()
+        for (module, lvl), rollup in self.sections.items():
+            if module_number is not None and module != module_number:
+                continue
+            if level is not None and lvl != level:
+                continue
+            for name in _SECTION_COUNTERS:
+                setattr(total, name, getattr(total, name) + getattr(rollup, name))
+            if rollup.first_incomplete_order is not None and (
+                total.first_incomplete_order is None
+                or rollup.first_incomplete_order < total.first_incomplete_order
+            ):
+                total.first_incomplete_order = rollup.first_incomplete_order
+                total.first_incomplete_section = rollup.first_incomplete_section
+        return total
+
+    def current_section(self) -> tuple[int, str] | None:
+        """(module_number, section_id) of the first incomplete section in display order."""
+        best = None
+        for (module, _), rollup in self.sections.items():
+            if rollup.first_incomplete_order is not None and (
+                best is None or rollup.first_incomplete_order < best[0]
+            ):
+                best = (rollup.first_incomplete_order, module, rollup.first_incomplete_section)
+        return None if best is None else (best[1], best[2])
+
+    # --- Struggle weights ---
+
+    def struggle_zones(self, min_weight: float = 0.5, limit: int = 5) -> list[dict]:
+        """Modules with struggle weight above ``min_weight``, worst first."""
+        by_module: dict[int, list[float]] = {}
+        for module, _, weight in self.struggles:
+            if weight > min_weight:
+                by_module.setdefault(module, []).append(weight)
+        zones = [
+            {
+                "module_number": module,
+                "weight": max(weights),
+                "avg_priority": sum(weights) / len(weights),
+            }
+            for module, weights in by_module.items()
+        ]
+        zones.sort(key=lambda zone: -zone["weight"])
+        return zones[:limit]
+
+    def max_struggle_by_section_module(self) -> dict[int, float]:
+        """Highest weight among struggle rows attached to each module's sections."""
+        result: dict[int, float] = {}
+        for _, section_module, weight in self.struggles:
+            if section_module is not None:
+                result[section_module] = max(result.get(section_module, 0.0), weight)
+        return result
+
+
+class DashboardSummaryStore:
+    """
+    Dashboard rollups with an in-process snapshot cache.
+
+    Example:
+        store = get_summary_store()
+        snapshot = store.snapshot("default")
+        print(snapshot.due_count())
+
+    Write paths call ``invalidate`` after committing. Without the migration
+    040 triggers they also call ``atom_facts`` before and after changing
+    atoms and pass both to ``apply_atom_changes``. All methods take a
+    SQLAlchemy connection or session and never commit.
+    """
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE_SECONDS):
+        """
+        Initialize store.
+
+        Args:
+            max_age: Seconds a cached snapshot is served before reloading
+                (picks up writes made by other processes)
+        """
+        self.max_age = max_age
+        self._snapshots: dict[str, DashboardSnapshot] = {}
+
+    # =========================================================================
+    # Reads
+    # =========================================================================
+
+    def snapshot(self, user_id: str = "default", conn: Any = None) -> DashboardSnapshot:
+        """Cached dashboard snapshot for a user (loads on miss or expiry)."""
+        cached = self._snapshots.get(user_id)
+        if cached is not None and time.monotonic() - cached.loaded_at < self.max_age:
+            return cached
+
+        if conn is None:
+            from src.db.database import engine
+
+            with engine.connect() as connection:
+                snapshot = self._load(connection, user_id)
+                connection.commit()
+        else:
+            snapshot = self._load(conn, user_id)
+        self._snapshots[user_id] = snapshot
+        return snapshot
+
+    def invalidate(self, user_id: str | None = None) -> None:
+        """Drop cached snapshots (one user, or all)."""
+        if user_id is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(user_id, None)
+
+    def _load(self, conn: Any, user_id: str) -> DashboardSnapshot:
+        snapshot = DashboardSnapshot(user_id=user_id)
+        try:
+            with conn.begin_nested():
+                atom_rows, due_rows, sections = self._read_rollups(conn, user_id)
+        except Exception as e:
+            # Rollup tables missing (migration 034 not applied): aggregate directly
+            logger.warning(f"Dashboard rollups unavailable, aggregating source tables: {e}")
+            atom_rows = conn.execute(text(ATOM_ROLLUP_SQL)).fetchall()
+            due_rows = conn.execute(text(DUE_ROLLUP_SQL)).fetchall()
+            sections = self._compute_sections(conn, user_id)
+
+        for row in atom_rows:
+            key = (int(row[0]), row[1], bool(row[2]))
+            snapshot.atoms[key] = [int(v or 0) for v in row[3:]]
+        for row in due_rows:
+            if row[1]:
+                snapshot.due[_as_date(row[0])] = int(row[1])
+        snapshot.sections = sections
+
+        snapshot.streak_days = self._optional_scalar(conn, STREAK_SQL, {"user_id": user_id})
+        try:
+            with conn.begin_nested():
+                snapshot.struggles = [
+                    (int(r[0]), None if r[1] is None else int(r[1]), float(r[2] or 0))
+                    for r in conn.execute(text(STRUGGLE_SQL))
+                ]
+        except Exception as e:
+            logger.debug(f"Struggle weights unavailable for dashboard: {e}")
+
+        return snapshot
+
+    def _read_rollups(
+        self, conn: Any, user_id: str
+    ) -> tuple[list[Any], list[Any], dict[tuple[int, int], SectionRollup]]:
+        """Rollup rows, rebuilding empty rollups from the source tables first."""
+        atom_sql = text(
+            f"SELECT module_number, atom_type, has_section, {', '.join(_ATOM_COUNTERS)} "
+            "FROM dashboard_atom_rollup"
+        )
+        atom_rows = conn.execute(atom_sql).fetchall()
+        if not atom_rows:
+            self.rebuild(conn)
+            atom_rows = conn.execute(atom_sql).fetchall()
+        due_rows = conn.execute(
+            text("SELECT due_date, atom_count FROM dashboard_due_rollup")
+        ).fetchall()
+
+        section_sql = text("SELECT * FROM dashboard_section_rollup WHERE user_id = :user_id")
+        section_rows = conn.execute(section_sql, {"user_id": user_id}).fetchall()
+        if not section_rows:
+            self.refresh_sections(conn, user_id)
+            section_rows = conn.execute(section_sql, {"user_id": user_id}).fetchall()
+        sections = {}
+        for row in section_rows:
+            values = row._mapping
+            sections[(int(values["module_number"]), int(values["level"]))] = SectionRollup(
+                **{name: _number(values[name]) for name in _SECTION_COUNTERS},
+                first_incomplete_order=values["first_incomplete_order"],
+                first_incomplete_section=values["first_incomplete_section"],
+            )
+        return atom_rows, due_rows, sections
+
+    @staticmethod
+    def _optional_scalar(conn: Any, sql: str, params: dict[str, Any]) -> int:
+        """Scalar from a table that may not exist yet (0 if unavailable)."""
+        try:
+            with conn.begin_nested():
+                return int(conn.execute(text(sql), params).scalar() or 0)
+        except Exception as e:
+            logger.debug(f"Dashboard query skipped: {e}")
+            return 0
+
+    # =========================================================================
+    # Full rebuild
+    # =========================================================================
+
+    def rebuild(self, conn: Any, user_id: str | None = None) -> None:
+        """
+        Recompute the atom and due rollups (and a user's section rollup).
+
+        One pass over learning_atoms; repairs the rollups where the
+        migration 040 triggers are missing or were disabled during a load.
+        """
+        started = time.perf_counter()
+        conn.execute(text("DELETE FROM dashboard_atom_rollup"))
+        conn.execute(
+            text(
+                "INSERT INTO dashboard_atom_rollup "
+                f"(module_number, atom_type, has_section, {', '.join(_ATOM_COUNTERS)}) "
+                + ATOM_ROLLUP_SQL
+            )
+        )
+        conn.execute(text("DELETE FROM dashboard_due_rollup"))
+        conn.execute(
+            text("INSERT INTO dashboard_due_rollup (due_date, atom_count) " + DUE_ROLLUP_SQL)
+        )
+        if user_id is not None:
+            self.refresh_sections(conn, user_id)
+        self.invalidate()
+        logger.info(f"Rebuilt dashboard rollups in {time.perf_counter() - started:.2f}s")
+
+    # =========================================================================
+    # Incremental maintenance
+    # =========================================================================
+
+    def atom_facts(
+        self,
+        conn: Any,
+        atom_ids: Iterable[str] | None = None,
+        card_ids: Iterable[str] | None = None,
+    ) -> dict[str, AtomFacts]:
+        """Current rollup facts for atoms selected by id or Anki card_id."""
+        column, keys = ("la.id", atom_ids) if atom_ids is not None else ("la.card_id", card_ids)
+        keys = [str(k) for k in keys or ()]
+        query = text(ATOM_FACTS_SQL + f" WHERE {column} IN :keys").bindparams(
+            bindparam("keys", expanding=True)
+        )
+        facts: dict[str, AtomFacts] = {}
+        for start in range(0, len(keys), _FACTS_CHUNK):
+            for row in conn.execute(query, {"keys": keys[start : start + _FACTS_CHUNK]}):
+                facts[str(row.atom_id)] = AtomFacts.from_row(row)
+        return facts
+
+    def apply_atom_changes(
+        self,
+        conn: Any,
+        before: Mapping[str, AtomFacts],
+        after: Mapping[str, AtomFacts],
+    ) -> int:
+        """
+        Apply the difference between two atom_facts reads to the rollups.
+
+        Atoms only in ``after`` count as inserted, only in ``before`` as
+        deleted. Returns the number of rollup rows touched.
+        """
+        atom_deltas: dict[AtomKey, list[int]] = {}
+        due_deltas: dict[date, int] = {}
+
+        def add(facts: AtomFacts, sign: int) -> None:
+            delta = atom_deltas.setdefault(facts.key, [0] * len(_ATOM_COUNTERS))
+            for i, value in enumerate(facts.counters()):
+                delta[i] += sign * value
+            if facts.due_date is not None:
+                due_deltas[facts.due_date] = due_deltas.get(facts.due_date, 0) + sign
+
+        for facts in before.values():
+            add(facts, -1)
+        for facts in after.values():
+            add(facts, 1)
+
+        atom_deltas = {k: v for k, v in atom_deltas.items() if any(v)}
+        due_deltas = {k: v for k, v in due_deltas.items() if v}
+        if atom_deltas:
+            conn.execute(
+                text(
+                    "INSERT INTO dashboard_atom_rollup "
+                    "(module_number, atom_type, has_section, atom_count, authored_count, "
+                    " reviewed_count, nls_mastered_count) "
+                    "VALUES (:module_number, :atom_type, :has_section, :atom_count, "
+                    " :authored_count, :reviewed_count, :nls_mastered_count) "
+                    "ON CONFLICT (module_number, atom_type, has_section) DO UPDATE SET "
+                    + ", ".join(
+                        f"{name} = dashboard_atom_rollup.{name} + EXCLUDED.{name}"
+                        for name in _ATOM_COUNTERS
+                    )
+                ),
+                [
+                    {
+                        "module_number": module,
+                        "atom_type": atom_type,
+                        "has_section": has_section,
+                        **dict(zip(_ATOM_COUNTERS, delta)),
+                    }
+                    for (module, atom_type, has_section), delta in atom_deltas.items()
+                ],
+            )
+        if due_deltas:
+            conn.execute(
+                text(
+                    "INSERT INTO dashboard_due_rollup (due_date, atom_count) "
+                    "VALUES (:due_date, :delta) "
+                    "ON CONFLICT (due_date) DO UPDATE SET "
+                    "atom_count = dashboard_due_rollup.atom_count + EXCLUDED.atom_count"
+                ),
+                [{"due_date": d, "delta": delta} for d, delta in due_deltas.items()],
+            )
+        return len(atom_deltas) + len(due_deltas)
+
+    @staticmethod
+    def _compute_sections(
+        conn: Any, user_id: str, module_number: int | None = None
+    ) -> dict[tuple[int, int], SectionRollup]:
+        """Aggregate ccna_sections x ccna_section_mastery per (module, level)."""
+        module_filter = "" if module_number is None else "WHERE s.module_number = :module"
+        params: dict[str, Any] = {"user_id": user_id}
+        if module_number is not None:
+            params["module"] = module_number
+        rows = conn.execute(
+            text(SECTION_ROWS_SQL.format(module_filter=module_filter)), params
+        ).fetchall()
+
+        rollups: dict[tuple[int, int], SectionRollup] = {}
+        for row in rows:
+            rollup = rollups.setdefault((int(row.module_number), int(row.level)), SectionRollup())
+            rollup.section_count += 1
+            if row.is_completed:
+                rollup.completed_count += 1
+            elif row.display_order is not None and (
+                rollup.first_incomplete_order is None
+                or row.display_order < rollup.first_incomplete_order
+            ):
+                rollup.first_incomplete_order = int(row.display_order)
+                rollup.first_incomplete_section = row.section_id
+            if row.mastery_score is not None:
+                rollup.mastery_rows += 1
+                rollup.mastery_sum += float(row.mastery_score)
+            rollup.atoms_total += row.atoms_total or 0
+            rollup.atoms_mastered += row.atoms_mastered or 0
+            rollup.atoms_learning += row.atoms_learning or 0
+            rollup.atoms_struggling += row.atoms_struggling or 0
+            rollup.atoms_new += row.atoms_new or 0
+            if row.needs_remediation:
+                rollup.remediation_sections += 1
+                rollup.remediation_atoms += row.atoms_struggling or 0
+        return rollups
+
+    def refresh_sections(
+        self, conn: Any, user_id: str, module_number: int | None = None
+    ) -> None:
+        """Recompute a user's section rollup for one module (or all)."""
+        rollups = self._compute_sections(conn, user_id, module_number)
+        params: dict[str, Any] = {"user_id": user_id, "module": module_number}
+
+        delete_sql = "DELETE FROM dashboard_section_rollup WHERE user_id = :user_id"
+        if module_number is not None:
+            delete_sql += " AND module_number = :module"
+        conn.execute(text(delete_sql), params)
+        if rollups:
+            conn.execute(
+                text(
+                    "INSERT INTO dashboard_section_rollup "
+                    f"(user_id, module_number, level, {', '.join(_SECTION_COUNTERS)}, "
+                    " first_incomplete_order, first_incomplete_section) "
+                    f"VALUES (:user_id, :module_number, :level, "
+                    f"{', '.join(':' + name for name in _SECTION_COUNTERS)}, "
+                    " :first_incomplete_order, :first_incomplete_section)"
+                ),
+                [
+                    {
+                        "user_id": user_id,
+                        "module_number": module,
+                        "level": level,
+                        **{name: getattr(rollup, name) for name in _SECTION_COUNTERS},
+                        "first_incomplete_order": rollup.first_incomplete_order,
+                        "first_incomplete_section": rollup.first_incomplete_section,
+                    }
+                    for (module, level), rollup in rollups.items()
+                ],
+            )
+
+
+def _as_date(value: date | datetime | str | None) -> date | None:
+    """anki_due_date as a date (SQLite returns ISO strings)."""
+    if value is None or type(value) is date:
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return date.fromisoformat(str(value)[:10])
+
+
+def _number(value: Any) -> int | float:
+    if value is None:
+        return 0
+    return float(value) if not float(value).is_integer() else int(value)
+
+
+# Global store instance
+_store: DashboardSummaryStore | None = None
+
+
+def get_summary_store() -> DashboardSummaryStore:
+    """Get or create the global dashboard summary store."""
+    global _store
+    if _store is None:
+        _store = DashboardSummaryStore()
+    return _store
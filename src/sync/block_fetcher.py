@@ -0,0 +1,335 @@
+"""
+Concurrent Notion block tree fetcher.
+
+Walking a page's blocks one ``blocks.children.list`` call at a time costs a
+full round-trip per nested block. BlockTreeFetcher instead explores the
+block trees of one or more pages breadth-first:
+
+- Every known container (page, block with children, next cursor of a
+  paginated listing) is requested as soon as it is discovered, on a
+  bounded thread pool.
+- All requests pass through one shared RateLimiter. A 429 pauses the
+  limiter for every worker for the Retry-After interval, then the request
+  is retried.
+- Whole pages are cached by (page id, last_edited_time), taken from the
+  database query results, for at most ``ttl_seconds``. Nested blocks are
+  always listed: a parent block's timestamp does not change when only
+  its children are edited, so it cannot key their subtree.
+
+Results are flattened in document order (each block followed by its
+descendants), exactly as the recursive walk produced them.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+DEFAULT_BLOCK_CACHE_PATH = Path("data/notion_blocks/blocks.db")
+DEFAULT_BLOCK_CACHE_TTL_SECONDS = 24 * 3600.0
+MAX_DEPTH = 3  # Nesting levels below the page that are listed
+
+# (block_id, start_cursor) -> blocks.children.list response
+ListChildren = Callable[[str, str | None], dict[str, Any]]
+
+
+class RateLimiter:
+    """
+    Thread-safe request pacing shared by all workers.
+
+    Allows ``burst`` requests at once, then one every ``1 / rate`` seconds
+    (generic cell rate algorithm). ``pause`` holds every caller back, e.g.
+    for a Retry-After interval.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.interval = 1.0 / rate
+        self.tolerance = (max(1, burst) - 1) * self.interval
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tat = 0.0  # Theoretical arrival time of the next request
+        self._paused_until = 0.0
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; returns the seconds waited."""
+        with self._lock:
+            now = self._clock()
+            tat = max(self._tat, now)
+            send_at = max(now, tat - self.tolerance, self._paused_until)
+            self._tat = max(tat, send_at) + self.interval
+        delay = send_at - now
+        if delay > 0:
+            self._sleep(delay)
+        return max(delay, 0.0)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every request back for ``seconds``, then resume without a burst."""
+        with self._lock:
+            until = self._clock() + seconds
+            self._paused_until = max(self._paused_until, until)
+            # Use up the burst allowance so requests after the pause are paced
+            self._tat = max(self._tat, self._paused_until + self.tolerance)
+
+
+class PageBlockCache:
+    """SQLite store of flattened page blocks keyed by page id and last_edited_time."""
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_BLOCK_CACHE_PATH,
+        ttl_seconds: float = DEFAULT_BLOCK_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Open (and create) the cache.
+
+        Args:
+            path: SQLite file
+            ttl_seconds: Age after which a page is listed again even if its
+                last_edited_time is unchanged
+            clock: Wall clock (seconds since the epoch)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " page_id TEXT PRIMARY KEY, last_edited_time TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL, blocks TEXT NOT NULL)"
+        )
+
+    def get(self, page_id: str, last_edited_time: str) -> list[dict[str, Any]] | None:
+        """Cached blocks of a page, or None if missing, edited since or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT blocks FROM pages "
+                "WHERE page_id = ? AND last_edited_time = ? AND fetched_at > ?",
+                (page_id, last_edited_time, self._clock() - self.ttl_seconds),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_many(self, entries: Iterable[tuple[str, str, list[dict[str, Any]]]]) -> None:
+        """Store (page_id, last_edited_time, blocks) entries."""
+        fetched_at = self._clock()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages (page_id, last_edited_time, fetched_at, blocks) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (page_id, edited, fetched_at, json.dumps(blocks))
+                    for page_id, edited, blocks in entries
+                ],
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RateLimitedError(Exception):
+    """A request was still rate limited after every retry."""
+
+
+@dataclass
+class FetchStats:
+    """Counters for one fetch run."""
+
+    requests: int = 0
+    rate_limited: int = 0
+    cache_hits: int = 0  # Pages served from the cache
+    failed_containers: list[str] = field(default_factory=list)
+
+
+@dataclass
+class _Container:
+    """A page or block whose children are being listed."""
+
+    depth: int
+    children: list[dict[str, Any]] = field(default_factory=list)
+    failed: bool = False
+
+
+class BlockTreeFetcher:
+    """
+    Breadth-first, concurrent, cached fetch of Notion block trees.
+
+    Example:
+        fetcher = BlockTreeFetcher(list_children, RateLimiter(3.0, burst=3))
+        blocks_by_page = fetcher.fetch_pages(["page-id"])
+    """
+
+    def __init__(
+        self,
+        list_children: ListChildren,
+        limiter: RateLimiter,
+        cache: PageBlockCache | None = None,
+        max_workers: int = 8,
+        max_depth: int = MAX_DEPTH,
+        max_retries: int = 5,
+    ):
+        """
+        Initialize fetcher.
+
+        Args:
+            list_children: Calls blocks.children.list(block_id, start_cursor)
+            limiter: Rate limiter shared by every request
+            cache: Page cache (None disables caching)
+            max_workers: Concurrent requests
+            max_depth: Deepest nesting level whose children are listed
+            max_retries: Retries of a rate-limited request
+        """
+        self.list_children = list_children
+        self.limiter = limiter
+        self.cache = cache
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.max_retries = max_retries
+        self.stats = FetchStats()
+        self._stats_lock = threading.Lock()
+
+    def fetch_pages(
+        self,
+        page_ids: Iterable[str],
+        last_edited: dict[str, str] | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Fetch the flattened block lists of several pages.
+
+        Args:
+            page_ids: Pages to fetch
+            last_edited: Optional page last_edited_time by id (from the
+                database query results). Only pages with a timestamp are
+                cached; an unchanged, unexpired page is served without any
+                request.
+
+        Returns:
+            Blocks per page in document order. A container whose listing
+            failed contributes the children fetched before the failure.
+        """
+        page_ids = list(dict.fromkeys(page_ids))
+        last_edited = last_edited or {}
+        self.stats = FetchStats()
+        containers: dict[str, _Container] = {}
+        pages: dict[str, list[dict[str, Any]]] = {}
+        futures: dict[Future, str] = {}
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="notion-blocks"
+        ) as pool:
+
+            def submit(block_id: str, cursor: str | None) -> None:
+                futures[pool.submit(self._list, block_id, cursor)] = block_id
+
+            def discover(block_id: str, depth: int) -> None:
+                if block_id not in containers:
+                    containers[block_id] = _Container(depth)
+                    submit(block_id, None)
+
+            for page_id in page_ids:
+                edited = last_edited.get(page_id)
+                hit = self.cache.get(page_id, edited) if self.cache and edited else None
+                if hit is not None:
+                    pages[page_id] = hit
+                    self.stats.cache_hits += 1
+                else:
+                    discover(page_id, 0)
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    block_id = futures.pop(future)
+                    container = containers[block_id]
+                    try:
+                        response = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to fetch blocks for {block_id}: {e}")
+                        container.failed = True
+                        self.stats.failed_containers.append(block_id)
+                        continue
+
+                    # A container's next cursor is only requested after this
+                    # response, so its children arrive in order
+                    results = response.get("results", [])
+                    container.children.extend(results)
+                    if response.get("has_more") and response.get("next_cursor"):
+                        submit(block_id, response["next_cursor"])
+                    if container.depth < self.max_depth:
+                        for block in results:
+                            if block.get("has_children", False):
+                                discover(block["id"], container.depth + 1)
+
+        store: list[tuple[str, str, list[dict[str, Any]]]] = []
+        for page_id in page_ids:
+            if page_id in pages:
+                continue
+            pages[page_id], complete = self._flatten(page_id, containers)
+            if complete and last_edited.get(page_id):
+                store.append((page_id, last_edited[page_id], pages[page_id]))
+        if self.cache and store:
+            self.cache.put_many(store)
+        return {page_id: pages[page_id] for page_id in page_ids}
+
+    def _flatten(
+        self, block_id: str, containers: dict[str, _Container]
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """Descendants of a block in document order, and whether they are complete."""
+        container = containers.get(block_id)
+        if container is None:
+            return [], True  # Below max_depth: children never listed
+
+        blocks: list[dict[str, Any]] = []
+        complete = not container.failed
+        for block in container.children:
+            blocks.append(block)
+            if block.get("has_children", False):
+                descendants, ok = self._flatten(block["id"], containers)
+                blocks.extend(descendants)
+                complete = complete and ok
+        return blocks, complete
+
+    def _list(self, block_id: str, cursor: str | None) -> dict[str, Any]:
+        """One rate-limited listing, retrying 429s after their Retry-After."""
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            with self._stats_lock:
+                self.stats.requests += 1
+            try:
+                return self.list_children(block_id, cursor)
+            except Exception as e:
+                if getattr(e, "status", None) != 429 or attempt == self.max_retries:
+                    raise
+                with self._stats_lock:
+                    self.stats.rate_limited += 1
+                delay = retry_after_seconds(e, attempt)
+                logger.debug(f"Rate limited listing {block_id}; retrying in {delay:.2f}s")
+                self.limiter.pause(delay)
+        raise RateLimitedError(block_id)
+
+
+def retry_after_seconds(error: Exception, attempt: int) -> float:
+    """Retry-After of a 429 response, or exponential backoff without one."""
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return min(0.5 * 2**attempt, 30.0)
@@ -8,13 +8,13 @@ Allowed methods: client.data_sources.query(), client.pages.retrieve(),
 
 from __future__ import annotations
 
-import time
 from typing import Any
 
 from loguru import logger
 from notion_client import Client
 
 from config import get_settings
+from src.sync.block_fetcher import BlockTreeFetcher, PageBlockCache, RateLimiter
 
 
 class NotionClient:
@@ -23,7 +23,7 @@ class NotionClient:
 
     Handles:
     - Pagination for large databases
-    - Rate limiting (3 req/sec)
+    - Rate limiting (3 req/sec, shared by concurrent block fetches)
     - Fallback query methods (data_sources → databases)
     - Write protection via PROTECT_NOTION setting
     """
@@ -31,14 +31,26 @@ class NotionClient:
     def __init__(
         self,
         api_key: str | None = None,
+        base_url: str | None = None,
     ) -> None:
         self._settings = get_settings()
         self.api_key = api_key or self._settings.notion_api_key
         self._client: Client | None = None
+        self._block_client: Client | None = None
+        self._block_cache: PageBlockCache | None = None
         self._warned_raw_request = False
+        self._limiter = RateLimiter(
+            self._settings.notion_requests_per_second,
+            burst=max(1, int(self._settings.notion_requests_per_second)),
+        )
 
         if self.api_key:
-            self._client = Client(auth=self.api_key, notion_version=self._settings.notion_version)
+            options = {"auth": self.api_key, "notion_version": self._settings.notion_version}
+            if base_url:
+                options["base_url"] = base_url
+            self._client = Client(**options)
+            # Block fetches pace and retry 429s through the shared limiter instead
+            self._block_client = Client(**options, retry=False)
             logger.info("Notion client initialized")
         else:
             logger.warning("Notion credentials missing. Set NOTION_API_KEY to enable syncing.")
@@ -405,10 +417,17 @@ class NotionClient:
     # PAGE CONTENT BLOCK FETCHING (for AI enrichment)
     # =========================================================================
 
-    def fetch_page_content(self, page_id: str) -> dict[str, Any]:
+    def fetch_page_content(
+        self, page_id: str, last_edited_time: str | None = None
+    ) -> dict[str, Any]:
         """
         Fetch all content blocks from a Notion page.
 
+        Args:
+            page_id: Notion page ID
+            last_edited_time: The page's last_edited_time, if known; an
+                unchanged page is served from the block cache
+
         Returns:
             Dictionary with:
                 - blocks: List of parsed block dictionaries
@@ -427,7 +446,12 @@ class NotionClient:
                 "block_count": 0,
             }
 
-        blocks = self._fetch_all_blocks(page_id)
+        last_edited = {page_id: last_edited_time} if last_edited_time else None
+        blocks = self._block_fetcher().fetch_pages([page_id], last_edited)[page_id]
+        return self._summarize_blocks(blocks)
+
+    def _summarize_blocks(self, blocks: list[dict[str, Any]]) -> dict[str, Any]:
+        """Parse raw blocks into the page content dictionary."""
         parsed_blocks = [self._parse_block(block) for block in blocks]
 
         # Combine all text content
@@ -451,66 +475,28 @@ class NotionClient:
             "block_count": len(parsed_blocks),
         }
 
-    def _fetch_all_blocks(self, block_id: str, depth: int = 0) -> list[dict[str, Any]]:
-        """
-        Recursively fetch all blocks from a page/block.
-
-        Args:
-            block_id: The block/page ID to fetch children from
-            depth: Current recursion depth (max 3 levels)
-
-        Returns:
-            Flat list of all blocks including nested children
-        """
-        if depth > 3:
-            logger.debug(f"Max depth reached for block {block_id}")
-            return []
-
-        if not self._client:
-            return []
-
-        all_blocks = []
-        start_cursor: str | None = None
-
-        try:
-            while True:
-                blocks_api = getattr(self._client, "blocks", None)
-                if blocks_api is None:
-                    logger.warning("blocks API not available in Notion client")
-                    break
-
-                children = getattr(blocks_api, "children", None)
-                if children is None:
-                    logger.warning("blocks.children API not available")
-                    break
-
-                list_fn = getattr(children, "list", None)
-                if not callable(list_fn):
-                    logger.warning("blocks.children.list not callable")
-                    break
-
-                kwargs = {"block_id": block_id, "page_size": 100}
-                if start_cursor:
-                    kwargs["start_cursor"] = start_cursor
-
-                response = list_fn(**kwargs)
-                results = response.get("results", [])
-
-                for block in results:
-                    all_blocks.append(block)
-                    # Recursively fetch nested blocks
-                    if block.get("has_children", False):
-                        child_blocks = self._fetch_all_blocks(block["id"], depth=depth + 1)
-                        all_blocks.extend(child_blocks)
-
-                if not response.get("has_more"):
-                    break
-                start_cursor = response.get("next_cursor")
-
-        except Exception as e:
-            logger.error(f"Failed to fetch blocks for {block_id}: {e}")
-
-        return all_blocks
+    def _block_fetcher(self) -> BlockTreeFetcher:
+        """Concurrent block tree fetcher sharing this client's rate limiter."""
+        cache_path = self._settings.notion_block_cache_path
+        if cache_path and self._block_cache is None:
+            self._block_cache = PageBlockCache(
+                cache_path, ttl_seconds=self._settings.notion_block_cache_ttl_seconds
+            )
+        return BlockTreeFetcher(
+            self._list_block_children,
+            self._limiter,
+            cache=self._block_cache,
+            max_workers=self._settings.notion_block_workers,
+        )
+
+    def _list_block_children(self, block_id: str, start_cursor: str | None) -> dict[str, Any]:
+        """One blocks.children.list call (no SDK retries; the fetcher handles 429s)."""
+        if not self._block_client:
+            return {"results": [], "has_more": False}
+        kwargs = {"block_id": block_id, "page_size": 100}
+        if start_cursor:
+            kwargs["start_cursor"] = start_cursor
+        return self._block_client.blocks.children.list(**kwargs)
 
     def _parse_block(self, block: dict[str, Any]) -> dict[str, Any]:
         """Parse a Notion block into a simplified structure."""
@@ -547,39 +533,43 @@ class NotionClient:
     def fetch_page_content_batch(
         self,
         page_ids: list[str],
-        rate_limit_delay: float = 0.35,
+        last_edited: dict[str, str] | None = None,
     ) -> dict[str, dict[str, Any]]:
         """
-        Fetch content for multiple pages with rate limiting.
+        Fetch content for multiple pages concurrently.
+
+        All pages' block trees are explored together under the shared rate
+        limiter, so nested blocks of different pages are fetched in parallel.
 
         Args:
             page_ids: List of Notion page IDs to fetch
-            rate_limit_delay: Seconds to wait between requests (~3 req/sec)
+            last_edited: Optional page last_edited_time by id; unchanged
+                pages are served from the block cache
 
         Returns:
             Dictionary mapping page_id to content dict
         """
-        results: dict[str, dict[str, Any]] = {}
-        total = len(page_ids)
-
-        for i, page_id in enumerate(page_ids):
-            try:
-                content = self.fetch_page_content(page_id)
-                results[page_id] = content
-                logger.debug(f"Fetched content for page {i + 1}/{total}: {page_id}")
-            except Exception as e:
-                logger.error(f"Failed to fetch content for {page_id}: {e}")
-                results[page_id] = {
-                    "blocks": [],
-                    "text_content": "",
-                    "has_images": False,
-                    "has_code": False,
-                    "block_count": 0,
-                    "error": str(e),
-                }
-
-            # Rate limiting
-            if i < total - 1:
-                time.sleep(rate_limit_delay)
+        empty = {
+            "blocks": [],
+            "text_content": "",
+            "has_images": False,
+            "has_code": False,
+            "block_count": 0,
+        }
+        if not self._client:
+            logger.warning("Notion client not ready; cannot fetch page content")
+            return {page_id: dict(empty) for page_id in page_ids}
 
-        return results
+        fetcher = self._block_fetcher()
+        try:
+            blocks_by_page = fetcher.fetch_pages(page_ids, last_edited)
+        except Exception as e:
+            logger.error(f"Failed to fetch page content batch: {e}")
+            return {page_id: {**empty, "error": str(e)} for page_id in page_ids}
+
+        stats = fetcher.stats
+        logger.debug(
+            f"Fetched {len(page_ids)} pages: {stats.requests} requests, "
+            f"{stats.cache_hits} cached pages, {stats.rate_limited} rate limited"
+        )
+        return {page_id: self._summarize_blocks(blocks_by_page[page_id]) for page_id in page_ids}
@@ -0,0 +1,453 @@
+"""
+Synthetic-corpus benchmarks for the adaptive and content pipelines.
+
+Each scenario times one hot path against a seeded synthetic corpus
+(see synthetic.py) at a named size:
+
+    adaptive_session   StudyService.get_adaptive_session
+    zscore_batch       ZScoreEngine.compute_batch (centrality pre-cached, no Neo4j)
+    semantic_dupes     SemanticSimilarityService.find_semantic_duplicates
+    quality_analyze    CardQualityAnalyzer.analyze over every atom
+    parse_modules      CCNAContentParser.parse_module over every module file
+    mastery_sections   per-section MasteryCalculator.calculate from review history
+
+Results are appended to a JSONL history file. A run regresses when its
+median exceeds the median of the last ``--window`` comparable runs
+(same scenario, size, backend and host) by more than the threshold.
+
+Usage:
+    python -m tests.benchmarks.bench --sizes small medium
+    python -m tests.benchmarks.bench --backend postgres   # scratch DB from DATABASE_URL
+    python -m tests.benchmarks.bench --threshold 0.5 --threshold-for semantic_dupes=1.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from tests.benchmarks import synthetic
+from tests.benchmarks.synthetic import CorpusConfig, SyntheticCorpus
+
+DEFAULT_HISTORY = Path("data/benchmarks/history.jsonl")
+DEFAULT_THRESHOLD = 0.25  # 25% slower than baseline
+DEFAULT_WINDOW = 5
+
+
+@dataclass
+class BenchContext:
+    """Loaded corpus plus the handles scenarios need."""
+
+    corpus: SyntheticCorpus
+    backend: str
+    engine: Any
+    workdir: Path
+    replica: Any = None
+    module_files: list[Path] = field(default_factory=list)
+
+
+@dataclass
+class BenchResult:
+    """Timing summary for one scenario at one size."""
+
+    scenario: str
+    size: str
+    backend: str
+    items: int
+    repeats: int
+    median_ms: float
+    min_ms: float
+    max_ms: float
+    host: str = field(default_factory=socket.gethostname)
+    python: str = field(default_factory=platform.python_version)
+    commit: str | None = None
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+    baseline_ms: float | None = None
+    regression: bool = False
+
+
+# =============================================================================
+# Scenarios: each takes the context and returns (thunk, items)
+# =============================================================================
+
+
+def _adaptive_session(ctx: BenchContext) -> tuple[Callable[[], Any], int]:
+    if ctx.backend == "sqlite":
+        from src.study.replica_study_service import ReplicaStudyService
+
+        service = ReplicaStudyService(ctx.replica)
+    else:
+        from src.study.study_service import StudyService
+
+        service = StudyService(interleave_seed=0)
+    return lambda: service.get_adaptive_session(limit=50), 50
+
+
+def _zscore_batch(ctx: BenchContext) -> tuple[Callable[[], Any], int]:
+    from src.graph.zscore_engine import AtomMetrics, ZScoreEngine
+
+    engine = ZScoreEngine()
+    metrics = []
+    for i, atom in enumerate(ctx.corpus.atoms):
+        # Warm the centrality cache so compute_batch never asks the graph
+        engine._centrality_cache[atom["id"]] = (i % 100) / 100
+        metrics.append(
+            AtomMetrics(
+                atom_id=atom["id"],
+                last_touched=atom["updated_at"] if atom["anki_review_count"] else None,
+                review_count=atom["anki_review_count"],
+                stability=atom["anki_stability"] or 0.0,
+                difficulty=atom["anki_difficulty"],
+                memory_state="REVIEW" if atom["anki_review_count"] else "NEW",
+            )
+        )
+    return lambda: engine.compute_batch(metrics, now=synthetic.NOW), len(metrics)
+
+
+def _semantic_dupes(ctx: BenchContext) -> tuple[Callable[[], Any], int]:
+    from src.semantic.similarity_service import SemanticSimilarityService
+
+    session = Session(bind=ctx.engine)
+    service = SemanticSimilarityService(session)
+    return lambda: service.find_semantic_duplicates(threshold=0.9, limit=100), len(
+        ctx.corpus.embeddings
+    )
+
+
+def _quality_analyze(ctx: BenchContext) -> tuple[Callable[[], Any], int]:
+    from src.content.cleaning.atomicity import CardQualityAnalyzer
+
+    analyzer = CardQualityAnalyzer()
+    atoms = ctx.corpus.atoms
+
+    def run() -> None:
+        for atom in atoms:
+            analyzer.analyze(atom["front"], atom["back"], atom["atom_type"])
+
+    return run, len(atoms)
+
+
+def _parse_modules(ctx: BenchContext) -> tuple[Callable[[], Any], int]:
+    from src.ccna.content_parser import CCNAContentParser
+
+    parser = CCNAContentParser(ctx.workdir / "modules")
+    files = ctx.module_files
+
+    def run() -> None:
+        for path in files:
+            parser.parse_module(path)
+
+    return run, len(files)
+
+
+MASTERY_SQL = """
+    SELECT ca.ccna_section_id AS section_id,
+           ca.anki_stability AS stability,
+           ca.anki_lapses AS lapses,
+           ca.anki_review_count AS reviews,
+           ca.atom_type AS atom_type,
+           COUNT(r.atom_id) AS answered,
+           SUM(CASE WHEN r.is_correct THEN 1 ELSE 0 END) AS correct
+    FROM learning_atoms ca
+    LEFT JOIN atom_responses r ON r.atom_id = ca.id
+    WHERE ca.ccna_section_id IS NOT NULL
+    GROUP BY ca.id, ca.ccna_section_id, ca.anki_stability, ca.anki_lapses,
+             ca.anki_review_count, ca.atom_type
+"""
+
+
+def _mastery_sections(ctx: BenchContext) -> tuple[Callable[[], Any], int]:
+    from src.study.mastery_calculator import MasteryCalculator, MasteryMetrics
+
+    calculator = MasteryCalculator()
+
+    def run() -> list[Any]:
+        sections: dict[str, list[dict]] = {}
+        with ctx.engine.connect() as conn:
+            for row in conn.execute(text(MASTERY_SQL)):
+                sections.setdefault(row.section_id, []).append(dict(row._mapping))
+
+        results = []
+        for atoms in sections.values():
+            reviewed = [a for a in atoms if a["reviews"]]
+            stability = [a["stability"] or 0.0 for a in reviewed]
+            mcq = [a for a in atoms if a["atom_type"] == "mcq" and a["answered"]]
+            answered = sum(a["answered"] for a in mcq)
+            results.append(
+                calculator.calculate(
+                    MasteryMetrics(
+                        # FSRS retrievability one day after the last review
+                        avg_retrievability=statistics.fmean(
+                            (1 + 1 / (9 * max(s, 0.1))) ** -1 for s in stability
+                        )
+                        if stability
+                        else 0.0,
+                        avg_stability_days=statistics.fmean(stability) if stability else 0.0,
+                        avg_lapses=statistics.fmean(a["lapses"] or 0 for a in reviewed)
+                        if reviewed
+                        else 0.0,
+                        mcq_score=100 * sum(a["correct"] for a in mcq) / answered if mcq else None,
+                        atoms_total=len(atoms),
+                        atoms_mastered=sum(1 for s in stability if s >= 21),
+                        atoms_learning=sum(1 for s in stability if s < 21),
+                        atoms_struggling=sum(1 for a in reviewed if (a["lapses"] or 0) >= 3),
+                        atoms_new=len(atoms) - len(reviewed),
+                    )
+                )
+            )
+        return results
+
+    return run, len(ctx.corpus.sections)
+
+
+SCENARIOS: dict[str, Callable[[BenchContext], tuple[Callable[[], Any], int]]] = {
+    "adaptive_session": _adaptive_session,
+    "zscore_batch": _zscore_batch,
+    "semantic_dupes": _semantic_dupes,
+    "quality_analyze": _quality_analyze,
+    "parse_modules": _parse_modules,
+    "mastery_sections": _mastery_sections,
+}
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+
+
+def time_call(fn: Callable[[], Any], repeats: int, warmup: int = 1) -> list[float]:
+    """Wall-clock seconds for ``repeats`` calls after ``warmup`` untimed calls."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def prepare(corpus: SyntheticCorpus, backend: str, workdir: Path) -> BenchContext:
+    """
+    Load ``corpus`` into the backend and write its module files.
+
+    Args:
+        corpus: Generated corpus
+        backend: "sqlite" (file under workdir) or "postgres" (configured DATABASE_URL)
+        workdir: Scratch directory for the SQLite file and module texts
+
+    Returns:
+        BenchContext
+    """
+    if backend == "sqlite":
+        replica = synthetic.load_sqlite(corpus, workdir / "bench.db")
+        ctx = BenchContext(corpus, backend, replica.engine, workdir, replica=replica)
+    elif backend == "postgres":
+        from src.db.database import engine
+
+        synthetic.load_database(corpus, engine)
+        ctx = BenchContext(corpus, backend, engine, workdir)
+    else:
+        raise ValueError(f"Unknown backend: {backend}")
+    ctx.module_files = synthetic.write_module_files(corpus, workdir / "modules")
+    return ctx
+
+
+def run_size(
+    size: str,
+    config: CorpusConfig,
+    backend: str = "sqlite",
+    scenarios: Iterable[str] | None = None,
+    repeats: int = 5,
+    workdir: Path | None = None,
+) -> list[BenchResult]:
+    """
+    Generate, load and time every scenario at one corpus size.
+
+    Args:
+        size: Size label recorded with the results
+        config: Corpus dimensions
+        backend: "sqlite" or "postgres"
+        scenarios: Scenario names (default: all)
+        repeats: Timed calls per scenario
+        workdir: Scratch directory (default: a temporary directory)
+
+    Returns:
+        One BenchResult per scenario
+    """
+    names = list(scenarios or SCENARIOS)
+    corpus = synthetic.generate(config)
+    with tempfile.TemporaryDirectory(prefix="cortex-bench-") as tmp:
+        ctx = prepare(corpus, backend, Path(workdir or tmp))
+        results = []
+        for name in names:
+            try:
+                fn, items = SCENARIOS[name](ctx)
+            except ImportError as e:
+                # Optional dependency missing on this box (e.g. sentence-transformers)
+                logger.warning(f"Skipping {name}: {e}")
+                continue
+            timings = [t * 1000 for t in time_call(fn, repeats)]
+            results.append(
+                BenchResult(
+                    scenario=name,
+                    size=size,
+                    backend=backend,
+                    items=items,
+                    repeats=repeats,
+                    median_ms=round(statistics.median(timings), 3),
+                    min_ms=round(min(timings), 3),
+                    max_ms=round(max(timings), 3),
+                )
+            )
+        ctx.engine.dispose()
+    return results
+
+
+# =============================================================================
+# History and regression checks
+# =============================================================================
+
+
+def load_history(path: Path) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def check_regressions(
+    results: list[BenchResult],
+    history: list[dict[str, Any]],
+    threshold: float = DEFAULT_THRESHOLD,
+    thresholds: dict[str, float] | None = None,
+    window: int = DEFAULT_WINDOW,
+) -> list[BenchResult]:
+    """
+    Compare results against the history and flag regressions in place.
+
+    The baseline is the median of the last ``window`` runs with the same
+    scenario, size, backend and host.
+
+    Returns:
+        The results flagged as regressions
+    """
+    thresholds = thresholds or {}
+    regressions = []
+    for result in results:
+        previous = [
+            h["median_ms"]
+            for h in history
+            if (h["scenario"], h["size"], h["backend"], h.get("host"))
+            == (result.scenario, result.size, result.backend, result.host)
+        ][-window:]
+        if not previous:
+            continue
+        result.baseline_ms = round(statistics.median(previous), 3)
+        limit = thresholds.get(result.scenario, threshold)
+        if result.median_ms > result.baseline_ms * (1 + limit):
+            result.regression = True
+            regressions.append(result)
+    return regressions
+
+
+def append_history(path: Path, results: list[BenchResult]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(asdict(result)) + "\n")
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def format_results(results: list[BenchResult]) -> str:
+    lines = [
+        f"{'scenario':<18} {'size':<7} {'items':>7} {'median':>10} {'min':>10} "
+        f"{'max':>10} {'baseline':>10}"
+    ]
+    for r in results:
+        baseline = f"{r.baseline_ms:.1f}ms" if r.baseline_ms is not None else "-"
+        flag = "  REGRESSION" if r.regression else ""
+        lines.append(
+            f"{r.scenario:<18} {r.size:<7} {r.items:>7} {r.median_ms:>8.1f}ms "
+            f"{r.min_ms:>8.1f}ms {r.max_ms:>8.1f}ms {baseline:>10}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Cortex synthetic-corpus benchmarks")
+    parser.add_argument("--sizes", nargs="+", default=["small"], choices=list(synthetic.SIZES))
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS))
+    parser.add_argument("--backend", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, help="Override the corpus seed")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        "--threshold-for",
+        action="append",
+        default=[],
+        metavar="SCENARIO=FRACTION",
+        help="Per-scenario regression threshold",
+    )
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW)
+    parser.add_argument("--no-record", action="store_true", help="Don't append to the history")
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    thresholds = {}
+    for item in args.threshold_for:
+        name, _, value = item.partition("=")
+        thresholds[name] = float(value)
+
+    commit = _git_commit()
+    results: list[BenchResult] = []
+    for size in args.sizes:
+        config = synthetic.SIZES[size]
+        if args.seed is not None:
+            config = CorpusConfig(**{**asdict(config), "seed": args.seed})
+        for result in run_size(size, config, args.backend, args.scenarios, args.repeats):
+            result.commit = commit
+            results.append(result)
+
+    regressions = check_regressions(
+        results, load_history(args.history), args.threshold, thresholds, args.window
+    )
+    print(format_results(results))
+    if not args.no_record:
+        append_history(args.history, results)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over threshold", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
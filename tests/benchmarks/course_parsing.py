@@ -0,0 +1,135 @@
+"""
+Course parsing benchmark: per-pattern regex scans vs the section tokenizer.
+
+Generates a seeded synthetic course plan (10 MB by default). It is in the
+Moodle week format that both EASVParser and MoodleWeeklyParser read. The
+benchmark then times:
+
+- ``legacy``: the previous parsers. EASVParser splits on week headers and
+  runs the lazy DOTALL Before/During/Workshop patterns per week.
+  MoodleWeeklyParser uses the lazy week findall and re-splits each week.
+- ``tokenizer``: the current parsers, which cut every section from one scan.
+- ``cold cache``: the current parsers storing their result in a ParseCache.
+- ``warm``: the current parsers with a ParseCache that already holds the file.
+- ``re-ingest``: a directory of course files parsed through a warm cache
+  after one file changed. Only that file is parsed again.
+
+Every mode's output must equal the legacy output. The curriculum table
+pattern backtracks catastrophically when its header is followed by more
+columns and the file keeps mentioning "week" and "topic". Legacy timings are
+shown for doubling prose sizes while the next run fits in ``--table-budget``
+seconds.
+
+Usage:
+    python -m tests.benchmarks.course_parsing                 # 10 MB course
+    python -m tests.benchmarks.course_parsing --size-mb 2 --files 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from src.processing.course_chunker import CurriculumTableParser, UniversalChunker
+from src.processing.parse_cache import ParseCache
+from tests.fixtures.course_parsing import (
+    LegacyCurriculumTableParser,
+    chunk,
+    generate_course,
+    generate_table_course,
+    generate_week,
+    parse_easv,
+)
+
+# =============================================================================
+# Runs
+# =============================================================================
+
+
+def timed(fn: Any, *args: Any, **kwargs: Any) -> tuple[float, Any]:
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Course parsing benchmark")
+    parser.add_argument("--size-mb", type=float, default=10.0)
+    parser.add_argument("--files", type=int, default=12, help="Files in the re-ingest directory")
+    parser.add_argument("--table-budget", type=float, default=20.0, help="Legacy table seconds")
+    args = parser.parse_args(argv)
+    logger.remove()
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        course = root / "SDE2.txt"
+        course.write_text(generate_course(int(args.size_mb * 1_000_000)), encoding="utf-8")
+        size = course.stat().st_size / 1e6
+        print(f"course file {size:.1f} MB")
+
+        cache = ParseCache(root / "cache.db")
+        for name, run in (("EASVParser", parse_easv), ("UniversalChunker", chunk)):
+            legacy_s, expected = timed(run, course, legacy=True)
+            new_s, result = timed(run, course)
+            cold_s, cold = timed(run, course, cache)
+            warm_s, warm = timed(run, course, cache)
+            same = result == expected and cold == expected and warm == expected
+            ok = ok and same
+            print(
+                f"{name:<17} legacy {legacy_s:5.2f}s  tokenizer {new_s:5.2f}s "
+                f"({size / new_s:4.1f} MB/s)  cold cache {cold_s:5.2f}s  "
+                f"warm {warm_s:5.2f}s  identical={same}"
+            )
+
+        directory = root / "courses"
+        directory.mkdir()
+        per_file = int(args.size_mb * 1_000_000 / args.files)
+        for n in range(args.files):
+            text = generate_course(per_file, seed=100 + n)
+            (directory / f"course{n:02d}.txt").write_text(text, encoding="utf-8")
+        dir_cache = root / "dir_cache.db"
+        ingest = UniversalChunker.chunk_directory
+        cold_s, _ = timed(lambda: list(ingest(directory, "*.txt", dir_cache)))
+        edited = directory / "course00.txt"
+        edited.write_text(edited.read_text(encoding="utf-8") + generate_week(random.Random(1), 7))
+        re_s, chunks = timed(lambda: list(ingest(directory, "*.txt", dir_cache)))
+        fresh = list(ingest(directory, "*.txt", None))
+        ok = ok and chunks == fresh
+        print(
+            f"re-ingest {args.files} files, 1 changed: cold {cold_s:.2f}s  "
+            f"after edit {re_s:.2f}s  identical={chunks == fresh}"
+        )
+
+        print("curriculum table with a notes column, then N prose lines about week/topic:")
+        lines, legacy_done = 50, False
+        while lines <= 64_000:
+            text = generate_table_course(lines)
+            new_s, new = timed(
+                lambda text=text: CurriculumTableParser().can_parse(text, course)
+                and list(CurriculumTableParser().parse(text, course))
+            )
+            row = f"  {lines:>6} lines  tokenizer {new_s * 1000:8.1f} ms"
+            if not legacy_done:
+                legacy_s, old = timed(
+                    lambda text=text: LegacyCurriculumTableParser().can_parse(text, course)
+                    and list(LegacyCurriculumTableParser().parse(text, course))
+                )
+                ok = ok and old == new
+                row += f"  legacy {legacy_s * 1000:10.1f} ms  identical={old == new}"
+                legacy_done = legacy_s * 8 > args.table_budget  # Cubic
+            print(row)
+            lines *= 2
+        cache.close()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
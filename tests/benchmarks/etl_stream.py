@@ -0,0 +1,111 @@
+"""
+Staged vs streaming ETL pipeline benchmark.
+
+A seeded synthetic extractor produces chunks lazily up to a byte budget,
+a transformer simulates per-chunk I/O latency (LLM or API call) and a
+loader simulates a per-batch commit without keeping the atoms. The same
+source runs through ``Pipeline.run`` staged and streaming; the report
+shows wall time, peak RSS growth and the streaming stage metrics.
+
+Staged runs hold the whole corpus in memory, so ``--staged-mb`` caps the
+comparison size; ``--stream-gb`` runs streaming alone on a multi-gigabyte
+source to show memory stays flat.
+
+Usage:
+    python -m tests.benchmarks.etl_stream                       # 64 MB comparison
+    python -m tests.benchmarks.etl_stream --staged-mb 256 --latency-ms 0.5
+    python -m tests.benchmarks.etl_stream --staged-mb 0 --stream-gb 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import resource
+import sys
+import time
+from dataclasses import dataclass
+
+from src.etl.pipeline import Pipeline, PipelineResult
+from tests.fixtures.etl_stream import CountingLoader, LatencyTransformer, SyntheticExtractor
+
+
+@dataclass
+class RunReport:
+    mode: str
+    megabytes: float
+    wall_s: float
+    rss_growth_mb: float
+    result: PipelineResult
+
+
+def _max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def run_once(
+    mode: str,
+    total_bytes: int,
+    latency_s: float,
+    commit_s: float,
+    transform_workers: int = 8,
+) -> RunReport:
+    """Run one pipeline over a fresh synthetic source."""
+    pipeline = Pipeline(
+        SyntheticExtractor(total_bytes),
+        [LatencyTransformer(latency_s)],
+        CountingLoader(commit_s),
+        batch_size=200,
+        streaming=mode == "streaming",
+        transform_workers=transform_workers,
+    )
+    rss_before = _max_rss_mb()
+    start = time.perf_counter()
+    result = asyncio.run(pipeline.run())
+    wall = time.perf_counter() - start
+    return RunReport(mode, total_bytes / 2**20, wall, _max_rss_mb() - rss_before, result)
+
+
+def format_report(report: RunReport) -> str:
+    r = report.result
+    lines = [
+        f"{report.mode:<10} {report.megabytes:8.0f} MB  {report.wall_s:7.2f}s  "
+        f"chunks={r.chunks_extracted} loaded={r.atoms_loaded}  "
+        f"peak RSS +{report.rss_growth_mb:.0f} MB"
+    ]
+    for name, stage in r.stage_metrics.items():
+        m = stage.to_dict()
+        lines.append(
+            f"  {name:<9} {m['throughput_per_sec']:>10.1f}/s  util={m['utilization']:.2f}  "
+            f"queue max={m['max_queue_depth']}/{m['queue_capacity']} "
+            f"mean={m['mean_queue_depth']}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Staged vs streaming ETL benchmark")
+    parser.add_argument("--staged-mb", type=float, default=64, help="Comparison size (0 = skip)")
+    parser.add_argument("--stream-gb", type=float, default=0, help="Streaming-only run size")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="Simulated I/O per chunk")
+    parser.add_argument("--commit-ms", type=float, default=5.0, help="Simulated commit per batch")
+    parser.add_argument("--workers", type=int, default=8, help="Streaming transform workers")
+    args = parser.parse_args(argv)
+
+    latency, commit = args.latency_ms / 1000, args.commit_ms / 1000
+    if args.staged_mb:
+        size = int(args.staged_mb * 2**20)
+        # Streaming first: ru_maxrss only grows, so staged growth is measured on top
+        streaming = run_once("streaming", size, latency, commit, args.workers)
+        staged = run_once("staged", size, latency, commit)
+        print(format_report(streaming))
+        print(format_report(staged))
+        print(f"speedup    {staged.wall_s / streaming.wall_s:.1f}x")
+    if args.stream_gb:
+        size = int(args.stream_gb * 2**30)
+        print(format_report(run_once("streaming", size, latency, commit, args.workers)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""
+Greenlight queue dispatch stress benchmark (PostgreSQL).
+
+Creates greenlight_queue (migration 031 without the learning_atoms foreign
+key, plus migration 036) in a scratch schema. For each worker count it
+enqueues a batch of items and drains them with concurrent workers, each on
+its own connection:
+
+- ``legacy``: get_pending, then mark_executing and mark_complete per item,
+  one transaction each, polling when idle. Workers race for the same rows;
+  lost races are counted as wasted claims.
+- ``claim``: GreenlightQueueWorker. Batches are taken with FOR UPDATE SKIP
+  LOCKED, outcomes are written in one statement per batch, and idle workers
+  sleep on LISTEN/NOTIFY.
+
+The handler sleeps ``--work-ms`` (the Greenlight round-trip) and fails a
+share of first attempts. The run fails if any (item, attempt) is executed
+twice or any item is left unfinished. A last check lets a worker "die"
+holding a batch and verifies that the lease expires and another worker
+finishes it.
+
+Usage:
+    python -m tests.benchmarks.greenlight_queue                 # DATABASE_URL
+    python -m tests.benchmarks.greenlight_queue --dsn postgresql://... --items 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import Counter
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.integrations.greenlight_queue_manager import (
+    GreenlightQueueListener,
+    GreenlightQueueManager,
+    GreenlightQueueWorker,
+    QueuedExecution,
+)
+
+SCHEMA = "greenlight_bench"
+MIGRATIONS = Path(__file__).parents[2] / "src" / "db" / "migrations"
+MIGRATION = MIGRATIONS / "036_greenlight_queue_claims.sql"
+
+TABLE_DDL = """
+CREATE TABLE greenlight_queue (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    atom_id UUID,
+    learner_id UUID NOT NULL,
+    execution_id VARCHAR(100) UNIQUE,
+    status VARCHAR(20) DEFAULT 'pending',
+    request_payload JSONB NOT NULL,
+    result_payload JSONB,
+    queued_at TIMESTAMPTZ DEFAULT NOW(),
+    started_at TIMESTAMPTZ,
+    completed_at TIMESTAMPTZ,
+    error_message TEXT,
+    retry_count INTEGER DEFAULT 0,
+    max_retries INTEGER DEFAULT 3
+);
+CREATE INDEX idx_greenlight_queue_status ON greenlight_queue(status, queued_at);
+"""
+
+
+def _async_url(url: str) -> str:
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+async def setup(dsn: str, pool_size: int) -> AsyncEngine:
+    """Create the scratch schema and return an engine bound to it."""
+    admin = create_async_engine(_async_url(dsn))
+    async with admin.connect() as conn:
+        raw = (await conn.get_raw_connection()).driver_connection
+        await raw.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}")
+        await raw.execute(f"SET search_path TO {SCHEMA}; {TABLE_DDL}")
+        await raw.execute(MIGRATION.read_text(encoding="utf-8"))
+    await admin.dispose()
+    return create_async_engine(
+        _async_url(dsn),
+        pool_size=pool_size,
+        max_overflow=pool_size,
+        connect_args={"server_settings": {"search_path": SCHEMA}},
+    )
+
+
+def session_scope_for(engine: AsyncEngine):
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def scope() -> AsyncGenerator[AsyncSession, None]:
+        async with factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    return scope
+
+
+class Executor:
+    """Handler that records every (item, attempt) it runs."""
+
+    def __init__(self, work_s: float, fail_share: float, seed: int = 5):
+        self.work_s = work_s
+        self.fail_share = fail_share
+        self.rng = random.Random(seed)
+        self.attempts: Counter[tuple[str, int]] = Counter()
+
+    async def __call__(self, item: QueuedExecution) -> dict:
+        self.attempts[(item.id, item.retry_count)] += 1
+        await asyncio.sleep(self.work_s)
+        if item.retry_count == 0 and self.rng.random() < self.fail_share:
+            raise RuntimeError("simulated Greenlight failure")
+        return {"ok": True}
+
+
+async def enqueue(scope, items: int) -> None:
+    async with scope() as session:
+        await session.execute(text("TRUNCATE greenlight_queue"))
+        await session.execute(
+            text(
+                "INSERT INTO greenlight_queue (learner_id, request_payload) "
+                "SELECT gen_random_uuid(), jsonb_build_object('n', g) "
+                "FROM generate_series(1, :n) g"
+            ),
+            {"n": items},
+        )
+
+
+async def unfinished(scope) -> int:
+    async with scope() as session:
+        return (
+            await session.execute(
+                text(
+                    "SELECT COUNT(*) FROM greenlight_queue "
+                    "WHERE status IN ('pending', 'executing')"
+                )
+            )
+        ).scalar_one()
+
+
+async def legacy_worker(scope, executor: Executor, stop: asyncio.Event, batch: int) -> int:
+    """Previous dispatch: read pending rows, then race to mark each one."""
+    wasted = 0
+    while not stop.is_set():
+        async with scope() as session:
+            pending = await GreenlightQueueManager(session).get_pending(batch)
+        if not pending:
+            await asyncio.sleep(0.05)
+            continue
+        for item in pending:
+            async with scope() as session:
+                won = await GreenlightQueueManager(session).mark_executing(item.id)
+            if not won:
+                wasted += 1
+                continue
+            try:
+                result = await executor(item)
+            except Exception as e:
+                async with scope() as session:
+                    await GreenlightQueueManager(session).mark_failed(item.id, str(e))
+                continue
+            async with scope() as session:
+                await GreenlightQueueManager(session).mark_complete(item.id, result)
+    return wasted
+
+
+async def drain(scope, stop: asyncio.Event, tasks: list[asyncio.Task]) -> None:
+    while await unfinished(scope):
+        await asyncio.sleep(0.05)
+    stop.set()
+    await asyncio.gather(*tasks)
+
+
+async def run_mode(engine, mode: str, workers: int, args) -> tuple[float, int, Executor]:
+    scope = session_scope_for(engine)
+    await enqueue(scope, args.items)
+    executor = Executor(args.work_ms / 1000, args.fail_share)
+    stop = asyncio.Event()
+    listener = None
+    started = time.perf_counter()
+    if mode == "legacy":
+        tasks = [
+            asyncio.create_task(legacy_worker(scope, executor, stop, args.batch))
+            for _ in range(workers)
+        ]
+    else:
+        listener = GreenlightQueueListener(engine)
+        await listener.start()
+        pool = [
+            GreenlightQueueWorker(
+                executor, f"w{n}", scope, listener, batch_size=args.batch, idle_timeout=1.0
+            )
+            for n in range(workers)
+        ]
+        tasks = [asyncio.create_task(worker.run(stop)) for worker in pool]
+    await drain(scope, stop, tasks)
+    elapsed = time.perf_counter() - started
+    wasted = sum(t.result() or 0 for t in tasks) if mode == "legacy" else 0
+    if listener:
+        await listener.close()
+    return elapsed, wasted, executor
+
+
+async def check_lease_recovery(engine) -> bool:
+    """A worker claims a batch and dies; the lease expires and another finishes it."""
+    scope = session_scope_for(engine)
+    await enqueue(scope, 5)
+    async with scope() as session:
+        claimed = await GreenlightQueueManager(session).claim("dead", limit=5, lease_seconds=1)
+    await asyncio.sleep(1.2)
+    executor = Executor(0.0, 0.0)
+    survivor = GreenlightQueueWorker(executor, "survivor", scope, batch_size=5, lease_seconds=1)
+    stop = asyncio.Event()
+    task = asyncio.create_task(survivor.run(stop))
+    await drain(scope, stop, [task])
+    return len(claimed) == 5 and {key[0] for key in executor.attempts} == {i.id for i in claimed}
+
+
+async def main_async(args) -> int:
+    engine = await setup(args.dsn, pool_size=max(args.workers) * 2 + 4)
+    ok = True
+    try:
+        print(f"{args.items} items, {args.work_ms:.0f} ms work, batch {args.batch}")
+        for workers in args.workers:
+            for mode in ("legacy", "claim"):
+                elapsed, wasted, executor = await run_mode(engine, mode, workers, args)
+                doubles = sum(1 for n in executor.attempts.values() if n > 1)
+                ok = ok and doubles == 0
+                print(
+                    f"{mode:<7} workers={workers:<3} {elapsed:7.2f}s "
+                    f"{args.items / elapsed:8.0f} items/s  wasted claims={wasted:<6} "
+                    f"double executions={doubles}"
+                )
+        recovered = await check_lease_recovery(engine)
+        ok = ok and recovered
+        print(f"lease recovery after worker death: {recovered}")
+    finally:
+        async with engine.connect() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await conn.commit()
+        await engine.dispose()
+    return 0 if ok else 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    from config import get_settings
+
+    parser = argparse.ArgumentParser(description="Greenlight queue dispatch benchmark")
+    parser.add_argument("--dsn", default=get_settings().database_url)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--batch", type=int, default=10)
+    parser.add_argument("--work-ms", type=float, default=5.0)
+    parser.add_argument("--fail-share", type=float, default=0.02)
+    args = parser.parse_args(argv)
+    if not args.dsn.startswith("postgresql"):
+        print("This benchmark needs PostgreSQL (SKIP LOCKED, LISTEN/NOTIFY)", file=sys.stderr)
+        return 2
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
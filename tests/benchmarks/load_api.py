@@ -0,0 +1,235 @@
+"""
+Concurrent load generator for the FastAPI service.
+
+Fires requests at one path from ``--concurrency`` workers for a fixed
+number of requests or a duration, then reports throughput and latency
+percentiles. Runs against a live server (``--url``) or in-process
+through httpx's ASGI transport (``--app``), so a route can be measured
+before and after moving blocking work off the event loop.
+
+``--seeded SIZE`` loads a synthetic corpus of that size into the
+configured DATABASE_URL (a scratch database with the project schema;
+databases with real content are refused), writes its module files to a
+temporary directory, and drives src.api.main:app in-process over the
+module, QA and struggle routes unless ``--path`` is given.
+
+Usage:
+    python -m tests.benchmarks.load_api --url http://localhost:8100 --path /api/ccna/modules
+    python -m tests.benchmarks.load_api --app src.api.main:app --path /health --duration 10
+    DATABASE_URL=postgresql://localhost/cortex_bench \\
+        python -m tests.benchmarks.load_api --seeded medium --concurrency 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from tests.benchmarks import synthetic
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_REQUESTS = 500
+# Read paths served by the seeded tables and module files
+SEEDED_PATHS = [
+    "/api/ccna/modules",
+    "/api/ccna/modules/NET-M1",
+    "/api/ccna/qa/report",
+    "/api/struggles/",
+]
+
+
+@dataclass
+class LoadResult:
+    """Outcome of one load run."""
+
+    path: str
+    concurrency: int
+    requests: int = 0
+    errors: int = 0
+    elapsed_s: float = 0.0
+    latencies_ms: list[float] = field(default_factory=list)
+    status_counts: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed_s if self.elapsed_s else 0.0
+
+    def percentile(self, pct: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    path: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    total_requests: int | None = DEFAULT_REQUESTS,
+    duration_s: float | None = None,
+    method: str = "GET",
+) -> LoadResult:
+    """
+    Drive ``path`` with ``concurrency`` workers.
+
+    Args:
+        client: Client bound to the server or app under test
+        path: Request path (with query string)
+        concurrency: Number of in-flight requests
+        total_requests: Stop after this many requests (ignored with duration_s)
+        duration_s: Stop after this many seconds
+        method: HTTP method
+
+    Returns:
+        LoadResult with per-request latencies
+    """
+    result = LoadResult(path=path, concurrency=concurrency)
+    issued = 0
+    start = time.perf_counter()
+    deadline = start + duration_s if duration_s else None
+
+    def claim() -> bool:
+        nonlocal issued
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        if issued >= (total_requests or 0):
+            return False
+        issued += 1
+        return True
+
+    async def worker() -> None:
+        while claim():
+            t0 = time.perf_counter()
+            try:
+                response = await client.request(method, path)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+            result.latencies_ms.append((time.perf_counter() - t0) * 1000)
+            result.requests += 1
+            result.status_counts[status] = result.status_counts.get(status, 0) + 1
+            if status == 0 or status >= 500:
+                result.errors += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed_s = time.perf_counter() - start
+    return result
+
+
+def format_result(result: LoadResult) -> str:
+    statuses = " ".join(f"{k}:{v}" for k, v in sorted(result.status_counts.items()))
+    mean = statistics.fmean(result.latencies_ms) if result.latencies_ms else 0.0
+    return (
+        f"{result.path}  c={result.concurrency}  n={result.requests}  "
+        f"{result.throughput:.1f} req/s  "
+        f"mean={mean:.1f}ms p50={result.percentile(50):.1f}ms "
+        f"p95={result.percentile(95):.1f}ms p99={result.percentile(99):.1f}ms  "
+        f"errors={result.errors}  [{statuses}]"
+    )
+
+
+def _load_app(spec: str) -> Any:
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr or "app")
+
+
+def seed(size: str, modules_dir: Path) -> Any:
+    """
+    Load the synthetic corpus of ``size`` and point the app at its module files.
+
+    Args:
+        size: Key of synthetic.SIZES
+        modules_dir: Directory for the generated ``CCNA Module N.txt`` files
+
+    Returns:
+        src.api.main:app
+    """
+    from config import get_settings
+    from src.db.database import engine
+
+    corpus = synthetic.generate(synthetic.SIZES[size])
+    synthetic.load_database(corpus, engine)
+    synthetic.write_module_files(corpus, modules_dir)
+    get_settings().ccna_modules_path = str(modules_dir)
+    return _load_app("src.api.main:app")
+
+
+def _client(args: argparse.Namespace, app: Any | None) -> httpx.AsyncClient:
+    if app is not None:
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://load", timeout=args.timeout
+        )
+    limits = httpx.Limits(max_connections=args.concurrency)
+    return httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout)
+
+
+async def _run(args: argparse.Namespace, app: Any | None, paths: list[str]) -> list[LoadResult]:
+    results = []
+    async with _client(args, app) as client:
+        for path in paths:
+            results.append(
+                await run_load(
+                    client,
+                    path,
+                    args.concurrency,
+                    args.requests,
+                    args.duration,
+                    args.method,
+                )
+            )
+    return results
+
+
+async def _main(args: argparse.Namespace) -> list[LoadResult]:
+    if not args.seeded:
+        app = _load_app(args.app) if args.app else None
+        return await _run(args, app, args.path or ["/health"])
+
+    from src.db.database import dispose_async_engine, engine
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = seed(args.seeded, Path(tmp))
+        try:
+            return await _run(args, app, args.path or SEEDED_PATHS)
+        finally:
+            await dispose_async_engine()
+            engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Cortex API load generator")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running server")
+    target.add_argument("--app", help="ASGI app to load in-process, e.g. src.api.main:app")
+    target.add_argument(
+        "--seeded",
+        choices=list(synthetic.SIZES),
+        help="Load a synthetic corpus into DATABASE_URL and drive src.api.main:app",
+    )
+    parser.add_argument("--path", nargs="+", help="Paths to drive (default: /health)")
+    parser.add_argument("--method", default="GET")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--duration", type=float, help="Seconds to run (overrides --requests)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(_main(args))
+    for result in results:
+        print(format_result(result))
+    return 1 if any(r.errors for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
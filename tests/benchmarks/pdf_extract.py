@@ -0,0 +1,77 @@
+"""
+PDF extraction benchmark.
+
+Generates a seeded textbook-shaped PDF (chapters, "N.M Section" headings,
+dense body text) with PyMuPDF and times ``PDFExtractor`` over it:
+
+- ``legacy``: the previous single-pass loop, which re-split the growing
+  section string on every page (quadratic in section length)
+- ``serial``: the current extractor on one worker thread, no cache
+- ``parallel``: page ranges on a process pool, cold cache
+- ``cached``: a re-run on the unchanged file, served from the page cache
+
+Every mode must produce the same chunk titles and content.
+
+Usage:
+    python -m tests.benchmarks.pdf_extract                   # 1200 pages
+    python -m tests.benchmarks.pdf_extract --pages 3000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.etl.extractors.pdf_extractor import PDFExtractor
+from src.etl.models import RawChunk
+from tests.fixtures.pdf_extract import LegacyPDFExtractor, config, generate_pdf, signature
+
+
+def timed(extractor: PDFExtractor) -> tuple[float, list[RawChunk]]:
+    start = time.perf_counter()
+    chunks = asyncio.run(extractor.extract())
+    return time.perf_counter() - start, chunks
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="PDF extraction benchmark")
+    parser.add_argument("--pages", type=int, default=1200, help="Generated page count")
+    parser.add_argument("--workers", type=int, default=0, help="Pool processes (0 = all cores)")
+    parser.add_argument(
+        "--section-words", type=int, default=20_000, help="max_section_words (long sections)"
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = generate_pdf(Path(tmp) / "textbook.pdf", args.pages)
+        cache = Path(tmp) / "pages.db"
+        words = args.section_words
+        runs = [
+            ("legacy", LegacyPDFExtractor(pdf, config(1, None, words))),
+            ("serial", PDFExtractor(pdf, config(1, None, words))),
+            ("parallel", PDFExtractor(pdf, config(args.workers, cache, words))),
+            ("cached", PDFExtractor(pdf, config(args.workers, cache, words))),
+        ]
+
+        print(f"{args.pages} pages, {pdf.stat().st_size / 2**20:.1f} MB")
+        baseline = None
+        for name, extractor in runs:
+            wall, chunks = timed(extractor)
+            if baseline is None:
+                baseline = (wall, signature(chunks))
+            elif signature(chunks) != baseline[1]:
+                print(f"{name}: output differs from legacy", file=sys.stderr)
+                return 1
+            print(
+                f"{name:<9} {wall:7.2f}s  {args.pages / wall:8.0f} pages/s  "
+                f"chunks={len(chunks)}  speedup={baseline[0] / wall:.1f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
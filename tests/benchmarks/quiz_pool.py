@@ -0,0 +1,162 @@
+"""
+Quiz pool selection benchmark: global-RNG shuffle vs seeded hash ranking.
+
+Builds seeded synthetic question pools (100k questions per pool by default)
+in a SQLite file, then times selection of a 20-question quiz:
+
+- ``legacy``: the previous select_questions. It loads every candidate
+  question as an ORM entity, seeds the global RNG, shuffles, and slices.
+  The atom eager load is skipped, which flatters it. Diverse selection
+  runs the previous grouping over a 5x oversample.
+- ``hash``: QuizPoolManager ranks candidates by md5(salt || id) in SQL.
+  Plain selection is ORDER BY ... LIMIT; diverse selection streams the
+  ranking and stops once the quotas are filled.
+
+It then repeats every seed's selection from concurrent threads and counts
+results that differ from the seed's serial result. The legacy path
+reseeds the shared RNG, so concurrent requests interleave.
+
+Pools, the md5() shim and SQLiteSession live in tests/fixtures/quiz_pool.py.
+
+Usage:
+    python -m tests.benchmarks.quiz_pool                      # 2 pools x 100k
+    python -m tests.benchmarks.quiz_pool --questions 20000 --repeats 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.db.models import QuizQuestion
+from tests.fixtures.quiz_pool import generate, make_engine, run_selection
+
+
+def _legacy_seed(seed: str) -> int:
+    return int.from_bytes(hashlib.sha256(seed.encode()).digest()[:8], byteorder="big")
+
+
+def legacy_select(engine: Engine, pool_id: uuid.UUID, count: int, seed: str) -> list[Any]:
+    """The previous select_questions: load all, reseed the global RNG, shuffle."""
+    with Session(engine) as session:
+        questions = list(
+            session.execute(
+                select(QuizQuestion).where(QuizQuestion.pool_id == pool_id, QuizQuestion.is_active)
+            ).scalars()
+        )
+    random.seed(_legacy_seed(seed))
+    random.shuffle(questions)
+    selected = questions[:count]
+    random.seed()
+    return selected
+
+
+def legacy_diverse(engine: Engine, pool_id: uuid.UUID, count: int, seed: str) -> list[Any]:
+    """The previous select_diverse_questions over a 5x legacy oversample."""
+    candidates = legacy_select(engine, pool_id, count * 5, seed)
+    by_type: dict[str, list[Any]] = {}
+    for q in candidates:
+        by_type.setdefault(q.question_type, []).append(q)
+    per_type = max(1, count // len(by_type))
+    selected, remaining = [], count
+    for questions in by_type.values():
+        take = min(per_type, len(questions), remaining)
+        selected.extend(questions[:take])
+        remaining -= take
+    used = {q.id for q in selected}
+    rest = [q for q in candidates if q.id not in used]
+    random.seed(_legacy_seed(seed))
+    random.shuffle(rest)
+    random.seed()
+    return (selected + rest[:remaining])[:count]
+
+
+def _median_ms(fn: Any, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def concurrent_mismatches(
+    fn: Any, seeds: list[str], threads: int, rounds: int = 4
+) -> tuple[int, int]:
+    """Selections run concurrently that differ from their seed's serial result."""
+    serial = {seed: fn(seed) for seed in seeds}
+    jobs = [seed for _ in range(rounds) for seed in seeds]
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(fn, jobs))
+    return sum(result != serial[seed] for seed, result in zip(jobs, results)), len(jobs)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Quiz pool selection benchmark")
+    parser.add_argument("--pools", type=int, default=2)
+    parser.add_argument("--questions", type=int, default=100_000, help="Questions per pool")
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=9)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(Path(tmp) / "quiz.db")
+        pool_ids = generate(engine, args.pools, args.questions)
+        pool_id = pool_ids[0]
+        print(f"{args.pools} pools x {args.questions} questions, selecting {args.count}")
+
+        def ids(questions: list[Any]) -> list[str]:
+            return [str(getattr(q, "question_id", None) or q.id) for q in questions]
+
+        modes = {
+            "legacy select": lambda s: ids(legacy_select(engine, pool_id, args.count, s)),
+            "hash select": lambda s: ids(
+                run_selection(
+                    engine, "select_questions", pool_id=pool_id, count=args.count, seed=s
+                )
+            ),
+            "legacy diverse": lambda s: ids(legacy_diverse(engine, pool_id, args.count, s)),
+            "hash diverse": lambda s: ids(
+                run_selection(
+                    engine, "select_diverse_questions", pool_id=pool_id, count=args.count, seed=s
+                )
+            ),
+        }
+        latency = {}
+        for name, fn in modes.items():
+            counter = iter(range(10**9))
+            latency[name] = _median_ms(
+                lambda fn=fn, counter=counter: fn(f"user-{next(counter)}:1"), args.repeats
+            )
+            print(f"{name:<15} median {latency[name]:9.1f} ms")
+
+        seeds = [f"user-{n}:quiz:1" for n in range(16)]
+        ok = True
+        for name in ("legacy select", "hash select", "hash diverse"):
+            bad, total = concurrent_mismatches(modes[name], seeds, args.threads)
+            print(f"{name:<15} {bad}/{total} concurrent results differ from serial")
+            ok = ok and (bad == 0 or name.startswith("legacy"))
+
+        print(
+            f"speedup         select {latency['legacy select'] / latency['hash select']:.1f}x   "
+            f"diverse {latency['legacy diverse'] / latency['hash diverse']:.1f}x"
+        )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Skill mastery update benchmark: per-event updates vs batch replay.
+
+Generates a seeded response history (1M responses by default) over learners,
+atoms and weighted atom-skill links, then applies it:
+
+- ``per-event``: SkillMasteryTracker.update_skill_mastery for every
+  response. Each linked skill costs a read, a write and (on first practice)
+  a skill code lookup.
+- ``batch``: SkillMasteryTracker.update_skill_mastery_batch in chunks. Each
+  chunk does one link query, one state query and one upsert.
+
+Storage is InMemoryTracker (tests/fixtures), which keeps the tables in dicts
+and counts database round-trips. Reported throughput is the measured CPU
+time plus ``--rtt-ms`` per round-trip, so it shows what a real connection
+would cost. The per-event path runs on the first ``--sample`` responses and
+is extrapolated. The batch results must equal the per-event results exactly
+on that sample.
+
+Usage:
+    python -m tests.benchmarks.skill_mastery                  # 1M responses
+    python -m tests.benchmarks.skill_mastery --events 200000 --rtt-ms 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Any
+
+from tests.fixtures.skill_mastery import (
+    InMemoryTracker,
+    generate,
+    run_batch,
+    run_per_event,
+    snapshot,
+)
+
+
+def _measure(coro_fn: Any, tracker: InMemoryTracker, rtt_s: float) -> tuple[float, float]:
+    started = time.perf_counter()
+    asyncio.run(coro_fn())
+    cpu = time.perf_counter() - started
+    return cpu, cpu + tracker.round_trips * rtt_s
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Skill mastery update benchmark")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--learners", type=int, default=2_000)
+    parser.add_argument("--atoms", type=int, default=5_000)
+    parser.add_argument("--skills", type=int, default=300)
+    parser.add_argument("--sample", type=int, default=50_000, help="Per-event responses")
+    parser.add_argument("--chunk", type=int, default=100_000, help="Responses per batch")
+    parser.add_argument("--rtt-ms", type=float, default=0.3, help="Simulated round-trip")
+    args = parser.parse_args(argv)
+    rtt_s = args.rtt_ms / 1000
+
+    history, links = generate(args.events, args.learners, args.atoms, args.skills)
+    sample = history[: args.sample]
+    print(
+        f"{args.events} responses, {args.learners} learners, {args.atoms} atoms, "
+        f"{args.skills} skills, {args.rtt_ms} ms per round-trip"
+    )
+
+    per_event = InMemoryTracker(links)
+    cpu, total = _measure(lambda: run_per_event(per_event, sample), per_event, rtt_s)
+    print(
+        f"per-event  {len(sample):>9} responses  cpu {cpu:7.2f}s  "
+        f"round-trips {per_event.round_trips:>9}  {len(sample) / total:>9.0f} responses/s"
+    )
+    per_event_rate = len(sample) / total
+
+    batch_sample = InMemoryTracker(links)
+    asyncio.run(run_batch(batch_sample, sample, args.chunk))
+    identical = snapshot(batch_sample) == snapshot(per_event)
+    print(f"batch == per-event on the sample: {identical}")
+
+    batch = InMemoryTracker(links)
+    cpu, total = _measure(lambda: run_batch(batch, history, args.chunk), batch, rtt_s)
+    batch_rate = len(history) / total
+    print(
+        f"batch      {len(history):>9} responses  cpu {cpu:7.2f}s  "
+        f"round-trips {batch.round_trips:>9}  {batch_rate:>9.0f} responses/s"
+    )
+    print(
+        f"speedup    {batch_rate / per_event_rate:.0f}x "
+        f"({len(batch.rows)} learner skills written)"
+    )
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Struggle priority benchmark: view recompute vs materialized table.
+
+Builds a seeded synthetic course in SQLite, with atoms spread over
+modules and sections and struggle weights on a share of modules and
+sections. It then replays a stream of synthetic interactions (1M by
+default). Each batch updates stability and updated_at the way
+``StudyService.record_interaction`` does and refreshes only the touched
+atoms. The report covers:
+
+- read latency of the adaptive struggle query against the 018 view
+  definition (joins and scoring on every read) and against
+  struggle_priority (recency term added at read time)
+- refresh cost per interaction batch, per single interaction and per
+  module (struggle import) against a full rebuild
+- whether the incrementally maintained table still equals a rebuild
+
+The SQL is the SQLite port used by the replica; PostgreSQL plans differ,
+but the work removed from the read path is the same.
+
+Usage:
+    python -m tests.benchmarks.struggle_priority                    # 100k atoms, 1M interactions
+    python -m tests.benchmarks.struggle_priority --atoms 20000 --interactions 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import create_engine, text
+
+from src.study.struggle_priority import StrugglePriorityStore
+from tests.fixtures.struggle_priority import (
+    TABLE_READ_SQL,
+    VIEW_READ_SQL,
+    generate,
+    record_interactions,
+    snapshot,
+)
+
+
+def _median_ms(conn, sql: str, params: dict, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        conn.execute(text(sql), params).fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Struggle priority view vs table benchmark")
+    parser.add_argument("--atoms", type=int, default=100_000)
+    parser.add_argument("--interactions", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=500, help="Interactions per refresh")
+    parser.add_argument("--reads", type=int, default=20, help="Repeats per read measurement")
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    engine = create_engine("sqlite://")
+    store = StrugglePriorityStore()
+    with engine.begin() as conn:
+        course = generate(conn, args.atoms, seed=args.seed)
+
+        started = time.perf_counter()
+        rows = store.rebuild(conn)
+        rebuild_ms = (time.perf_counter() - started) * 1000
+        print(f"{args.atoms} atoms, {rows} priority rows, full rebuild {rebuild_ms:.0f} ms")
+
+        now = datetime(2026, 10, 1, tzinfo=UTC)
+        params = {"now": now.isoformat(), "limit": 50}
+        view_ms = _median_ms(conn, VIEW_READ_SQL, params, args.reads)
+        table_ms = _median_ms(conn, TABLE_READ_SQL, params, args.reads)
+        same = [r.id for r in conn.execute(text(VIEW_READ_SQL), params)] == [
+            r.id for r in conn.execute(text(TABLE_READ_SQL), params)
+        ]
+        print(
+            f"read      view {view_ms:8.1f} ms   table {table_ms:8.1f} ms   "
+            f"speedup {view_ms / table_ms:.1f}x   same top 50: {same}"
+        )
+
+        # Interaction stream: skewed toward a working set, as in real sessions
+        working_set = rng.sample(course.atom_ids, max(1, len(course.atom_ids) // 5))
+        refresh_s = 0.0
+        done = 0
+        while done < args.interactions:
+            n = min(args.batch, args.interactions - done)
+            batch = [
+                rng.choice(working_set) if rng.random() < 0.8 else rng.choice(course.atom_ids)
+                for _ in range(n)
+            ]
+            now += timedelta(seconds=n * 5)
+            record_interactions(conn, batch, rng, now)
+            started = time.perf_counter()
+            store.refresh_atoms(conn, atom_ids=set(batch))
+            refresh_s += time.perf_counter() - started
+            done += n
+        batches = -(-args.interactions // args.batch)
+        print(
+            f"refresh   {args.interactions} interactions in {batches} batches: "
+            f"{refresh_s:.1f}s total, {refresh_s / batches * 1000:.2f} ms/batch "
+            f"({refresh_s / args.interactions * 1e6:.0f} us/interaction)"
+        )
+
+        singles = []
+        for atom_id in rng.sample(course.atom_ids, 200):
+            record_interactions(conn, [atom_id], rng, now)
+            started = time.perf_counter()
+            store.refresh_atoms(conn, atom_ids=[atom_id])
+            singles.append((time.perf_counter() - started) * 1000)
+        print(f"single    median {statistics.median(singles):.3f} ms per record_interaction")
+
+        module = rng.choice(course.modules)
+        conn.execute(
+            text("UPDATE struggle_weights SET weight = 0.95 WHERE module_number = :m"),
+            {"m": module},
+        )
+        started = time.perf_counter()
+        store.refresh_modules(conn, [module])
+        print(f"import    one module {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        incremental = snapshot(conn)
+        store.rebuild(conn)
+        consistent = incremental == snapshot(conn)
+        params["now"] = now.isoformat()
+        print(
+            f"after     view {_median_ms(conn, VIEW_READ_SQL, params, args.reads):8.1f} ms   "
+            f"table {_median_ms(conn, TABLE_READ_SQL, params, args.reads):8.1f} ms   "
+            f"incremental == rebuild: {consistent}"
+        )
+    return 0 if same and consistent else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,360 @@
+"""
+Seeded synthetic corpus for benchmarks.
+
+Generates modules, sections, concepts, learning atoms (with embeddings,
+a share of near-duplicate embeddings, and FSRS scheduling state), review
+histories, struggle weights and CCNA-style module text files. The same
+seed and CorpusConfig always produce the same corpus.
+
+Loaders write the corpus into a local SQLite file (replica schema plus
+embeddings and atom_responses) or into a scratch PostgreSQL database that
+already has the project schema.
+"""
+
+from __future__ import annotations
+
+import random
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from src.db.replica import LocalReplica, _to_local
+from tests.fixtures import WORDS
+
+SOURCE_FILE = "bench:synthetic"
+QUIZ_TYPES = ("mcq", "true_false", "parsons", "matching")
+ATOM_TYPES = QUIZ_TYPES + ("flashcard", "cloze", "numeric")
+NOW = datetime(2025, 6, 1, 12, 0, 0)  # Fixed clock so histories are reproducible
+
+
+@dataclass(frozen=True)
+class CorpusConfig:
+    """Corpus dimensions."""
+
+    modules: int = 4
+    sections_per_module: int = 6
+    atoms: int = 1_000
+    embeddings: int = 300  # Atoms that get an embedding (pairwise scans are O(n^2))
+    embedding_dim: int = 384
+    duplicate_rate: float = 0.05  # Share of embedded atoms that near-copy another
+    reviews_per_atom: float = 4.0  # Mean review-history length for reviewed atoms
+    new_atom_rate: float = 0.3
+    paragraphs_per_section: int = 6
+    seed: int = 42
+
+
+# Named sizes used by the runner
+SIZES: dict[str, CorpusConfig] = {
+    "small": CorpusConfig(),
+    "medium": CorpusConfig(modules=10, sections_per_module=10, atoms=10_000, embeddings=1_000),
+    "large": CorpusConfig(modules=17, sections_per_module=15, atoms=50_000, embeddings=2_500),
+}
+
+
+@dataclass
+class SyntheticCorpus:
+    """Rows for every benchmark table plus module texts."""
+
+    config: CorpusConfig
+    sections: list[dict[str, Any]] = field(default_factory=list)
+    concepts: list[dict[str, Any]] = field(default_factory=list)
+    atoms: list[dict[str, Any]] = field(default_factory=list)
+    embeddings: dict[str, np.ndarray] = field(default_factory=dict)
+    responses: list[dict[str, Any]] = field(default_factory=list)
+    struggle_weights: list[dict[str, Any]] = field(default_factory=list)
+    section_mastery: list[dict[str, Any]] = field(default_factory=list)
+    module_texts: dict[int, str] = field(default_factory=dict)
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _sentence(rng: random.Random, low: int, high: int) -> str:
+    words = rng.choices(WORDS, k=rng.randint(low, high))
+    return " ".join(words).capitalize()
+
+
+def generate(config: CorpusConfig) -> SyntheticCorpus:
+    """
+    Build a corpus for ``config``.
+
+    Args:
+        config: Corpus dimensions and seed
+
+    Returns:
+        SyntheticCorpus
+    """
+    rng = random.Random(config.seed)
+    np_rng = np.random.default_rng(config.seed)
+    corpus = SyntheticCorpus(config=config)
+
+    order = 0
+    for m in range(1, config.modules + 1):
+        for s in range(1, config.sections_per_module + 1):
+            order += 1
+            corpus.sections.append(
+                {
+                    "section_id": f"{m}.{s}",
+                    "module_number": m,
+                    "title": _sentence(rng, 2, 5),
+                    "level": 2,
+                    "parent_section_id": None,
+                    "display_order": order,
+                    "updated_at": NOW,
+                }
+            )
+    for i in range(max(1, len(corpus.sections) // 2)):
+        corpus.concepts.append(
+            {"id": _uuid(rng), "name": f"Concept {i} {rng.choice(WORDS)}", "updated_at": NOW}
+        )
+
+    today = NOW.date()
+    for n in range(config.atoms):
+        section = rng.choice(corpus.sections)
+        atom_type = rng.choice(ATOM_TYPES)
+        reviewed = rng.random() >= config.new_atom_rate
+        reviews = max(1, int(rng.expovariate(1 / config.reviews_per_atom))) if reviewed else 0
+        stability = round(rng.lognormvariate(1.5, 1.0), 2) if reviewed else None
+        back = _sentence(rng, 3, 40)
+        if atom_type == "parsons" or rng.random() < 0.05:
+            lines = rng.randint(1, 12)
+            commands = (f"Router(config)# {rng.choice(WORDS)} {i}" for i in range(lines))
+            back += "\n```\n" + "\n".join(commands) + "\n```"
+        corpus.atoms.append(
+            {
+                "id": _uuid(rng),
+                "card_id": f"BENCH-{n:06d}",
+                "atom_type": atom_type,
+                "front": _sentence(rng, 4, 30) + "?",
+                "back": back,
+                "concept_id": rng.choice(corpus.concepts)["id"],
+                "ccna_section_id": section["section_id"],
+                "source_file": SOURCE_FILE,
+                "anki_difficulty": round(rng.random(), 3),
+                "anki_stability": stability,
+                "anki_lapses": rng.randint(0, 4) if reviewed else 0,
+                "anki_review_count": reviews,
+                "anki_due_date": today + timedelta(days=rng.randint(-10, 20)) if reviewed else None,
+                "updated_at": NOW - timedelta(minutes=n),
+            }
+        )
+
+    # Review histories for reviewed atoms
+    for atom in corpus.atoms:
+        for _ in range(atom["anki_review_count"]):
+            corpus.responses.append(
+                {
+                    "atom_id": atom["id"],
+                    "user_id": "default",
+                    "is_correct": rng.random() < 0.75,
+                    "response_time_ms": int(rng.lognormvariate(8.5, 0.5)),
+                    "user_answer": "",
+                    "responded_at": NOW - timedelta(days=rng.uniform(0, 120)),
+                }
+            )
+
+    # Embeddings: unit vectors, some near-copies of earlier ones
+    embedded = corpus.atoms[: min(config.embeddings, len(corpus.atoms))]
+    vectors = np_rng.standard_normal((len(embedded), config.embedding_dim)).astype(np.float32)
+    for i in range(1, len(embedded)):
+        if np_rng.random() < config.duplicate_rate:
+            source = int(np_rng.integers(0, i))
+            vectors[i] = vectors[source] + 0.05 * np_rng.standard_normal(config.embedding_dim)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    corpus.embeddings = {atom["id"]: vectors[i] for i, atom in enumerate(embedded)}
+
+    for m in range(1, config.modules + 1):
+        if rng.random() < 0.4:
+            weight = round(rng.uniform(0.5, 1.0), 2)
+            corpus.struggle_weights.append(
+                {
+                    "id": _uuid(rng),
+                    "module_number": m,
+                    "section_id": None,
+                    "weight": weight,
+                    "severity": "high" if weight >= 0.7 else "medium",
+                    "user_id": "default",
+                    "updated_at": NOW,
+                }
+            )
+    for section in corpus.sections:
+        total = rng.randint(5, 60)
+        mastered = rng.randint(0, total)
+        corpus.section_mastery.append(
+            {
+                "section_id": section["section_id"],
+                "user_id": "default",
+                "mastery_score": round(rng.uniform(0, 100), 1),
+                "is_completed": mastered == total,
+                "needs_remediation": rng.random() < 0.3,
+                "atoms_total": total,
+                "atoms_mastered": mastered,
+                "atoms_learning": total - mastered,
+                "atoms_struggling": 0,
+                "atoms_new": 0,
+                "updated_at": NOW,
+            }
+        )
+
+    corpus.module_texts = {m: _module_text(rng, config, m) for m in range(1, config.modules + 1)}
+    return corpus
+
+
+def _module_text(rng: random.Random, config: CorpusConfig, module: int) -> str:
+    """CCNA-style module text (markdown headers, tables, bullets, CLI blocks)."""
+    lines = [
+        f"# Module {module}: {_sentence(rng, 2, 4)}",
+        "",
+        f"> **CCNA: Introduction to Networks** — Module {module} {_sentence(rng, 3, 6)}",
+        "",
+        "## Module Objectives",
+        "",
+        "| Topic Title | Topic Objective |",
+        "|---|---|",
+    ]
+    lines += [f"| {_sentence(rng, 2, 3)} | {_sentence(rng, 5, 9)} |" for _ in range(4)]
+    for s in range(1, config.sections_per_module + 1):
+        lines += ["", f"## {module}.{s} {_sentence(rng, 2, 5)}", ""]
+        for p in range(1, config.paragraphs_per_section + 1):
+            if p % 3 == 1:
+                lines += [f"### {module}.{s}.{p} {_sentence(rng, 2, 4)}", ""]
+            lines.append(" ".join(_sentence(rng, 8, 20) + "." for _ in range(rng.randint(2, 5))))
+            lines.append("")
+            if rng.random() < 0.3:
+                lines += [f"- **{rng.choice(WORDS)}** {_sentence(rng, 4, 10)}" for _ in range(3)]
+                lines.append("")
+            if rng.random() < 0.2:
+                lines += ["```", "Router> enable", "Router# configure terminal",
+                          f"Router(config)# hostname R{module}", "```", ""]
+    return "\n".join(lines)
+
+
+def write_module_files(corpus: SyntheticCorpus, directory: Path) -> list[Path]:
+    """Write ``CCNA Module N.txt`` files for the parser benchmark."""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for module, body in corpus.module_texts.items():
+        path = directory / f"CCNA Module {module}.txt"
+        path.write_text(body, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+# =============================================================================
+# Loaders
+# =============================================================================
+
+_SQLITE_EXTRA_DDL = (
+    "ALTER TABLE learning_atoms ADD COLUMN embedding BLOB",
+    """
+    CREATE TABLE IF NOT EXISTS atom_responses (
+        atom_id TEXT, user_id TEXT, is_correct BOOLEAN, response_time_ms INTEGER,
+        user_answer TEXT, responded_at TIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_bench_responses_atom ON atom_responses(atom_id)",
+)
+
+
+def _insert(conn: Any, table: str, rows: list[dict[str, Any]], local: bool) -> None:
+    if not rows:
+        return
+    if local:
+        rows = [
+            {k: v if isinstance(v, bytes) else _to_local(v) for k, v in row.items()}
+            for row in rows
+        ]
+    columns = list(rows[0])
+    conn.execute(
+        text(
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(':' + c for c in columns)})"
+        ),
+        rows,
+    )
+
+
+def _rows_with_embeddings(corpus: SyntheticCorpus) -> list[dict[str, Any]]:
+    rows = []
+    for atom in corpus.atoms:
+        vector = corpus.embeddings.get(atom["id"])
+        rows.append({**atom, "embedding": vector.tobytes() if vector is not None else None})
+    return rows
+
+
+def _load_rows(conn: Any, corpus: SyntheticCorpus, local: bool = False) -> None:
+    _insert(conn, "ccna_sections", corpus.sections, local)
+    _insert(conn, "concepts", corpus.concepts, local)
+    _insert(conn, "learning_atoms", _rows_with_embeddings(corpus), local)
+    _insert(conn, "struggle_weights", corpus.struggle_weights, local)
+    _insert(conn, "ccna_section_mastery", corpus.section_mastery, local)
+    _insert(conn, "atom_responses", corpus.responses, local)
+
+
+def load_sqlite(corpus: SyntheticCorpus, path: Path) -> LocalReplica:
+    """
+    Load the corpus into a fresh SQLite file with the replica schema.
+
+    Args:
+        corpus: Generated corpus
+        path: SQLite file (replaced if it exists)
+
+    Returns:
+        LocalReplica over the loaded file
+    """
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+    replica = LocalReplica(path)
+    with replica.engine.begin() as conn:
+        for ddl in _SQLITE_EXTRA_DDL:
+            conn.execute(text(ddl))
+        _load_rows(conn, corpus, local=True)
+    return replica
+
+
+def load_database(corpus: SyntheticCorpus, engine: Engine) -> None:
+    """
+    Load the corpus into a scratch PostgreSQL database with the project schema.
+
+    Previous synthetic rows are replaced. Refuses to touch a database
+    that holds non-synthetic atoms.
+
+    Raises:
+        RuntimeError: If the database contains real content
+    """
+    with engine.begin() as conn:
+        real = conn.execute(
+            text("SELECT COUNT(*) FROM learning_atoms WHERE source_file IS DISTINCT FROM :s"),
+            {"s": SOURCE_FILE},
+        ).scalar()
+        if real:
+            raise RuntimeError(
+                f"Database has {real} non-synthetic atoms; benchmarks need a scratch database"
+            )
+        for table in (
+            "atom_responses",
+            "learning_atoms",
+            "ccna_section_mastery",
+            "struggle_weights",
+            "concepts",
+            "ccna_sections",
+        ):
+            conn.execute(text(f"DELETE FROM {table}"))
+        _load_rows(conn, corpus)
+
+
+def describe(config: CorpusConfig) -> dict[str, Any]:
+    """Config as a plain dict for result records."""
+    return asdict(config)
+
+
+def today() -> date:
+    """The generator's fixed 'today'."""
+    return NOW.date()
@@ -0,0 +1,55 @@
+"""
+Smoke tests for the synthetic corpus and benchmark runner (tiny corpus).
+"""
+
+import numpy as np
+import pytest
+
+from tests.benchmarks import bench, synthetic
+from tests.benchmarks.synthetic import CorpusConfig
+
+TINY = CorpusConfig(
+    modules=2, sections_per_module=3, atoms=120, embeddings=40, paragraphs_per_section=2
+)
+
+
+def test_generator_is_deterministic():
+    a = synthetic.generate(TINY)
+    b = synthetic.generate(TINY)
+
+    assert [x["id"] for x in a.atoms] == [x["id"] for x in b.atoms]
+    assert a.module_texts == b.module_texts
+    assert len(a.atoms) == 120 and len(a.embeddings) == 40
+    assert all(np.isclose(np.linalg.norm(v), 1.0) for v in a.embeddings.values())
+
+
+def test_all_scenarios_run_on_sqlite(tmp_path):
+    results = bench.run_size("tiny", TINY, repeats=1, workdir=tmp_path)
+
+    names = {r.scenario for r in results}
+    assert {
+        "adaptive_session",
+        "zscore_batch",
+        "quality_analyze",
+        "parse_modules",
+        "mastery_sections",
+    } <= names
+    assert all(r.median_ms >= 0 for r in results)
+
+
+def test_regression_check_against_history(tmp_path):
+    path = tmp_path / "history.jsonl"
+    old = bench.BenchResult("parse_modules", "tiny", "sqlite", 2, 3, 10.0, 9.0, 11.0)
+    bench.append_history(path, [old, old])
+
+    slower = bench.BenchResult("parse_modules", "tiny", "sqlite", 2, 3, 14.0, 13.0, 15.0)
+    regressions = bench.check_regressions([slower], bench.load_history(path), threshold=0.25)
+
+    assert regressions == [slower]
+    assert slower.baseline_ms == pytest.approx(10.0)
+
+    slower.regression = False
+    relaxed = bench.check_regressions(
+        [slower], bench.load_history(path), thresholds={"parse_modules": 0.5}
+    )
+    assert relaxed == []
@@ -0,0 +1,55 @@
+"""
+Seeded data generators, fakes and reference implementations shared by the
+unit tests and the benchmark scripts in tests/benchmarks.
+"""
+
+# Networking vocabulary for generated text
+WORDS = [
+    "router",
+    "switch",
+    "vlan",
+    "trunk",
+    "subnet",
+    "mask",
+    "gateway",
+    "packet",
+    "frame",
+    "header",
+    "ethernet",
+    "mac",
+    "address",
+    "arp",
+    "dhcp",
+    "dns",
+    "tcp",
+    "udp",
+    "port",
+    "segment",
+    "window",
+    "ack",
+    "handshake",
+    "ipv4",
+    "ipv6",
+    "prefix",
+    "route",
+    "static",
+    "dynamic",
+    "ospf",
+    "interface",
+    "duplex",
+    "speed",
+    "cable",
+    "fiber",
+    "copper",
+    "wireless",
+    "ssid",
+    "encryption",
+    "password",
+    "console",
+    "privilege",
+    "mode",
+    "config",
+    "show",
+    "running",
+    "startup",
+]
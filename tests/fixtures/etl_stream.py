@@ -0,0 +1,96 @@
+"""
+Synthetic ETL stages.
+
+SyntheticExtractor produces seeded chunks lazily up to a byte budget,
+LatencyTransformer passes atoms through after a simulated I/O wait and
+CountingLoader counts atoms after a simulated commit without keeping them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import AsyncIterator
+from typing import Any
+
+from src.etl.extractors.base import BaseExtractor, ExtractionConfig
+from src.etl.loaders.base import BaseLoader, LoaderConfig
+from src.etl.models import RawChunk, TransformedAtom
+from src.etl.pipeline import LoadResult
+from src.etl.transformers.base import PassthroughTransformer, TransformerConfig
+from tests.fixtures import WORDS
+
+
+class SyntheticExtractor(BaseExtractor):
+    """Lazily generated chunks totalling ``total_bytes`` of text."""
+
+    source_type = "synthetic"
+
+    def __init__(self, total_bytes: int, chunk_bytes: int = 4096, seed: int = 11):
+        super().__init__("synthetic", ExtractionConfig(min_chunk_words=0, max_chunk_words=10**6))
+        self.total_bytes = total_bytes
+        self.chunk_bytes = chunk_bytes
+        self.seed = seed
+
+    async def iter_chunks(self) -> AsyncIterator[RawChunk]:
+        rng = random.Random(self.seed)
+        paragraphs = [" ".join(rng.choices(WORDS, k=40)) for _ in range(64)]
+        produced = 0
+        n = 0
+        while produced < self.total_bytes:
+            parts, size = [], 0
+            while size < self.chunk_bytes:
+                parts.append(rng.choice(paragraphs))
+                size += len(parts[-1]) + 1
+            content = "\n".join(parts)
+            produced += len(content)
+            n += 1
+            yield self._create_chunk(
+                chunk_id=f"syn-{n}", title=f"Section {n}", content=content, module_number=n % 17
+            )
+            if n % 256 == 0:
+                await asyncio.sleep(0)  # Let downstream stages run
+
+    async def extract(self) -> list[RawChunk]:
+        return [chunk async for chunk in self.iter_chunks()]
+
+    def _parse_content(self, raw_content: str) -> list[dict[str, Any]]:
+        return []
+
+
+class LatencyTransformer(PassthroughTransformer):
+    """Passthrough atoms after a simulated I/O wait per chunk."""
+
+    name = "latency"
+
+    def __init__(self, latency_s: float):
+        super().__init__(TransformerConfig(min_quality_score=0.0, log_transformations=False))
+        self.latency_s = latency_s
+
+    async def _transform_chunk(self, chunk: RawChunk) -> list[TransformedAtom]:
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        return await super()._transform_chunk(chunk)
+
+
+class CountingLoader(BaseLoader):
+    """Counts atoms after a simulated commit; keeps nothing."""
+
+    name = "counting"
+
+    def __init__(self, commit_s: float = 0.0):
+        super().__init__(LoaderConfig(log_operations=False))
+        self.commit_s = commit_s
+        self.count = 0
+
+    async def _insert_batch(self, atoms: list[TransformedAtom]) -> LoadResult:
+        if self.commit_s:
+            await asyncio.sleep(self.commit_s)
+        self.count += len(atoms)
+        return LoadResult(inserted=len(atoms))
+
+    async def _update_batch(self, atoms: list[TransformedAtom]) -> LoadResult:
+        return LoadResult(updated=len(atoms))
+
+    async def _check_existing(self, atom_ids: list[str]) -> set[str]:
+        return set()
@@ -0,0 +1,170 @@
+"""
+Seeded Anki migration matching corpora.
+
+generate builds new atoms and legacy cards; most legacy cards are reworded
+copies of an atom (dropped and swapped words, plurals, HTML), the rest are
+unrelated. recall compares blocked against exhaustive matches.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+
+from src.ccna.anki_migration import AnkiMigrationService, CardLearningState, CardMatch
+from src.ccna.atomizer_service import AtomType, GeneratedAtom, KnowledgeType
+
+SYLLABLES = [
+    "ra",
+    "ter",
+    "net",
+    "lan",
+    "vi",
+    "sub",
+    "ma",
+    "ga",
+    "pa",
+    "fra",
+    "eth",
+    "ad",
+    "dre",
+    "dh",
+    "dn",
+    "tc",
+    "ud",
+    "po",
+    "seg",
+    "win",
+    "ack",
+    "ip",
+    "pre",
+    "rou",
+    "sta",
+    "dyn",
+    "osp",
+    "inter",
+    "dup",
+    "spe",
+    "ca",
+    "fi",
+    "co",
+    "wi",
+    "ss",
+    "enc",
+    "pas",
+    "con",
+    "pri",
+    "mo",
+    "sho",
+    "run",
+    "sta",
+]
+TAGS = [f"ccna:m{m}" for m in range(1, 18)] + ["type:fc", "type:mcq", "type:cloze"]
+
+
+@dataclass
+class MatchCorpus:
+    """Legacy cards, new atoms and the atom each legacy card was derived from."""
+
+    old_states: list[CardLearningState]
+    new_atoms: list[GeneratedAtom]
+    sources: dict[str, str]  # old card_id -> new card_id it was reworded from
+
+
+def _vocabulary(rng: random.Random, size: int) -> list[str]:
+    words: set[str] = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    vocabulary = sorted(words)
+    rng.shuffle(vocabulary)  # Zipf rank must not follow spelling
+    return vocabulary
+
+
+def _reword(rng: random.Random, text: str, vocabulary: list[str]) -> str:
+    words = []
+    for word in text.split():
+        roll = rng.random()
+        if roll < 0.1:
+            continue  # Dropped
+        if roll < 0.18:
+            word = rng.choice(vocabulary)  # Swapped
+        elif roll < 0.25:
+            word += "s"
+        words.append(word)
+    return " ".join(words)
+
+
+def generate(n_old: int, n_new: int, seed: int = 7, derived_rate: float = 0.7) -> MatchCorpus:
+    """
+    Build a matching corpus.
+
+    Args:
+        n_old: Legacy cards
+        n_new: New atoms
+        seed: RNG seed
+        derived_rate: Share of legacy cards reworded from a new atom
+
+    Returns:
+        MatchCorpus
+    """
+    rng = random.Random(seed)
+    vocabulary = _vocabulary(rng, 20_000)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]  # Zipfian
+
+    def sentence(low: int, high: int) -> str:
+        return " ".join(rng.choices(vocabulary, weights, k=rng.randint(low, high)))
+
+    new_atoms = [
+        GeneratedAtom(
+            card_id=f"NET-M{i % 17 + 1}-S{i // 17}-FC-{i}",
+            atom_type=AtomType.FLASHCARD,
+            front=sentence(6, 14),
+            back=sentence(3, 10),
+            knowledge_type=KnowledgeType.FACTUAL,
+            tags=rng.sample(TAGS, 2),
+        )
+        for i in range(n_new)
+    ]
+
+    old_states, sources = [], {}
+    for i in range(n_old):
+        card_id = f"LEGACY-{i}"
+        if rng.random() < derived_rate:
+            source = rng.choice(new_atoms)
+            front = f"<b>{_reword(rng, source.front, vocabulary)}</b>"
+            back = _reword(rng, source.back, vocabulary)
+            tags = list(source.tags)
+            sources[card_id] = source.card_id
+        else:
+            front, back, tags = sentence(6, 14), sentence(3, 10), rng.sample(TAGS, 2)
+        old_states.append(
+            CardLearningState(
+                card_id=card_id,
+                anki_note_id=str(i),
+                anki_card_id=str(i),
+                total_reviews=rng.randint(1, 40),
+                interval_days=rng.randint(1, 90),
+                front_text=front,
+                back_text=back,
+                tags=tags,
+            )
+        )
+    return MatchCorpus(old_states=old_states, new_atoms=new_atoms, sources=sources)
+
+
+def recall(blocked: list[CardMatch], exhaustive: list[CardMatch]) -> float:
+    """Share of exhaustive matches the blocked matcher found with the same new card."""
+    if not exhaustive:
+        return 1.0
+    found = {(m.old_card_id, m.new_card_id) for m in blocked}
+    return sum((m.old_card_id, m.new_card_id) in found for m in exhaustive) / len(exhaustive)
+
+
+def service(candidates: int | None = None, workers: int | None = None) -> AnkiMigrationService:
+    """Migration service with optional matcher overrides."""
+    svc = AnkiMigrationService()
+    if candidates is not None:
+        svc.max_candidates = candidates
+    if workers is not None:
+        svc.match_workers = workers
+    return svc
@@ -0,0 +1,265 @@
+"""
+Local fake Notion server for block fetching.
+
+FakeNotionServer serves ``GET /v1/blocks/{id}/children`` for seeded
+synthetic pages (see generate_pages):
+- nested toggles and lists up to four levels deep
+- listings paginated at 100 blocks
+- per-request latency with jitter
+- a token-bucket rate limit that answers 429 with Retry-After, like
+  Notion's average of three requests per second with short bursts
+- Notion's timestamps: editing a block bumps its own last_edited_time and
+  its page's (``last_edited``, as a database query reports it), never a
+  parent block's
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+BLOCK_TYPES = ["paragraph", "heading_2", "bulleted_list_item", "code", "quote", "image"]
+PARENT_TYPES = ["toggle", "bulleted_list_item", "numbered_list_item", "callout"]
+WORDS = [
+    "vlan",
+    "trunk",
+    "subnet",
+    "router",
+    "switch",
+    "frame",
+    "packet",
+    "ospf",
+    "arp",
+    "dhcp",
+    "ipv6",
+    "gateway",
+]
+PAGE_SIZE = 100
+_CHILDREN_PATH = re.compile(r"^/v1/blocks/([^/]+)/children$")
+
+
+def _timestamp(n: int) -> str:
+    return f"2026-09-{1 + n // 1440 % 28:02d}T{n // 60 % 24:02d}:{n % 60:02d}:00.000Z"
+
+
+def generate_pages(
+    n_pages: int,
+    seed: int = 7,
+    parent_share: float = 0.08,
+) -> tuple[list[str], dict[str, list[dict[str, Any]]]]:
+    """Seeded page trees: (page ids, children by container id)."""
+    rng = random.Random(seed)
+    children: dict[str, list[dict[str, Any]]] = {}
+    counter = 0
+
+    def build(container: str, count: int, depth: int) -> None:
+        nonlocal counter
+        blocks = []
+        for _ in range(count):
+            counter += 1
+            nested = depth < 4 and rng.random() < parent_share * (2 if depth else 1)
+            block_type = rng.choice(PARENT_TYPES if nested else BLOCK_TYPES)
+            text = " ".join(rng.choices(WORDS, k=rng.randint(4, 16)))
+            blocks.append(
+                {
+                    "object": "block",
+                    "id": f"b{counter}",
+                    "type": block_type,
+                    "has_children": nested,
+                    "last_edited_time": _timestamp(counter),
+                    block_type: {"rich_text": [{"plain_text": text}]},
+                }
+            )
+            if nested:
+                build(f"b{counter}", rng.randint(2, 8), depth + 1)
+        children[container] = blocks
+
+    page_ids = [f"page-{n}" for n in range(n_pages)]
+    for page_id in page_ids:
+        build(page_id, rng.randint(30, 160), 0)
+    return page_ids, children
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate, self.burst = rate, burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> float:
+        """0 if a token was taken, else seconds until one is available."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class FakeNotionServer:
+    """Local HTTP server implementing the block children endpoint."""
+
+    def __init__(
+        self,
+        children: dict[str, list[dict[str, Any]]],
+        latency_s: float = 0.5,
+        jitter_s: float = 0.2,
+        rate: float = 3.0,
+        burst: int = 6,
+        retry_after: str | None = None,
+        seed: int = 7,
+    ):
+        """
+        Args:
+            children: Children by container id (see generate_pages)
+            latency_s: Mean response latency
+            jitter_s: Uniform +/- latency jitter
+            rate: Sustained requests per second before 429s
+            burst: Requests allowed at once
+            retry_after: Retry-After header value (default: the bucket's
+                refill time rounded up to whole seconds, as Notion sends)
+        """
+        self.children = children
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.retry_after = retry_after
+        self.bucket = _TokenBucket(rate, burst)
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+        self._parents = {b["id"]: c for c, blocks in children.items() for b in blocks}
+        # Page last_edited_time by page id, as returned by a database query
+        self.last_edited = {
+            container: max(_timestamp(0), *(b["last_edited_time"] for b in blocks))
+            for container, blocks in children.items()
+            if container not in self._parents
+        }
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def __enter__(self) -> FakeNotionServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def edit(self, block_id: str, text: str) -> None:
+        """Change a block's text, bumping its own and its page's last_edited_time."""
+        edited = "2026-10-01T00:00:00.000Z"
+        container = self._parents[block_id]
+        for block in self.children[container]:
+            if block["id"] == block_id:
+                block["last_edited_time"] = edited
+                block[block["type"]] = {"rich_text": [{"plain_text": text}]}
+        while container in self._parents:
+            container = self._parents[container]
+        self.last_edited[container] = edited
+
+    def walk(self, page_id: str, max_depth: int = 3) -> list[dict[str, Any]]:
+        """Expected flattened blocks of a page, straight from the tree."""
+
+        def visit(container: str, depth: int) -> list[dict[str, Any]]:
+            out = []
+            for block in self.children.get(container, []):
+                out.append(block)
+                if block["has_children"] and depth < max_depth:
+                    out.extend(visit(block["id"], depth + 1))
+            return out
+
+        return visit(page_id, 0)
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _send(self, status: int, body: dict, headers: dict | None = None) -> None:
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self) -> None:
+                with server._lock:
+                    server.requests += 1
+                    delay = server.latency_s + server.rng.uniform(
+                        -server.jitter_s, server.jitter_s
+                    )
+                wait = server.bucket.take()
+                if wait:
+                    with server._lock:
+                        server.rate_limited += 1
+                    retry_after = server.retry_after or str(max(1, int(wait + 0.999)))
+                    self._send(
+                        429,
+                        {"object": "error", "status": 429, "code": "rate_limited",
+                         "message": "You have been rate limited."},
+                        {"Retry-After": retry_after},
+                    )
+                    return
+
+                time.sleep(max(0.0, delay))
+                url = urlparse(self.path)
+                match = _CHILDREN_PATH.match(url.path)
+                if not match or match.group(1) not in server.children:
+                    self._send(404, {"object": "error", "status": 404,
+                                     "code": "object_not_found", "message": "Not found"})
+                    return
+                query = parse_qs(url.query)
+                start = int(query.get("start_cursor", ["0"])[0])
+                size = int(query.get("page_size", [str(PAGE_SIZE)])[0])
+                blocks = server.children[match.group(1)]
+                more = start + size < len(blocks)
+                self._send(
+                    200,
+                    {
+                        "object": "list",
+                        "results": blocks[start : start + size],
+                        "has_more": more,
+                        "next_cursor": str(start + size) if more else None,
+                    },
+                )
+
+        return Handler
+
+
+def make_client(url: str, cache_path: Path | None, rate: float, workers: int = 8):
+    """NotionClient pointed at the fake server."""
+    from src.sync.notion_client import NotionClient
+
+    client = NotionClient(api_key="secret_fake", base_url=url)
+    client._settings = client._settings.model_copy(
+        update={
+            "notion_block_cache_path": str(cache_path) if cache_path else None,
+            "notion_block_workers": workers,
+            "notion_requests_per_second": rate,
+        }
+    )
+    from src.sync.block_fetcher import RateLimiter
+
+    client._limiter = RateLimiter(rate, burst=max(1, int(rate)))
+    return client
@@ -0,0 +1,122 @@
+"""
+Textbook-shaped PDFs and the legacy extraction loop.
+
+generate_pdf writes a seeded PDF (chapters, "N.M Section" headings, dense
+body text) with PyMuPDF. LegacyPDFExtractor is the pre-parallel loop whose
+output the current extractor must reproduce.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+from pathlib import Path
+
+from src.etl.extractors.pdf_extractor import PDFExtractionConfig, PDFExtractor
+from src.etl.models import RawChunk
+from tests.fixtures import WORDS
+
+
+def generate_pdf(
+    path: str | Path,
+    pages: int,
+    pages_per_chapter: int = 40,
+    pages_per_section: int = 4,
+    seed: int = 5,
+) -> Path:
+    """Write a textbook-shaped PDF of ``pages`` pages."""
+    import fitz
+
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for n in range(pages):
+        chapter, offset = divmod(n, pages_per_chapter)
+        lines = []
+        if offset == 0:
+            lines.append(f"Chapter {chapter + 1}: {rng.choice(WORDS).title()} Fundamentals")
+        if offset % pages_per_section == 0:
+            lines.append(f"{chapter + 1}.{offset // pages_per_section + 1} {rng.choice(WORDS)}")
+        lines.extend(" ".join(rng.choices(WORDS, k=12)) for _ in range(45))
+        page = doc.new_page()
+        page.insert_text((36, 40), "\n".join(lines), fontsize=9)
+    doc.save(str(path))
+    doc.close()
+    return Path(path)
+
+
+class LegacyPDFExtractor(PDFExtractor):
+    """The pre-parallel extraction loop, kept for comparison."""
+
+    async def iter_chunks(self):
+        import fitz
+
+        doc = fitz.open(str(self.source))
+        try:
+            current_chapter = "Introduction"
+            current_section = ""
+            accumulated_text = ""
+            for page in doc:
+                text = page.get_text()
+                chapter_match = re.search(
+                    r"^(?:Chapter|CHAPTER)\s+(\d+)[:\s]+(.+)$", text, re.MULTILINE
+                )
+                if chapter_match:
+                    if accumulated_text.strip():
+                        chunk = self._legacy_chunk(
+                            current_chapter, current_section, accumulated_text.strip()
+                        )
+                        if self._filter_chunk(chunk):
+                            yield chunk
+                    current_chapter = f"Chapter {chapter_match.group(1)}: {chapter_match.group(2)}"
+                    accumulated_text = ""
+
+                section_match = re.search(r"^(?:\d+\.\d+)\s+(.+)$", text, re.MULTILINE)
+                if section_match:
+                    current_section = section_match.group(1)
+
+                accumulated_text += f"\n{text}"
+
+                if len(accumulated_text.split()) > self.config.max_section_words:
+                    chunk = self._legacy_chunk(
+                        current_chapter, current_section, accumulated_text.strip()[:5000]
+                    )
+                    if self._filter_chunk(chunk):
+                        yield chunk
+                    accumulated_text = ""
+
+            if accumulated_text.strip():
+                chunk = self._legacy_chunk(
+                    current_chapter, current_section, accumulated_text.strip()[:5000]
+                )
+                if self._filter_chunk(chunk):
+                    yield chunk
+        finally:
+            doc.close()
+
+    def _legacy_chunk(self, chapter: str, section: str, content: str) -> RawChunk:
+        return self._create_chunk(
+            chunk_id="legacy",
+            title=f"{chapter} - {section}".strip(" -"),
+            content=content,
+            module_number=self._extract_module_number(chapter),
+        )
+
+
+def config(
+    workers: int,
+    cache_path: Path | None,
+    max_section_words: int = 1000,
+    pages_per_task: int = 32,
+) -> PDFExtractionConfig:
+    return PDFExtractionConfig(
+        workers=workers,
+        pages_per_task=pages_per_task,
+        page_cache_path=cache_path,
+        max_section_words=max_section_words,
+        max_chunk_words=10**6,
+    )
+
+
+def signature(chunks: list[RawChunk]) -> list[tuple[str, str]]:
+    """Chunk identity without the random chunk ids."""
+    return [(c.title, c.content) for c in chunks]
@@ -0,0 +1,134 @@
+"""
+Seeded quiz question pools in SQLite.
+
+generate creates quiz_questions (with the migration 037 index) and fills
+seeded pools with a realistic mix of question types. SQLite has no md5();
+make_engine registers one (PostgreSQL's builtin returns the same hex
+digest). run_selection runs QuizPoolManager's awaits on a sync connection
+through SQLiteSession.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import random
+import uuid
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+
+from src.quiz.quiz_pool_manager import QuizPoolManager, SelectedQuestion
+
+QUESTION_TYPES = ["mcq", "true_false", "short_answer", "matching", "ranking", "passage_based"]
+TYPE_WEIGHTS = [50, 20, 15, 8, 5, 2]
+KNOWLEDGE_TYPES = ["factual", "conceptual", "procedural", "metacognitive"]
+
+SCHEMA = [
+    "CREATE TABLE learning_atoms (id TEXT PRIMARY KEY, front TEXT)",
+    """CREATE TABLE quiz_questions (
+        id TEXT PRIMARY KEY, atom_id TEXT NOT NULL, question_type TEXT NOT NULL,
+        question_content TEXT NOT NULL, difficulty REAL, intrinsic_load INTEGER,
+        knowledge_type TEXT, points INTEGER, partial_credit INTEGER,
+        distractor_quality_score REAL, answer_clarity_score REAL, quality_issues TEXT,
+        pool_id TEXT, is_active INTEGER, import_key TEXT, created_at TEXT, updated_at TEXT)""",
+    # Migration 037 (SQLite has no INCLUDE; the rowid plays its part)
+    """CREATE INDEX idx_quiz_questions_pool_active
+        ON quiz_questions(pool_id, question_type) WHERE is_active = 1""",
+]
+
+
+def _md5(value: str | None) -> str | None:
+    return None if value is None else hashlib.md5(value.encode()).hexdigest()
+
+
+def make_engine(path: Path) -> Engine:
+    """SQLite engine with PostgreSQL's md5() registered."""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _register(dbapi_conn, _record):
+        dbapi_conn.create_function("md5", 1, _md5, deterministic=True)
+
+    return engine
+
+
+def generate(engine: Engine, pools: int, questions: int, seed: int = 17) -> list[uuid.UUID]:
+    """Create the schema and seeded pools; returns the pool IDs."""
+    rng = random.Random(seed)
+    pool_ids = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(pools)]
+    with engine.begin() as conn:
+        for ddl in SCHEMA:
+            conn.execute(text(ddl))
+        for pool_id in pool_ids:
+            atoms, rows = [], []
+            for n in range(questions):
+                atom_id = uuid.UUID(int=rng.getrandbits(128)).hex
+                atoms.append({"id": atom_id, "front": f"Question {n}"})
+                rows.append(
+                    {
+                        "id": uuid.UUID(int=rng.getrandbits(128)).hex,
+                        "atom_id": atom_id,
+                        "type": rng.choices(QUESTION_TYPES, TYPE_WEIGHTS)[0],
+                        "content": json.dumps({"options": ["A", "B", "C", "D"]}),
+                        "difficulty": round(rng.uniform(0.1, 0.95), 2),
+                        "knowledge": rng.choice(KNOWLEDGE_TYPES),
+                        "pool": pool_id.hex,
+                        "active": rng.random() > 0.02,
+                    }
+                )
+            conn.execute(text("INSERT INTO learning_atoms VALUES (:id, :front)"), atoms)
+            conn.execute(
+                text(
+                    "INSERT INTO quiz_questions VALUES (:id, :atom_id, :type, :content, "
+                    ":difficulty, NULL, :knowledge, 1, 0, NULL, NULL, NULL, :pool, :active, NULL, "
+                    "'2026-01-01', '2026-01-01')"
+                ),
+                rows,
+            )
+    return pool_ids
+
+
+class _Rows:
+    def __init__(self, result: Any):
+        self.result = result
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        for row in self.result:
+            yield row
+
+    async def close(self) -> None:
+        self.result.close()
+
+
+class SQLiteSession:
+    """The AsyncSession subset QuizPoolManager uses, on a sync connection."""
+
+    def __init__(self, engine: Engine):
+        self.conn = engine.connect()
+
+    async def execute(self, statement: Any, params: Any = None) -> Any:
+        return self.conn.execute(statement, params or {})
+
+    async def stream(self, statement: Any) -> _Rows:
+        return _Rows(self.conn.execute(statement))
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def run_selection(engine: Engine, method: str, **kwargs: Any) -> list[SelectedQuestion]:
+    """Run one QuizPoolManager selection on a fresh connection."""
+    session = SQLiteSession(engine)
+    try:
+        manager = QuizPoolManager(session)  # type: ignore[arg-type]
+        return asyncio.run(getattr(manager, method)(**kwargs))
+    finally:
+        session.close()
@@ -0,0 +1,138 @@
+"""
+Seeded skill mastery histories and an in-memory SkillMasteryTracker.
+
+generate builds a response history over learners, atoms and weighted
+atom-skill links. InMemoryTracker keeps the tracker's tables in dicts and
+counts database round-trips; run_per_event and run_batch replay a history
+through the per-event and batch update paths.
+"""
+
+from __future__ import annotations
+
+import random
+import uuid
+from collections.abc import Iterable
+from dataclasses import asdict, replace
+from datetime import datetime, timedelta
+from typing import Any
+
+from src.learning.skill_mastery_tracker import (
+    SkillEvent,
+    SkillMasteryState,
+    SkillMasteryTracker,
+)
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128)))
+
+
+def generate(
+    events: int, learners: int, atoms: int, skills: int, seed: int = 7
+) -> tuple[list[SkillEvent], dict[str, list[dict[str, Any]]]]:
+    """Seeded response history and skill links (1-3 skills per atom, one primary)."""
+    rng = random.Random(seed)
+    skill_ids = [_uuid(rng) for _ in range(skills)]
+    atom_ids = [_uuid(rng) for _ in range(atoms)]
+    learner_ids = [_uuid(rng) for _ in range(learners)]
+    links: dict[str, list[dict[str, Any]]] = {}
+    for n, atom_id in enumerate(atom_ids):
+        if n % 50 == 0:
+            continue  # Some atoms have no skill links
+        linked = rng.sample(range(skills), rng.randint(1, 3))
+        rows = [
+            {
+                "skill_id": skill_ids[s],
+                "skill_code": f"SK{s:04d}",
+                "weight": 1.0 if i == 0 else round(rng.uniform(0.1, 0.9), 2),
+                "is_primary": i == 0,
+            }
+            for i, s in enumerate(linked)
+        ]
+        rows.sort(key=lambda r: (not r["is_primary"], -r["weight"]))
+        links[atom_id] = rows
+    start = datetime(2025, 1, 1)
+    history = [
+        SkillEvent(
+            learner_id=rng.choice(learner_ids),
+            atom_id=rng.choice(atom_ids),
+            is_correct=rng.random() < 0.7,
+            latency_ms=rng.randint(800, 30_000),
+            confidence=rng.randint(1, 5),
+            answered_at=start + timedelta(seconds=30 * n),
+        )
+        for n in range(events)
+    ]
+    return history, links
+
+
+class InMemoryTracker(SkillMasteryTracker):
+    """SkillMasteryTracker on dict tables; every database method is one round-trip."""
+
+    def __init__(self, links: dict[str, list[dict[str, Any]]]):
+        super().__init__(None)
+        self.links = links
+        self.codes = {
+            link["skill_id"]: link["skill_code"] for rows in links.values() for link in rows
+        }
+        self.rows: dict[tuple[str, str], SkillMasteryState] = {}
+        self.round_trips = 0
+
+    async def _get_atom_skills(self, atom_id: str) -> list[dict[str, Any]]:
+        self.round_trips += 1
+        return self.links.get(atom_id, [])
+
+    async def _get_skill_mastery(self, learner_id: str, skill_id: str) -> SkillMasteryState:
+        self.round_trips += 1
+        state = self.rows.get((learner_id, skill_id))
+        if state is None:
+            return self._default_state(skill_id, await self._get_skill_code(skill_id))
+        return state
+
+    async def _get_skill_code(self, skill_id: str) -> str:
+        self.round_trips += 1
+        return self.codes.get(skill_id, "UNKNOWN")
+
+    async def _save_skill_mastery(self, learner_id: str, skill_id: str, **values: Any) -> None:
+        self.round_trips += 1
+        self.rows[(learner_id, skill_id)] = SkillMasteryState(
+            skill_id=skill_id, skill_code=self.codes[skill_id], last_practiced=None, **values
+        )
+
+    async def _get_atom_skills_many(
+        self, atom_ids: Iterable[str] | None
+    ) -> dict[str, list[dict[str, Any]]]:
+        self.round_trips += 1
+        if atom_ids is None:
+            return dict(self.links)
+        return {a: self.links[a] for a in atom_ids if a in self.links}
+
+    async def _get_skill_masteries(
+        self, keys: Iterable[tuple[str, str]]
+    ) -> dict[tuple[str, str], SkillMasteryState]:
+        self.round_trips += 1
+        return {key: self.rows[key] for key in keys if key in self.rows}
+
+    async def _save_skill_masteries(
+        self, states: dict[tuple[str, str], SkillMasteryState]
+    ) -> int:
+        self.round_trips += 1
+        self.rows.update(states)
+        return len(states)
+
+
+def snapshot(tracker: InMemoryTracker) -> dict[tuple[str, str], dict[str, Any]]:
+    """Stored states without last_practiced (NOW() on the per-event path)."""
+    return {key: asdict(replace(s, last_practiced=None)) for key, s in tracker.rows.items()}
+
+
+async def run_per_event(tracker: InMemoryTracker, events: list[SkillEvent]) -> None:
+    for e in events:
+        await tracker.update_skill_mastery(
+            e.learner_id, e.atom_id, e.is_correct, e.latency_ms, e.confidence
+        )
+
+
+async def run_batch(tracker: InMemoryTracker, events: list[SkillEvent], chunk: int) -> None:
+    for start in range(0, len(events), chunk):
+        await tracker.update_skill_mastery_batch(events[start : start + chunk])
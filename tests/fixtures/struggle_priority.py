@@ -0,0 +1,156 @@
+"""
+Seeded struggle priority course in SQLite.
+
+generate creates the source tables and struggle_priority (the SQLite
+ports of migrations 018 and 035) and fills them with atoms spread over
+modules and sections and struggle weights on a share of them.
+VIEW_READ_SQL and TABLE_READ_SQL are the adaptive struggle read over the
+018 view definition and over the materialized table.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import text
+
+SCHEMA = [
+    """CREATE TABLE learning_atoms (
+        id TEXT PRIMARY KEY, card_id TEXT, atom_type TEXT, front TEXT, back TEXT,
+        ccna_section_id TEXT, anki_stability REAL, anki_difficulty REAL, updated_at TEXT)""",
+    "CREATE INDEX idx_atoms_section ON learning_atoms(ccna_section_id)",
+    "CREATE INDEX idx_atoms_card ON learning_atoms(card_id)",
+    """CREATE TABLE ccna_sections (
+        section_id TEXT PRIMARY KEY, module_number INTEGER, title TEXT)""",
+    """CREATE TABLE struggle_weights (
+        id TEXT PRIMARY KEY, user_id TEXT, module_number INTEGER, section_id TEXT, weight REAL)""",
+    """CREATE TABLE struggle_priority (
+        weight_id TEXT, atom_id TEXT, user_id TEXT, module_number INTEGER, section_id TEXT,
+        struggle_weight REAL, base_score REAL, atom_updated_at TEXT,
+        PRIMARY KEY (weight_id, atom_id))""",
+    "CREATE INDEX idx_struggle_priority_atom ON struggle_priority(atom_id)",
+    "CREATE INDEX idx_struggle_priority_module ON struggle_priority(module_number)",
+]
+
+ATOM_TYPES = ["mcq", "true_false", "parsons", "matching", "flashcard", "cloze"]
+
+_QUIZ_FILTER = """
+      AND la.atom_type IN ('mcq', 'true_false', 'parsons', 'matching')
+      AND la.front IS NOT NULL AND la.front != ''
+"""
+
+# Adaptive struggle read over the migration 018 view definition
+VIEW_READ_SQL = f"""
+    SELECT la.id, la.card_id, cs.module_number, sw.weight AS struggle_weight,
+        (sw.weight * 2.0)
+            + (1.0 - MIN(COALESCE(la.anki_stability, 30) / 30.0, 1.0))
+            + (1.0 / (1 + julianday(:now) - julianday(la.updated_at))) AS priority_score
+    FROM learning_atoms la
+    JOIN ccna_sections cs ON la.ccna_section_id = cs.section_id
+    JOIN struggle_weights sw
+        ON sw.module_number = cs.module_number
+        AND (sw.section_id IS NULL OR sw.section_id = cs.section_id)
+    WHERE sw.user_id = 'default' AND sw.weight >= 0.5
+      {_QUIZ_FILTER}
+    ORDER BY priority_score DESC
+    LIMIT :limit
+"""
+
+# The same read over the materialized table (migration 035 view)
+TABLE_READ_SQL = f"""
+    SELECT la.id, la.card_id, sp.module_number, sp.struggle_weight,
+        sp.base_score
+            + (1.0 / (1 + julianday(:now) - julianday(sp.atom_updated_at))) AS priority_score
+    FROM struggle_priority sp
+    JOIN learning_atoms la ON la.id = sp.atom_id
+    WHERE sp.user_id = 'default' AND sp.struggle_weight >= 0.5
+      {_QUIZ_FILTER}
+    ORDER BY priority_score DESC
+    LIMIT :limit
+"""
+
+
+@dataclass
+class Course:
+    atom_ids: list[str]
+    modules: list[int]
+
+
+def generate(
+    conn,
+    atoms: int,
+    modules: int = 60,
+    sections_per_module: int = 12,
+    seed: int = 13,
+) -> Course:
+    """Create the schema and a seeded synthetic course."""
+    rng = random.Random(seed)
+    for ddl in SCHEMA:
+        conn.execute(text(ddl))
+
+    sections = [
+        (f"{m}.{s}", m) for m in range(1, modules + 1) for s in range(1, sections_per_module + 1)
+    ]
+    conn.execute(
+        text("INSERT INTO ccna_sections VALUES (:s, :m, :t)"),
+        [{"s": s, "m": m, "t": f"Section {s}"} for s, m in sections],
+    )
+
+    weights = []
+    for m in range(1, modules + 1):
+        if rng.random() < 0.4:
+            weights.append((m, None, round(rng.uniform(0.3, 1.0), 2)))
+        for s in rng.sample(range(1, sections_per_module + 1), 2):
+            if rng.random() < 0.5:
+                weights.append((m, f"{m}.{s}", round(rng.uniform(0.3, 1.0), 2)))
+    conn.execute(
+        text("INSERT INTO struggle_weights VALUES (:id, 'default', :m, :s, :w)"),
+        [{"id": f"w{n}", "m": m, "s": s, "w": w} for n, (m, s, w) in enumerate(weights)],
+    )
+
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    atom_ids = [f"a{n}" for n in range(atoms)]
+    rows = [
+        {
+            "id": atom_id,
+            "card": f"c{n}",
+            "type": rng.choice(ATOM_TYPES),
+            "front": "" if rng.random() < 0.05 else "Q",
+            "section": rng.choice(sections)[0] if rng.random() < 0.95 else None,
+            "stability": None if rng.random() < 0.3 else round(rng.uniform(1, 90), 1),
+            "difficulty": rng.random(),
+            "updated": (start + timedelta(minutes=rng.randrange(400_000))).isoformat(),
+        }
+        for n, atom_id in enumerate(atom_ids)
+    ]
+    conn.execute(
+        text(
+            "INSERT INTO learning_atoms VALUES "
+            "(:id, :card, :type, :front, 'A', :section, :stability, :difficulty, :updated)"
+        ),
+        rows,
+    )
+    return Course(atom_ids=atom_ids, modules=list(range(1, modules + 1)))
+
+
+def record_interactions(conn, atom_ids: list[str], rng: random.Random, now: datetime) -> None:
+    """Apply record_interaction's stability update to each atom."""
+    updates = [{"id": atom_id, "correct": rng.random() < 0.7} for atom_id in atom_ids]
+    conn.execute(
+        text(
+            "UPDATE learning_atoms SET "
+            "anki_stability = CASE WHEN :correct "
+            "    THEN MIN(COALESCE(anki_stability, 1) * 2.5, 365) "
+            "    ELSE MAX(COALESCE(anki_stability, 1) * 0.5, 1) END, "
+            "updated_at = :now WHERE id = :id"
+        ),
+        [{**u, "now": now.isoformat()} for u in updates],
+    )
+
+
+def snapshot(conn) -> list[tuple]:
+    return conn.execute(
+        text("SELECT * FROM struggle_priority ORDER BY weight_id, atom_id")
+    ).fetchall()
@@ -0,0 +1,55 @@
+"""
+Fixtures for integration tests that run against PostgreSQL.
+
+``pg_schema`` creates a scratch schema on the configured database
+(DATABASE_URL) for one test module and drops it afterwards, so tests can
+apply migrations to their own tables without touching real data. Tests
+using it are skipped when the server is unreachable. ``run_migration``
+executes a file from src/db/migrations.
+"""
+
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+MIGRATIONS = Path(__file__).parents[2] / "src" / "db" / "migrations"
+
+
+@pytest.fixture(scope="module")
+def pg_schema(db_url):
+    """Name of a scratch schema on the test database (module scope)."""
+    if not db_url.startswith("postgresql"):
+        pytest.skip("PostgreSQL not configured")
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(db_url)
+    try:
+        with admin.begin() as conn:
+            conn.execute(text(f"CREATE SCHEMA {schema}"))
+    except Exception as e:
+        admin.dispose()
+        pytest.skip(f"Database not available: {e}")
+    yield schema
+    with admin.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    admin.dispose()
+
+
+@pytest.fixture(scope="module")
+def pg_engine(db_url, pg_schema) -> Engine:
+    """Sync engine whose connections use the scratch schema."""
+    engine = create_engine(db_url, connect_args={"options": f"-csearch_path={pg_schema}"})
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def run_migration():
+    """Execute a migration file from src/db/migrations on a connection."""
+
+    def run(conn, name: str) -> None:
+        conn.exec_driver_sql((MIGRATIONS / name).read_text(encoding="utf-8"))
+
+    return run
@@ -0,0 +1,137 @@
+"""
+Integration tests for the dashboard rollup triggers (migration 040).
+
+Writers that know nothing about the rollups (plain INSERT, UPDATE and
+DELETE on the source tables, as the CCNA router and the ETL loaders issue
+them) must leave the rollups equal to a full rebuild. Requires PostgreSQL;
+runs in a scratch schema.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from src.study.summary_store import DashboardSummaryStore
+
+SOURCE_DDL = """
+CREATE TABLE ccna_sections (
+    section_id TEXT PRIMARY KEY,
+    module_number INTEGER NOT NULL,
+    level INTEGER DEFAULT 2,
+    display_order INTEGER
+);
+CREATE TABLE learning_atoms (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    card_id TEXT,
+    atom_type TEXT,
+    front TEXT,
+    ccna_section_id TEXT,
+    anki_review_count INTEGER DEFAULT 0,
+    anki_due_date DATE,
+    nls_correct_count INTEGER DEFAULT 0,
+    nls_incorrect_count INTEGER DEFAULT 0
+);
+CREATE TABLE ccna_section_mastery (
+    section_id TEXT,
+    user_id TEXT DEFAULT 'default',
+    mastery_score FLOAT,
+    is_completed BOOLEAN DEFAULT FALSE,
+    needs_remediation BOOLEAN DEFAULT FALSE,
+    atoms_total INTEGER DEFAULT 0,
+    atoms_mastered INTEGER DEFAULT 0,
+    atoms_learning INTEGER DEFAULT 0,
+    atoms_struggling INTEGER DEFAULT 0,
+    atoms_new INTEGER DEFAULT 0
+);
+"""
+
+ROLLUP_SQL = (
+    "SELECT * FROM dashboard_atom_rollup ORDER BY 1, 2, 3",
+    "SELECT * FROM dashboard_due_rollup ORDER BY 1",
+)
+
+
+@pytest.fixture(scope="module")
+def engine(pg_engine, run_migration):
+    with pg_engine.begin() as conn:
+        conn.exec_driver_sql(SOURCE_DDL)
+        run_migration(conn, "034_dashboard_rollups.sql")
+        run_migration(conn, "040_dashboard_rollup_triggers.sql")
+    return pg_engine
+
+
+@pytest.fixture
+def conn(engine):
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        connection.execute(
+            text(
+                "INSERT INTO ccna_sections (section_id, module_number, display_order) "
+                "VALUES ('1.1', 1, 1), ('1.2', 1, 2), ('2.1', 2, 3)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO learning_atoms (card_id, atom_type, front, ccna_section_id, "
+                " anki_review_count, anki_due_date, nls_correct_count) "
+                "SELECT 'c' || g, (ARRAY['mcq', 'flashcard', NULL])[g % 3 + 1], "
+                " CASE WHEN g % 4 = 0 THEN '' ELSE 'Q' END, "
+                " (ARRAY['1.1', '1.2', '2.1', NULL])[g % 4 + 1], g % 2, "
+                " CURRENT_DATE + (g % 5), g % 3 "
+                "FROM generate_series(1, 60) g"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO ccna_section_mastery (section_id, mastery_score) "
+                "VALUES ('1.1', 0.5), ('2.1', 0.9)"
+            )
+        )
+        yield connection
+        transaction.rollback()
+
+
+def assert_matches_rebuild(conn) -> None:
+    maintained = [conn.execute(text(sql)).fetchall() for sql in ROLLUP_SQL]
+    DashboardSummaryStore().rebuild(conn)
+    assert maintained == [conn.execute(text(sql)).fetchall() for sql in ROLLUP_SQL]
+
+
+def test_inserted_atoms_are_counted(conn):
+    total = conn.execute(text("SELECT SUM(atom_count) FROM dashboard_atom_rollup")).scalar()
+    assert total == 60
+    assert_matches_rebuild(conn)
+
+
+def test_atom_updates_and_deletes_are_followed(conn):
+    conn.execute(
+        text(
+            "UPDATE learning_atoms SET anki_review_count = anki_review_count + 1, "
+            "anki_due_date = CURRENT_DATE + 9, nls_correct_count = 5 "
+            "WHERE card_id IN ('c1', 'c2', 'c3')"
+        )
+    )
+    conn.execute(text("UPDATE learning_atoms SET ccna_section_id = '2.1' WHERE card_id = 'c4'"))
+    conn.execute(text("UPDATE learning_atoms SET front = NULL, atom_type = 'mcq' WHERE card_id = 'c5'"))
+    conn.execute(text("DELETE FROM learning_atoms WHERE card_id IN ('c6', 'c7')"))
+
+    assert_matches_rebuild(conn)
+
+
+def test_section_changes_move_atoms_between_modules(conn):
+    conn.execute(text("UPDATE ccna_sections SET module_number = 2 WHERE section_id = '1.2'"))
+    assert_matches_rebuild(conn)
+
+    conn.execute(text("DELETE FROM ccna_sections WHERE section_id = '2.1'"))
+    assert_matches_rebuild(conn)
+
+
+def test_mastery_changes_drop_section_rollup(conn):
+    store = DashboardSummaryStore()
+    store.refresh_sections(conn, "default")
+    assert conn.execute(text("SELECT COUNT(*) FROM dashboard_section_rollup")).scalar() > 0
+
+    conn.execute(text("UPDATE ccna_section_mastery SET is_completed = TRUE WHERE section_id = '1.1'"))
+
+    assert conn.execute(text("SELECT COUNT(*) FROM dashboard_section_rollup")).scalar() == 0
+    snapshot = store.snapshot("default", conn=conn)
+    assert snapshot.sections[(1, 2)].completed_count == 1
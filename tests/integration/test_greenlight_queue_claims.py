@@ -0,0 +1,183 @@
+"""
+Integration tests for Greenlight queue claims (migration 036) on asyncpg.
+
+Exercises the statements the unit tests only mock: the SKIP LOCKED claim
+with its make_interval lease, lease reclaim, the batch writes that bind
+uuid[] and text[] arrays through unnest, the NOTIFY trigger and the
+listener that waits on it. Requires PostgreSQL; runs in a scratch schema.
+"""
+
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.integrations.greenlight_queue_manager import (
+    GreenlightQueueListener,
+    GreenlightQueueManager,
+)
+
+# Migration 031's table without the learning_atoms foreign key
+TABLE_DDL = """
+CREATE TABLE greenlight_queue (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    atom_id UUID,
+    learner_id UUID NOT NULL,
+    execution_id VARCHAR(100) UNIQUE,
+    status VARCHAR(20) DEFAULT 'pending',
+    request_payload JSONB NOT NULL,
+    result_payload JSONB,
+    queued_at TIMESTAMPTZ DEFAULT NOW(),
+    started_at TIMESTAMPTZ,
+    completed_at TIMESTAMPTZ,
+    error_message TEXT,
+    retry_count INTEGER DEFAULT 0,
+    max_retries INTEGER DEFAULT 3
+);
+"""
+
+
+@pytest.fixture(scope="module")
+def schema(pg_engine, pg_schema, run_migration):
+    with pg_engine.begin() as conn:
+        conn.exec_driver_sql(TABLE_DDL)
+        run_migration(conn, "036_greenlight_queue_claims.sql")
+    return pg_schema
+
+
+@pytest_asyncio.fixture
+async def engine(db_url, schema):
+    engine = create_async_engine(
+        db_url.replace("postgresql://", "postgresql+asyncpg://", 1),
+        connect_args={"server_settings": {"search_path": schema}},
+    )
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE greenlight_queue"))
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def scope(engine):
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def session_scope():
+        async with factory() as session:
+            yield session
+            await session.commit()
+
+    return session_scope
+
+
+async def enqueue(scope, count: int, max_retries: int = 3) -> list[str]:
+    async with scope() as session:
+        result = await session.execute(
+            text(
+                "INSERT INTO greenlight_queue (learner_id, request_payload, max_retries, queued_at) "
+                "SELECT gen_random_uuid(), jsonb_build_object('n', g), :max_retries, "
+                "       NOW() - make_interval(secs => :count - g) "
+                "FROM generate_series(1, :count) g "
+                "RETURNING id"
+            ),
+            {"count": count, "max_retries": max_retries},
+        )
+        ids = [str(row[0]) for row in result]
+    return ids
+
+
+async def rows(scope) -> dict[str, dict]:
+    async with scope() as session:
+        result = await session.execute(text("SELECT * FROM greenlight_queue"))
+        return {str(row.id): dict(row._mapping) for row in result}
+
+
+@pytest.mark.asyncio
+async def test_claim_skips_rows_locked_by_another_claim(scope):
+    ids = await enqueue(scope, 5)
+
+    async with scope() as first:
+        held = await GreenlightQueueManager(first).claim("w1", limit=3, lease_seconds=90)
+        # Second worker claims while the first transaction still holds its locks
+        async with scope() as second:
+            rest = await GreenlightQueueManager(second).claim("w2", limit=5, lease_seconds=90)
+
+    assert [item.id for item in held] == ids[:3]
+    assert [item.id for item in rest] == ids[3:]
+    assert held[0].request_payload == {"n": 1}
+    state = await rows(scope)
+    assert {state[i]["worker_id"] for i in ids[:3]} == {"w1"}
+    assert all(row["status"] == "executing" for row in state.values())
+    lease = state[ids[0]]["lease_expires_at"] - state[ids[0]]["started_at"]
+    assert lease.total_seconds() == pytest.approx(90)
+
+
+@pytest.mark.asyncio
+async def test_reclaim_expired_requeues_or_fails(scope):
+    ids = await enqueue(scope, 2)
+    async with scope() as session:
+        await session.execute(
+            text("UPDATE greenlight_queue SET max_retries = 1 WHERE id = :id"), {"id": ids[1]}
+        )
+        await GreenlightQueueManager(session).claim("w1", limit=2, lease_seconds=0)
+    async with scope() as session:
+        assert await GreenlightQueueManager(session).heartbeat("w1", ids, lease_seconds=0) == 2
+
+    async with scope() as session:
+        reclaimed = await GreenlightQueueManager(session).reclaim_expired()
+
+    state = await rows(scope)
+    assert reclaimed == 2
+    assert [state[i]["status"] for i in ids] == ["pending", "failed"]
+    assert [state[i]["retry_count"] for i in ids] == [1, 1]
+    assert state[ids[0]]["worker_id"] is None
+    assert state[ids[0]]["error_message"] == "Lease expired on worker w1"
+
+
+@pytest.mark.asyncio
+async def test_batch_outcomes_apply_only_to_held_leases(scope):
+    ids = await enqueue(scope, 4)
+    async with scope() as session:
+        await session.execute(
+            text("UPDATE greenlight_queue SET max_retries = 1 WHERE id = :id"), {"id": ids[3]}
+        )
+        await GreenlightQueueManager(session).claim("w1", limit=4)
+
+    async with scope() as session:
+        manager = GreenlightQueueManager(session)
+        completed = await manager.complete_many({ids[0]: {"ok": True}, ids[1]: {"ok": 1}}, "w1")
+        stolen = await manager.complete_many({ids[2]: {"ok": True}}, "w2")
+        requeued = await manager.fail_many({ids[2]: "timeout", ids[3]: "boom"}, "w1")
+
+    state = await rows(scope)
+    assert (completed, stolen) == (2, 0)
+    assert requeued == {ids[2]: True, ids[3]: False}
+    assert state[ids[0]]["result_payload"] == {"ok": True}
+    assert state[ids[0]]["lease_expires_at"] is None
+    assert [state[i]["status"] for i in ids] == ["complete", "complete", "pending", "failed"]
+    assert state[ids[3]]["error_message"] == "boom"
+
+
+@pytest.mark.asyncio
+async def test_listener_wakes_when_rows_become_pending(engine, scope):
+    listener = GreenlightQueueListener(engine)
+    await listener.start()
+    try:
+        assert await listener.wait(0.2) is False
+
+        ids = await enqueue(scope, 3)
+        assert await listener.wait(5) is True
+
+        async with scope() as session:
+            await GreenlightQueueManager(session).claim("w1", limit=3)
+        async with scope() as session:
+            await GreenlightQueueManager(session).complete_many({ids[0]: {"ok": True}}, "w1")
+        assert await listener.wait(0.2) is False
+
+        async with scope() as session:
+            await GreenlightQueueManager(session).fail_many({ids[1]: "retry me"}, "w1")
+        assert await listener.wait(5) is True
+    finally:
+        await listener.close()
@@ -0,0 +1,169 @@
+"""
+Integration tests for the skill mastery backfill on asyncpg.
+
+Runs HISTORY_SQL (both response tables through UNION ALL, non-UUID
+learners filtered out by the regex), the uuid[] unnest read and the
+unnest upsert that the unit tests only mock. Requires PostgreSQL; runs in
+a scratch schema.
+"""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import asyncpg
+import pytest
+import pytest_asyncio
+
+from src.learning.skill_mastery_tracker import SkillEvent, SkillMasteryTracker
+
+# Migration 030's skill tables plus the response tables, without foreign keys
+# to the content tables
+TABLE_DDL = """
+CREATE TABLE skills (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    skill_code VARCHAR(100) UNIQUE NOT NULL
+);
+CREATE TABLE atom_skill_weights (
+    atom_id UUID NOT NULL,
+    skill_id UUID NOT NULL REFERENCES skills(id),
+    weight FLOAT NOT NULL DEFAULT 1.0,
+    is_primary BOOLEAN DEFAULT FALSE,
+    UNIQUE (atom_id, skill_id)
+);
+CREATE TABLE learner_skill_mastery (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    learner_id UUID NOT NULL,
+    skill_id UUID NOT NULL REFERENCES skills(id),
+    mastery_level FLOAT NOT NULL DEFAULT 0.0,
+    confidence_interval FLOAT NOT NULL DEFAULT 0.5,
+    practice_count INTEGER NOT NULL DEFAULT 0,
+    consecutive_correct INTEGER NOT NULL DEFAULT 0,
+    last_practiced TIMESTAMPTZ,
+    retrievability FLOAT NOT NULL DEFAULT 1.0,
+    difficulty FLOAT NOT NULL DEFAULT 0.3,
+    stability FLOAT NOT NULL DEFAULT 1.0,
+    last_updated TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE (learner_id, skill_id)
+);
+CREATE TABLE atom_responses (
+    atom_id UUID NOT NULL,
+    user_id VARCHAR(100) NOT NULL DEFAULT 'default',
+    is_correct BOOLEAN NOT NULL,
+    response_time_ms INTEGER,
+    responded_at TIMESTAMPTZ
+);
+CREATE TABLE learning_path_sessions (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    learner_id TEXT NOT NULL
+);
+CREATE TABLE session_atom_responses (
+    session_id UUID NOT NULL REFERENCES learning_path_sessions(id),
+    atom_id UUID NOT NULL,
+    is_correct BOOLEAN,
+    time_spent_ms INT,
+    confidence_rating INT,
+    answered_at TIMESTAMPTZ
+);
+"""
+
+LEARNER = str(uuid.UUID(int=1))
+ATOM = str(uuid.UUID(int=20))
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+@pytest.fixture(scope="module")
+def schema(pg_engine, pg_schema):
+    with pg_engine.begin() as conn:
+        conn.exec_driver_sql(TABLE_DDL)
+    return pg_schema
+
+
+@pytest_asyncio.fixture
+async def conn(db_url, schema):
+    connection = await asyncpg.connect(db_url, server_settings={"search_path": schema})
+    await connection.execute(
+        "TRUNCATE learner_skill_mastery, atom_skill_weights, skills, atom_responses, "
+        "session_atom_responses, learning_path_sessions"
+    )
+    yield connection
+    await connection.close()
+
+
+async def seed(conn) -> list[str]:
+    skill_ids = [
+        str(await conn.fetchval("INSERT INTO skills (skill_code) VALUES ($1) RETURNING id", code))
+        for code in ("NET-1", "NET-2")
+    ]
+    await conn.executemany(
+        "INSERT INTO atom_skill_weights (atom_id, skill_id, weight, is_primary) "
+        "VALUES ($1, $2, $3, $4)",
+        [(ATOM, skill_ids[0], 1.0, True), (ATOM, skill_ids[1], 0.5, False)],
+    )
+    await conn.executemany(
+        "INSERT INTO atom_responses (atom_id, user_id, is_correct, response_time_ms, "
+        "responded_at) VALUES ($1, $2, $3, $4, $5)",
+        [
+            (ATOM, LEARNER, True, None, START),
+            (ATOM, LEARNER, True, 3_000, START + timedelta(minutes=2)),
+            (ATOM, "default", False, 1_000, START),  # Not a UUID learner
+            (ATOM, LEARNER, False, 1_000, None),  # No timestamp
+        ],
+    )
+    session = await conn.fetchval(
+        "INSERT INTO learning_path_sessions (learner_id) VALUES ($1) RETURNING id", LEARNER
+    )
+    await conn.executemany(
+        "INSERT INTO session_atom_responses (session_id, atom_id, is_correct, time_spent_ms, "
+        "confidence_rating, answered_at) VALUES ($1, $2, $3, $4, $5, $6)",
+        [
+            (session, ATOM, False, 5_000, 5, START + timedelta(minutes=1)),
+            (session, ATOM, None, 5_000, 5, START + timedelta(minutes=3)),  # Unscored
+        ],
+    )
+    return skill_ids
+
+
+@pytest.mark.asyncio
+async def test_backfill_replays_both_response_tables(conn):
+    skill_ids = await seed(conn)
+    tracker = SkillMasteryTracker(conn)
+
+    result = await tracker.backfill_from_history(prefetch=2)
+
+    assert (result.events, result.skipped_events, result.states_written) == (3, 0, 2)
+    expected: dict = {}
+    tracker.apply_events(
+        [
+            SkillEvent(LEARNER, ATOM, True, 0, 3, START),
+            SkillEvent(LEARNER, ATOM, False, 5_000, 5, START + timedelta(minutes=1)),
+            SkillEvent(LEARNER, ATOM, True, 3_000, 3, START + timedelta(minutes=2)),
+        ],
+        await tracker._get_atom_skills_many([ATOM]),
+        expected,
+    )
+    stored = await tracker._get_skill_masteries((LEARNER, s) for s in skill_ids)
+    assert stored == expected
+    assert stored[(LEARNER, skill_ids[0])].last_practiced == START + timedelta(minutes=2)
+
+
+@pytest.mark.asyncio
+async def test_backfill_overwrites_existing_rows(conn):
+    skill_ids = await seed(conn)
+    tracker = SkillMasteryTracker(conn)
+    await conn.execute(
+        "INSERT INTO learner_skill_mastery (learner_id, skill_id, mastery_level, practice_count) "
+        "VALUES ($1, $2, 0.99, 40)",
+        LEARNER,
+        skill_ids[0],
+    )
+
+    await tracker.backfill_from_history()
+    await tracker.backfill_from_history()
+
+    rows = await conn.fetch(
+        "SELECT skill_id, practice_count FROM learner_skill_mastery WHERE learner_id = $1",
+        uuid.UUID(LEARNER),
+    )
+    assert sorted((str(r["skill_id"]), r["practice_count"]) for r in rows) == sorted(
+        (s, 3) for s in skill_ids
+    )
@@ -0,0 +1,124 @@
+"""
+Integration tests for the struggle_priority maintenance triggers (migration 039).
+
+Writers that know nothing about struggle_priority (plain INSERT, UPDATE and
+DELETE on the source tables, as the importers, remediation and ETL issue
+them) must leave the table equal to a full rebuild. Requires PostgreSQL;
+runs in a scratch schema.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from src.study.struggle_priority import StrugglePriorityStore
+
+SOURCE_DDL = """
+CREATE TABLE ccna_sections (
+    section_id TEXT PRIMARY KEY,
+    module_number INTEGER NOT NULL,
+    title TEXT,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE TABLE learning_atoms (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    card_id TEXT,
+    atom_type TEXT DEFAULT 'mcq',
+    front TEXT DEFAULT 'Q',
+    back TEXT DEFAULT 'A',
+    ccna_section_id TEXT,
+    anki_difficulty FLOAT,
+    anki_stability FLOAT,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE TABLE struggle_weights (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id VARCHAR(255) DEFAULT 'default',
+    module_number INTEGER NOT NULL,
+    section_id TEXT,
+    weight FLOAT NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+"""
+
+ROWS_SQL = """
+    SELECT weight_id, atom_id, user_id, module_number, section_id,
+           struggle_weight, base_score, atom_updated_at
+    FROM struggle_priority ORDER BY weight_id, atom_id
+"""
+
+
+@pytest.fixture(scope="module")
+def engine(pg_engine, run_migration):
+    with pg_engine.begin() as conn:
+        conn.exec_driver_sql(SOURCE_DDL)
+        run_migration(conn, "035_struggle_priority.sql")
+        run_migration(conn, "039_struggle_priority_triggers.sql")
+    return pg_engine
+
+
+@pytest.fixture
+def conn(engine):
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        connection.execute(
+            text(
+                "INSERT INTO ccna_sections (section_id, module_number) "
+                "VALUES ('1.1', 1), ('1.2', 1), ('2.1', 2)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO struggle_weights (module_number, section_id, weight) "
+                "VALUES (1, NULL, 0.8), (2, '2.1', 0.5)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO learning_atoms (card_id, ccna_section_id, anki_stability) "
+                "SELECT 'c' || g, (ARRAY['1.1', '1.2', '2.1'])[g % 3 + 1], g % 40 "
+                "FROM generate_series(1, 60) g"
+            )
+        )
+        yield connection
+        transaction.rollback()
+
+
+def assert_matches_rebuild(conn) -> None:
+    maintained = conn.execute(text(ROWS_SQL)).fetchall()
+    StrugglePriorityStore().rebuild(conn)
+    assert maintained == conn.execute(text(ROWS_SQL)).fetchall()
+
+
+def test_inserted_atoms_get_rows(conn):
+    assert conn.execute(text("SELECT COUNT(*) FROM struggle_priority")).scalar() == 60
+    assert_matches_rebuild(conn)
+
+
+def test_atom_updates_and_deletes_are_followed(conn):
+    conn.execute(text("UPDATE learning_atoms SET anki_stability = 31 WHERE card_id IN ('c1', 'c2')"))
+    conn.execute(text("UPDATE learning_atoms SET ccna_section_id = '2.1' WHERE card_id = 'c3'"))
+    conn.execute(text("UPDATE learning_atoms SET ccna_section_id = NULL WHERE card_id = 'c4'"))
+    conn.execute(text("DELETE FROM learning_atoms WHERE card_id = 'c5'"))
+
+    assert_matches_rebuild(conn)
+
+
+def test_weight_and_section_changes_are_followed(conn):
+    conn.execute(text("UPDATE struggle_weights SET weight = 0.95 WHERE module_number = 1"))
+    conn.execute(
+        text("INSERT INTO struggle_weights (module_number, section_id, weight) VALUES (1, '1.2', 0.6)")
+    )
+    conn.execute(text("DELETE FROM struggle_weights WHERE module_number = 2"))
+    conn.execute(text("UPDATE ccna_sections SET module_number = 2 WHERE section_id = '1.2'"))
+
+    assert_matches_rebuild(conn)
+
+
+def test_view_never_ranks_deleted_weights(conn):
+    conn.execute(
+        text("ALTER TABLE struggle_weights DISABLE TRIGGER trg_struggle_priority_weights_delete")
+    )
+    conn.execute(text("DELETE FROM struggle_weights WHERE module_number = 1"))
+
+    modules = conn.execute(text("SELECT DISTINCT module_number FROM v_struggle_priority")).fetchall()
+    assert modules == [(2,)]
@@ -0,0 +1,88 @@
+"""
+Integration tests for the updated_at triggers (migration 038).
+
+Study-table writes must bump updated_at so replica pulls see them, while
+calibration writes to the psychometric columns of learning_atoms must not.
+Requires PostgreSQL; runs in a scratch schema.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from src.adaptive.psychometrics import CALIBRATION_COLUMNS
+
+# Migration 005's trigger function and the tables migration 038 attaches to
+SOURCE_DDL = """
+CREATE FUNCTION update_updated_at_column()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.updated_at = now();
+    RETURN NEW;
+END;
+$$;
+CREATE TABLE learning_atoms (
+    id TEXT PRIMARY KEY,
+    front TEXT,
+    anki_stability FLOAT,
+    irt_difficulty NUMERIC(5,3),
+    irt_discrimination NUMERIC(5,3),
+    irt_guessing NUMERIC(4,3),
+    p_value NUMERIC(5,4),
+    discrimination_index NUMERIC(5,4),
+    response_count INTEGER DEFAULT 0,
+    correct_count INTEGER DEFAULT 0,
+    updated_at TIMESTAMPTZ
+);
+CREATE TABLE ccna_sections (section_id TEXT PRIMARY KEY, title TEXT, updated_at TIMESTAMPTZ);
+CREATE TABLE ccna_section_mastery (section_id TEXT, updated_at TIMESTAMPTZ);
+CREATE TABLE concepts (id TEXT PRIMARY KEY, name TEXT, updated_at TIMESTAMPTZ);
+"""
+
+
+@pytest.fixture(scope="module")
+def engine(pg_engine, run_migration):
+    with pg_engine.begin() as conn:
+        conn.exec_driver_sql(SOURCE_DDL)
+        run_migration(conn, "038_updated_at_triggers.sql")
+    return pg_engine
+
+
+@pytest.fixture
+def conn(engine):
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        connection.execute(
+            text(
+                "INSERT INTO learning_atoms (id, front, anki_stability, updated_at) "
+                "VALUES ('a', 'Q', 1.0, '2025-01-01T00:00:00Z')"
+            )
+        )
+        yield connection
+        transaction.rollback()
+
+
+def updated_at(conn):
+    return conn.execute(text("SELECT updated_at FROM learning_atoms WHERE id = 'a'")).scalar()
+
+
+def test_calibration_columns_keep_updated_at(conn):
+    before = updated_at(conn)
+    assignments = ", ".join(f"{column} = 0.5" for column in CALIBRATION_COLUMNS)
+
+    conn.execute(text(f"UPDATE learning_atoms SET {assignments} WHERE id = 'a'"))
+
+    assert updated_at(conn) == before
+
+
+@pytest.mark.parametrize(
+    "assignment",
+    ["front = 'Q2'", "anki_stability = 4.0", "front = 'Q2', p_value = 0.5"],
+)
+def test_study_column_changes_bump_updated_at(conn, assignment):
+    before = updated_at(conn)
+
+    conn.execute(text(f"UPDATE learning_atoms SET {assignment} WHERE id = 'a'"))
+
+    assert updated_at(conn) > before
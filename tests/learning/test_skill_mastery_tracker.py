@@ -6,17 +6,25 @@ Tests:
 - Hypercorrection logic (high confidence + wrong = bigger penalty)
 - FSRS parameter updates
 - Confidence interval computation
+- Batch updates, backfill and the statements they send
 """
 
 import math
+import uuid
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
 
 import pytest
 
+from src.learning import skill_mastery_tracker
 from src.learning.skill_mastery_tracker import (
+    HISTORY_SQL,
+    SkillEvent,
     SkillMasteryState,
     SkillMasteryTracker,
     SkillUpdate,
 )
+from tests.fixtures import skill_mastery
 
 
 class MockDB:
@@ -25,22 +33,44 @@ class MockDB:
     def __init__(self):
         self.queries = []
         self.mock_data = {}
+        self.in_transaction = False
+        self.transaction_queries = []
+
+    def _record(self, query: str, args: tuple) -> None:
+        self.queries.append((query, args))
+        if self.in_transaction:
+            self.transaction_queries.append(query)
 
     async def fetch(self, query: str, *args):
         """Mock fetch method."""
-        self.queries.append((query, args))
+        self._record(query, args)
         return self.mock_data.get("fetch", [])
 
     async def fetchrow(self, query: str, *args):
         """Mock fetchrow method."""
-        self.queries.append((query, args))
+        self._record(query, args)
         return self.mock_data.get("fetchrow")
 
     async def execute(self, query: str, *args):
         """Mock execute method."""
-        self.queries.append((query, args))
+        self._record(query, args)
         return "EXECUTED"
 
+    @asynccontextmanager
+    async def transaction(self):
+        """Mock transaction context manager."""
+        self.in_transaction = True
+        try:
+            yield
+        finally:
+            self.in_transaction = False
+
+    async def cursor(self, query: str, *args, prefetch: int | None = None):
+        """Mock cursor; rows come from mock_data["cursor"]."""
+        self._record(query, (*args, prefetch))
+        for row in self.mock_data.get("cursor", []):
+            yield row
+
 
 @pytest.fixture
 def mock_db():
@@ -340,3 +370,213 @@ class TestEdgeCases:
         # Larger update with high confidence
         assert result > 0.5
         assert result == pytest.approx(0.6, rel=0.01)
+
+
+class TestBatchUpdate:
+    """Tests for batch updates (in-memory tables from tests/fixtures)."""
+
+    @pytest.fixture
+    def history(self):
+        return skill_mastery.generate(2_000, learners=40, atoms=60, skills=20, seed=5)
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_per_event_exactly(self, history):
+        events, links = history
+        per_event = skill_mastery.InMemoryTracker(links)
+        await skill_mastery.run_per_event(per_event, events)
+        batch = skill_mastery.InMemoryTracker(links)
+        await skill_mastery.run_batch(batch, events, chunk=500)
+
+        assert skill_mastery.snapshot(batch) == skill_mastery.snapshot(per_event)
+        assert batch.round_trips == 3 * 4  # links, states, upsert per chunk
+
+    @pytest.mark.asyncio
+    async def test_batch_counts_and_last_practiced(self, history):
+        events, links = history
+        tracker = skill_mastery.InMemoryTracker(links)
+        result = await tracker.update_skill_mastery_batch(events)
+
+        unlinked = sum(1 for e in events if e.atom_id not in links)
+        assert result.events == len(events)
+        assert result.skipped_events == unlinked
+        assert result.skill_updates == sum(len(links.get(e.atom_id, [])) for e in events)
+        assert result.states_written == len(tracker.rows)
+        last = events[-1]
+        for link in links[last.atom_id]:
+            assert tracker.rows[(last.learner_id, link["skill_id"])].last_practiced == (
+                last.answered_at
+            )
+
+    @pytest.mark.asyncio
+    async def test_batch_writes_one_upsert(self, tracker, mock_db):
+        """Links and states are read once and all states written in one statement."""
+        from src.learning.skill_mastery_tracker import SkillEvent
+
+        link = {
+            "atom_id": "atom-1",
+            "skill_id": "skill-1",
+            "skill_code": "NET-1",
+            "weight": 1.0,
+            "is_primary": True,
+        }
+        results = iter([[link], []])  # Skill links, then no stored states
+
+        async def fetch(query, *args):
+            mock_db.queries.append((query, args))
+            return next(results)
+
+        mock_db.fetch = fetch
+        events = [
+            SkillEvent("learner-1", "atom-1", True, 2000, 4),
+            SkillEvent("learner-1", "atom-1", False, 5000, 2),
+            SkillEvent("learner-2", "atom-1", True, 1500, 3),
+        ]
+
+        result = await tracker.update_skill_mastery_batch(events)
+
+        assert result.states_written == 2
+        assert len(mock_db.queries) == 3
+        upsert, args = mock_db.queries[-1]
+        assert "unnest" in upsert and "ON CONFLICT" in upsert
+        assert args[0] == ["learner-1", "learner-2"]
+        assert args[4] == [2, 1]  # practice_count
+        assert args[5] == [0, 1]  # consecutive_correct
+
+
+class TestDatabaseStatements:
+    """Parameters and row shapes of the batch reads, upserts and backfill."""
+
+    LEARNER = str(uuid.UUID(int=1))
+    SKILLS = [str(uuid.UUID(int=10)), str(uuid.UUID(int=11))]
+    ATOM = str(uuid.UUID(int=20))
+
+    def state(self, skill_id: str, **values) -> SkillMasteryState:
+        return SkillMasteryState(
+            skill_id=skill_id,
+            skill_code="NET-1",
+            mastery_level=values.get("mastery_level", 0.4),
+            confidence_interval=0.3,
+            practice_count=values.get("practice_count", 2),
+            consecutive_correct=1,
+            last_practiced=values.get("last_practiced"),
+            retrievability=0.9,
+            difficulty=0.3,
+            stability=2.5,
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_skill_masteries_binds_key_arrays(self, tracker, mock_db):
+        """Keys are sent as two uuid[] arrays; UUID rows come back keyed by strings."""
+        practiced = datetime(2025, 3, 1, tzinfo=UTC)
+        mock_db.mock_data["fetch"] = [
+            {
+                "learner_id": uuid.UUID(self.LEARNER),
+                "skill_id": uuid.UUID(self.SKILLS[0]),
+                "skill_code": "NET-1",
+                "mastery_level": 0.4,
+                "confidence_interval": 0.3,
+                "practice_count": 2,
+                "consecutive_correct": 1,
+                "last_practiced": practiced,
+                "retrievability": 0.9,
+                "difficulty": 0.3,
+                "stability": 2.5,
+            }
+        ]
+        keys = [(self.LEARNER, skill_id) for skill_id in self.SKILLS]
+
+        states = await tracker._get_skill_masteries(keys)
+
+        query, args = mock_db.queries[0]
+        assert "unnest($1::uuid[], $2::uuid[])" in query
+        assert args == ([self.LEARNER] * 2, self.SKILLS)
+        assert states == {
+            (self.LEARNER, self.SKILLS[0]): self.state(self.SKILLS[0], last_practiced=practiced)
+        }
+        assert await tracker._get_skill_masteries([]) == {}
+        assert len(mock_db.queries) == 1
+
+    @pytest.mark.asyncio
+    async def test_save_skill_masteries_sends_one_array_per_column(
+        self, tracker, mock_db, monkeypatch
+    ):
+        """Each chunk is one upsert with ten equally long column arrays."""
+        monkeypatch.setattr(skill_mastery_tracker, "UPSERT_CHUNK", 2)
+        practiced = datetime(2025, 3, 1, tzinfo=UTC)
+        learners = [str(uuid.UUID(int=n)) for n in range(1, 4)]
+        states = {
+            (learners[0], self.SKILLS[0]): self.state(self.SKILLS[0], last_practiced=practiced),
+            (learners[1], self.SKILLS[0]): self.state(self.SKILLS[0], practice_count=5),
+            (learners[2], self.SKILLS[1]): self.state(self.SKILLS[1]),
+        }
+
+        written = await tracker._save_skill_masteries(states)
+
+        assert written == 3
+        assert len(mock_db.queries) == 2
+        first, second = mock_db.queries
+        assert "ON CONFLICT (learner_id, skill_id)" in first[0]
+        assert "COALESCE(u.last_practiced, NOW())" in first[0]
+        assert [len(column) for column in first[1]] == [2] * 10
+        assert [len(column) for column in second[1]] == [1] * 10
+        assert first[1][0] == learners[:2]
+        assert first[1][1] == [self.SKILLS[0]] * 2
+        assert first[1][4] == [2, 5]  # practice_count
+        assert first[1][6] == [practiced, None]  # last_practiced
+        assert second[1][:2] == ([learners[2]], [self.SKILLS[1]])
+
+    @pytest.mark.asyncio
+    async def test_backfill_replays_history_cursor_in_transaction(self, tracker, mock_db):
+        """History streams through a cursor and is written in the same transaction."""
+        mock_db.mock_data["fetch"] = [
+            {
+                "atom_id": uuid.UUID(self.ATOM),
+                "skill_id": uuid.UUID(skill_id),
+                "skill_code": f"NET-{n}",
+                "weight": weight,
+                "is_primary": n == 0,
+            }
+            for n, (skill_id, weight) in enumerate(zip(self.SKILLS, (1.0, 0.5)))
+        ]
+        start = datetime(2025, 1, 1, tzinfo=UTC)
+        # Replayed as: no latency -> 0 ms, no confidence -> DEFAULT_CONFIDENCE (3)
+        events = [
+            SkillEvent(self.LEARNER, self.ATOM, True, 0, 3, start),
+            SkillEvent(self.LEARNER, self.ATOM, False, 4_000, 3, start + timedelta(minutes=1)),
+            SkillEvent(self.LEARNER, self.ATOM, True, 4_000, 5, start + timedelta(minutes=2)),
+        ]
+        rows = [
+            {
+                "learner_id": uuid.UUID(e.learner_id),
+                "atom_id": uuid.UUID(e.atom_id),
+                "is_correct": e.is_correct,
+                "latency_ms": e.latency_ms or None,
+                "confidence": None if e.confidence == 3 else e.confidence,
+                "answered_at": e.answered_at,
+            }
+            for e in events
+        ]
+        rows.append({**rows[0], "atom_id": uuid.uuid4()})  # Atom without skill links
+        mock_db.mock_data["cursor"] = rows
+
+        result = await tracker.backfill_from_history(prefetch=2)
+
+        (links_sql, links_args), cursor, (upsert, args) = mock_db.queries
+        assert "WHERE" not in links_sql and links_args == ()
+        assert cursor == (HISTORY_SQL, (2,))
+        assert mock_db.transaction_queries == [HISTORY_SQL, upsert]
+        assert "ON CONFLICT" in upsert
+        assert (result.events, result.skipped_events) == (4, 1)
+        assert (result.skill_updates, result.states_written) == (6, 2)
+
+        expected: dict = {}
+        links = [
+            {"skill_id": skill_id, "skill_code": f"NET-{n}", "weight": weight}
+            for n, (skill_id, weight) in enumerate(zip(self.SKILLS, (1.0, 0.5)))
+        ]
+        tracker.apply_events(events, {self.ATOM: links}, expected)
+        assert args[0] == [self.LEARNER] * 2
+        assert args[1] == self.SKILLS
+        assert args[2] == [expected[(self.LEARNER, s)].mastery_level for s in self.SKILLS]
+        assert args[4] == [3, 3]  # practice_count
+        assert args[6] == [events[-1].answered_at] * 2  # last_practiced
@@ -0,0 +1,110 @@
+"""
+Tests for the concurrent Notion block fetcher.
+
+Pages are fetched from the local fake Notion server in tests/fixtures,
+with latency and rate limits scaled down. Output must match a
+serial walk of the tree, 429s must be retried, and unchanged pages must
+come from the cache until they expire.
+"""
+
+import pytest
+
+from src.sync.block_fetcher import BlockTreeFetcher, PageBlockCache, RateLimiter
+from tests.fixtures import notion_fetch as notion
+
+
+@pytest.fixture
+def pages():
+    return notion.generate_pages(4, seed=11, parent_share=0.15)
+
+
+def test_fetch_matches_serial_walk(pages, tmp_path):
+    page_ids, children = pages
+    with notion.FakeNotionServer(children, latency_s=0.002, jitter_s=0.002, rate=1000) as server:
+        client = notion.make_client(server.url, tmp_path / "blocks.db", rate=1000)
+        content = client.fetch_page_content_batch(page_ids)
+
+        for page_id in page_ids:
+            expected = server.walk(page_id)
+            assert any(b["has_children"] for b in expected)
+            assert [b["id"] for b in content[page_id]["blocks"]] == [b["id"] for b in expected]
+            assert content[page_id]["block_count"] == len(expected)
+
+
+def test_rate_limited_requests_are_retried(pages, tmp_path):
+    page_ids, children = pages
+    with notion.FakeNotionServer(
+        children, latency_s=0.0, jitter_s=0.0, rate=100, burst=2, retry_after="0.05"
+    ) as server:
+        # Same sustained rate as the server, but a burst it rejects
+        client = notion.make_client(server.url, None, rate=100)
+        client._limiter = RateLimiter(100, burst=10)
+        fetcher = client._block_fetcher()
+        blocks = fetcher.fetch_pages(page_ids)
+
+        assert server.rate_limited > 0
+        assert fetcher.stats.rate_limited == server.rate_limited
+        assert fetcher.stats.failed_containers == []
+        assert blocks == {page_id: server.walk(page_id) for page_id in page_ids}
+
+
+def test_cache_serves_unchanged_pages(pages, tmp_path):
+    page_ids, children = pages
+    with notion.FakeNotionServer(children, latency_s=0.0, jitter_s=0.0, rate=1000) as server:
+        client = notion.make_client(server.url, tmp_path / "blocks.db", rate=1000)
+        client._block_fetcher().fetch_pages(page_ids, dict(server.last_edited))
+        cold = server.requests
+
+        fetcher = client._block_fetcher()
+        blocks = fetcher.fetch_pages(page_ids, dict(server.last_edited))
+        assert server.requests == cold
+        assert fetcher.stats.cache_hits == len(page_ids)
+
+        # A nested edit leaves its parent block's timestamp alone; only the
+        # page's timestamp tells the cache to list the page again
+        nested = next(b for c, blocks in children.items() if c.startswith("b") for b in blocks)
+        parent = server._parents[nested["id"]]
+        parent_edited = next(
+            b["last_edited_time"] for blocks in children.values() for b in blocks if b["id"] == parent
+        )
+        server.edit(nested["id"], "edited text")
+        assert parent_edited == next(
+            b["last_edited_time"] for blocks in children.values() for b in blocks if b["id"] == parent
+        )
+        blocks = fetcher.fetch_pages(page_ids, dict(server.last_edited))
+
+        assert blocks == {page_id: server.walk(page_id) for page_id in page_ids}
+        assert fetcher.stats.cache_hits == len(page_ids) - 1
+        assert 0 < server.requests - cold < cold
+
+
+def test_cached_pages_expire(pages, tmp_path):
+    page_ids, children = pages
+    now = [1000.0]
+    with notion.FakeNotionServer(children, latency_s=0.0, jitter_s=0.0, rate=1000) as server:
+        client = notion.make_client(server.url, None, rate=1000)
+        cache = PageBlockCache(tmp_path / "blocks.db", ttl_seconds=60, clock=lambda: now[0])
+        fetcher = BlockTreeFetcher(client._list_block_children, client._limiter, cache=cache)
+        fetcher.fetch_pages(page_ids, dict(server.last_edited))
+
+        now[0] += 59
+        fetcher.fetch_pages(page_ids, dict(server.last_edited))
+        assert fetcher.stats.cache_hits == len(page_ids)
+
+        now[0] += 2
+        fetcher.fetch_pages(page_ids, dict(server.last_edited))
+        assert fetcher.stats.cache_hits == 0
+        assert fetcher.stats.requests > 0
+        cache.close()
+
+
+def test_rate_limiter_bursts_then_paces():
+    now = [0.0]
+    limiter = RateLimiter(4.0, burst=2, clock=lambda: now[0], sleep=lambda s: None)
+
+    assert [limiter.acquire() for _ in range(4)] == pytest.approx([0, 0, 0.25, 0.5])
+    now[0] = 10.0
+    limiter.pause(1.0)
+    assert limiter.acquire() == pytest.approx(1.0)
+    now[0] = 11.0
+    assert limiter.acquire() == pytest.approx(0.25)
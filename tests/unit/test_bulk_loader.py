@@ -0,0 +1,161 @@
+"""
+Tests for the COPY/executemany bulk loader.
+
+Runs against in-memory SQLite (executemany staging path); the COPY text
+encoding used for PostgreSQL is checked directly.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.db.bulk import BulkLoader, _array_literal, _copy_line
+
+
+@pytest.fixture
+def conn():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE cards ("
+                "note_id INTEGER PRIMARY KEY, front TEXT, payload TEXT, reviews INTEGER)"
+            )
+        )
+        connection.execute(text("INSERT INTO cards VALUES (1, 'old', NULL, 5)"))
+        yield connection
+
+
+class TestBulkLoader:
+    def test_counts_inserted_and_updated(self, conn):
+        result = BulkLoader(conn).load(
+            "cards",
+            [
+                {"note_id": 1, "front": "new", "payload": {"a": 1}, "reviews": 6},
+                {"note_id": 2, "front": "x", "payload": None, "reviews": 0},
+            ],
+            key_columns=["note_id"],
+            json_columns=["payload"],
+        )
+
+        assert (result.inserted, result.updated, result.skipped) == (1, 1, 0)
+        rows = conn.execute(text("SELECT note_id, front, payload FROM cards ORDER BY 1")).fetchall()
+        assert rows == [(1, "new", '{"a": 1}'), (2, "x", None)]
+
+    def test_duplicate_keys_last_wins_and_are_skipped(self, conn):
+        result = BulkLoader(conn).load(
+            "cards",
+            [
+                {"note_id": 3, "front": "first", "reviews": 0},
+                {"note_id": 3, "front": "second", "reviews": 0},
+            ],
+            key_columns=["note_id"],
+        )
+
+        assert (result.inserted, result.skipped) == (1, 1)
+        front = conn.execute(text("SELECT front FROM cards WHERE note_id = 3")).scalar_one()
+        assert front == "second"
+
+    def test_update_where_and_do_nothing_count_as_skipped(self, conn):
+        loader = BulkLoader(conn, chunk_size=1)
+        stale = loader.load(
+            "cards",
+            [{"note_id": 1, "front": "stale", "reviews": 1}],
+            key_columns=["note_id"],
+            update_where="EXCLUDED.reviews > cards.reviews",
+        )
+        untouched = loader.load(
+            "cards",
+            [{"note_id": 1, "front": "ignored", "reviews": 99}],
+            key_columns=["note_id"],
+            update_columns=(),
+        )
+
+        assert (stale.updated, stale.skipped) == (0, 1)
+        assert (untouched.updated, untouched.skipped) == (0, 1)
+        front = conn.execute(text("SELECT front FROM cards WHERE note_id = 1")).scalar_one()
+        assert front == "old"
+
+    def test_update_assigns_only_update_columns_where_allowed(self, conn):
+        conn.execute(text("INSERT INTO cards VALUES (2, 'old', NULL, 9)"))
+        result = BulkLoader(conn).update(
+            "cards",
+            [
+                {"note_id": 1, "front": "new", "reviews": 5},
+                {"note_id": 2, "front": "new", "reviews": 5},
+            ],
+            key_columns=["note_id"],
+            update_columns=["front"],
+            update_where="cards.reviews <= s.reviews",
+        )
+
+        assert (result.updated, result.skipped) == (1, 1)
+        rows = conn.execute(text("SELECT note_id, front, reviews FROM cards ORDER BY 1")).fetchall()
+        assert rows == [(1, "new", 5), (2, "old", 9)]
+
+    def test_returning_reads_back_target_columns(self, conn):
+        result = BulkLoader(conn).load(
+            "cards",
+            [{"note_id": 1, "front": "a"}, {"note_id": 7, "front": "b"}],
+            key_columns=["note_id"],
+            update_columns=(),
+            returning=["front"],
+        )
+
+        assert sorted((r["note_id"], r["front"]) for r in result.returned) == [
+            (1, "old"),
+            (7, "b"),
+        ]
+
+    def test_missing_key_column_raises(self, conn):
+        with pytest.raises(ValueError):
+            BulkLoader(conn).load("cards", [{"front": "a"}], key_columns=["note_id"])
+
+    def test_isolate_errors_merges_good_rows_and_reports_bad_ones(self, conn):
+        conn.execute(text("CREATE TABLE checked (k INTEGER PRIMARY KEY, v INTEGER CHECK (v >= 0))"))
+        result = BulkLoader(conn).load(
+            "checked",
+            [{"k": 1, "v": 1}, {"k": 2, "v": -1}, {"k": 3, "v": 3}, {"k": 3, "v": 4}],
+            key_columns=["k"],
+            isolate_errors=True,
+        )
+
+        assert (result.inserted, result.skipped, result.failed) == (2, 1, 1)
+        assert result.errors[0].startswith("checked (2)")
+        rows = conn.execute(text("SELECT k, v FROM checked ORDER BY k")).fetchall()
+        assert rows == [(1, 1), (3, 4)]
+
+    def test_failed_merge_raises_the_original_error(self, conn, monkeypatch):
+        conn.execute(text("CREATE TABLE checked (k INTEGER PRIMARY KEY, v INTEGER CHECK (v >= 0))"))
+        real_execute = conn.execute
+
+        def execute(statement, *args, **kwargs):
+            if str(statement).startswith("DROP TABLE"):
+                raise RuntimeError("current transaction is aborted")
+            return real_execute(statement, *args, **kwargs)
+
+        monkeypatch.setattr(conn, "execute", execute)
+        with pytest.raises(Exception, match="CHECK constraint failed"):
+            BulkLoader(conn).load("checked", [{"k": 1, "v": -1}], key_columns=["k"])
+
+
+class TestCopyEncoding:
+    def test_copy_line_escapes_text_format(self):
+        line = _copy_line(
+            {"a": "tab\there\nnew\\", "b": None, "c": True, "d": datetime(2025, 1, 2, 3, 4)},
+            ["a", "b", "c", "d"],
+            json_columns=set(),
+            array_columns=set(),
+        )
+        assert line == "tab\\there\\nnew\\\\\t\\N\tt\t2025-01-02T03:04:00\n"
+
+    def test_array_and_json_columns(self):
+        assert _array_literal(['a"b', None, "c,d"]) == '{"a\\"b",NULL,"c,d"}'
+        line = _copy_line(
+            {"tags": ["x"], "raw": {"k": "v"}},
+            ["tags", "raw"],
+            json_columns={"raw"},
+            array_columns={"tags"},
+        )
+        assert line == '{"x"}\t{"k": "v"}\n'
@@ -0,0 +1,132 @@
+"""
+Tests for SparseConfusionStore and vectorized PSI.
+
+The sparse store must give the same answers as the in-memory
+ConfusionMatrix for any interaction sequence, and survive a save/load.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.adaptive.confusion_store import SparseConfusionStore
+from src.adaptive.ncde_pipeline import ConfusionMatrix
+from src.adaptive.neuro_model import (
+    LearningAtomEmbed,
+    NeuroCognitiveModel,
+    compute_psi_matrix,
+    vectorized_psi,
+)
+
+
+def replay(events, *stores):
+    for target, selected in events:
+        for store in stores:
+            if target == selected:
+                store.record_discrimination(target, selected)
+            else:
+                store.record_confusion(target, selected)
+
+
+@pytest.fixture
+def events():
+    rng = random.Random(7)
+    atoms = [f"atom-{i}" for i in range(25)]
+    return [(rng.choice(atoms), rng.choice(atoms)) for _ in range(600)]
+
+
+class TestSparseConfusionStore:
+    def test_matches_confusion_matrix(self, events, tmp_path):
+        reference = ConfusionMatrix()
+        store = SparseConfusionStore(directory=tmp_path, compact_every=16)
+        replay(events, reference, store)
+
+        for i in range(25):
+            target = f"atom-{i}"
+            assert store.get_psi(target) == pytest.approx(reference.get_psi(target))
+            assert sorted(store.get_confusables(target, 0.2)) == sorted(
+                reference.get_confusables(target, 0.2)
+            )
+            ref_pair = reference.get_worst_pair(target)
+            pair = store.get_worst_pair(target)
+            if ref_pair is None:
+                assert pair is None
+            else:
+                assert pair[1] == pytest.approx(ref_pair[1])
+
+    def test_unknown_target_has_full_separation(self, tmp_path):
+        store = SparseConfusionStore(directory=tmp_path)
+        assert store.get_psi("missing") == 1.0
+        assert store.get_worst_pair("missing") is None
+        assert store.get_confusables("missing") == []
+
+    def test_save_and_load_round_trip(self, events, tmp_path):
+        store = SparseConfusionStore(learner_id="learner/1", directory=tmp_path)
+        replay(events, store)
+        path = store.save()
+
+        loaded = SparseConfusionStore.load("learner/1", directory=tmp_path)
+
+        assert path.name == "learner_1.npz"
+        assert loaded.nnz == store.nnz
+        assert loaded.most_confused_pairs(5) == store.most_confused_pairs(5)
+        loaded.record_confusion("atom-0", "atom-1")  # still updatable after load
+
+    def test_most_confused_pairs_sorted(self, tmp_path):
+        store = SparseConfusionStore(directory=tmp_path)
+        for _ in range(3):
+            store.record_confusion("a", "b")
+        store.record_confusion("c", "d")
+
+        pairs = store.most_confused_pairs(2)
+
+        assert [(t, s) for t, s, _ in pairs] == [("a", "b"), ("c", "d")]
+        assert pairs[0][2] > pairs[1][2]
+
+
+    def test_session_loads_its_learners_store(self, monkeypatch):
+        import src.cortex.session as session_module
+
+        loaded = []
+        monkeypatch.setattr(
+            SparseConfusionStore, "load", classmethod(lambda cls, learner_id: loaded.append(learner_id))
+        )
+        monkeypatch.setattr(session_module, "NCDEPipeline", lambda confusion_store: None)
+        session = session_module.CortexSession(modules=[1], learner_id="learner-42")
+
+        assert loaded == ["learner-42"]
+        assert session.dialogue_recorder.learner_id == "learner-42"
+        session.prefetcher.close()
+
+
+class TestVectorizedPsi:
+    def test_matches_pairwise_calculate_psi(self):
+        rng = np.random.default_rng(3)
+        atoms = [
+            LearningAtomEmbed(id=f"a{i}", content="", embedding=rng.normal(size=16).tolist())
+            for i in range(12)
+        ]
+        atoms.append(LearningAtomEmbed(id="zero", content="", embedding=[0.0] * 16))
+        model = NeuroCognitiveModel()
+
+        matrix = compute_psi_matrix(atoms, block_size=5)
+
+        assert len(matrix) == 13 * 12
+        for (a, b), psi in list(matrix.items())[:40]:
+            atom_a = next(x for x in atoms if x.id == a)
+            atom_b = next(x for x in atoms if x.id == b)
+            assert psi == pytest.approx(model.calculate_psi(atom_a, atom_b), abs=1e-5)
+
+    def test_threshold_returns_sparse_pairs(self):
+        embeddings = np.array([[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]])
+        scores = vectorized_psi(embeddings)
+        atoms = [
+            LearningAtomEmbed(id=str(i), content="", embedding=row.tolist())
+            for i, row in enumerate(embeddings)
+        ]
+
+        sparse = compute_psi_matrix(atoms, threshold=0.9)
+
+        assert set(sparse) == {("0", "1"), ("1", "0")}
+        assert sparse[("0", "1")] == pytest.approx(float(scores[0, 1]))
@@ -0,0 +1,180 @@
+"""
+Tests for EmbeddingIndex and the vectorized KnowledgeGraph similarity queries.
+
+Results must match per-pair loops (calculate_psi / cosine similarity) on
+small random graphs.
+"""
+
+import numpy as np
+import pytest
+
+from src.adaptive.embedding_index import EmbeddingIndex
+from src.adaptive.knowledge_graph import (
+    AtomContent,
+    AtomMetadata,
+    AtomType,
+    KnowledgeGraph,
+    LearningAtom,
+)
+from src.adaptive.neuro_model import (
+    LearningAtomEmbed,
+    NeuroCognitiveModel,
+    find_confusable_neighbors,
+    generate_adversarial_lures,
+)
+
+
+def clustered_embeddings(n: int, dim: int = 12, seed: int = 11) -> np.ndarray:
+    """Embeddings in a few tight clusters so thresholds produce hits."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(4, dim))
+    return centers[rng.integers(0, 4, size=n)] + 0.3 * rng.normal(size=(n, dim))
+
+
+def cosine(v1: list[float], v2: list[float]) -> float:
+    a1, a2 = np.asarray(v1), np.asarray(v2)
+    return float(a1 @ a2 / (np.linalg.norm(a1) * np.linalg.norm(a2)))
+
+
+def make_graph(embeddings: np.ndarray) -> KnowledgeGraph:
+    types = [AtomType.DEFINITION, AtomType.FACT, AtomType.THEOREM, AtomType.EXAMPLE]
+    graph = KnowledgeGraph()
+    for i, vector in enumerate(embeddings):
+        graph.add_atom(
+            LearningAtom(
+                id=f"atom-{i}",
+                content=AtomContent(text=f"atom {i}"),
+                metadata=AtomMetadata(atom_type=types[i % 4]),
+                embedding=vector.tolist(),
+            )
+        )
+    return graph
+
+
+class TestEmbeddingIndex:
+    def test_top_k_matches_brute_force(self):
+        embeddings = clustered_embeddings(200)
+        index = EmbeddingIndex(block_size=32)
+        for i, vector in enumerate(embeddings):
+            index.add(f"atom-{i}", vector)
+
+        hits = index.top_k("atom-0", k=5, threshold=0.5)
+
+        normed = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        sims = np.clip(normed[1:] @ normed[0], 0, 1)
+        expected = np.sort(sims[sims >= 0.5])[::-1][:5]
+        assert [score for _, score in hits] == pytest.approx(expected.tolist(), abs=1e-5)
+        assert "atom-0" not in {atom_id for atom_id, _ in hits}
+
+    def test_readd_overwrites_row(self):
+        index = EmbeddingIndex()
+        index.add("a", [1.0, 0.0])
+        index.add("b", [0.0, 1.0])
+        index.add("a", [0.0, 2.0])
+
+        assert index.ids == ["a", "b"]
+        assert index.top_k("b", k=1) == [("a", pytest.approx(1.0))]
+
+    def test_top_k_within_ranks_only_given_ids(self):
+        embeddings = clustered_embeddings(100)
+        index = EmbeddingIndex.from_vectors([f"atom-{i}" for i in range(100)], embeddings)
+        pool = [f"atom-{i}" for i in range(60, 100)]
+
+        hits = index.top_k("atom-0", k=5, within=pool)
+
+        scores = index.scores("atom-0")[60:]
+        assert [atom_id for atom_id, _ in hits] == [
+            f"atom-{60 + i}" for i in np.argsort(-scores, kind="stable")[:5]
+        ]
+
+    def test_dimension_mismatch_rejected(self):
+        index = EmbeddingIndex()
+        index.add("a", [1.0, 0.0])
+        with pytest.raises(ValueError):
+            index.add("b", [1.0, 0.0, 0.0])
+
+    def test_pairs_above_matches_nested_loop(self):
+        embeddings = clustered_embeddings(70)
+        index = EmbeddingIndex.from_vectors([str(i) for i in range(70)], embeddings)
+
+        pairs = [(i, j) for i, j, _ in index.pairs_above(0.8)]
+
+        normed = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        expected = [
+            (i, j)
+            for i in range(70)
+            for j in range(i + 1, 70)
+            if float(normed[i] @ normed[j]) > 0.8
+        ]
+        assert pairs == expected
+
+
+class TestKnowledgeGraphQueries:
+    def test_confusable_neighbors_match_pairwise_scan(self):
+        graph = make_graph(clustered_embeddings(120))
+        target = graph.get_atom("atom-3")
+
+        neighbors = graph.get_confusable_neighbors("atom-3", threshold=0.7)
+
+        pairwise = sorted(
+            (
+                (other.id, cosine(target.embedding, other.embedding))
+                for other in graph
+                if other.id != target.id
+            ),
+            key=lambda x: -x[1],
+        )
+        expected = [(aid, sim) for aid, sim in pairwise if sim > 0.7][:10]
+        assert [score for _, score in neighbors] == pytest.approx(
+            [sim for _, sim in expected], abs=1e-5
+        )
+
+    def test_infer_prerequisites_matches_pairwise_scan(self):
+        graph = make_graph(clustered_embeddings(60))
+        atoms = list(graph)
+
+        inferred = graph.infer_prerequisites(similarity_threshold=0.8)
+
+        expected = []
+        for i, a in enumerate(atoms):
+            for b in atoms[i + 1 :]:
+                if cosine(a.embedding, b.embedding) > 0.8:
+                    if graph._should_be_prerequisite(a, b):
+                        expected.append(a.id)
+                    elif graph._should_be_prerequisite(b, a):
+                        expected.append(b.id)
+        assert [c.target_id for c in inferred] == expected
+        assert all(c.inferred for c in inferred)
+
+
+class TestLureSearch:
+    def test_lures_match_calculate_psi_ranking(self):
+        embeddings = clustered_embeddings(80)
+        atoms = [
+            LearningAtomEmbed(id=f"a{i}", content="", embedding=v.tolist())
+            for i, v in enumerate(embeddings)
+        ]
+        target, candidates = atoms[0], atoms
+        model = NeuroCognitiveModel()
+
+        neighbors = find_confusable_neighbors(target, candidates, threshold=0.6, max_neighbors=6)
+
+        expected = sorted(
+            (model.calculate_psi(target, c) for c in candidates[1:]), reverse=True
+        )
+        expected = [psi for psi in expected if psi >= 0.6][:6]
+        assert [psi for _, psi in neighbors] == pytest.approx(expected, abs=1e-5)
+
+    def test_prebuilt_index_restricted_to_candidates(self):
+        graph = make_graph(clustered_embeddings(50))
+        atoms = [
+            LearningAtomEmbed(id=a.id, content="", embedding=a.embedding) for a in graph
+        ]
+        pool = atoms[:20]
+
+        lures = generate_adversarial_lures(
+            atoms[0], pool, num_lures=3, index=graph.embedding_index
+        )
+
+        assert lures == generate_adversarial_lures(atoms[0], pool, num_lures=3)
+        assert {lure.id for lure in lures} <= {a.id for a in pool[1:]}
@@ -0,0 +1,146 @@
+"""
+Tests for the ETL pipeline in staged and streaming modes.
+"""
+
+import asyncio
+
+import pytest
+
+from src.etl.loaders.base import DryRunLoader, LoaderConfig
+from src.etl.pipeline import Pipeline, PipelineBuilder
+from tests.fixtures.etl_stream import CountingLoader, LatencyTransformer, SyntheticExtractor
+
+
+class ListExtractor:
+    """Extractor with only the list API."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def extract(self):
+        return self.chunks
+
+
+class TrackingLoader(CountingLoader):
+    """Records how many chunks were extracted but not yet loaded at each commit."""
+
+    def __init__(self, extractor):
+        super().__init__()
+        self.extractor = extractor
+        self.in_flight: list[int] = []
+
+    async def _insert_batch(self, atoms):
+        self.in_flight.append(self.extractor.produced - self.count)
+        return await super()._insert_batch(atoms)
+
+
+class CountedExtractor(SyntheticExtractor):
+    produced = 0
+
+    async def iter_chunks(self):
+        async for chunk in super().iter_chunks():
+            self.produced += 1
+            yield chunk
+
+
+def _run(pipeline):
+    return asyncio.run(pipeline.run())
+
+
+def test_streaming_matches_staged():
+    def build(streaming):
+        loader = DryRunLoader(LoaderConfig(log_operations=False))
+        pipeline = Pipeline(
+            SyntheticExtractor(200_000, chunk_bytes=1024),
+            [LatencyTransformer(0)],
+            loader,
+            batch_size=25,
+            streaming=streaming,
+            transform_workers=3,
+            chunk_batch_size=4,
+            queue_size=8,
+        )
+        return pipeline, loader
+
+    staged, staged_loader = build(False)
+    streaming, streaming_loader = build(True)
+    staged_result, streaming_result = _run(staged), _run(streaming)
+
+    assert streaming_result.chunks_extracted == staged_result.chunks_extracted > 150
+    assert streaming_result.atoms_loaded == staged_result.atoms_loaded
+    assert streaming_result.atoms_by_type == staged_result.atoms_by_type
+    assert sorted(a.card_id for a in streaming_loader.loaded_atoms) == sorted(
+        a.card_id for a in staged_loader.loaded_atoms
+    )
+
+    stages = streaming_result.to_dict()["stages"]
+    assert list(stages) == ["extract", "transform", "validate", "load"]
+    assert stages["transform"]["items_in"] == streaming_result.chunks_extracted
+    assert stages["load"]["items_out"] == streaming_result.atoms_loaded
+    assert 0 < stages["transform"]["max_queue_depth"] <= 8
+    assert staged_result.stage_metrics == {}
+
+
+@pytest.mark.parametrize("total_bytes", [100_000, 800_000])
+def test_streaming_memory_is_bounded_by_queues(total_bytes):
+    extractor = CountedExtractor(total_bytes, chunk_bytes=512)
+    loader = TrackingLoader(extractor)
+    pipeline = Pipeline(
+        extractor,
+        [LatencyTransformer(0)],
+        loader,
+        batch_size=10,
+        streaming=True,
+        transform_workers=2,
+        chunk_batch_size=4,
+        queue_size=4,
+    )
+
+    result = _run(pipeline)
+
+    # Loads start long before extraction ends, and the backlog never grows
+    # past queues + worker batches + one load batch, whatever the corpus size
+    assert result.atoms_loaded == extractor.produced
+    assert loader.in_flight[0] < extractor.produced / 4
+    assert max(loader.in_flight) <= 3 * 4 + 2 * 4 + 10 + 2
+
+
+def test_streaming_accepts_list_extractors_and_builder():
+    chunks = asyncio.run(SyntheticExtractor(20_000, chunk_bytes=512).extract())
+    pipeline = (
+        PipelineBuilder()
+        .extract_from(ListExtractor(chunks))
+        .transform_with(LatencyTransformer(0))
+        .load_to(CountingLoader())
+        .with_streaming(transform_workers=2, queue_size=2)
+        .build()
+    )
+
+    result = _run(pipeline)
+
+    assert pipeline.streaming and pipeline.queue_size == 2
+    assert result.atoms_loaded == len(chunks) and result.success
+
+
+def test_streaming_load_failure_stops_when_not_continuing():
+    class FailingLoader:
+        async def load(self, atoms):
+            raise RuntimeError("database unavailable")
+
+    def build(continue_on_error):
+        return Pipeline(
+            SyntheticExtractor(50_000, chunk_bytes=512),
+            [LatencyTransformer(0)],
+            FailingLoader(),
+            batch_size=10,
+            streaming=True,
+            continue_on_error=continue_on_error,
+        )
+
+    stopped = _run(build(False))
+    continued = _run(build(True))
+
+    assert stopped.extraction_errors == ["database unavailable"]
+    assert stopped.atoms_failed == 10
+    assert continued.atoms_failed == continued.atoms_transformed > 10
+    assert continued.loading_errors[0] == "database unavailable"
@@ -1,9 +1,13 @@
+from contextlib import asynccontextmanager
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
 import pytest
 
-from src.integrations.greenlight_queue_manager import GreenlightQueueManager
+from src.integrations.greenlight_queue_manager import (
+    GreenlightQueueManager,
+    GreenlightQueueWorker,
+)
 
 
 class FakeResult:
@@ -104,3 +108,89 @@ async def test_get_pending_maps_rows():
 
     assert len(pending) == 1
     assert pending[0].id == "queue-123"
+
+
+def _queue_row(queue_id, queued_at, retry_count=0):
+    return SimpleNamespace(
+        _mapping={
+            "id": queue_id,
+            "atom_id": None,
+            "learner_id": "learner-1",
+            "execution_id": None,
+            "status": "executing",
+            "request_payload": {"atom_type": "code_submission"},
+            "result_payload": None,
+            "queued_at": queued_at,
+            "started_at": None,
+            "completed_at": None,
+            "error_message": None,
+            "retry_count": retry_count,
+            "max_retries": 3,
+            "worker_id": "worker-1",
+            "lease_expires_at": None,
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_claim_skips_locked_rows_and_orders_by_queue_time():
+    session = AsyncMock()
+    session.execute.return_value = FakeResult(
+        rows=[_queue_row("q2", "2025-01-01T00:00:02Z"), _queue_row("q1", "2025-01-01T00:00:01Z")]
+    )
+    manager = GreenlightQueueManager(session)
+
+    claimed = await manager.claim("worker-1", limit=2, lease_seconds=30)
+
+    sql = str(session.execute.call_args.args[0])
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert session.execute.call_args.args[1] == {
+        "worker_id": "worker-1",
+        "limit": 2,
+        "lease_seconds": 30,
+    }
+    assert [item.id for item in claimed] == ["q1", "q2"]
+    assert claimed[0].worker_id == "worker-1"
+
+
+@pytest.mark.asyncio
+async def test_fail_many_reports_requeued_items_in_one_statement():
+    session = AsyncMock()
+    session.execute.return_value = FakeResult(rows=[("q1", "pending"), ("q2", "failed")])
+    manager = GreenlightQueueManager(session)
+
+    requeued = await manager.fail_many({"q1": "boom", "q2": "boom"}, worker_id="worker-1")
+
+    assert requeued == {"q1": True, "q2": False}
+    assert session.execute.call_count == 1
+    assert await manager.fail_many({}) == {}
+    assert await manager.complete_many({}) == 0
+    assert session.execute.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_batches_outcomes_of_a_claim():
+    session = AsyncMock()
+    session.execute.side_effect = [
+        FakeResult(rows=[_queue_row("q1", 1), _queue_row("q2", 2)]),
+        FakeResult(rowcount=1),
+        FakeResult(rows=[("q2", "pending")]),
+    ]
+
+    @asynccontextmanager
+    async def scope():
+        yield session
+
+    async def handler(item):
+        if item.id == "q2":
+            raise RuntimeError("boom")
+        return {"passed": True}
+
+    worker = GreenlightQueueWorker(handler, "worker-1", scope, batch_size=5, lease_seconds=30)
+
+    assert await worker.run_once() == 2
+    complete, fail = session.execute.call_args_list[1:]
+    assert complete.args[1]["queue_ids"] == ["q1"]
+    assert complete.args[1]["payloads"] == ['{"passed": true}']
+    assert fail.args[1]["queue_ids"] == ["q2"]
+    assert fail.args[1]["errors"] == ["boom"]
@@ -0,0 +1,186 @@
+"""
+Tests for the core interleaving engine.
+
+The "order" policy must reproduce the first-valid-atom scan it replaced
+in InterleaveScheduler; other policies are checked for their constraint
+and determinism guarantees.
+"""
+
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+import pytest
+
+from src.core.interleaving import InterleaveEngine, MaxConsecutive, MinSpacing, facet
+from src.study.interleaver import AdaptiveInterleaver, InterleaveConfig, StudyCard, StudyQueue
+from src.study.retention_engine import SmartInterleaver
+
+
+@dataclass
+class FakeAtom:
+    id: int
+    module_number: int
+    atom_type: str
+
+
+def make_atoms(n, modules=4, types=("mcq", "true_false", "parsons"), seed=0):
+    rng = random.Random(seed)
+    return [FakeAtom(i, rng.randint(1, modules), rng.choice(types)) for i in range(n)]
+
+
+def reference_constraints(queue, max_module, max_type):
+    """The quadratic scan InterleaveScheduler used before the engine."""
+
+    def can_add(result, atom):
+        if len(result) < 2:
+            return True
+        recent = [a.module_number for a in result[-max_module:]]
+        if len(recent) >= max_module and all(m == atom.module_number for m in recent):
+            return False
+        recent = [a.atom_type for a in result[-max_type:]]
+        return not (len(recent) >= max_type and all(t == atom.atom_type for t in recent))
+
+    result, remaining = [], list(queue)
+    while remaining:
+        for i, atom in enumerate(remaining):
+            if can_add(result, atom):
+                result.append(remaining.pop(i))
+                break
+        else:
+            result.append(remaining.pop(0))
+    return result
+
+
+def max_run(values):
+    best = run = 0
+    previous = object()
+    for value in values:
+        run = run + 1 if value == previous else 1
+        previous = value
+        best = max(best, run)
+    return best
+
+
+class TestOrderPolicy:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_first_valid_scan(self, seed):
+        atoms = make_atoms(300, modules=3, seed=seed)
+        engine = InterleaveEngine(
+            group_by=lambda a: (a.module_number, a.atom_type),
+            constraints=[
+                MaxConsecutive(facet("module_number"), 2),
+                MaxConsecutive(facet("atom_type"), 3),
+            ],
+            policy="order",
+        )
+
+        assert [a.id for a in engine.interleave(atoms)] == [
+            a.id for a in reference_constraints(atoms, 2, 3)
+        ]
+
+    def test_scales_to_large_queues(self):
+        atoms = make_atoms(50_000, modules=17, seed=1)
+        engine = InterleaveEngine(
+            group_by=lambda a: (a.module_number, a.atom_type),
+            constraints=[
+                MaxConsecutive(facet("module_number"), 2),
+                MaxConsecutive(facet("atom_type"), 3),
+            ],
+            policy="order",
+        )
+
+        started = time.perf_counter()
+        result = engine.interleave(atoms)
+
+        assert time.perf_counter() - started < 5.0
+        assert sorted(a.id for a in result) == list(range(50_000))
+        assert max_run(a.module_number for a in result) <= 2
+
+
+class TestPolicies:
+    def test_round_robin_follows_group_order(self):
+        atoms = [{"id": i, "atom_type": t} for i, t in enumerate("aaabbc")]
+        engine = InterleaveEngine(group_by=facet("atom_type"), group_order=["c", "b", "a"])
+
+        assert [a["atom_type"] for a in engine.interleave(atoms)] == list("cbabaa")
+
+    def test_constraints_hold_when_feasible(self):
+        atoms = [
+            {"id": i, "atom_type": t, "module_number": i % 3, "concept_id": None}
+            for i, t in enumerate(["mcq"] * 30 + ["parsons"] * 30)
+        ]
+        engine = InterleaveEngine(
+            group_by=facet("atom_type"),
+            constraints=[MaxConsecutive(facet("module_number"), 1)],
+            policy="balanced",
+            shuffle=True,
+            seed=3,
+        )
+
+        result = engine.interleave(atoms)
+
+        modules = [a["module_number"] for a in result]
+        # Greedy placement may only be forced into a repeat at the very end
+        assert max_run(modules[:-2]) == 1
+        assert max_run(a["atom_type"] for a in result) == 1
+        assert Counter(a["id"] for a in result) == Counter(range(60))
+
+    def test_seed_is_deterministic(self):
+        atoms = [{"id": i, "atom_type": "mcq" if i % 2 else "parsons"} for i in range(40)]
+
+        def run(seed):
+            engine = InterleaveEngine(group_by=facet("atom_type"), shuffle=True, seed=seed)
+            return [a["id"] for a in engine.interleave(atoms)]
+
+        assert run(7) == run(7)
+        assert run(7) != run(8)
+
+    def test_min_spacing_with_set_valued_facet(self):
+        items = [{"id": i, "tags": {"x", str(i)} if i < 4 else {str(i)}} for i in range(12)]
+        engine = InterleaveEngine(constraints=[MinSpacing(facet("tags"), 2)], policy="order")
+
+        positions = [i for i, item in enumerate(engine.interleave(items)) if "x" in item["tags"]]
+
+        assert all(b - a > 2 for a, b in zip(positions, positions[1:]))
+
+    def test_proportional_spreads_minority_bucket(self):
+        items = [{"source": "new"}] * 14 + [{"source": "remediation"}] * 6
+        engine = InterleaveEngine(group_by=facet("source"), policy="proportional")
+
+        positions = [
+            i for i, item in enumerate(engine.interleave(items)) if item["source"] == "remediation"
+        ]
+
+        assert positions[0] < 4 and positions[-1] > 15
+
+
+class TestCallers:
+    def test_adaptive_interleaver_keeps_due_first(self):
+        def card(i, source):
+            return StudyCard(str(i), str(i), "f", "b", "mcq", f"{i % 4}.1", source)
+
+        queue = StudyQueue(
+            due_reviews=[card(i, "due") for i in range(3)],
+            new_cards=[card(i, "new") for i in range(3, 13)],
+            remediation_cards=[card(i, "remediation") for i in range(13, 18)],
+        )
+        interleaver = AdaptiveInterleaver(InterleaveConfig(seed=11))
+
+        result = interleaver.interleave(queue)
+
+        assert [c.atom_id for c in result[:3]] == ["0", "1", "2"]
+        assert sorted(int(c.atom_id) for c in result) == list(range(18))
+        assert result == interleaver.interleave(queue)
+
+    def test_smart_interleaver_spaces_clusters(self):
+        atoms = [{"id": i, "front": "subnet mask", "back": ""} for i in range(4)] + [
+            {"id": i, "front": "vlan trunk", "back": ""} for i in range(4, 12)
+        ]
+
+        result = SmartInterleaver().interleave(atoms, spacing_factor=1)
+
+        clusters = ["addressing" if a["id"] < 4 else "switching" for a in result]
+        assert max_run(clusters[:8]) == 1
+        assert sorted(a["id"] for a in result) == list(range(12))
@@ -0,0 +1,61 @@
+"""
+Tests for the candidate-blocked Anki migration matcher.
+"""
+
+import pytest
+
+from src.ccna import migration_matching
+from src.ccna.migration_matching import CandidateIndex, best_matches, index_keys
+from tests.fixtures import migration_match
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return migration_match.generate(n_old=200, n_new=1_000, seed=3)
+
+
+def test_blocked_matches_agree_with_exhaustive(corpus):
+    service = migration_match.service(candidates=32, workers=1)
+
+    blocked = service.find_content_matches(corpus.old_states, corpus.new_atoms)
+    exhaustive = service.find_content_matches(
+        corpus.old_states, corpus.new_atoms, exhaustive=True
+    )
+    reworded = [m for m in exhaustive if corpus.sources.get(m.old_card_id) == m.new_card_id]
+
+    assert len(reworded) > 100
+    assert migration_match.recall(blocked, reworded) == 1.0
+    assert migration_match.recall(blocked, exhaustive) >= 0.97
+    assert {m.match_type for m in blocked} == {"semantic"}
+
+
+def test_exact_id_match_overrides_semantic(corpus):
+    service = migration_match.service(workers=1)
+    old = corpus.old_states[0]
+    source = next(a for a in corpus.new_atoms if a.card_id == corpus.sources[old.card_id])
+    old.card_id = source.card_id.rsplit("-", 2)[0] + "-MCQ-9"
+
+    (match,) = service.find_content_matches([old], corpus.new_atoms)
+
+    assert match.match_type == "exact" and match.similarity_score == 1.0
+    assert match.new_card_id.startswith(old.card_id.rsplit("-", 2)[0])
+
+
+def test_candidates_prefer_rare_shared_words():
+    keys = [index_keys(text) for text in ("vlan trunk", "vlan subnet", "ospf area", "vlans")]
+    index = CandidateIndex.build(keys, max_df=0.5)
+
+    assert index_keys("vlans and trunks") == {"vlan", "and", "trunk"}
+    assert index.candidates({"vlan", "trunk"}, limit=1) == [0]
+    assert index.candidates({"bgp"}, limit=5) == []
+
+
+def test_process_pool_matches_in_process(corpus, monkeypatch):
+    monkeypatch.setattr(migration_matching, "PARALLEL_MIN_PAIRS", 0)
+    old = [(s.front_text, s.back_text, s.tags) for s in corpus.old_states[:60]]
+    new = [(a.front, a.back, a.tags) for a in corpus.new_atoms]
+
+    serial = best_matches(old, new, threshold=0.75, max_candidates=16, workers=1)
+    pooled = best_matches(old, new, threshold=0.75, max_candidates=16, workers=2)
+
+    assert pooled == serial
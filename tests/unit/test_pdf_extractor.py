@@ -0,0 +1,53 @@
+"""
+Tests for page-parallel, cached PDF extraction.
+"""
+
+import asyncio
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from src.etl.extractors.page_cache import PageTextCache, file_sha256  # noqa: E402
+from src.etl.extractors.pdf_extractor import PDFExtractor  # noqa: E402
+from tests.fixtures import pdf_extract  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def textbook(tmp_path_factory):
+    path = tmp_path_factory.mktemp("pdf") / "textbook.pdf"
+    return pdf_extract.generate_pdf(path, pages=90, pages_per_chapter=20, pages_per_section=3)
+
+
+def _extract(extractor):
+    return pdf_extract.signature(asyncio.run(extractor.extract()))
+
+
+@pytest.mark.parametrize("section_words", [800, 5_000])
+def test_parallel_output_matches_legacy_loop(textbook, section_words):
+    legacy = _extract(
+        pdf_extract.LegacyPDFExtractor(textbook, pdf_extract.config(1, None, section_words))
+    )
+    pooled = _extract(
+        PDFExtractor(textbook, pdf_extract.config(2, None, section_words, pages_per_task=7))
+    )
+
+    assert len(legacy) > 5
+    assert pooled == legacy
+
+
+def test_warm_cache_skips_pdf_parsing(textbook, tmp_path, monkeypatch):
+    cache_path = tmp_path / "pages.db"
+    cold = _extract(PDFExtractor(textbook, pdf_extract.config(1, cache_path, pages_per_task=16)))
+
+    cache = PageTextCache(cache_path)
+    assert cache.page_count(file_sha256(textbook)) == 90
+    cache.close()
+
+    def no_open(*args, **kwargs):
+        raise AssertionError("PDF opened despite a warm cache")
+
+    monkeypatch.setattr(fitz, "open", no_open)
+    warm = _extract(PDFExtractor(textbook, pdf_extract.config(1, cache_path, pages_per_task=16)))
+
+    assert warm == cold
@@ -0,0 +1,169 @@
+"""
+Tests for PlatformClient / RightLearningClient transport behaviour.
+
+A stub right-learning server (httpx.MockTransport) records every request so
+the tests can assert on round trips: connection reuse, ETag revalidation,
+due-atom prefetch and batched review submission. Reviews submitted to the
+stub leave its due set, as on the real platform.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.api_client import RightLearningClient
+from src.core.modes import ApiConfig
+from src.core.platform_client import PlatformClient
+
+
+class StubPlatform:
+    """Minimal right-learning API: 40 due atoms, bulk reviews, ETagged payloads."""
+
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+        self.bulk_payloads: list[dict] = []
+        self.due = [{"id": f"atom-{i}"} for i in range(40)]
+        self.version = 1
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+
+        if path == "/api/v1/atoms":
+            etag = f'"atoms-v{self.version}"'
+            if request.headers.get("If-None-Match") == etag:
+                return httpx.Response(304)
+            limit = int(request.url.params.get("limit", 50))
+            return httpx.Response(200, json={"atoms": self.due[:limit]}, headers={"ETag": etag})
+
+        if path == "/api/v1/reviews/bulk":
+            body = json.loads(request.content)
+            self.bulk_payloads.append(body)
+            reviewed = {r["atom_id"] for r in body["reviews"]}
+            self.due = [a for a in self.due if a["id"] not in reviewed]
+            self.version += 1
+            return httpx.Response(201, json={"uploaded": len(body["reviews"])})
+
+        if path == "/api/Curriculum":
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json=[{"id": "ccna"}], headers={"ETag": '"v1"'})
+
+        return httpx.Response(404, json={"detail": "not found"})
+
+    def paths(self) -> list[str]:
+        return [r.url.path for r in self.requests]
+
+
+def ids(atoms: list[dict]) -> list[str]:
+    return [a["id"] for a in atoms]
+
+
+async def settle() -> None:
+    """Let background prefetch and flush tasks run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def stub():
+    return StubPlatform()
+
+
+def make_client(stub, tmp_path, **overrides) -> PlatformClient:
+    overrides.setdefault("prefetch_due_atoms", False)
+    config = ApiConfig(base_url="http://stub", cache_dir=tmp_path, **overrides)
+    return PlatformClient(config, transport=httpx.MockTransport(stub.handler))
+
+
+@pytest.mark.asyncio
+async def test_curriculum_revalidates_with_etag(stub, tmp_path):
+    async with RightLearningClient(
+        "http://stub", "key", cache_dir=tmp_path, transport=httpx.MockTransport(stub.handler)
+    ) as client:
+        first = await client.get_curriculums()
+        second = await client.get_curriculums()
+
+    assert first == second == [{"id": "ccna"}]
+    assert stub.requests[1].headers["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_due_atoms_revalidate_over_one_pooled_client(stub, tmp_path):
+    client = make_client(stub, tmp_path)
+
+    first = await client.get_due_atoms(limit=8)
+    pooled = client._client
+    second = await client.get_due_atoms(limit=8)
+    assert client._client is pooled
+    await client.close()
+
+    assert first == second == [{"id": f"atom-{i}"} for i in range(8)]
+    assert stub.requests[1].headers["If-None-Match"] == '"atoms-v1"'
+
+
+@pytest.mark.asyncio
+async def test_prefetch_lives_with_the_client(stub, tmp_path):
+    client = make_client(stub, tmp_path, prefetch_due_atoms=True, due_batch_size=8)
+
+    async with client:
+        await settle()
+        assert stub.paths() == ["/api/v1/atoms"]  # Sent on enter, before any call
+
+        first = await client.next_due_batch()
+        await settle()
+        assert len(stub.requests) == 2  # Following batch already requested
+        prefetch = client._prefetch_task
+        second = await client.next_due_batch()
+        assert prefetch.done()
+        pending = client._prefetch_task
+
+    assert ids(first) == [f"atom-{i}" for i in range(8)]
+    assert ids(second) == [f"atom-{i}" for i in range(8, 16)]
+    assert len(stub.requests) == 2  # Both batches came from prefetches
+    assert pending.done() and client._prefetch_task is None
+
+
+@pytest.mark.asyncio
+async def test_batches_skip_no_atoms_as_reviews_leave_due_set(stub, tmp_path):
+    client = make_client(
+        stub, tmp_path, prefetch_due_atoms=True, due_batch_size=8, review_batch_size=8
+    )
+
+    async with client:
+        first = await client.next_due_batch()
+        for atom in first:
+            await client.record_review(atom["id"], grade=3, response_ms=1000, defer=True)
+        await settle()
+        assert len(stub.bulk_payloads) == 1  # Full batch flushed, due set shrank
+
+        second = await client.next_due_batch()
+        third = await client.next_due_batch()
+
+    assert ids(second) == [f"atom-{i}" for i in range(8, 16)]
+    assert ids(third) == [f"atom-{i}" for i in range(16, 24)]
+
+
+@pytest.mark.asyncio
+async def test_deferred_reviews_flush_on_size_age_and_close(stub, tmp_path):
+    client = make_client(stub, tmp_path, review_batch_size=3, review_flush_seconds=0.05)
+
+    async with client:
+        for i in range(3):
+            result = await client.record_review(f"atom-{i}", 3, 1200, defer=True)
+            assert result == {"success": True, "deferred": True}
+        await settle()
+        assert [len(p["reviews"]) for p in stub.bulk_payloads] == [3]
+
+        await client.record_review("atom-3", 4, 900, defer=True)
+        await asyncio.sleep(0.2)
+        assert [len(p["reviews"]) for p in stub.bulk_payloads] == [3, 1]
+
+        await client.record_review("atom-4", 2, 900, defer=True)
+        assert len(client.pending_reviews) == 1
+
+    assert [len(p["reviews"]) for p in stub.bulk_payloads] == [3, 1, 1]
+    assert client.pending_reviews == []
+    assert set(stub.paths()) == {"/api/v1/reviews/bulk"}
@@ -0,0 +1,145 @@
+"""
+Tests for the span/timer API, SQL accounting and the API metrics middleware.
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.util import greenlet_spawn
+
+from src.api import metrics
+from src.core import profiling
+from src.core.profiling import instrument_engine, render_breakdown, span, sql_capture, timed
+from src.db import database
+
+
+@pytest.fixture
+def profiler():
+    profiling.profiler.reset()
+    profiling.enable()
+    yield profiling.profiler
+    profiling.disable()
+    profiling.profiler.reset()
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+    return engine
+
+
+class TestSpans:
+    def test_nested_spans_aggregate_by_path(self, profiler):
+        @timed("inner")
+        def inner():
+            time.sleep(0.002)
+
+        for _ in range(3):
+            with span("outer"):
+                inner()
+                inner()
+
+        stats = {s.path: s for s in profiler.snapshot()}
+        assert stats[("outer",)].calls == 3
+        assert stats[("outer", "inner")].calls == 6
+        assert stats[("outer",)].seconds >= stats[("outer", "inner")].seconds > 0.012
+
+    def test_disabled_spans_are_noops(self):
+        profiling.profiler.reset()
+
+        with span("ignored"):
+            pass
+        assert timed()(lambda: 42)() == 42
+
+        assert profiling.profiler.snapshot() == []
+        assert span("a") is span("b")
+
+    def test_sql_is_attributed_to_innermost_span(self, profiler, db):
+        with span("load"), db.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            with span("write"):
+                conn.execute(text("INSERT INTO t VALUES (1)"))
+                conn.execute(text("INSERT INTO t VALUES (2)"))
+
+        stats = {s.path: s for s in profiler.snapshot()}
+        assert stats[("load",)].sql_count == 1
+        assert stats[("load", "write")].sql_count == 2
+
+    def test_sql_capture_without_profiling(self, db):
+        with sql_capture() as captured, db.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+
+        assert captured.count == 2
+        assert profiling.profiler.snapshot() == []
+
+    def test_breakdown_shows_tree(self, profiler):
+        with span("session.run"), span("load_queue"):
+            pass
+
+        lines = render_breakdown().splitlines()
+
+        assert lines[1].startswith("session.run")
+        assert lines[2].startswith("  load_queue")
+
+
+class TestMetricsMiddleware:
+    def test_route_histograms_and_sql_counts(self, db):
+        metrics.route_metrics.reset()
+        app = FastAPI()
+        app.add_middleware(metrics.MetricsMiddleware)
+        app.include_router(metrics.router)
+
+        @app.get("/items/{item_id}")
+        def get_item(item_id: int):
+            with db.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return {"id": item_id}
+
+        client = TestClient(app)
+        for i in range(3):
+            assert client.get(f"/items/{i}").status_code == 200
+
+        body = client.get("/metrics").text
+
+        labels = 'method="GET",route="/items/{item_id}"'
+        assert f'cortex_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in body
+        assert f"cortex_http_request_duration_seconds_count{{{labels}}} 3" in body
+        assert f"cortex_sql_queries_total{{{labels}}} 3" in body
+
+    def test_async_engine_sql_counts(self, monkeypatch):
+        sync_engine = create_engine("sqlite://")
+        monkeypatch.setattr(database, "_async_engine", None)
+        monkeypatch.setattr(
+            database,
+            "create_async_engine",
+            lambda url, **kwargs: SimpleNamespace(sync_engine=sync_engine),
+        )
+        metrics.route_metrics.reset()
+        app = FastAPI()
+        app.add_middleware(metrics.MetricsMiddleware)
+        app.include_router(metrics.router)
+
+        def query():
+            with database.get_async_engine().sync_engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        @app.get("/async")
+        async def get_async():
+            await greenlet_spawn(query)  # How AsyncEngine runs statements on its sync_engine
+            return {}
+
+        client = TestClient(app)
+        for _ in range(2):
+            assert client.get("/async").status_code == 200
+
+        body = client.get("/metrics").text
+
+        assert 'cortex_sql_queries_total{method="GET",route="/async"} 2' in body
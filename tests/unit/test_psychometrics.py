@@ -0,0 +1,219 @@
+"""
+Tests for IRT/CTT item calibration.
+
+Parameter recovery runs on simulated 2PL data; the calibrator runs end to
+end against in-memory SQLite (atom_responses -> learning_atoms).
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from src.adaptive.psychometrics import (
+    PsychometricCalibrator,
+    ResponseMatrix,
+    classical_item_stats,
+    difficulty_to_unit,
+    fit_irt,
+)
+from src.db.bulk import BulkLoader
+
+
+def simulate(n_learners=600, n_items=40, per_learner=30, seed=5):
+    """Simulated 2PL responses with known parameters."""
+    rng = np.random.default_rng(seed)
+    theta = rng.normal(size=n_learners)
+    b = rng.normal(size=n_items)
+    a = np.exp(rng.normal(0, 0.25, size=n_items))
+    learners, items, correct = [], [], []
+    for i in range(n_learners):
+        for j in rng.choice(n_items, size=per_learner, replace=False):
+            p = 1 / (1 + np.exp(-a[j] * (theta[i] - b[j])))
+            learners.append(f"u{i}")
+            items.append(f"q{j}")
+            correct.append(bool(rng.random() < p))
+    return learners, items, correct, b
+
+
+def brute_force_point_biserial(learners, items, correct, item):
+    """Item-rest correlation from per-learner proportions, computed naively."""
+    by_learner = {}
+    for learner, it, ok in zip(learners, items, correct):
+        by_learner.setdefault(learner, []).append((it, ok))
+    xs, ys = [], []
+    for answers in by_learner.values():
+        own = [ok for it, ok in answers if it == item]
+        rest = [ok for it, ok in answers if it != item]
+        if own and rest:
+            xs.append(sum(own) / len(own))
+            ys.append(sum(rest) / len(rest))
+    return float(np.corrcoef(xs, ys)[0, 1])
+
+
+class TestClassicalStats:
+    def test_matches_brute_force(self):
+        learners, items, correct, _ = simulate(n_learners=80, n_items=8, per_learner=5)
+        matrix = ResponseMatrix()
+        matrix.add_responses(learners, items, correct)
+
+        stats = classical_item_stats(matrix)
+
+        for j, item in enumerate(matrix.item_ids):
+            answers = [ok for it, ok in zip(items, correct) if it == item]
+            assert stats.response_count[j] == len(answers)
+            assert stats.p_value[j] == pytest.approx(sum(answers) / len(answers))
+            assert stats.point_biserial[j] == pytest.approx(
+                brute_force_point_biserial(learners, items, correct, item)
+            )
+
+    def test_repeat_attempts_merge_into_one_cell(self):
+        matrix = ResponseMatrix()
+        matrix.add_responses(["u1", "u1"], ["q1", "q1"], [True, False])
+        matrix.add_responses(["u1"], ["q1"], [True])
+        matrix.compact()
+
+        assert (matrix.n_cells, matrix.n_responses) == (1, 3)
+        assert (matrix.attempts.tolist(), matrix.correct.tolist()) == ([3], [2])
+
+
+class TestFitIRT:
+    @pytest.mark.parametrize("model", ["2pl", "3pl"])
+    def test_recovers_difficulty(self, model):
+        learners, items, correct, b = simulate()
+        matrix = ResponseMatrix()
+        matrix.add_responses(learners, items, correct)
+
+        params = fit_irt(matrix, model=model)
+
+        true_b = b[[int(item[1:]) for item in matrix.item_ids]]
+        assert params.converged
+        assert np.corrcoef(params.difficulty, true_b)[0, 1] > 0.9
+        assert np.all(params.discrimination > 0)
+
+    def test_warm_start_converges_faster(self):
+        learners, items, correct, _ = simulate()
+        matrix = ResponseMatrix()
+        matrix.add_responses(learners, items, correct)
+        cold = fit_irt(matrix)
+
+        warm = fit_irt(matrix, init=cold.extended_to(matrix, matrix.learner_ids, matrix.item_ids))
+
+        assert warm.iterations < cold.iterations
+        assert warm.difficulty == pytest.approx(cold.difficulty, abs=0.05)
+
+    def test_difficulty_to_unit(self):
+        assert difficulty_to_unit(None) == 0.5
+        assert difficulty_to_unit(0.0) == pytest.approx(0.5)
+        assert difficulty_to_unit(-10) == 0.0
+        assert difficulty_to_unit(3.0) == 1.0
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    with Session(engine) as session:
+        session.execute(
+            text(
+                "CREATE TABLE learning_atoms ("
+                "id TEXT PRIMARY KEY, front TEXT NOT NULL, irt_difficulty REAL, "
+                "irt_discrimination REAL, irt_guessing REAL, p_value REAL, "
+                "discrimination_index REAL, response_count INTEGER, correct_count INTEGER)"
+            )
+        )
+        session.execute(
+            text(
+                "CREATE TABLE atom_responses ("
+                "user_id TEXT, atom_id TEXT, is_correct BOOLEAN, responded_at TIMESTAMP)"
+            )
+        )
+        yield session
+
+
+def insert_responses(session, learners, items, correct, start):
+    session.execute(
+        text("INSERT INTO atom_responses VALUES (:u, :a, :c, :t)"),
+        [
+            {"u": u, "a": a, "c": c, "t": start + timedelta(seconds=i)}
+            for i, (u, a, c) in enumerate(zip(learners, items, correct))
+        ],
+    )
+
+
+class TestCalibrator:
+    def test_bulk_update_only_touches_existing_rows(self, session):
+        session.execute(text("INSERT INTO learning_atoms (id, front) VALUES ('a', 'x')"))
+
+        result = BulkLoader(session).update(
+            "learning_atoms",
+            [{"id": "a", "p_value": 0.5}, {"id": "missing", "p_value": 0.1}],
+            key_columns=["id"],
+        )
+
+        assert (result.updated, result.skipped) == (1, 1)
+        rows = session.execute(text("SELECT id, front, p_value FROM learning_atoms")).fetchall()
+        assert rows == [("a", "x", 0.5)]
+
+    def test_incremental_run_reads_only_new_responses(self, session, tmp_path):
+        learners, items, correct, _ = simulate(n_learners=200, n_items=20, per_learner=10)
+        session.execute(
+            text("INSERT INTO learning_atoms (id, front) VALUES (:id, 'x')"),
+            [{"id": f"q{j}"} for j in range(20)],
+        )
+        half = len(learners) // 2
+        start = datetime(2025, 1, 1)
+        insert_responses(session, learners[:half], items[:half], correct[:half], start)
+        state = tmp_path / "irt_state.npz"
+
+        first = PsychometricCalibrator(session, state_path=state).run()
+        insert_responses(
+            session,
+            learners[half:],
+            items[half:],
+            correct[half:],
+            start + timedelta(days=1),
+        )
+        second = PsychometricCalibrator(session, state_path=state).run()
+        full = PsychometricCalibrator(session, state_path=None).run(full=True, dry_run=True)
+
+        assert first.responses_read == half
+        assert second.responses_read == len(learners) - half
+        assert second.warm_start
+        assert second.total_responses == full.total_responses == len(learners)
+        assert second.rows_updated == 20
+        counts = session.execute(
+            text("SELECT SUM(response_count), COUNT(irt_difficulty) FROM learning_atoms")
+        ).one()
+        assert tuple(counts) == (len(learners), 20)
+
+    def test_unchanged_statistics_are_not_rewritten(self, session):
+        learners, items, correct, _ = simulate(n_learners=50, n_items=5, per_learner=5)
+        session.execute(
+            text("INSERT INTO learning_atoms (id, front) VALUES (:id, 'x')"),
+            [{"id": f"q{j}"} for j in range(5)],
+        )
+        insert_responses(session, learners, items, correct, datetime(2025, 1, 1))
+
+        first = PsychometricCalibrator(session, state_path=None).run(full=True)
+        session.execute(text("UPDATE learning_atoms SET p_value = NULL WHERE id = 'q3'"))
+        second = PsychometricCalibrator(session, state_path=None).run(full=True)
+
+        assert first.rows_updated == 5
+        assert second.rows_updated == 1  # Only the row that differs
+
+    def test_dry_run_writes_nothing(self, session, tmp_path):
+        learners, items, correct, _ = simulate(n_learners=50, n_items=5, per_learner=5)
+        session.execute(
+            text("INSERT INTO learning_atoms (id, front) VALUES (:id, 'x')"),
+            [{"id": f"q{j}"} for j in range(5)],
+        )
+        insert_responses(session, learners, items, correct, datetime(2025, 1, 1))
+        state = tmp_path / "irt_state.npz"
+
+        result = PsychometricCalibrator(session, state_path=state).run(dry_run=True)
+
+        assert result.items == 5 and result.rows_updated == 0
+        assert not state.exists()
+        assert session.execute(text("SELECT COUNT(p_value) FROM learning_atoms")).scalar() == 0
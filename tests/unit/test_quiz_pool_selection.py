@@ -0,0 +1,102 @@
+"""
+Tests for seeded quiz pool selection.
+
+Selections must be reproducible per seed when requests run concurrently,
+leave the global RNG alone, and diverse selection must give every question
+type its quota, taken in seeded order. Runs against the seeded SQLite
+pools in tests/fixtures.
+"""
+
+import random
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tests.fixtures import quiz_pool
+
+
+@pytest.fixture(scope="module")
+def pools(tmp_path_factory):
+    engine = quiz_pool.make_engine(tmp_path_factory.mktemp("quiz") / "quiz.db")
+    return engine, quiz_pool.generate(engine, pools=2, questions=2_000, seed=3)
+
+
+def _ids(questions):
+    return [q.question_id for q in questions]
+
+
+def test_concurrent_selection_is_reproducible_per_seed(pools):
+    engine, (pool_id, _) = pools
+
+    def select(seed):
+        return _ids(
+            quiz_pool.run_selection(
+                engine, "select_questions", pool_id=pool_id, count=15, seed=seed
+            )
+        )
+
+    seeds = [f"user-{n}:1" for n in range(8)]
+    serial = {seed: select(seed) for seed in seeds}
+    jobs = seeds * 4
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(select, jobs))
+
+    assert results == [serial[seed] for seed in jobs]
+    assert len({tuple(ids) for ids in serial.values()}) == len(seeds)
+    assert all(len(ids) == 15 for ids in serial.values())
+
+
+def test_filters_apply_without_touching_global_rng(pools):
+    engine, (pool_id, _) = pools
+    everything = quiz_pool.run_selection(
+        engine, "select_questions", pool_id=pool_id, count=10**6, seed="s"
+    )
+    excluded = _ids(everything[:5])
+
+    random.seed(42)
+    state = random.getstate()
+    selected = quiz_pool.run_selection(
+        engine,
+        "select_questions",
+        pool_id=pool_id,
+        count=10,
+        seed="s",
+        exclude_ids=excluded,
+        difficulty_range=(0.3, 0.6),
+        question_types=["mcq", "true_false"],
+    )
+
+    assert random.getstate() == state
+    assert len(selected) == 10
+    assert not set(_ids(selected)) & set(excluded)
+    assert all(0.3 <= q.difficulty <= 0.6 for q in selected)
+    assert {q.question_type for q in selected} <= {"mcq", "true_false"}
+    ranked = [q for q in _ids(everything) if q in set(_ids(selected))]
+    assert _ids(selected) == ranked
+
+
+@pytest.mark.parametrize("count", [4, 20, 60])
+def test_diverse_selection_fills_type_quotas_in_seeded_order(pools, count):
+    engine, (pool_id, _) = pools
+    ranking = quiz_pool.run_selection(
+        engine, "select_questions", pool_id=pool_id, count=10**6, seed="d"
+    )
+    by_type: dict[str, list[str]] = {}
+    for q in ranking:
+        by_type.setdefault(q.question_type, []).append(q.question_id)
+    per_type = max(1, count // len(by_type))
+
+    diverse = quiz_pool.run_selection(
+        engine, "select_diverse_questions", pool_id=pool_id, count=count, seed="d"
+    )
+
+    assert len(diverse) == count
+    counts = Counter(q.question_type for q in diverse)
+    assert len(counts) == min(count, len(by_type))
+    for question_type, n in counts.items():
+        assert n >= min(per_type, len(by_type[question_type]))
+        # Each type's picks are the head of that type's seeded order
+        assert _ids(q for q in diverse if q.question_type == question_type) == (
+            by_type[question_type][:n]
+        )
@@ -0,0 +1,186 @@
+"""
+Tests for background prefetch of render assets in study sessions.
+
+The prefetcher must hand out assets only for the atom and plan they were
+built for, drop work when the queue is re-ranked, and stay under its memory
+cap. A scripted session re-ranks its queue while the worker is building and
+checks that every card renders with its own assets.
+"""
+
+import io
+import json
+import random
+import threading
+import time
+from unittest.mock import MagicMock
+
+from rich.console import Console
+
+import src.cortex.session as session_module
+from src.cortex.render_prefetch import RenderPrefetcher, estimate_size
+from src.cortex.session import CortexSession
+
+
+def atom(n: int) -> dict:
+    return {"id": f"atom-{n}", "atom_type": "flashcard", "front": f"Q{n}", "back": f"A{n}"}
+
+
+def drain(prefetcher: RenderPrefetcher) -> None:
+    """Wait for the single worker to finish everything queued before this call."""
+    prefetcher._executor.submit(lambda: None).result()
+
+
+class RecordingBuilder:
+    def __init__(self, gate: threading.Event | None = None, payload: str = ""):
+        self.gate = gate
+        self.payload = payload
+        self.calls: list[tuple[str, object]] = []
+
+    def __call__(self, note: dict, plan: object) -> dict:
+        self.calls.append((note["id"], plan))
+        if self.gate is not None:
+            self.gate.wait(5)
+        return {"atom_id": note["id"], "plan": plan, "text": self.payload}
+
+
+def test_prefetched_assets_are_taken_in_order():
+    gate = threading.Event()
+    build = RecordingBuilder(gate)
+    prefetcher = RenderPrefetcher(build, depth=3)
+    atoms = [atom(n) for n in range(3)]
+
+    prefetcher.schedule([(a, None) for a in atoms])
+    while not build.calls:
+        time.sleep(0.001)
+    threading.Timer(0.05, gate.set).start()
+    assert prefetcher.take(atoms[0], None)["atom_id"] == "atom-0"  # Waits for the build
+    drain(prefetcher)
+    for a in atoms[1:]:
+        assert prefetcher.take(a, None)["atom_id"] == a["id"]
+
+    assert [atom_id for atom_id, _ in build.calls] == ["atom-0", "atom-1", "atom-2"]
+    assert (prefetcher.hits, prefetcher.misses) == (3, 0)
+    prefetcher.close()
+
+
+def test_reranked_window_drops_stale_work():
+    gate = threading.Event()
+    build = RecordingBuilder(gate)
+    prefetcher = RenderPrefetcher(build, depth=3)
+    a, b, c, d = (atom(n) for n in range(4))
+
+    prefetcher.schedule([(a, None), (b, None), (c, None)])
+    while not build.calls:
+        time.sleep(0.001)  # a is building; b and c are queued
+    prefetcher.schedule([(c, None), (d, None)])
+    gate.set()
+    drain(prefetcher)
+
+    assert prefetcher.take(a, None) is None
+    assert prefetcher.take(c, None)["atom_id"] == "atom-2"
+    assert prefetcher.take(d, None)["atom_id"] == "atom-3"
+    assert [atom_id for atom_id, _ in build.calls] == ["atom-0", "atom-2", "atom-3"]
+    assert prefetcher.discarded == 1  # a finished after it left the window
+    assert prefetcher.ready_bytes == 0
+    prefetcher.close()
+
+
+def test_changed_plan_is_rebuilt():
+    build = RecordingBuilder()
+    prefetcher = RenderPrefetcher(build, depth=2)
+    a = atom(0)
+
+    prefetcher.schedule([(a, "atom-7")])
+    drain(prefetcher)
+    prefetcher.schedule([(a, "atom-9")])
+    drain(prefetcher)
+    assert prefetcher.take(a, "atom-9")["plan"] == "atom-9"
+
+    prefetcher.schedule([(a, "atom-9")])
+    drain(prefetcher)
+    assert prefetcher.take(a, "atom-7") is None
+    assert build.calls == [("atom-0", "atom-7"), ("atom-0", "atom-9"), ("atom-0", "atom-9")]
+    prefetcher.close()
+
+
+def test_memory_cap_evicts_farthest_ahead():
+    build = RecordingBuilder(payload="x" * 4000)
+    size = estimate_size(build(atom(0), None))
+    prefetcher = RenderPrefetcher(build, depth=4, max_bytes=int(size * 2.5))
+    atoms = [atom(n) for n in range(4)]
+
+    prefetcher.schedule([(a, None) for a in atoms])
+    drain(prefetcher)
+
+    assert prefetcher.ready_bytes <= prefetcher.max_bytes
+    assert [prefetcher.take(a, None) is not None for a in atoms] == [True, True, False, False]
+    prefetcher.close()
+
+
+def test_disabled_prefetch_builds_nothing():
+    build = RecordingBuilder()
+    prefetcher = RenderPrefetcher(build, depth=0)
+    prefetcher.schedule([(atom(0), None)])
+    assert prefetcher.take(atom(0), None) is None
+    assert build.calls == []
+
+
+def test_scripted_session_with_reranking_renders_each_card_with_its_assets(monkeypatch):
+    atoms = [
+        {**atom(n), "content_json": json.dumps({"card": n, "hint": f"h{n}"})} for n in range(24)
+    ]
+    rng = random.Random(3)
+
+    def answer(note):
+        position = session.current_index
+        if position % 2:
+            # Re-rank the rest of the queue while the worker is building it
+            rest = session.queue[position:]
+            rng.shuffle(rest)
+            session.queue[position:] = rest
+        else:
+            time.sleep(0.02)  # Answering: the window gets built
+        return rng.random() < 0.7
+
+    session = CortexSession(
+        modules=[1],
+        limit=len(atoms),
+        enable_ncde=False,
+        atoms_override=atoms,
+        answer_provider=answer,
+    )
+    session.sync_anki = lambda: None
+    session.study_service = MagicMock()
+    session._session_store = MagicMock()
+
+    build = session.prefetcher.build
+
+    def slow_build(note, plan):
+        time.sleep(0.003)
+        return build(note, plan)
+
+    session.prefetcher.build = slow_build
+
+    rendered = []
+    render_question_panel = session_module.ui.render_question_panel
+
+    def record(console, note):
+        if not note.get("_retry_attempt"):
+            assets = session._card_assets
+            rendered.append((note["id"], assets["atom_id"], assets["content_json"]))
+        render_question_panel(console, note)
+
+    monkeypatch.setattr(session_module.ui, "render_question_panel", record)
+    monkeypatch.setattr(session_module, "console", Console(file=io.StringIO(), width=120))
+
+    session.run()
+
+    by_id = {a["id"]: json.loads(a["content_json"]) for a in atoms}
+    assert sorted(note_id for note_id, _, _ in rendered) == sorted(by_id)
+    for note_id, assets_id, content_json in rendered:
+        assert assets_id == note_id
+        assert content_json == by_id[note_id]
+    assert len(session.render_times_ms) == len(atoms)
+    assert session.prefetcher.hits > 0
+    assert session.prefetcher.hits + session.prefetcher.misses == len(atoms)
+    assert session.correct + session.incorrect == len(atoms)
@@ -0,0 +1,293 @@
+"""
+Tests for the local SQLite read replica.
+
+An in-memory SQLite database stands in for PostgreSQL as the sync source;
+the replica itself is a temporary SQLite file.
+"""
+
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from src.db.replica import LocalReplica, ReplicaSync
+from src.study.replica_study_service import ReplicaStudyService, open_study_service
+
+SOURCE_SCHEMA = [
+    """CREATE TABLE ccna_sections (
+        section_id TEXT PRIMARY KEY, module_number INTEGER, title TEXT, level INTEGER,
+        parent_section_id TEXT, display_order INTEGER, updated_at TIMESTAMP)""",
+    "CREATE TABLE concepts (id TEXT PRIMARY KEY, name TEXT, updated_at TIMESTAMP)",
+    """CREATE TABLE learning_atoms (
+        id TEXT PRIMARY KEY, card_id TEXT, atom_type TEXT, front TEXT, back TEXT,
+        concept_id TEXT, ccna_section_id TEXT, source_file TEXT, anki_difficulty REAL,
+        anki_stability REAL, anki_lapses INTEGER, anki_review_count INTEGER,
+        anki_due_date DATE, updated_at TIMESTAMP)""",
+    """CREATE TABLE struggle_weights (
+        id TEXT PRIMARY KEY, module_number INTEGER, section_id TEXT, weight REAL,
+        severity TEXT, user_id TEXT, updated_at TIMESTAMP)""",
+    """CREATE TABLE ccna_section_mastery (
+        section_id TEXT, user_id TEXT, mastery_score REAL, is_completed BOOLEAN,
+        needs_remediation BOOLEAN, atoms_total INTEGER, atoms_mastered INTEGER,
+        atoms_learning INTEGER, atoms_struggling INTEGER, atoms_new INTEGER,
+        updated_at TIMESTAMP, PRIMARY KEY (section_id, user_id))""",
+    """CREATE TABLE atom_responses (
+        atom_id TEXT, user_id TEXT, is_correct BOOLEAN, response_time_ms INTEGER,
+        user_answer TEXT, responded_at TIMESTAMP)""",
+]
+
+T0 = datetime(2025, 1, 1, 12, 0, 0)
+TODAY = date.today()
+
+
+@pytest.fixture
+def source():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    with engine.begin() as conn:
+        for ddl in SOURCE_SCHEMA:
+            conn.execute(text(ddl))
+        conn.execute(
+            text("INSERT INTO ccna_sections VALUES (:s, :m, :t, 2, NULL, :o, :u)"),
+            [
+                {"s": "1.1", "m": 1, "t": "Intro", "o": 1, "u": T0},
+                {"s": "2.1", "m": 2, "t": "Switching", "o": 2, "u": T0},
+            ],
+        )
+        conn.execute(text("INSERT INTO concepts VALUES ('c1', 'OSI', :u)"), {"u": T0})
+        conn.execute(
+            text(
+                "INSERT INTO learning_atoms VALUES "
+                "(:id, :card, :t, 'Q', 'A', 'c1', :sec, 'f.txt', 0.3, :stab, 0, :rc, :due, :u)"
+            ),
+            [
+                {
+                    "id": f"a{n}",
+                    "card": f"k{n}",
+                    "t": ["mcq", "true_false", "parsons"][n % 3],
+                    "sec": "1.1" if n < 10 else "2.1",
+                    "stab": float(n % 5 + 1),
+                    "rc": 0 if n % 4 == 0 else 2,
+                    "due": None if n % 4 == 0 else TODAY - timedelta(days=n % 3),
+                    "u": T0 + timedelta(minutes=n),
+                }
+                for n in range(20)
+            ],
+        )
+        conn.execute(
+            text("INSERT INTO struggle_weights VALUES ('w1', 2, NULL, 0.9, 'high', 'default', :u)"),
+            {"u": T0},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO ccna_section_mastery VALUES "
+                "(:s, 'default', 50.0, 0, 1, 10, 2, 3, 4, 1, :u)"
+            ),
+            [{"s": "1.1", "u": T0}, {"s": "2.1", "u": T0}],
+        )
+    return engine
+
+
+@pytest.fixture
+def replica(tmp_path):
+    return LocalReplica(tmp_path / "cortex.db")
+
+
+def local_rows(replica, sql):
+    with replica.engine.connect() as conn:
+        return conn.execute(text(sql)).fetchall()
+
+
+class TestPull:
+    def test_initial_pull_copies_all_tables(self, source, replica):
+        result = ReplicaSync(replica, source=source).sync()
+
+        assert result.success
+        assert result.pulled_rows == {
+            "ccna_sections": 2,
+            "concepts": 1,
+            "learning_atoms": 20,
+            "struggle_weights": 1,
+            "ccna_section_mastery": 2,
+        }
+        assert replica.is_populated()
+
+    def test_delta_pull_fetches_only_changed_rows(self, source, replica):
+        sync = ReplicaSync(replica, source=source)
+        sync.sync()
+        with source.begin() as conn:
+            conn.execute(
+                text("UPDATE learning_atoms SET front = 'Q2', updated_at = :u WHERE id = 'a3'"),
+                {"u": T0 + timedelta(hours=1)},
+            )
+
+        result = sync.sync()
+
+        # a3, plus a14-a19 inside the overlap before the watermark (a19 sits on it)
+        assert result.pulled_rows["learning_atoms"] == 7
+        assert result.pulled_rows["concepts"] == 1
+        assert local_rows(replica, "SELECT front FROM learning_atoms WHERE id = 'a3'") == [("Q2",)]
+
+    def test_count_mismatch_reconciles_deletes_and_untimestamped_inserts(self, source, replica):
+        sync = ReplicaSync(replica, source=source)
+        sync.sync()
+        with source.begin() as conn:
+            conn.execute(text("DELETE FROM learning_atoms WHERE id IN ('a1', 'a2')"))
+            conn.execute(
+                text("INSERT INTO learning_atoms (id, atom_type, front) VALUES ('x', 'mcq', 'Q')")
+            )
+            conn.execute(text("DELETE FROM ccna_section_mastery WHERE section_id = '2.1'"))
+
+        result = sync.sync()
+
+        ids = {row[0] for row in local_rows(replica, "SELECT id FROM learning_atoms")}
+        assert result.deleted_rows["learning_atoms"] == 2
+        assert "x" in ids and not {"a1", "a2"} & ids
+        assert local_rows(replica, "SELECT section_id FROM ccna_section_mastery") == [("1.1",)]
+
+
+class TestReplicaSessions:
+    def test_adaptive_session_reads_replica(self, source, replica):
+        ReplicaSync(replica, source=source).sync()
+        service = ReplicaStudyService(replica)
+
+        atoms = service.get_adaptive_session(limit=10, modules=[1, 2])
+
+        assert 0 < len(atoms) <= 10
+        assert len({a["id"] for a in atoms}) == len(atoms)
+        assert {a["source"] for a in atoms} <= {"struggle", "due", "new"}
+        assert all(a["module_number"] == 2 for a in atoms if a["source"] == "struggle")
+        assert all(a["concept_name"] == "OSI" for a in atoms)
+
+    def test_war_session_filters_modules_and_types(self, source, replica):
+        ReplicaSync(replica, source=source).sync()
+
+        atoms = ReplicaStudyService(replica).get_war_session([1], limit=50, prioritize_types=["mcq"])
+
+        assert atoms and all(a["module_number"] == 1 and a["atom_type"] == "mcq" for a in atoms)
+
+    def test_open_study_service_requires_synced_replica(self, source, tmp_path):
+        path = tmp_path / "cortex.db"
+        assert not isinstance(
+            open_study_service(replica_path=path, source=source), ReplicaStudyService
+        )
+
+        ReplicaSync(LocalReplica(path), source=source).sync()
+
+        assert isinstance(open_study_service(replica_path=path, source=source), ReplicaStudyService)
+
+    def test_open_study_service_syncs_before_handing_out_the_replica(self, source, tmp_path):
+        path = tmp_path / "cortex.db"
+        ReplicaSync(LocalReplica(path), source=source).sync()
+        with source.begin() as conn:
+            conn.execute(
+                text("UPDATE learning_atoms SET front = 'Q2', updated_at = :u WHERE id = 'a3'"),
+                {"u": T0 + timedelta(hours=1)},
+            )
+
+        service = open_study_service(replica_path=path, source=source)
+
+        assert isinstance(service, ReplicaStudyService)
+        assert local_rows(service.replica, "SELECT front FROM learning_atoms WHERE id = 'a3'") == [
+            ("Q2",)
+        ]
+
+    def test_server_probe_gives_up_after_connect_timeout(self, replica):
+        # Non-routable address: without a connect timeout this waits for TCP to give up
+        unreachable = create_engine("postgresql://cortex@10.255.255.1:5432/cortex")
+        started = time.perf_counter()
+
+        assert not ReplicaSync(replica, source=unreachable).server_available(timeout=2)
+        assert time.perf_counter() - started < 10
+
+    def test_open_study_service_uses_stale_replica_only_offline(self, source, tmp_path):
+        path = tmp_path / "cortex.db"
+        ReplicaSync(LocalReplica(path), source=source).sync()
+        unreachable = create_engine(f"sqlite:///{tmp_path / 'missing' / 'server.db'}")
+
+        assert isinstance(
+            open_study_service(replica_path=path, source=unreachable), ReplicaStudyService
+        )
+
+        with source.begin() as conn:
+            conn.execute(text("DROP TABLE concepts"))
+
+        # Reachable but the sync fails: use the database, not the stale replica
+        assert not isinstance(
+            open_study_service(replica_path=path, source=source), ReplicaStudyService
+        )
+
+
+class TestPush:
+    def test_reviews_are_pushed_in_batches(self, source, replica):
+        ReplicaSync(replica, source=source).sync()
+        service = ReplicaStudyService(replica)
+
+        correct = service.record_interaction("a5", True, 1200)
+        service.record_interaction("a6", False, 900)
+        service.record_interaction("a6", True, 800)
+
+        assert correct["new_stability"] == pytest.approx(2.5)
+        assert correct["next_due"] == TODAY + timedelta(days=2)
+        assert replica.pending_count() == 3
+
+        result = ReplicaSync(replica, source=source, batch_size=2).sync()
+
+        assert (result.pushed_reviews, result.pushed_atoms) == (3, 3)
+        assert replica.pending_count() == 0
+        with source.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM atom_responses")).scalar() == 3
+            row = conn.execute(
+                text("SELECT anki_stability, anki_lapses, anki_review_count FROM learning_atoms WHERE id = 'a6'")
+            ).one()
+        # a6: stability 2 -> 1 (min 1) -> 2.5, one lapse, two more reviews
+        assert tuple(row) == (pytest.approx(2.5), 1, 4)
+
+    def test_push_keeps_server_state_of_atoms_changed_since_pull(self, source, replica):
+        ReplicaSync(replica, source=source).sync()
+        service = ReplicaStudyService(replica)
+        service.record_interaction("a5", True, 1200)
+        service.record_interaction("a6", True, 1200)
+        with source.begin() as conn:
+            # e.g. an Anki sync reviewed a6 after the replica last pulled it
+            conn.execute(
+                text(
+                    "UPDATE learning_atoms SET anki_stability = 9.0, updated_at = :u "
+                    "WHERE id = 'a6'"
+                ),
+                {"u": T0 + timedelta(hours=1)},
+            )
+
+        result = ReplicaSync(replica, source=source).sync()
+
+        assert (result.pushed_reviews, result.pushed_atoms, result.stale_atoms) == (2, 1, 1)
+        with source.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM atom_responses")).scalar() == 2
+            stability = dict(
+                conn.execute(
+                    text("SELECT id, anki_stability FROM learning_atoms WHERE id IN ('a5', 'a6')")
+                ).fetchall()
+            )
+        assert stability == {"a5": pytest.approx(2.5), "a6": pytest.approx(9.0)}
+        # The pull after the push brings the server's state into the replica
+        assert local_rows(replica, "SELECT anki_stability FROM learning_atoms WHERE id = 'a6'") == [
+            (pytest.approx(9.0),)
+        ]
+
+    def test_failed_push_keeps_outbox_and_skips_pull(self, source, replica):
+        ReplicaSync(replica, source=source).sync()
+        ReplicaStudyService(replica).record_interaction("a5", True, 1200)
+        with source.begin() as conn:
+            conn.execute(text("DROP TABLE atom_responses"))
+
+        result = ReplicaSync(replica, source=source).sync()
+
+        assert not result.success
+        assert result.pulled_rows == {}
+        assert replica.pending_count() == 1
+        assert local_rows(replica, "SELECT anki_stability FROM learning_atoms WHERE id = 'a5'") == [
+            (pytest.approx(2.5),)
+        ]
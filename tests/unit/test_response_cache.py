@@ -0,0 +1,132 @@
+"""
+Tests for the API response cache (TTL/LRU, ETags, tag invalidation).
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from config import get_settings
+from src.api.cache import TAG_CCNA_QA, ResponseCache
+from src.api.routers import ccna_router
+
+
+@pytest.fixture
+def app_with_cache():
+    cache = ResponseCache(ttl_seconds=60, max_entries=2)
+    calls = {"n": 0, "value": "a"}
+    app = FastAPI()
+
+    @app.get("/report")
+    def report(request: Request):
+        def build():
+            calls["n"] += 1
+            return {"value": calls["value"]}
+
+        return cache.respond(request, [TAG_CCNA_QA], build)
+
+    return TestClient(app), cache, calls
+
+
+class TestResponseCache:
+    def test_hit_etag_and_not_modified(self, app_with_cache):
+        client, cache, calls = app_with_cache
+
+        first = client.get("/report")
+        second = client.get("/report")
+        revalidated = client.get("/report", headers={"If-None-Match": first.headers["etag"]})
+
+        assert first.json() == {"value": "a"}
+        assert (first.headers["x-cache"], second.headers["x-cache"]) == ("MISS", "HIT")
+        assert first.headers["etag"] == second.headers["etag"]
+        assert revalidated.status_code == 304 and revalidated.content == b""
+        assert calls["n"] == 1
+
+    def test_query_parameters_are_part_of_the_key(self, app_with_cache):
+        client, cache, calls = app_with_cache
+
+        client.get("/report?b=2&a=1")
+        client.get("/report?a=1&b=2")
+        client.get("/report?a=2")
+
+        assert calls["n"] == 2
+
+    def test_invalidation_and_lru_eviction(self, app_with_cache):
+        client, cache, calls = app_with_cache
+        etag = client.get("/report").headers["etag"]
+
+        calls["value"] = "b"
+        assert cache.invalidate(TAG_CCNA_QA) == 1
+        fresh = client.get("/report", headers={"If-None-Match": etag})
+
+        assert fresh.status_code == 200 and fresh.json() == {"value": "b"}
+
+        client.get("/report?x=1")
+        client.get("/report?x=2")
+        assert len(cache) == 2
+
+    def test_result_computed_during_invalidation_is_not_cached(self, app_with_cache):
+        client, cache, calls = app_with_cache
+        app = client.app
+
+        @app.get("/racy")
+        def racy(request: Request):
+            def build():
+                calls["n"] += 1
+                cache.invalidate(TAG_CCNA_QA)  # A write lands mid-computation
+                return {"n": calls["n"]}
+
+            return cache.respond(request, [TAG_CCNA_QA], build)
+
+        assert client.get("/racy").json() == {"n": 1}
+        assert client.get("/racy").json() == {"n": 2}
+
+
+def test_module_listing_is_cached_until_files_change(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "ccna_modules_path", str(tmp_path))
+    monkeypatch.setattr(get_settings(), "api_cpu_workers", 0)  # parse in threads, not processes
+    module = tmp_path / "CCNA Module 1.txt"
+    module.write_text("# Module 1: Networking Today\n\n## 1.1 Networks Affect our Lives\n\nText.\n")
+    app = FastAPI()
+    app.include_router(ccna_router.router, prefix="/api/ccna")
+    client = TestClient(app)
+
+    first = client.get("/api/ccna/modules")
+    second = client.get("/api/ccna/modules")
+    module.write_text(module.read_text() + "\n## 1.2 Network Components\n\nMore text.\n")
+    third = client.get("/api/ccna/modules")
+
+    assert [m["module_number"] for m in first.json()] == [1]
+    assert second.headers["x-cache"] == "HIT"
+    assert third.headers["x-cache"] == "MISS"
+    assert third.headers["etag"] != first.headers["etag"]
+
+
+def test_modules_version_is_the_same_in_every_process(tmp_path):
+    module = tmp_path / "CCNA Module 1.txt"
+    module.write_text("# Module 1: Networking Today\n")
+    script = (
+        "import sys; from pathlib import Path; "
+        "from src.api.routers.ccna_router import _modules_version; "
+        "print(_modules_version([Path(sys.argv[1])]))"
+    )
+    root = Path(__file__).resolve().parents[2]
+
+    versions = {
+        subprocess.run(
+            [sys.executable, "-c", script, str(module)],
+            cwd=root,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        for seed in ("1", "2")
+    }
+
+    assert versions == {ccna_router._modules_version([module])}
@@ -0,0 +1,185 @@
+"""
+Tests for the single-pass course section tokenizer and the parse cache.
+
+The tokenizer must cut exactly what the previous regexes matched. Random
+strings built from marker fragments are compared against the legacy
+patterns kept in tests/fixtures/course_parsing.py.
+"""
+
+import random
+import sqlite3
+import time
+
+import pytest
+
+from src.curriculum.easv_parser import EASVParser
+from src.processing import parse_cache
+from src.processing.course_chunker import (
+    CurriculumTableParser,
+    MoodleWeeklyParser,
+    UniversalChunker,
+)
+from src.processing.parse_cache import ParseCache
+from src.processing.section_tokenizer import (
+    curriculum_table,
+    easv_sections,
+    has_curriculum_table,
+    moodle_weeks,
+)
+from tests.fixtures import course_parsing as courses
+
+FRAGMENTS = [
+    "W3 ", "W12-", "w7:", "Week 4", "week\t9", "\n5 -", "\n12 :", "W35 - 2. Aug (Git)",
+    "W1 -3.x", "Before Class", "before  class", "During\nClass", "Workshop", "Quiz",
+    "Learning resources", "Topic", "topic ", "Learning objectives", "learning objectives\n",
+    " ", "  ", "\t", "\n", "\n\n", "x", "ab", "-", ":", "5.", "(", ")",
+]
+TABLE_FRAGMENTS = [
+    "Week", "week ", "Topic", " topic\t", "Learning objectives", "learning objectives\n",
+    " ", "  ", "\t", "\n", " \n ", "\n\n", "x", "35", "Git",
+]
+HEADERS = MoodleWeeklyParser.SECTION_HEADERS
+
+
+def random_texts(seed: int, count: int = 400, max_fragments: int = 30, fragments=FRAGMENTS):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(fragments) for _ in range(rng.randint(0, max_fragments)))
+
+
+def test_easv_sections_match_legacy_split():
+    for text in random_texts(1):
+        sections = easv_sections(text)
+        assert [s.span.text(text) for s in sections] == courses.legacy_easv_sections(text)
+        for section in sections:
+            blocks = courses.legacy_class_blocks(section.span.text(text))
+            children = {kind: span.text(text) for kind, span in section.children.items()}
+            assert children.keys() == blocks.keys()
+            for kind, block in blocks.items():
+                assert children[kind].strip() == block.strip()
+
+
+def test_moodle_weeks_match_legacy_findall():
+    for text in random_texts(2):
+        weeks = moodle_weeks(text, HEADERS)
+        assert [w.span.text(text) for w in weeks] == courses.legacy_moodle_weeks(text)
+        for week in weeks:
+            children = {name: span.text(text) for name, span in week.children.items()}
+            assert children == courses.legacy_split_week_sections(week.span.text(text))
+
+
+def test_curriculum_table_matches_legacy_patterns():
+    for text in random_texts(3, count=1500, max_fragments=20, fragments=TABLE_FRAGMENTS):
+        assert has_curriculum_table(text) == courses.legacy_has_table(text), repr(text)
+        span = curriculum_table(text)
+        assert (span.text(text) if span else None) == courses.legacy_table_body(text), repr(text)
+
+
+def test_parsers_match_legacy_on_course(tmp_path):
+    path = tmp_path / "SDE2.txt"
+    path.write_text(courses.generate_course(150_000), encoding="utf-8")
+
+    assert EASVParser().parse_file(path) == courses.LegacyEASVParser().parse_file(path)
+    chunks = courses.chunk(path)
+    assert len(chunks) > 100
+    assert chunks == courses.chunk(path, legacy=True)
+
+
+def test_table_with_trailing_columns_parses_in_linear_time(tmp_path):
+    # The previous table pattern needs minutes here: it fails from every week/topic pair
+    text = courses.generate_table_course(20_000)
+    path = tmp_path / "plan.txt"
+    started = time.perf_counter()
+    parser = CurriculumTableParser()
+    assert parser.can_parse(text, path)
+    assert list(parser.parse(text, path)) == []
+    assert not has_curriculum_table("Week topic " * 20_000)
+    assert time.perf_counter() - started < 5
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    calls = []
+    original = MoodleWeeklyParser.parse
+
+    def parse(self, content, file_path):
+        calls.append(file_path.name)
+        return original(self, content, file_path)
+
+    monkeypatch.setattr(MoodleWeeklyParser, "parse", parse)
+    return calls
+
+
+def test_directory_reingest_parses_only_changed_files(tmp_path, parse_calls):
+    directory = tmp_path / "courses"
+    directory.mkdir()
+    for n in range(3):
+        text = courses.generate_course(20_000, seed=n)
+        (directory / f"course{n}.txt").write_text(text, encoding="utf-8")
+    cache_path = tmp_path / "cache.db"
+
+    first = list(UniversalChunker.chunk_directory(directory, "*.txt", cache_path))
+    assert sorted(parse_calls) == ["course0.txt", "course1.txt", "course2.txt"]
+
+    parse_calls.clear()
+    assert list(UniversalChunker.chunk_directory(directory, "*.txt", cache_path)) == first
+    assert parse_calls == []
+
+    edited = directory / "course1.txt"
+    edited.write_text(edited.read_text(encoding="utf-8") + courses.generate_week(random.Random(5), 9))
+    chunks = list(UniversalChunker.chunk_directory(directory, "*.txt", cache_path))
+    assert parse_calls == ["course1.txt"]
+    assert chunks == list(UniversalChunker.chunk_directory(directory, "*.txt", None))
+
+
+def test_easv_parser_serves_unchanged_file_from_cache(tmp_path, monkeypatch):
+    path = tmp_path / "SDE2.txt"
+    path.write_text(courses.generate_course(20_000), encoding="utf-8")
+    cache = ParseCache(tmp_path / "cache.db")
+    course = EASVParser(cache).parse_file(path)
+
+    def fail(*args):
+        raise AssertionError("parsed again")
+
+    monkeypatch.setattr(EASVParser, "_parse_weeks", fail)
+    assert EASVParser(cache).parse_file(path) == course
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+
+def test_unreadable_or_outdated_entries_are_misses(tmp_path, monkeypatch):
+    path = tmp_path / "SDE2.txt"
+    path.write_text(courses.generate_course(20_000), encoding="utf-8")
+    cache_path = tmp_path / "cache.db"
+    cache = ParseCache(cache_path)
+    course = EASVParser(cache).parse_file(path)
+
+    with sqlite3.connect(cache_path) as conn:
+        conn.execute("UPDATE parsed SET payload = x'8004'")  # Truncated pickle
+    assert EASVParser(cache).parse_file(path) == course
+    assert EASVParser(cache).parse_file(path) == course  # Rewritten by the re-parse
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    monkeypatch.setattr(parse_cache, "code_version", lambda parser_type: "edited")
+    assert EASVParser(cache).parse_file(path) == course
+    assert (cache.hits, cache.misses) == (1, 3)
+    cache.close()
+
+
+def test_cache_written_before_versioning_is_replaced(tmp_path):
+    cache_path = tmp_path / "cache.db"
+    with sqlite3.connect(cache_path) as conn:
+        conn.execute(
+            "CREATE TABLE parsed (parser TEXT, source TEXT, content_hash TEXT, payload BLOB, "
+            "PRIMARY KEY (parser, source))"
+        )
+    path = tmp_path / "SDE2.txt"
+    path.write_text(courses.generate_course(20_000), encoding="utf-8")
+
+    cache = ParseCache(cache_path)
+    course = EASVParser(cache).parse_file(path)
+
+    assert EASVParser(cache).parse_file(path) == course
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert parse_cache.DEFAULT_PARSE_CACHE_PATH.is_absolute()
+    cache.close()
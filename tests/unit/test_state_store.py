@@ -0,0 +1,143 @@
+"""
+Tests for the portable-mode StateStore.
+
+Covers WAL setup, batched commits, the bulk APIs, review-log
+compaction into per-day aggregates and resetting compacted history.
+"""
+
+import json
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.delivery.state_store import SM2State, StateStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = StateStore(db_path=tmp_path / "state.db")
+    yield s
+    s.close()
+
+
+def other_connection(store):
+    return sqlite3.connect(str(store.db_path))
+
+
+class TestConnection:
+    def test_wal_journal_and_covering_index(self, store):
+        assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        plan = store.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT atom_id FROM sm2_state "
+            "WHERE next_review <= ? ORDER BY next_review, interval_days",
+            (date.today(),),
+        ).fetchall()
+        assert "COVERING INDEX idx_sm2_due" in " ".join(row[3] for row in plan)
+
+
+class TestBatch:
+    def test_batch_defers_commit_until_exit(self, store):
+        with store.batch():
+            store.save_sm2_state(SM2State(atom_id="a1", next_review=date.today()))
+            store.log_review("a1", 4, 1200)
+            with store.batch():
+                store.log_review("a1", 5, 900)
+            other = other_connection(store)
+            assert other.execute("SELECT COUNT(*) FROM review_log").fetchone()[0] == 0
+
+        assert other.execute("SELECT COUNT(*) FROM review_log").fetchone()[0] == 2
+        assert other.execute("SELECT COUNT(*) FROM sm2_state").fetchone()[0] == 1
+
+    def test_batch_rolls_back_on_error(self, store):
+        with pytest.raises(RuntimeError), store.batch():
+            store.log_review("a1", 4, 1200)
+            raise RuntimeError("boom")
+
+        assert store.get_review_history("a1") == []
+
+
+class TestBulk:
+    def test_bulk_round_trip(self, store):
+        today = date.today()
+        states = [
+            SM2State(atom_id=f"a{i}", interval_days=i, repetitions=1, next_review=today)
+            for i in range(2000)
+        ]
+
+        assert store.save_sm2_states(states) == 2000
+        loaded = store.get_sm2_states([f"a{i}" for i in range(0, 2000, 7)] + ["missing"])
+
+        assert loaded["a14"].interval_days == 14
+        assert loaded["a14"].next_review == today
+        assert loaded["missing"] == SM2State(atom_id="missing")
+        assert len(loaded) == len(range(0, 2000, 7)) + 1
+
+    def test_log_reviews(self, store):
+        logged = store.log_reviews(
+            [
+                {"atom_id": "a1", "grade": 4, "response_ms": 800},
+                {"atom_id": "a1", "grade": 2, "response_ms": 1500, "confidence": 3},
+            ]
+        )
+
+        assert logged == 2
+        assert sorted(r.grade for r in store.get_review_history("a1")) == [2, 4]
+
+    def test_bulk_insert_is_fast(self, store):
+        rows = [{"atom_id": f"a{i % 500}", "grade": 3, "response_ms": 1000} for i in range(200_000)]
+
+        started = time.perf_counter()
+        with store.batch():
+            store.log_reviews(rows)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 10.0
+        assert store.get_stats()["total_reviews"] == 200_000
+
+
+class TestCompaction:
+    def test_old_reviews_fold_into_daily_aggregates(self, store):
+        old = datetime.now() - timedelta(days=200)
+        store.log_reviews(
+            [
+                {"atom_id": "a1", "grade": 5, "response_ms": 1000, "reviewed_at": old},
+                {"atom_id": "a2", "grade": 1, "response_ms": 3000, "reviewed_at": old},
+                {"atom_id": "a1", "grade": 4, "response_ms": 500},
+            ]
+        )
+
+        assert store.compact_reviews() == 2
+        assert store.compact_reviews() == 0
+
+        stats = store.get_stats()
+        assert stats["total_reviews"] == 3
+        daily = store.get_daily_reviews(days=365)
+        assert daily[0]["day"] == old.date()
+        assert (daily[0]["reviews"], daily[0]["passed"]) == (2, 1)
+        assert daily[0]["avg_response_ms"] == 2000
+        assert [r.grade for r in store.get_review_history("a1")] == [4]
+
+    def test_compact_if_due_runs_once_per_interval(self, store):
+        old = datetime.now() - timedelta(days=200)
+        store.log_reviews([{"atom_id": "a1", "grade": 3, "response_ms": 1, "reviewed_at": old}])
+
+        assert store.compact_if_due() == 1
+        store.log_reviews([{"atom_id": "a1", "grade": 3, "response_ms": 1, "reviewed_at": old}])
+        assert store.compact_if_due() == 0
+
+    def test_full_reset_backs_up_and_clears_compacted_history(self, store):
+        old = datetime.now() - timedelta(days=200)
+        store.save_sm2_state(SM2State(atom_id="M1-a1", next_review=date.today()))
+        store.log_reviews([{"atom_id": "M1-a1", "grade": 4, "response_ms": 1, "reviewed_at": old}])
+        store.compact_reviews()
+
+        assert store.reset(module_filter=2, force=True) == 0  # Nothing in module 2
+        assert store.reset(force=True) == 1
+
+        assert store.get_stats()["total_reviews"] == 0
+        assert store.conn.execute("SELECT COUNT(*) FROM store_meta").fetchone()[0] == 0
+        backup = json.loads(store.list_backups()[0].read_text())
+        assert [row["reviews"] for row in backup["review_daily"]] == [1]
+        assert [row["key"] for row in backup["store_meta"]] == ["last_compaction"]
@@ -0,0 +1,73 @@
+"""
+Tests for the materialized struggle priority store.
+
+Incremental refreshes must leave struggle_priority identical to a full
+rebuild, and reads over it must rank like the view it replaces.
+Runs against in-memory SQLite.
+"""
+
+import random
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.study.struggle_priority import StrugglePriorityStore
+from tests.fixtures import struggle_priority as course
+
+NOW = datetime(2026, 10, 1, tzinfo=UTC)
+
+
+@pytest.fixture
+def conn():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        course.generate(connection, atoms=2_000, modules=8, sections_per_module=5, seed=4)
+        yield connection
+
+
+def test_reads_rank_like_the_view(conn):
+    store = StrugglePriorityStore()
+    assert store.ensure_built(conn) is True
+    assert store.ensure_built(conn) is False
+
+    params = {"now": NOW.isoformat(), "limit": 100}
+    view = conn.execute(text(course.VIEW_READ_SQL), params).fetchall()
+    table = conn.execute(text(course.TABLE_READ_SQL), params).fetchall()
+
+    assert len(view) == 100
+    assert [r.id for r in table] == [r.id for r in view]
+    assert [r.priority_score for r in table] == pytest.approx([r.priority_score for r in view])
+
+
+def test_atom_refresh_matches_rebuild(conn):
+    store = StrugglePriorityStore()
+    store.rebuild(conn)
+    touched = [f"a{n}" for n in range(0, 2_000, 7)]
+    course.record_interactions(conn, touched, random.Random(1), NOW)
+    conn.execute(text("UPDATE learning_atoms SET ccna_section_id = '3.1' WHERE id = 'a7'"))
+
+    store.refresh_atoms(conn, atom_ids=touched)
+    store.refresh_atoms(conn, card_ids=["c14"])
+    incremental = course.snapshot(conn)
+    store.rebuild(conn)
+
+    assert incremental == course.snapshot(conn)
+
+
+def test_module_refresh_only_touches_that_module(conn):
+    store = StrugglePriorityStore()
+    store.rebuild(conn)
+    conn.execute(text("UPDATE struggle_weights SET weight = 0.99 WHERE module_number = 2"))
+    conn.execute(
+        text("INSERT INTO struggle_weights VALUES ('w-new', 'default', 2, '2.1', 0.7)")
+    )
+
+    written = store.refresh_modules(conn, [2])
+    incremental = course.snapshot(conn)
+    store.rebuild(conn)
+
+    assert written == conn.execute(
+        text("SELECT COUNT(*) FROM struggle_priority WHERE module_number = 2")
+    ).scalar()
+    assert incremental == course.snapshot(conn)
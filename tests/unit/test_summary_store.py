@@ -0,0 +1,208 @@
+"""
+Tests for the dashboard summary store.
+
+Incremental deltas must leave the rollups identical to a full rebuild,
+cached snapshots change only when invalidated, and snapshot views must
+match the aggregate queries they replace.
+Runs against in-memory SQLite.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.study.summary_store import DashboardSummaryStore
+
+SCHEMA = [
+    """CREATE TABLE learning_atoms (
+        id TEXT PRIMARY KEY, card_id TEXT, atom_type TEXT, front TEXT,
+        ccna_section_id TEXT, anki_review_count INTEGER, anki_due_date DATE,
+        nls_correct_count INTEGER, nls_incorrect_count INTEGER)""",
+    """CREATE TABLE ccna_sections (
+        section_id TEXT PRIMARY KEY, module_number INTEGER, level INTEGER,
+        display_order INTEGER)""",
+    """CREATE TABLE ccna_section_mastery (
+        section_id TEXT, user_id TEXT, mastery_score REAL, is_completed BOOLEAN,
+        needs_remediation BOOLEAN, atoms_total INTEGER, atoms_mastered INTEGER,
+        atoms_learning INTEGER, atoms_struggling INTEGER, atoms_new INTEGER)""",
+    """CREATE TABLE struggle_weights (module_number INTEGER, section_id TEXT, weight REAL)""",
+    """CREATE TABLE dashboard_atom_rollup (
+        module_number INTEGER, atom_type TEXT, has_section BOOLEAN,
+        atom_count INTEGER DEFAULT 0, authored_count INTEGER DEFAULT 0,
+        reviewed_count INTEGER DEFAULT 0, nls_mastered_count INTEGER DEFAULT 0,
+        PRIMARY KEY (module_number, atom_type, has_section))""",
+    """CREATE TABLE dashboard_due_rollup (due_date DATE PRIMARY KEY, atom_count INTEGER)""",
+    """CREATE TABLE dashboard_section_rollup (
+        user_id TEXT, module_number INTEGER, level INTEGER,
+        section_count INTEGER, completed_count INTEGER, mastery_rows INTEGER,
+        mastery_sum REAL, atoms_total INTEGER, atoms_mastered INTEGER,
+        atoms_learning INTEGER, atoms_struggling INTEGER, atoms_new INTEGER,
+        remediation_sections INTEGER, remediation_atoms INTEGER,
+        first_incomplete_order INTEGER, first_incomplete_section TEXT,
+        PRIMARY KEY (user_id, module_number, level))""",
+]
+
+TODAY = date.today()
+
+
+@pytest.fixture
+def conn():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        for ddl in SCHEMA:
+            connection.execute(text(ddl))
+        connection.execute(
+            text("INSERT INTO ccna_sections VALUES (:s, :m, :l, :o)"),
+            [
+                {"s": "1.1", "m": 1, "l": 2, "o": 1},
+                {"s": "1.1.1", "m": 1, "l": 3, "o": 2},
+                {"s": "2.1", "m": 2, "l": 2, "o": 3},
+                {"s": "2.2", "m": 2, "l": 2, "o": 4},
+            ],
+        )
+        connection.execute(
+            text("INSERT INTO ccna_section_mastery VALUES (:s, 'default', :score, :done, :rem, 10, 2, 3, :st, 5)"),
+            [
+                {"s": "1.1", "score": 80.0, "done": True, "rem": False, "st": 1},
+                {"s": "1.1.1", "score": 40.0, "done": False, "rem": True, "st": 4},
+                {"s": "2.1", "score": 20.0, "done": False, "rem": True, "st": 6},
+            ],
+        )
+        connection.execute(
+            text("INSERT INTO struggle_weights VALUES (:m, :s, :w)"),
+            [{"m": 1, "s": "1.1", "w": 0.9}, {"m": 2, "s": None, "w": 0.6}, {"m": 2, "s": "2.1", "w": 0.3}],
+        )
+        connection.execute(
+            text("INSERT INTO learning_atoms VALUES (:id, :card, :t, :f, :sec, :r, :due, :c, :i)"),
+            [
+                {"id": f"a{n}", "card": f"c{n}", "t": ["mcq", "flashcard", "parsons"][n % 3],
+                 "f": "" if n % 7 == 0 else "Q", "sec": [None, "1.1", "1.1.1", "2.1", "missing"][n % 5],
+                 "r": n % 4, "due": TODAY + timedelta(days=(n % 6) - 3) if n % 2 else None,
+                 "c": n % 3, "i": None if n % 5 == 0 else 1}
+                for n in range(60)
+            ],
+        )
+        yield connection
+
+
+def rollup_tables(conn):
+    atoms = conn.execute(
+        text("SELECT * FROM dashboard_atom_rollup WHERE atom_count != 0 ORDER BY 1, 2, 3")
+    ).fetchall()
+    due = conn.execute(
+        text("SELECT * FROM dashboard_due_rollup WHERE atom_count != 0 ORDER BY 1")
+    ).fetchall()
+    return atoms, due
+
+
+class TestSnapshotViews:
+    def test_views_match_source_aggregates(self, conn):
+        snapshot = DashboardSummaryStore().snapshot("default", conn=conn)
+
+        due = conn.execute(
+            text("SELECT COUNT(*) FROM learning_atoms WHERE anki_due_date <= :d"), {"d": TODAY}
+        ).scalar()
+        learned, total = conn.execute(
+            text(
+                "SELECT SUM(CASE WHEN anki_review_count > 0 THEN 1 ELSE 0 END), COUNT(*) "
+                "FROM learning_atoms WHERE ccna_section_id IS NOT NULL"
+            )
+        ).one()
+        by_type = dict(
+            conn.execute(
+                text(
+                    "SELECT atom_type, COUNT(*) FROM learning_atoms "
+                    "WHERE front IS NOT NULL AND front != '' GROUP BY atom_type"
+                )
+            ).fetchall()
+        )
+        atoms = snapshot.atom_totals(has_section=True)
+
+        assert snapshot.due_count(TODAY) == due
+        assert (atoms["reviewed_count"], atoms["atom_count"]) == (learned, total)
+        assert snapshot.authored_by_type() == by_type
+        assert snapshot.current_section() == (1, "1.1.1")
+        assert snapshot.section_totals().remediation_atoms == 10
+        assert snapshot.section_totals(level=2).mastery_sum == pytest.approx(100.0)
+        assert [z["module_number"] for z in snapshot.struggle_zones()] == [1, 2]
+        assert snapshot.max_struggle_by_section_module() == {1: 0.9, 2: 0.3}
+
+    def test_falls_back_to_source_tables_without_rollups(self, conn):
+        expected = DashboardSummaryStore().snapshot("default", conn=conn)
+        for table in ("dashboard_atom_rollup", "dashboard_due_rollup", "dashboard_section_rollup"):
+            conn.execute(text(f"DROP TABLE {table}"))
+
+        snapshot = DashboardSummaryStore().snapshot("default", conn=conn)
+
+        assert snapshot.atoms == expected.atoms
+        assert snapshot.due == expected.due
+        assert snapshot.sections == expected.sections
+
+
+class TestIncrementalUpdates:
+    def test_deltas_match_full_rebuild(self, conn):
+        store = DashboardSummaryStore()
+        snapshot = store.snapshot("default", conn=conn)
+        touched = ["a1", "a2", "a8", "a30"]
+        before = store.atom_facts(conn, atom_ids=touched + ["new"])
+
+        conn.execute(
+            text(
+                "UPDATE learning_atoms SET anki_review_count = anki_review_count + 1, "
+                "anki_due_date = :due, nls_correct_count = 5, ccna_section_id = '2.2' "
+                "WHERE id IN ('a1', 'a2', 'a8')"
+            ),
+            {"due": TODAY + timedelta(days=9)},
+        )
+        conn.execute(text("DELETE FROM learning_atoms WHERE id = 'a30'"))
+        conn.execute(
+            text("INSERT INTO learning_atoms (id, atom_type, front, anki_due_date) VALUES ('new', 'mcq', 'Q', :d)"),
+            {"d": TODAY},
+        )
+        after = store.atom_facts(conn, atom_ids=touched + ["new"])
+        cached = (dict(snapshot.atoms), dict(snapshot.due))
+        store.apply_atom_changes(conn, before, after)
+        incremental = rollup_tables(conn)
+
+        # The cache only changes once the writer commits and invalidates
+        assert store.snapshot("default", conn=conn) is snapshot
+        assert (snapshot.atoms, snapshot.due) == cached
+        store.invalidate()
+        reloaded = store.snapshot("default", conn=conn)
+
+        store.rebuild(conn)
+
+        assert incremental == rollup_tables(conn)
+        rebuilt = store.snapshot("default", conn=conn)
+        assert {k: v for k, v in reloaded.atoms.items() if any(v)} == rebuilt.atoms
+        assert {k: v for k, v in reloaded.due.items() if v} == rebuilt.due
+
+    def test_pull_style_lookup_by_card_id(self, conn):
+        store = DashboardSummaryStore()
+        store.snapshot("default", conn=conn)
+        before = store.atom_facts(conn, card_ids=["c4", "c8"])
+
+        conn.execute(text("UPDATE learning_atoms SET anki_review_count = 3 WHERE card_id IN ('c4', 'c8')"))
+        store.apply_atom_changes(conn, before, store.atom_facts(conn, card_ids=["c4", "c8"]))
+
+        incremental = rollup_tables(conn)
+        store.rebuild(conn)
+        assert incremental == rollup_tables(conn)
+
+    def test_refresh_sections_updates_one_module(self, conn):
+        store = DashboardSummaryStore()
+        snapshot = store.snapshot("default", conn=conn)
+        conn.execute(
+            text("UPDATE ccna_section_mastery SET is_completed = 1, needs_remediation = 0 WHERE section_id = '2.1'")
+        )
+
+        store.refresh_sections(conn, "default", module_number=2)
+
+        assert snapshot.sections[(2, 2)].completed_count == 0
+        store.invalidate("default")
+        snapshot = store.snapshot("default", conn=conn)
+        assert snapshot.sections[(2, 2)].completed_count == 1
+        assert snapshot.section_totals(module_number=2).remediation_sections == 0
+        assert snapshot.sections[(1, 3)].remediation_sections == 1
+        assert snapshot.current_section() == (1, "1.1.1")
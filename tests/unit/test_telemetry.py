@@ -0,0 +1,146 @@
+"""
+Tests for the buffered JSON telemetry sink and the telemetry query engine.
+"""
+
+import gzip
+import json
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from src.delivery.json_telemetry import DiagnosisEvent, InteractionEvent, JSONTelemetryLogger
+from src.delivery.telemetry_query import TelemetryQuery
+
+
+def interaction(i, correct=True, rt=1000):
+    return InteractionEvent(
+        atom_id=f"a{i}",
+        atom_type="mcq",
+        module_number=1,
+        section_id="1.1",
+        is_correct=correct,
+        response_time_ms=rt,
+        user_answer="x",
+        correct_answer="x",
+    )
+
+
+@pytest.fixture
+def telemetry(tmp_path):
+    return JSONTelemetryLogger(log_dir=tmp_path, learner_id="t", flush_interval_seconds=3600)
+
+
+class TestBufferedSink:
+    def test_events_are_buffered_until_session_end(self, telemetry):
+        telemetry.start_session("adaptive")
+        for i in range(10):
+            telemetry.log_interaction(interaction(i))
+
+        assert not telemetry.session_file.exists()
+
+        path = telemetry.session_file
+        telemetry.end_session()
+
+        types = [json.loads(line)["type"] for line in path.read_text().splitlines()]
+        assert types == ["session_start"] + ["interaction"] * 10 + ["session_end"]
+
+    def test_rotation_compresses_and_keeps_every_event(self, tmp_path):
+        telemetry = JSONTelemetryLogger(
+            log_dir=tmp_path, learner_id="t", rotation_size_mb=0, buffer_size_kb=1
+        )
+        telemetry.rotation_size_bytes = 4096
+        telemetry.start_session("adaptive")
+        for i in range(200):
+            telemetry.log_interaction(interaction(i))
+        telemetry.end_session()
+
+        rotated = list(telemetry.sessions_dir.glob("*.jsonl.gz"))
+        assert rotated
+        lines = []
+        for path in sorted(telemetry.sessions_dir.iterdir()):
+            opener = gzip.open if path.suffix == ".gz" else open
+            with opener(path, "rt") as f:
+                lines.extend(json.loads(line) for line in f)
+        assert sum(e["type"] == "interaction" for e in lines) == 200
+
+    def test_daily_rollup_is_appended_per_session(self, telemetry):
+        for correct in (True, False):
+            telemetry.start_session("war")
+            telemetry.log_interaction(interaction(0, correct=correct))
+            telemetry.log_diagnosis(DiagnosisEvent("a0", "retrieval", None, "focus", 0.8))
+            summary = telemetry.end_session()
+
+        daily = telemetry.read_daily_summary()
+        path = telemetry.get_daily_summary_path()
+
+        assert len(path.read_text().splitlines()) == 2
+        assert daily["total_atoms"] == 2
+        assert daily["overall_accuracy"] == 50.0
+        assert daily["mode_counts"] == {"war": 2}
+        assert daily["failure_modes"] == {"retrieval": 2}
+        assert daily["sessions"][-1] == summary.session_id
+
+
+def write_session(sessions_dir, day, name, results, compress=False, fatigue_at=None):
+    lines = []
+    for i, (correct, rt) in enumerate(results):
+        if fatigue_at == i:
+            lines.append({"session": name, "type": "diagnosis", "cognitive_state": "fatigue"})
+        lines.append(
+            {"session": name, "type": "interaction", "is_correct": correct, "response_time_ms": rt}
+        )
+    body = "".join(json.dumps(line) + "\n" for line in lines)
+    path = sessions_dir / f"{day.isoformat()}_session_{name}.jsonl"
+    if compress:
+        with gzip.open(path.with_name(path.name + ".gz"), "wt") as f:
+            f.write(body)
+    else:
+        path.write_text(body)
+
+
+class TestTelemetryQuery:
+    def test_aggregates_across_days_and_compressed_files(self, tmp_path):
+        sessions = tmp_path / "sessions"
+        sessions.mkdir()
+        rng = np.random.default_rng(0)
+        today = date.today()
+        all_rt = []
+        for d in range(30):
+            for s in range(3):
+                # 20 good cards, then accuracy collapses and RT doubles
+                results = [(bool(rng.random() < 0.9), int(rng.integers(800, 1200))) for _ in range(20)]
+                results += [(bool(rng.random() < 0.4), int(rng.integers(1600, 2400))) for _ in range(20)]
+                all_rt.extend(rt for _, rt in results)
+                write_session(
+                    sessions,
+                    today - timedelta(days=d),
+                    f"s{d}_{s}",
+                    results,
+                    compress=d % 2 == 0,
+                    fatigue_at=22 if s == 0 else None,
+                )
+
+        report = TelemetryQuery(log_dir=tmp_path, chunk_size=1000).summarize()
+
+        assert report.sessions == 90
+        assert report.interactions == 3600
+        assert report.files_scanned == 90
+        assert 60 < report.accuracy_percent < 70
+        assert len(report.daily) == 30
+        assert report.rt_percentiles[75] == pytest.approx(np.percentile(all_rt, 75), rel=0.03)
+        assert report.rt_percentiles[95] == pytest.approx(np.percentile(all_rt, 95), rel=0.03)
+        assert report.fatigue_onset_position == 20
+        assert report.diagnosed_fatigue_sessions == 30
+        assert report.diagnosed_fatigue_median_position == 22
+
+    def test_date_range_filters_files(self, tmp_path):
+        sessions = tmp_path / "sessions"
+        sessions.mkdir()
+        today = date.today()
+        write_session(sessions, today, "new", [(True, 500)])
+        write_session(sessions, today - timedelta(days=40), "old", [(False, 500)] * 3)
+
+        report = TelemetryQuery(log_dir=tmp_path).summarize(start=today - timedelta(days=7))
+
+        assert (report.sessions, report.interactions, report.accuracy_percent) == (1, 1, 100.0)